@@ -272,10 +272,24 @@ async def app_lifespan(app: FastAPI):
         return
     # Defer launch to the next loop turn so eager task execution cannot block bind.
     schedule_deferred_startup(app)
+    # Async DB facade: one pool for the server loop (opened without
+    # waiting for connections, so bind isn't delayed).
+    try:
+        from solden.core.async_database import open_async_pool
+
+        await open_async_pool()
+    except Exception as e:
+        logger.warning(f"Async DB pool open failed: {e}")
     try:
         yield
     finally:
         await cancel_deferred_startup(app)
+        try:
+            from solden.core.async_database import close_async_pool
+
+            await close_async_pool()
+        except Exception as e:
+            logger.warning(f"Async DB pool close failed: {e}")
         try:
             from solden.services.gmail_autopilot import stop_gmail_autopilot
             await stop_gmail_autopilot(app)
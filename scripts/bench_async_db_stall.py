@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Load test: event-loop stall from sync vs async DB access.
+
+Runs ``--tasks`` concurrent coroutines on one event loop, each doing
+``--iterations`` rounds of a hot handler pattern — read an AP item,
+log an LLM call — while a heartbeat task
+wakes every ``--tick-ms`` and records how late it woke. Two modes:
+
+* **sync** — the calls go straight to ``SoldenDB`` from the coroutine
+  (what the engine handlers, outbox worker and gateway did), so every
+  query blocks the loop for its full round trip.
+* **async** — the same calls through ``AsyncSoldenDB`` on a pooled
+  ``AsyncConnection`` per task.
+
+Reports wall time, operations per second and heartbeat lateness
+(p50 / p99 / max, and the total time the loop was stalled past one
+tick).
+
+Usage
+-----
+    DATABASE_URL=postgresql://localhost/clearledgr_bench \\
+        python scripts/bench_async_db_stall.py --tasks 20 --iterations 50
+
+Rows are written under a throwaway organisation (``bench-async-<hex>``)
+and deleted on exit. Never point this at a production database.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from solden.core.async_database import (  # noqa: E402
+    close_async_pool,
+    get_async_db,
+    open_async_pool,
+)
+from solden.core.database import get_db  # noqa: E402
+from solden.core.stores.ap_store import _AP_ITEM_BY_ID_SQL  # noqa: E402
+from solden.core.stores.async_llm_call_store import LLM_CALL_LOG_INSERT_SQL  # noqa: E402
+
+
+def _llm_row(organization_id: str) -> tuple:
+    return (
+        f"LLM-bench-{uuid.uuid4().hex[:12]}", organization_id, "explain_state", "bench",
+        100, 20, 250, 0.001, 0, None, None,
+        datetime.now(timezone.utc).isoformat(), None, None,
+    )
+
+
+async def _sync_worker(db, organization_id: str, ap_item_id: str, iterations: int) -> None:
+    for _ in range(iterations):
+        db.get_ap_item(ap_item_id)
+        with db.connect() as conn:
+            conn.execute(LLM_CALL_LOG_INSERT_SQL, _llm_row(organization_id))
+            conn.commit()
+        await asyncio.sleep(0)
+
+
+async def _async_worker(adb, organization_id: str, ap_item_id: str, iterations: int) -> None:
+    for _ in range(iterations):
+        await adb.fetchone(_AP_ITEM_BY_ID_SQL, (ap_item_id,))
+        await adb.insert_llm_call_log(_llm_row(organization_id))
+
+
+async def _run(mode: str, db, organization_id: str, ap_item_ids: List[str], iterations: int, tick: float):
+    lateness: List[float] = []
+    done = asyncio.Event()
+
+    async def heartbeat() -> None:
+        while not done.is_set():
+            expected = time.perf_counter() + tick
+            await asyncio.sleep(tick)
+            lateness.append(max(0.0, time.perf_counter() - expected))
+
+    adb = get_async_db(db)
+    if mode == "async":
+        pool = await open_async_pool(db)
+        await pool.wait()
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(tick * 2)
+    started = time.perf_counter()
+    if mode == "sync":
+        workers = [_sync_worker(db, organization_id, a, iterations) for a in ap_item_ids]
+    else:
+        workers = [_async_worker(adb, organization_id, a, iterations) for a in ap_item_ids]
+    await asyncio.gather(*workers)
+    wall = time.perf_counter() - started
+    done.set()
+    await beat
+    if mode == "async":
+        await close_async_pool(db.dsn)
+    return wall, lateness
+
+
+def _cleanup(db, organization_id: str) -> None:
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM llm_call_log WHERE organization_id = %s", (organization_id,))
+        cur.execute("DELETE FROM ap_items WHERE organization_id = %s", (organization_id,))
+        conn.commit()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20, help="Concurrent coroutines (default 20)")
+    parser.add_argument("--iterations", type=int, default=50, help="Rounds per coroutine (default 50)")
+    parser.add_argument("--tick-ms", type=float, default=5.0, help="Heartbeat interval in ms (default 5)")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("psycopg.pool").setLevel(logging.ERROR)
+    db = get_db()
+    db.initialize()
+    organization_id = f"bench-async-{uuid.uuid4().hex[:8]}"
+    ap_item_ids = []
+    for i in range(args.tasks):
+        item = db.create_ap_item({
+            "invoice_key": f"bench-{organization_id}-{i}",
+            "thread_id": f"bench-thr-{organization_id}-{i}",
+            "vendor_name": "Bench Vendor",
+            "amount": 100.0,
+            "currency": "USD",
+            "state": "received",
+            "organization_id": organization_id,
+        })
+        ap_item_ids.append(item["id"])
+    tick = args.tick_ms / 1000.0
+    ops = args.tasks * args.iterations * 2
+    try:
+        print(f"tasks={args.tasks} iterations={args.iterations} ops/mode={ops} tick={args.tick_ms}ms")
+        print(f"{'mode':<6} {'wall s':>8} {'ops/s':>8} {'p50 late ms':>12} {'p99 late ms':>12} "
+              f"{'max late ms':>12} {'stalled s':>10}")
+        for mode in ("sync", "async"):
+            wall, late = asyncio.run(_run(mode, db, organization_id, ap_item_ids, args.iterations, tick))
+            late_ms = sorted(x * 1000 for x in late) or [0.0]
+            p99 = late_ms[min(len(late_ms) - 1, int(len(late_ms) * 0.99))]
+            stalled = sum(x for x in late if x > tick)
+            print(f"{mode:<6} {wall:>8.2f} {ops / wall:>8.0f} {statistics.median(late_ms):>12.2f} "
+                  f"{p99:>12.2f} {late_ms[-1]:>12.2f} {stalled:>10.2f}")
+    finally:
+        _cleanup(db, organization_id)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
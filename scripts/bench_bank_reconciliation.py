@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Benchmark batched vs per-line bank statement reconciliation.
+
+Seeds a throwaway organisation with ``--lines`` outflow statement lines
+and one matching ``payment_confirmations`` row per line (plus a share of
+decoys and duplicate amounts so the ambiguity path is exercised), then
+runs ``reconcile_import`` both ways and reports wall time and DB
+connection checkouts (a proxy for round trips).
+
+The per-line path is run on a ``--per-line-sample`` slice of the import
+and extrapolated: at 20k lines it takes long enough that timing it in
+full is the problem this benchmark exists to show.
+
+Usage
+-----
+    DATABASE_URL=postgresql://localhost/clearledgr_bench \\
+        python scripts/bench_bank_reconciliation.py --lines 20000
+
+The seeded org (``bench-bankrec-<hex>``) is deleted on exit unless
+``--keep`` is passed; its audit events stay behind because
+``audit_events`` is append-only. Never point this at a production
+database.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from solden.core.database import get_db  # noqa: E402
+from solden.services.bank_reconciliation_matcher import reconcile_import  # noqa: E402
+
+
+class _ConnectCounter:
+    """Wrap ``db.connect`` to count checkouts while a block runs."""
+
+    def __init__(self, db) -> None:
+        self._db = db
+        self.count = 0
+
+    @contextmanager
+    def counting(self) -> Iterator[None]:
+        original = self._db.connect
+
+        def _counted(*args, **kwargs):
+            self.count += 1
+            return original(*args, **kwargs)
+
+        self._db.connect = _counted
+        try:
+            yield
+        finally:
+            self._db.connect = original
+
+
+def _seed(db, organization_id: str, n_lines: int, seed: int) -> str:
+    rng = random.Random(seed)
+    base = datetime(2026, 4, 1, tzinfo=timezone.utc)
+    now_iso = datetime.now(timezone.utc).isoformat()
+    confirmations: List[tuple] = []
+    lines: List[tuple] = []
+    import_row = db.create_bank_statement_import(
+        organization_id=organization_id,
+        filename="bench.xml",
+        format="camt.053",
+        statement_currency="EUR",
+        line_count=n_lines,
+    )
+    for i in range(n_lines):
+        amount = Decimal(rng.randint(1_000, 5_000_000)) / 100
+        day = base + timedelta(days=rng.randint(0, 29))
+        confirmations.append((
+            f"PC-bench-{uuid.uuid4().hex[:20]}", organization_id,
+            f"AP-bench-{i}", f"P-bench-{i}", "bench", "confirmed",
+            (day - timedelta(days=rng.randint(0, 3))).isoformat(),
+            amount, "EUR", f"REF-{i}", now_iso,
+        ))
+        lines.append((
+            f"BSL-bench-{uuid.uuid4().hex[:20]}", organization_id,
+            import_row["id"], i, day.date().isoformat(), day.date().isoformat(),
+            -amount, "EUR", f"Payment REF-{i}" if rng.random() < 0.7 else "Payment",
+            now_iso,
+        ))
+        if rng.random() < 0.1:
+            # Decoy with the same amount + date — drives the ambiguity path.
+            confirmations.append((
+                f"PC-bench-{uuid.uuid4().hex[:20]}", organization_id,
+                f"AP-bench-decoy-{i}", f"P-bench-decoy-{i}", "bench", "confirmed",
+                day.isoformat(), amount, "EUR", f"DECOY-{i}", now_iso,
+            ))
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.executemany(
+            "INSERT INTO payment_confirmations "
+            "(id, organization_id, ap_item_id, payment_id, source, status, "
+            " settlement_at, amount, currency, payment_reference, created_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            confirmations,
+        )
+        cur.executemany(
+            "INSERT INTO bank_statement_lines "
+            "(id, organization_id, import_id, line_index, value_date, "
+            " booking_date, amount, currency, description, match_status, created_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'unmatched', %s)",
+            lines,
+        )
+        conn.commit()
+    return import_row["id"]
+
+
+def _cleanup(db, organization_id: str) -> None:
+    with db.connect() as conn:
+        cur = conn.cursor()
+        for table in ("bank_statement_lines", "bank_statement_imports", "payment_confirmations"):
+            cur.execute(f"DELETE FROM {table} WHERE organization_id = %s", (organization_id,))
+        conn.commit()
+
+
+def _run(db, counter: _ConnectCounter, **kwargs: Any) -> Dict[str, Any]:
+    counter.count = 0
+    started = time.perf_counter()
+    with counter.counting():
+        summary = reconcile_import(db, **kwargs)
+    return {
+        "seconds": time.perf_counter() - started,
+        "connections": counter.count,
+        "summary": summary,
+    }
+
+
+def _per_line_sample(db, organization_id: str, import_id: str, sample: int) -> str:
+    """Copy the first ``sample`` lines into their own import so the
+    per-line path can be timed without touching the full import."""
+    sample_import = db.create_bank_statement_import(
+        organization_id=organization_id,
+        filename="bench-sample.xml",
+        format="camt.053",
+        statement_currency="EUR",
+        line_count=sample,
+    )
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO bank_statement_lines "
+            "(id, organization_id, import_id, line_index, value_date, "
+            " booking_date, amount, currency, description, match_status, created_at) "
+            "SELECT 'BSL-sample-' || substr(md5(id), 1, 20), organization_id, %s, "
+            "       line_index, value_date, booking_date, amount, currency, "
+            "       description, 'unmatched', created_at "
+            "FROM bank_statement_lines "
+            "WHERE import_id = %s AND line_index < %s",
+            (sample_import["id"], import_id, sample),
+        )
+        conn.commit()
+    return sample_import["id"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=20_000, help="Statement lines to seed (default 20000)")
+    parser.add_argument("--per-line-sample", type=int, default=500, help="Lines to time on the per-line path (default 500)")
+    parser.add_argument("--seed", type=int, default=7, help="RNG seed for the synthetic statement")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded org instead of deleting it")
+    args = parser.parse_args(argv)
+
+    db = get_db()
+    db.initialize()
+    organization_id = f"bench-bankrec-{uuid.uuid4().hex[:8]}"
+    counter = _ConnectCounter(db)
+    try:
+        t0 = time.perf_counter()
+        import_id = _seed(db, organization_id, args.lines, args.seed)
+        print(f"seeded {args.lines} lines in {time.perf_counter() - t0:.1f}s (org={organization_id})")
+
+        sample = min(args.per_line_sample, args.lines)
+        sample_id = _per_line_sample(db, organization_id, import_id, sample)
+
+        per_line = _run(
+            db, counter, organization_id=organization_id,
+            import_id=sample_id, batched=False,
+        )
+        batched = _run(
+            db, counter, organization_id=organization_id, import_id=import_id,
+        )
+
+        scale = args.lines / sample if sample else 0
+        print()
+        print(f"{'path':<22} {'lines':>8} {'seconds':>10} {'conns':>8} {'matched':>8} {'ambig':>7}")
+        print(
+            f"{'per-line (sampled)':<22} {sample:>8} {per_line['seconds']:>10.2f} "
+            f"{per_line['connections']:>8} {per_line['summary']['matched']:>8} "
+            f"{per_line['summary']['ambiguous']:>7}"
+        )
+        print(
+            f"{'per-line (projected)':<22} {args.lines:>8} {per_line['seconds'] * scale:>10.2f} "
+            f"{int(per_line['connections'] * scale):>8}"
+        )
+        print(
+            f"{'batched':<22} {args.lines:>8} {batched['seconds']:>10.2f} "
+            f"{batched['connections']:>8} {batched['summary']['matched']:>8} "
+            f"{batched['summary']['ambiguous']:>7}"
+        )
+    finally:
+        if not args.keep:
+            _cleanup(db, organization_id)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Benchmark event-stream intake: old Beat drain vs EventStreamConsumer.
+
+Enqueues ``--events`` events (a ``--high-ratio`` share on
+high_priority) into a throwaway pair of streams, then drains them two
+ways with a handler that sleeps ``--handler-ms`` to stand in for the
+planning + coordination engines:
+
+* **beat-drain** — the pre-consumer path: every 2s tick claims up to
+  10 entries with ``XREADGROUP count=1`` each. Ticks are simulated
+  back-to-back (no 2s sleep), so this is its ceiling *per tick*; the
+  sustained rate is ``10 / 2s`` regardless of handler speed.
+* **consumer** — ``EventStreamConsumer`` with batched claims, a thread
+  pool of ``--concurrency`` and ack-after-processing.
+
+Usage
+-----
+    REDIS_URL=redis://localhost:6379/15 \\
+        python scripts/bench_event_stream_consumer.py --events 5000
+
+The benchmark streams are namespaced ``clearledgr:bench:<hex>:*`` and
+deleted on exit. Never point this at a production Redis.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from solden.core import event_queue as event_queue_module  # noqa: E402
+from solden.core.events import AgentEvent, AgentEventType  # noqa: E402
+from solden.services.event_stream_consumer import EventStreamConsumer  # noqa: E402
+
+
+def _fill(queue, events: int, high_ratio: float) -> None:
+    pipe = queue._redis.pipeline(transaction=False)
+    every = int(1 / high_ratio) if high_ratio > 0 else 0
+    for i in range(events):
+        high = every and i % every == 0
+        event = AgentEvent(
+            type=AgentEventType.EMAIL_RECEIVED,
+            source="bench",
+            payload={"message_id": f"m{i}"},
+            organization_id=f"bench-org-{i % 20}",
+            priority="high_priority" if high else "standard",
+        )
+        stream = event_queue_module.STREAM_HIGH if high else event_queue_module.STREAM_STANDARD
+        pipe.xadd(stream, event.to_dict())
+    pipe.execute()
+
+
+def _handler(handler_ms: float):
+    def handle(event_data: dict, redis_client=None) -> dict:
+        time.sleep(handler_ms / 1000)
+        return {"status": "completed"}
+    return handle
+
+
+def _beat_drain(queue, events: int, handler_ms: float) -> tuple:
+    handle = _handler(handler_ms)
+    done = ticks = 0
+    started = time.perf_counter()
+    while done < events:
+        ticks += 1
+        before = done
+        for _ in range(10):
+            claimed = queue.claim_next("bench-beat", block_ms=0)
+            if not claimed:
+                break
+            stream, entry_id, event = claimed
+            queue.ack(stream, entry_id)
+            handle(event.to_dict())  # the Celery task ran after the ack
+            done += 1
+        if done == before:
+            break
+    return time.perf_counter() - started, ticks
+
+
+def _consumer(queue, events: int, handler_ms: float, concurrency: int, batch: int) -> float:
+    consumer = EventStreamConsumer(
+        queue,
+        consumer_name="bench-consumer",
+        batch_size=batch,
+        max_in_flight=concurrency,
+        block_ms=0,
+        handler=_handler(handler_ms),
+    )
+    started = time.perf_counter()
+    while consumer.stats["acked"] < events:
+        consumer.run_once()
+    elapsed = time.perf_counter() - started
+    consumer._executor.shutdown(wait=True)
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--handler-ms", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--high-ratio", type=float, default=0.1)
+    parser.add_argument("--beat-events", type=int, default=500,
+                        help="events for the (slow) beat-drain pass")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    prefix = f"clearledgr:bench:{uuid.uuid4().hex[:8]}"
+    event_queue_module.STREAM_HIGH = f"{prefix}:high_priority"
+    event_queue_module.STREAM_STANDARD = f"{prefix}:standard"
+    queue = event_queue_module.RedisEventQueue(
+        os.environ.get("REDIS_URL", "redis://localhost:6379/15"),
+    )
+    try:
+        beat_events = min(args.beat_events, args.events)
+        _fill(queue, beat_events, args.high_ratio)
+        elapsed, ticks = _beat_drain(queue, beat_events, args.handler_ms)
+        print(
+            f"beat-drain : {beat_events} events in {elapsed:.2f}s over {ticks} ticks "
+            f"-> {beat_events / elapsed:.0f} ev/s back-to-back, "
+            f"{10 / 2.0:.0f} ev/s at the real 2s cadence"
+        )
+
+        _fill(queue, args.events, args.high_ratio)
+        elapsed = _consumer(queue, args.events, args.handler_ms, args.concurrency, args.batch)
+        print(
+            f"consumer   : {args.events} events in {elapsed:.2f}s "
+            f"-> {args.events / elapsed:.0f} ev/s "
+            f"(concurrency={args.concurrency}, batch={args.batch}, handler={args.handler_ms:g}ms)"
+        )
+    finally:
+        queue._redis.delete(event_queue_module.STREAM_HIGH, event_queue_module.STREAM_STANDARD)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Benchmark Gmail history intake: per-message vs batched.
+
+Replays a synthetic history of ``--messages`` new messages (default
+500, a vendor statement run or a ``needsFullSync`` resync) for a
+throwaway organisation. Every ``--reply-every``-th message lands on a
+thread that already has an AP item. Gmail is a MockTransport that
+answers after ``--gmail-latency-ms`` per HTTP request, so round trips
+dominate as they do against the real API. Two modes:
+
+* **per-message** — the old loop: ``get_message(format="metadata")``,
+  ``get_ap_item_by_thread`` and ``queue.enqueue`` for each message.
+* **batched** — ``batch_get_messages`` (one multipart request per 50
+  ids), one ``get_ap_items_by_threads`` query and one
+  ``queue.enqueue_many`` call.
+
+Reports HTTP requests, DB connection checkouts and wall time per mode.
+The queue is Redis when ``REDIS_URL`` is set, the in-memory fallback
+otherwise; each mode uses fresh message ids so dedup never short-
+circuits the second run.
+
+Usage
+-----
+    DATABASE_URL=postgresql://localhost/clearledgr_bench \\
+        python scripts/bench_gmail_intake.py --messages 500
+
+The seeded org (``bench-gmail-<hex>``) and its AP items are deleted on
+exit unless ``--keep`` is passed. With Redis, the benchmark events stay
+in the streams and dedup keys expire after a day — use a scratch Redis
+DB. Never point this at production.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from solden.core import http_client as http_client_mod  # noqa: E402
+from solden.core.database import get_db  # noqa: E402
+from solden.core.event_queue import get_event_queue  # noqa: E402
+from solden.core.events import AgentEvent, AgentEventType  # noqa: E402
+from solden.services.gmail_api import GmailAPIClient, GmailToken  # noqa: E402
+
+
+def _thread_for(message_id: str, reply_every: int) -> str:
+    index = int(message_id.rsplit("-", 1)[-1])
+    return f"bench-thread-{index % 10_000}" if index % reply_every == 0 else f"thread-{message_id}"
+
+
+def _message_json(message_id: str, reply_every: int) -> dict:
+    return {
+        "id": message_id,
+        "threadId": _thread_for(message_id, reply_every),
+        "labelIds": ["INBOX"],
+        "payload": {"headers": [{"name": "Subject", "value": f"Statement {message_id}"}]},
+    }
+
+
+class _FakeGmail:
+    """MockTransport handler for single gets and batch requests."""
+
+    def __init__(self, latency_ms: float, reply_every: int):
+        self.latency = latency_ms / 1000.0
+        self.reply_every = reply_every
+        self.requests = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        if request.method == "POST" and "/batch/" in str(request.url):
+            body = request.content.decode("utf-8")
+            parts = []
+            for content_id, message_id in re.findall(
+                r"Content-ID: <item-(\d+)>\r\n\r\nGET /gmail/v1/users/me/messages/([^?]+)", body,
+            ):
+                parts.append(
+                    "--resp\r\nContent-Type: application/http\r\n"
+                    f"Content-ID: <response-item-{content_id}>\r\n\r\n"
+                    "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n"
+                    f"{json.dumps(_message_json(message_id, self.reply_every))}\r\n"
+                )
+            return httpx.Response(
+                200, text="".join(parts) + "--resp--\r\n",
+                headers={"Content-Type": "multipart/mixed; boundary=resp"},
+            )
+        message_id = request.url.path.rsplit("/", 1)[-1]
+        return httpx.Response(200, json=_message_json(message_id, self.reply_every))
+
+
+class _CountingDB:
+    """Counts connection checkouts on ``db`` while installed."""
+
+    def __init__(self, db):
+        self.db = db
+        self.count = 0
+        self._connect = db.connect
+
+    def __enter__(self):
+        def _counted():
+            self.count += 1
+            return self._connect()
+
+        self.db.connect = _counted
+        return self
+
+    def __exit__(self, *exc):
+        del self.db.connect
+
+
+def _event(organization_id: str, message_id: str, thread_id: str, existing) -> AgentEvent:
+    return AgentEvent(
+        type=AgentEventType.VENDOR_RESPONSE_RECEIVED if existing else AgentEventType.EMAIL_RECEIVED,
+        source="gmail_pubsub",
+        payload={
+            "message_id": message_id,
+            "thread_id": thread_id,
+            "mailbox": "bench@example.com",
+            "user_id": "bench-user",
+            "vendor_id": (existing or {}).get("vendor_name", ""),
+        },
+        organization_id=organization_id,
+        idempotency_key=message_id,
+    )
+
+
+async def _per_message(client, db, queue, organization_id: str, message_ids: List[str]) -> int:
+    replies = 0
+    for message_id in message_ids:
+        meta = await client.get_message(message_id, format="metadata")
+        existing = db.get_ap_item_by_thread(organization_id, meta.thread_id)
+        replies += bool(existing)
+        queue.enqueue(_event(organization_id, message_id, meta.thread_id, existing))
+    return replies
+
+
+async def _batched(client, db, queue, organization_id: str, message_ids: List[str]) -> int:
+    metadata = await client.batch_get_messages(message_ids, format="metadata")
+    existing_by_thread = db.get_ap_items_by_threads(
+        organization_id, [meta.thread_id for meta in metadata.values()],
+    )
+    events = []
+    for message_id in message_ids:
+        thread_id = metadata[message_id].thread_id
+        events.append(_event(organization_id, message_id, thread_id, existing_by_thread.get(thread_id)))
+    queue.enqueue_many(events)
+    return sum(1 for event in events if event.type == AgentEventType.VENDOR_RESPONSE_RECEIVED)
+
+
+async def _run(args, db, organization_id: str) -> list:
+    gmail = _FakeGmail(args.gmail_latency_ms, args.reply_every)
+    http_client_mod._reset_for_testing()
+    http_client_mod._shared_client = httpx.AsyncClient(transport=httpx.MockTransport(gmail))
+    client = GmailAPIClient("bench-user")
+    client._token = GmailToken(
+        user_id="bench-user", access_token="bench", refresh_token="bench",
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1), email="bench@example.com",
+    )
+    queue = get_event_queue()
+    rows = []
+    for label, mode in (("per-message", _per_message), ("batched", _batched)):
+        message_ids = [f"bench-{label}-{uuid.uuid4().hex[:6]}-{i}" for i in range(args.messages)]
+        gmail.requests = 0
+        with _CountingDB(db) as counter:
+            started = time.perf_counter()
+            replies = await mode(client, db, queue, organization_id, message_ids)
+            elapsed = time.perf_counter() - started
+        rows.append((label, gmail.requests, counter.count, replies, elapsed))
+    await http_client_mod.close_http_client()
+    return rows
+
+
+def _seed(db, organization_id: str, messages: int, reply_every: int) -> None:
+    db.ensure_organization(organization_id, organization_name="Gmail intake bench")
+    for index in range(0, messages, reply_every):
+        thread_id = f"bench-thread-{index % 10_000}"
+        db.create_ap_item({
+            "id": f"{organization_id}-{index}",
+            "invoice_key": f"{organization_id}-inv-{index}",
+            "thread_id": thread_id,
+            "message_id": f"{organization_id}-msg-{index}",
+            "vendor_name": f"Vendor {index % 37}",
+            "amount": 100.0,
+            "state": "needs_approval",
+            "organization_id": organization_id,
+        })
+
+
+def _cleanup(db, organization_id: str) -> None:
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM ap_items WHERE organization_id = %s", (organization_id,))
+        cur.execute("DELETE FROM organizations WHERE id = %s", (organization_id,))
+        conn.commit()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500, help="Messages in the replayed history (default 500)")
+    parser.add_argument("--reply-every", type=int, default=5, help="Every Nth message replies on a known thread")
+    parser.add_argument("--gmail-latency-ms", type=float, default=30.0, help="Simulated Gmail latency per HTTP request")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark org instead of deleting it")
+    args = parser.parse_args(argv)
+
+    db = get_db()
+    db.initialize()
+    organization_id = f"bench-gmail-{uuid.uuid4().hex[:8]}"
+    _seed(db, organization_id, args.messages, args.reply_every)
+    try:
+        rows = asyncio.run(_run(args, db, organization_id))
+        print(f"{'mode':<12} {'http requests':>14} {'db checkouts':>13} {'replies':>8} {'wall s':>8}")
+        for label, requests, checkouts, replies, elapsed in rows:
+            print(f"{label:<12} {requests:>14} {checkouts:>13} {replies:>8} {elapsed:>8.2f}")
+    finally:
+        if not args.keep:
+            _cleanup(db, organization_id)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
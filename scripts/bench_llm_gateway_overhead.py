@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Benchmark LLM gateway overhead per call: ledger pre-flight vs per-call check.
+
+Seeds a throwaway organisation with ``--log-rows`` month-to-date
+``llm_call_log`` rows (the volume the per-call ``SUM`` has to scan),
+then drives ``LLMGateway.call`` ``--calls`` times against an in-process
+``httpx.MockTransport`` — no network, so what is timed is the gateway's
+own work: budget pre-flight, prompt assembly, response parsing and the
+``llm_call_log`` insert. Two modes:
+
+* **per-call check** — the budget ledger is invalidated before every
+  call, so each call runs the authoritative ``_enforce_budget_cap``
+  (org load + cap resolution + month-to-date ``SUM``), i.e. the
+  pre-ledger behaviour.
+* **ledger** — the default: one authoritative check, then pre-flight
+  is a dict lookup until the entry goes stale.
+
+Also reports the pre-flight alone (no HTTP, no insert) both ways.
+
+Usage
+-----
+    DATABASE_URL=postgresql://localhost/clearledgr_bench \\
+        python scripts/bench_llm_gateway_overhead.py --calls 500
+
+The seeded org (``bench-llm-<hex>``) and its log rows are deleted on
+exit unless ``--keep`` is passed. Never point this at a production
+database.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from solden.core import http_client as http_client_mod  # noqa: E402
+from solden.core.database import get_db  # noqa: E402
+from solden.core.llm_budget_ledger import get_llm_budget_ledger  # noqa: E402
+from solden.core.llm_gateway import LLMAction, LLMGateway  # noqa: E402
+
+_RESPONSE = {
+    "content": [{"type": "text", "text": "{\"ok\": true}"}],
+    "stop_reason": "end_turn",
+    "usage": {"input_tokens": 40, "output_tokens": 8},
+}
+
+
+def _seed(db, organization_id: str, rows: int) -> None:
+    db.ensure_organization(organization_id, organization_name="LLM gateway bench")
+    db.update_organization(
+        organization_id, settings={"llm_cost_hard_cap_usd_override": 1_000_000.0},
+    )
+    month_start = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    span = max(1.0, (datetime.now(timezone.utc) - month_start).total_seconds())
+    values = [
+        (
+            f"LLM-bench-{uuid.uuid4().hex[:12]}", organization_id, "explain_state",
+            "bench-model", 400, 80, 900, 0.0024, 0, None, None,
+            (month_start + timedelta(seconds=span * i / rows)).isoformat(),
+        )
+        for i in range(rows)
+    ]
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.executemany(
+            "INSERT INTO llm_call_log "
+            "(id, organization_id, action, model, input_tokens, output_tokens, "
+            " latency_ms, cost_estimate_usd, truncated, error, correlation_id, created_at) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+            values,
+        )
+        conn.commit()
+
+
+def _cleanup(db, organization_id: str) -> None:
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM llm_call_log WHERE organization_id = %s", (organization_id,))
+        cur.execute("DELETE FROM organizations WHERE id = %s", (organization_id,))
+        conn.commit()
+
+
+async def _drive(gateway: LLMGateway, organization_id: str, calls: int, *, per_call_check: bool) -> float:
+    ledger = get_llm_budget_ledger()
+    ledger.invalidate(organization_id)
+    started = time.perf_counter()
+    for _ in range(calls):
+        if per_call_check:
+            ledger.invalidate(organization_id)
+        await gateway.call(
+            LLMAction.EXPLAIN_STATE,
+            [{"role": "user", "content": "Why is this invoice on hold?"}],
+            organization_id=organization_id,
+        )
+    return time.perf_counter() - started
+
+
+def _preflight(gateway: LLMGateway, organization_id: str, calls: int, *, per_call_check: bool) -> float:
+    ledger = get_llm_budget_ledger()
+    ledger.invalidate(organization_id)
+    started = time.perf_counter()
+    for _ in range(calls):
+        if per_call_check:
+            ledger.invalidate(organization_id)
+        if not gateway._budget_preflight(organization_id):
+            gateway._enforce_budget_cap(organization_id)
+    return time.perf_counter() - started
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=500, help="Gateway calls per mode (default 500)")
+    parser.add_argument("--log-rows", type=int, default=200_000, help="Month-to-date llm_call_log rows to seed (default 200000)")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded org instead of deleting it")
+    args = parser.parse_args(argv)
+
+    db = get_db()
+    db.initialize()
+    organization_id = f"bench-llm-{uuid.uuid4().hex[:8]}"
+    http_client_mod._reset_for_testing()
+    http_client_mod._shared_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=_RESPONSE)),
+    )
+    gateway = LLMGateway(api_key="bench-key", db=db)
+    try:
+        t0 = time.perf_counter()
+        _seed(db, organization_id, args.log_rows)
+        print(f"seeded {args.log_rows} llm_call_log rows in {time.perf_counter() - t0:.1f}s (org={organization_id})")
+
+        results = {
+            "preflight, per-call check": _preflight(gateway, organization_id, args.calls, per_call_check=True),
+            "preflight, ledger": _preflight(gateway, organization_id, args.calls, per_call_check=False),
+            "call(), per-call check": asyncio.run(
+                _drive(gateway, organization_id, args.calls, per_call_check=True)
+            ),
+            "call(), ledger": asyncio.run(
+                _drive(gateway, organization_id, args.calls, per_call_check=False)
+            ),
+        }
+        print()
+        print(f"{'path':<28} {'calls':>7} {'seconds':>9} {'us/call':>10}")
+        for label, seconds in results.items():
+            print(f"{label:<28} {args.calls:>7} {seconds:>9.2f} {seconds / args.calls * 1e6:>10.0f}")
+    finally:
+        http_client_mod._reset_for_testing()
+        if not args.keep:
+            _cleanup(db, organization_id)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Benchmark org-scoped DB round trips per processed invoice.
+
+Replays the organization lookups one invoice makes on its way through
+intake, validation, approval routing and posting, ``--invoices`` times
+for a throwaway organisation, and counts ``db.connect()`` checkouts
+(one per store call) and wall time two ways:
+
+* **uncached** — ``OrgCache(ttl_seconds=0)``: every lookup reads
+  Postgres, as before the cache.
+* **cached** — the default cache; after the first invoice the lookups
+  are served from process memory.
+
+The replayed sequence per invoice (from the call sites in
+``invoice_workflow``, ``invoice_validation``, ``finance_runtime_invoice_processing``,
+``erp_router`` and ``sla_tracker``):
+
+* ``get_org_config`` once, ``get_organization`` three times;
+* ``SubscriptionService.check_limit`` and ``increment_usage`` (each
+  resolves the subscription; ``increment_usage`` also writes);
+* ``get_erp_connection`` twice (validation and posting);
+* the SLA tier lookup (``get_subscription_record``).
+
+Usage
+-----
+    DATABASE_URL=postgresql://localhost/clearledgr_bench \\
+        python scripts/bench_org_cache.py --invoices 500
+
+The seeded org (``bench-orgc-<hex>``) is deleted on exit unless
+``--keep`` is passed. Never point this at a production database.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import solden.core.org_cache as org_cache_mod  # noqa: E402
+from solden.core.database import get_db  # noqa: E402
+from solden.core.org_cache import OrgCache  # noqa: E402
+from solden.core.org_config import get_org_config  # noqa: E402
+from solden.integrations.erp_router import get_erp_connection  # noqa: E402
+from solden.services.subscription import SubscriptionService  # noqa: E402
+
+
+class _CountingDB:
+    """Counts connection checkouts on ``db`` while installed."""
+
+    def __init__(self, db):
+        self.db = db
+        self.count = 0
+        self._connect = db.connect
+
+    def __enter__(self):
+        def _counted():
+            self.count += 1
+            return self._connect()
+
+        self.db.connect = _counted
+        return self
+
+    def __exit__(self, *exc):
+        del self.db.connect
+
+
+def _one_invoice(db, subscriptions: SubscriptionService, organization_id: str) -> None:
+    get_org_config(organization_id)
+    for _ in range(3):
+        db.get_organization(organization_id)
+    subscriptions.check_limit(organization_id, "invoices_per_month", 0)
+    subscriptions.increment_usage(organization_id, "invoices_this_month")
+    get_erp_connection(organization_id)
+    get_erp_connection(organization_id)
+    db.get_subscription_record(organization_id)
+
+
+def _run(db, organization_id: str, invoices: int, ttl_seconds: Optional[float]) -> tuple:
+    org_cache_mod._caches[db.dsn or ""] = OrgCache(ttl_seconds=ttl_seconds)
+    subscriptions = SubscriptionService()
+    with _CountingDB(db) as counter:
+        started = time.perf_counter()
+        for _ in range(invoices):
+            _one_invoice(db, subscriptions, organization_id)
+        elapsed = time.perf_counter() - started
+    return counter.count, elapsed, org_cache_mod._caches[db.dsn or ""].metrics_snapshot()
+
+
+def _cleanup(db, organization_id: str) -> None:
+    with db.connect() as conn:
+        cur = conn.cursor()
+        for table in ("erp_connections", "subscriptions"):
+            cur.execute(f"DELETE FROM {table} WHERE organization_id = %s", (organization_id,))
+        cur.execute("DELETE FROM organizations WHERE id = %s", (organization_id,))
+        conn.commit()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invoices", type=int, default=500, help="Invoices to replay per mode (default 500)")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark org instead of deleting it")
+    args = parser.parse_args(argv)
+
+    db = get_db()
+    db.initialize()
+    organization_id = f"bench-orgc-{uuid.uuid4().hex[:8]}"
+    db.ensure_organization(organization_id, organization_name="Org cache bench")
+    db.save_erp_connection(organization_id, "xero", access_token="bench", tenant_id="bench")
+    try:
+        rows = []
+        for label, ttl in (("uncached", 0.0), ("cached", None)):
+            queries, elapsed, snapshot = _run(db, organization_id, args.invoices, ttl)
+            rows.append((label, queries, elapsed, snapshot))
+        print(f"{'mode':<10} {'queries/invoice':>16} {'ms/invoice':>12}")
+        for label, queries, elapsed, _snapshot in rows:
+            print(
+                f"{label:<10} {queries / args.invoices:>16.2f} "
+                f"{elapsed * 1000 / args.invoices:>12.2f}"
+            )
+        print("cache counters:", rows[-1][3]["namespaces"])
+    finally:
+        if not args.keep:
+            _cleanup(db, organization_id)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Benchmark SLA metric ingestion and summary: per-row vs buffered.
+
+Records ``--records`` measurements for a throwaway organisation two
+ways:
+
+* **per-row** — the pre-buffering path: a tier lookup plus one
+  ``INSERT INTO ap_sla_metrics`` and commit per measurement, on the
+  caller's thread.
+* **buffered** — ``SLATracker.record`` (tier cache + queue append) with
+  the caller-side cost timed separately from the ``flush`` that writes
+  the batch (``COPY`` + rollup upsert).
+
+Then times ``get_summary`` over the raw rows (old ``GROUP BY`` scan)
+against the per-minute rollup.
+
+Usage
+-----
+    DATABASE_URL=postgresql://localhost/clearledgr_bench \\
+        python scripts/bench_sla_ingestion.py --records 20000
+
+The seeded org (``bench-sla-<hex>``) and its rows are deleted on exit
+unless ``--keep`` is passed. Never point this at a production database.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from solden.core.database import get_db  # noqa: E402
+from solden.core.sla_tracker import SLA_TARGETS_MS, SLATracker  # noqa: E402
+
+_STEPS = list(SLA_TARGETS_MS)
+
+
+def _per_row(db, organization_id: str, samples: List[tuple]) -> float:
+    started = time.perf_counter()
+    for step, latency in samples:
+        db.get_subscription_record(organization_id)
+        with db.connect() as conn:
+            conn.execute(
+                "INSERT INTO ap_sla_metrics "
+                "(id, ap_item_id, organization_id, step_name, latency_ms, breached, created_at) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                (
+                    f"SLA-{uuid.uuid4().hex[:12]}", None, organization_id, step, latency,
+                    1 if latency > SLA_TARGETS_MS[step]["starter"] else 0,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            conn.commit()
+    return time.perf_counter() - started
+
+
+def _old_summary(db, organization_id: str, hours: int) -> float:
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+    started = time.perf_counter()
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT step_name, COUNT(*) as total, "
+            "AVG(latency_ms) as avg_ms, MAX(latency_ms) as max_ms, "
+            "SUM(CASE WHEN breached = 1 THEN 1 ELSE 0 END) as breached_count "
+            "FROM ap_sla_metrics "
+            "WHERE organization_id = %s AND created_at >= %s "
+            "GROUP BY step_name",
+            (organization_id, cutoff),
+        )
+        cur.fetchall()
+    return time.perf_counter() - started
+
+
+def _cleanup(db, organization_id: str) -> None:
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM ap_sla_metrics WHERE organization_id = %s", (organization_id,))
+        cur.execute("DELETE FROM ap_sla_metrics_rollup WHERE organization_id = %s", (organization_id,))
+        conn.commit()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000, help="Measurements per mode (default 20000)")
+    parser.add_argument("--seed", type=int, default=7, help="RNG seed for step / latency samples")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark rows instead of deleting them")
+    args = parser.parse_args(argv)
+
+    # Synthetic latencies breach often; the per-breach warnings are noise here.
+    logging.getLogger("solden.core.sla_tracker").setLevel(logging.ERROR)
+    db = get_db()
+    db.initialize()
+    organization_id = f"bench-sla-{uuid.uuid4().hex[:8]}"
+    rng = random.Random(args.seed)
+    samples = [
+        (step, int(rng.expovariate(1.0 / (SLA_TARGETS_MS[step]["starter"] * 0.6))))
+        for step in (rng.choice(_STEPS) for _ in range(args.records))
+    ]
+    tracker = SLATracker(db=db, background=False)
+    try:
+        per_row = _per_row(db, organization_id, samples)
+
+        started = time.perf_counter()
+        for step, latency in samples:
+            tracker.record(step, latency, organization_id=organization_id)
+        record_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        tracker.flush()
+        flush_seconds = time.perf_counter() - started
+
+        old_summary = min(_old_summary(db, organization_id, 24) for _ in range(5))
+        rollup_summary = float("inf")
+        for _ in range(5):
+            started = time.perf_counter()
+            tracker.get_summary(organization_id, 24)
+            rollup_summary = min(rollup_summary, time.perf_counter() - started)
+
+        n = args.records
+        print(f"records={n} (raw rows in table: {2 * n})")
+        print(f"{'path':<28} {'seconds':>9} {'us/record':>10}")
+        print(f"{'per-row insert':<28} {per_row:>9.2f} {per_row / n * 1e6:>10.0f}")
+        print(f"{'buffered record (caller)':<28} {record_seconds:>9.2f} {record_seconds / n * 1e6:>10.1f}")
+        print(f"{'buffered flush (COPY)':<28} {flush_seconds:>9.2f} {flush_seconds / n * 1e6:>10.1f}")
+        print()
+        print(f"{'summary':<28} {'ms':>9}")
+        print(f"{'raw GROUP BY':<28} {old_summary * 1000:>9.2f}")
+        print(f"{'rollup':<28} {rollup_summary * 1000:>9.2f}")
+    finally:
+        tracker.close(flush=False)
+        if not args.keep:
+            _cleanup(db, organization_id)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
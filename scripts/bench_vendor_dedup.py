@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Benchmark index-backed vendor dedup against the full-corpus scan.
+
+Builds a synthetic vendor master of ``--vendors`` names (brand + common
+industry words + legal suffix, with a share of typo / casing variants
+planted as true duplicates), then times the dedup query loop both ways:
+
+* **indexed** — one :class:`VendorNameIndex` build, then
+  :func:`find_indexed_matches` per profile with the dedup shortlist
+  settings. Run over the whole corpus.
+* **full scan** — :func:`find_candidate_matches` with
+  ``shortlist_size=None`` per profile, i.e. the pre-index behaviour.
+  Timed on ``--scan-sample`` queries and extrapolated: at 50k vendors
+  it would run for days.
+
+Also reports how many planted duplicate pairs the indexed path puts in
+each other's top-K (the recall that matters for mutual top-K dedup).
+Pure Python, no database — the DB load is one ``SELECT`` either way.
+
+Usage
+-----
+    python scripts/bench_vendor_dedup.py --vendors 50000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from solden.services.vendor_dedup import (  # noqa: E402
+    DEDUP_SHORTLIST_SIZE,
+    DEDUP_TRIGRAM_FLOOR,
+    DEFAULT_TOP_K,
+)
+from solden.services.vendor_name_index import VendorNameIndex  # noqa: E402
+from solden.services.vendor_search import (  # noqa: E402
+    find_candidate_matches,
+    find_indexed_matches,
+)
+
+_COMMON_WORDS = (
+    "Global", "Logistics", "Solutions", "Services", "Consulting", "Group",
+    "Holdings", "Systems", "Partners", "Technologies", "Supply", "Trading",
+    "International", "Foods", "Media", "Energy", "Capital", "Industries",
+)
+_SUFFIXES = ("Inc", "LLC", "Ltd", "GmbH", "Corp", "Co", "", "", "")
+
+
+def _synthetic_vendors(n: int, seed: int) -> Tuple[List[str], List[Tuple[int, int]]]:
+    rng = random.Random(seed)
+    syllables = [
+        c + v + e
+        for c in "bcdfghjklmnprstvwxz" for v in "aeiouy" for e in ("", "n", "r", "l", "x", "s")
+    ]
+
+    def word(lo: int, hi: int) -> str:
+        return "".join(rng.choice(syllables) for _ in range(rng.randint(lo, hi))).capitalize()
+
+    names: List[str] = []
+    planted: List[Tuple[int, int]] = []
+    while len(names) < n:
+        parts = [word(2, 4)]
+        if rng.random() < 0.5:
+            parts.append(word(2, 3))
+        parts.extend(rng.choice(_COMMON_WORDS) for _ in range(rng.randint(0, 2)))
+        suffix = rng.choice(_SUFFIXES)
+        if suffix:
+            parts.append(suffix)
+        name = " ".join(parts)
+        names.append(name)
+        if rng.random() < 0.08 and len(names) < n:
+            chars = list(name)
+            i = rng.randrange(1, len(chars))
+            roll = rng.random()
+            if roll < 0.4:
+                chars[i], chars[i - 1] = chars[i - 1], chars[i]
+            elif roll < 0.7:
+                chars.insert(i, rng.choice("aeiour"))
+            else:
+                chars = list(name.upper() + " Inc")
+            names.append("".join(chars))
+            planted.append((len(names) - 2, len(names) - 1))
+    return names, planted
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vendors", type=int, default=50_000, help="Vendor names to generate (default 50000)")
+    parser.add_argument("--scan-sample", type=int, default=20, help="Queries to time on the full-scan path (default 20)")
+    parser.add_argument("--seed", type=int, default=7, help="RNG seed for the synthetic vendor master")
+    args = parser.parse_args(argv)
+
+    names, planted = _synthetic_vendors(args.vendors, args.seed)
+    records = [{"vendor_name": name, "_rrf_idx": i} for i, name in enumerate(names)]
+
+    started = time.perf_counter()
+    index = VendorNameIndex.from_records(records, key_field="_rrf_idx")
+    build_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    top_k = {}
+    for record in records:
+        matches = find_indexed_matches(
+            record["vendor_name"], index,
+            k=DEFAULT_TOP_K,
+            shortlist_size=DEDUP_SHORTLIST_SIZE,
+            exclude=record["_rrf_idx"],
+            min_trigram=DEDUP_TRIGRAM_FLOOR,
+        )
+        top_k[record["_rrf_idx"]] = {m.candidate_record["_rrf_idx"] for m in matches}
+    query_seconds = time.perf_counter() - started
+    mutual = sum(1 for a, b in planted if b in top_k[a] and a in top_k[b])
+
+    sample = records[: max(1, min(args.scan_sample, len(records)))]
+    started = time.perf_counter()
+    for record in sample:
+        corpus = [r for r in records if r["_rrf_idx"] != record["_rrf_idx"]]
+        find_candidate_matches(record["vendor_name"], corpus, k=DEFAULT_TOP_K, shortlist_size=None)
+    scan_per_query = (time.perf_counter() - started) / len(sample)
+
+    print(f"vendors={len(names)} planted duplicate pairs={len(planted)}")
+    print(f"{'path':<22} {'seconds':>12}")
+    print(f"{'index build':<22} {build_seconds:>12.2f}")
+    print(f"{'indexed queries':<22} {query_seconds:>12.2f}")
+    print(f"{'full scan (projected)':<22} {scan_per_query * len(records):>12.0f}")
+    if planted:
+        print(f"planted pairs found mutually in top-{DEFAULT_TOP_K}: {mutual}/{len(planted)} "
+              f"({mutual / len(planted):.1%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
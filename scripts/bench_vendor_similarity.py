@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark batch vs scalar vendor similarity scoring.
+
+Scores ``--queries`` vendor names against a ``--vendors``-name synthetic
+vendor master (same generator as ``bench_vendor_dedup.py``: brands,
+shared industry words, legal suffixes, typo / casing variants) two
+ways:
+
+* **scalar** — ``[vendor_similarity_modes(q, n) for n in names]``, the
+  per-pair path that re-normalizes both names and runs pure-Python
+  Wagner-Fischer Levenshtein.
+* **batch** — :func:`vendor_similarity_modes_batch` over an
+  :class:`EncodedVendorNames` built once (the encode time is reported
+  separately).
+
+Every batch result is compared with the scalar one; the run fails if
+any score differs.
+
+Usage
+-----
+    python scripts/bench_vendor_similarity.py --vendors 10000 --queries 20
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench_vendor_dedup import _synthetic_vendors  # noqa: E402
+
+from solden.services.fuzzy_matching import (  # noqa: E402
+    EncodedVendorNames,
+    vendor_similarity_modes,
+    vendor_similarity_modes_batch,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vendors", type=int, default=10_000, help="Corpus size (default 10000)")
+    parser.add_argument("--queries", type=int, default=20, help="Queries to score (default 20)")
+    parser.add_argument("--seed", type=int, default=7, help="RNG seed for the synthetic vendor master")
+    args = parser.parse_args(argv)
+
+    names, _ = _synthetic_vendors(args.vendors, args.seed)
+    queries = random.Random(args.seed).sample(names, min(args.queries, len(names)))
+
+    started = time.perf_counter()
+    corpus = EncodedVendorNames(names)
+    encode_seconds = time.perf_counter() - started
+
+    scalar_seconds = batch_seconds = 0.0
+    mismatches = 0
+    for query in queries:
+        started = time.perf_counter()
+        expected = [vendor_similarity_modes(query, name) for name in names]
+        scalar_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        got = vendor_similarity_modes_batch(query, corpus)
+        batch_seconds += time.perf_counter() - started
+
+        mismatches += sum(1 for a, b in zip(expected, got) if a != b)
+
+    n = len(queries)
+    print(f"vendors={len(names)} queries={n}")
+    print(f"{'path':<16} {'total s':>10} {'ms/query':>10}")
+    print(f"{'encode (once)':<16} {encode_seconds:>10.2f}")
+    print(f"{'scalar':<16} {scalar_seconds:>10.2f} {scalar_seconds / n * 1000:>10.1f}")
+    print(f"{'batch':<16} {batch_seconds:>10.2f} {batch_seconds / n * 1000:>10.1f}")
+    print(f"speedup x{scalar_seconds / batch_seconds:.1f}; mismatched scores: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
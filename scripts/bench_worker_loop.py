@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Benchmark event execution: asyncio.run per event vs persistent worker loops.
+
+Runs ``--events`` simulated agent events on ``--threads`` worker
+threads (a Celery threads pool / the event-stream consumer). Each event
+makes ``--calls`` requests through the shared
+``solden.core.http_client`` client to a local HTTP server that counts
+the TCP connections it accepts, then reports per-event latency
+(p50/p99) and connections opened per 1k events for:
+
+* **asyncio.run** — the old bridge: a fresh loop per event, so the
+  shared client's pool is rebuilt every time;
+* **worker-loop** — ``run_on_worker_loop``: one persistent loop (and
+  HTTP pool) per thread.
+
+The local server is plain HTTP on loopback, so the connect cost shown
+is the floor; against Gmail / ERPs / the model API each new connection
+also pays a TLS handshake of one or two RTTs.
+
+Usage
+-----
+    python scripts/bench_worker_loop.py --events 1000 --threads 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from solden.core import http_client  # noqa: E402
+from solden.core.worker_loop import run_on_worker_loop  # noqa: E402
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def _event(url: str, calls: int) -> None:
+    client = http_client.get_http_client()
+    for _ in range(calls):
+        resp = await client.get(url)
+        resp.raise_for_status()
+
+
+def _run(mode: str, url: str, events: int, threads: int, calls: int) -> List[float]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def one(_i: int) -> None:
+        started = time.perf_counter()
+        if mode == "asyncio.run":
+            asyncio.run(_event(url, calls))
+        else:
+            run_on_worker_loop(_event(url, calls))
+        elapsed = (time.perf_counter() - started) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(one, range(events)))
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=3, help="HTTP calls per event")
+    args = parser.parse_args()
+
+    server = _CountingServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    try:
+        for mode in ("asyncio.run", "worker-loop"):
+            http_client._reset_for_testing()
+            server.connections = 0
+            started = time.perf_counter()
+            latencies = sorted(_run(mode, url, args.events, args.threads, args.calls))
+            wall = time.perf_counter() - started
+            p50 = statistics.median(latencies)
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            print(
+                f"{mode:12}: p50 {p50:6.2f}ms  p99 {p99:6.2f}ms  "
+                f"{server.connections * 1000 / args.events:7.1f} conns/1k events  "
+                f"{args.events / wall:6.0f} ev/s"
+            )
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,10 @@ export CLEARLEDGR_PROCESS_ROLE="${CLEARLEDGR_PROCESS_ROLE:-worker}"
 # §11.2.1: Celery worker fleet — stateless processes consuming from Redis Streams.
 # Falls back to legacy async worker if Celery is not available.
 if python3 -c "import celery" 2>/dev/null; then
-    exec celery -A solden.services.celery_app worker -l info -c "${CELERY_CONCURRENCY:-4}"
+    # CELERY_POOL=threads runs tasks on threads of one process; each
+    # thread keeps its own persistent event loop (solden.core.worker_loop).
+    exec celery -A solden.services.celery_app worker -l info \
+        --pool "${CELERY_POOL:-prefork}" -c "${CELERY_CONCURRENCY:-4}"
 else
     echo "WARNING: celery not installed, falling back to legacy async worker"
     exec python3 -m solden.services.worker_runtime
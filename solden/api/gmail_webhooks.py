@@ -32,6 +32,7 @@ from solden.core.errors import safe_error
 from solden.core.models import FinanceEmail
 from solden.services.gmail_api import (
     GmailAPIClient,
+    GmailMessage,
     GmailWatchService,
     token_store,
     exchange_code_for_tokens,
@@ -903,9 +904,10 @@ async def _process_label_changes(
         logger.warning("[LabelSync] list_labels failed: %s", exc)
         return
 
-    enqueued = 0
+    # Records carrying a Solden action label, then their AP boxes in
+    # one query and their events in one enqueue.
+    actionable = []
     for rec in records:
-        message_id = rec.get("message_id") or ""
         thread_id = rec.get("thread_id") or ""
         label_ids = rec.get("label_ids") or []
         if not thread_id or not label_ids:
@@ -920,20 +922,26 @@ async def _process_label_changes(
                 break
         if not action_label:
             continue
-
-        # Only act if the thread has an AP box in this org.
-        try:
-            box = db.get_ap_item_by_thread(organization_id, thread_id)
-        except Exception:
-            box = None
-        if not box:
-            continue
-
         intent = intent_for_label(action_label)
         if not intent:
             continue
+        actionable.append((rec.get("message_id") or "", thread_id, action_label, intent))
+
+    if not actionable:
+        return
+
+    # Only act if the thread has an AP box in this org.
+    try:
+        boxes = db.get_ap_items_by_threads(organization_id, [thread_id for _, thread_id, _, _ in actionable])
+    except Exception:
+        boxes = {}
 
-        event = AgentEvent(
+    events = []
+    for message_id, thread_id, action_label, intent in actionable:
+        box = boxes.get(thread_id)
+        if not box:
+            continue
+        events.append(AgentEvent(
             type=AgentEventType.LABEL_CHANGED,
             source="gmail_label_sync",
             payload={
@@ -946,13 +954,17 @@ async def _process_label_changes(
             },
             organization_id=organization_id,
             idempotency_key=f"label:{action_label}:{message_id}",
-        )
-        result = queue.enqueue(event)
+        ))
+    if not events:
+        return
+
+    enqueued = 0
+    for event, result in zip(events, queue.enqueue_many(events)):
         if result != "duplicate":
             enqueued += 1
             logger.info(
                 "[LabelSync] Enqueued LABEL_CHANGED: box=%s label=%s intent=%s",
-                box.get("id"), action_label, intent,
+                event.payload["box_id"], event.payload["label_name"], event.payload["intent"],
             )
 
     if enqueued > 0:
@@ -1040,84 +1052,104 @@ async def process_gmail_notification(email_address: str, history_id: str, push_r
 
         # §2: Enqueue events to durable queue instead of inline processing
         from solden.core.events import AgentEvent, AgentEventType
-        from solden.core.event_queue import get_event_queue
+        from solden.core.event_queue import EnqueueManyError, get_event_queue
 
         queue = get_event_queue()
-        enqueued = 0
         db = get_db()
+        message_ids = list(dict.fromkeys(message_ids))
+
+        # §2.2: Detect replies on watched threads (vendor responses) vs
+        # new email. One Gmail batch request per 50 messages for the
+        # thread ids, one query for the Boxes those threads belong to,
+        # one pipeline for the enqueues. Any lookup failure falls back
+        # to EMAIL_RECEIVED for the affected messages.
+        metadata: Dict[str, GmailMessage] = {}
+        existing_by_thread: Dict[str, Dict[str, Any]] = {}
+        if message_ids:
+            try:
+                metadata = await client.batch_get_messages(message_ids, format="metadata")
+            except Exception as exc:
+                logger.warning("Gmail batch metadata fetch failed for %s: %s", email_address, exc)
+            thread_ids = [getattr(msg, "thread_id", "") or "" for msg in metadata.values()]
+            try:
+                existing_by_thread = db.get_ap_items_by_threads(organization_id, thread_ids)
+            except Exception as exc:
+                logger.warning("Thread lookup failed for %s: %s", email_address, exc)
+
+        events = []
         for message_id in message_ids:
+            thread_id_for_event = getattr(metadata.get(message_id), "thread_id", "") or ""
+            existing_item = existing_by_thread.get(thread_id_for_event) if thread_id_for_event else None
+            event_type = (
+                AgentEventType.VENDOR_RESPONSE_RECEIVED if existing_item
+                else AgentEventType.EMAIL_RECEIVED
+            )
+            events.append(AgentEvent(
+                type=event_type,
+                source="gmail_pubsub",
+                payload={
+                    "message_id": message_id,
+                    "thread_id": thread_id_for_event,
+                    "mailbox": email_address,
+                    "user_id": token.user_id,
+                    "vendor_id": (existing_item or {}).get("vendor_name", ""),
+                },
+                organization_id=organization_id,
+                idempotency_key=message_id,
+            ))
+
+        try:
+            results = queue.enqueue_many(events) if events else []
+        except Exception as e:
+            # Fallback: process inline if queue unavailable. Events
+            # confirmed before a part-way failure are already in the
+            # stream; only the rest (one event per message, in order)
+            # run here.
+            results = e.results if isinstance(e, EnqueueManyError) else []
+            inline_ids = message_ids[len(results):]
+            logger.warning(
+                "Event queue unavailable, processing %d/%d inline: %s",
+                len(inline_ids), len(message_ids), e,
+            )
             try:
-                # §2.2: Detect if this is a reply on a watched thread (vendor response)
-                # vs a new email. Check if thread belongs to existing Box.
-                event_type = AgentEventType.EMAIL_RECEIVED
-                thread_id_for_event = ""
-                # Pre-fix ``existing_item`` was bound only inside the
-                # inner try when the message had a thread AND the DB
-                # lookup succeeded. When either condition failed, the
-                # reference at the AgentEvent payload below raised
-                # ``NameError`` — silently swallowed by the outer
-                # try/except, dropping every per-message branch into
-                # the inline-LLM fallback. Initialising to None makes
-                # the fallthrough explicit + correct.
-                existing_item = None
-                try:
-                    # Fetch thread_id from the message
-                    msg_meta = await client.get_message(message_id, format="metadata")
-                    thread_id_for_event = getattr(msg_meta, "thread_id", "") or ""
-                    if thread_id_for_event:
-                        existing_item = db.get_ap_item_by_thread(organization_id, thread_id_for_event)
-                        if existing_item:
-                            # This is a reply on a watched thread — vendor response
-                            event_type = AgentEventType.VENDOR_RESPONSE_RECEIVED
-                except Exception:
-                    pass  # Fall back to EMAIL_RECEIVED
-
-                event = AgentEvent(
-                    type=event_type,
-                    source="gmail_pubsub",
-                    payload={
-                        "message_id": message_id,
-                        "thread_id": thread_id_for_event,
-                        "mailbox": email_address,
-                        "user_id": token.user_id,
-                        "vendor_id": (
-                            (existing_item or {}).get("vendor_name", "")
-                            if event_type == AgentEventType.VENDOR_RESPONSE_RECEIVED
-                            else ""
-                        ),
-                    },
-                    organization_id=organization_id,
-                    idempotency_key=message_id,
-                )
-                result = queue.enqueue(event)
-                if result != "duplicate":
-                    enqueued += 1
-                    # §11: Record email_receipt_to_queue SLA latency
-                    if push_receipt_ts is not None:
-                        try:
-                            import time as _t
-                            from solden.core.sla_tracker import get_sla_tracker
-                            latency_ms = int((_t.monotonic() - push_receipt_ts) * 1000)
-                            get_sla_tracker().record(
-                                "email_receipt_to_queue", latency_ms,
-                                ap_item_id=message_id,
-                                organization_id=organization_id,
-                            )
-                        except Exception:
-                            pass
-            except Exception as e:
-                # Fallback: process inline if queue unavailable
-                logger.warning("Event queue unavailable, processing inline: %s", e)
+                full_messages = await client.batch_get_messages(inline_ids)
+            except Exception as fetch_exc:
+                logger.warning("Gmail batch fetch failed, fetching per message: %s", fetch_exc)
+                full_messages = {}
+            for message_id in inline_ids:
                 try:
                     await process_single_email(
                         client=client,
                         message_id=message_id,
                         user_id=token.user_id,
                         organization_id=organization_id,
+                        message=full_messages.get(message_id),
                     )
                 except Exception as inner_e:
                     logger.error(f"Error processing message {message_id}: {inner_e}")
 
+        enqueued_ids = [
+            event.payload["message_id"]
+            for event, result in zip(events, results)
+            if result != "duplicate"
+        ]
+        enqueued = len(enqueued_ids)
+        # §11: Record email_receipt_to_queue SLA latency
+        if enqueued_ids and push_receipt_ts is not None:
+            try:
+                import time as _t
+                from solden.core.sla_tracker import get_sla_tracker
+                latency_ms = int((_t.monotonic() - push_receipt_ts) * 1000)
+                tracker = get_sla_tracker()
+                for message_id in enqueued_ids:
+                    tracker.record(
+                        "email_receipt_to_queue", latency_ms,
+                        ap_item_id=message_id,
+                        organization_id=organization_id,
+                    )
+            except Exception:
+                pass
+
         # Events are now in the Redis Stream. Celery workers consume from
         # the stream via the Beat-scheduled reclaim task + direct stream
         # consumers. No direct Celery dispatch needed — that would cause
@@ -1166,12 +1198,17 @@ async def process_single_email(
     message_id: str,
     user_id: str,
     organization_id: str,
+    message: Optional[GmailMessage] = None,
 ):
     """
     Process a single email autonomously.
+
+    ``message`` is the already-fetched full message (e.g. from
+    ``GmailAPIClient.batch_get_messages``); fetched here when omitted.
     """
     # Fetch the full message
-    message = await client.get_message(message_id)
+    if message is None:
+        message = await client.get_message(message_id)
     
     db = get_db()
 
@@ -117,8 +117,8 @@ def _runtime_health_snapshot() -> Dict[str, Any]:
                 break
         snapshot["event_queue_ready"] = ok
 
-        # Beat heartbeat: Celery Beat writes a key each tick (via the
-        # drain-event-stream scheduled task's monotonic timestamp).
+        # Beat heartbeat: Celery Beat writes a key every 30s (via the
+        # beat-heartbeat scheduled task).
         # If nothing has been written in 5+ minutes, Beat is likely dead.
         heartbeat_key = "clearledgr:beat:last-tick"
         try:
@@ -392,7 +392,7 @@ async def get_llm_cost_summary(
                     "       COALESCE(SUM(cost_estimate_usd), 0) AS cost, "
                     "       COALESCE(SUM(CASE WHEN error IS NOT NULL AND error != '' THEN 1 ELSE 0 END), 0) AS errs "
                     "FROM llm_call_log "
-                    "WHERE organization_id = %s AND created_at >= %s"
+                    "WHERE organization_id = %s AND created_at_tz >= %s::timestamptz"
                 ),
                 (organization_id, cutoff),
             )
@@ -421,7 +421,7 @@ async def get_llm_cost_summary(
                     "       COALESCE(SUM(output_tokens), 0) AS output_tok, "
                     "       COALESCE(SUM(cost_estimate_usd), 0) AS cost "
                     "FROM llm_call_log "
-                    "WHERE organization_id = %s AND created_at >= %s "
+                    "WHERE organization_id = %s AND created_at_tz >= %s::timestamptz "
                     "GROUP BY action "
                     "ORDER BY cost DESC"
                 ),
@@ -446,15 +446,15 @@ async def get_llm_cost_summary(
                         "cost_usd": round(float(row[4] or 0.0), 4),
                     })
 
-            # Per-day trend (substr(created_at, 1, 10) = 'YYYY-MM-DD')
+            # Per-day trend, bucketed by UTC calendar day ('YYYY-MM-DD')
             cur.execute(
                 (
-                    "SELECT substr(created_at, 1, 10) AS day, "
+                    "SELECT to_char(created_at_tz AT TIME ZONE 'UTC', 'YYYY-MM-DD') AS day, "
                     "       COUNT(*) AS n, "
                     "       COALESCE(SUM(cost_estimate_usd), 0) AS cost "
                     "FROM llm_call_log "
-                    "WHERE organization_id = %s AND created_at >= %s "
-                    "GROUP BY substr(created_at, 1, 10) "
+                    "WHERE organization_id = %s AND created_at_tz >= %s::timestamptz "
+                    "GROUP BY day "
                     "ORDER BY day ASC"
                 ),
                 (organization_id, cutoff),
@@ -493,6 +493,31 @@ async def get_ap_kpis(
     return {"kpis": kpis}
 
 
+@router.get("/ap-kpis/summary")
+async def get_ap_kpi_summary(
+    organization_id: Optional[str] = Query(default=None),
+    user: TokenData = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Headline AP KPIs (state counts, touchless, exceptions, cycle
+    time, missed discounts) read straight from the KPI rollup."""
+    organization_id = _assert_org_access(user, organization_id)
+    db = get_db()
+    return {"summary": db.get_ap_kpi_summary(organization_id)}
+
+
+@router.post("/ap-kpis/reconcile")
+async def reconcile_ap_kpis(
+    organization_id: Optional[str] = Query(default=None),
+    user: TokenData = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Recompute the org's KPI rollup from ``ap_items`` now and report
+    what drifted. Admin or owner role required."""
+    _require_admin(user)
+    organization_id = _assert_org_access(user, organization_id)
+    db = get_db()
+    return {"reconciliation": db.reconcile_ap_kpi_rollup(organization_id)}
+
+
 @router.get("/ap-kpis/digest")
 async def get_ap_kpi_digest(
     organization_id: Optional[str] = Query(default=None),
@@ -756,7 +781,7 @@ async def get_extraction_quality(
         sql = (
             "SELECT * FROM audit_events WHERE organization_id = %s "
             "AND event_type IN ('correction_applied','field_correction','extraction_correction') "
-            "AND ts >= %s ORDER BY ts DESC LIMIT 5000"
+            "AND ts_tz >= %s::timestamptz ORDER BY ts_tz DESC LIMIT 5000"
         )
         try:
             with db.connect() as conn:
@@ -785,7 +810,7 @@ async def get_extraction_quality(
     else:
         try:
             sql2 = (
-                "SELECT COUNT(*) as cnt FROM ap_items WHERE organization_id = %s AND created_at >= %s"
+                "SELECT COUNT(*) as cnt FROM ap_items WHERE organization_id = %s AND created_at_tz >= %s::timestamptz"
             )
             with db.connect() as conn:
                 cur = conn.cursor()
@@ -809,7 +834,7 @@ async def get_extraction_quality(
     try:
         sql_fc = (
             "SELECT field_confidences FROM ap_items "
-            "WHERE organization_id = %s AND created_at >= %s "
+            "WHERE organization_id = %s AND created_at_tz >= %s::timestamptz "
             "AND field_confidences IS NOT NULL LIMIT 2000"
         )
         with db.connect() as conn:
@@ -918,7 +943,7 @@ def _evaluate_monitoring_thresholds(
         "SELECT event_type FROM audit_events "
         "WHERE organization_id = %s "
         "AND event_type IN ('erp_post_attempted', 'erp_post_failed') "
-        "AND ts >= %s"
+        "AND ts_tz >= %s::timestamptz"
     )
     try:
         with db.connect() as conn:
@@ -938,7 +963,7 @@ def _evaluate_monitoring_thresholds(
     exception_count = 0
     total_active = 0
     _state_sql = (
-        "SELECT state FROM ap_items WHERE organization_id = %s AND created_at >= %s"
+        "SELECT state FROM ap_items WHERE organization_id = %s AND created_at_tz >= %s::timestamptz"
     )
     _exception_states = {"exception", "failed_post", "needs_info"}
     _active_states = {
@@ -966,10 +991,10 @@ def _evaluate_monitoring_thresholds(
         "SELECT COUNT(*) AS cnt FROM audit_events "
         "WHERE organization_id = %s "
         "AND event_type IN ('correction_applied','field_correction','extraction_correction') "
-        "AND ts >= %s"
+        "AND ts_tz >= %s::timestamptz"
     )
     _total_sql = (
-        "SELECT COUNT(*) AS cnt FROM ap_items WHERE organization_id = %s AND created_at >= %s"
+        "SELECT COUNT(*) AS cnt FROM ap_items WHERE organization_id = %s AND created_at_tz >= %s::timestamptz"
     )
     try:
         with db.connect() as conn:
@@ -990,7 +1015,7 @@ def _evaluate_monitoring_thresholds(
         "SELECT COUNT(*) AS cnt FROM audit_events "
         "WHERE organization_id = %s "
         "AND event_type IN ('duplicate_post_detected', 'idempotency_key_collision') "
-        "AND ts >= %s"
+        "AND ts_tz >= %s::timestamptz"
     )
     try:
         with db.connect() as conn:
@@ -1120,7 +1145,7 @@ async def get_ap_decision_health(
     try:
         sql = (
             "SELECT metadata, state FROM ap_items "
-            "WHERE organization_id = %s AND created_at >= %s LIMIT 10000"
+            "WHERE organization_id = %s AND created_at_tz >= %s::timestamptz LIMIT 10000"
         )
         with db.connect() as conn:
             cur = conn.cursor()
@@ -1155,7 +1180,7 @@ async def get_ap_decision_health(
     try:
         sql2 = (
             "SELECT COUNT(*) as cnt FROM audit_events "
-            "WHERE organization_id = %s AND event_type = 'ap_decision_override' AND ts >= %s"
+            "WHERE organization_id = %s AND event_type = 'ap_decision_override' AND ts_tz >= %s::timestamptz"
         )
         with db.connect() as conn:
             cur = conn.cursor()
@@ -1450,6 +1475,21 @@ async def skip_retry_job(
     }
 
 
+@router.get("/org-cache")
+async def get_org_cache_stats(
+    user: TokenData = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Hit / miss / invalidation counters of this process's org cache.
+
+    Counters are per process and carry no tenant data. Admin or owner
+    role required.
+    """
+    _require_admin(user)
+    from solden.core.org_cache import get_org_cache
+
+    return {"org_cache": get_org_cache(getattr(get_db(), "dsn", None)).metrics_snapshot()}
+
+
 @router.post("/llm-budget/reset")
 async def reset_llm_budget_pause(
     organization_id: str = Query(..., description="Organization whose LLM budget pause to clear"),
@@ -1482,6 +1522,10 @@ async def reset_llm_budget_pause(
             status_code=500,
             detail=f"failed_to_clear_pause: {exc}",
         )
+    # Drop this process's cached pause; other workers pick the
+    # cleared tombstone up on their next ledger refresh.
+    from solden.core.llm_budget_ledger import get_llm_budget_ledger
+    get_llm_budget_ledger().invalidate(org_id)
 
     cleared_at = datetime.now(timezone.utc).isoformat()
     try:
@@ -21,9 +21,14 @@ Endpoints:
 * ``POST /api/policies/replay`` — given a version_id + date window,
   return per-AP-item deltas. The novel piece: lets a finance team
   ask "what would have routed differently under the old policy?"
+* ``POST /api/policies/replay/runs`` — queue a replay of a version over
+  a full date window (no item cap) as a background run.
+* ``GET /api/policies/replay/runs/{run_id}`` — run progress; once done,
+  a compact diff report (counts per transition + sample deltas).
 """
 from __future__ import annotations
 
+import logging
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -37,6 +42,8 @@ from solden.services.policy_service import (
     PolicyVersionNotFound,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/policies", tags=["policies"])
 
 
@@ -211,6 +218,54 @@ def replay_policy(
     }
 
 
+class PolicyReplayRunRequest(BaseModel):
+    version_id: str
+    since: Optional[str] = None
+    until: Optional[str] = None
+
+
+@router.post("/replay/runs")
+def start_policy_replay_run(
+    body: PolicyReplayRunRequest,
+    organization_id: Optional[str] = Query(default=None),
+    user=Depends(get_current_user),
+) -> Dict[str, Any]:
+    """Queue a full-window replay; poll ``GET /replay/runs/{run_id}``."""
+    service = _service(organization_id, user)
+    try:
+        run = service.create_replay_run(
+            body.version_id,
+            since=body.since,
+            until=body.until,
+            requested_by=_actor_from_user(user),
+        )
+    except PolicyVersionNotFound:
+        raise HTTPException(status_code=404, detail=f"version {body.version_id!r} not found")
+
+    # Broker outage / no worker: fail the row instead of leaving the
+    # SPA polling a run that will never start.
+    try:
+        from solden.services.celery_tasks import run_policy_replay
+        run_policy_replay.delay(run["id"], service.organization_id)
+    except Exception as exc:
+        logger.exception("[policies/replay/runs] dispatch failed: %s", exc)
+        service.mark_replay_run_failed(run["id"], f"dispatch_failed: {exc}")
+        run = service.get_replay_run(run["id"]) or run
+    return run
+
+
+@router.get("/replay/runs/{run_id}")
+def get_policy_replay_run(
+    run_id: str,
+    organization_id: Optional[str] = Query(default=None),
+    user=Depends(get_current_user),
+) -> Dict[str, Any]:
+    run = _service(organization_id, user).get_replay_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"replay run {run_id!r} not found")
+    return run
+
+
 # ─── Helpers ────────────────────────────────────────────────────────
 
 
@@ -27,14 +27,12 @@ The endpoint is intentionally unauthenticated and rate-limit-tolerant:
 from __future__ import annotations
 
 import logging
-import uuid
-from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Request
 from pydantic import BaseModel, Field
 
-from solden.core.database import get_db
+from solden.core.sla_tracker import get_sla_tracker
 
 logger = logging.getLogger(__name__)
 
@@ -87,35 +85,20 @@ async def record_ui_perf(beacon: PerfBeacon, request: Request) -> Dict[str, Any]
     org_id = raw_org
     ap_item_id = str(context.get("ap_item_id") or "").strip() or None
 
-    metric_id = f"UIP-{uuid.uuid4().hex[:12]}"
-    created_at = datetime.now(timezone.utc).isoformat()
-
+    # Through the tracker so beacons land in the same buffered writer
+    # and per-minute rollup as backend steps; it logs the breach.
     try:
-        db = get_db()
-        with db.connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                (
-                    "INSERT INTO ap_sla_metrics "
-                    "(id, ap_item_id, organization_id, step_name, latency_ms, breached, created_at) "
-                    "VALUES (%s, %s, %s, %s, %s, %s, %s)"
-                ),
-                (
-                    metric_id, ap_item_id, org_id, step_name,
-                    int(beacon.latency_ms),
-                    1 if beacon.breached else 0,
-                    created_at,
-                ),
-            )
-            conn.commit()
+        metric_id = get_sla_tracker().record(
+            step_name, int(beacon.latency_ms),
+            ap_item_id=ap_item_id,
+            organization_id=org_id,
+            breached=bool(beacon.breached),
+            target_ms=int(beacon.budget_ms) or None,
+        )
     except Exception as exc:  # noqa: BLE001
-        logger.debug("[ui-perf] insert failed (non-fatal): %s", exc)
+        logger.debug("[ui-perf] record failed (non-fatal): %s", exc)
+        metric_id = None
+    if metric_id is None:
         return {"recorded": False, "reason": "insert_failed"}
 
-    if beacon.breached:
-        logger.warning(
-            "[ui-perf] %s BREACH %dms > budget %dms (org=%s)",
-            step_name, beacon.latency_ms, beacon.budget_ms, org_id,
-        )
-
     return {"recorded": True, "id": metric_id}
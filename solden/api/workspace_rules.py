@@ -212,7 +212,7 @@ def test_rule(
             "actions": body.candidate_rule.get("actions"),
             "created_at": "0",
         }
-        result = rule_engine.evaluate_rules(invoice_ctx, [candidate])
+        result = rule_engine.evaluate_rules(invoice_ctx, [candidate], cache=False)
         return {"result": result.to_dict(), "invoice_context": invoice_ctx}
 
     if body.rule_id:
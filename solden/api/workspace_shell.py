@@ -2889,10 +2889,10 @@ async def get_chart_of_accounts_endpoint(
 ):
     """Return chart of accounts from the connected ERP.
 
-    Results are cached for 24h in org settings. Use ``force_refresh=true``
-    to bypass cache and pull fresh data from the ERP.  Supports optional
-    filters: ``account_type`` (expense, revenue, asset, liability, equity)
-    and ``active_only`` (default true).
+    Served from the ERP account cache, refreshed from the ERP when older
+    than 24h. Use ``force_refresh=true`` to sync with the ERP first.
+    Supports optional filters: ``account_type`` (expense, revenue,
+    asset, liability, equity) and ``active_only`` (default true).
     """
     org_id = _resolve_org_id(user, organization_id)
 
@@ -2904,15 +2904,10 @@ async def get_chart_of_accounts_endpoint(
     accounts = await _get_coa(
         organization_id=org_id,
         force_refresh=force_refresh,
+        account_type=account_type,
+        active_only=active_only,
     )
 
-    # Apply filters
-    if active_only:
-        accounts = [a for a in accounts if a.get("active", True)]
-    if account_type:
-        normalized_type = account_type.strip().lower()
-        accounts = [a for a in accounts if a.get("type") == normalized_type]
-
     erp_conn = _get_erp_conn(org_id)
     erp_type = erp_conn.type if erp_conn else None
 
@@ -3652,10 +3647,10 @@ async def get_erp_vendor_list(
 ):
     """Return full vendor directory from the connected ERP.
 
-    Results are cached for 24h in org settings. Use ``force_refresh=true``
-    to bypass cache and pull fresh data from the ERP.  Supports optional
-    filters: ``active_only`` (default true) and ``search`` (case-insensitive
-    name/email substring match).
+    Served from the ERP vendor cache, refreshed from the ERP when older
+    than 24h. Use ``force_refresh=true`` to sync with the ERP first.
+    Supports optional filters: ``active_only`` (default true) and
+    ``search`` (case-insensitive name/email substring match).
     """
     org_id = _resolve_org_id(user, organization_id)
 
@@ -3667,19 +3662,10 @@ async def get_erp_vendor_list(
     vendors = await _list_vendors(
         organization_id=org_id,
         force_refresh=force_refresh,
+        active_only=active_only,
+        search=search,
     )
 
-    # Apply filters
-    if active_only:
-        vendors = [v for v in vendors if v.get("active", True)]
-    if search:
-        needle = search.strip().lower()
-        vendors = [
-            v for v in vendors
-            if needle in str(v.get("name") or "").lower()
-            or needle in str(v.get("email") or "").lower()
-        ]
-
     erp_conn = _get_erp_conn(org_id)
     erp_type = erp_conn.type if erp_conn else None
 
@@ -4654,6 +4640,10 @@ def override_llm_budget_pause(
             status_code=500,
             detail=f"failed_to_clear_pause: {exc}",
         )
+    # Drop this process's cached pause; other workers pick the
+    # cleared tombstone up on their next ledger refresh.
+    from solden.core.llm_budget_ledger import get_llm_budget_ledger
+    get_llm_budget_ledger().invalidate(org_id)
 
     cleared_at = datetime.now(timezone.utc).isoformat()
     try:
@@ -0,0 +1,210 @@
+"""Native async Postgres access alongside the sync ``SoldenDB``.
+
+``SoldenDB`` is synchronous, and most async paths (engine handlers, the
+outbox worker, the LLM gateway) call it straight from a coroutine, so
+every query stalls the event loop for its full round trip.
+``AsyncSoldenDB`` runs the same SQL over psycopg's ``AsyncConnection``:
+
+* rows come back as the same :class:`~solden.core.database.HybridRow`
+  (``row["col"]`` and ``row[0]``), so results are interchangeable with
+  the sync mixins';
+* schema is owned by the sync side — ``initialize()`` runs the sync
+  migrations once, in a worker thread;
+* async store mixins (``solden.core.stores.async_*``) reuse the sync
+  stores' SQL constants and row builders rather than copying them.
+
+Connections
+~~~~~~~~~~~
+An ``AsyncConnectionPool`` is bound to the event loop that opened it,
+so pools are opt-in per loop: long-lived loops (the API server, the
+outbox worker) call :func:`open_async_pool` at startup and
+:func:`close_async_pool` on exit. On a loop without a pool,
+``connect()`` opens a one-off connection — still non-blocking, and
+nothing is left behind when a short-lived loop (``asyncio.run`` in a
+Celery task, a test) goes away. Per-call writers (the LLM gateway's
+call log) check :func:`has_async_pool` and go through the sync pool in
+a thread instead, rather than paying a connect per call. Either way the connection comes back
+with the same semantics as ``SoldenDB.connect()``: autocommit off,
+explicit ``commit()``, uncommitted work rolled back on release.
+
+Usage::
+
+    from solden.core.async_database import get_async_db
+
+    adb = get_async_db()
+    totals = await adb.get_llm_cost_this_month(organization_id)
+    async with adb.connect() as conn:
+        cur = conn.cursor()
+        await cur.execute("SELECT 1")
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import psycopg
+
+from solden.core.database import _SoldenDBBase, dict_row, get_db
+from solden.core.stores.async_llm_call_store import AsyncLLMCallStore
+
+logger = logging.getLogger(__name__)
+
+# loop -> {dsn: AsyncConnectionPool}. Weak on the loop so a discarded
+# loop doesn't keep its (already unusable) pools reachable.
+_ASYNC_POOLS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _current_pool(dsn: str) -> Any:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return _ASYNC_POOLS.get(loop, {}).get(dsn)
+
+
+class _AsyncSoldenDBBase:
+    """Connection management; wraps (and takes its DSN from) a sync DB."""
+
+    def __init__(self, db: Any = None):
+        self.sync_db = db if db is not None else get_db()
+        self.dsn: str = self.sync_db.dsn
+
+    async def initialize(self) -> None:
+        if not getattr(self.sync_db, "_initialized", False):
+            await asyncio.to_thread(self.sync_db.initialize)
+
+    @asynccontextmanager
+    async def connect(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        pool = _current_pool(self.dsn)
+        if pool is not None:
+            conn = await pool.getconn()
+        else:
+            conn = await psycopg.AsyncConnection.connect(
+                self.dsn,
+                row_factory=dict_row,
+                connect_timeout=self.sync_db._postgres_connect_timeout_seconds(),
+            )
+        try:
+            yield conn
+        finally:
+            # Same defensive autocommit reset as SoldenDB.connect().
+            try:
+                if conn.autocommit:
+                    await conn.set_autocommit(False)
+            except Exception:
+                pass
+            if pool is not None:
+                try:
+                    await pool.putconn(conn)
+                except Exception:
+                    await conn.close()
+            else:
+                # Unpooled: nothing committed explicitly is discarded,
+                # matching the pool's rollback-on-return.
+                await conn.close()
+
+    async def execute(self, sql: str, params: Tuple[Any, ...] = ()) -> None:
+        """Execute a DML/DDL statement and commit."""
+        async with self.connect() as conn:
+            cur = conn.cursor()
+            await cur.execute(sql, params)
+            await conn.commit()
+
+    async def fetchone(self, sql: str, params: Tuple[Any, ...] = ()):
+        async with self.connect() as conn:
+            cur = conn.cursor()
+            await cur.execute(sql, params)
+            return await cur.fetchone()
+
+    async def fetchall(self, sql: str, params: Tuple[Any, ...] = ()):
+        async with self.connect() as conn:
+            cur = conn.cursor()
+            await cur.execute(sql, params)
+            return await cur.fetchall()
+
+    async def fetchone_dict(self, sql: str, params: Tuple[Any, ...] = ()) -> Optional[Dict[str, Any]]:
+        row = await self.fetchone(sql, params)
+        return dict(row) if row is not None else None
+
+    async def fetchall_dict(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Dict[str, Any]]:
+        return [dict(r) for r in await self.fetchall(sql, params)]
+
+
+class AsyncSoldenDB(AsyncLLMCallStore, _AsyncSoldenDBBase):
+    """Async twin of ``SoldenDB`` for the hot paths. Methods mirror the
+    sync names and return shapes; anything not twinned yet is still on
+    ``self.sync_db``."""
+
+
+_ASYNC_DBS: "weakref.WeakKeyDictionary[Any, AsyncSoldenDB]" = weakref.WeakKeyDictionary()
+
+
+def get_async_db(db: Any = None) -> AsyncSoldenDB:
+    """Async facade over ``db`` (default: the ``get_db()`` singleton),
+    cached per sync instance."""
+    sync_db = db if db is not None else get_db()
+    adb = _ASYNC_DBS.get(sync_db)
+    if adb is None:
+        adb = AsyncSoldenDB(sync_db)
+        _ASYNC_DBS[sync_db] = adb
+    return adb
+
+
+def async_db_for(db: Any) -> Optional[AsyncSoldenDB]:
+    """The async facade for ``db`` when it is a real Postgres-backed
+    ``SoldenDB``, else ``None`` — callers fall back to the sync path
+    (and test doubles keep working)."""
+    if isinstance(db, _SoldenDBBase) and isinstance(getattr(db, "dsn", None), str):
+        return get_async_db(db)
+    return None
+
+
+async def open_async_pool(db: Any = None) -> Any:
+    """Open an ``AsyncConnectionPool`` for the running loop (idempotent).
+
+    Call from long-lived loops only; see the module docstring.
+    """
+    from psycopg_pool import AsyncConnectionPool
+
+    sync_db = db if db is not None else get_db()
+    loop = asyncio.get_running_loop()
+    pools = _ASYNC_POOLS.setdefault(loop, {})
+    pool = pools.get(sync_db.dsn)
+    if pool is None:
+        pool = AsyncConnectionPool(
+            sync_db.dsn,
+            min_size=1,
+            max_size=int(os.getenv("DB_ASYNC_POOL_MAX_SIZE", "20")),
+            kwargs={
+                "row_factory": dict_row,
+                "connect_timeout": sync_db._postgres_connect_timeout_seconds(),
+            },
+            open=False,
+        )
+        await pool.open(wait=False)
+        pools[sync_db.dsn] = pool
+        logger.info("Async Postgres connection pool opened")
+    return pool
+
+
+def has_async_pool(dsn: str) -> bool:
+    """Whether the running loop already has a pool for ``dsn``."""
+    return _current_pool(dsn) is not None
+
+
+async def close_async_pool(dsn: Optional[str] = None) -> None:
+    """Close the running loop's pool for ``dsn`` (default: all of them)."""
+    loop = asyncio.get_running_loop()
+    pools = _ASYNC_POOLS.get(loop, {})
+    for key in [k for k in pools if dsn is None or k == dsn]:
+        pool = pools.pop(key)
+        try:
+            await pool.close()
+        except Exception as exc:
+            logger.debug("Async pool close failed: %s", exc)
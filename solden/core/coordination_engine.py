@@ -2264,7 +2264,7 @@ class CoordinationEngine:
     async def _handle_escalate(self, action: Action, plan: Plan) -> dict:
         try:
             from solden.services.agent_background import _check_approval_timeouts
-            await _check_approval_timeouts(self.organization_id)
+            await _check_approval_timeouts(self.organization_id, ap_item_id=plan.box_id or None)
         except Exception as exc:
             logger.debug("[CoordinationEngine] Escalation failed: %s", exc)
         return {"ok": True}
@@ -2732,8 +2732,11 @@ class CoordinationEngine:
 
     async def _handle_unsnooze(self, action: Action, plan: Plan) -> dict:
         try:
-            from solden.services.agent_background import _reap_expired_snoozes
-            await _reap_expired_snoozes([self.organization_id])
+            from solden.services.agent_background import _reap_expired_snoozes, unsnooze_ap_item
+            if plan.box_id:
+                await unsnooze_ap_item(plan.box_id)
+            else:
+                await _reap_expired_snoozes([self.organization_id])
         except Exception as exc:
             logger.warning("[CoordinationEngine] unsnooze failed: %s", exc)
         return {"ok": True}
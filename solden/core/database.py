@@ -69,15 +69,29 @@ class HybridRow(dict):
         return iter(self._values)
 
 
+# Generated timestamptz twins of TEXT timestamps (migration 107). They
+# exist for WHERE / GROUP BY / index use only; dropping them from result
+# rows keeps ``SELECT *`` payloads JSON-serializable and lets callers
+# write a fetched row back without touching a generated column. Select
+# them under an alias if a query needs the typed value.
+QUERY_ONLY_COLUMNS = frozenset({"created_at_tz", "updated_at_tz", "erp_posted_at_tz", "ts_tz"})
+
+
 def dict_row(cursor):
     """Row factory that returns HybridRow instances (dict + positional)."""
     desc = cursor.description
     if desc is None:
         return lambda values: values
     names = [c.name for c in desc]
-    def make_row(values):
-        return HybridRow(zip(names, values))
-    return make_row
+    keep = [i for i, name in enumerate(names) if name not in QUERY_ONLY_COLUMNS]
+    if len(keep) == len(names):
+        def make_row(values):
+            return HybridRow(zip(names, values))
+        return make_row
+    kept_names = [names[i] for i in keep]
+    def make_projected_row(values):
+        return HybridRow(zip(kept_names, [values[i] for i in keep]))
+    return make_projected_row
 
 logger = logging.getLogger(__name__)
 
@@ -149,6 +163,10 @@ def _load_store_symbols() -> None:
     global GenericBoxStore
     global WorkflowSpecStore
     global LearningStore
+    global TimerStore
+    global ErpCacheStore
+    global KpiRollupStore
+    global InvoiceFingerprintStore
 
     if "APStore" in globals():
         return
@@ -224,6 +242,18 @@ def _load_store_symbols() -> None:
     from solden.core.stores.learning_store import (
         LearningStore as _LearningStore,
     )
+    from solden.core.stores.timer_store import (
+        TimerStore as _TimerStore,
+    )
+    from solden.core.stores.erp_cache_store import (
+        ErpCacheStore as _ErpCacheStore,
+    )
+    from solden.core.stores.kpi_rollup_store import (
+        KpiRollupStore as _KpiRollupStore,
+    )
+    from solden.core.stores.invoice_fingerprint_store import (
+        InvoiceFingerprintStore as _InvoiceFingerprintStore,
+    )
 
     APStore = _APStore
     APRuntimeStore = _APRuntimeStore
@@ -258,6 +288,10 @@ def _load_store_symbols() -> None:
     GenericBoxStore = _GenericBoxStore
     WorkflowSpecStore = _WorkflowSpecStore
     LearningStore = _LearningStore
+    TimerStore = _TimerStore
+    ErpCacheStore = _ErpCacheStore
+    KpiRollupStore = _KpiRollupStore
+    InvoiceFingerprintStore = _InvoiceFingerprintStore
 
 
 class _SoldenDBBase:
@@ -704,6 +738,15 @@ class _SoldenDBBase:
                 return fallback
         return fallback
 
+    def _org_cache(self):
+        """Process-local cache of org rows for this database; starts
+        its NOTIFY listener on first use (see ``solden.core.org_cache``)."""
+        from solden.core.org_cache import get_org_cache
+
+        cache = get_org_cache(self.dsn)
+        cache.start_listener(self.dsn)
+        return cache
+
     # ------------------------------------------------------------------
     # Schema initialization
     # ------------------------------------------------------------------
@@ -1742,6 +1785,10 @@ def _get_db_impl_class():
             GenericBoxStore,
             WorkflowSpecStore,
             LearningStore,
+            TimerStore,
+            ErpCacheStore,
+            KpiRollupStore,
+            InvoiceFingerprintStore,
             _SoldenDBBase,
         ):
             pass
@@ -19,8 +19,76 @@ logger = logging.getLogger(__name__)
 
 STREAM_HIGH = "clearledgr:events:high_priority"
 STREAM_STANDARD = "clearledgr:events:standard"
+# Entries a consumer gave up on (see EventStreamConsumer.MAX_DELIVERIES).
+# No consumer group reads it; operators inspect and replay by hand.
+STREAM_DEAD_LETTER = "clearledgr:events:dead_letter"
 GROUP_NAME = "clearledgr-workers"
 _VISIBILITY_TIMEOUT_MS = 60_000  # 60 seconds before reclaim
+_DEDUP_TTL_SECONDS = 86400
+# Approximate cap (``XADD MAXLEN ~``) on each stream. Under a backlog
+# the oldest entries are trimmed, acked or not, so size this well above
+# the deepest backlog you expect to recover from.
+_STREAM_MAXLEN = int(os.environ.get("EVENT_STREAM_MAXLEN", "500000"))
+# Events per ``enqueue_many`` script call; bounds how long one call
+# holds the Redis event loop.
+_ENQUEUE_MANY_CHUNK = 500
+
+# Dedup + append for a batch of events in one round trip. ARGV is
+# (maxlen, ttl) followed, per event, by (dedup_key or "", stream,
+# field count, field, value, ...). Returns the entry ID or "duplicate"
+# per event. The dedup keys are not declared in KEYS, which is fine on
+# the single-node Redis this queue runs on but not on Redis Cluster.
+_ENQUEUE_MANY_LUA = """
+local maxlen = ARGV[1]
+local ttl = tonumber(ARGV[2])
+local results = {}
+local i = 3
+while i <= #ARGV do
+    local dedup_key = ARGV[i]
+    local stream = ARGV[i + 1]
+    local field_count = tonumber(ARGV[i + 2])
+    local first = i + 3
+    i = first + 2 * field_count
+    if dedup_key ~= '' and not redis.call('SET', dedup_key, '1', 'NX', 'EX', ttl) then
+        results[#results + 1] = 'duplicate'
+    else
+        results[#results + 1] = redis.call(
+            'XADD', stream, 'MAXLEN', '~', maxlen, '*', unpack(ARGV, first, i - 1)
+        )
+    end
+end
+return results
+"""
+
+
+class EnqueueManyError(Exception):
+    """``enqueue_many`` failed part-way through.
+
+    ``results`` holds the result for every event before the chunk that
+    failed — those are in the stream (or were duplicates). Whether the
+    events from the failed chunk onward were appended is unknown.
+    """
+
+    def __init__(self, results: List[str], total: int, cause: Exception) -> None:
+        super().__init__(f"enqueued {len(results)}/{total} events before failure: {cause}")
+        self.results = results
+
+
+def _stream_for(event: AgentEvent) -> str:
+    return STREAM_HIGH if event.priority == "high_priority" else STREAM_STANDARD
+
+
+def _enqueue_many_args(events: List[AgentEvent]) -> List[Any]:
+    """Flatten ``events`` into ``_ENQUEUE_MANY_LUA``'s ARGV."""
+    args: List[Any] = [_STREAM_MAXLEN, _DEDUP_TTL_SECONDS]
+    for event in events:
+        fields = event.to_dict()
+        args.append(f"clearledgr:dedup:{event.idempotency_key}" if event.idempotency_key else "")
+        args.append(_stream_for(event))
+        args.append(len(fields))
+        for name, value in fields.items():
+            args.extend((name, value))
+    return args
 
 
 class RedisEventQueue:
@@ -59,20 +127,52 @@ class RedisEventQueue:
         # Deduplication by idempotency_key
         if event.idempotency_key:
             dedup_key = f"clearledgr:dedup:{event.idempotency_key}"
-            if not self._redis.set(dedup_key, "1", nx=True, ex=86400):
+            if not self._redis.set(dedup_key, "1", nx=True, ex=_DEDUP_TTL_SECONDS):
                 logger.debug(
                     "[EventQueue] Duplicate event dropped: %s", event.idempotency_key,
                 )
                 return "duplicate"
 
-        stream = STREAM_HIGH if event.priority == "high_priority" else STREAM_STANDARD
-        entry_id = self._redis.xadd(stream, event.to_dict())
+        stream = _stream_for(event)
+        entry_id = self._redis.xadd(
+            stream, event.to_dict(), maxlen=_STREAM_MAXLEN, approximate=True,
+        )
         logger.info(
             "[EventQueue] Enqueued %s (%s) → %s [%s]",
             event.type.value, event.id, stream.split(":")[-1], entry_id,
         )
         return str(entry_id)
 
+    def enqueue_many(self, events: List[AgentEvent]) -> List[str]:
+        """Enqueue several events in one round trip per 500.
+
+        Same semantics as calling ``enqueue`` per event — one result per
+        event, in order: the stream entry ID or ``"duplicate"`` — but
+        the dedup ``SET NX`` and the ``XADD`` for every event run inside
+        one server-side script, so a burst of N events costs one round
+        trip instead of 2N. A repeated idempotency key within the batch
+        is a duplicate of its first occurrence. A failure after the first
+        chunk raises :class:`EnqueueManyError` carrying the results so far.
+        """
+        script = getattr(self, "_enqueue_many_script", None)
+        if script is None:
+            script = self._enqueue_many_script = self._redis.register_script(_ENQUEUE_MANY_LUA)
+        results: List[str] = []
+        for start in range(0, len(events), _ENQUEUE_MANY_CHUNK):
+            chunk = events[start:start + _ENQUEUE_MANY_CHUNK]
+            try:
+                chunk_results = script(keys=[], args=_enqueue_many_args(chunk))
+            except Exception as exc:
+                raise EnqueueManyError(results, len(events), exc) from exc
+            results.extend(str(result) for result in chunk_results)
+        if events:
+            duplicates = results.count("duplicate")
+            logger.info(
+                "[EventQueue] Enqueued %d/%d events (%d duplicate)",
+                len(events) - duplicates, len(events), duplicates,
+            )
+        return results
+
     def claim_next(
         self,
         consumer_name: str,
@@ -99,10 +199,96 @@ class RedisEventQueue:
 
         return None
 
+    def claim_batch(
+        self,
+        consumer_name: str,
+        count: int = 64,
+        block_ms: int = 0,
+    ) -> List[Tuple[str, str, AgentEvent]]:
+        """Claim up to ``count`` events in one round trip per stream.
+
+        high_priority is drained first; standard only fills what's left.
+        When both are empty and ``block_ms`` > 0, one XREADGROUP blocks
+        on both streams — a blocked read can then return up to ``count``
+        entries per stream. Undecodable entries are acked and dropped
+        (a poison payload never parses on retry).
+        """
+        claimed: List[Tuple[str, str, AgentEvent]] = []
+        for stream in (STREAM_HIGH, STREAM_STANDARD):
+            if len(claimed) >= count:
+                break
+            claimed.extend(self._read_group(consumer_name, {stream: ">"}, count - len(claimed)))
+        if not claimed and block_ms > 0:
+            claimed = self._read_group(
+                consumer_name, {STREAM_HIGH: ">", STREAM_STANDARD: ">"}, count, block_ms,
+            )
+        return claimed
+
+    def _read_group(
+        self,
+        consumer_name: str,
+        streams: Dict[str, str],
+        count: int,
+        block_ms: Optional[int] = None,
+    ) -> List[Tuple[str, str, AgentEvent]]:
+        try:
+            results = self._redis.xreadgroup(
+                GROUP_NAME, consumer_name, streams, count=count, block=block_ms,
+            )
+        except Exception as exc:
+            logger.warning("[EventQueue] Batch read from %s failed: %s", ",".join(streams), exc)
+            return []
+        # XREADGROUP answers in request order, so high_priority stays first.
+        return self._decode_entries(
+            (stream_name, entries) for stream_name, entries in (results or [])
+        )
+
+    def _decode_entries(self, stream_entries) -> List[Tuple[str, str, AgentEvent]]:
+        decoded: List[Tuple[str, str, AgentEvent]] = []
+        for stream_name, entries in stream_entries:
+            stream = str(stream_name)
+            poison: List[str] = []
+            for entry_id, data in entries:
+                try:
+                    decoded.append((stream, str(entry_id), AgentEvent.from_dict(data)))
+                except Exception as exc:
+                    logger.error("[EventQueue] Poison entry %s on %s dropped: %s", entry_id, stream, exc)
+                    poison.append(str(entry_id))
+            self.ack_many(stream, poison)
+        return decoded
+
     def ack(self, stream: str, entry_id: str) -> None:
         """Acknowledge successful processing of an event."""
         self._redis.xack(stream, GROUP_NAME, entry_id)
 
+    def ack_many(self, stream: str, entry_ids: List[str]) -> None:
+        """Acknowledge several entries of one stream in a single XACK."""
+        if entry_ids:
+            self._redis.xack(stream, GROUP_NAME, *entry_ids)
+
+    def touch(self, stream: str, consumer_name: str, entry_ids: List[str]) -> None:
+        """Reset the idle time of entries this consumer is still working
+        on, so a long-running event isn't reclaimed out from under it."""
+        if entry_ids:
+            self._redis.xclaim(
+                stream, GROUP_NAME, consumer_name,
+                min_idle_time=0, message_ids=entry_ids, justid=True,
+            )
+
+    def dead_letter(self, stream: str, entry_id: str, event: AgentEvent, reason: str) -> None:
+        """Copy an entry to the dead-letter stream and ack it, in one
+        MULTI so it is never both dropped and still pending."""
+        fields = event.to_dict()
+        fields.update({"_source_stream": stream, "_source_id": entry_id, "_dead_letter_reason": reason})
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.xadd(STREAM_DEAD_LETTER, fields, maxlen=_STREAM_MAXLEN, approximate=True)
+        pipe.xack(stream, GROUP_NAME, entry_id)
+        pipe.execute()
+        logger.warning(
+            "[EventQueue] Dead-lettered %s (%s) from %s: %s",
+            event.id, entry_id, stream.split(":")[-1], reason,
+        )
+
     def nack_and_requeue(self, stream: str, entry_id: str, delay_seconds: int = 5) -> None:
         """Return an event to the queue with a delay (workspace at concurrency limit)."""
         # Acknowledge the current claim, then re-add with delay marker
@@ -114,15 +300,17 @@ class RedisEventQueue:
             if entries:
                 _, data = entries[0]
                 data["_requeue_after"] = str(delay_seconds)
-                self._redis.xadd(stream, data)
+                self._redis.xadd(stream, data, maxlen=_STREAM_MAXLEN, approximate=True)
         except Exception as exc:
             logger.warning("[EventQueue] Requeue failed for %s: %s", entry_id, exc)
 
-    def reclaim_stale(self, consumer_name: str) -> List[Tuple[str, str, AgentEvent]]:
+    def reclaim_stale(
+        self, consumer_name: str, count: int = 10,
+    ) -> List[Tuple[str, str, AgentEvent]]:
         """Reclaim events from dead consumers (§12.1: crash recovery).
 
-        Uses XAUTOCLAIM to take over events that have been pending
-        longer than the visibility timeout.
+        Uses XAUTOCLAIM to take over up to ``count`` events per stream
+        that have been pending longer than the visibility timeout.
         """
         reclaimed: List[Tuple[str, str, AgentEvent]] = []
         for stream in (STREAM_HIGH, STREAM_STANDARD):
@@ -131,14 +319,13 @@ class RedisEventQueue:
                 result = self._redis.xautoclaim(
                     stream, GROUP_NAME, consumer_name,
                     min_idle_time=_VISIBILITY_TIMEOUT_MS,
-                    start_id="0-0", count=10,
+                    start_id="0-0", count=count,
                 )
                 if result and len(result) >= 2:
                     entries = result[1]  # list of (id, data) tuples
-                    for entry_id, data in entries:
-                        if data:
-                            event = AgentEvent.from_dict(data)
-                            reclaimed.append((stream, str(entry_id), event))
+                    reclaimed.extend(self._decode_entries(
+                        [(stream, [(entry_id, data) for entry_id, data in entries if data])]
+                    ))
             except Exception as exc:
                 logger.debug("[EventQueue] Reclaim from %s failed: %s", stream, exc)
 
@@ -177,15 +364,19 @@ class InMemoryEventQueue:
             STREAM_HIGH: [],
             STREAM_STANDARD: [],
         }
+        self.dead_letters: List[Tuple[str, str, AgentEvent, str]] = []
         self._counter = 0
 
     def enqueue(self, event: AgentEvent) -> str:
         self._counter += 1
         entry_id = f"{self._counter}-0"
-        stream = STREAM_HIGH if event.priority == "high_priority" else STREAM_STANDARD
+        stream = _stream_for(event)
         self._queues[stream].append((entry_id, event))
         return entry_id
 
+    def enqueue_many(self, events: List[AgentEvent]) -> List[str]:
+        return [self.enqueue(event) for event in events]
+
     def claim_next(self, consumer_name: str, block_ms: int = 0) -> Optional[Tuple[str, str, AgentEvent]]:
         for stream in (STREAM_HIGH, STREAM_STANDARD):
             if self._queues[stream]:
@@ -193,13 +384,32 @@ class InMemoryEventQueue:
                 return (stream, entry_id, event)
         return None
 
+    def claim_batch(
+        self, consumer_name: str, count: int = 64, block_ms: int = 0,
+    ) -> List[Tuple[str, str, AgentEvent]]:
+        claimed: List[Tuple[str, str, AgentEvent]] = []
+        for stream in (STREAM_HIGH, STREAM_STANDARD):
+            take = self._queues[stream][: count - len(claimed)]
+            del self._queues[stream][: len(take)]
+            claimed.extend((stream, entry_id, event) for entry_id, event in take)
+        return claimed
+
     def ack(self, stream: str, entry_id: str) -> None:
         pass
 
+    def ack_many(self, stream: str, entry_ids: List[str]) -> None:
+        pass
+
+    def touch(self, stream: str, consumer_name: str, entry_ids: List[str]) -> None:
+        pass
+
+    def dead_letter(self, stream: str, entry_id: str, event: AgentEvent, reason: str) -> None:
+        self.dead_letters.append((stream, entry_id, event, reason))
+
     def nack_and_requeue(self, stream: str, entry_id: str, delay_seconds: int = 5) -> None:
         pass
 
-    def reclaim_stale(self, consumer_name: str) -> list:
+    def reclaim_stale(self, consumer_name: str, count: int = 10) -> list:
         return []
 
     def pending_count(self) -> Dict[str, int]:
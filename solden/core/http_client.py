@@ -24,10 +24,13 @@ and the TLS session, so each call after the first is essentially a
 free cold-handshake tax. This module owns that client.
 
 Lifetime: the client is lazily created on first ``get_http_client()``
-call. There's one per process — in FastAPI workers that's one per
-uvicorn process; in Celery workers that's one per worker process.
-httpx's AsyncClient is safe across coroutines on a single event loop,
-which matches what we have (each process runs a single loop).
+call and belongs to the event loop it was first used on — an
+AsyncClient's pooled connections can't move between loops. In FastAPI
+workers that's the one uvicorn loop. Sync worker code runs coroutines
+on the persistent per-thread loops of :mod:`solden.core.worker_loop`;
+each of those loops gets its own client, kept for the life of the
+loop. A client whose loop has been closed (the old ``asyncio.run``
+per-call pattern) is dropped and replaced rather than handed out dead.
 
 Shutdown: the FastAPI lifespan hook calls ``close_http_client()`` on
 app shutdown so the pool is drained cleanly before the process
@@ -42,7 +45,9 @@ negligible relative to call frequency.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
+import weakref
 from typing import Optional
 
 import httpx
@@ -51,44 +56,76 @@ logger = logging.getLogger(__name__)
 
 
 _shared_client: Optional[httpx.AsyncClient] = None
+# The loop ``_shared_client`` was created on (None = created outside
+# a loop, or injected by a test).
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+# Clients for any further loops — the per-thread worker loops.
+_loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _new_client() -> httpx.AsyncClient:
+    client = httpx.AsyncClient(
+        # Timeout defaults mirror the old per-call patterns.
+        # Callers that need tighter deadlines pass ``timeout=`` on
+        # the request itself — that overrides this default per
+        # call without affecting other callers sharing the pool.
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(
+            # Bounded pool prevents runaway fd usage under a load
+            # spike while leaving plenty of headroom for normal
+            # concurrency. The worker runs 4 greenlets (Celery
+            # concurrency default) × a few concurrent calls each.
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=30.0,
+        ),
+        # HTTP/1.1 keep-alive is the real win here — TLS-session
+        # reuse + TCP connection reuse on subsequent calls to the
+        # same host. HTTP/2 would be better for fanning out many
+        # concurrent calls to the model API but requires the `h2`
+        # extra which isn't in requirements.txt; skip until we
+        # have a concrete reason to add the dep.
+    )
+    logger.info("[http_client] shared AsyncClient created (http1, pool=100)")
+    return client
 
 
 def get_http_client() -> httpx.AsyncClient:
-    """Return the process-wide shared async client, creating on demand."""
-    global _shared_client
+    """Return the shared async client for the running loop, creating on demand."""
+    global _shared_client, _shared_client_loop
+    loop = _running_loop()
+    if _shared_client is not None and _shared_client_loop is not None and _shared_client_loop.is_closed():
+        # Its connections died with its loop.
+        _shared_client, _shared_client_loop = None, None
     if _shared_client is None:
-        _shared_client = httpx.AsyncClient(
-            # Timeout defaults mirror the old per-call patterns.
-            # Callers that need tighter deadlines pass ``timeout=`` on
-            # the request itself — that overrides this default per
-            # call without affecting other callers sharing the pool.
-            timeout=httpx.Timeout(30.0, connect=10.0),
-            limits=httpx.Limits(
-                # Bounded pool prevents runaway fd usage under a load
-                # spike while leaving plenty of headroom for normal
-                # concurrency. The worker runs 4 greenlets (Celery
-                # concurrency default) × a few concurrent calls each.
-                max_connections=100,
-                max_keepalive_connections=20,
-                keepalive_expiry=30.0,
-            ),
-            # HTTP/1.1 keep-alive is the real win here — TLS-session
-            # reuse + TCP connection reuse on subsequent calls to the
-            # same host. HTTP/2 would be better for fanning out many
-            # concurrent calls to the model API but requires the `h2`
-            # extra which isn't in requirements.txt; skip until we
-            # have a concrete reason to add the dep.
-        )
-        logger.info("[http_client] shared AsyncClient created (http1, pool=100)")
-    return _shared_client
+        _shared_client, _shared_client_loop = _new_client(), loop
+        return _shared_client
+    if loop is None or _shared_client_loop is None or _shared_client_loop is loop:
+        return _shared_client
+    client = _loop_clients.get(loop)
+    if client is None:
+        client = _loop_clients[loop] = _new_client()
+    return client
 
 
 async def close_http_client() -> None:
-    """Close the shared client if it was ever created. Safe to call
-    multiple times or before the client is initialized."""
-    global _shared_client
-    if _shared_client is not None:
-        client, _shared_client = _shared_client, None
+    """Close the running loop's client if it was ever created. Safe to
+    call multiple times or before the client is initialized."""
+    global _shared_client, _shared_client_loop
+    loop = _running_loop()
+    client = _loop_clients.pop(loop, None) if loop is not None else None
+    if client is None and _shared_client is not None and _shared_client_loop in (None, loop):
+        client, _shared_client, _shared_client_loop = _shared_client, None, None
+    if client is not None:
         try:
             await client.aclose()
         except Exception as exc:  # noqa: BLE001
@@ -104,5 +141,6 @@ def _reset_for_testing() -> None:
     the async ``close_http_client`` would need an event loop; this
     synchronous variant is a no-op for test setup.
     """
-    global _shared_client
-    _shared_client = None
+    global _shared_client, _shared_client_loop
+    _shared_client, _shared_client_loop = None, None
+    _loop_clients.clear()
@@ -0,0 +1,255 @@
+"""In-process month-to-date LLM spend ledger for the gateway budget guard.
+
+``LLMGateway._enforce_budget_cap`` is authoritative but expensive: it
+loads the organization row, resolves the effective cap through the
+subscription service and ``SUM``s the whole month of ``llm_call_log``.
+Running that before every model call put two synchronous queries (one
+of them growing with the month's call volume) on the event loop.
+
+:class:`LLMBudgetLedger` caches what that check learned per org — the
+month, the spend, the cap and the pause tombstone — and keeps the spend
+current by adding each call's cost as ``_log_call`` records it. The
+gateway's pre-flight becomes a dict lookup; the authoritative check
+only runs when the cached entry is missing, from a previous month,
+older than ``STALENESS_SECONDS`` (``NEAR_CAP_STALENESS_SECONDS`` once
+spend is within ``NEAR_CAP_FRACTION`` of the cap), or already at the
+cap — in which case the authoritative path does the tripping, so the
+tombstone, alert, webhook and audit row are unchanged.
+
+Across processes, spend is shared through a Redis counter per org and
+month (``INCRBYFLOAT`` on every call) when ``REDIS_URL`` is set. The
+authoritative check reads that counter and only falls back to the
+Postgres ``SUM`` when the counter is missing or more than
+``DB_RECONCILE_SECONDS`` old, after which it resets the counter to the
+Postgres figure. Without Redis every refresh uses Postgres.
+
+Overshoot bound: a process sees its own spend immediately; spend from
+other processes becomes visible within one staleness window. The most
+a workspace can run past its cap is therefore the calls already in
+flight plus what the other workers spend in ``NEAR_CAP_STALENESS_SECONDS``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STALENESS_SECONDS = 30.0
+NEAR_CAP_FRACTION = 0.9
+NEAR_CAP_STALENESS_SECONDS = 2.0
+DB_RECONCILE_SECONDS = 300.0
+
+# Shared counters outlive their month by a few days so a late reader at
+# the rollover still finds the previous month's total.
+_REDIS_KEY_TTL_SECONDS = 35 * 24 * 3600
+
+
+def current_month(now: Optional[datetime] = None) -> str:
+    now = now or datetime.now(timezone.utc)
+    return f"{now.year:04d}-{now.month:02d}"
+
+
+@dataclass
+class OrgBudget:
+    """One org's cached budget state for ``month``."""
+    month: str
+    spent_usd: float
+    cap_usd: float
+    paused_at: Optional[str]
+    refreshed_at: float  # time.monotonic()
+    db_reconciled_at: float  # time.monotonic() of the last Postgres SUM
+
+    def is_fresh(self, now: float) -> bool:
+        window = STALENESS_SECONDS
+        if self.cap_usd > 0 and self.spent_usd >= self.cap_usd * NEAR_CAP_FRACTION:
+            window = NEAR_CAP_STALENESS_SECONDS
+        return now - self.refreshed_at < window
+
+
+class LLMBudgetLedger:
+    """Per-org month-to-date spend, cap and pause state.
+
+    Thread-safe: ``_log_call`` runs on whichever thread made the call,
+    the authoritative refresh runs in a worker thread.
+    """
+
+    def __init__(self, redis_client: Any = None) -> None:
+        self._entries: Dict[str, OrgBudget] = {}
+        self._lock = threading.Lock()
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+
+    # ------------------------------------------------------------------
+    # Pre-flight
+    # ------------------------------------------------------------------
+
+    def peek(self, organization_id: str) -> Optional[OrgBudget]:
+        """The cached entry if it can answer the pre-flight on its own,
+        else ``None`` (missing, stale, or from another month)."""
+        entry = self._entries.get(organization_id)
+        if entry is None or entry.month != current_month():
+            return None
+        if not entry.is_fresh(time.monotonic()):
+            return None
+        return entry
+
+    def get(self, organization_id: str) -> Optional[OrgBudget]:
+        return self._entries.get(organization_id)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def seed(
+        self,
+        organization_id: str,
+        *,
+        spent_usd: float,
+        cap_usd: float,
+        paused_at: Optional[str] = None,
+        db_reconciled: bool = False,
+    ) -> OrgBudget:
+        """Store the result of an authoritative check."""
+        now = time.monotonic()
+        with self._lock:
+            previous = self._entries.get(organization_id)
+            month = current_month()
+            reconciled_at = now if db_reconciled else (
+                previous.db_reconciled_at
+                if previous is not None and previous.month == month
+                else 0.0
+            )
+            entry = OrgBudget(
+                month=month,
+                spent_usd=float(spent_usd),
+                cap_usd=float(cap_usd),
+                paused_at=paused_at,
+                refreshed_at=now,
+                db_reconciled_at=reconciled_at,
+            )
+            self._entries[organization_id] = entry
+        return entry
+
+    def record(self, organization_id: str, cost_usd: float) -> None:
+        """Add one call's cost to the org's running total (local entry
+        and, when configured, the shared Redis counter)."""
+        if not cost_usd or cost_usd <= 0:
+            return
+        month = current_month()
+        with self._lock:
+            entry = self._entries.get(organization_id)
+            if entry is not None and entry.month == month:
+                entry.spent_usd += cost_usd
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            key = self._redis_key(organization_id, month)
+            pipe = client.pipeline()
+            pipe.incrbyfloat(key, cost_usd)
+            pipe.expire(key, _REDIS_KEY_TTL_SECONDS)
+            pipe.execute()
+        except Exception as exc:
+            logger.debug("[LLMBudgetLedger] shared spend increment failed: %s", exc)
+
+    def invalidate(self, organization_id: Optional[str] = None) -> None:
+        """Drop cached state (one org, or all) so the next call runs the
+        authoritative check — e.g. after a budget override."""
+        with self._lock:
+            if organization_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(organization_id, None)
+
+    # ------------------------------------------------------------------
+    # Shared (cross-process) spend
+    # ------------------------------------------------------------------
+
+    def needs_db_reconcile(self, organization_id: str) -> bool:
+        entry = self._entries.get(organization_id)
+        if entry is None or entry.month != current_month():
+            return True
+        return time.monotonic() - entry.db_reconciled_at >= DB_RECONCILE_SECONDS
+
+    def shared_spend(self, organization_id: str) -> Optional[float]:
+        """Month-to-date spend from the Redis counter, or ``None`` when
+        there is no counter (or no Redis)."""
+        client = self._redis_client()
+        if client is None:
+            return None
+        try:
+            value = client.get(self._redis_key(organization_id, current_month()))
+        except Exception as exc:
+            logger.debug("[LLMBudgetLedger] shared spend read failed: %s", exc)
+            return None
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def reconcile_shared(self, organization_id: str, spent_usd: float) -> None:
+        """Reset the Redis counter to the Postgres month-to-date total."""
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            client.set(
+                self._redis_key(organization_id, current_month()),
+                repr(float(spent_usd)),
+                ex=_REDIS_KEY_TTL_SECONDS,
+            )
+        except Exception as exc:
+            logger.debug("[LLMBudgetLedger] shared spend reconcile failed: %s", exc)
+
+    @staticmethod
+    def _redis_key(organization_id: str, month: str) -> str:
+        return f"clearledgr:llm_spend:{organization_id}:{month}"
+
+    def _redis_client(self) -> Any:
+        if self._redis_resolved:
+            return self._redis
+        self._redis_resolved = True
+        redis_url = os.getenv("REDIS_URL", "").strip()
+        if not redis_url:
+            return None
+        try:
+            import redis
+
+            client = redis.Redis.from_url(
+                redis_url, decode_responses=True, socket_connect_timeout=2,
+            )
+            client.ping()
+            self._redis = client
+        except Exception as exc:
+            logger.info("[LLMBudgetLedger] Redis unavailable, per-process spend only: %s", exc)
+            self._redis = None
+        return self._redis
+
+
+_ledger: Optional[LLMBudgetLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_llm_budget_ledger() -> LLMBudgetLedger:
+    """Process-wide ledger shared by every gateway instance."""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = LLMBudgetLedger()
+    return _ledger
+
+
+def reset_llm_budget_ledger() -> None:
+    """Drop the process-wide ledger (tests)."""
+    global _ledger
+    with _ledger_lock:
+        _ledger = None
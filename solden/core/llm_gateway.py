@@ -18,6 +18,7 @@ Usage:
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import time
@@ -25,7 +26,10 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from solden.core.llm_budget_ledger import get_llm_budget_ledger, reset_llm_budget_ledger
+from solden.core.stores.async_llm_call_store import LLM_CALL_LOG_INSERT_SQL
 
 logger = logging.getLogger(__name__)
 
@@ -457,8 +461,28 @@ class LLMGateway:
             return os.environ.get("ANTHROPIC_EXTRACTION_MODEL", _MODEL_HAIKU)
         return os.environ.get("ANTHROPIC_MODEL", _MODEL_SONNET)
 
+    def _budget_preflight(self, organization_id: str) -> bool:
+        """O(1) budget check against the process-wide spend ledger.
+
+        Returns True when the cached entry clears the call, raises
+        :class:`LLMBudgetExceededError` when it says the org is paused
+        this month, and returns False when only the authoritative
+        :meth:`_enforce_budget_cap` can answer — no fresh entry, or the
+        running spend has reached the cap and the trip (tombstone,
+        alert, webhook, audit) still has to happen.
+        """
+        entry = get_llm_budget_ledger().peek(organization_id)
+        if entry is None:
+            return False
+        if entry.paused_at:
+            raise LLMBudgetExceededError(
+                f"Cost budget exceeded for organization "
+                f"{organization_id}: paused at {entry.paused_at}"
+            )
+        return entry.spent_usd < entry.cap_usd
+
     def _enforce_budget_cap(self, organization_id: str) -> None:
-        """Runaway-spend guard — pre-flight check against the monthly cap.
+        """Runaway-spend guard — authoritative check against the monthly cap.
 
         Fast path (already paused this month): raises immediately
         without querying llm_call_log. The tombstone is the answer.
@@ -472,6 +496,13 @@ class LLMGateway:
         If the tombstone is set but from a prior calendar month,
         clears it (new billing cycle) and proceeds.
 
+        Month-to-date cost comes from the ledger's shared Redis counter
+        when one is configured and was reconciled with Postgres within
+        ``DB_RECONCILE_SECONDS``; otherwise from the ``llm_call_log``
+        SUM, which then resets the counter. Every outcome is seeded
+        into the ledger so :meth:`_budget_preflight` can answer the
+        following calls from memory.
+
         Best-effort: any failure to load the org / subscription
         / cost total falls through to "allow the call" rather than
         blocking work on a DB hiccup. The runaway guard is a safety
@@ -504,6 +535,7 @@ class LLMGateway:
             return
 
         now = datetime.now(timezone.utc)
+        ledger = get_llm_budget_ledger()
 
         # --- Fast path: already paused? ---
         paused_at_raw = org.get("llm_cost_paused_at")
@@ -514,6 +546,10 @@ class LLMGateway:
                 )
                 if (paused_at.year, paused_at.month) == (now.year, now.month):
                     # Still the same billing month — stay paused.
+                    ledger.seed(
+                        organization_id, spent_usd=0.0, cap_usd=0.0,
+                        paused_at=str(paused_at_raw),
+                    )
                     raise LLMBudgetExceededError(
                         f"Cost budget exceeded for organization "
                         f"{organization_id}: paused at {paused_at_raw}"
@@ -540,8 +576,16 @@ class LLMGateway:
             from solden.services.subscription import get_subscription_service
             sub_svc = get_subscription_service()
             cap_usd = float(sub_svc.get_effective_llm_cost_cap(organization_id))
-            cost_row = sub_svc._get_llm_cost_this_month(organization_id) or {}
-            cost_usd = float(cost_row.get("total_cost_usd") or 0.0)
+            shared_cost = (
+                None if ledger.needs_db_reconcile(organization_id)
+                else ledger.shared_spend(organization_id)
+            )
+            if shared_cost is not None:
+                cost_usd = shared_cost
+            else:
+                cost_row = sub_svc._get_llm_cost_this_month(organization_id) or {}
+                cost_usd = float(cost_row.get("total_cost_usd") or 0.0)
+                ledger.reconcile_shared(organization_id, cost_usd)
         except Exception as exc:
             logger.debug(
                 "[LLMGateway] budget-cap: cost/cap lookup failed for "
@@ -550,6 +594,10 @@ class LLMGateway:
             return
 
         if cost_usd < cap_usd:
+            ledger.seed(
+                organization_id, spent_usd=cost_usd, cap_usd=cap_usd,
+                db_reconciled=shared_cost is None,
+            )
             return  # Within budget — normal path.
 
         # --- Over cap: pause + alert + webhook + audit, then raise ---
@@ -559,6 +607,10 @@ class LLMGateway:
             cap_usd=cap_usd,
             now_iso=now.isoformat(),
         )
+        ledger.seed(
+            organization_id, spent_usd=cost_usd, cap_usd=cap_usd,
+            paused_at=now.isoformat(), db_reconciled=shared_cost is None,
+        )
         raise LLMBudgetExceededError(
             f"Cost budget exceeded for organization {organization_id}: "
             f"${cost_usd:.2f} >= ${cap_usd:.2f}"
@@ -608,7 +660,6 @@ class LLMGateway:
 
         # 3. Webhook to the customer's Backoffice.
         try:
-            import asyncio
             from solden.services.webhook_delivery import emit_webhook_event
 
             payload = {
@@ -688,7 +739,12 @@ class LLMGateway:
         an explicit ``box_id``, it's used as the box_id for
         ``box_type='ap_item'``. Classification calls that run before
         a Box exists may pass nothing and the columns stay null.
+
+        The cost is also added to the budget ledger's running total,
+        whether or not the row lands — the spend happened either way.
         """
+        get_llm_budget_ledger().record(organization_id, cost_estimate)
+
         if not self._db:
             try:
                 from solden.core.database import get_db
@@ -696,40 +752,91 @@ class LLMGateway:
             except Exception:
                 return None
 
-        # AP convenience: if the caller passed ap_item_id, that's the
-        # box_id for type ap_item. Explicit box_id/box_type kwargs
-        # always win over the AP shortcut.
-        if box_id is None and ap_item_id:
-            box_id = ap_item_id
-        if box_type is None and box_id is not None:
-            box_type = "ap_item"
-
+        call_id, params = self._llm_call_row(
+            action=action, model=model,
+            input_tokens=input_tokens, output_tokens=output_tokens,
+            latency_ms=latency_ms, cost_estimate=cost_estimate,
+            truncated=truncated, error=error,
+            organization_id=organization_id, ap_item_id=ap_item_id,
+            correlation_id=correlation_id, box_id=box_id, box_type=box_type,
+        )
         try:
             self._db.initialize()
-            now = datetime.now(timezone.utc).isoformat()
-            call_id = f"LLM-{uuid.uuid4().hex[:12]}"
-            sql = (
-                "INSERT INTO llm_call_log "
-                "(id, organization_id, action, model, input_tokens, output_tokens, "
-                "latency_ms, cost_estimate_usd, truncated, error, "
-                "correlation_id, created_at, box_id, box_type) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
-            )
             with self._db.connect() as conn:
-                conn.execute(sql, (
-                    call_id, organization_id, action.value, model,
-                    input_tokens, output_tokens, latency_ms, cost_estimate,
-                    1 if truncated else 0, error,
-                    correlation_id,
-                    now,
-                    box_id, box_type,
-                ))
+                conn.execute(LLM_CALL_LOG_INSERT_SQL, params)
                 conn.commit()
             return call_id
         except Exception as exc:
             logger.debug("[LLMGateway] Failed to log call: %s", exc)
             return None
 
+    async def _alog_call(self, **kwargs: Any) -> Optional[str]:
+        """``_log_call`` for coroutines, off the event loop.
+
+        The insert goes through the async DB facade when the running
+        loop has a pool; without one (Celery worker loops, scripts)
+        each call would open its own connection, so the sync writer
+        runs in a thread and uses ``SoldenDB``'s pool instead. Test
+        doubles that aren't a Postgres ``SoldenDB`` use the sync writer
+        directly."""
+        if not self._db:
+            try:
+                from solden.core.database import get_db
+                self._db = get_db()
+            except Exception:
+                return None
+        from solden.core.async_database import async_db_for, has_async_pool
+
+        adb = async_db_for(self._db)
+        if adb is None:
+            return self._log_call(**kwargs)
+        if not has_async_pool(adb.dsn):
+            return await asyncio.to_thread(self._log_call, **kwargs)
+
+        get_llm_budget_ledger().record(kwargs["organization_id"], kwargs["cost_estimate"])
+        call_id, params = self._llm_call_row(**kwargs)
+        try:
+            await adb.insert_llm_call_log(params)
+            return call_id
+        except Exception as exc:
+            logger.debug("[LLMGateway] Failed to log call: %s", exc)
+            return None
+
+    @staticmethod
+    def _llm_call_row(
+        *,
+        action: LLMAction,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency_ms: int,
+        cost_estimate: float,
+        truncated: bool,
+        error: Optional[str],
+        organization_id: str,
+        ap_item_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        box_id: Optional[str] = None,
+        box_type: Optional[str] = None,
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        """``(call_id, LLM_CALL_LOG_INSERT_SQL params)`` for one call."""
+        # AP convenience: if the caller passed ap_item_id, that's the
+        # box_id for type ap_item. Explicit box_id/box_type kwargs
+        # always win over the AP shortcut.
+        if box_id is None and ap_item_id:
+            box_id = ap_item_id
+        if box_type is None and box_id is not None:
+            box_type = "ap_item"
+        call_id = f"LLM-{uuid.uuid4().hex[:12]}"
+        return call_id, (
+            call_id, organization_id, action.value, model,
+            input_tokens, output_tokens, latency_ms, cost_estimate,
+            1 if truncated else 0, error,
+            correlation_id,
+            datetime.now(timezone.utc).isoformat(),
+            box_id, box_type,
+        )
+
     async def call(
         self,
         action: LLMAction,
@@ -787,7 +894,10 @@ class LLMGateway:
         organization_id = assert_org_id(
             organization_id, context="LLMGateway.call"
         )
-        self._enforce_budget_cap(organization_id)
+        # Ledger hit: a dict lookup. Miss: the authoritative check,
+        # kept off the event loop because it does blocking DB reads.
+        if not self._budget_preflight(organization_id):
+            await asyncio.to_thread(self._enforce_budget_cap, organization_id)
 
         config = ACTION_REGISTRY[action]
         model = model_override or self._resolve_model(config)
@@ -853,7 +963,7 @@ class LLMGateway:
         if _circuit_open():
             remaining = _circuit_remaining()
             last_error = f"429: circuit breaker open, retry in {remaining}s"
-            self._log_call(
+            await self._alog_call(
                 action=action, model=model,
                 input_tokens=0, output_tokens=0,
                 latency_ms=0, cost_estimate=0.0,
@@ -893,7 +1003,6 @@ class LLMGateway:
                         "[LLMGateway] %s returned %d, retrying in %ds (attempt %d/%d)",
                         action.value, resp.status_code, delay, attempt + 1, _MAX_RETRIES,
                     )
-                    import asyncio
                     await asyncio.sleep(delay)
                     continue
 
@@ -901,7 +1010,7 @@ class LLMGateway:
                     error_text = resp.text[:200]
                     last_error = f"{resp.status_code}: {error_text}"
                     latency_ms = int((time.monotonic() - start_time) * 1000)
-                    self._log_call(
+                    await self._alog_call(
                         action=action, model=model,
                         input_tokens=0, output_tokens=0,
                         latency_ms=latency_ms, cost_estimate=0.0,
@@ -926,7 +1035,7 @@ class LLMGateway:
                 if len(raw_body) > 10_000_000:
                     last_error = f"response_too_large:{len(raw_body)}_bytes"
                     latency_ms = int((time.monotonic() - start_time) * 1000)
-                    self._log_call(
+                    await self._alog_call(
                         action=action, model=model,
                         input_tokens=0, output_tokens=0,
                         latency_ms=latency_ms, cost_estimate=0.0,
@@ -965,7 +1074,7 @@ class LLMGateway:
                         b.get("text", "") for b in content_blocks if b.get("type") == "text"
                     )
 
-                self._log_call(
+                await self._alog_call(
                     action=action, model=model,
                     input_tokens=input_tokens, output_tokens=output_tokens,
                     latency_ms=latency_ms, cost_estimate=cost,
@@ -1001,14 +1110,13 @@ class LLMGateway:
                         "[LLMGateway] %s timed out, retrying in %ds (attempt %d/%d)",
                         action.value, delay, attempt + 1, _MAX_RETRIES,
                     )
-                    import asyncio
                     await asyncio.sleep(delay)
                     continue
                 last_error = "timeout"
 
         # All retries exhausted
         latency_ms = int((time.monotonic() - start_time) * 1000)
-        self._log_call(
+        await self._alog_call(
             action=action, model=model,
             input_tokens=0, output_tokens=0,
             latency_ms=latency_ms, cost_estimate=0.0,
@@ -1127,7 +1235,7 @@ class LLMGateway:
         finally:
             latency_ms = int((_time.monotonic() - start_time) * 1000)
             cost = self._estimate_cost(config, input_tokens, output_tokens)
-            self._log_call(
+            await self._alog_call(
                 action=action, model=model,
                 input_tokens=input_tokens, output_tokens=output_tokens,
                 latency_ms=latency_ms, cost_estimate=cost,
@@ -1146,8 +1254,6 @@ class LLMGateway:
         **kwargs: Any,
     ) -> LLMResponse:
         """Synchronous wrapper around ``call()`` for non-async contexts."""
-        import asyncio
-
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
@@ -1179,6 +1285,7 @@ def get_llm_gateway() -> LLMGateway:
 
 
 def reset_llm_gateway() -> None:
-    """Reset the singleton (for tests)."""
+    """Reset the singleton and the budget ledger (for tests)."""
     global _gateway_instance
     _gateway_instance = None
+    reset_llm_budget_ledger()
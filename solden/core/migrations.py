@@ -5928,3 +5928,776 @@ def _v99_box_links_org(cur, db):
         "CREATE INDEX IF NOT EXISTS idx_box_links_org "
         "ON box_links(organization_id, source_box_id)"
     )
+
+
+@migration(100, "outbox_events NOTIFY trigger — wake outbox workers on new work")
+def _v100_outbox_events_notify(cur, db):
+    """Fire ``NOTIFY outbox_events`` whenever a row becomes pending.
+
+    Covers both fresh enqueues (INSERT) and ops retries (UPDATE back to
+    ``pending``). ``OutboxWorker.run_forever`` LISTENs on the channel and
+    claims immediately instead of sleeping out its poll interval. The
+    payload is empty on purpose: Postgres folds identical notifications
+    raised in one transaction, so a bulk enqueue wakes workers once.
+    """
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION outbox_events_notify()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            PERFORM pg_notify('outbox_events', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    cur.execute(
+        """
+        CREATE OR REPLACE TRIGGER trg_outbox_events_notify
+        AFTER INSERT OR UPDATE OF status ON outbox_events
+        FOR EACH ROW
+        WHEN (NEW.status = 'pending')
+        EXECUTE FUNCTION outbox_events_notify()
+        """
+    )
+
+
+@migration(101, "ap_sla_metrics_rollup — per-minute SLA aggregates for get_summary")
+def _v101_sla_metrics_rollup(cur, db):
+    """Per-minute, per-step aggregates of ``ap_sla_metrics``.
+
+    ``SLATracker`` writes raw rows and rollup increments in the same
+    flush; ``get_summary`` sums the rollup buckets instead of scanning
+    every raw measurement in the window. ``bucket`` is the ``created_at``
+    ISO prefix truncated to the minute (``YYYY-MM-DDTHH:MM``) so it
+    compares against the same text timestamps. Existing rows are
+    backfilled.
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ap_sla_metrics_rollup (
+            organization_id TEXT NOT NULL,
+            step_name TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            latency_ms_sum BIGINT NOT NULL DEFAULT 0,
+            max_ms INTEGER NOT NULL DEFAULT 0,
+            breached_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (organization_id, bucket, step_name)
+        )
+    """)
+    cur.execute("""
+        INSERT INTO ap_sla_metrics_rollup
+            (organization_id, step_name, bucket, total, latency_ms_sum, max_ms, breached_count)
+        SELECT organization_id, step_name, substr(created_at, 1, 16),
+               COUNT(*), SUM(latency_ms), MAX(latency_ms),
+               SUM(CASE WHEN breached = 1 THEN 1 ELSE 0 END)
+        FROM ap_sla_metrics
+        WHERE created_at IS NOT NULL
+        GROUP BY organization_id, step_name, substr(created_at, 1, 16)
+        ON CONFLICT (organization_id, bucket, step_name) DO NOTHING
+    """)
+
+
+@migration(102, "agent_sweep_leases — per-(job, org) leases for the background sweeps")
+def _v102_agent_sweep_leases(cur, db):
+    """One row per background job per org, claimed under a lease.
+
+    ``SweepScheduler`` replicas take due rows with ``FOR UPDATE SKIP
+    LOCKED`` and hold ``lease_until`` while they run, so an org sweep
+    is split across replicas instead of repeated by each. The last
+    run's outcome and a running overrun count stay on the row for ops.
+    Timestamps are ISO text like the rest of the schema.
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS agent_sweep_leases (
+            job_name TEXT NOT NULL,
+            organization_id TEXT NOT NULL,
+            next_due_at TEXT NOT NULL,
+            lease_owner TEXT,
+            lease_until TEXT,
+            last_started_at TEXT,
+            last_finished_at TEXT,
+            last_duration_ms INTEGER,
+            last_status TEXT,
+            last_error TEXT,
+            overrun_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (job_name, organization_id)
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_agent_sweep_leases_due
+        ON agent_sweep_leases (job_name, next_due_at)
+    """)
+
+
+@migration(103, "agent_timers — indexed due-time table for snooze/ERP-recheck/approval timers")
+def _v103_agent_timers(cur, db):
+    """One row per (box, timer type) with a typed, indexed ``due_at``.
+
+    Replaces the per-minute scans in ``fire_pending_timers`` that looked
+    up orgs with snoozed / waiting items (``LIMIT 100``, so later orgs
+    were silently skipped) and re-parsed JSON expiry fields per item.
+    Writers register timers through ``TimerStore.register_timer``; the
+    consumer pops due rows with ``FOR UPDATE SKIP LOCKED``. ``due_at`` is
+    ``TIMESTAMPTZ`` rather than the schema's usual ISO text so the range
+    scan and ordering are done on real timestamps.
+
+    Open snoozes and ERP rechecks are backfilled. Approval timers are
+    armed when an item next enters ``needs_approval`` or the approval
+    sweep handles it; the sweep still covers items already waiting.
+    """
+    import json as _json
+    import uuid as _uuid
+    from datetime import datetime as _dt, timezone as _tz
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS agent_timers (
+            id TEXT PRIMARY KEY,
+            organization_id TEXT NOT NULL,
+            box_id TEXT NOT NULL,
+            box_type TEXT NOT NULL DEFAULT 'ap_item',
+            timer_type TEXT NOT NULL,
+            due_at TIMESTAMPTZ NOT NULL,
+            payload TEXT,
+            claim_token TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            UNIQUE (box_id, timer_type)
+        )
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_agent_timers_due ON agent_timers(due_at)")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_agent_timers_org "
+        "ON agent_timers(organization_id, timer_type)"
+    )
+
+    def _parse(value):
+        try:
+            parsed = _dt.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except (TypeError, ValueError):
+            return None
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=_tz.utc)
+
+    def _load(raw):
+        if isinstance(raw, dict):
+            return raw
+        try:
+            loaded = _json.loads(raw or "{}")
+        except (TypeError, ValueError):
+            return {}
+        return loaded if isinstance(loaded, dict) else {}
+
+    timers = []
+    cur.execute(
+        "SELECT id, organization_id, metadata FROM ap_items WHERE state = 'snoozed'"
+    )
+    for row in cur.fetchall():
+        due = _parse(_load(row[2]).get("snoozed_until"))
+        if due is not None and row[1]:
+            timers.append((row[1], row[0], "snooze_expired", due))
+    cur.execute(
+        "SELECT id, organization_id, waiting_condition FROM ap_items "
+        "WHERE waiting_condition IS NOT NULL AND waiting_condition <> ''"
+    )
+    for row in cur.fetchall():
+        condition = _load(row[2])
+        if condition.get("type") != "external_dependency_unavailable":
+            continue
+        due = _parse(condition.get("expected_by"))
+        if due is not None and row[1]:
+            timers.append((row[1], row[0], "erp_recheck", due))
+
+    now = _dt.now(_tz.utc).isoformat()
+    for organization_id, box_id, timer_type, due in timers:
+        cur.execute(
+            """
+            INSERT INTO agent_timers
+            (id, organization_id, box_id, box_type, timer_type, due_at,
+             attempts, created_at, updated_at)
+            VALUES (%s, %s, %s, 'ap_item', %s, %s, 0, %s, %s)
+            ON CONFLICT (box_id, timer_type) DO NOTHING
+            """,
+            (f"tmr_{_uuid.uuid4().hex[:16]}", organization_id, box_id,
+             timer_type, due, now, now),
+        )
+
+
+@migration(104, "erp_vendor_cache / erp_account_cache — ERP directories out of settings_json")
+def _v104_erp_directory_cache(cur, db):
+    """Row-per-record caches for the ERP vendor list and chart of accounts.
+
+    Both used to be JSON blobs in ``organizations.settings_json``
+    (``vendor_list_cache`` / ``chart_of_accounts_cache``), rewritten
+    whole on every refresh. Rows are keyed by org, ERP entity
+    (``entity_key``, ``''`` for the default connection), ERP type and
+    record id, with the normalized record in ``payload``.
+    ``erp_cache_sync_state`` keeps the per-scope high-water mark used
+    by delta syncs.
+
+    Existing blobs are moved into the tables, stamped with their old
+    ``fetched_at`` so the 24h TTL carries over, and removed from
+    ``settings_json``.
+    """
+    import json as _json
+    from datetime import datetime as _dt, timezone as _tz
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS erp_vendor_cache (
+            organization_id TEXT NOT NULL,
+            entity_key TEXT NOT NULL DEFAULT '',
+            erp_type TEXT NOT NULL,
+            vendor_id TEXT NOT NULL,
+            name TEXT NOT NULL DEFAULT '',
+            name_normalized TEXT NOT NULL DEFAULT '',
+            email TEXT,
+            tax_id TEXT,
+            active INTEGER NOT NULL DEFAULT 1,
+            payload TEXT NOT NULL,
+            synced_at TEXT NOT NULL,
+            PRIMARY KEY (organization_id, entity_key, erp_type, vendor_id)
+        )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_erp_vendor_cache_name "
+        "ON erp_vendor_cache(organization_id, entity_key, erp_type, name_normalized)"
+    )
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS erp_account_cache (
+            organization_id TEXT NOT NULL,
+            entity_key TEXT NOT NULL DEFAULT '',
+            erp_type TEXT NOT NULL,
+            account_id TEXT NOT NULL,
+            name TEXT NOT NULL DEFAULT '',
+            name_normalized TEXT NOT NULL DEFAULT '',
+            code TEXT,
+            account_type TEXT,
+            active INTEGER NOT NULL DEFAULT 1,
+            payload TEXT NOT NULL,
+            synced_at TEXT NOT NULL,
+            PRIMARY KEY (organization_id, entity_key, erp_type, account_id)
+        )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_erp_account_cache_name "
+        "ON erp_account_cache(organization_id, entity_key, erp_type, name_normalized)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_erp_account_cache_code "
+        "ON erp_account_cache(organization_id, entity_key, erp_type, code)"
+    )
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS erp_cache_sync_state (
+            organization_id TEXT NOT NULL,
+            entity_key TEXT NOT NULL DEFAULT '',
+            erp_type TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            last_full_sync_at TEXT,
+            last_delta_sync_at TEXT,
+            high_water_mark TEXT,
+            row_count INTEGER,
+            PRIMARY KEY (organization_id, entity_key, erp_type, kind)
+        )
+    """)
+
+    def _norm(name):
+        return " ".join(str(name or "").lower().split())
+
+    cur.execute(
+        "SELECT id, settings_json FROM organizations "
+        "WHERE settings_json LIKE '%vendor_list_cache%' "
+        "OR settings_json LIKE '%chart_of_accounts_cache%'"
+    )
+    for row in cur.fetchall():
+        org_id = row[0]
+        try:
+            settings = _json.loads(row[1] or "{}")
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(settings, dict):
+            continue
+        for key, kind, list_key in (
+            ("vendor_list_cache", "vendors", "vendors"),
+            ("chart_of_accounts_cache", "accounts", "accounts"),
+        ):
+            cache = settings.pop(key, None)
+            if not isinstance(cache, dict):
+                continue
+            erp_type = str(cache.get("erp_type") or "").strip().lower()
+            fetched_at = str(cache.get("fetched_at") or "") or _dt.now(_tz.utc).isoformat()
+            records = [r for r in (cache.get(list_key) or []) if isinstance(r, dict)]
+            if not erp_type:
+                continue
+            written = 0
+            for record in records:
+                active = 0 if record.get("active", True) is False else 1
+                if kind == "vendors":
+                    record_id = str(record.get("vendor_id") or "").strip()
+                    if not record_id:
+                        continue
+                    cur.execute(
+                        """
+                        INSERT INTO erp_vendor_cache
+                        (organization_id, entity_key, erp_type, vendor_id, name,
+                         name_normalized, email, tax_id, active, payload, synced_at)
+                        VALUES (%s, '', %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        ON CONFLICT DO NOTHING
+                        """,
+                        (org_id, erp_type, record_id, str(record.get("name") or ""),
+                         _norm(record.get("name")), str(record.get("email") or ""),
+                         str(record.get("tax_id") or ""), active,
+                         _json.dumps(record), fetched_at),
+                    )
+                else:
+                    record_id = str(record.get("id") or "").strip()
+                    if not record_id:
+                        continue
+                    cur.execute(
+                        """
+                        INSERT INTO erp_account_cache
+                        (organization_id, entity_key, erp_type, account_id, name,
+                         name_normalized, code, account_type, active, payload, synced_at)
+                        VALUES (%s, '', %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        ON CONFLICT DO NOTHING
+                        """,
+                        (org_id, erp_type, record_id, str(record.get("name") or ""),
+                         _norm(record.get("name")), str(record.get("code") or ""),
+                         str(record.get("type") or ""), active,
+                         _json.dumps(record), fetched_at),
+                    )
+                written += 1
+            cur.execute(
+                """
+                INSERT INTO erp_cache_sync_state
+                (organization_id, entity_key, erp_type, kind, last_full_sync_at,
+                 high_water_mark, row_count)
+                VALUES (%s, '', %s, %s, %s, %s, %s)
+                ON CONFLICT DO NOTHING
+                """,
+                (org_id, erp_type, kind, fetched_at, fetched_at, written),
+            )
+        cur.execute(
+            "UPDATE organizations SET settings_json = %s WHERE id = %s",
+            (_json.dumps(settings), org_id),
+        )
+
+
+@migration(105, "org_cache NOTIFY triggers — cross-process org cache invalidation")
+def _v105_org_cache_notify(cur, db):
+    """Announce writes to the rows ``solden.core.org_cache`` keeps.
+
+    Every INSERT / UPDATE / DELETE on ``organizations``,
+    ``subscriptions`` and ``erp_connections`` sends
+    ``NOTIFY org_cache, '<table>:<organization_id>'`` on commit; each
+    process's listener drops its copy. The trigger argument names the
+    org id column. ``TRUNCATE`` is a statement trigger with no row, so
+    it sends an empty id, which drops the whole table's namespace.
+    """
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION org_cache_notify()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            org_id TEXT := '';
+        BEGIN
+            IF TG_LEVEL = 'ROW' THEN
+                IF TG_OP = 'DELETE' THEN
+                    org_id := to_jsonb(OLD) ->> TG_ARGV[0];
+                ELSE
+                    org_id := to_jsonb(NEW) ->> TG_ARGV[0];
+                END IF;
+            END IF;
+            PERFORM pg_notify('org_cache', TG_TABLE_NAME || ':' || COALESCE(org_id, ''));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table, column in (
+        ("organizations", "id"),
+        ("subscriptions", "organization_id"),
+        ("erp_connections", "organization_id"),
+    ):
+        cur.execute(
+            f"""
+            CREATE OR REPLACE TRIGGER trg_{table}_org_cache_notify
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            FOR EACH ROW
+            EXECUTE FUNCTION org_cache_notify('{column}')
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE OR REPLACE TRIGGER trg_{table}_org_cache_truncate
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION org_cache_notify('{column}')
+            """
+        )
+
+
+@migration(106, "ap_kpi_item_facts / ap_kpi_rollup — incrementally maintained AP KPIs")
+def _v106_ap_kpi_rollup(cur, db):
+    """Per-item KPI facts and their per-org sums.
+
+    ``ap_kpi_item_facts`` holds what each AP item contributes to the
+    headline KPIs; ``ap_kpi_rollup`` holds the per-org totals keyed by
+    ``(metric, bucket)``, kept in step by the ``ap_kpi_rollup``
+    projector. ``discount_deadline`` is only set for open, untaken
+    discounts, and the partial index makes "which of those have passed"
+    a range scan. No backfill: an org is seeded by a full reconcile on
+    its first summary read (``ap_kpi_rollup_state.seeded_at``).
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ap_kpi_item_facts (
+            ap_item_id TEXT PRIMARY KEY,
+            organization_id TEXT NOT NULL,
+            state TEXT NOT NULL,
+            completed BOOLEAN NOT NULL DEFAULT FALSE,
+            touchless BOOLEAN NOT NULL DEFAULT FALSE,
+            exception BOOLEAN NOT NULL DEFAULT FALSE,
+            cycle_hours DOUBLE PRECISION,
+            discount_candidate BOOLEAN NOT NULL DEFAULT FALSE,
+            discount_missed BOOLEAN NOT NULL DEFAULT FALSE,
+            discount_amount DOUBLE PRECISION NOT NULL DEFAULT 0,
+            discount_deadline TIMESTAMPTZ,
+            updated_at TEXT
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ap_kpi_item_facts_org
+        ON ap_kpi_item_facts (organization_id)
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ap_kpi_item_facts_discount_deadline
+        ON ap_kpi_item_facts (organization_id, discount_deadline)
+        WHERE discount_deadline IS NOT NULL
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ap_kpi_rollup (
+            organization_id TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            bucket TEXT NOT NULL DEFAULT '',
+            count BIGINT NOT NULL DEFAULT 0,
+            total DOUBLE PRECISION NOT NULL DEFAULT 0,
+            PRIMARY KEY (organization_id, metric, bucket)
+        )
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ap_kpi_rollup_state (
+            organization_id TEXT PRIMARY KEY,
+            seeded_at TEXT,
+            reconciled_at TEXT,
+            items_reconciled INTEGER NOT NULL DEFAULT 0,
+            last_drift_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+
+# Generated timestamptz twins of the ISO TEXT timestamps that time-range
+# queries filter on. ``solden.core.database.dict_row`` hides these from
+# result rows, so ``SELECT *`` callers keep seeing the TEXT columns only.
+TYPED_TIMESTAMP_COLUMNS: Tuple[Tuple[str, str, str], ...] = (
+    ("ap_items", "created_at", "created_at_tz"),
+    ("ap_items", "updated_at", "updated_at_tz"),
+    ("ap_items", "erp_posted_at", "erp_posted_at_tz"),
+    ("audit_events", "ts", "ts_tz"),
+    ("llm_call_log", "created_at", "created_at_tz"),
+    ("ap_sla_metrics", "created_at", "created_at_tz"),
+    ("outbox_events", "created_at", "created_at_tz"),
+)
+
+
+@migration(107, "typed timestamptz columns + covering indexes for time-range queries")
+def _v107_typed_timestamps(cur, db):
+    """Generated ``timestamptz`` columns for the hot TEXT timestamps.
+
+    Reports and ops metrics used to filter with ``created_at >= %s``
+    (a string comparison that only works while every writer emits the
+    same ISO shape) or ``created_at::timestamptz`` per row, which no
+    index can serve. Each column in ``TYPED_TIMESTAMP_COLUMNS`` gets a
+    ``STORED`` twin computed by ``solden_iso_ts`` — the cast pinned to
+    UTC so it is immutable, with unparseable text mapping to NULL
+    rather than failing the write.
+
+    Indexes: b-tree on the org-scoped filters (org+state+created,
+    org+created, org+posted, org+event_type+ts, and org+created on
+    ``llm_call_log`` covering the cost columns for index-only month
+    aggregates); BRIN on the append-only ``ts``/``created_at`` columns,
+    which are physically in insert order.
+
+    ``ADD COLUMN ... STORED`` rewrites each table once under an
+    ACCESS EXCLUSIVE lock, so run this in a deploy window on large
+    tenants.
+    """
+    cur.execute(
+        """
+        CREATE OR REPLACE FUNCTION solden_iso_ts(value TEXT)
+        RETURNS TIMESTAMPTZ
+        LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE
+        SET timezone = 'UTC'
+        AS $$
+        BEGIN
+            IF value IS NULL OR btrim(value) = '' THEN
+                RETURN NULL;
+            END IF;
+            RETURN value::timestamptz;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    for table, source, column in TYPED_TIMESTAMP_COLUMNS:
+        cur.execute(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} TIMESTAMPTZ "
+            f"GENERATED ALWAYS AS (solden_iso_ts({source})) STORED"
+        )
+    for ddl in (
+        "CREATE INDEX IF NOT EXISTS idx_ap_items_org_state_created_tz "
+        "ON ap_items(organization_id, state, created_at_tz)",
+        "CREATE INDEX IF NOT EXISTS idx_ap_items_org_created_tz "
+        "ON ap_items(organization_id, created_at_tz)",
+        "CREATE INDEX IF NOT EXISTS idx_ap_items_org_posted_tz "
+        "ON ap_items(organization_id, erp_posted_at_tz) "
+        "WHERE erp_posted_at_tz IS NOT NULL",
+        "CREATE INDEX IF NOT EXISTS idx_audit_org_event_ts_tz "
+        "ON audit_events(organization_id, event_type, ts_tz)",
+        "CREATE INDEX IF NOT EXISTS idx_llm_call_log_org_created_tz "
+        "ON llm_call_log(organization_id, created_at_tz) "
+        "INCLUDE (cost_estimate_usd, input_tokens, output_tokens)",
+        "CREATE INDEX IF NOT EXISTS brin_audit_events_ts_tz "
+        "ON audit_events USING brin (ts_tz)",
+        "CREATE INDEX IF NOT EXISTS brin_ap_sla_metrics_created_tz "
+        "ON ap_sla_metrics USING brin (created_at_tz)",
+        "CREATE INDEX IF NOT EXISTS brin_outbox_events_created_tz "
+        "ON outbox_events USING brin (created_at_tz)",
+    ):
+        cur.execute(ddl)
+
+
+@migration(108, "ap_invoice_fingerprints — org-wide duplicate-invoice blocking index")
+def _v108_invoice_fingerprints(cur, db):
+    """Fingerprint rows for duplicate-invoice candidate lookup.
+
+    One row per AP item (``InvoiceFingerprintStore``). The two indexes
+    are the two blocking keys: normalized invoice number across the org
+    (partial — blank numbers never block), and vendor key + currency +
+    amount bucket + invoice day. No backfill here: the
+    ``invoice_fingerprint_sync`` sweep walks each org from the cursor in
+    ``ap_invoice_fingerprint_state``, served by the new
+    ``(organization_id, updated_at, id)`` index on ``ap_items``.
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ap_invoice_fingerprints (
+            ap_item_id TEXT PRIMARY KEY,
+            organization_id TEXT NOT NULL,
+            vendor_key TEXT NOT NULL DEFAULT '',
+            invoice_number_norm TEXT NOT NULL DEFAULT '',
+            currency TEXT NOT NULL DEFAULT 'USD',
+            amount DOUBLE PRECISION,
+            amount_bucket INTEGER,
+            invoice_day INTEGER,
+            source_updated_at TEXT
+        )
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ap_invoice_fingerprints_number
+        ON ap_invoice_fingerprints (organization_id, invoice_number_norm)
+        WHERE invoice_number_norm <> ''
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ap_invoice_fingerprints_vendor_amount_day
+        ON ap_invoice_fingerprints (organization_id, vendor_key, currency, amount_bucket, invoice_day)
+    """)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS ap_invoice_fingerprint_state (
+            organization_id TEXT PRIMARY KEY,
+            cursor_updated_at TEXT NOT NULL DEFAULT '',
+            cursor_id TEXT NOT NULL DEFAULT '',
+            synced_at TEXT
+        )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ap_items_org_updated_id "
+        "ON ap_items(organization_id, updated_at, id)"
+    )
+
+
+@migration(109, "policy_replay_runs — streaming policy replay jobs with progress")
+def _v109_policy_replay_runs(cur, db):
+    """Background policy replay over a full history window.
+
+    ``PolicyService.run_replay`` (the ``run_policy_replay`` Celery task)
+    pages ``ap_items`` through a server-side cursor and folds the deltas
+    into a compact report. This row carries progress while the run is
+    going (``items_evaluated`` of ``items_total``, running ``summary_json``)
+    and the report once done.
+
+    Status lifecycle: ``queued`` → ``running`` → ``done`` | ``failed``.
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS policy_replay_runs (
+            id TEXT PRIMARY KEY,
+            organization_id TEXT NOT NULL,
+            target_version_id TEXT NOT NULL,
+            target_version_number INTEGER,
+            target_kind TEXT NOT NULL,
+            requested_by TEXT NOT NULL,
+            filters_json TEXT NOT NULL DEFAULT '{}',
+            status TEXT NOT NULL DEFAULT 'queued',
+            items_total INTEGER,
+            items_evaluated INTEGER NOT NULL DEFAULT 0,
+            summary_json TEXT,
+            report_json TEXT,
+            error_message TEXT,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            updated_at TEXT,
+            completed_at TEXT
+        )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_policy_replay_runs_org_created "
+        "ON policy_replay_runs(organization_id, created_at DESC)"
+    )
+
+
+@migration(110, "outbox_events processing index — reclaim rows from dead workers")
+def _v110_outbox_processing_lease(cur, db):
+    """The worker claim reclaims rows left in ``processing`` past
+    ``OutboxWorker.PROCESSING_LEASE_SECONDS``; index them by claim time
+    so that arm of the claim doesn't scan the whole table."""
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_outbox_processing_claimed "
+        "ON outbox_events(last_attempted_at) "
+        "WHERE status = 'processing'"
+    )
+
+
+@migration(111, "policy_replay_partitions — replay runs fanned out over keyset ranges")
+def _v111_policy_replay_partitions(cur, db):
+    """One row per ``(created_at_tz, id)`` range of a replay run.
+
+    ``PolicyService.start_replay_run`` plans the ranges and the
+    ``replay_policy_partition`` Celery task replays each one, storing a
+    partial report here; the last partition to finish merges them into
+    ``policy_replay_runs``. Bounds are ISO text, cast back to
+    ``timestamptz`` in the range filter; the last range has no upper
+    bound.
+
+    Status lifecycle: ``queued`` → ``running`` → ``done`` | ``failed``.
+    The partial index serves the stale-run sweep.
+    """
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS policy_replay_partitions (
+            run_id TEXT NOT NULL,
+            partition_index INTEGER NOT NULL,
+            organization_id TEXT NOT NULL,
+            lower_created_at TEXT NOT NULL,
+            lower_id TEXT NOT NULL,
+            upper_created_at TEXT,
+            upper_id TEXT,
+            status TEXT NOT NULL DEFAULT 'queued',
+            items_evaluated INTEGER NOT NULL DEFAULT 0,
+            report_json TEXT,
+            error_message TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT,
+            PRIMARY KEY (run_id, partition_index)
+        )
+    """)
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_policy_replay_runs_running "
+        "ON policy_replay_runs(updated_at) WHERE status = 'running'"
+    )
+
+
+@migration(112, "agent_timers.scheduled_at — stable timer idempotency key")
+def _v112_agent_timer_scheduled_at(cur, db):
+    """``claim_due_timers`` pushes ``due_at`` out by the lease, so a
+    timer handed out again after a lapsed claim came back with a new
+    ``due_at`` and a new idempotency key, and fired twice.
+    ``scheduled_at`` is the time it was registered for; it only changes
+    when the timer is re-armed.
+
+    Rows claimed at migration time get their lease-pushed ``due_at``;
+    at worst each of those fires once more.
+    """
+    cur.execute("ALTER TABLE agent_timers ADD COLUMN IF NOT EXISTS scheduled_at TIMESTAMPTZ")
+    cur.execute("UPDATE agent_timers SET scheduled_at = due_at WHERE scheduled_at IS NULL")
+
+
+@migration(113, "agent_case_index backfill — index belief states written before it existed")
+def _v113_agent_case_index_backfill(cur, db):
+    """Index belief states written before ``agent_case_index`` existed.
+
+    ``AgentMemoryService`` writes the index row in the same transaction
+    as the belief state, so only older rows are missing. Recall used to
+    backfill them on its first call per process, in the request path;
+    the feature vector is computed in Python, so the backfill runs here
+    in pages instead of as one ``INSERT ... SELECT``. A database that
+    has never had ``agent_belief_states`` has nothing to backfill — the
+    service creates both tables.
+    """
+    import json as _json
+
+    from solden.services.agent_case_index import CASE_INDEX_TABLE_SQL, case_index_entry
+
+    cur.execute("SELECT to_regclass('agent_belief_states')")
+    row = cur.fetchone()
+    if row is None or row[0] is None:
+        return
+    cur.execute(CASE_INDEX_TABLE_SQL)
+
+    def _load(raw):
+        if isinstance(raw, dict):
+            return raw
+        try:
+            loaded = _json.loads(raw or "{}")
+        except (TypeError, ValueError):
+            return {}
+        return loaded if isinstance(loaded, dict) else {}
+
+    page = 500
+    while True:
+        cur.execute(
+            """
+            SELECT b.organization_id, b.skill_id, b.ap_item_id, b.current_state, b.status,
+                   b.belief_json, b.next_action_json, b.updated_at
+            FROM agent_belief_states b
+            LEFT JOIN agent_case_index c
+              ON c.organization_id = b.organization_id
+             AND c.skill_id = b.skill_id
+             AND c.ap_item_id = b.ap_item_id
+            WHERE c.ap_item_id IS NULL
+            LIMIT %s
+            """,
+            (page,),
+        )
+        rows = cur.fetchall()
+        for row in rows:
+            entry = case_index_entry(
+                ap_item_id=str(row[2] or ""),
+                current_state=row[3],
+                status=row[4],
+                belief=_load(row[5]),
+                next_action=_load(row[6]),
+                updated_at=str(row[7] or ""),
+            )
+            cur.execute(
+                """
+                INSERT INTO agent_case_index (
+                    organization_id, skill_id, ap_item_id, vendor_key, vendor_token, document_type,
+                    state_key, next_action_type, requires_field_review, features, updated_at
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (organization_id, skill_id, ap_item_id) DO NOTHING
+                """,
+                (
+                    row[0], row[1], entry["ap_item_id"], entry["vendor_key"], entry["vendor_token"],
+                    entry["document_type"], entry["state_key"], entry["next_action_type"],
+                    entry["requires_field_review"], entry["features"], entry["updated_at"],
+                ),
+            )
+        if len(rows) < page:
+            break
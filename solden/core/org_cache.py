@@ -0,0 +1,352 @@
+"""Process-local read-through cache for per-organization rows.
+
+Every request and every agent action resolves the same handful of
+org-scoped rows: the ``organizations`` row (and the ``OrganizationConfig``
+parsed out of its settings), the org's ``subscriptions`` row and its
+active ``erp_connections`` (decrypted). Each lookup used to be a
+``SELECT`` plus JSON decoding or Fernet decryption, several times per
+processed invoice.
+
+:class:`OrgCache` keeps those values per process, keyed by
+``(namespace, organization_id)``:
+
+* **Read-through.** ``get`` returns a deep copy of the cached value or
+  calls the loader on a miss. Missing rows (``None``) are cached too,
+  so ``ensure_organization`` on a known org costs nothing.
+* **Versioned fills.** Invalidating a key bumps its version. A fill
+  records the version before it reads the database and is dropped if
+  the version moved while it was reading, so a read that raced a
+  write can never park the old row in the cache.
+* **Invalidation.** Writers in the stores call ``invalidate`` after
+  they commit. Migration 105 adds triggers on the three tables that
+  ``NOTIFY org_cache, '<table>:<organization_id>'``; each process
+  runs one listener thread that applies those to its own cache, so
+  writes from other web and worker processes land within a round
+  trip. ``TRUNCATE`` notifies with an empty id and drops the table's
+  namespaces.
+* **TTL.** Entries expire after ``ORG_CACHE_TTL_SECONDS`` (300) as a
+  safety net. While the listener is not connected, fills use
+  ``ORG_CACHE_UNLISTENED_TTL_SECONDS`` (5) instead and the cache is
+  cleared on every (re)connect, since notifications sent while it was
+  down are lost. ``ORG_CACHE_TTL_SECONDS=0`` turns the cache off.
+
+``metrics_snapshot`` exposes hits, misses, invalidations and discarded
+fills per namespace (``GET /api/ops/org-cache``).
+"""
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "org_cache"
+
+NS_ORGANIZATION = "organization"
+NS_ORG_CONFIG = "org_config"
+NS_SUBSCRIPTION = "subscription"
+NS_ERP_CONNECTIONS = "erp_connections"
+
+# Which cached namespaces a write to each table makes stale.
+TABLE_NAMESPACES: Dict[str, Tuple[str, ...]] = {
+    "organizations": (NS_ORGANIZATION, NS_ORG_CONFIG),
+    "subscriptions": (NS_SUBSCRIPTION,),
+    "erp_connections": (NS_ERP_CONNECTIONS,),
+}
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_UNLISTENED_TTL_SECONDS = 5.0
+DEFAULT_MAX_ENTRIES = 20_000
+LISTEN_RECONNECT_MAX_SECONDS = 60.0
+# How often a waiting listener wakes to check for ``stop``.
+LISTEN_POLL_SECONDS = 5.0
+
+
+def _env_seconds(name: str, default: float) -> float:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning("[OrgCache] ignoring non-numeric %s=%r", name, raw)
+        return default
+
+
+def _notifies(conn: Any) -> Any:
+    try:
+        return conn.notifies(timeout=LISTEN_POLL_SECONDS)
+    except TypeError:
+        # psycopg < 3.2: no timeout, the generator blocks until a
+        # notification or a dropped connection.
+        return conn.notifies()
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float  # time.monotonic()
+
+
+@dataclass
+class NamespaceMetrics:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    discarded_fills: int = 0
+
+
+class OrgCache:
+    """Versioned per-process cache of org-scoped rows.
+
+    Thread-safe. The loader runs outside the lock, so two threads that
+    miss on the same key may both read the database; the second fill
+    simply overwrites the first.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: Optional[float] = None,
+        unlistened_ttl_seconds: Optional[float] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.ttl_seconds = (
+            _env_seconds("ORG_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+            if ttl_seconds is None else float(ttl_seconds)
+        )
+        self.unlistened_ttl_seconds = min(
+            self.ttl_seconds,
+            _env_seconds("ORG_CACHE_UNLISTENED_TTL_SECONDS", DEFAULT_UNLISTENED_TTL_SECONDS)
+            if unlistened_ttl_seconds is None else float(unlistened_ttl_seconds),
+        )
+        self.max_entries = max(1, int(max_entries))
+        self.metrics: Dict[str, NamespaceMetrics] = {}
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._listener: Optional[threading.Thread] = None
+        self._listening = False
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @property
+    def listening(self) -> bool:
+        return self._listening
+
+    # ------------------------------------------------------------------
+    # Read-through
+    # ------------------------------------------------------------------
+
+    def get(self, namespace: str, organization_id: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for ``(namespace, organization_id)``,
+        filling it from ``loader`` on a miss."""
+        if not self.enabled or not organization_id:
+            return loader()
+        self._check_fork()
+        key = (namespace, str(organization_id))
+        now = time.monotonic()
+        with self._lock:
+            metrics = self._metrics(namespace)
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                metrics.hits += 1
+                value = entry.value
+                hit = True
+            else:
+                metrics.misses += 1
+                token = (self._epoch, self._versions.get(key, 0))
+                hit = False
+        if hit:
+            return copy.deepcopy(value)
+
+        value = loader()
+        ttl = self.ttl_seconds if self._listening else self.unlistened_ttl_seconds
+        with self._lock:
+            if (self._epoch, self._versions.get(key, 0)) != token:
+                self._metrics(namespace).discarded_fills += 1
+            else:
+                if key not in self._entries and len(self._entries) >= self.max_entries:
+                    self._evict(time.monotonic())
+                self._entries[key] = _Entry(copy.deepcopy(value), time.monotonic() + ttl)
+        return value
+
+    def _evict(self, now: float) -> None:
+        """Make room for one entry: drop expired ones, else the oldest fill."""
+        expired = [k for k, e in self._entries.items() if e.expires_at <= now]
+        for k in expired:
+            del self._entries[k]
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+
+    def invalidate(self, table: str, organization_id: Optional[str] = None) -> None:
+        """Drop what a write to ``table`` made stale — one org, or every
+        org when ``organization_id`` is empty."""
+        namespaces = TABLE_NAMESPACES.get(table)
+        if not namespaces:
+            return
+        org_id = str(organization_id or "")
+        with self._lock:
+            if not org_id:
+                for key in [k for k in self._entries if k[0] in namespaces]:
+                    del self._entries[key]
+                # Outstanding fills for any org in these namespaces
+                # started before the write; the epoch covers them all.
+                self._epoch += 1
+                for ns in namespaces:
+                    self._metrics(ns).invalidations += 1
+                return
+            for ns in namespaces:
+                key = (ns, org_id)
+                self._entries.pop(key, None)
+                self._versions[key] = self._versions.get(key, 0) + 1
+                self._metrics(ns).invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry and every in-flight fill."""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._epoch += 1
+
+    def apply_notification(self, payload: str) -> None:
+        """Handle one ``'<table>:<organization_id>'`` NOTIFY payload."""
+        table, _, org_id = str(payload or "").partition(":")
+        self.invalidate(table, org_id)
+
+    # ------------------------------------------------------------------
+    # Cross-process invalidation
+    # ------------------------------------------------------------------
+
+    def start_listener(self, dsn: Optional[str]) -> None:
+        """Start the ``LISTEN org_cache`` thread once per process."""
+        if not self.enabled or not dsn:
+            return
+        self._check_fork()
+        if self._listener is not None:
+            return
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(
+                target=self._listen, args=(dsn,), name="org-cache-listener", daemon=True,
+            )
+        self._listener.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _listen(self, dsn: str) -> None:
+        try:
+            import psycopg
+        except ImportError:
+            logger.info("[OrgCache] psycopg unavailable; relying on the %ss TTL", self.unlistened_ttl_seconds)
+            return
+
+        delay = 1.0
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    # Writes made while we were not listening were never
+                    # announced to this process.
+                    self.clear()
+                    self._listening = True
+                    delay = 1.0
+                    while not self._stop.is_set():
+                        for notify in _notifies(conn):
+                            self.apply_notification(notify.payload)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("[OrgCache] LISTEN %s connection lost — %s", NOTIFY_CHANNEL, exc)
+            finally:
+                if self._listening:
+                    self._listening = False
+                    self.clear()
+            self._stop.wait(delay)
+            delay = min(delay * 2, LISTEN_RECONNECT_MAX_SECONDS)
+
+    def _check_fork(self) -> None:
+        """A forked child inherits the entries but not the listener thread."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._entries.clear()
+            self._versions.clear()
+            self._epoch += 1
+            self._listener = None
+            self._listening = False
+            self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _metrics(self, namespace: str) -> NamespaceMetrics:
+        metrics = self.metrics.get(namespace)
+        if metrics is None:
+            metrics = self.metrics[namespace] = NamespaceMetrics()
+        return metrics
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            namespaces = {
+                name: {
+                    "hits": m.hits,
+                    "misses": m.misses,
+                    "hit_rate": round(m.hits / (m.hits + m.misses), 4) if (m.hits + m.misses) else 0,
+                    "invalidations": m.invalidations,
+                    "discarded_fills": m.discarded_fills,
+                }
+                for name, m in self.metrics.items()
+            }
+            entries = len(self._entries)
+        return {
+            "enabled": self.enabled,
+            "listening": self._listening,
+            "ttl_seconds": self.ttl_seconds if self._listening else self.unlistened_ttl_seconds,
+            "entries": entries,
+            "namespaces": namespaces,
+        }
+
+
+_caches: Dict[str, OrgCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_org_cache(dsn: Optional[str] = None) -> OrgCache:
+    """Process-wide cache for the database at ``dsn``."""
+    key = dsn or ""
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = _caches[key] = OrgCache()
+    return cache
+
+
+def clear_org_caches() -> None:
+    """Empty every cache in this process (tests: ``TRUNCATE`` between
+    tests notifies asynchronously, so the next test could still see
+    rows from the last one)."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
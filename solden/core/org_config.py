@@ -422,10 +422,20 @@ def get_org_config(organization_id: str) -> Optional[OrganizationConfig]:
     from solden.core.database import get_db
 
     db = get_db()
-    org = db.get_organization(organization_id)
-    if not org:
-        return None
-    return _load_config_from_org_settings(org)
+
+    def _load() -> Optional[OrganizationConfig]:
+        org = db.get_organization(organization_id)
+        if not org:
+            return None
+        return _load_config_from_org_settings(org)
+
+    # The parsed config is cached next to the org row it came from and
+    # invalidated with it (``solden.core.org_cache``).
+    if not hasattr(type(db), "_org_cache"):
+        return _load()
+    from solden.core.org_cache import NS_ORG_CONFIG
+
+    return db._org_cache().get(NS_ORG_CONFIG, organization_id, _load)
 
 
 def save_org_config(config: OrganizationConfig):
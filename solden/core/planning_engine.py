@@ -452,13 +452,20 @@ class DeterministicPlanningEngine:
         # Operators copy-paste vendor-status text from
         # ``vendor_inquiry.lookup`` into their own emails instead.
         elif timer_type == "approval_timeout":
+            # agent_timers arms this for the reminder milestone first,
+            # then the escalation milestone.
+            summary = (
+                "Approval reminder sent to pending approvers"
+                if event.payload.get("stage") == "reminder"
+                else "Approval escalated to next tier due to timeout"
+            )
             return Plan(
                 event_type="timer_fired",
                 actions=[
                     Action("escalate_approval", "DET", {},
                            "Escalate approval to next tier in hierarchy"),
                     Action("post_timeline_entry", "DET",
-                           {"summary": "Approval escalated to next tier due to timeout"},
+                           {"summary": summary},
                            "Log escalation to Box timeline"),
                 ],
                 box_id=box_id,
@@ -2,7 +2,8 @@
 
 Tracks latency per processing step for SLA compliance monitoring.
 Each step is timed with a context manager and logged to the
-``ap_sla_metrics`` table.
+``ap_sla_metrics`` table (buffered, written in batches by a background
+flusher) with per-minute aggregates in ``ap_sla_metrics_rollup``.
 
 SLA targets (§11):
   classification:    <5s  (Starter) / <3s  (Enterprise)
@@ -26,12 +27,16 @@ Usage:
 """
 from __future__ import annotations
 
+import atexit
 import logging
+import os
+import threading
 import time
 import uuid
+from collections import deque
 from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -50,11 +55,45 @@ SLA_TARGETS_MS = {
 }
 
 
+_METRIC_COLUMNS = (
+    "id", "ap_item_id", "organization_id", "step_name",
+    "latency_ms", "breached", "created_at",
+)
+
+
 class SLATracker:
-    """Records per-step latency metrics to the database."""
+    """Records per-step latency metrics to the database.
+
+    ``record`` never touches the database on the hot path: breach
+    detection uses a per-org tier cache, the breach alert is logged
+    immediately, and the measurement is appended to an in-memory queue.
+    A daemon flusher thread drains the queue every
+    ``FLUSH_INTERVAL_SECONDS`` (sooner once ``FLUSH_MAX_ROWS`` are
+    waiting) with one ``COPY`` into ``ap_sla_metrics`` plus one
+    multi-row upsert into the per-minute ``ap_sla_metrics_rollup``,
+    in a single transaction. ``flush()`` drains synchronously (tests,
+    shutdown); an ``atexit`` hook flushes whatever is left.
+    """
+
+    FLUSH_INTERVAL_SECONDS = 1.0
+    FLUSH_MAX_ROWS = 500
+    # Back-pressure: past this many unflushed rows (DB down) new
+    # measurements are dropped rather than growing without bound.
+    MAX_BUFFERED_ROWS = 50_000
+    TIER_CACHE_TTL_SECONDS = 300.0
 
-    def __init__(self, db: Any = None):
+    def __init__(self, db: Any = None, *, background: bool = True):
         self._db = db
+        self._background = background
+        # deque.append / popleft are atomic, so producers never take a lock.
+        self._queue: Deque[Tuple[Any, ...]] = deque()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self._dropped = 0
+        self._tiers: Dict[str, Tuple[str, float]] = {}
 
     def _get_db(self) -> Any:
         if self._db is not None:
@@ -69,18 +108,26 @@ class SLATracker:
     def _resolve_tier(self, organization_id: str, db: Any) -> str:
         """Resolve workspace tier (starter/enterprise) for SLA checking.
 
-        Returns 'starter' (most permissive) when tier cannot be determined.
+        Cached per org for ``TIER_CACHE_TTL_SECONDS``; a plan change
+        applies to breach detection within that window. Returns
+        'starter' (most permissive) when tier cannot be determined.
         """
+        cached = self._tiers.get(organization_id)
+        now = time.monotonic()
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        tier = "starter"
         try:
             sub = db.get_subscription_record(organization_id) if hasattr(db, "get_subscription_record") else None
             if sub:
                 plan = str(sub.get("plan") or "").lower()
                 # Enterprise tier uses tighter SLAs
                 if plan in ("enterprise", "enterprise_annual"):
-                    return "enterprise"
+                    tier = "enterprise"
         except Exception:
             pass
-        return "starter"
+        self._tiers[organization_id] = (tier, now + self.TIER_CACHE_TTL_SECONDS)
+        return tier
 
     def record(
         self,
@@ -90,14 +137,20 @@ class SLATracker:
         ap_item_id: Optional[str] = None,
         organization_id: Optional[str] = None,
         breached: Optional[bool] = None,
-    ) -> None:
+        target_ms: Optional[int] = None,
+    ) -> Optional[str]:
         """Record a latency measurement for an SLA step.
 
         §11: Breach detection uses the workspace's tier (starter/enterprise).
-        Enterprise workspaces have tighter targets than Starter.
+        Enterprise workspaces have tighter targets than Starter. Callers
+        with their own budget (UI beacons) pass ``target_ms``.
 
         ``organization_id`` is required — SLA metrics are per-tenant, and a
         missing org used to silently bind to the legacy ``"default"`` bucket.
+
+        Returns the metric id, or ``None`` when the measurement was not
+        queued (no database, or the buffer is full). The row itself is
+        written by the next flush.
         """
         from solden.core.org_utils import assert_org_id
 
@@ -106,75 +159,191 @@ class SLATracker:
         )
         db = self._get_db()
         if not db:
-            return
+            return None
 
         # Check if SLA was breached against THIS workspace's tier
-        if breached is None:
+        if target_ms is None:
             targets = SLA_TARGETS_MS.get(step_name)
             if targets:
                 tier = self._resolve_tier(organization_id, db)
                 target_ms = targets.get(tier, targets.get("starter", 999999))
-                breached = latency_ms > target_ms
+        if breached is None:
+            breached = target_ms is not None and latency_ms > target_ms
 
-        try:
-            db.initialize()
-            now = datetime.now(timezone.utc).isoformat()
-            metric_id = f"SLA-{uuid.uuid4().hex[:12]}"
-            sql = (
-                "INSERT INTO ap_sla_metrics "
-                "(id, ap_item_id, organization_id, step_name, latency_ms, breached, created_at) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+        # Alerts don't wait for the flush.
+        if breached:
+            logger.warning(
+                "[SLA] %s breached: %dms (target: %sms, org=%s)",
+                step_name, latency_ms, target_ms, organization_id,
             )
-            with db.connect() as conn:
-                conn.execute(sql, (
-                    metric_id, ap_item_id, organization_id,
-                    step_name, latency_ms, 1 if breached else 0, now,
-                ))
-                conn.commit()
 
-            if breached:
+        if len(self._queue) >= self.MAX_BUFFERED_ROWS:
+            self._dropped += 1
+            if self._dropped == 1 or self._dropped % 1000 == 0:
                 logger.warning(
-                    "[SLA] %s breached: %dms (target: %s)",
-                    step_name, latency_ms, SLA_TARGETS_MS.get(step_name),
+                    "[SLA] metric buffer full, dropped %d measurement(s)", self._dropped,
                 )
-        except Exception as exc:
-            logger.debug("[SLA] Failed to record metric: %s", exc)
+            return None
+
+        metric_id = f"SLA-{uuid.uuid4().hex[:12]}"
+        self._queue.append((
+            metric_id, ap_item_id, organization_id, step_name,
+            int(latency_ms), 1 if breached else 0,
+            datetime.now(timezone.utc).isoformat(),
+        ))
+        if self._background:
+            self._ensure_flusher()
+            if len(self._queue) >= self.FLUSH_MAX_ROWS:
+                self._wake.set()
+        return metric_id
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def flush(self) -> int:
+        """Write every queued measurement; returns the number written.
+
+        On a write failure the batch goes back on the queue for the
+        next flush and the error is logged at debug level, as before.
+        """
+        written = 0
+        with self._flush_lock:
+            while self._queue:
+                batch: List[Tuple[Any, ...]] = []
+                try:
+                    while len(batch) < self.FLUSH_MAX_ROWS * 4:
+                        batch.append(self._queue.popleft())
+                except IndexError:
+                    pass
+                try:
+                    self._write_batch(batch)
+                except Exception as exc:
+                    logger.debug("[SLA] Failed to record %d metric(s): %s", len(batch), exc)
+                    self._queue.extendleft(reversed(batch))
+                    break
+                written += len(batch)
+        return written
+
+    def close(self, *, flush: bool = True) -> None:
+        """Stop the flusher thread, optionally draining the queue first."""
+        self._closed = True
+        self._wake.set()
+        flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join(timeout=5)
+        self._flusher = None
+        if flush:
+            self.flush()
+        else:
+            self._queue.clear()
+
+    def _write_batch(self, rows: List[Tuple[Any, ...]]) -> None:
+        db = self._get_db()
+        if not db:
+            return
+        rollup: Dict[Tuple[str, str, str], List[int]] = {}
+        for _id, _item, org, step, latency, breached, created_at in rows:
+            bucket = rollup.setdefault((org, step, created_at[:16]), [0, 0, 0, 0])
+            bucket[0] += 1
+            bucket[1] += latency
+            bucket[2] = max(bucket[2], latency)
+            bucket[3] += breached
+        rollup_params: List[Any] = []
+        for (org, step, minute), (total, latency_sum, max_ms, breached_count) in rollup.items():
+            rollup_params.extend((org, step, minute, total, latency_sum, max_ms, breached_count))
+
+        db.initialize()
+        with db.connect() as conn:
+            cur = conn.cursor()
+            with cur.copy(
+                f"COPY ap_sla_metrics ({', '.join(_METRIC_COLUMNS)}) FROM STDIN"
+            ) as copy:
+                for row in rows:
+                    copy.write_row(row)
+            cur.execute(
+                "INSERT INTO ap_sla_metrics_rollup AS r "
+                "(organization_id, step_name, bucket, total, latency_ms_sum, max_ms, breached_count) "
+                "VALUES " + ", ".join(["(%s, %s, %s, %s, %s, %s, %s)"] * len(rollup)) + " "
+                "ON CONFLICT (organization_id, bucket, step_name) DO UPDATE SET "
+                "total = r.total + EXCLUDED.total, "
+                "latency_ms_sum = r.latency_ms_sum + EXCLUDED.latency_ms_sum, "
+                "max_ms = GREATEST(r.max_ms, EXCLUDED.max_ms), "
+                "breached_count = r.breached_count + EXCLUDED.breached_count",
+                rollup_params,
+            )
+            conn.commit()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None or self._closed:
+            return
+        with self._start_lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="sla-metrics-flusher", daemon=True,
+            )
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _run_flusher(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.FLUSH_INTERVAL_SECONDS)
+            self._wake.clear()
+            if self._closed:
+                return
+            try:
+                self.flush()
+            except Exception as exc:  # never let the flusher die
+                logger.debug("[SLA] flusher error: %s", exc)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
 
     def get_summary(
         self, organization_id: str, hours: int = 24,
     ) -> Dict[str, Any]:
-        """Get SLA compliance summary for the last N hours."""
+        """Get SLA compliance summary for the last N hours.
+
+        Sums the per-minute rollup buckets, so the window starts at the
+        minute boundary and measurements still in the flush queue (at
+        most ``FLUSH_INTERVAL_SECONDS`` old) are not yet counted.
+        """
         db = self._get_db()
         if not db:
             return {}
 
         try:
             from datetime import timedelta
-            cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+            cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()[:16]
             sql = (
-                "SELECT step_name, COUNT(*) as total, "
-                "AVG(latency_ms) as avg_ms, MAX(latency_ms) as max_ms, "
-                "SUM(CASE WHEN breached = 1 THEN 1 ELSE 0 END) as breached_count "
-                "FROM ap_sla_metrics "
-                "WHERE organization_id = %s AND created_at >= %s "
+                "SELECT step_name, SUM(total) as total, "
+                "SUM(latency_ms_sum) as latency_ms_sum, MAX(max_ms) as max_ms, "
+                "SUM(breached_count) as breached_count "
+                "FROM ap_sla_metrics_rollup "
+                "WHERE organization_id = %s AND bucket >= %s "
                 "GROUP BY step_name"
             )
             with db.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(sql, (organization_id, cutoff))
-                rows = cur.fetchall()
+                rows = [dict(r) for r in cur.fetchall()]
             return {
                 "organization_id": organization_id,
                 "period_hours": hours,
                 "steps": [
                     {
-                        "step": dict(r)["step_name"],
-                        "total": dict(r)["total"],
-                        "avg_ms": round(dict(r)["avg_ms"] or 0),
-                        "max_ms": dict(r)["max_ms"] or 0,
-                        "breached": dict(r)["breached_count"] or 0,
+                        "step": r["step_name"],
+                        "total": int(r["total"] or 0),
+                        "avg_ms": round((r["latency_ms_sum"] or 0) / max(r["total"] or 0, 1)),
+                        "max_ms": r["max_ms"] or 0,
+                        "breached": int(r["breached_count"] or 0),
                         "compliance_pct": round(
-                            (1 - (dict(r)["breached_count"] or 0) / max(dict(r)["total"], 1)) * 100, 1
+                            (1 - (r["breached_count"] or 0) / max(r["total"] or 0, 1)) * 100, 1
                         ),
                     }
                     for r in rows
@@ -196,6 +365,26 @@ def get_sla_tracker() -> SLATracker:
     return _tracker
 
 
+def reset_sla_tracker(*, flush: bool = False) -> None:
+    """Stop and drop the singleton (tests). Unflushed rows are discarded
+    unless ``flush`` is set."""
+    global _tracker
+    tracker, _tracker = _tracker, None
+    if tracker is not None:
+        tracker.close(flush=flush)
+
+
+def _forget_tracker_after_fork() -> None:
+    # A forked worker (Celery prefork) inherits the parent's queue but not
+    # its flusher thread; start clean so rows are neither stuck nor
+    # written twice.
+    global _tracker
+    _tracker = None
+
+
+os.register_at_fork(after_in_child=_forget_tracker_after_fork)
+
+
 @contextmanager
 def track_step(
     step_name: str,
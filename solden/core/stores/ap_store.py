@@ -48,6 +48,56 @@ def _is_unique_violation(exc: Exception) -> bool:
 
 logger = logging.getLogger(__name__)
 
+_AUDIT_EVENT_INSERT_PREFIX = (
+    "INSERT INTO audit_events "
+    "(id, box_id, box_type, event_type, prev_state, new_state, "
+    "actor_type, actor_id, payload_json, external_refs, "
+    "idempotency_key, source, correlation_id, workflow_id, run_id, "
+    "decision_reason, governance_verdict, agent_confidence, "
+    "organization_id, entity_id, policy_version, agent_version, "
+    "capability_id, capability_version, tool_scope, ts) "
+    "VALUES "
+)
+_AUDIT_EVENT_INSERT_SQL = _AUDIT_EVENT_INSERT_PREFIX + "(" + ", ".join(["%s"] * 26) + ")"
+# Hot single-row reads.
+_AP_ITEM_BY_ID_SQL = "SELECT * FROM ap_items WHERE id = %s"
+_AP_ITEM_BY_THREAD_SQL = """
+    SELECT * FROM ap_items
+    WHERE organization_id = %s
+      AND (
+        thread_id = %s
+        OR id IN (
+          SELECT ap_item_id
+          FROM ap_item_sources
+          WHERE source_type = 'gmail_thread' AND source_ref = %s
+        )
+      )
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+# Batched form of ``_AP_ITEM_BY_THREAD_SQL``: newest matching item per
+# requested thread, via the thread column or a ``gmail_thread`` source.
+_AP_ITEMS_BY_THREADS_SQL = """
+    SELECT DISTINCT ON (lookup_thread_id) *
+    FROM (
+        SELECT ai.thread_id AS lookup_thread_id, ai.*
+        FROM ap_items ai
+        WHERE ai.organization_id = %s AND ai.thread_id = ANY(%s)
+        UNION ALL
+        SELECT src.source_ref AS lookup_thread_id, ai.*
+        FROM ap_item_sources src
+        JOIN ap_items ai ON ai.id = src.ap_item_id
+        WHERE ai.organization_id = %s
+          AND src.source_type = 'gmail_thread' AND src.source_ref = ANY(%s)
+    ) matches
+    ORDER BY lookup_thread_id, created_at DESC
+"""
+_AUDIT_EVENT_BY_ID_SQL = "SELECT * FROM audit_events WHERE id = %s"
+_AUDIT_EVENT_BY_KEY_SQL = "SELECT * FROM audit_events WHERE idempotency_key = %s"
+# Rows per multi-row INSERT in ``append_audit_events``. 26 params/row
+# keeps each statement well under psycopg's 65535-parameter ceiling.
+_AUDIT_BATCH_SIZE = 500
+
 
 class APStore:
     """Mixin providing all AP-domain persistence methods."""
@@ -273,7 +323,19 @@ class APStore:
             cur = conn.cursor()
             cur.execute(sql, values)
             conn.commit()
-        return self.get_ap_item(item_id)
+        item = self.get_ap_item(item_id)
+
+        # Duplicate-invoice fingerprint; the invoice_fingerprint_sync
+        # sweep re-indexes anything this misses.
+        if item and hasattr(self, "upsert_invoice_fingerprints"):
+            try:
+                self.upsert_invoice_fingerprints([item])
+            except Exception as fp_exc:
+                logger.warning(
+                    "[APStore] invoice fingerprint write failed for %s: %s",
+                    item_id, fp_exc,
+                )
+        return item
 
     def update_ap_item(self, ap_item_id: str, **kwargs) -> bool:
         """Update an AP item with column-whitelist enforcement and state machine validation.
@@ -600,6 +662,39 @@ class APStore:
                         ap_item_id, mirror_exc,
                     )
 
+            # Timer mirror — snooze / approval / ERP-recheck deadlines
+            # live in agent_timers so firing them never scans ap_items.
+            _TIMER_COLUMNS = {"state", "waiting_condition"}
+            if _TIMER_COLUMNS & kwargs.keys() and hasattr(self, "register_timer"):
+                try:
+                    from solden.services.agent_timers import sync_ap_item_timers
+
+                    sync_ap_item_timers(
+                        self,
+                        ap_item_id,
+                        fields=kwargs,
+                        organization_id=org_id,
+                        prev_state=prev_state,
+                    )
+                except Exception as mirror_exc:
+                    logger.warning(
+                        "[APStore] agent_timers mirror failed for %s: %s",
+                        ap_item_id, mirror_exc,
+                    )
+
+            # Duplicate-invoice fingerprint mirror.
+            if hasattr(self, "refresh_invoice_fingerprint"):
+                from solden.core.stores.invoice_fingerprint_store import FINGERPRINT_SOURCE_COLUMNS
+
+                if FINGERPRINT_SOURCE_COLUMNS & kwargs.keys():
+                    try:
+                        self.refresh_invoice_fingerprint(ap_item_id)
+                    except Exception as mirror_exc:
+                        logger.warning(
+                            "[APStore] invoice fingerprint mirror failed for %s: %s",
+                            ap_item_id, mirror_exc,
+                        )
+
         return updated
 
     def _build_decision_context_snapshot(
@@ -868,10 +963,9 @@ class APStore:
         ``logger.info(ap_item)`` cannot leak the plaintext.
         """
         self.initialize()
-        sql = "SELECT * FROM ap_items WHERE id = %s"
         with self.connect() as conn:
             cur = conn.cursor()
-            cur.execute(sql, (ap_item_id,))
+            cur.execute(_AP_ITEM_BY_ID_SQL, (ap_item_id,))
             row = cur.fetchone()
         return dict(row) if row else None
 
@@ -1419,28 +1513,34 @@ class APStore:
 
     def get_ap_item_by_thread(self, organization_id: str, thread_id: str) -> Optional[Dict[str, Any]]:
         self.initialize()
-        sql = (
-            """
-            SELECT * FROM ap_items
-            WHERE organization_id = %s
-              AND (
-                thread_id = %s
-                OR id IN (
-                  SELECT ap_item_id
-                  FROM ap_item_sources
-                  WHERE source_type = 'gmail_thread' AND source_ref = %s
-                )
-              )
-            ORDER BY created_at DESC
-            LIMIT 1
-            """
-        )
         with self.connect() as conn:
             cur = conn.cursor()
-            cur.execute(sql, (organization_id, thread_id, thread_id))
+            cur.execute(_AP_ITEM_BY_THREAD_SQL, (organization_id, thread_id, thread_id))
             row = cur.fetchone()
         return dict(row) if row else None
 
+    def get_ap_items_by_threads(
+        self, organization_id: str, thread_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """``get_ap_item_by_thread`` for many threads in one query.
+
+        Returns ``{thread_id: item}`` for the threads that have an AP
+        item; threads without one are absent.
+        """
+        wanted = sorted({str(thread_id) for thread_id in thread_ids if thread_id})
+        if not wanted:
+            return {}
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(_AP_ITEMS_BY_THREADS_SQL, (organization_id, wanted, organization_id, wanted))
+            rows = cur.fetchall()
+        items: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            item = dict(row)
+            items[item.pop("lookup_thread_id")] = item
+        return items
+
     def get_ap_item_by_message_id(self, organization_id: str, message_id: str) -> Optional[Dict[str, Any]]:
         self.initialize()
         sql = (
@@ -1641,11 +1741,17 @@ class APStore:
             rows = cur.fetchall()
         return [dict(row) for row in rows]
 
-    def get_overdue_approvals(self, organization_id: str, min_hours: float) -> List[Dict[str, Any]]:
+    def get_overdue_approvals(
+        self,
+        organization_id: str,
+        min_hours: float,
+        ap_item_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """Return ap_items stuck in needs_approval longer than min_hours.
 
         Prefer the explicit ``approval_requested_at`` timestamp stored in item
-        metadata and fall back to ``updated_at`` for legacy rows.
+        metadata and fall back to ``updated_at`` for legacy rows. Pass
+        ``ap_item_id`` to check a single item.
         """
         self.initialize()
         # metadata is stored as TEXT (for SQLite parity) so we must
@@ -1659,9 +1765,12 @@ class APStore:
             "WHERE organization_id = %s AND state = 'needs_approval' "
             "AND COALESCE(NULLIF(metadata::jsonb->>'approval_requested_at', ''), updated_at)::timestamptz "
             "< (NOW() - (%s * INTERVAL '1 hour')) "
-            "ORDER BY updated_at ASC LIMIT 50"
         )
         params: tuple = (organization_id, min_hours)
+        if ap_item_id:
+            sql += "AND id = %s "
+            params += (ap_item_id,)
+        sql += "ORDER BY updated_at ASC LIMIT 50"
         with self.connect() as conn:
             cur = conn.cursor()
             cur.execute(sql, params)
@@ -2086,10 +2195,6 @@ class APStore:
         normalised to ``box_id``/``box_type='ap_item'``).
         """
         self.initialize()
-        import uuid
-        now = payload.get("ts") or datetime.now(timezone.utc).isoformat()
-        event_id = payload.get("id") or f"EVT-{uuid.uuid4().hex}"
-
         # Normalise the idempotency_key: empty string + whitespace → None
         # so the row is INSERTed with SQL NULL, not "". The audit_events
         # table has ``UNIQUE(idempotency_key)`` and Postgres treats two
@@ -2098,17 +2203,166 @@ class APStore:
         # empty key collided with every other one. Symptom was a 500
         # on the second non-state-transition audit row in any flow that
         # didn't bother to mint a deterministic key.
-        raw_idempotency_key = payload.get("idempotency_key")
-        idempotency_key: Optional[str] = (
-            str(raw_idempotency_key).strip()
-            if raw_idempotency_key is not None
-            else ""
-        ) or None
+        idempotency_key = self._normalise_audit_idempotency_key(
+            payload.get("idempotency_key")
+        )
         if idempotency_key:
             existing = self.get_ap_audit_event_by_key(idempotency_key)
             if existing:
                 return existing
 
+        event_id, params = self._build_audit_event_row(
+            payload, idempotency_key=idempotency_key,
+        )
+        try:
+            with self.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(_AUDIT_EVENT_INSERT_SQL, params)
+                conn.commit()
+        except Exception as exc:
+            # audit_events.idempotency_key has a UNIQUE constraint. The
+            # pre-check above catches the common case, but two concurrent
+            # callers with the same idempotency_key can both see "no row"
+            # and race to INSERT — one wins, the other trips the UNIQUE
+            # and raises IntegrityError (sqlite3) or UniqueViolation
+            # (psycopg). Treat that as "someone else already wrote this
+            # exact event" and return the winner's row, so the caller's
+            # idempotent path stays idempotent instead of bubbling a 500.
+            if idempotency_key and _is_unique_violation(exc):
+                winner = self.get_ap_audit_event_by_key(idempotency_key)
+                if winner:
+                    return winner
+            raise
+
+        # Module 7 v1 Pass 3 — webhook fan-out. After the canonical
+        # audit_events INSERT commits, fire-and-forget enqueue a
+        # Celery task that fans this event out to every webhook
+        # subscription matching its event_type. Decouples audit-write
+        # latency from webhook delivery latency: a slow SIEM
+        # endpoint never slows the canonical audit write.
+        #
+        # Best-effort: a Celery dispatch failure (broker outage,
+        # import error during dev) logs + swallows so the audit
+        # write itself stays committed. The audit log is the source
+        # of truth; webhook delivery is downstream observability.
+        try:
+            from solden.services.celery_tasks import dispatch_audit_webhooks
+            dispatch_audit_webhooks.delay(event_id)
+        except Exception as fanout_exc:
+            logger.warning(
+                "[append_audit_event] webhook fan-out enqueue failed for %s: %s",
+                event_id, fanout_exc,
+            )
+
+        return self.get_ap_audit_event(event_id)
+
+    def append_audit_events(self, payloads: List[Dict[str, Any]]) -> List[str]:
+        """Batched twin of ``append_audit_event`` for bulk writers.
+
+        Same column resolution and idempotency contract, but the
+        idempotency pre-check and the AP ``entity_id`` lookup each run
+        as one ``ANY(%s)`` query, and rows go in as multi-row INSERTs
+        (``ON CONFLICT (idempotency_key) DO NOTHING`` absorbs races).
+        The per-row hash-chain trigger still fires for every row, so
+        the chain is identical to N single appends.
+
+        Returns the ids of the rows actually inserted; payloads whose
+        idempotency key already exists are skipped silently.
+        """
+        self.initialize()
+        if not payloads:
+            return []
+
+        keys = [
+            self._normalise_audit_idempotency_key(p.get("idempotency_key"))
+            for p in payloads
+        ]
+        ap_item_ids = sorted({
+            str(p.get("box_id") or p.get("ap_item_id"))
+            for p in payloads
+            if p.get("entity_id") is None
+            and (p.get("box_id") or p.get("ap_item_id"))
+            and (p.get("box_type") or "ap_item") == "ap_item"
+        })
+        existing_keys: set = set()
+        entity_ids: Dict[str, Optional[str]] = {}
+        with self.connect() as conn:
+            cur = conn.cursor()
+            wanted_keys = [k for k in keys if k]
+            if wanted_keys:
+                cur.execute(
+                    "SELECT idempotency_key FROM audit_events "
+                    "WHERE idempotency_key = ANY(%s)",
+                    (wanted_keys,),
+                )
+                existing_keys = {row[0] for row in cur.fetchall()}
+            if ap_item_ids:
+                cur.execute(
+                    "SELECT id, entity_id FROM ap_items WHERE id = ANY(%s)",
+                    (ap_item_ids,),
+                )
+                entity_ids = {row[0]: row[1] for row in cur.fetchall()}
+
+        rows: List[Tuple[Any, ...]] = []
+        for payload, key in zip(payloads, keys):
+            if key:
+                if key in existing_keys:
+                    continue
+                existing_keys.add(key)
+            _, params = self._build_audit_event_row(
+                payload, idempotency_key=key, entity_ids=entity_ids,
+            )
+            rows.append(params)
+
+        inserted: List[str] = []
+        width = len(rows[0]) if rows else 0
+        placeholder = "(" + ", ".join(["%s"] * width) + ")"
+        with self.connect() as conn:
+            cur = conn.cursor()
+            for start in range(0, len(rows), _AUDIT_BATCH_SIZE):
+                chunk = rows[start:start + _AUDIT_BATCH_SIZE]
+                sql = (
+                    _AUDIT_EVENT_INSERT_PREFIX
+                    + ", ".join([placeholder] * len(chunk))
+                    + " ON CONFLICT (idempotency_key) DO NOTHING RETURNING id"
+                )
+                cur.execute(sql, tuple(v for row in chunk for v in row))
+                inserted.extend(row[0] for row in cur.fetchall())
+            conn.commit()
+
+        # Same best-effort webhook fan-out as the single-row path.
+        try:
+            from solden.services.celery_tasks import dispatch_audit_webhooks
+            for event_id in inserted:
+                dispatch_audit_webhooks.delay(event_id)
+        except Exception as fanout_exc:
+            logger.warning(
+                "[append_audit_events] webhook fan-out enqueue failed: %s",
+                fanout_exc,
+            )
+        return inserted
+
+    @staticmethod
+    def _normalise_audit_idempotency_key(raw: Any) -> Optional[str]:
+        return (str(raw).strip() if raw is not None else "") or None
+
+    def _build_audit_event_row(
+        self,
+        payload: Dict[str, Any],
+        *,
+        idempotency_key: Optional[str],
+        entity_ids: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Tuple[str, Tuple[Any, ...]]:
+        """Resolve one audit payload into ``(event_id, insert params)``.
+
+        Shared by ``append_audit_event`` and ``append_audit_events`` so
+        the single and batched writers can never drift on column
+        resolution. ``entity_ids`` is a prefetched ``ap_item_id ->
+        entity_id`` map; when omitted the AP row is looked up inline.
+        """
+        now = payload.get("ts") or datetime.now(timezone.utc).isoformat()
+        event_id = payload.get("id") or f"EVT-{uuid.uuid4().hex}"
+
         payload_json = payload.get("payload_json")
         if payload_json is None:
             payload_json = {}
@@ -2182,7 +2436,9 @@ class APStore:
         #      admin actions (org renamed, integration changed) live
         #      here so they're not hidden from entity auditors.
         entity_id = payload.get("entity_id")
-        if entity_id is None and box_type == "ap_item" and box_id:
+        if entity_id is None and box_type == "ap_item" and box_id and entity_ids is not None:
+            entity_id = entity_ids.get(box_id)
+        elif entity_id is None and box_type == "ap_item" and box_id:
             try:
                 ap_row = self.get_ap_item(box_id)
                 if ap_row:
@@ -2223,84 +2479,34 @@ class APStore:
             except (TypeError, ValueError):
                 tool_scope_json = None
 
-        sql = """
-            INSERT INTO audit_events
-            (id, box_id, box_type, event_type, prev_state, new_state,
-             actor_type, actor_id, payload_json, external_refs,
-             idempotency_key, source, correlation_id, workflow_id, run_id,
-             decision_reason, governance_verdict, agent_confidence,
-             organization_id, entity_id, policy_version, agent_version,
-             capability_id, capability_version, tool_scope, ts)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        try:
-            with self.connect() as conn:
-                cur = conn.cursor()
-                cur.execute(sql, (
-                    event_id,
-                    box_id,
-                    box_type,
-                    payload.get("event_type"),
-                    payload.get("from_state"),
-                    payload.get("to_state"),
-                    payload.get("actor_type"),
-                    payload.get("actor_id"),
-                    json.dumps(payload_json or {}),
-                    json.dumps(external_refs or {}),
-                    idempotency_key,
-                    payload.get("source"),
-                    payload.get("correlation_id"),
-                    payload.get("workflow_id"),
-                    payload.get("run_id"),
-                    payload.get("decision_reason") or payload.get("reason"),
-                    governance_verdict,
-                    agent_confidence,
-                    payload.get("organization_id"),
-                    entity_id,
-                    policy_version,
-                    payload.get("agent_version"),
-                    capability_id,
-                    capability_version,
-                    tool_scope_json,
-                    now,
-                ))
-                conn.commit()
-        except Exception as exc:
-            # audit_events.idempotency_key has a UNIQUE constraint. The
-            # pre-check above catches the common case, but two concurrent
-            # callers with the same idempotency_key can both see "no row"
-            # and race to INSERT — one wins, the other trips the UNIQUE
-            # and raises IntegrityError (sqlite3) or UniqueViolation
-            # (psycopg). Treat that as "someone else already wrote this
-            # exact event" and return the winner's row, so the caller's
-            # idempotent path stays idempotent instead of bubbling a 500.
-            if idempotency_key and _is_unique_violation(exc):
-                winner = self.get_ap_audit_event_by_key(idempotency_key)
-                if winner:
-                    return winner
-            raise
-
-        # Module 7 v1 Pass 3 — webhook fan-out. After the canonical
-        # audit_events INSERT commits, fire-and-forget enqueue a
-        # Celery task that fans this event out to every webhook
-        # subscription matching its event_type. Decouples audit-write
-        # latency from webhook delivery latency: a slow SIEM
-        # endpoint never slows the canonical audit write.
-        #
-        # Best-effort: a Celery dispatch failure (broker outage,
-        # import error during dev) logs + swallows so the audit
-        # write itself stays committed. The audit log is the source
-        # of truth; webhook delivery is downstream observability.
-        try:
-            from solden.services.celery_tasks import dispatch_audit_webhooks
-            dispatch_audit_webhooks.delay(event_id)
-        except Exception as fanout_exc:
-            logger.warning(
-                "[append_audit_event] webhook fan-out enqueue failed for %s: %s",
-                event_id, fanout_exc,
-            )
-
-        return self.get_ap_audit_event(event_id)
+        return event_id, (
+            event_id,
+            box_id,
+            box_type,
+            payload.get("event_type"),
+            payload.get("from_state"),
+            payload.get("to_state"),
+            payload.get("actor_type"),
+            payload.get("actor_id"),
+            json.dumps(payload_json or {}),
+            json.dumps(external_refs or {}),
+            idempotency_key,
+            payload.get("source"),
+            payload.get("correlation_id"),
+            payload.get("workflow_id"),
+            payload.get("run_id"),
+            payload.get("decision_reason") or payload.get("reason"),
+            governance_verdict,
+            agent_confidence,
+            payload.get("organization_id"),
+            entity_id,
+            policy_version,
+            payload.get("agent_version"),
+            capability_id,
+            capability_version,
+            tool_scope_json,
+            now,
+        )
 
     def set_ap_item_owner_atomic(
         self,
@@ -2447,10 +2653,9 @@ class APStore:
 
     def get_ap_audit_event(self, event_id: str) -> Optional[Dict[str, Any]]:
         self.initialize()
-        sql = "SELECT * FROM audit_events WHERE id = %s"
         with self.connect() as conn:
             cur = conn.cursor()
-            cur.execute(sql, (event_id,))
+            cur.execute(_AUDIT_EVENT_BY_ID_SQL, (event_id,))
             row = cur.fetchone()
         return self._deserialize_audit_event(dict(row)) if row else None
 
@@ -2458,10 +2663,9 @@ class APStore:
         if not idempotency_key:
             return None
         self.initialize()
-        sql = "SELECT * FROM audit_events WHERE idempotency_key = %s"
         with self.connect() as conn:
             cur = conn.cursor()
-            cur.execute(sql, (idempotency_key,))
+            cur.execute(_AUDIT_EVENT_BY_KEY_SQL, (idempotency_key,))
             row = cur.fetchone()
         return self._deserialize_audit_event(dict(row)) if row else None
 
@@ -2491,6 +2695,17 @@ class APStore:
     ) -> List[Dict[str, Any]]:
         """Generic reader for any Box type's audit trail."""
         self.initialize()
+        sql, params = self._box_audit_events_query(box_type, box_id, limit, order)
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+        return [self._deserialize_audit_event(dict(row)) for row in rows]
+
+    @staticmethod
+    def _box_audit_events_query(
+        box_type: str, box_id: str, limit: Optional[int], order: str,
+    ) -> Tuple[str, Tuple[Any, ...]]:
         direction = "DESC" if str(order).lower() == "desc" else "ASC"
         sql = (
             "SELECT * FROM audit_events "
@@ -2501,12 +2716,7 @@ class APStore:
         if limit is not None:
             sql += " LIMIT %s"
             params = (box_id, box_type, int(limit))
-        sql = sql
-        with self.connect() as conn:
-            cur = conn.cursor()
-            cur.execute(sql, params)
-            rows = cur.fetchall()
-        return [self._deserialize_audit_event(dict(row)) for row in rows]
+        return sql, params
 
     def list_recent_ap_audit_events(self, organization_id: str, limit: int = 30) -> List[Dict[str, Any]]:
         """Return recent AP audit events for an organization (newest first)."""
@@ -2937,7 +3147,7 @@ class APStore:
             "       ) AS errors, "
             "       MAX(ts) AS latest_event_at "
             "FROM audit_events "
-            "WHERE organization_id = %s AND ts >= %s "
+            "WHERE organization_id = %s AND ts_tz >= %s::timestamptz "
             "GROUP BY kind"
         )
 
@@ -2949,7 +3159,7 @@ class APStore:
             f"       {kind_expr} AS kind_col, "
             "        ts, event_type, source, payload_json "
             "FROM audit_events "
-            "WHERE organization_id = %s AND ts >= %s "
+            "WHERE organization_id = %s AND ts_tz >= %s::timestamptz "
             "  AND (event_type LIKE '%%failed%%' OR event_type LIKE '%%error%%') "
             f"ORDER BY kind_col, ts DESC"
         )
@@ -3681,7 +3891,7 @@ class APStore:
         cutoff = (datetime.now(timezone.utc) - timedelta(days=max(1, days))).isoformat()
         sql = (
             "SELECT * FROM ap_items WHERE organization_id = %s AND vendor_name = %s "
-            "AND created_at >= %s ORDER BY created_at DESC LIMIT %s"
+            "AND created_at_tz >= %s::timestamptz ORDER BY created_at_tz DESC LIMIT %s"
         )
         try:
             with self.connect() as conn:
@@ -3700,7 +3910,7 @@ class APStore:
         sql = (
             "SELECT vendor_name, SUM(amount) as total "
             "FROM ap_items WHERE organization_id = %s "
-            "AND created_at >= %s AND amount IS NOT NULL "
+            "AND created_at_tz >= %s::timestamptz AND amount IS NOT NULL "
             "GROUP BY vendor_name ORDER BY total DESC"
         )
         try:
@@ -3722,7 +3932,7 @@ class APStore:
         sql = (
             "SELECT vendor_name, SUM(amount) as total "
             "FROM ap_items WHERE organization_id = %s "
-            "AND created_at >= %s AND created_at < %s AND amount IS NOT NULL "
+            "AND created_at_tz >= %s::timestamptz AND created_at_tz < %s::timestamptz AND amount IS NOT NULL "
             "GROUP BY vendor_name ORDER BY total DESC"
         )
         try:
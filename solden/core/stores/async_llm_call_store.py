@@ -0,0 +1,61 @@
+"""``llm_call_log`` persistence for the async DB facade.
+
+The sync writers live where they always have (``LLMGateway._log_call``
+and ``SubscriptionService._get_llm_cost_this_month``); the SQL they run
+is defined here so the async twins below execute exactly the same
+statements.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Tuple
+
+LLM_CALL_LOG_INSERT_SQL = (
+    "INSERT INTO llm_call_log "
+    "(id, organization_id, action, model, input_tokens, output_tokens, "
+    "latency_ms, cost_estimate_usd, truncated, error, "
+    "correlation_id, created_at, box_id, box_type) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+)
+
+LLM_COST_THIS_MONTH_SQL = (
+    "SELECT COUNT(*) as call_count, "
+    "COALESCE(SUM(cost_estimate_usd), 0) as total_cost_usd, "
+    "COALESCE(SUM(input_tokens), 0) as total_input_tokens, "
+    "COALESCE(SUM(output_tokens), 0) as total_output_tokens "
+    "FROM llm_call_log "
+    "WHERE organization_id = %s AND created_at_tz >= %s::timestamptz"
+)
+
+
+def month_start_iso() -> str:
+    now = datetime.now(timezone.utc)
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+
+class AsyncLLMCallStore:
+    """Mixin for ``AsyncSoldenDB``: async ``llm_call_log`` insert and
+    month-to-date cost aggregate."""
+
+    async def insert_llm_call_log(self, params: Tuple[Any, ...]) -> None:
+        """Insert one row; ``params`` in ``LLM_CALL_LOG_INSERT_SQL`` order."""
+        await self.initialize()
+        async with self.connect() as conn:
+            cur = conn.cursor()
+            await cur.execute(LLM_CALL_LOG_INSERT_SQL, params)
+            await conn.commit()
+
+    async def get_llm_cost_this_month(self, organization_id: str) -> Dict[str, Any]:
+        await self.initialize()
+        async with self.connect() as conn:
+            cur = conn.cursor()
+            await cur.execute(LLM_COST_THIS_MONTH_SQL, (organization_id, month_start_iso()))
+            row = await cur.fetchone()
+        r = dict(row) if row else {}
+        return {
+            "call_count": r.get("call_count", 0),
+            "total_cost_usd": r.get("total_cost_usd", 0),
+            "total_input_tokens": r.get("total_input_tokens", 0),
+            "total_output_tokens": r.get("total_output_tokens", 0),
+        }
@@ -238,6 +238,8 @@ class AuthStore:
                 (row_id, name, (domain or None), settings_json, integration_mode or "shared", now, now),
             )
             conn.commit()
+        # A miss on this id may have cached ``None``.
+        self._org_cache().invalidate("organizations", row_id)
         return self.get_organization(row_id) or {}
 
     # ------------------------------------------------------------------
@@ -326,6 +328,9 @@ class AuthStore:
                         table, org_id, exc,
                     )
             conn.commit()
+        cache = self._org_cache()
+        for table in counts:
+            cache.invalidate(table, org_id)
         total = sum(counts.values())
         logger.info(
             "[purge] org=%s purged %d rows across %d tables",
@@ -362,6 +367,15 @@ class AuthStore:
         return [dict(r) for r in rows]
 
     def get_organization(self, organization_id: str) -> Optional[Dict[str, Any]]:
+        """Read through the process-local org cache (see ``solden.core.org_cache``)."""
+        from solden.core.org_cache import NS_ORGANIZATION
+
+        return self._org_cache().get(
+            NS_ORGANIZATION, organization_id,
+            lambda: self._fetch_organization(organization_id),
+        )
+
+    def _fetch_organization(self, organization_id: str) -> Optional[Dict[str, Any]]:
         self.initialize()
         sql = "SELECT * FROM organizations WHERE id = %s"
         with self.connect() as conn:
@@ -469,11 +483,16 @@ class AuthStore:
                 f"UPDATE organizations SET {set_clause} WHERE id = %s"
             )
             params = (*payload.values(), organization_id)
-        with self.connect() as conn:
-            cur = conn.cursor()
-            cur.execute(sql, params)
-            conn.commit()
-            return cur.rowcount > 0
+        try:
+            with self.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(sql, params)
+                conn.commit()
+                return cur.rowcount > 0
+        finally:
+            # Also on a CAS miss: the caller's re-read must see the
+            # winning write, not the cached row it lost against.
+            self._org_cache().invalidate("organizations", organization_id)
 
     def ensure_organization(
         self,
@@ -1272,6 +1291,7 @@ class AuthStore:
                 with self.connect() as conn:
                     conn.execute(update_sql, (json.dumps(usage), sub["id"]))
                     conn.commit()
+                self._org_cache().invalidate("subscriptions", organization_id)
         except Exception:
             pass
 
@@ -29,6 +29,12 @@ _VALID_MATCH_STATUSES = frozenset({
     "unmatched", "matched", "reconciled", "ignored",
 })
 
+# Rows per ``UPDATE ... FROM (VALUES ...)`` in the bulk match writer.
+_LINE_UPDATE_BATCH_SIZE = 1000
+
+# Rows per multi-row INSERT in the bulk line writer (15 params each).
+_LINE_INSERT_BATCH_SIZE = 1000
+
 
 class BankStatementStore:
     """Mixin: CRUD for bank_statement_imports + bank_statement_lines."""
@@ -128,6 +134,56 @@ class BankStatementStore:
             )
             conn.commit()
 
+    def update_bank_statement_import_header(
+        self,
+        import_id: str,
+        *,
+        statement_iban: Optional[str] = None,
+        statement_account: Optional[str] = None,
+        statement_currency: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        opening_balance: Optional[Any] = None,
+        closing_balance: Optional[Any] = None,
+        line_count: int = 0,
+    ) -> None:
+        """Fill in the statement header after a streamed import — the
+        parser only knows it (and the line count) at end of file."""
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE bank_statement_imports "
+                "SET statement_iban = %s, statement_account = %s, "
+                "    statement_currency = %s, from_date = %s, to_date = %s, "
+                "    opening_balance = %s, closing_balance = %s, line_count = %s "
+                "WHERE id = %s",
+                (
+                    statement_iban, statement_account, statement_currency,
+                    from_date, to_date,
+                    (Decimal(str(opening_balance)) if opening_balance is not None else None),
+                    (Decimal(str(closing_balance)) if closing_balance is not None else None),
+                    int(line_count or 0), import_id,
+                ),
+            )
+            conn.commit()
+
+    def delete_bank_statement_import(self, import_id: str) -> None:
+        """Remove an import and its lines (used to roll back a streamed
+        import whose payload turned out malformed or empty)."""
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM bank_statement_lines WHERE import_id = %s",
+                (import_id,),
+            )
+            cur.execute(
+                "DELETE FROM bank_statement_imports WHERE id = %s",
+                (import_id,),
+            )
+            conn.commit()
+
     # ── Lines ──────────────────────────────────────────────────────
 
     def insert_bank_statement_line(
@@ -184,6 +240,61 @@ class BankStatementStore:
             raise
         return self.get_bank_statement_line(line_id) or {"id": line_id}
 
+    def insert_bank_statement_lines(
+        self,
+        *,
+        organization_id: str,
+        import_id: str,
+        lines: List[Dict[str, Any]],
+    ) -> int:
+        """Bulk twin of ``insert_bank_statement_line``.
+
+        ``lines`` use the parser's canonical shape. Rows go in as
+        multi-row INSERTs in one transaction; duplicates on
+        ``(organization_id, import_id, line_index)`` are skipped as in
+        the single-row path. Returns the number of rows inserted.
+        """
+        self.initialize()
+        if not lines:
+            return 0
+        now_iso = datetime.now(timezone.utc).isoformat()
+        inserted = 0
+        with self.connect() as conn:
+            cur = conn.cursor()
+            for start in range(0, len(lines), _LINE_INSERT_BATCH_SIZE):
+                chunk = lines[start:start + _LINE_INSERT_BATCH_SIZE]
+                values_sql = ", ".join(
+                    ["(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, "
+                     "'unmatched', %s, %s)"] * len(chunk)
+                )
+                params: List[Any] = []
+                for ln in chunk:
+                    metadata = ln.get("metadata")
+                    params.extend((
+                        f"BSL-{uuid.uuid4().hex[:24]}",
+                        organization_id, import_id, int(ln["line_index"]),
+                        ln.get("value_date"), ln.get("booking_date"),
+                        Decimal(str(ln["amount"])), ln["currency"],
+                        ln.get("description"), ln.get("counterparty"),
+                        ln.get("counterparty_iban"),
+                        ln.get("bank_reference"), ln.get("end_to_end_id"),
+                        now_iso,
+                        (json.dumps(metadata) if metadata else None),
+                    ))
+                cur.execute(
+                    "INSERT INTO bank_statement_lines "
+                    "(id, organization_id, import_id, line_index, value_date, "
+                    " booking_date, amount, currency, description, counterparty, "
+                    " counterparty_iban, bank_reference, end_to_end_id, "
+                    " match_status, created_at, metadata_json) "
+                    "VALUES " + values_sql + " "
+                    "ON CONFLICT (organization_id, import_id, line_index) DO NOTHING",
+                    tuple(params),
+                )
+                inserted += cur.rowcount or 0
+            conn.commit()
+        return inserted
+
     def get_bank_statement_line(self, line_id: str) -> Optional[Dict[str, Any]]:
         self.initialize()
         with self.connect() as conn:
@@ -233,6 +344,44 @@ class BankStatementStore:
             if d is not None
         ]
 
+    def list_bank_statement_lines_for_import(
+        self,
+        organization_id: str,
+        import_id: str,
+        *,
+        match_status: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Every line of one import, uncapped, in ``line_index`` order.
+
+        ``list_bank_statement_lines`` caps at 5000 rows for the UI; the
+        bulk reconciler needs the whole import (month-end camt.053
+        files run to tens of thousands of lines) and is bounded by the
+        import itself, so no page cap here.
+        """
+        self.initialize()
+        clauses = ["organization_id = %s", "import_id = %s"]
+        params: List[Any] = [organization_id, import_id]
+        if match_status:
+            if match_status not in _VALID_MATCH_STATUSES:
+                raise ValueError(
+                    f"invalid match_status filter: {match_status!r}"
+                )
+            clauses.append("match_status = %s")
+            params.append(match_status)
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT * FROM bank_statement_lines "
+                "WHERE " + " AND ".join(clauses) + " "
+                "ORDER BY line_index ASC",
+                tuple(params),
+            )
+            rows = cur.fetchall()
+        return [
+            d for d in (self._decode_bank_line_row(r) for r in rows)
+            if d is not None
+        ]
+
     def list_bank_statement_lines_for_confirmations(
         self,
         organization_id: str,
@@ -292,6 +441,68 @@ class BankStatementStore:
             )
             conn.commit()
 
+    def update_bank_statement_line_matches(
+        self, updates: List[Dict[str, Any]],
+    ) -> int:
+        """Set-based twin of ``update_bank_statement_line_match``.
+
+        Each update is a dict with ``line_id`` plus the same keyword
+        fields as the single-row writer, and an optional ``metadata``
+        dict that is merged into the line's ``metadata_json`` (split
+        matches record their extra confirmations there). Rows are
+        applied as one
+        ``UPDATE ... FROM (VALUES ...)`` per chunk inside a single
+        transaction. Returns the number of rows updated.
+        """
+        self.initialize()
+        if not updates:
+            return 0
+        for upd in updates:
+            if upd.get("match_status") not in _VALID_MATCH_STATUSES:
+                raise ValueError(
+                    f"invalid match_status: {upd.get('match_status')!r}"
+                )
+        now_iso = datetime.now(timezone.utc).isoformat()
+        updated = 0
+        with self.connect() as conn:
+            cur = conn.cursor()
+            for start in range(0, len(updates), _LINE_UPDATE_BATCH_SIZE):
+                chunk = updates[start:start + _LINE_UPDATE_BATCH_SIZE]
+                values_sql = ", ".join(
+                    ["(%s, %s, %s, %s::real, %s, %s, %s::text)"] * len(chunk)
+                )
+                params: List[Any] = [now_iso]
+                for upd in chunk:
+                    params.extend((
+                        upd["line_id"],
+                        upd.get("payment_confirmation_id"),
+                        upd["match_status"],
+                        upd.get("match_confidence"),
+                        upd.get("match_reason"),
+                        upd.get("matched_by"),
+                        json.dumps(upd["metadata"]) if upd.get("metadata") else None,
+                    ))
+                cur.execute(
+                    "UPDATE bank_statement_lines AS l "
+                    "SET payment_confirmation_id = v.payment_confirmation_id, "
+                    "    match_status = v.match_status, "
+                    "    match_confidence = v.match_confidence, "
+                    "    match_reason = v.match_reason, "
+                    "    matched_at = %s, matched_by = v.matched_by, "
+                    "    metadata_json = CASE WHEN v.metadata IS NULL "
+                    "        THEN l.metadata_json "
+                    "        ELSE (COALESCE(NULLIF(l.metadata_json, ''), '{}')::jsonb "
+                    "              || v.metadata::jsonb)::text END "
+                    "FROM (VALUES " + values_sql + ") AS v("
+                    "id, payment_confirmation_id, match_status, "
+                    "match_confidence, match_reason, matched_by, metadata) "
+                    "WHERE l.id = v.id",
+                    tuple(params),
+                )
+                updated += cur.rowcount or 0
+            conn.commit()
+        return updated
+
     # ── Helpers ────────────────────────────────────────────────────
 
     def _decode_bank_import_row(self, row) -> Optional[Dict[str, Any]]:
@@ -195,23 +195,13 @@ class EntityStore:
 
     def get_parent_organization(self, org_id: str) -> Optional[Dict[str, Any]]:
         """Return the parent organization, or the org itself if it has no parent."""
-        self.initialize()
-        sql = "SELECT * FROM organizations WHERE id = %s"
-        with self.connect() as conn:
-            cur = conn.cursor()
-            cur.execute(sql, (org_id,))
-            row = cur.fetchone()
-            if not row:
-                return None
-            org = dict(row)
-            parent_id = org.get("parent_organization_id")
-            if not parent_id or parent_id == org_id:
-                return org
-            # Fetch parent within the same connection
-            cur2 = conn.cursor()
-            cur2.execute(sql, (parent_id,))
-            parent_row = cur2.fetchone()
-            return dict(parent_row) if parent_row else org
+        org = self.get_organization(org_id)
+        if not org:
+            return None
+        parent_id = org.get("parent_organization_id")
+        if not parent_id or parent_id == org_id:
+            return org
+        return self.get_organization(parent_id) or org
 
     def is_parent_account(self, org_id: str) -> bool:
         """True if this organization has child organizations."""
@@ -226,28 +216,19 @@ class EntityStore:
     def get_effective_subscription(self, org_id: str) -> Optional[Dict[str, Any]]:
         """§3: Child orgs inherit parent's subscription.
 
-        Uses ``get_parent_organization`` to walk up the hierarchy.
+        Uses ``get_parent_organization`` to walk up the hierarchy. Both
+        lookups read through the org cache.
         """
-        self.initialize()
-        sql = "SELECT * FROM subscriptions WHERE organization_id = %s"
         # Check own subscription first
-        with self.connect() as conn:
-            cur = conn.cursor()
-            cur.execute(sql, (org_id,))
-            row = cur.fetchone()
+        row = self.get_subscription_record(org_id)
         if row:
-            return dict(row)
+            return row
         # Walk up to parent via get_parent_organization
         parent = self.get_parent_organization(org_id)
         if parent:
             parent_id = parent.get("id")
             if parent_id and parent_id != org_id:
-                with self.connect() as conn:
-                    cur = conn.cursor()
-                    cur.execute(sql, (parent_id,))
-                    parent_row = cur.fetchone()
-                if parent_row:
-                    return dict(parent_row)
+                return self.get_subscription_record(parent_id)
         return None
 
     def get_effective_agent_config(self, entity_id: str) -> Dict[str, Any]:
@@ -0,0 +1,431 @@
+"""ErpCacheStore mixin — cached ERP vendor directory and chart of accounts.
+
+The vendor list and chart of accounts used to live as single JSON blobs
+in ``organizations.settings_json``: every read deserialized the whole
+directory, every refresh rewrote it (and every other org setting with
+it), and a lookup by name or id was a linear scan in Python. They now
+live one row per record in ``erp_vendor_cache`` / ``erp_account_cache``,
+keyed by ``(organization_id, entity_key, erp_type, <record id>)`` with a
+btree on the normalized name, so pages and lookups are index reads.
+
+``entity_key`` is the ERP entity the rows were pulled for (``''`` for
+the org's default connection). The full normalized record is kept in
+``payload`` so readers get back exactly what the fetcher produced;
+the other columns exist to filter and sort on.
+
+``erp_cache_sync_state`` records, per scope and kind, when the last
+full and delta syncs ran and the ERP-side high-water mark to resume a
+delta sync from. The sync loop itself lives in
+:mod:`solden.integrations.erp_router`.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+ERP_CACHE_VENDORS = "vendors"
+ERP_CACHE_ACCOUNTS = "accounts"
+
+# kind -> (table, id column, payload key holding the id)
+_ERP_CACHE_TABLES = {
+    ERP_CACHE_VENDORS: ("erp_vendor_cache", "vendor_id", "vendor_id"),
+    ERP_CACHE_ACCOUNTS: ("erp_account_cache", "account_id", "id"),
+}
+
+_UPSERT_CHUNK = 500
+
+
+def normalize_erp_cache_name(name: Any) -> str:
+    """Lower-case, whitespace-collapsed form used for name lookups."""
+    return " ".join(str(name or "").lower().split())
+
+
+def _entity_key(entity_id: Optional[str]) -> str:
+    return str(entity_id or "").strip()
+
+
+def _cache_table(kind: str):
+    try:
+        return _ERP_CACHE_TABLES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown ERP cache kind: {kind!r}") from None
+
+
+class ErpCacheStore:
+    """Mixin providing ERP vendor / account cache persistence for SoldenDB.
+
+    The tables are created by migration 104.
+    """
+
+    @staticmethod
+    def _erp_cache_payload(row: Any) -> Dict[str, Any]:
+        raw = dict(row).get("payload")
+        try:
+            data = json.loads(raw) if raw else {}
+        except (TypeError, ValueError):
+            data = {}
+        return data if isinstance(data, dict) else {}
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def upsert_erp_cache_rows(
+        self,
+        kind: str,
+        organization_id: str,
+        erp_type: str,
+        records: Iterable[Dict[str, Any]],
+        *,
+        entity_id: Optional[str] = None,
+        synced_at: Optional[str] = None,
+    ) -> int:
+        """Insert or replace normalized vendor / account records.
+
+        Records without an id are skipped. Every written row is stamped
+        with ``synced_at`` (default now) so a full sync can prune the
+        rows it did not see. Returns the number of rows written.
+        """
+        table, id_col, id_key = _cache_table(kind)
+        stamp = synced_at or datetime.now(timezone.utc).isoformat()
+        entity_key = _entity_key(entity_id)
+        rows = []
+        for record in records:
+            record_id = str(record.get(id_key) or "").strip()
+            if not record_id:
+                continue
+            active = 0 if record.get("active", True) is False else 1
+            common = (
+                organization_id, entity_key, erp_type, record_id,
+                str(record.get("name") or ""),
+                normalize_erp_cache_name(record.get("name")),
+            )
+            if kind == ERP_CACHE_VENDORS:
+                extra = (str(record.get("email") or ""), str(record.get("tax_id") or ""))
+            else:
+                extra = (str(record.get("code") or ""), str(record.get("type") or ""))
+            rows.append((*common, *extra, active, json.dumps(record), stamp))
+        if not rows:
+            return 0
+
+        if kind == ERP_CACHE_VENDORS:
+            extra_cols = ("email", "tax_id")
+        else:
+            extra_cols = ("code", "account_type")
+        sql = (
+            f"""
+            INSERT INTO {table}
+            (organization_id, entity_key, erp_type, {id_col}, name,
+             name_normalized, {extra_cols[0]}, {extra_cols[1]}, active,
+             payload, synced_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (organization_id, entity_key, erp_type, {id_col})
+            DO UPDATE SET
+                name = EXCLUDED.name,
+                name_normalized = EXCLUDED.name_normalized,
+                {extra_cols[0]} = EXCLUDED.{extra_cols[0]},
+                {extra_cols[1]} = EXCLUDED.{extra_cols[1]},
+                active = EXCLUDED.active,
+                payload = EXCLUDED.payload,
+                synced_at = EXCLUDED.synced_at
+            """
+        )
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            for start in range(0, len(rows), _UPSERT_CHUNK):
+                cur.executemany(sql, rows[start:start + _UPSERT_CHUNK])
+            conn.commit()
+        return len(rows)
+
+    def delete_erp_cache_rows(
+        self,
+        kind: str,
+        organization_id: str,
+        erp_type: str,
+        record_ids: Sequence[str],
+        *,
+        entity_id: Optional[str] = None,
+    ) -> int:
+        """Delete records the ERP reported as deleted."""
+        ids = [str(r) for r in record_ids if r]
+        if not ids:
+            return 0
+        table, id_col, _ = _cache_table(kind)
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"DELETE FROM {table} WHERE organization_id = %s AND entity_key = %s "
+                f"AND erp_type = %s AND {id_col} = ANY(%s)",
+                (organization_id, _entity_key(entity_id), erp_type, ids),
+            )
+            conn.commit()
+            return cur.rowcount
+
+    def prune_erp_cache_rows(
+        self,
+        kind: str,
+        organization_id: str,
+        *,
+        keep_erp_type: str,
+        synced_before: str,
+        entity_id: Optional[str] = None,
+    ) -> int:
+        """Drop rows a full sync did not see.
+
+        Removes rows of ``keep_erp_type`` stamped before ``synced_before``
+        and every row left over from a previously connected ERP.
+        """
+        table, _, _ = _cache_table(kind)
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"DELETE FROM {table} WHERE organization_id = %s AND entity_key = %s "
+                "AND (erp_type <> %s OR synced_at < %s)",
+                (organization_id, _entity_key(entity_id), keep_erp_type, synced_before),
+            )
+            conn.commit()
+            return cur.rowcount
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def list_erp_cache_rows(
+        self,
+        kind: str,
+        organization_id: str,
+        erp_type: str,
+        *,
+        entity_id: Optional[str] = None,
+        search: Optional[str] = None,
+        active_only: bool = False,
+        account_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Return one page of cached records ordered by name.
+
+        ``search`` is a case-insensitive substring of the name (and, for
+        vendors, the email); ``account_type`` applies to accounts only.
+        """
+        table, id_col, _ = _cache_table(kind)
+        clauses = ["organization_id = %s", "entity_key = %s", "erp_type = %s"]
+        params: List[Any] = [organization_id, _entity_key(entity_id), erp_type]
+        if active_only:
+            clauses.append("active = 1")
+        if search and search.strip():
+            needle = f"%{normalize_erp_cache_name(search)}%"
+            if kind == ERP_CACHE_VENDORS:
+                clauses.append("(name_normalized LIKE %s OR LOWER(email) LIKE %s)")
+                params.extend([needle, needle])
+            else:
+                clauses.append("name_normalized LIKE %s")
+                params.append(needle)
+        if account_type and kind == ERP_CACHE_ACCOUNTS:
+            clauses.append("account_type = %s")
+            params.append(account_type.strip().lower())
+        sql = (
+            f"SELECT payload FROM {table} WHERE {' AND '.join(clauses)} "
+            f"ORDER BY name_normalized, {id_col}"
+        )
+        if limit is not None:
+            sql += " LIMIT %s OFFSET %s"
+            params.extend([max(0, int(limit)), max(0, int(offset or 0))])
+        elif offset:
+            sql += " OFFSET %s"
+            params.append(max(0, int(offset)))
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, tuple(params))
+            rows = cur.fetchall()
+        return [self._erp_cache_payload(r) for r in rows]
+
+    def get_erp_cache_row(
+        self,
+        kind: str,
+        organization_id: str,
+        erp_type: str,
+        record_id: str,
+        *,
+        entity_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Look up one cached record by its ERP id."""
+        table, id_col, _ = _cache_table(kind)
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"SELECT payload FROM {table} WHERE organization_id = %s "
+                f"AND entity_key = %s AND erp_type = %s AND {id_col} = %s",
+                (organization_id, _entity_key(entity_id), erp_type, str(record_id)),
+            )
+            row = cur.fetchone()
+        return self._erp_cache_payload(row) if row else None
+
+    def find_erp_cache_rows_by_name(
+        self,
+        kind: str,
+        organization_id: str,
+        erp_type: str,
+        name: str,
+        *,
+        entity_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Exact (normalized) name lookup, served by the name index."""
+        table, id_col, _ = _cache_table(kind)
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"SELECT payload FROM {table} WHERE organization_id = %s "
+                "AND entity_key = %s AND erp_type = %s AND name_normalized = %s "
+                f"ORDER BY active DESC, {id_col} LIMIT %s",
+                (
+                    organization_id, _entity_key(entity_id), erp_type,
+                    normalize_erp_cache_name(name), max(1, int(limit)),
+                ),
+            )
+            rows = cur.fetchall()
+        return [self._erp_cache_payload(r) for r in rows]
+
+    def match_erp_account_codes(
+        self,
+        organization_id: str,
+        erp_type: str,
+        codes: Sequence[str],
+        *,
+        entity_id: Optional[str] = None,
+        active_only: bool = True,
+    ) -> set:
+        """Return the subset of ``codes`` that name a cached account.
+
+        A GL code matches an account's ``code`` or its ERP id, so
+        validating an invoice's lines is one indexed probe instead of
+        loading the whole chart.
+        """
+        wanted = sorted({str(c).strip() for c in codes if str(c or "").strip()})
+        if not wanted:
+            return set()
+        sql = (
+            "SELECT code, account_id FROM erp_account_cache WHERE organization_id = %s "
+            "AND entity_key = %s AND erp_type = %s "
+            "AND (code = ANY(%s) OR account_id = ANY(%s))"
+        )
+        if active_only:
+            sql += " AND active = 1"
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, (organization_id, _entity_key(entity_id), erp_type, wanted, wanted))
+            rows = cur.fetchall()
+        found = set()
+        for row in rows:
+            found.update(v for v in (row[0], row[1]) if v)
+        return found & set(wanted)
+
+    def count_erp_cache_rows(
+        self,
+        kind: str,
+        organization_id: str,
+        erp_type: str,
+        *,
+        entity_id: Optional[str] = None,
+    ) -> int:
+        table, _, _ = _cache_table(kind)
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"SELECT COUNT(*) FROM {table} WHERE organization_id = %s "
+                "AND entity_key = %s AND erp_type = %s",
+                (organization_id, _entity_key(entity_id), erp_type),
+            )
+            row = cur.fetchone()
+        return int(row[0]) if row else 0
+
+    # ------------------------------------------------------------------
+    # Sync state
+    # ------------------------------------------------------------------
+
+    def get_erp_cache_sync_state(
+        self,
+        kind: str,
+        organization_id: str,
+        *,
+        erp_type: Optional[str] = None,
+        entity_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the sync state for a scope.
+
+        Without ``erp_type``, returns the most recently synced ERP's
+        state — what readers use when they don't want to resolve the
+        connection just to read the cache.
+        """
+        _cache_table(kind)
+        sql = (
+            "SELECT * FROM erp_cache_sync_state WHERE organization_id = %s "
+            "AND entity_key = %s AND kind = %s"
+        )
+        params: List[Any] = [organization_id, _entity_key(entity_id), kind]
+        if erp_type:
+            sql += " AND erp_type = %s"
+            params.append(erp_type)
+        sql += " ORDER BY GREATEST(COALESCE(last_full_sync_at, ''), COALESCE(last_delta_sync_at, '')) DESC LIMIT 1"
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, tuple(params))
+            row = cur.fetchone()
+        return dict(row) if row else None
+
+    def record_erp_cache_sync(
+        self,
+        kind: str,
+        organization_id: str,
+        erp_type: str,
+        *,
+        full: bool,
+        synced_at: str,
+        high_water_mark: Optional[str] = None,
+        row_count: Optional[int] = None,
+        entity_id: Optional[str] = None,
+    ) -> None:
+        """Record a completed sync and advance the high-water mark.
+
+        Only call after the sync's rows are written: a failed sync must
+        leave the old mark in place so the next one re-reads the gap.
+        """
+        _cache_table(kind)
+        column = "last_full_sync_at" if full else "last_delta_sync_at"
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                INSERT INTO erp_cache_sync_state
+                (organization_id, entity_key, erp_type, kind, {column},
+                 high_water_mark, row_count)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (organization_id, entity_key, erp_type, kind)
+                DO UPDATE SET
+                    {column} = EXCLUDED.{column},
+                    high_water_mark = COALESCE(EXCLUDED.high_water_mark,
+                                               erp_cache_sync_state.high_water_mark),
+                    row_count = COALESCE(EXCLUDED.row_count,
+                                         erp_cache_sync_state.row_count)
+                """,
+                (
+                    organization_id, _entity_key(entity_id), erp_type, kind,
+                    synced_at, high_water_mark, row_count,
+                ),
+            )
+            conn.commit()
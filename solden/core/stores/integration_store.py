@@ -208,6 +208,7 @@ class IntegrationStore:
             cur = conn.cursor()
             cur.execute(sql, params)
             conn.commit()
+        self._org_cache().invalidate("erp_connections", organization_id)
 
     def _decrypt_erp_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
         """Decrypt ERP connection credentials with legacy unencrypted fallback."""
@@ -227,6 +228,15 @@ class IntegrationStore:
         return result
 
     def get_erp_connections(self, organization_id: str) -> List[Dict[str, Any]]:
+        """Active connections, decrypted; read through the org cache."""
+        from solden.core.org_cache import NS_ERP_CONNECTIONS
+
+        return self._org_cache().get(
+            NS_ERP_CONNECTIONS, organization_id,
+            lambda: self._fetch_erp_connections(organization_id),
+        )
+
+    def _fetch_erp_connections(self, organization_id: str) -> List[Dict[str, Any]]:
         self.initialize()
         sql = (
             "SELECT * FROM erp_connections WHERE organization_id = %s AND is_active = 1"
@@ -332,6 +342,7 @@ class IntegrationStore:
             cur = conn.cursor()
             cur.execute(sql, params)
             conn.commit()
+        self._org_cache().invalidate("erp_connections", organization_id)
         return connection_id
 
     def delete_erp_connection(self, organization_id: str, erp_type: str) -> bool:
@@ -344,7 +355,9 @@ class IntegrationStore:
             cur = conn.cursor()
             cur.execute(sql, (now, organization_id, erp_type))
             conn.commit()
-            return cur.rowcount > 0
+            deleted = cur.rowcount > 0
+        self._org_cache().invalidate("erp_connections", organization_id)
+        return deleted
 
     # ------------------------------------------------------------------
     # Slack installations
@@ -790,6 +803,15 @@ class IntegrationStore:
     # ------------------------------------------------------------------
 
     def get_subscription_record(self, organization_id: str) -> Optional[Dict[str, Any]]:
+        """Read through the org cache; writers below invalidate it."""
+        from solden.core.org_cache import NS_SUBSCRIPTION
+
+        return self._org_cache().get(
+            NS_SUBSCRIPTION, organization_id,
+            lambda: self._fetch_subscription_record(organization_id),
+        )
+
+    def _fetch_subscription_record(self, organization_id: str) -> Optional[Dict[str, Any]]:
         self.initialize()
         sql = "SELECT * FROM subscriptions WHERE organization_id = %s LIMIT 1"
         with self.connect() as conn:
@@ -860,6 +882,7 @@ class IntegrationStore:
             cur = conn.cursor()
             cur.execute(sql, tuple(params))
             conn.commit()
+        self._org_cache().invalidate("subscriptions", organization_id)
         return self.get_subscription_record(organization_id) or {}
 
     def upsert_subscription_record(self, organization_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -867,7 +890,9 @@ class IntegrationStore:
         import uuid
 
         now = datetime.now(timezone.utc).isoformat()
-        existing = self.get_subscription_record(organization_id)
+        # Merge onto the committed row, not a cached copy that may be
+        # missing another process's write.
+        existing = self._fetch_subscription_record(organization_id)
         row_id = (existing or {}).get("id") or f"SUB-{uuid.uuid4().hex}"
 
         merged = dict(existing or {})
@@ -960,4 +985,5 @@ class IntegrationStore:
                 ),
             )
             conn.commit()
+        self._org_cache().invalidate("subscriptions", organization_id)
         return self.get_subscription_record(organization_id) or {}
@@ -0,0 +1,331 @@
+"""InvoiceFingerprintStore mixin — org-wide duplicate-invoice index.
+
+Duplicate detection used to score the incoming invoice against the last
+50 ``vendor_invoice_history`` rows for the exact vendor string. A
+duplicate sent under a vendor-name variant ("ACME, Inc." vs "Acme"),
+or older than a busy vendor's last 50 bills, was never compared.
+
+``ap_invoice_fingerprints`` holds one row per AP item with the fields a
+duplicate has to share:
+
+* ``invoice_number_norm`` — :func:`normalize_invoice_number`.
+* ``vendor_key`` — :func:`solden.services.fuzzy_matching.normalize_vendor`.
+* ``currency`` + ``amount_bucket`` — ``floor(log(amount) / log(1.02))``;
+  two amounts within the analyzer's 1% tolerance are never more than
+  one bucket apart.
+* ``invoice_day`` — proleptic ordinal of the invoice date (the item's
+  ``created_at`` date when the invoice carries none).
+
+A lookup probes two blocking keys, each an index range: the normalized
+invoice number across the whole org, and vendor + currency + amount
+bucket ±1 + invoice day ±``DUPLICATE_DAYS_WINDOW``. Scoring stays with
+:class:`solden.services.cross_invoice_analysis.CrossInvoiceAnalyzer`;
+this store only returns the handful of rows worth scoring.
+``find_invoice_duplicate_candidates`` takes many probes and answers
+them in one query, so bulk imports check a whole file at once.
+
+Rows are written through by ``create_ap_item`` / ``update_ap_item``.
+``sync_invoice_fingerprints`` walks an org's ``ap_items`` in
+``(updated_at, id)`` order from a per-org cursor in
+``ap_invoice_fingerprint_state``, so the first run backfills the org
+in pages and later runs only pick up rows changed since — it repairs
+anything the write-through missed. It runs as the
+``invoice_fingerprint_sync`` sweep job.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from solden.services.fuzzy_matching import normalize_vendor
+
+logger = logging.getLogger(__name__)
+
+AMOUNT_BUCKET_BASE = 1.02
+DUPLICATE_DAYS_WINDOW = 7
+
+# Columns of ap_items a fingerprint is computed from; update_ap_item
+# refreshes the fingerprint when any of them changes.
+FINGERPRINT_SOURCE_COLUMNS = frozenset({
+    "vendor_name", "amount", "currency", "invoice_number", "invoice_date", "organization_id",
+})
+
+_UPSERT_CHUNK = 500
+_SYNC_PAGE = 1000
+_CANDIDATES_PER_BLOCK = 25
+
+_UPSERT_SQL = """
+    INSERT INTO ap_invoice_fingerprints
+    (ap_item_id, organization_id, vendor_key, invoice_number_norm, currency,
+     amount, amount_bucket, invoice_day, source_updated_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (ap_item_id) DO UPDATE SET
+        organization_id = EXCLUDED.organization_id,
+        vendor_key = EXCLUDED.vendor_key,
+        invoice_number_norm = EXCLUDED.invoice_number_norm,
+        currency = EXCLUDED.currency,
+        amount = EXCLUDED.amount,
+        amount_bucket = EXCLUDED.amount_bucket,
+        invoice_day = EXCLUDED.invoice_day,
+        source_updated_at = EXCLUDED.source_updated_at
+"""
+
+_CANDIDATE_COLUMNS = """
+    SELECT c.idx, c.vendor_key, i.id, i.message_id, i.thread_id, i.vendor_name, i.invoice_number,
+           i.amount, i.currency, i.invoice_date, i.created_at, i.state
+"""
+
+# One query for any number of probes. Each LATERAL is an index range
+# per probe; a candidate found by both blocks comes back twice and is
+# collapsed by the caller.
+_CANDIDATES_SQL = _CANDIDATE_COLUMNS + """
+    FROM (
+        WITH probes AS (
+            SELECT * FROM unnest(%s::int[], %s::text[], %s::text[], %s::text[], %s::int[], %s::int[])
+                AS p(idx, number_norm, vendor_key, currency, amount_bucket, invoice_day)
+        )
+        SELECT p.idx, f.ap_item_id, f.vendor_key FROM probes p
+        CROSS JOIN LATERAL (
+            SELECT ap_item_id, vendor_key FROM ap_invoice_fingerprints
+            WHERE organization_id = %s AND p.number_norm <> ''
+              AND invoice_number_norm = p.number_norm
+            ORDER BY invoice_day DESC NULLS LAST
+            LIMIT %s
+        ) f
+        UNION ALL
+        SELECT p.idx, f.ap_item_id, f.vendor_key FROM probes p
+        CROSS JOIN LATERAL (
+            SELECT ap_item_id, vendor_key FROM ap_invoice_fingerprints
+            WHERE organization_id = %s AND vendor_key = p.vendor_key
+              AND currency = p.currency
+              AND amount_bucket BETWEEN p.amount_bucket - 1 AND p.amount_bucket + 1
+              AND invoice_day BETWEEN p.invoice_day - %s AND p.invoice_day + %s
+            ORDER BY invoice_day DESC
+            LIMIT %s
+        ) f
+    ) c
+    JOIN ap_items i ON i.id = c.ap_item_id
+"""
+
+_SYNC_PAGE_SQL = """
+    SELECT id, organization_id, vendor_name, amount, currency, invoice_number,
+           invoice_date, created_at, updated_at
+    FROM ap_items
+    WHERE organization_id = %s AND (updated_at, id) > (%s, %s)
+    ORDER BY updated_at, id
+    LIMIT %s
+"""
+
+
+def normalize_invoice_number(raw: Any) -> str:
+    """Lowercase, strip whitespace, ``#`` and ``inv``/``invoice`` prefixes."""
+    val = str(raw or "").strip().lower()
+    val = val.lstrip("#")
+    val = re.sub(r"^inv(?:oice)?[-\s]*", "", val)
+    return val.strip()
+
+
+def normalize_invoice_currency(raw: Any) -> str:
+    """Upper-case ISO code; blank means USD, as the analyzer has always assumed."""
+    return str(raw or "USD").strip().upper() or "USD"
+
+
+def invoice_amount_bucket(amount: Any) -> Optional[int]:
+    try:
+        value = float(amount)
+    except (TypeError, ValueError):
+        return None
+    if not value > 0 or math.isinf(value):
+        return None
+    return math.floor(math.log(value) / math.log(AMOUNT_BUCKET_BASE))
+
+
+def invoice_day(*values: Any) -> Optional[int]:
+    """Ordinal day of the first parseable date among ``values``."""
+    for value in values:
+        if isinstance(value, datetime):
+            return value.date().toordinal()
+        if isinstance(value, date):
+            return value.toordinal()
+        text = str(value or "").strip()
+        if len(text) < 10:
+            continue
+        try:
+            return date.fromisoformat(text[:10]).toordinal()
+        except ValueError:
+            continue
+    return None
+
+
+def invoice_fingerprint(item: Dict[str, Any]) -> Dict[str, Any]:
+    """The index row for one AP item (or an incoming invoice probe)."""
+    return {
+        "ap_item_id": item.get("id"),
+        "organization_id": item.get("organization_id"),
+        "vendor_key": normalize_vendor(str(item.get("vendor_name") or "")),
+        "invoice_number_norm": normalize_invoice_number(item.get("invoice_number")),
+        "currency": normalize_invoice_currency(item.get("currency")),
+        "amount": item.get("amount"),
+        "amount_bucket": invoice_amount_bucket(item.get("amount")),
+        "invoice_day": invoice_day(item.get("invoice_date"), item.get("created_at")),
+    }
+
+
+class InvoiceFingerprintStore:
+    """Mixin providing the duplicate-invoice fingerprint index for SoldenDB.
+
+    The tables are created by migration 108.
+    """
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _upsert_invoice_fingerprint_rows(cur: Any, items: Iterable[Dict[str, Any]]) -> int:
+        rows = []
+        for item in items:
+            if not item.get("id") or not item.get("organization_id"):
+                continue
+            fp = invoice_fingerprint(item)
+            try:
+                amount = float(fp["amount"]) if fp["amount"] is not None else None
+            except (TypeError, ValueError):
+                amount = None
+            rows.append((
+                fp["ap_item_id"], fp["organization_id"], fp["vendor_key"],
+                fp["invoice_number_norm"], fp["currency"], amount,
+                fp["amount_bucket"], fp["invoice_day"], item.get("updated_at"),
+            ))
+        for start in range(0, len(rows), _UPSERT_CHUNK):
+            cur.executemany(_UPSERT_SQL, rows[start:start + _UPSERT_CHUNK])
+        return len(rows)
+
+    def upsert_invoice_fingerprints(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Index (or re-index) AP item rows. Returns the number written."""
+        items = list(items)
+        if not items:
+            return 0
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            written = self._upsert_invoice_fingerprint_rows(cur, items)
+            conn.commit()
+        return written
+
+    def refresh_invoice_fingerprint(self, ap_item_id: str) -> bool:
+        """Re-index one AP item from its current row."""
+        item = self.get_ap_item(ap_item_id)
+        if not item:
+            return False
+        return self.upsert_invoice_fingerprints([item]) > 0
+
+    def sync_invoice_fingerprints(
+        self,
+        organization_id: str,
+        *,
+        page_size: int = _SYNC_PAGE,
+        max_pages: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Index the org's AP items changed since the last sync.
+
+        Resumes from the stored ``(updated_at, id)`` cursor and saves it
+        after every page, so an interrupted backfill picks up where it
+        stopped. ``max_pages`` bounds one call's work.
+        """
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT cursor_updated_at, cursor_id FROM ap_invoice_fingerprint_state "
+                "WHERE organization_id = %s",
+                (organization_id,),
+            )
+            row = cur.fetchone()
+        cursor_ts = (row["cursor_updated_at"] if row else None) or ""
+        cursor_id = (row["cursor_id"] if row else None) or ""
+
+        indexed = 0
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            with self.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(_SYNC_PAGE_SQL, (organization_id, cursor_ts, cursor_id, page_size))
+                items = [dict(r) for r in cur.fetchall()]
+                if not items:
+                    break
+                indexed += self._upsert_invoice_fingerprint_rows(cur, items)
+                cursor_ts = items[-1].get("updated_at") or ""
+                cursor_id = items[-1]["id"]
+                cur.execute(
+                    """
+                    INSERT INTO ap_invoice_fingerprint_state
+                    (organization_id, cursor_updated_at, cursor_id, synced_at)
+                    VALUES (%s, %s, %s, %s)
+                    ON CONFLICT (organization_id) DO UPDATE SET
+                        cursor_updated_at = EXCLUDED.cursor_updated_at,
+                        cursor_id = EXCLUDED.cursor_id,
+                        synced_at = EXCLUDED.synced_at
+                    """,
+                    (organization_id, cursor_ts, cursor_id, datetime.now(timezone.utc).isoformat()),
+                )
+                conn.commit()
+            pages += 1
+            if len(items) < page_size:
+                break
+        return {"indexed": indexed, "pages": pages, "cursor_updated_at": cursor_ts}
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def find_invoice_duplicate_candidates(
+        self,
+        organization_id: str,
+        probes: Sequence[Dict[str, Any]],
+        *,
+        limit_per_block: int = _CANDIDATES_PER_BLOCK,
+    ) -> List[List[Dict[str, Any]]]:
+        """AP items sharing a blocking key with each probe.
+
+        A probe is an invoice-shaped dict (``vendor_name``, ``amount``,
+        ``currency``, ``invoice_number``, ``invoice_date``). Returns one
+        list per probe, in probe order, of ``ap_items`` rows plus the
+        candidate's ``vendor_key``; each candidate appears once per
+        probe. Excluding the invoice itself is the caller's job.
+        """
+        results: List[List[Dict[str, Any]]] = [[] for _ in probes]
+        if not probes:
+            return results
+        fingerprints = [invoice_fingerprint(probe) for probe in probes]
+        params = (
+            list(range(len(fingerprints))),
+            [fp["invoice_number_norm"] for fp in fingerprints],
+            [fp["vendor_key"] for fp in fingerprints],
+            [fp["currency"] for fp in fingerprints],
+            [fp["amount_bucket"] for fp in fingerprints],
+            [fp["invoice_day"] for fp in fingerprints],
+            organization_id, limit_per_block,
+            organization_id, DUPLICATE_DAYS_WINDOW, DUPLICATE_DAYS_WINDOW, limit_per_block,
+        )
+        self.initialize()
+        try:
+            with self.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(_CANDIDATES_SQL, params)
+                rows = cur.fetchall()
+        except Exception as exc:
+            logger.warning("[InvoiceFingerprintStore] candidate lookup failed: %s", exc)
+            return results
+        seen = set()
+        for row in rows:
+            candidate = dict(row)
+            idx = candidate.pop("idx")
+            if (idx, candidate["id"]) in seen:
+                continue
+            seen.add((idx, candidate["id"]))
+            results[idx].append(candidate)
+        return results
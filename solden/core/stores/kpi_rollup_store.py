@@ -0,0 +1,567 @@
+"""KpiRollupStore mixin — incrementally maintained AP KPI rollups.
+
+The headline AP KPIs (items per state, touchless rate, exception rate,
+cycle time, missed early-payment discounts) used to be recomputed on
+every dashboard load by pulling up to 10,000 ``ap_items`` and their
+approvals into Python and decoding each item's metadata JSON — and
+quietly covered only the newest 10,000 items of a large tenant.
+
+They now come from two tables maintained per transition:
+
+* ``ap_kpi_item_facts`` — one row per AP item holding what that item
+  contributes to the KPIs (its state, whether it completed touchless,
+  its cycle time, its discount status).
+* ``ap_kpi_rollup`` — per-org sums of those facts keyed by
+  ``(metric, bucket)``: ``items``, ``state/<state>``, ``completed``,
+  ``touchless``, ``exception``, ``cycle_time/<histogram bucket>``,
+  ``discount_candidate`` and ``discount_missed``.
+
+``apply_ap_kpi_fact`` recomputes one item's fact from its current row
+and adds the difference to the rollup in the same transaction, so a
+replayed or out-of-order call never double counts. The
+``ap_kpi_rollup`` projector in :mod:`solden.services.box_projection`
+calls it on every state transition. ``get_ap_kpi_summary`` is then a
+read of a few dozen rollup rows plus an index range over discounts
+whose deadline has passed since their item last changed (the one
+time-dependent KPI).
+
+Changes that do not go through a state transition (a metadata-only
+edit, a direct insert) are not seen by the projector;
+``reconcile_ap_kpi_rollup`` recomputes an org from ``ap_items``,
+rewrites both tables and reports any drift it corrected. It runs as
+the ``ap_kpi_reconciliation`` sweep job and seeds an org on its first
+summary read. ``ap_kpi_rollup_state`` records when each org was seeded
+and last reconciled; the reconcile holds that row ``FOR UPDATE`` while
+per-item applies hold it ``FOR SHARE``.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from solden.core.utils import safe_float
+
+logger = logging.getLogger(__name__)
+
+AP_KPI_COMPLETED_STATES = frozenset({"closed", "posted_to_erp"})
+
+# Upper bounds (hours) of the cycle-time histogram buckets; the last
+# bucket is open-ended.
+CYCLE_TIME_BUCKETS_HOURS: Tuple[float, ...] = (1, 4, 8, 24, 48, 72, 168, 336, 720)
+_OPEN_BUCKET = "inf"
+
+_RECONCILE_PAGE = 1000
+_INSERT_CHUNK = 500
+
+_FACT_COLUMNS = (
+    "ap_item_id", "organization_id", "state", "completed", "touchless",
+    "exception", "cycle_hours", "discount_candidate", "discount_missed",
+    "discount_amount", "discount_deadline",
+)
+
+_ITEM_COLUMNS_SQL = """
+    SELECT i.id, i.organization_id, i.state, i.approval_required, i.metadata,
+           i.created_at, i.updated_at, i.erp_posted_at,
+           EXISTS (SELECT 1 FROM approvals a WHERE a.ap_item_id = i.id) AS has_approvals
+    FROM ap_items i
+"""
+
+
+def _parse_ts(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _metadata(raw: Any) -> Dict[str, Any]:
+    if isinstance(raw, dict):
+        return raw
+    if isinstance(raw, str) and raw.strip():
+        try:
+            decoded = json.loads(raw)
+        except (TypeError, ValueError):
+            return {}
+        return decoded if isinstance(decoded, dict) else {}
+    return {}
+
+
+def cycle_time_bucket(hours: float) -> str:
+    """Histogram bucket label (its upper bound in hours) for ``hours``."""
+    for bound in CYCLE_TIME_BUCKETS_HOURS:
+        if hours <= bound:
+            return f"{bound:g}"
+    return _OPEN_BUCKET
+
+
+def compute_ap_kpi_fact(
+    item: Dict[str, Any],
+    *,
+    has_approvals: bool,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """What one AP item contributes to the KPIs.
+
+    Same definitions ``get_ap_kpis`` has always used: completed means
+    ``closed`` / ``posted_to_erp``; touchless means completed without a
+    required approval or with no approval record; cycle time runs from
+    ``created_at`` to ``erp_posted_at`` (else ``updated_at``); an
+    exception is a ``metadata.exception_code``; a discount is a
+    candidate when ``metadata.discount`` (or ``payment_discount``) is
+    available, eligible or has an amount, and missed when it was not
+    taken and has no deadline or the item completed.
+
+    An open, untaken discount with a deadline is not missed yet; its
+    deadline is kept so the summary can count it once it passes.
+    """
+    now = now or datetime.now(timezone.utc)
+    state = str(item.get("state") or "received")
+    completed = state in AP_KPI_COMPLETED_STATES
+    metadata = _metadata(item.get("metadata"))
+
+    touchless = False
+    cycle_hours: Optional[float] = None
+    if completed:
+        touchless = (not bool(item.get("approval_required"))) or not has_approvals
+        created_at = _parse_ts(item.get("created_at")) or _parse_ts(item.get("updated_at"))
+        completed_at = _parse_ts(item.get("erp_posted_at")) or _parse_ts(item.get("updated_at")) or now
+        if created_at and completed_at >= created_at:
+            cycle_hours = (completed_at - created_at).total_seconds() / 3600.0
+
+    candidate = False
+    missed = False
+    amount = 0.0
+    deadline: Optional[datetime] = None
+    discount = metadata.get("discount") or metadata.get("payment_discount") or {}
+    if isinstance(discount, dict) and (
+        discount.get("available") is True
+        or discount.get("eligible") is True
+        or discount.get("amount")
+    ):
+        candidate = True
+        amount = max(0.0, safe_float(discount.get("amount"), 0.0))
+        if not discount.get("taken"):
+            deadline = _parse_ts(discount.get("deadline") or discount.get("due_at"))
+            if deadline is None or completed:
+                missed = True
+                deadline = None
+
+    return {
+        "ap_item_id": str(item.get("id") or ""),
+        "organization_id": str(item.get("organization_id") or ""),
+        "state": state,
+        "completed": completed,
+        "touchless": touchless,
+        "exception": bool(metadata.get("exception_code")),
+        "cycle_hours": cycle_hours,
+        "discount_candidate": candidate,
+        "discount_missed": missed,
+        "discount_amount": amount,
+        "discount_deadline": deadline,
+    }
+
+
+def ap_kpi_fact_contributions(fact: Optional[Dict[str, Any]]) -> Dict[Tuple[str, str], Tuple[int, float]]:
+    """``(metric, bucket) -> (count, total)`` that ``fact`` adds to the rollup."""
+    if not fact:
+        return {}
+    out: Dict[Tuple[str, str], Tuple[int, float]] = {
+        ("items", ""): (1, 0.0),
+        ("state", str(fact.get("state") or "")): (1, 0.0),
+    }
+    for flag in ("completed", "touchless", "exception", "discount_candidate"):
+        if fact.get(flag):
+            out[(flag, "")] = (1, 0.0)
+    cycle_hours = fact.get("cycle_hours")
+    if cycle_hours is not None:
+        out[("cycle_time", cycle_time_bucket(float(cycle_hours)))] = (1, float(cycle_hours))
+    if fact.get("discount_missed"):
+        out[("discount_missed", "")] = (1, float(fact.get("discount_amount") or 0.0))
+    return out
+
+
+def _contribution_delta(
+    old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]],
+) -> Dict[Tuple[str, str], Tuple[int, float]]:
+    before = ap_kpi_fact_contributions(old)
+    after = ap_kpi_fact_contributions(new)
+    delta: Dict[Tuple[str, str], Tuple[int, float]] = {}
+    for key in set(before) | set(after):
+        count = after.get(key, (0, 0.0))[0] - before.get(key, (0, 0.0))[0]
+        total = after.get(key, (0, 0.0))[1] - before.get(key, (0, 0.0))[1]
+        if count or abs(total) > 1e-9:
+            delta[key] = (count, total)
+    return delta
+
+
+def _accumulate(
+    into: Dict[Tuple[str, str], Tuple[int, float]],
+    contributions: Dict[Tuple[str, str], Tuple[int, float]],
+) -> None:
+    for key, (count, total) in contributions.items():
+        prev_count, prev_total = into.get(key, (0, 0.0))
+        into[key] = (prev_count + count, prev_total + total)
+
+
+def histogram_percentile(buckets: Iterable[Tuple[str, int, float]], percentile: float) -> Optional[float]:
+    """Estimate a percentile from ``(bucket, count, total)`` cycle-time rows.
+
+    Interpolates linearly inside the bucket the rank falls in; the
+    open-ended bucket has no upper bound, so its mean stands in.
+    """
+    bounds = {f"{b:g}": float(b) for b in CYCLE_TIME_BUCKETS_HOURS}
+    ordered = sorted(
+        ((bounds.get(label, float("inf")), int(count), float(total)) for label, count, total in buckets if count > 0),
+        key=lambda row: row[0],
+    )
+    n = sum(count for _, count, _ in ordered)
+    if n <= 0:
+        return None
+    rank = max(0.0, min(1.0, float(percentile))) * n
+    seen = 0
+    lower = 0.0
+    for upper, count, total in ordered:
+        if seen + count >= rank:
+            if upper == float("inf"):
+                return total / count
+            return lower + (upper - lower) * ((rank - seen) / count)
+        seen += count
+        lower = upper
+    upper, count, total = ordered[-1]
+    return total / count if upper == float("inf") else upper
+
+
+def _rate(numerator: int, denominator: int) -> float:
+    return round((numerator / denominator) if denominator else 0.0, 4)
+
+
+class KpiRollupStore:
+    """Mixin providing AP KPI rollup persistence for SoldenDB.
+
+    The tables are created by migration 106.
+    """
+
+    # ------------------------------------------------------------------
+    # Per-item apply (called by the ap_kpi_rollup projector)
+    # ------------------------------------------------------------------
+
+    def apply_ap_kpi_fact(self, ap_item_id: str) -> Dict[str, Any]:
+        """Recompute ``ap_item_id``'s fact and fold the change into its
+        org's rollup. Idempotent: applying an unchanged item is a no-op.
+
+        Orgs that have not been seeded yet are skipped — their first
+        summary read reconciles the whole org anyway.
+        """
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT organization_id FROM ap_items WHERE id = %s", (ap_item_id,))
+            row = cur.fetchone()
+            if not row or not row[0]:
+                cur.execute("SELECT organization_id FROM ap_kpi_item_facts WHERE ap_item_id = %s", (ap_item_id,))
+                row = cur.fetchone()
+                if not row:
+                    return {"applied": False, "skip_reason": "item_not_found"}
+            organization_id = str(row[0])
+
+            cur.execute(
+                "SELECT seeded_at FROM ap_kpi_rollup_state WHERE organization_id = %s FOR SHARE",
+                (organization_id,),
+            )
+            state_row = cur.fetchone()
+            if not state_row or not state_row[0]:
+                conn.commit()
+                return {"applied": False, "skip_reason": "org_not_seeded"}
+
+            # Serialise applies of the same item; read the item only
+            # after the lock so the last applier sees the last write.
+            cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"ap_kpi_fact:{ap_item_id}",))
+            cur.execute(
+                f"SELECT {', '.join(_FACT_COLUMNS)} FROM ap_kpi_item_facts WHERE ap_item_id = %s",
+                (ap_item_id,),
+            )
+            old_row = cur.fetchone()
+            old = dict(old_row) if old_row else None
+            cur.execute(_ITEM_COLUMNS_SQL + " WHERE i.id = %s", (ap_item_id,))
+            item_row = cur.fetchone()
+            new = None
+            if item_row and dict(item_row).get("organization_id") == organization_id:
+                item = dict(item_row)
+                new = compute_ap_kpi_fact(item, has_approvals=bool(item.get("has_approvals")))
+
+            delta = _contribution_delta(old, new)
+            if new is None:
+                cur.execute("DELETE FROM ap_kpi_item_facts WHERE ap_item_id = %s", (ap_item_id,))
+            elif old is None or any(_fact_value(old, c) != _fact_value(new, c) for c in _FACT_COLUMNS):
+                self._upsert_ap_kpi_facts(cur, [new])
+            self._add_ap_kpi_rollup(cur, organization_id, delta)
+            conn.commit()
+        return {"applied": True, "changed": bool(delta), "organization_id": organization_id}
+
+    @staticmethod
+    def _upsert_ap_kpi_facts(cur: Any, facts: List[Dict[str, Any]]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        columns = ", ".join(_FACT_COLUMNS)
+        placeholders = ", ".join(["%s"] * (len(_FACT_COLUMNS) + 1))
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in _FACT_COLUMNS[1:])
+        sql = (
+            f"INSERT INTO ap_kpi_item_facts ({columns}, updated_at) VALUES ({placeholders}) "
+            f"ON CONFLICT (ap_item_id) DO UPDATE SET {updates}, updated_at = EXCLUDED.updated_at"
+        )
+        rows = [tuple(f[c] for c in _FACT_COLUMNS) + (now,) for f in facts]
+        for start in range(0, len(rows), _INSERT_CHUNK):
+            cur.executemany(sql, rows[start:start + _INSERT_CHUNK])
+
+    @staticmethod
+    def _add_ap_kpi_rollup(
+        cur: Any,
+        organization_id: str,
+        delta: Dict[Tuple[str, str], Tuple[int, float]],
+    ) -> None:
+        # Sorted so concurrent applies lock rollup rows in one order.
+        for (metric, bucket), (count, total) in sorted(delta.items()):
+            cur.execute(
+                """
+                INSERT INTO ap_kpi_rollup (organization_id, metric, bucket, count, total)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (organization_id, metric, bucket) DO UPDATE SET
+                    count = ap_kpi_rollup.count + EXCLUDED.count,
+                    total = ap_kpi_rollup.total + EXCLUDED.total
+                """,
+                (organization_id, metric, bucket, count, total),
+            )
+
+    # ------------------------------------------------------------------
+    # Reconciliation (full recompute)
+    # ------------------------------------------------------------------
+
+    def reconcile_ap_kpi_rollup(self, organization_id: str) -> Dict[str, Any]:
+        """Recompute ``organization_id``'s facts and rollup from
+        ``ap_items`` and replace the stored ones.
+
+        Returns the number of items scanned and every ``(metric,
+        bucket)`` whose stored value differed from the recompute. The
+        first run for an org seeds it and reports no drift.
+        """
+        self.initialize()
+        now = datetime.now(timezone.utc)
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO ap_kpi_rollup_state (organization_id)
+                VALUES (%s) ON CONFLICT (organization_id) DO NOTHING
+                """,
+                (organization_id,),
+            )
+            cur.execute(
+                "SELECT seeded_at FROM ap_kpi_rollup_state WHERE organization_id = %s FOR UPDATE",
+                (organization_id,),
+            )
+            state_row = cur.fetchone()
+            seeded = bool(state_row and state_row[0])
+
+            cur.execute(
+                "SELECT metric, bucket, count, total FROM ap_kpi_rollup WHERE organization_id = %s",
+                (organization_id,),
+            )
+            stored = {
+                (str(r[0]), str(r[1])): (int(r[2] or 0), float(r[3] or 0.0))
+                for r in cur.fetchall()
+            }
+
+            facts: List[Dict[str, Any]] = []
+            expected: Dict[Tuple[str, str], Tuple[int, float]] = {}
+            last_id = ""
+            while True:
+                cur.execute(
+                    _ITEM_COLUMNS_SQL + " WHERE i.organization_id = %s AND i.id > %s ORDER BY i.id LIMIT %s",
+                    (organization_id, last_id, _RECONCILE_PAGE),
+                )
+                page = [dict(r) for r in cur.fetchall()]
+                if not page:
+                    break
+                for item in page:
+                    fact = compute_ap_kpi_fact(item, has_approvals=bool(item.get("has_approvals")), now=now)
+                    facts.append(fact)
+                    _accumulate(expected, ap_kpi_fact_contributions(fact))
+                last_id = str(page[-1]["id"])
+                if len(page) < _RECONCILE_PAGE:
+                    break
+
+            drift = []
+            if seeded:
+                for key in sorted(set(stored) | set(expected)):
+                    was = stored.get(key, (0, 0.0))
+                    should = expected.get(key, (0, 0.0))
+                    if was[0] != should[0] or abs(was[1] - should[1]) > 1e-6:
+                        drift.append({
+                            "metric": key[0],
+                            "bucket": key[1],
+                            "stored_count": was[0],
+                            "expected_count": should[0],
+                            "stored_total": round(was[1], 4),
+                            "expected_total": round(should[1], 4),
+                        })
+
+            cur.execute("DELETE FROM ap_kpi_item_facts WHERE organization_id = %s", (organization_id,))
+            self._upsert_ap_kpi_facts(cur, facts)
+            cur.execute("DELETE FROM ap_kpi_rollup WHERE organization_id = %s", (organization_id,))
+            self._add_ap_kpi_rollup(cur, organization_id, expected)
+            cur.execute(
+                """
+                UPDATE ap_kpi_rollup_state
+                SET seeded_at = COALESCE(seeded_at, %s), reconciled_at = %s,
+                    items_reconciled = %s, last_drift_count = %s
+                WHERE organization_id = %s
+                """,
+                (now.isoformat(), now.isoformat(), len(facts), len(drift), organization_id),
+            )
+            conn.commit()
+
+        if drift:
+            logger.warning(
+                "[KpiRollup] org=%s: corrected %d drifted rollup rows (%s)",
+                organization_id, len(drift),
+                ", ".join(f"{d['metric']}/{d['bucket']}" for d in drift[:10]),
+            )
+        return {
+            "organization_id": organization_id,
+            "seeded": not seeded,
+            "items": len(facts),
+            "drift_count": len(drift),
+            "drift": drift,
+            "reconciled_at": now.isoformat(),
+        }
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_ap_kpi_summary(
+        self,
+        organization_id: str,
+        *,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Headline AP KPIs for every item of the org, from the rollup."""
+        self.initialize()
+        now = now or datetime.now(timezone.utc)
+        for attempt in range(2):
+            with self.connect() as conn:
+                cur = conn.cursor()
+                cur.execute(
+                    "SELECT seeded_at, reconciled_at FROM ap_kpi_rollup_state WHERE organization_id = %s",
+                    (organization_id,),
+                )
+                state_row = cur.fetchone()
+                if state_row and state_row[0]:
+                    cur.execute(
+                        "SELECT metric, bucket, count, total FROM ap_kpi_rollup WHERE organization_id = %s",
+                        (organization_id,),
+                    )
+                    rows = [(str(r[0]), str(r[1]), int(r[2] or 0), float(r[3] or 0.0)) for r in cur.fetchall()]
+                    cur.execute(
+                        """
+                        SELECT COUNT(*), COALESCE(SUM(discount_amount), 0)
+                        FROM ap_kpi_item_facts
+                        WHERE organization_id = %s AND discount_deadline <= %s
+                        """,
+                        (organization_id, now),
+                    )
+                    overdue = cur.fetchone()
+                    return self._ap_kpi_summary_from_rows(
+                        organization_id, rows,
+                        overdue_count=int(overdue[0] or 0) if overdue else 0,
+                        overdue_value=float(overdue[1] or 0.0) if overdue else 0.0,
+                        reconciled_at=state_row[1],
+                        now=now,
+                    )
+            if attempt == 0:
+                self.reconcile_ap_kpi_rollup(organization_id)
+        raise RuntimeError(f"ap_kpi_rollup: org {organization_id} did not seed")
+
+    @staticmethod
+    def _ap_kpi_summary_from_rows(
+        organization_id: str,
+        rows: List[Tuple[str, str, int, float]],
+        *,
+        overdue_count: int,
+        overdue_value: float,
+        reconciled_at: Optional[str],
+        now: datetime,
+    ) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        totals: Dict[str, float] = {}
+        states: Dict[str, int] = {}
+        cycle_buckets: List[Tuple[str, int, float]] = []
+        for metric, bucket, count, total in rows:
+            if metric == "state":
+                if count:
+                    states[bucket] = count
+            elif metric == "cycle_time":
+                cycle_buckets.append((bucket, count, total))
+            else:
+                counts[metric] = counts.get(metric, 0) + count
+                totals[metric] = totals.get(metric, 0.0) + total
+
+        items = counts.get("items", 0)
+        completed = counts.get("completed", 0)
+        touchless = counts.get("touchless", 0)
+        exceptions = counts.get("exception", 0)
+        cycle_count = sum(count for _, count, _ in cycle_buckets)
+        cycle_total = sum(total for _, _, total in cycle_buckets)
+        bounds = {f"{b:g}": b for b in CYCLE_TIME_BUCKETS_HOURS}
+        histogram = [
+            {"le_hours": bounds.get(label), "count": count}
+            for label, count, _ in sorted(cycle_buckets, key=lambda r: bounds.get(r[0], float("inf")))
+            if count
+        ]
+        return {
+            "organization_id": organization_id,
+            "generated_at": now.isoformat(),
+            "source": "rollup",
+            "reconciled_at": reconciled_at,
+            "totals": {"items": items, "completed_items": completed},
+            "states": states,
+            "touchless_rate": {
+                "eligible_count": completed,
+                "touchless_count": touchless,
+                "rate": _rate(touchless, completed),
+            },
+            "cycle_time_hours": {
+                "count": cycle_count,
+                "avg": round(cycle_total / cycle_count, 2) if cycle_count else 0.0,
+                "median": round(histogram_percentile(cycle_buckets, 0.5) or 0.0, 2),
+                "p95": round(histogram_percentile(cycle_buckets, 0.95) or 0.0, 2),
+                "histogram": histogram,
+            },
+            "exception_rate": {
+                "exception_count": exceptions,
+                "rate": _rate(exceptions, items),
+            },
+            "missed_discounts_baseline": {
+                "candidate_count": counts.get("discount_candidate", 0),
+                "missed_count": counts.get("discount_missed", 0) + overdue_count,
+                "missed_value": round(totals.get("discount_missed", 0.0) + overdue_value, 2),
+            },
+        }
+
+
+def _fact_value(fact: Dict[str, Any], column: str) -> Any:
+    value = fact.get(column)
+    if column == "discount_deadline":
+        return _parse_ts(value)
+    if column in ("cycle_hours", "discount_amount") and value is not None:
+        return round(float(value), 6)
+    return value
@@ -11,6 +11,7 @@ expects the concrete class that inherits it to provide:
 * ``self.list_ap_items()``                 -- lists AP items for an organization
 * ``self.list_approvals()``                -- lists approvals for an organization
 * ``self.list_audit_events()``             -- lists audit events for an organization
+* ``self.get_ap_kpi_summary()``            -- rollup-backed headline KPIs (``KpiRollupStore``)
 
 All methods are copied verbatim from ``solden/core/database.py`` so that
 ``SoldenDB(MetricsStore, ...)`` inherits them without any behavioural change.
@@ -27,6 +28,9 @@ from solden.core.utils import safe_float
 
 logger = logging.getLogger(__name__)
 
+# Items / approvals the windowed detail sections of ``get_ap_kpis`` read.
+_KPI_DETAIL_ITEM_LIMIT = 10000
+
 
 def _state_transition_event_types(box_type: str) -> List[str]:
     """Map a Box type to the audit event_type(s) that record its
@@ -992,6 +996,7 @@ class MetricsStore:
         event_types: Optional[List[str]] = None,
         limit: int = 10000,
         box_id: Optional[str] = None,
+        since: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         self.initialize()
         params: List[Any] = [organization_id]
@@ -999,6 +1004,9 @@ class MetricsStore:
         if box_id:
             sql += " AND box_id = %s"
             params.append(box_id)
+        if since:
+            sql += " AND ts_tz >= %s::timestamptz"
+            params.append(since)
         if event_types:
             placeholders = ",".join("%s" for _ in event_types)
             sql += f" AND event_type IN ({placeholders})"
@@ -1023,30 +1031,39 @@ class MetricsStore:
     ) -> Dict[str, Any]:
         self.initialize()
         now = datetime.now(timezone.utc)
-        items = self.list_ap_items(organization_id, limit=5000)
+        cutoff = now - timedelta(hours=24)
+        open_states = {"received", "validated", "needs_info", "needs_approval", "approved", "ready_to_post", "failed_post"}
+        # State counts come from the KPI rollup; queue lag only needs the
+        # open items, and the posting sections only the last 24h of events.
+        state_counts: Dict[str, int] = dict(self.get_ap_kpi_summary(organization_id, now=now)["states"])
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT state, created_at, updated_at FROM ap_items "
+                "WHERE organization_id = %s AND state = ANY(%s)",
+                (organization_id, sorted(open_states)),
+            )
+            open_items = [dict(row) for row in cur.fetchall()]
         approvals = self.list_approvals(organization_id, status="approved", limit=5000)
         post_events = self.list_audit_events(
             organization_id,
             event_types=["erp_post_attempted", "erp_post_failed"],
             limit=10000,
+            since=cutoff.isoformat(),
         )
         callback_events = self.list_audit_events(
             organization_id,
             event_types=["approval_callback_rejected"],
             limit=10000,
+            since=cutoff.isoformat(),
         )
 
-        state_counts: Dict[str, int] = {}
-        open_states = {"received", "validated", "needs_info", "needs_approval", "approved", "ready_to_post", "failed_post"}
         queue_lags: List[float] = []
         sla_breached_open = 0
         workflow_stuck_count = 0
 
-        for item in items:
+        for item in open_items:
             state = str(item.get("state") or "received")
-            state_counts[state] = state_counts.get(state, 0) + 1
-            if state not in open_states:
-                continue
             created_at = self._parse_iso(item.get("created_at")) or self._parse_iso(item.get("updated_at"))
             if not created_at:
                 continue
@@ -1072,14 +1089,15 @@ class MetricsStore:
             organization_id,
             event_types=["erp_post_resumed", "erp_post_retry_enqueued"],
             limit=10000,
+            since=cutoff.isoformat(),
         )
         succeeded_events = self.list_audit_events(
             organization_id,
             event_types=["erp_post_succeeded"],
             limit=10000,
+            since=cutoff.isoformat(),
         )
 
-        cutoff = now - timedelta(hours=24)
         attempted_24h = 0
         failed_24h = 0
         retry_24h = 0
@@ -1365,8 +1383,11 @@ class MetricsStore:
     ) -> Dict[str, Any]:
         self.initialize()
         now = datetime.now(timezone.utc)
-        items = self.list_ap_items(organization_id, limit=10000)
-        approvals = self.list_approvals(organization_id, limit=10000)
+        # Headline KPIs cover every item and come from the rollup; the
+        # detail sections below still work from a bounded recent window.
+        summary = self.get_ap_kpi_summary(organization_id, now=now)
+        items = self.list_ap_items(organization_id, limit=_KPI_DETAIL_ITEM_LIMIT)
+        approvals = self.list_approvals(organization_id, limit=_KPI_DETAIL_ITEM_LIMIT)
 
         approvals_by_item: Dict[str, List[Dict[str, Any]]] = {}
         for approval in approvals:
@@ -1375,53 +1396,10 @@ class MetricsStore:
                 continue
             approvals_by_item.setdefault(ap_item_id, []).append(approval)
 
-        completed_states = {"closed", "posted_to_erp"}
-        completed_items = [item for item in items if str(item.get("state") or "") in completed_states]
-        touchless_eligible = len(completed_items)
-        touchless_count = 0
-        cycle_times_hours: List[float] = []
-        exception_count = 0
-        discount_candidate_count = 0
-        missed_discount_count = 0
-        missed_discount_value = 0.0
-
-        for item in items:
-            metadata = self._decode_json(item.get("metadata"))
-            item_id = str(item.get("id") or "")
-            item_approvals = approvals_by_item.get(item_id, [])
-            approval_required = bool(item.get("approval_required"))
-            if str(item.get("state") or "") in completed_states:
-                if (not approval_required) or not item_approvals:
-                    touchless_count += 1
-                created_at = self._parse_iso(item.get("created_at")) or self._parse_iso(item.get("updated_at"))
-                completed_at = (
-                    self._parse_iso(item.get("erp_posted_at"))
-                    or self._parse_iso(item.get("updated_at"))
-                    or now
-                )
-                if created_at and completed_at and completed_at >= created_at:
-                    cycle_times_hours.append((completed_at - created_at).total_seconds() / 3600.0)
-
-            if metadata.get("exception_code"):
-                exception_count += 1
-
-            discount = metadata.get("discount") or metadata.get("payment_discount") or {}
-            if isinstance(discount, dict) and (
-                discount.get("available") is True
-                or discount.get("eligible") is True
-                or discount.get("amount")
-            ):
-                discount_candidate_count += 1
-                taken = bool(discount.get("taken"))
-                deadline = self._parse_iso(discount.get("deadline") or discount.get("due_at"))
-                missed = (not taken) and (
-                    deadline is None
-                    or deadline <= now
-                    or str(item.get("state") or "") in completed_states
-                )
-                if missed:
-                    missed_discount_count += 1
-                    missed_discount_value += max(0.0, safe_float(discount.get("amount"), 0.0))
+        touchless_eligible = int(summary["touchless_rate"]["eligible_count"])
+        touchless_count = int(summary["touchless_rate"]["touchless_count"])
+        exception_count = int(summary["exception_rate"]["exception_count"])
+        cycle_time_summary = summary["cycle_time_hours"]
 
         approved_records = [record for record in approvals if str(record.get("status") or "") == "approved"]
         on_time_count = 0
@@ -1846,7 +1824,7 @@ class MetricsStore:
         touchless_rate = round((touchless_count / touchless_eligible) if touchless_eligible else 0.0, 4)
         human_intervention_rate = round((human_intervention_count / touchless_eligible) if touchless_eligible else 0.0, 4)
         on_time_approval_rate = round((on_time_count / len(approved_records)) if approved_records else 0.0, 4)
-        avg_cycle_time_hours = round(sum(cycle_times_hours) / len(cycle_times_hours), 2) if cycle_times_hours else 0.0
+        avg_cycle_time_hours = float(cycle_time_summary["avg"])
         avg_approval_wait_hours = round(approval_wait_avg_minutes / 60.0, 2)
         approval_sla_hours = round(float(approval_sla_minutes) / 60.0, 2)
 
@@ -1984,7 +1962,7 @@ class MetricsStore:
             "highlights": proof_highlights[:4],
         }
 
-        total_items = len(items)
+        total_items = int(summary["totals"]["items"])
 
         # DESIGN_THESIS §11 success metric #4 — vendor activation SLA.
         # "A new vendor went from invited to active in under five
@@ -1999,6 +1977,14 @@ class MetricsStore:
         return {
             "organization_id": organization_id,
             "generated_at": now.isoformat(),
+            "rollup_reconciled_at": summary.get("reconciled_at"),
+            # Sections other than the headline KPIs cover only the most
+            # recent items; say so instead of truncating silently.
+            "detail_window": {
+                "item_limit": _KPI_DETAIL_ITEM_LIMIT,
+                "items_considered": len(items),
+                "truncated": len(items) >= _KPI_DETAIL_ITEM_LIMIT,
+            },
             "totals": {
                 "items": total_items,
                 "completed_items": touchless_eligible,
@@ -2010,12 +1996,7 @@ class MetricsStore:
                 "rate": round((touchless_count / touchless_eligible) if touchless_eligible else 0.0, 4),
             },
             "vendor_activation_sla": vendor_activation_sla,
-            "cycle_time_hours": {
-                "count": len(cycle_times_hours),
-                "avg": round(sum(cycle_times_hours) / len(cycle_times_hours), 2) if cycle_times_hours else 0.0,
-                "median": round(self._percentile(cycle_times_hours, 0.5) or 0.0, 2),
-                "p95": round(self._p95(cycle_times_hours) or 0.0, 2),
-            },
+            "cycle_time_hours": cycle_time_summary,
             "exception_rate": {
                 "exception_count": exception_count,
                 "rate": round((exception_count / total_items) if total_items else 0.0, 4),
@@ -2029,11 +2010,7 @@ class MetricsStore:
                 if approval_latencies_hours
                 else 0.0,
             },
-            "missed_discounts_baseline": {
-                "candidate_count": discount_candidate_count,
-                "missed_count": missed_discount_count,
-                "missed_value": round(missed_discount_value, 2),
-            },
+            "missed_discounts_baseline": summary["missed_discounts_baseline"],
             "approval_friction": {
                 "population_count": int(approval_population),
                 "avg_handoffs": round(sum(handoff_counts) / len(handoff_counts), 2) if handoff_counts else 0.0,
@@ -159,6 +159,47 @@ class PaymentConfirmationsStore:
             rows = cur.fetchall()
         return [d for d in (self._decode_row(r) for r in rows) if d is not None]
 
+    def list_payment_confirmations_in_window(
+        self,
+        organization_id: str,
+        *,
+        status: Optional[str] = None,
+        from_ts: Optional[str] = None,
+        to_ts: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Uncapped settlement-window load for the bulk bank-rec sweep.
+
+        ``list_payment_confirmations`` caps at 1000 rows, which is right
+        for a feed but silently drops candidates when the reconciler
+        loads one window for a whole statement import. The window is
+        the caller's bound here. Rows with NULL ``settlement_at`` are
+        only returned when no bounds are given (same as the capped feed).
+        """
+        self.initialize()
+        clauses = ["organization_id = %s"]
+        params: List[Any] = [organization_id]
+        if status:
+            if status not in _VALID_STATUSES:
+                raise ValueError(f"invalid status filter: {status!r}")
+            clauses.append("status = %s")
+            params.append(status)
+        if from_ts:
+            clauses.append("settlement_at >= %s")
+            params.append(from_ts)
+        if to_ts:
+            clauses.append("settlement_at <= %s")
+            params.append(to_ts)
+        sql = (
+            "SELECT * FROM payment_confirmations "
+            "WHERE " + " AND ".join(clauses) + " "
+            "ORDER BY settlement_at ASC NULLS LAST, created_at ASC"
+        )
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, tuple(params))
+            rows = cur.fetchall()
+        return [d for d in (self._decode_row(r) for r in rows) if d is not None]
+
     # ------------------------------------------------------------------
     # Writes
     # ------------------------------------------------------------------
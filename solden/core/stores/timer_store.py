@@ -0,0 +1,221 @@
+"""TimerStore mixin — the ``agent_timers`` due-time index.
+
+Every Box that is waiting on the clock registers one row here per
+timer type: a snoozed item (``snooze_expired``), an item paused on an
+unreachable ERP (``erp_recheck``) and an approval waiting on a reminder
+or escalation milestone (``approval_timeout``). ``due_at`` is a real
+``TIMESTAMPTZ`` with a btree index, so finding what is due is an index
+range scan that costs O(due timers) instead of a scan of ``ap_items``
+that re-parses JSON expiry fields per row.
+
+Rows are keyed by ``(box_id, timer_type)``: registering again moves
+the timer, cancelling deletes it. ``claim_due_timers`` pops due rows
+in due order with ``FOR UPDATE SKIP LOCKED`` so several consumers can
+drain the table concurrently; a claim pushes ``due_at`` out by a lease
+and stamps a ``claim_token``, while ``scheduled_at`` keeps the time the
+timer was registered for. ``complete_timers`` deletes the claimed
+rows once their events are enqueued — a consumer that dies mid-batch
+leaves them to reappear when the lease runs out. A timer re-registered
+while claimed drops the token, so completing the stale claim cannot
+delete the new registration.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+
+# How long a claimed timer stays hidden from other consumers before it
+# is handed out again.
+DEFAULT_TIMER_LEASE_SECONDS = 300
+
+
+def _as_utc(value: Union[datetime, str]) -> datetime:
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+class TimerStore:
+    """Mixin providing agent-timer persistence for SoldenDB.
+
+    The table is created by migration 103; ``scheduled_at`` is added by
+    migration 112.
+    """
+
+    @staticmethod
+    def _timer_row_to_dict(row: Any) -> Dict[str, Any]:
+        data = dict(row)
+        for key in ("due_at", "scheduled_at"):
+            if isinstance(data.get(key), datetime):
+                data[key] = _as_utc(data[key]).isoformat()
+        raw_payload = data.get("payload")
+        try:
+            data["payload"] = json.loads(raw_payload) if raw_payload else {}
+        except (TypeError, ValueError):
+            data["payload"] = {}
+        return data
+
+    # ------------------------------------------------------------------
+    # Register / cancel
+    # ------------------------------------------------------------------
+
+    def register_timer(
+        self,
+        *,
+        organization_id: str,
+        box_id: str,
+        timer_type: str,
+        due_at: Union[datetime, str],
+        payload: Optional[Dict[str, Any]] = None,
+        box_type: str = "ap_item",
+    ) -> str:
+        """Create or move the ``timer_type`` timer for ``box_id``.
+
+        ``due_at`` may be an aware datetime or an ISO string (naive
+        values are taken as UTC). Returns the timer id.
+        """
+        self.initialize()
+        now = datetime.now(timezone.utc).isoformat()
+        sql = (
+            """
+            INSERT INTO agent_timers
+            (id, organization_id, box_id, box_type, timer_type, due_at,
+             scheduled_at, payload, claim_token, attempts, created_at, updated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NULL, 0, %s, %s)
+            ON CONFLICT (box_id, timer_type) DO UPDATE SET
+                organization_id = EXCLUDED.organization_id,
+                box_type = EXCLUDED.box_type,
+                due_at = EXCLUDED.due_at,
+                scheduled_at = EXCLUDED.scheduled_at,
+                payload = EXCLUDED.payload,
+                claim_token = NULL,
+                attempts = 0,
+                updated_at = EXCLUDED.updated_at
+            RETURNING id
+            """
+        )
+        due = _as_utc(due_at)
+        params = (
+            f"tmr_{uuid.uuid4().hex[:16]}",
+            organization_id,
+            box_id,
+            box_type,
+            timer_type,
+            due,
+            due,
+            json.dumps(payload) if payload else None,
+            now,
+            now,
+        )
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            row = cur.fetchone()
+            conn.commit()
+        return str(row[0]) if row else ""
+
+    def cancel_timer(self, box_id: str, timer_type: str) -> bool:
+        """Delete the ``timer_type`` timer for ``box_id``, if any."""
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM agent_timers WHERE box_id = %s AND timer_type = %s",
+                (box_id, timer_type),
+            )
+            conn.commit()
+            return cur.rowcount > 0
+
+    def get_timer(self, box_id: str, timer_type: str) -> Optional[Dict[str, Any]]:
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT * FROM agent_timers WHERE box_id = %s AND timer_type = %s",
+                (box_id, timer_type),
+            )
+            row = cur.fetchone()
+        return self._timer_row_to_dict(row) if row else None
+
+    # ------------------------------------------------------------------
+    # Consume
+    # ------------------------------------------------------------------
+
+    def claim_due_timers(
+        self,
+        *,
+        limit: int = 200,
+        lease_seconds: int = DEFAULT_TIMER_LEASE_SECONDS,
+        as_of: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Claim up to ``limit`` timers due at ``as_of`` (default now).
+
+        Returned in due order; each dict carries the ``due_at`` it was
+        claimed at (the lease-pushed one, if an earlier claim lapsed),
+        the ``scheduled_at`` it was registered for, and the batch's
+        ``claim_token`` for ``complete_timers``.
+        """
+        self.initialize()
+        now = _as_utc(as_of) if as_of is not None else datetime.now(timezone.utc)
+        token = uuid.uuid4().hex
+        safe_limit = max(1, min(int(limit or 200), 5000))
+        sql = (
+            """
+            WITH due AS (
+                SELECT id, due_at FROM agent_timers
+                WHERE due_at <= %s
+                ORDER BY due_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE agent_timers t
+            SET due_at = %s, claim_token = %s,
+                attempts = t.attempts + 1, updated_at = %s
+            FROM due
+            WHERE t.id = due.id
+            RETURNING t.id, t.organization_id, t.box_id, t.box_type,
+                      t.timer_type, due.due_at AS due_at,
+                      COALESCE(t.scheduled_at, due.due_at) AS scheduled_at, t.payload,
+                      t.claim_token, t.attempts
+            """
+        )
+        params = (
+            now,
+            safe_limit,
+            now + timedelta(seconds=max(1, int(lease_seconds))),
+            token,
+            now.isoformat(),
+        )
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+            conn.commit()
+        timers = [self._timer_row_to_dict(r) for r in rows]
+        timers.sort(key=lambda t: t["due_at"])
+        return timers
+
+    def complete_timers(self, timer_ids: Sequence[str], claim_token: str) -> int:
+        """Delete claimed timers that still carry ``claim_token``."""
+        ids = [str(t) for t in timer_ids if t]
+        if not ids:
+            return 0
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM agent_timers WHERE id = ANY(%s) AND claim_token = %s",
+                (ids, claim_token),
+            )
+            conn.commit()
+            return cur.rowcount
@@ -1571,6 +1571,60 @@ class VendorStore:
             profiles.append(parsed)
         return profiles
 
+    def list_vendor_profile_names(
+        self,
+        organization_id: str,
+        *,
+        updated_since: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return ``id`` / ``vendor_name`` / ``updated_at`` for the org's
+        profiles, optionally only those updated at or after
+        ``updated_since``.
+
+        Feeds the incremental sync of the per-org vendor name index
+        (``services/vendor_name_index.py``) — a narrow projection so a
+        50k-vendor org doesn't ship every JSON column on each refresh.
+        """
+        sql = (
+            "SELECT id, vendor_name, updated_at FROM vendor_profiles "
+            "WHERE organization_id = %s"
+        )
+        params: List[Any] = [organization_id]
+        if updated_since:
+            sql += " AND updated_at >= %s"
+            params.append(updated_since)
+        sql += " ORDER BY updated_at, id"
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, tuple(params))
+            return [dict(row) for row in cur.fetchall()]
+
+    def list_vendor_profile_ids(self, organization_id: str) -> List[str]:
+        """Return every profile id in the org (deletion sweep for the
+        vendor name index)."""
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT id FROM vendor_profiles WHERE organization_id = %s",
+                (organization_id,),
+            )
+            return [row["id"] for row in cur.fetchall()]
+
+    def count_vendor_profiles(self, organization_id: str, *, named_only: bool = False) -> int:
+        """Count the org's profiles. ``named_only`` skips blank names,
+        which the vendor name index never holds."""
+        sql = "SELECT COUNT(*) AS n FROM vendor_profiles WHERE organization_id = %s"
+        if named_only:
+            sql += " AND btrim(COALESCE(vendor_name, '')) <> ''"
+        self.initialize()
+        with self.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, (organization_id,))
+            row = cur.fetchone()
+        return int(row["n"] if row else 0)
+
     # ------------------------------------------------------------------ #
     # vendor_onboarding_sessions (Phase 3.1.a)                             #
     # ------------------------------------------------------------------ #
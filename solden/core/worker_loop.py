@@ -0,0 +1,117 @@
+"""Persistent event loops for sync worker code.
+
+Celery tasks and the event-stream consumer are synchronous, but the
+coordination engine, Gmail client, ERP connectors and LLM gateway are
+async. The old bridge was ``asyncio.run(...)`` per call, which builds a
+loop, runs one coroutine and closes the loop again. Anything bound to
+that loop dies with it — most expensively the shared
+``httpx.AsyncClient`` (:mod:`solden.core.http_client`), so every event
+paid fresh TCP + TLS handshakes to Gmail, the ERPs and the model API.
+
+:func:`run_on_worker_loop` is the drop-in replacement. Each OS thread
+gets one loop, created on first use and kept for the life of the
+thread:
+
+* a Celery prefork child (one task thread) → one loop per process;
+* a Celery ``threads`` pool or the event-stream consumer's thread pool
+  → one loop per pool thread, so plans still run side by side (the
+  engine's sync DB calls would serialize them on a single shared loop)
+  and each thread keeps its own warm HTTP pool.
+
+Unlike ``asyncio.run``, tasks a coroutine spawns and leaves running are
+not cancelled when it returns; they make progress the next time the
+thread's loop runs. Loops are dropped in forked children (they belong
+to the parent's threads) and closed at interpreter exit.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+import weakref
+from typing import Awaitable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_local = threading.local()
+# Every live worker loop, for the exit hook.
+_loops: "weakref.WeakSet[asyncio.AbstractEventLoop]" = weakref.WeakSet()
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Return this thread's persistent loop, creating it on first use."""
+    loop: Optional[asyncio.AbstractEventLoop] = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _local.loop = loop
+        _loops.add(loop)
+        logger.debug("[worker_loop] loop created for thread %s", threading.current_thread().name)
+    return loop
+
+
+def run_on_worker_loop(coro: Awaitable[T]) -> T:
+    """Run ``coro`` to completion on this thread's persistent loop.
+
+    Like ``asyncio.run``, this must not be called from a thread that is
+    already running a loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        close = getattr(coro, "close", None)
+        if close is not None:
+            close()
+        raise RuntimeError("run_on_worker_loop() cannot be called from a running event loop")
+    loop = get_worker_loop()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
+
+
+def _close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    if loop.is_closed() or loop.is_running():
+        return
+    from solden.core.http_client import close_http_client
+
+    try:
+        loop.run_until_complete(close_http_client())
+        pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("[worker_loop] shutdown of loop raised: %s", exc)
+    finally:
+        loop.close()
+
+
+def close_worker_loop() -> None:
+    """Close this thread's loop (and its HTTP client), if it has one."""
+    loop = getattr(_local, "loop", None)
+    _local.loop = None
+    if loop is not None:
+        _close_loop(loop)
+
+
+def _close_all_loops() -> None:
+    for loop in list(_loops):
+        _close_loop(loop)
+
+
+def _forget_loops_after_fork() -> None:
+    # The parent's loops belong to threads that don't exist here.
+    global _local, _loops
+    _local = threading.local()
+    _loops = weakref.WeakSet()
+
+
+atexit.register(_close_all_loops)
+os.register_at_fork(after_in_child=_forget_loops_after_fork)
+
@@ -7,7 +7,7 @@ settlements, attachments, OAuth 1.0 header construction, and async polling.
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 import httpx
@@ -1542,6 +1542,33 @@ _NS_ACCOUNT_TYPE_MAP = {
 }
 
 
+def _ns_active(is_inactive: Any) -> bool:
+    if isinstance(is_inactive, str):
+        return is_inactive.strip().upper() not in {"T", "TRUE", "YES", "1"}
+    if isinstance(is_inactive, bool):
+        return not is_inactive
+    return True
+
+
+def _ns_ref_name(value: Any) -> str:
+    if isinstance(value, dict):
+        return str(value.get("refName") or value.get("name") or "")
+    return str(value) if value else ""
+
+
+def _normalize_ns_account(item: Dict[str, Any]) -> Dict[str, Any]:
+    raw_type = str(item.get("accttype") or "").strip().lower()
+    return {
+        "id": str(item.get("id") or ""),
+        "code": str(item.get("acctnumber") or ""),
+        "name": str(item.get("acctname") or ""),
+        "type": _NS_ACCOUNT_TYPE_MAP.get(raw_type, raw_type),
+        "sub_type": raw_type,
+        "active": _ns_active(item.get("isinactive")),
+        "currency": _ns_ref_name(item.get("currency")),
+    }
+
+
 async def get_chart_of_accounts_netsuite(connection) -> List[Dict[str, Any]]:
     """Fetch all accounts from NetSuite via SuiteQL.
 
@@ -1557,7 +1584,7 @@ async def get_chart_of_accounts_netsuite(connection) -> List[Dict[str, Any]]:
     )
     auth_header = _oauth_header(connection, "POST", suiteql_url)
 
-    query = "SELECT id, acctnumber, acctname, accttype, isinactive, currency FROM account"
+    query = f"SELECT {_NS_ACCOUNT_COLUMNS} FROM account"
     try:
         client = get_http_client()
         response = await client.post(
@@ -1574,33 +1601,7 @@ async def get_chart_of_accounts_netsuite(connection) -> List[Dict[str, Any]]:
         response.raise_for_status()
         result = response.json()
 
-        accounts: List[Dict[str, Any]] = []
-        for item in result.get("items", []):
-            raw_type = str(item.get("accttype") or "").strip().lower()
-            is_inactive = item.get("isinactive")
-            active = True
-            if isinstance(is_inactive, str):
-                active = is_inactive.strip().upper() not in {"T", "TRUE", "YES", "1"}
-            elif isinstance(is_inactive, bool):
-                active = not is_inactive
-
-            currency_val = item.get("currency")
-            currency = ""
-            if isinstance(currency_val, dict):
-                currency = str(currency_val.get("refName") or currency_val.get("name") or "")
-            elif currency_val:
-                currency = str(currency_val)
-
-            accounts.append({
-                "id": str(item.get("id") or ""),
-                "code": str(item.get("acctnumber") or ""),
-                "name": str(item.get("acctname") or ""),
-                "type": _NS_ACCOUNT_TYPE_MAP.get(raw_type, raw_type),
-                "sub_type": raw_type,
-                "active": active,
-                "currency": currency,
-            })
-        return accounts
+        return [_normalize_ns_account(item) for item in result.get("items", [])]
 
     except Exception as e:
         logger.error("Failed to fetch NetSuite chart of accounts: %s", type(e).__name__)
@@ -1742,6 +1743,28 @@ async def preflight_netsuite(connection) -> Dict[str, Any]:
 # ==================== Vendor List ====================
 
 
+_NS_VENDOR_COLUMNS = (
+    "id, companyName, email, phone, "
+    "defaultAddress, terms, isInactive, currency"
+)
+_NS_ACCOUNT_COLUMNS = "id, acctnumber, acctname, accttype, isinactive, currency"
+
+
+def _normalize_ns_vendor(v: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "vendor_id": str(v.get("id") or ""),
+        "name": str(v.get("companyname") or v.get("companyName") or ""),
+        "email": str(v.get("email") or ""),
+        "phone": str(v.get("phone") or ""),
+        "tax_id": "",
+        "currency": _ns_ref_name(v.get("currency")),
+        "active": _ns_active(v.get("isinactive") or v.get("isInactive")),
+        "address": str(v.get("defaultaddress") or v.get("defaultAddress") or ""),
+        "payment_terms": _ns_ref_name(v.get("terms")),
+        "balance": 0.0,
+    }
+
+
 async def list_all_vendors_netsuite(connection) -> List[Dict[str, Any]]:
     """Fetch all vendors from NetSuite via SuiteQL with pagination.
 
@@ -1756,11 +1779,7 @@ async def list_all_vendors_netsuite(connection) -> List[Dict[str, Any]]:
         "/services/rest/query/v1/suiteql"
     )
 
-    query = (
-        "SELECT id, companyName, email, phone, "
-        "defaultAddress, terms, isInactive, currency "
-        "FROM vendor"
-    )
+    query = f"SELECT {_NS_VENDOR_COLUMNS} FROM vendor"
     page_size = 1000
     offset = 0
     all_vendors: List[Dict[str, Any]] = []
@@ -1792,40 +1811,7 @@ async def list_all_vendors_netsuite(connection) -> List[Dict[str, Any]]:
             if not items:
                 break
 
-            for v in items:
-                is_inactive = v.get("isinactive") or v.get("isInactive")
-                active = True
-                if isinstance(is_inactive, str):
-                    active = is_inactive.strip().upper() not in {"T", "TRUE", "YES", "1"}
-                elif isinstance(is_inactive, bool):
-                    active = not is_inactive
-
-                currency_val = v.get("currency")
-                currency = ""
-                if isinstance(currency_val, dict):
-                    currency = str(currency_val.get("refName") or currency_val.get("name") or "")
-                elif currency_val:
-                    currency = str(currency_val)
-
-                terms_val = v.get("terms")
-                terms = ""
-                if isinstance(terms_val, dict):
-                    terms = str(terms_val.get("refName") or terms_val.get("name") or "")
-                elif terms_val:
-                    terms = str(terms_val)
-
-                all_vendors.append({
-                    "vendor_id": str(v.get("id") or ""),
-                    "name": str(v.get("companyname") or v.get("companyName") or ""),
-                    "email": str(v.get("email") or ""),
-                    "phone": str(v.get("phone") or ""),
-                    "tax_id": "",
-                    "currency": currency,
-                    "active": active,
-                    "address": str(v.get("defaultaddress") or v.get("defaultAddress") or ""),
-                    "payment_terms": terms,
-                    "balance": 0.0,
-                })
+            all_vendors.extend(_normalize_ns_vendor(v) for v in items)
 
             if len(items) < page_size:
                 break
@@ -1836,3 +1822,65 @@ async def list_all_vendors_netsuite(connection) -> List[Dict[str, Any]]:
     except Exception as e:
         logger.error("Failed to fetch NetSuite vendor list: %s", type(e).__name__)
         return all_vendors or []
+
+
+# ==================== Incremental sync ====================
+
+# lastmodifieddate is compared in the account's time zone, which we
+# don't know; widening the window by a day covers any offset and the
+# upserts are idempotent.
+_NS_DELTA_TZ_SLACK = timedelta(days=1)
+
+
+async def _suiteql_changed_since(connection, table: str, columns: str, since: datetime) -> List[Dict[str, Any]]:
+    """Rows of ``table`` modified since ``since``; raises on any failure."""
+    if not connection.account_id:
+        raise ValueError("NetSuite connection is missing an account id")
+    suiteql_url = (
+        f"https://{connection.account_id}.suitetalk.api.netsuite.com"
+        "/services/rest/query/v1/suiteql"
+    )
+    cutoff = (since.astimezone(timezone.utc) - _NS_DELTA_TZ_SLACK).strftime("%Y-%m-%d %H:%M:%S")
+    query = (
+        f"SELECT {columns} FROM {table} "
+        f"WHERE lastmodifieddate > TO_DATE('{cutoff}', 'YYYY-MM-DD HH24:MI:SS')"
+    )
+    page_size = 1000
+    offset = 0
+    rows: List[Dict[str, Any]] = []
+    client = get_http_client()
+    while True:
+        response = await client.post(
+            suiteql_url,
+            json={"q": query},
+            headers={
+                "Authorization": _oauth_header(connection, "POST", suiteql_url),
+                "Content-Type": "application/json",
+                "Prefer": "transient",
+            },
+            params={"limit": page_size, "offset": offset},
+            timeout=60,
+        )
+        response.raise_for_status()
+        items = response.json().get("items", [])
+        rows.extend(items)
+        if len(items) < page_size:
+            break
+        offset += page_size
+    return rows
+
+
+async def list_vendor_changes_netsuite(connection, since: datetime) -> Dict[str, List[Any]]:
+    """Vendors modified since ``since`` (by ``lastmodifieddate``).
+
+    Deleted vendors are not reported; inactivated ones come back with
+    ``active`` false and the periodic full sync prunes deletions.
+    """
+    rows = await _suiteql_changed_since(connection, "vendor", _NS_VENDOR_COLUMNS, since)
+    return {"upserts": [_normalize_ns_vendor(v) for v in rows], "deleted": []}
+
+
+async def list_account_changes_netsuite(connection, since: datetime) -> Dict[str, List[Any]]:
+    """Accounts modified since ``since`` (same caveats as vendors)."""
+    rows = await _suiteql_changed_since(connection, "account", _NS_ACCOUNT_COLUMNS, since)
+    return {"upserts": [_normalize_ns_account(a) for a in rows], "deleted": []}
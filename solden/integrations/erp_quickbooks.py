@@ -1625,6 +1625,19 @@ _QB_ACCOUNT_TYPE_MAP = {
 }
 
 
+def _normalize_qb_account(acc: Dict[str, Any]) -> Dict[str, Any]:
+    raw_type = str(acc.get("AccountType") or "").strip().lower()
+    return {
+        "id": str(acc.get("Id") or ""),
+        "code": str(acc.get("AcctNum") or ""),
+        "name": str(acc.get("Name") or ""),
+        "type": _QB_ACCOUNT_TYPE_MAP.get(raw_type, raw_type),
+        "sub_type": str(acc.get("AccountSubType") or ""),
+        "active": acc.get("Active", True) is True,
+        "currency": str(acc.get("CurrencyRef", {}).get("value", "") if isinstance(acc.get("CurrencyRef"), dict) else ""),
+    }
+
+
 async def get_chart_of_accounts_quickbooks(connection) -> List[Dict[str, Any]]:
     """Fetch all accounts from QuickBooks Online.
 
@@ -1653,19 +1666,10 @@ async def get_chart_of_accounts_quickbooks(connection) -> List[Dict[str, Any]]:
         response.raise_for_status()
         result = response.json()
 
-        accounts: List[Dict[str, Any]] = []
-        for acc in result.get("QueryResponse", {}).get("Account", []):
-            raw_type = str(acc.get("AccountType") or "").strip().lower()
-            accounts.append({
-                "id": str(acc.get("Id") or ""),
-                "code": str(acc.get("AcctNum") or ""),
-                "name": str(acc.get("Name") or ""),
-                "type": _QB_ACCOUNT_TYPE_MAP.get(raw_type, raw_type),
-                "sub_type": str(acc.get("AccountSubType") or ""),
-                "active": acc.get("Active", True) is True,
-                "currency": str(acc.get("CurrencyRef", {}).get("value", "") if isinstance(acc.get("CurrencyRef"), dict) else ""),
-            })
-        return accounts
+        return [
+            _normalize_qb_account(acc)
+            for acc in result.get("QueryResponse", {}).get("Account", [])
+        ]
 
     except Exception as e:
         logger.error("Failed to fetch QuickBooks chart of accounts: %s", type(e).__name__)
@@ -1675,6 +1679,28 @@ async def get_chart_of_accounts_quickbooks(connection) -> List[Dict[str, Any]]:
 # ==================== Vendor List ====================
 
 
+def _normalize_qb_vendor(v: Dict[str, Any]) -> Dict[str, Any]:
+    addr = v.get("BillAddr") or {}
+    return {
+        "vendor_id": str(v.get("Id") or ""),
+        "name": str(v.get("DisplayName") or ""),
+        "email": str((v.get("PrimaryEmailAddr") or {}).get("Address") or ""),
+        "phone": str((v.get("PrimaryPhone") or {}).get("FreeFormNumber") or ""),
+        "tax_id": str(v.get("TaxIdentifier") or ""),
+        "currency": str((v.get("CurrencyRef") or {}).get("value") or ""),
+        "active": v.get("Active", True) is True,
+        "address": ", ".join(
+            filter(None, [
+                addr.get("Line1"), addr.get("City"),
+                addr.get("CountrySubDivisionCode"), addr.get("PostalCode"),
+                addr.get("Country"),
+            ])
+        ),
+        "payment_terms": "",
+        "balance": float(v.get("Balance") or 0),
+    }
+
+
 async def list_all_vendors_quickbooks(connection) -> List[Dict[str, Any]]:
     """Fetch all vendors from QuickBooks Online with pagination.
 
@@ -1714,26 +1740,7 @@ async def list_all_vendors_quickbooks(connection) -> List[Dict[str, Any]]:
             if not vendors:
                 break
 
-            for v in vendors:
-                addr = v.get("BillAddr") or {}
-                all_vendors.append({
-                    "vendor_id": str(v.get("Id") or ""),
-                    "name": str(v.get("DisplayName") or ""),
-                    "email": str((v.get("PrimaryEmailAddr") or {}).get("Address") or ""),
-                    "phone": str((v.get("PrimaryPhone") or {}).get("FreeFormNumber") or ""),
-                    "tax_id": str(v.get("TaxIdentifier") or ""),
-                    "currency": str((v.get("CurrencyRef") or {}).get("value") or ""),
-                    "active": v.get("Active", True) is True,
-                    "address": ", ".join(
-                        filter(None, [
-                            addr.get("Line1"), addr.get("City"),
-                            addr.get("CountrySubDivisionCode"), addr.get("PostalCode"),
-                            addr.get("Country"),
-                        ])
-                    ),
-                    "payment_terms": "",
-                    "balance": float(v.get("Balance") or 0),
-                })
+            all_vendors.extend(_normalize_qb_vendor(v) for v in vendors)
 
             if len(vendors) < page_size:
                 break
@@ -1746,6 +1753,73 @@ async def list_all_vendors_quickbooks(connection) -> List[Dict[str, Any]]:
         return all_vendors or []
 
 
+# ==================== Change Data Capture ====================
+
+# CDC returns at most this many objects per entity per call; a full
+# page means changes were dropped and the caller must do a full pull.
+QB_CDC_MAX_OBJECTS = 1000
+
+
+async def _quickbooks_cdc(connection, entity: str, since: datetime) -> List[Dict[str, Any]]:
+    """Return raw ``entity`` objects changed since ``since`` via the CDC API.
+
+    Unlike the list fetchers this raises on any failure — a delta sync
+    that silently returned nothing would advance the caller's
+    high-water mark past changes it never saw.
+    """
+    if not connection.access_token or not connection.realm_id:
+        raise ValueError("QuickBooks connection is missing a token or realm id")
+    url = f"https://quickbooks.api.intuit.com/v3/company/{connection.realm_id}/cdc"
+    client = get_http_client()
+    response = await client.get(
+        url,
+        params={
+            "entities": entity,
+            "changedSince": since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        },
+        headers=_quickbooks_headers(connection),
+        timeout=60,
+    )
+    response.raise_for_status()
+    objects: List[Dict[str, Any]] = []
+    for block in response.json().get("CDCResponse", []) or []:
+        for query_response in block.get("QueryResponse", []) or []:
+            objects.extend(query_response.get(entity, []) or [])
+    if len(objects) >= QB_CDC_MAX_OBJECTS:
+        raise OverflowError(f"QuickBooks CDC returned {len(objects)} {entity} objects; full sync required")
+    return objects
+
+
+def _split_qb_cdc(objects, normalize, id_key: str) -> Dict[str, List[Any]]:
+    upserts: List[Dict[str, Any]] = []
+    deleted: List[str] = []
+    for obj in objects:
+        if str(obj.get("status") or "").lower() == "deleted":
+            if obj.get("Id"):
+                deleted.append(str(obj["Id"]))
+            continue
+        record = normalize(obj)
+        if record.get(id_key):
+            upserts.append(record)
+    return {"upserts": upserts, "deleted": deleted}
+
+
+async def list_vendor_changes_quickbooks(connection, since: datetime) -> Dict[str, List[Any]]:
+    """Vendors created, updated or deleted since ``since``.
+
+    Returns ``{"upserts": [normalized vendors], "deleted": [vendor ids]}``.
+    CDC only looks back 30 days; raises when the window can't be served.
+    """
+    objects = await _quickbooks_cdc(connection, "Vendor", since)
+    return _split_qb_cdc(objects, _normalize_qb_vendor, "vendor_id")
+
+
+async def list_account_changes_quickbooks(connection, since: datetime) -> Dict[str, List[Any]]:
+    """Accounts created, updated or deleted since ``since`` (same shape as vendors)."""
+    objects = await _quickbooks_cdc(connection, "Account", since)
+    return _split_qb_cdc(objects, _normalize_qb_account, "id")
+
+
 async def list_all_purchase_orders_quickbooks(connection) -> List[Dict[str, Any]]:
     """Fetch all Purchase Orders from QuickBooks Online with pagination.
 
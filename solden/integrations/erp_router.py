@@ -24,12 +24,13 @@ import logging
 import secrets as _secrets_for_lock
 import time as _time_for_lock
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
 from solden.core.database import get_db as _canonical_get_db
 from solden.core.http_client import get_http_client
 from solden.core.org_utils import assert_org_id
+from solden.core.stores.erp_cache_store import ERP_CACHE_ACCOUNTS, ERP_CACHE_VENDORS
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +79,8 @@ from solden.integrations.erp_quickbooks import (  # noqa: F401, E402
     get_chart_of_accounts_quickbooks,
     list_all_purchase_orders_quickbooks,
     list_all_vendors_quickbooks,
+    list_account_changes_quickbooks,
+    list_vendor_changes_quickbooks,
 )
 
 # ---------------------------------------------------------------------------
@@ -101,6 +104,8 @@ from solden.integrations.erp_xero import (  # noqa: F401, E402
     get_chart_of_accounts_xero,
     list_all_purchase_orders_xero,
     list_all_vendors_xero,
+    list_account_changes_xero,
+    list_vendor_changes_xero,
 )
 
 # ---------------------------------------------------------------------------
@@ -125,6 +130,8 @@ from solden.integrations.erp_netsuite import (  # noqa: F401, E402
     get_payment_status_netsuite,
     get_chart_of_accounts_netsuite,
     list_all_vendors_netsuite,
+    list_account_changes_netsuite,
+    list_vendor_changes_netsuite,
 )
 
 # ---------------------------------------------------------------------------
@@ -2026,21 +2033,13 @@ async def erp_preflight_check(
         if gl_map:
             valid_codes.update(gl_map.values())
 
-        # Also pull codes from cached chart of accounts (no ERP call — cache only)
-        try:
-            cached_coa = _get_cached_chart_of_accounts(organization_id)
-            if cached_coa and isinstance(cached_coa.get("accounts"), list):
-                for acct in cached_coa["accounts"]:
-                    code = str(acct.get("code") or "").strip()
-                    acct_id = str(acct.get("id") or "").strip()
-                    if code:
-                        valid_codes.add(code)
-                    if acct_id:
-                        valid_codes.add(acct_id)
-        except Exception:
-            pass  # non-fatal — fall back to GL map only
+        # Also check the codes against the cached chart of accounts
+        # (no ERP call — an indexed probe of the cache only)
+        matched = _match_cached_gl_codes(organization_id, gl_codes, active_only=False)
+        if matched is not None:
+            valid_codes.update(matched)
 
-        if valid_codes:
+        if valid_codes or matched is not None:
             invalid = [c for c in gl_codes if c not in valid_codes]
             result["gl_valid"] = len(invalid) == 0
             result["invalid_gl_codes"] = invalid
@@ -2317,6 +2316,232 @@ async def get_bill_payment_status(
         return {"paid": False, "error": str(exc)}
 
 
+# ==================== ERP directory cache ====================
+#
+# The vendor directory and chart of accounts are cached one row per
+# record in ``erp_vendor_cache`` / ``erp_account_cache``
+# (:mod:`solden.core.stores.erp_cache_store`). Readers page and look up
+# from the tables; a refresh pulls only what changed since the last
+# sync's high-water mark when the ERP has a change feed (QuickBooks
+# CDC, Xero ``If-Modified-Since``, NetSuite ``lastmodifieddate``) and
+# falls back to a full pull otherwise.
+
+# Cache TTL: 24 hours
+_ERP_DIRECTORY_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Deltas are trusted for this long after the last full pull. The full
+# pull is what drops records deleted in ERPs whose change feed doesn't
+# report deletions (Xero, NetSuite), and QuickBooks CDC can't look back
+# more than 30 days.
+_ERP_DIRECTORY_FULL_SYNC_INTERVAL = timedelta(days=7)
+
+# The high-water mark is recorded this far before the sync started, so
+# records written in the ERP while we were reading are picked up again
+# next time. Upserts are idempotent, so the overlap only costs a few
+# repeated rows.
+_ERP_DIRECTORY_DELTA_OVERLAP = timedelta(minutes=5)
+
+
+def _parse_cache_ts(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _last_synced_at(state: Dict[str, Any]) -> Optional[datetime]:
+    stamps = [
+        ts for ts in (
+            _parse_cache_ts(state.get("last_full_sync_at")),
+            _parse_cache_ts(state.get("last_delta_sync_at")),
+        ) if ts is not None
+    ]
+    return max(stamps) if stamps else None
+
+
+def _fresh_directory_state(
+    kind: str,
+    organization_id: str,
+    entity_id: Optional[str] = None,
+    erp_type: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Sync state of the cached directory, or None if missing or past the TTL."""
+    state = _get_db().get_erp_cache_sync_state(
+        kind, organization_id, erp_type=erp_type, entity_id=entity_id,
+    )
+    if not state:
+        return None
+    synced_at = _last_synced_at(state)
+    if synced_at is None:
+        return None
+    age_seconds = (datetime.now(timezone.utc) - synced_at).total_seconds()
+    if age_seconds > _ERP_DIRECTORY_CACHE_TTL_SECONDS:
+        return None
+    return state
+
+
+def _store_full_directory(
+    kind: str,
+    organization_id: str,
+    erp_type: str,
+    records: List[Dict[str, Any]],
+    *,
+    entity_id: Optional[str] = None,
+    started_at: Optional[datetime] = None,
+) -> None:
+    """Replace the cached directory with a complete pull from the ERP."""
+    db = _get_db()
+    started = started_at or datetime.now(timezone.utc)
+    stamp = started.isoformat()
+    previous = db.count_erp_cache_rows(kind, organization_id, erp_type, entity_id=entity_id)
+    written = db.upsert_erp_cache_rows(
+        kind, organization_id, erp_type, records, entity_id=entity_id, synced_at=stamp,
+    )
+    # The list fetchers return what they got before a mid-pagination
+    # failure; don't let a truncated pull wipe most of a good cache.
+    if written * 2 >= previous:
+        db.prune_erp_cache_rows(
+            kind, organization_id, keep_erp_type=erp_type,
+            synced_before=stamp, entity_id=entity_id,
+        )
+    else:
+        logger.warning(
+            "ERP %s pull for org %s returned %d of %d cached rows; not pruning",
+            kind, organization_id, written, previous,
+        )
+    db.record_erp_cache_sync(
+        kind, organization_id, erp_type,
+        full=True,
+        synced_at=stamp,
+        high_water_mark=(started - _ERP_DIRECTORY_DELTA_OVERLAP).isoformat(),
+        row_count=db.count_erp_cache_rows(kind, organization_id, erp_type, entity_id=entity_id),
+        entity_id=entity_id,
+    )
+
+
+async def _sync_erp_directory(
+    kind: str,
+    organization_id: str,
+    connection: "ERPConnection",
+    *,
+    full_fetchers: Dict[str, Any],
+    change_fetchers: Dict[str, Any],
+    entity_id: Optional[str] = None,
+) -> bool:
+    """Bring the cached directory up to date; return False if nothing was synced.
+
+    Runs a delta sync from the recorded high-water mark when the ERP
+    supports one and the last full pull is recent enough; a failed
+    delta falls through to a full pull. Fetcher exceptions on the full
+    pull propagate to the caller.
+    """
+    db = _get_db()
+    erp_type = str(connection.type or "").strip().lower()
+    started = datetime.now(timezone.utc)
+
+    state = db.get_erp_cache_sync_state(
+        kind, organization_id, erp_type=erp_type, entity_id=entity_id,
+    ) or {}
+    last_full = _parse_cache_ts(state.get("last_full_sync_at"))
+    mark = _parse_cache_ts(state.get("high_water_mark"))
+    change_fetcher = change_fetchers.get(erp_type)
+    if (
+        change_fetcher is not None
+        and mark is not None
+        and last_full is not None
+        and started - last_full < _ERP_DIRECTORY_FULL_SYNC_INTERVAL
+    ):
+        try:
+            changes = await change_fetcher(connection, mark)
+        except Exception as exc:
+            logger.info(
+                "ERP %s delta sync for org %s (%s) failed, running a full pull: %s",
+                kind, organization_id, erp_type, exc,
+            )
+        else:
+            stamp = started.isoformat()
+            db.upsert_erp_cache_rows(
+                kind, organization_id, erp_type, changes.get("upserts") or [],
+                entity_id=entity_id, synced_at=stamp,
+            )
+            db.delete_erp_cache_rows(
+                kind, organization_id, erp_type, changes.get("deleted") or [],
+                entity_id=entity_id,
+            )
+            db.record_erp_cache_sync(
+                kind, organization_id, erp_type,
+                full=False,
+                synced_at=stamp,
+                high_water_mark=(started - _ERP_DIRECTORY_DELTA_OVERLAP).isoformat(),
+                row_count=db.count_erp_cache_rows(kind, organization_id, erp_type, entity_id=entity_id),
+                entity_id=entity_id,
+            )
+            return True
+
+    fetcher = full_fetchers.get(erp_type)
+    if not fetcher:
+        logger.warning("No %s fetcher for ERP type: %s", kind, erp_type)
+        return False
+    records = await fetcher(connection)
+    # The list fetchers return [] on errors; keep the old cache rather
+    # than recording an empty directory as fresh.
+    if not records:
+        return False
+    _store_full_directory(
+        kind, organization_id, erp_type, records,
+        entity_id=entity_id, started_at=started,
+    )
+    return True
+
+
+async def _read_erp_directory(
+    kind: str,
+    organization_id: str,
+    *,
+    entity_id: Optional[str],
+    force_refresh: bool,
+    full_fetchers: Dict[str, Any],
+    change_fetchers: Dict[str, Any],
+    **page: Any,
+) -> List[Dict[str, Any]]:
+    """Shared body of :func:`get_chart_of_accounts` / :func:`list_all_vendors`."""
+    db = _get_db()
+    if not force_refresh:
+        state = _fresh_directory_state(kind, organization_id, entity_id=entity_id)
+        if state is not None:
+            return db.list_erp_cache_rows(
+                kind, organization_id, state["erp_type"], entity_id=entity_id, **page,
+            )
+
+    connection = get_erp_connection(organization_id, entity_id=entity_id)
+    if not connection:
+        logger.debug("No ERP connection for org %s, returning empty %s", organization_id, kind)
+        return []
+    erp_type = str(connection.type or "").strip().lower()
+
+    # §11.1: Rate-limit check — serve whatever is cached instead
+    _rate_limited = _enforce_erp_rate_limit(organization_id, connection.type)
+    if _rate_limited:
+        logger.warning("ERP %s fetch rate-limited for org %s", kind, organization_id)
+    else:
+        try:
+            await _sync_erp_directory(
+                kind, organization_id, connection,
+                full_fetchers=full_fetchers,
+                change_fetchers=change_fetchers,
+                entity_id=entity_id,
+            )
+        except Exception as exc:
+            logger.error("ERP %s sync failed for org %s (%s): %s", kind, organization_id, erp_type, exc)
+
+    return db.list_erp_cache_rows(
+        kind, organization_id, erp_type, entity_id=entity_id, **page,
+    )
+
+
 # ==================== Chart of Accounts Dispatcher ====================
 
 _CHART_OF_ACCOUNTS_FETCHERS = {
@@ -2326,44 +2551,57 @@ _CHART_OF_ACCOUNTS_FETCHERS = {
     "sap": get_chart_of_accounts_sap,
 }
 
-# Default cache TTL: 24 hours (in seconds)
-_COA_CACHE_TTL_SECONDS = 24 * 60 * 60
+# Delta fetchers: ``(connection, since) -> {"upserts": [...], "deleted": [...]}``.
+# SAP has no change feed we can use and always does a full pull.
+_ACCOUNT_CHANGE_FETCHERS = {
+    "quickbooks": list_account_changes_quickbooks,
+    "xero": list_account_changes_xero,
+    "netsuite": list_account_changes_netsuite,
+}
 
 
 def _get_cached_chart_of_accounts(
     organization_id: str,
+    entity_id: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
-    """Return cached chart of accounts from org settings_json, or None if stale/missing."""
-    import json as _json
-
+    """Return the cached chart of accounts, or None if stale/missing."""
     try:
-        db = _get_db()
-        org = db.get_organization(organization_id)
-        if not org:
-            return None
-        settings = org.get("settings_json") or org.get("settings") or {}
-        if isinstance(settings, str):
-            try:
-                settings = _json.loads(settings)
-            except Exception:
-                return None
-        cache = settings.get("chart_of_accounts_cache")
-        if not isinstance(cache, dict):
+        state = _fresh_directory_state(ERP_CACHE_ACCOUNTS, organization_id, entity_id=entity_id)
+        if state is None:
             return None
-        fetched_at = cache.get("fetched_at")
-        if not fetched_at:
-            return None
-        # Parse the fetched_at timestamp and check TTL
-        try:
-            fetched_dt = datetime.fromisoformat(fetched_at)
-            if fetched_dt.tzinfo is None:
-                fetched_dt = fetched_dt.replace(tzinfo=timezone.utc)
-            age_seconds = (datetime.now(timezone.utc) - fetched_dt).total_seconds()
-            if age_seconds > _COA_CACHE_TTL_SECONDS:
-                return None
-        except (ValueError, TypeError):
+        accounts = _get_db().list_erp_cache_rows(
+            ERP_CACHE_ACCOUNTS, organization_id, state["erp_type"], entity_id=entity_id,
+        )
+        return {
+            "accounts": accounts,
+            "fetched_at": _last_synced_at(state).isoformat(),
+            "erp_type": state["erp_type"],
+            "account_count": len(accounts),
+        }
+    except Exception:
+        return None
+
+
+def _match_cached_gl_codes(
+    organization_id: str,
+    gl_codes: List[str],
+    *,
+    active_only: bool = True,
+    entity_id: Optional[str] = None,
+) -> Optional[set]:
+    """Return which ``gl_codes`` exist in the cached chart of accounts.
+
+    A code matches an account's code or ERP id. Returns None when there
+    is no fresh, non-empty cache to validate against.
+    """
+    try:
+        state = _fresh_directory_state(ERP_CACHE_ACCOUNTS, organization_id, entity_id=entity_id)
+        if state is None or not state.get("row_count"):
             return None
-        return cache
+        return _get_db().match_erp_account_codes(
+            organization_id, state["erp_type"], gl_codes,
+            entity_id=entity_id, active_only=active_only,
+        )
     except Exception:
         return None
 
@@ -2372,32 +2610,13 @@ def _save_chart_of_accounts_cache(
     organization_id: str,
     accounts: List[Dict[str, Any]],
     erp_type: str,
+    entity_id: Optional[str] = None,
 ) -> None:
-    """Store chart of accounts in org settings_json for caching."""
-    import json as _json
-
+    """Replace the cached chart of accounts with a full pull."""
     try:
-        db = _get_db()
-        org = db.get_organization(organization_id)
-        if not org:
-            return
-        settings = org.get("settings_json") or org.get("settings") or {}
-        if isinstance(settings, str):
-            try:
-                settings = _json.loads(settings)
-            except Exception:
-                settings = {}
-        if not isinstance(settings, dict):
-            settings = {}
-
-        settings["chart_of_accounts_cache"] = {
-            "accounts": accounts,
-            "fetched_at": datetime.now(timezone.utc).isoformat(),
-            "erp_type": erp_type,
-            "account_count": len(accounts),
-        }
-
-        db.update_organization(organization_id, settings_json=settings)
+        _store_full_directory(
+            ERP_CACHE_ACCOUNTS, organization_id, erp_type, accounts, entity_id=entity_id,
+        )
     except Exception as exc:
         logger.warning("Failed to cache chart of accounts for org %s: %s", organization_id, exc)
 
@@ -2406,51 +2625,35 @@ async def get_chart_of_accounts(
     organization_id: str,
     entity_id: Optional[str] = None,
     force_refresh: bool = False,
+    *,
+    account_type: Optional[str] = None,
+    active_only: bool = False,
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
 ) -> List[Dict[str, Any]]:
-    """Fetch chart of accounts from the connected ERP.
+    """Return the chart of accounts for the connected ERP, one page at a time.
 
-    Results are cached in organization settings for 24h.
-    Pass force_refresh=True to bypass cache.
+    Served from ``erp_account_cache``; a cache older than 24h (or
+    ``force_refresh=True``) is brought up to date from the ERP first.
+    Filters and paging run in SQL.
 
-    Returns an empty list on any error so the caller is never blocked.
+    Falls back to whatever is cached (possibly nothing) on any ERP
+    error so the caller is never blocked.
     """
     org_id = assert_org_id(organization_id, context="erp_router")
-
-    # Check cache first (unless force_refresh)
-    if not force_refresh:
-        cached = _get_cached_chart_of_accounts(org_id)
-        if cached is not None:
-            return cached.get("accounts", [])
-
-    # Resolve ERP connection
-    connection = get_erp_connection(org_id, entity_id=entity_id)
-    if not connection:
-        logger.debug("No ERP connection for org %s, returning empty chart of accounts", org_id)
-        return []
-
-    # §11.1: Rate-limit check — return empty list so caller falls back to cached/empty path
-    _rate_limited = _enforce_erp_rate_limit(org_id, connection.type)
-    if _rate_limited:
-        logger.warning("Chart of accounts fetch rate-limited for org %s", org_id)
-        return []
-
-    erp_type = str(connection.type or "").strip().lower()
-    fetcher = _CHART_OF_ACCOUNTS_FETCHERS.get(erp_type)
-    if not fetcher:
-        logger.warning("No chart-of-accounts fetcher for ERP type: %s", erp_type)
-        return []
-
-    try:
-        accounts = await fetcher(connection)
-    except Exception as exc:
-        logger.error("Chart of accounts fetch failed for org %s (%s): %s", org_id, erp_type, exc)
-        return []
-
-    # Cache the result
-    if accounts:
-        _save_chart_of_accounts_cache(org_id, accounts, erp_type)
-
-    return accounts
+    return await _read_erp_directory(
+        ERP_CACHE_ACCOUNTS, org_id,
+        entity_id=entity_id,
+        force_refresh=force_refresh,
+        full_fetchers=_CHART_OF_ACCOUNTS_FETCHERS,
+        change_fetchers=_ACCOUNT_CHANGE_FETCHERS,
+        account_type=account_type,
+        active_only=active_only,
+        search=search,
+        limit=limit,
+        offset=offset,
+    )
 
 
 # =====================================================================
@@ -2464,6 +2667,12 @@ _VENDOR_LIST_FETCHERS = {
     "sap": list_all_vendors_sap,
 }
 
+_VENDOR_CHANGE_FETCHERS = {
+    "quickbooks": list_vendor_changes_quickbooks,
+    "xero": list_vendor_changes_xero,
+    "netsuite": list_vendor_changes_netsuite,
+}
+
 # PO list fetchers. NetSuite and SAP will 404 until their PO listers
 # are built — they return empty so the sync path is safe to invoke.
 _PO_LIST_FETCHERS = {
@@ -2521,43 +2730,24 @@ async def sync_purchase_orders_from_erp(organization_id: str) -> Dict[str, Any]:
     return summary
 
 
-# Cache TTL: 24 hours
-_VENDOR_LIST_CACHE_TTL_SECONDS = 24 * 60 * 60
-
-
 def _get_cached_vendor_list(
     organization_id: str,
+    entity_id: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
-    """Return cached vendor list from org settings_json, or None if stale/missing."""
-    import json as _json
-
+    """Return the cached vendor list, or None if stale/missing."""
     try:
-        db = _get_db()
-        org = db.get_organization(organization_id)
-        if not org:
-            return None
-        settings = org.get("settings_json") or org.get("settings") or {}
-        if isinstance(settings, str):
-            try:
-                settings = _json.loads(settings)
-            except Exception:
-                return None
-        cache = settings.get("vendor_list_cache")
-        if not isinstance(cache, dict):
+        state = _fresh_directory_state(ERP_CACHE_VENDORS, organization_id, entity_id=entity_id)
+        if state is None:
             return None
-        fetched_at = cache.get("fetched_at")
-        if not fetched_at:
-            return None
-        try:
-            fetched_dt = datetime.fromisoformat(fetched_at)
-            if fetched_dt.tzinfo is None:
-                fetched_dt = fetched_dt.replace(tzinfo=timezone.utc)
-            age_seconds = (datetime.now(timezone.utc) - fetched_dt).total_seconds()
-            if age_seconds > _VENDOR_LIST_CACHE_TTL_SECONDS:
-                return None
-        except (ValueError, TypeError):
-            return None
-        return cache
+        vendors = _get_db().list_erp_cache_rows(
+            ERP_CACHE_VENDORS, organization_id, state["erp_type"], entity_id=entity_id,
+        )
+        return {
+            "vendors": vendors,
+            "fetched_at": _last_synced_at(state).isoformat(),
+            "erp_type": state["erp_type"],
+            "vendor_count": len(vendors),
+        }
     except Exception:
         return None
 
@@ -2566,82 +2756,82 @@ def _save_vendor_list_cache(
     organization_id: str,
     vendors: List[Dict[str, Any]],
     erp_type: str,
+    entity_id: Optional[str] = None,
 ) -> None:
-    """Store vendor list in org settings_json for caching."""
-    import json as _json
-
+    """Replace the cached vendor list with a full pull."""
     try:
-        db = _get_db()
-        org = db.get_organization(organization_id)
-        if not org:
-            return
-        settings = org.get("settings_json") or org.get("settings") or {}
-        if isinstance(settings, str):
-            try:
-                settings = _json.loads(settings)
-            except Exception:
-                settings = {}
-        if not isinstance(settings, dict):
-            settings = {}
+        _store_full_directory(
+            ERP_CACHE_VENDORS, organization_id, erp_type, vendors, entity_id=entity_id,
+        )
+    except Exception as exc:
+        logger.warning("Failed to cache vendor list for org %s: %s", organization_id, exc)
 
-        settings["vendor_list_cache"] = {
-            "vendors": vendors,
-            "fetched_at": datetime.now(timezone.utc).isoformat(),
-            "erp_type": erp_type,
-            "vendor_count": len(vendors),
-        }
 
-        db.update_organization(organization_id, settings_json=settings)
+def find_cached_vendor(
+    organization_id: str,
+    *,
+    vendor_id: Optional[str] = None,
+    name: Optional[str] = None,
+    entity_id: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Look up a vendor in the cached ERP directory by ERP id or exact name.
+
+    Index lookups only — never calls the ERP. Returns None when there
+    is no cache or no match; a name shared by several vendors resolves
+    to an active one first.
+    """
+    try:
+        db = _get_db()
+        state = db.get_erp_cache_sync_state(
+            ERP_CACHE_VENDORS, organization_id, entity_id=entity_id,
+        )
+        if not state:
+            return None
+        if vendor_id:
+            return db.get_erp_cache_row(
+                ERP_CACHE_VENDORS, organization_id, state["erp_type"], vendor_id,
+                entity_id=entity_id,
+            )
+        if name:
+            matches = db.find_erp_cache_rows_by_name(
+                ERP_CACHE_VENDORS, organization_id, state["erp_type"], name,
+                entity_id=entity_id, limit=1,
+            )
+            return matches[0] if matches else None
     except Exception as exc:
-        logger.warning("Failed to cache vendor list for org %s: %s", organization_id, exc)
+        logger.debug("Cached vendor lookup failed for org %s: %s", organization_id, exc)
+    return None
 
 
 async def list_all_vendors(
     organization_id: str,
     entity_id: Optional[str] = None,
     force_refresh: bool = False,
+    *,
+    active_only: bool = False,
+    search: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
 ) -> List[Dict[str, Any]]:
-    """Fetch full vendor directory from the connected ERP.
+    """Return the connected ERP's vendor directory, one page at a time.
 
-    Results are cached in organization settings for 24h.
-    Pass force_refresh=True to bypass cache.
+    Served from ``erp_vendor_cache``; a cache older than 24h (or
+    ``force_refresh=True``) is brought up to date from the ERP first.
+    ``search`` is a case-insensitive name/email substring. Filters and
+    paging run in SQL.
 
-    Returns an empty list on any error so the caller is never blocked.
+    Falls back to whatever is cached (possibly nothing) on any ERP
+    error so the caller is never blocked.
     """
     org_id = assert_org_id(organization_id, context="erp_router")
-
-    # Check cache first (unless force_refresh)
-    if not force_refresh:
-        cached = _get_cached_vendor_list(org_id)
-        if cached is not None:
-            return cached.get("vendors", [])
-
-    # Resolve ERP connection
-    connection = get_erp_connection(org_id, entity_id=entity_id)
-    if not connection:
-        logger.debug("No ERP connection for org %s, returning empty vendor list", org_id)
-        return []
-
-    # §11.1: Rate-limit check — return empty list so caller falls back to cached/empty path
-    _rate_limited = _enforce_erp_rate_limit(org_id, connection.type)
-    if _rate_limited:
-        logger.warning("Vendor list fetch rate-limited for org %s", org_id)
-        return []
-
-    erp_type = str(connection.type or "").strip().lower()
-    fetcher = _VENDOR_LIST_FETCHERS.get(erp_type)
-    if not fetcher:
-        logger.warning("No vendor-list fetcher for ERP type: %s", erp_type)
-        return []
-
-    try:
-        vendors = await fetcher(connection)
-    except Exception as exc:
-        logger.error("Vendor list fetch failed for org %s (%s): %s", org_id, erp_type, exc)
-        return []
-
-    # Cache the result
-    if vendors:
-        _save_vendor_list_cache(org_id, vendors, erp_type)
-
-    return vendors
+    return await _read_erp_directory(
+        ERP_CACHE_VENDORS, org_id,
+        entity_id=entity_id,
+        force_refresh=force_refresh,
+        full_fetchers=_VENDOR_LIST_FETCHERS,
+        change_fetchers=_VENDOR_CHANGE_FETCHERS,
+        active_only=active_only,
+        search=search,
+        limit=limit,
+        offset=offset,
+    )
@@ -1242,6 +1242,19 @@ _XERO_ACCOUNT_TYPE_MAP = {
 }
 
 
+def _normalize_xero_account(acc: Dict[str, Any]) -> Dict[str, Any]:
+    raw_type = str(acc.get("Type") or "").strip().lower()
+    return {
+        "id": str(acc.get("AccountID") or ""),
+        "code": str(acc.get("Code") or ""),
+        "name": str(acc.get("Name") or ""),
+        "type": _XERO_ACCOUNT_TYPE_MAP.get(raw_type, raw_type),
+        "sub_type": str(acc.get("Class") or ""),
+        "active": str(acc.get("Status") or "").upper() == "ACTIVE",
+        "currency": str(acc.get("CurrencyCode") or ""),
+    }
+
+
 async def get_chart_of_accounts_xero(connection) -> List[Dict[str, Any]]:
     """Fetch all accounts from Xero.
 
@@ -1270,19 +1283,7 @@ async def get_chart_of_accounts_xero(connection) -> List[Dict[str, Any]]:
         response.raise_for_status()
         result = response.json()
 
-        accounts: List[Dict[str, Any]] = []
-        for acc in result.get("Accounts", []):
-            raw_type = str(acc.get("Type") or "").strip().lower()
-            accounts.append({
-                "id": str(acc.get("AccountID") or ""),
-                "code": str(acc.get("Code") or ""),
-                "name": str(acc.get("Name") or ""),
-                "type": _XERO_ACCOUNT_TYPE_MAP.get(raw_type, raw_type),
-                "sub_type": str(acc.get("Class") or ""),
-                "active": str(acc.get("Status") or "").upper() == "ACTIVE",
-                "currency": str(acc.get("CurrencyCode") or ""),
-            })
-        return accounts
+        return [_normalize_xero_account(acc) for acc in result.get("Accounts", [])]
 
     except Exception as e:
         logger.error("Failed to fetch Xero chart of accounts: %s", type(e).__name__)
@@ -1292,6 +1293,39 @@ async def get_chart_of_accounts_xero(connection) -> List[Dict[str, Any]]:
 # ==================== Vendor List ====================
 
 
+def _normalize_xero_vendor(c: Dict[str, Any]) -> Dict[str, Any]:
+    addrs = c.get("Addresses") or []
+    addr_parts = []
+    for a in addrs:
+        if a.get("AddressType") == "POBOX" or a.get("AddressType") == "STREET":
+            addr_parts = list(filter(None, [
+                a.get("AddressLine1"), a.get("City"),
+                a.get("Region"), a.get("PostalCode"),
+                a.get("Country"),
+            ]))
+            break
+
+    phones = c.get("Phones") or []
+    phone = ""
+    for p in phones:
+        if p.get("PhoneNumber"):
+            phone = str(p["PhoneNumber"])
+            break
+
+    return {
+        "vendor_id": str(c.get("ContactID") or ""),
+        "name": str(c.get("Name") or ""),
+        "email": str(c.get("EmailAddress") or ""),
+        "phone": phone,
+        "tax_id": str(c.get("TaxNumber") or ""),
+        "currency": str(c.get("DefaultCurrency") or ""),
+        "active": str(c.get("ContactStatus") or "").upper() == "ACTIVE",
+        "address": ", ".join(addr_parts),
+        "payment_terms": "",
+        "balance": float(c.get("Balances", {}).get("AccountsPayable", {}).get("Outstanding") or 0),
+    }
+
+
 async def list_all_vendors_xero(connection) -> List[Dict[str, Any]]:
     """Fetch all supplier contacts from Xero with pagination.
 
@@ -1334,37 +1368,7 @@ async def list_all_vendors_xero(connection) -> List[Dict[str, Any]]:
             if not contacts:
                 break
 
-            for c in contacts:
-                addrs = c.get("Addresses") or []
-                addr_parts = []
-                for a in addrs:
-                    if a.get("AddressType") == "POBOX" or a.get("AddressType") == "STREET":
-                        addr_parts = list(filter(None, [
-                            a.get("AddressLine1"), a.get("City"),
-                            a.get("Region"), a.get("PostalCode"),
-                            a.get("Country"),
-                        ]))
-                        break
-
-                phones = c.get("Phones") or []
-                phone = ""
-                for p in phones:
-                    if p.get("PhoneNumber"):
-                        phone = str(p["PhoneNumber"])
-                        break
-
-                all_vendors.append({
-                    "vendor_id": str(c.get("ContactID") or ""),
-                    "name": str(c.get("Name") or ""),
-                    "email": str(c.get("EmailAddress") or ""),
-                    "phone": phone,
-                    "tax_id": str(c.get("TaxNumber") or ""),
-                    "currency": str(c.get("DefaultCurrency") or ""),
-                    "active": str(c.get("ContactStatus") or "").upper() == "ACTIVE",
-                    "address": ", ".join(addr_parts),
-                    "payment_terms": "",
-                    "balance": float(c.get("Balances", {}).get("AccountsPayable", {}).get("Outstanding") or 0),
-                })
+            all_vendors.extend(_normalize_xero_vendor(c) for c in contacts)
 
             if len(contacts) < 100:
                 break
@@ -1377,6 +1381,72 @@ async def list_all_vendors_xero(connection) -> List[Dict[str, Any]]:
         return all_vendors or []
 
 
+# ==================== Incremental sync ====================
+
+
+def _xero_modified_since_headers(connection, since: datetime) -> Dict[str, str]:
+    if not connection.access_token or not connection.tenant_id:
+        raise ValueError("Xero connection is missing a token or tenant id")
+    return {
+        "Authorization": f"Bearer {connection.access_token}",
+        "xero-tenant-id": str(connection.tenant_id or ""),
+        # Xero compares against each record's UpdatedDateUTC.
+        "If-Modified-Since": since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+async def list_vendor_changes_xero(connection, since: datetime) -> Dict[str, List[Any]]:
+    """Supplier contacts updated since ``since``, via ``If-Modified-Since``.
+
+    Archived contacts are included so they come back as inactive. Xero
+    doesn't delete contacts, so ``deleted`` is always empty. Raises on
+    any failure so the caller keeps its high-water mark.
+    """
+    headers = _xero_modified_since_headers(connection, since)
+    client = get_http_client()
+    upserts: List[Dict[str, Any]] = []
+    page = 1
+    while True:
+        response = await client.get(
+            "https://api.xero.com/api.xro/2.0/Contacts",
+            params={"where": "IsSupplier==true", "includeArchived": "true", "page": page},
+            headers=headers,
+            timeout=60,
+        )
+        # 304: nothing changed since the mark.
+        if response.status_code == 304:
+            break
+        response.raise_for_status()
+        contacts = response.json().get("Contacts", [])
+        upserts.extend(_normalize_xero_vendor(c) for c in contacts)
+        if len(contacts) < 100:
+            break
+        page += 1
+    return {"upserts": upserts, "deleted": []}
+
+
+async def list_account_changes_xero(connection, since: datetime) -> Dict[str, List[Any]]:
+    """Accounts updated since ``since``, via ``If-Modified-Since``.
+
+    Deleted accounts simply stop appearing; the periodic full sync
+    prunes them. Raises on any failure.
+    """
+    headers = _xero_modified_since_headers(connection, since)
+    client = get_http_client()
+    response = await client.get(
+        "https://api.xero.com/api.xro/2.0/Accounts",
+        headers=headers,
+        timeout=60,
+    )
+    if response.status_code == 304:
+        return {"upserts": [], "deleted": []}
+    response.raise_for_status()
+    return {
+        "upserts": [_normalize_xero_account(acc) for acc in response.json().get("Accounts", [])],
+        "deleted": [],
+    }
+
+
 async def list_all_purchase_orders_xero(connection) -> List[Dict[str, Any]]:
     """Fetch all Purchase Orders from Xero with pagination.
 
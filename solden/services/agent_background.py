@@ -11,6 +11,7 @@ Started on FastAPI app startup alongside GmailAutopilot.
 """
 
 import asyncio
+import json
 import logging
 import os
 from datetime import datetime, timezone, timedelta
@@ -210,7 +211,10 @@ async def reap_expired_override_windows() -> int:
         logger.warning("[OverrideWindowReaper] list_expired query failed: %s", exc)
         return 0
 
+    from solden.core.events import AgentEvent, AgentEventType
+
     reaped = 0
+    expired_events = []
     for window in expired or []:
         window_id = window.get("id")
         organization_id = window.get("organization_id")
@@ -229,18 +233,13 @@ async def reap_expired_override_windows() -> int:
             continue
         reaped += 1
 
-        # §2.2: Enqueue OVERRIDE_WINDOW_EXPIRED event
-        try:
-            from solden.core.events import AgentEvent, AgentEventType
-            from solden.core.event_queue import get_event_queue
-            get_event_queue().enqueue(AgentEvent(
-                type=AgentEventType.OVERRIDE_WINDOW_EXPIRED,
-                source="override_window_reaper",
-                payload={"box_id": window.get("ap_item_id", ""), "window_id": window_id},
-                organization_id=organization_id,
-            ))
-        except Exception:
-            pass  # Non-fatal — window already expired in DB
+        # §2.2: OVERRIDE_WINDOW_EXPIRED, enqueued together after the loop
+        expired_events.append(AgentEvent(
+            type=AgentEventType.OVERRIDE_WINDOW_EXPIRED,
+            source="override_window_reaper",
+            payload={"box_id": window.get("ap_item_id", ""), "window_id": window_id},
+            organization_id=organization_id,
+        ))
 
         # Best-effort Slack card update — if this fails the window is
         # still marked expired in the DB, the user just sees a stale card.
@@ -257,6 +256,12 @@ async def reap_expired_override_windows() -> int:
                 "[OverrideWindowReaper] Slack card finalize failed for %s: %s",
                 window_id, exc,
             )
+    if expired_events:
+        try:
+            from solden.core.event_queue import get_event_queue
+            get_event_queue().enqueue_many(expired_events)
+        except Exception:
+            pass  # Non-fatal — windows already expired in DB
     if reaped:
         logger.info("[OverrideWindowReaper] Reaped %d expired override windows", reaped)
     return reaped
@@ -496,208 +501,225 @@ async def stop_agent_background():
         logger.info("Override window reaper loop stopped")
 
 
+_GLOBAL_TICK_SECONDS = 900
+_SWEEP_POLL_SECONDS = int(os.getenv("AGENT_SWEEP_POLL_SECONDS", "60"))
+_sweep_scheduler = None
+
+
+async def _poll_payment_statuses_and_enqueue(org_id: str) -> None:
+    """Poll ERP payment status and enqueue PAYMENT_CONFIRMED (§2.2)."""
+    result = await _poll_payment_statuses(org_id)
+    if isinstance(result, dict) and result.get("updated", 0) > 0:
+        try:
+            from solden.core.events import AgentEvent, AgentEventType
+            from solden.core.event_queue import get_event_queue
+            get_event_queue().enqueue_many([
+                AgentEvent(
+                    type=AgentEventType.PAYMENT_CONFIRMED,
+                    source="payment_poll",
+                    payload={
+                        "payment_reference": payment_ref,
+                        "box_id": result.get("ap_item_ids", {}).get(payment_ref, ""),
+                    },
+                    organization_id=org_id,
+                )
+                for payment_ref in (result.get("settled_refs") or [])
+            ])
+        except Exception:
+            pass
+
+
+async def _check_circuit_breaker(org_id: str) -> None:
+    """§7.8: hourly circuit breaker check."""
+    try:
+        from solden.services.circuit_breaker import check_circuit_breaker
+        cb_result = await check_circuit_breaker(org_id)
+        if cb_result.get("tripped"):
+            logger.warning("[background] circuit breaker tripped for org=%s", org_id)
+    except Exception as cb_exc:
+        logger.debug("[background] circuit breaker check failed: %s", cb_exc)
+
+
+async def _reconcile_ap_kpi_rollup(org_id: str) -> None:
+    """Check the AP KPI rollup against a full recompute and correct it."""
+    from solden.core.database import get_db
+
+    db = get_db()
+    result = await asyncio.to_thread(db.reconcile_ap_kpi_rollup, org_id)
+    if result.get("drift_count"):
+        logger.info(
+            "[background] ap_kpi_rollup drift corrected for org=%s (%d rows)",
+            org_id, result["drift_count"],
+        )
+
+
+async def _sync_invoice_fingerprints(org_id: str) -> None:
+    """Index AP items changed since the org's last fingerprint sync."""
+    from solden.core.database import get_db
+
+    db = get_db()
+    result = await asyncio.to_thread(db.sync_invoice_fingerprints, org_id, max_pages=50)
+    if result.get("indexed"):
+        logger.info(
+            "[background] invoice fingerprints indexed for org=%s (%d rows)",
+            org_id, result["indexed"],
+        )
+
+
+def _sweep_jobs():
+    """Per-org jobs, with the cadences the old 15-minute tick ran them at."""
+    from solden.services.sweep_scheduler import SweepJob
+
+    return [
+        SweepJob("approval_timeouts", _check_approval_timeouts, interval_seconds=900),
+        SweepJob("exception_resolutions", _sweep_exception_resolutions, interval_seconds=2700),
+        SweepJob("task_scheduler_checks", _run_task_scheduler_checks, interval_seconds=5400),
+        SweepJob("verify_erp_postings", _verify_recent_erp_postings, interval_seconds=10800, concurrency=4),
+        SweepJob("circuit_breaker", _check_circuit_breaker, interval_seconds=3600),
+        SweepJob("anomalies", _check_anomalies, interval_seconds=3600),
+        # ERP-facing jobs sit behind upstream rate limits; narrower lanes.
+        SweepJob("erp_reconciliation", _run_erp_reconciliation, interval_seconds=3600, concurrency=4),
+        SweepJob("payment_statuses", _poll_payment_statuses_and_enqueue, interval_seconds=3600, concurrency=4),
+        SweepJob("grn_confirmations", _poll_grn_confirmations, interval_seconds=3600, concurrency=4),
+        SweepJob("monitoring_checks", _run_monitoring_checks, interval_seconds=3600),
+        SweepJob("ap_kpi_reconciliation", _reconcile_ap_kpi_rollup, interval_seconds=21600, timeout_seconds=1800),
+        SweepJob("invoice_fingerprint_sync", _sync_invoice_fingerprints, interval_seconds=900, timeout_seconds=900),
+        SweepJob("scheduled_reports", _deliver_scheduled_reports, interval_seconds=3600),
+        SweepJob("daily_digest", _send_daily_digest, hour_utc=8),
+        SweepJob("period_end", _check_period_end, hour_utc=7),
+        # Daily vendor master sync at 2am UTC (3am CET / 3am WAT), then
+        # POs at 3am so three-way match has POs that reference vendors
+        # we already know about.
+        SweepJob("vendor_master_sync", _sync_vendor_master_data, hour_utc=2, concurrency=4, timeout_seconds=1800),
+        SweepJob("purchase_order_sync", _sync_purchase_orders, hour_utc=3, concurrency=4, timeout_seconds=1800),
+    ]
+
+
+def get_sweep_scheduler():
+    """The process's per-org sweep scheduler (created on first use)."""
+    global _sweep_scheduler
+    if _sweep_scheduler is None:
+        from solden.services.sweep_scheduler import SweepScheduler
+        _sweep_scheduler = SweepScheduler(_sweep_jobs())
+    return _sweep_scheduler
+
+
+async def _run_global_tick(tick: int, org_ids: List[str]) -> None:
+    """Process-wide work on the 15-minute tick (not per org)."""
+    # Every tick: drain ERP-post retry queue (Gap #5 crash recovery)
+    await _drain_erp_post_retry_queue()
+
+    # Drain notification retry queue (F1: ensures failed Slack/Teams
+    # notifications are retried instead of silently dropped)
+    try:
+        from solden.services.slack_notifications import process_retry_queue
+        drained = await process_retry_queue()
+        if drained:
+            logger.info("Drained %d notification retries", drained)
+    except Exception as exc:
+        logger.warning("Notification retry drain failed: %s", exc)
+
+    # Every tick: check overdue and stale tasks
+    await _check_overdue_tasks()
+
+    # Every hour (4 ticks): trust-building arc milestones
+    # Phase 3.2 — time-gated Slack messages that accumulate trust:
+    # Week 1 transparency banner, Day 14 baseline, Day 30 tier
+    # expansion recommendation, weekly Monday signal.
+    if tick % 4 == 0:
+        try:
+            from solden.services.trust_arc import run_trust_arc_tick
+            arc_result = await run_trust_arc_tick()
+            if (arc_result.week1_banners or arc_result.day14_baselines
+                    or arc_result.day30_expansions or arc_result.weekly_signals):
+                logger.info(
+                    "[background] trust arc: week1=%d day14=%d day30=%d weekly=%d",
+                    arc_result.week1_banners, arc_result.day14_baselines,
+                    arc_result.day30_expansions, arc_result.weekly_signals,
+                )
+        except Exception as arc_exc:
+            logger.warning("[background] trust arc tick failed: %s", arc_exc)
+
+    # Pending-vendor-chase tick removed: Solden sends zero
+    # email to vendors (memory: 2026-05-02 second-pass
+    # dormant-vendor-emails decision). The chase-reaper +
+    # TIMER_FIRED enqueue used to push ``vendor_chase`` timers
+    # into the planner; both the reaper and the planner branch
+    # are gone, and ``_send_pending_chases`` itself is deleted
+    # below.
+
+    # Every tick (~15 min): fire due agent timers (snooze expiry, ERP
+    # rechecks, approval milestones). Celery beat drains the same table
+    # every minute via fire_pending_timers; claims are SKIP LOCKED so
+    # the two never fire a timer twice. This pass covers deployments
+    # without beat.
+    try:
+        from solden.services.agent_timers import fire_due_timers
+        fired = await asyncio.to_thread(fire_due_timers)
+        if fired:
+            logger.info("[background] fired %d agent timers", fired)
+    except Exception as timer_exc:
+        logger.warning("[background] agent timer consumer failed: %s", timer_exc)
+
+    # Every hour (4 ticks): reap expired audit exports. These are
+    # full Box export documents written with a TTL (expires_at);
+    # leaving them past expiry is a data-retention gap on the
+    # sovereignty primitive's own artifact. Global reap (not
+    # per-org) — the store DELETEs every row past its expires_at.
+    if tick % 4 == 0:
+        try:
+            from solden.core.database import get_db
+            deleted = await asyncio.to_thread(
+                get_db().reap_expired_audit_exports
+            )
+            if deleted:
+                logger.info(
+                    "[background] reaped %d expired audit exports", deleted
+                )
+        except Exception as export_exc:
+            logger.warning(
+                "[background] audit export reaper failed: %s", export_exc
+            )
+
+
 async def _run_loop():
-    """Main background loop."""
+    """Main background loop.
+
+    Process-wide work runs on a 15-minute tick. Per-org jobs go through
+    the :class:`~solden.services.sweep_scheduler.SweepScheduler`, polled
+    every ``AGENT_SWEEP_POLL_SECONDS``: each replica claims a share of
+    the due ``(job, org)`` leases and starts each as its own task.
+    """
     # Stagger startup to avoid thundering herd
     await asyncio.sleep(30)
 
+    scheduler = get_sweep_scheduler()
     tick = 0
+    org_ids: List[str] = []
+    next_global_tick = 0.0
+    next_metrics_log = 0.0
+    loop = asyncio.get_running_loop()
     while True:
         try:
-            tick += 1
-            org_ids = _active_org_ids()
-
-            # Every tick: drain ERP-post retry queue (Gap #5 crash recovery)
-            await _drain_erp_post_retry_queue()
-
-            # Drain notification retry queue (F1: ensures failed Slack/Teams
-            # notifications are retried instead of silently dropped)
-            try:
-                from solden.services.slack_notifications import process_retry_queue
-                drained = await process_retry_queue()
-                if drained:
-                    logger.info("Drained %d notification retries", drained)
-            except Exception as exc:
-                logger.warning("Notification retry drain failed: %s", exc)
-
-            # Every 15 minutes: check overdue and stale tasks + approval timeouts
-            if tick % 1 == 0:  # runs every iteration (15 min sleep)
-                await _check_overdue_tasks()
-                for org_id in org_ids:
-                    await _check_approval_timeouts(org_id)
-
-            # Every 3rd tick (~45 min): sweep exception auto-resolution
-            if tick % 3 == 0:
-                for org_id in org_ids:
-                    await _sweep_exception_resolutions(org_id)
-
-            # Every 6th tick (~90 min): run task scheduler checks per org
-            if tick % 6 == 0:
-                for org_id in org_ids:
-                    await _run_task_scheduler_checks(org_id)
-
-            # Every 12th tick (~3 hours): verify recent ERP postings
-            if tick % 12 == 0:
-                for org_id in org_ids:
-                    await _verify_recent_erp_postings(org_id)
-
-            # Every hour (4 ticks): trust-building arc milestones
-            # Phase 3.2 — time-gated Slack messages that accumulate trust:
-            # Week 1 transparency banner, Day 14 baseline, Day 30 tier
-            # expansion recommendation, weekly Monday signal.
-            if tick % 4 == 0:
-                try:
-                    from solden.services.trust_arc import run_trust_arc_tick
-                    arc_result = await run_trust_arc_tick()
-                    if (arc_result.week1_banners or arc_result.day14_baselines
-                            or arc_result.day30_expansions or arc_result.weekly_signals):
-                        logger.info(
-                            "[background] trust arc: week1=%d day14=%d day30=%d weekly=%d",
-                            arc_result.week1_banners, arc_result.day14_baselines,
-                            arc_result.day30_expansions, arc_result.weekly_signals,
-                        )
-                except Exception as arc_exc:
-                    logger.warning("[background] trust arc tick failed: %s", arc_exc)
-
-            # Pending-vendor-chase tick removed: Solden sends zero
-            # email to vendors (memory: 2026-05-02 second-pass
-            # dormant-vendor-emails decision). The chase-reaper +
-            # TIMER_FIRED enqueue used to push ``vendor_chase`` timers
-            # into the planner; both the reaper and the planner branch
-            # are gone, and ``_send_pending_chases`` itself is deleted
-            # below.
-
-            # Every tick (~15 min): reap expired snoozes (§3 Gmail Power Features)
-            try:
-                unsnoozed = await _reap_expired_snoozes(org_ids)
-                total = sum(len(v) for v in unsnoozed.values())
-                if total:
-                    logger.info("[background] unsnoozed %d expired AP items", total)
-                    # §2.2: Enqueue per-item TIMER_FIRED events for snooze expiry
-                    # so the planner can act on a specific box (post-unsnooze
-                    # bookkeeping, observer cleanup) rather than an org-wide
-                    # event with no box_id.
-                    try:
-                        from solden.core.events import AgentEvent, AgentEventType
-                        from solden.core.event_queue import get_event_queue
-                        queue = get_event_queue()
-                        for oid, ap_ids in unsnoozed.items():
-                            for ap_id in ap_ids:
-                                queue.enqueue(AgentEvent(
-                                    type=AgentEventType.TIMER_FIRED,
-                                    source="background_loop",
-                                    payload={
-                                        "timer_type": "snooze_expired",
-                                        "organization_id": oid,
-                                        "box_id": ap_id,
-                                    },
-                                    organization_id=oid,
-                                ))
-                    except Exception:
-                        pass
-            except Exception as snooze_exc:
-                logger.warning("[background] snooze reaper failed: %s", snooze_exc)
-
-            # Every hour (4 ticks): reap expired audit exports. These are
-            # full Box export documents written with a TTL (expires_at);
-            # leaving them past expiry is a data-retention gap on the
-            # sovereignty primitive's own artifact. Global reap (not
-            # per-org) — the store DELETEs every row past its expires_at.
-            if tick % 4 == 0:
-                try:
-                    from solden.core.database import get_db
-                    deleted = await asyncio.to_thread(
-                        get_db().reap_expired_audit_exports
-                    )
-                    if deleted:
-                        logger.info(
-                            "[background] reaped %d expired audit exports", deleted
-                        )
-                except Exception as export_exc:
-                    logger.warning(
-                        "[background] audit export reaper failed: %s", export_exc
-                    )
-
-            # Every hour (4 ticks): check circuit breaker (§7.8)
-            if tick % 4 == 0:
-                for org_id in org_ids:
-                    try:
-                        from solden.services.circuit_breaker import check_circuit_breaker
-                        cb_result = await check_circuit_breaker(org_id)
-                        if cb_result.get("tripped"):
-                            logger.warning("[background] circuit breaker tripped for org=%s", org_id)
-                    except Exception as cb_exc:
-                        logger.debug("[background] circuit breaker check failed: %s", cb_exc)
-
-            # Vendor-onboarding chase loop is dormant per the 2026-04-30
-            # product call (memory: project_vendor_onboarding_subordinate.md).
-            # Solden does NOT chase vendors — the AP-side master-check
-            # gate routes "unknown vendor" to needs_info instead. The
-            # `chase_stale_sessions` service stays on disk for option-
-            # value but is no longer scheduled.
-
-            # Every hour (4 ticks)
-            if tick % 4 == 0:
-                for org_id in org_ids:
-                    await _check_anomalies(org_id)
-                # E5: Run ERP follow-on reconciliation check every 4th tick (~60 min)
-                for org_id in org_ids:
-                    await _run_erp_reconciliation(org_id)
-                # Poll ERP for payment status changes every ~1 hour
-                for org_id in org_ids:
-                    result = await _poll_payment_statuses(org_id)
-                    # §2.2: Enqueue PAYMENT_CONFIRMED for settled payments
-                    if isinstance(result, dict) and result.get("updated", 0) > 0:
-                        try:
-                            from solden.core.events import AgentEvent, AgentEventType
-                            from solden.core.event_queue import get_event_queue
-                            queue = get_event_queue()
-                            for payment_ref in (result.get("settled_refs") or []):
-                                queue.enqueue(AgentEvent(
-                                    type=AgentEventType.PAYMENT_CONFIRMED,
-                                    source="payment_poll",
-                                    payload={
-                                        "payment_reference": payment_ref,
-                                        "box_id": result.get("ap_item_ids", {}).get(payment_ref, ""),
-                                    },
-                                    organization_id=org_id,
-                                ))
-                        except Exception:
-                            pass
-
-                # §2.2: Poll for GRN confirmations on waiting invoices
-                for org_id in org_ids:
-                    await _poll_grn_confirmations(org_id)
-
-                # Run monitoring health checks every ~1 hour
-                for org_id in org_ids:
-                    await _run_monitoring_checks(org_id)
-
-            # Daily (96 ticks at 15-min intervals, but we check by hour)
-            now = datetime.now(timezone.utc)
-            if tick % 4 == 0 and now.hour == 8:
-                for org_id in org_ids:
-                    await _send_daily_digest(org_id)
-            if tick % 4 == 0 and now.hour == 7:
-                for org_id in org_ids:
-                    await _check_period_end(org_id)
-            # Daily vendor master sync at 2am UTC (3am CET / 3am WAT)
-            if tick % 4 == 0 and now.hour == 2:
-                for org_id in org_ids:
-                    await _sync_vendor_master_data(org_id)
-
-            # Daily Purchase Order sync at 3am UTC — pulls open POs
-            # from the org's ERP into our DB so three-way match has
-            # something to match against. Runs AFTER vendor sync so
-            # POs reference vendors we already know about.
-            if tick % 4 == 0 and now.hour == 3:
-                for org_id in org_ids:
-                    await _sync_purchase_orders(org_id)
-
-            # Scheduled report delivery — check every hour
-            if tick % 4 == 0:
-                for org_id in org_ids:
-                    await _deliver_scheduled_reports(org_id)
+            now = loop.time()
+            if now >= next_global_tick:
+                next_global_tick = now + _GLOBAL_TICK_SECONDS
+                tick += 1
+                org_ids = _active_org_ids()
+                await scheduler.seed(org_ids)
+                await _run_global_tick(tick, org_ids)
+
+            # Only claims and starts due runs; slow ones keep going in
+            # the background and the next poll tops their jobs back up.
+            started = await scheduler.run_due(org_ids)
+            if any(started.values()):
+                logger.info(
+                    "[background] sweeps started %s",
+                    {name: count for name, count in started.items() if count},
+                )
+            if now >= next_metrics_log:
+                next_metrics_log = now + 3600
+                logger.info("[background] sweep metrics: %s", scheduler.metrics_snapshot())
 
         except asyncio.CancelledError:
             logger.info("Agent background loop cancelled")
@@ -705,8 +727,7 @@ async def _run_loop():
         except Exception as e:
             logger.error(f"Agent background loop error: {e}")
 
-        # Sleep 15 minutes
-        await asyncio.sleep(900)
+        await asyncio.sleep(_SWEEP_POLL_SECONDS)
 
 
 async def _check_overdue_tasks():
@@ -790,15 +811,101 @@ async def _check_overdue_tasks():
 # path. Operators now compose vendor follow-ups in their own Gmail.
 
 
+def _unsnooze_item(db, workflow, item: Dict[str, Any], now: datetime) -> bool:
+    """Restore one snoozed AP item if its snooze has expired."""
+    if item.get("state") != "snoozed":
+        return False
+    metadata = item.get("metadata") or {}
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except ValueError:
+            metadata = {}
+    metadata = dict(metadata) if isinstance(metadata, dict) else {}
+    snoozed_until_str = metadata.get("snoozed_until")
+    if not snoozed_until_str:
+        return False
+    try:
+        snoozed_until = datetime.fromisoformat(snoozed_until_str.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return False
+    if now < snoozed_until:
+        return False
+
+    restore_state = metadata.pop("pre_snooze_state", "needs_approval")
+    metadata.pop("snoozed_until", None)
+    metadata.pop("snooze_note", None)
+
+    ap_item_id = item.get("id")
+    gmail_id = item.get("thread_id") or item.get("gmail_id") or ap_item_id
+    transitioned = False
+    if workflow is not None and gmail_id:
+        try:
+            transitioned = bool(workflow._transition_invoice_state(
+                gmail_id,
+                restore_state,
+                source="snooze_reaper",
+                metadata=metadata,
+            ))
+        except Exception as exc:
+            logger.warning(
+                "[snooze_reaper] state transition snoozed→%s failed for %s: %s",
+                restore_state, ap_item_id, exc,
+            )
+    if not transitioned:
+        # Fallback so we don't strand items if workflow is unavailable.
+        # Leaves observers un-fired but at least clears the snooze.
+        try:
+            db.update_ap_item(ap_item_id, state=restore_state, metadata=metadata)
+        except Exception as exc:
+            logger.warning("[snooze_reaper] direct update failed for %s: %s", ap_item_id, exc)
+            return False
+
+    db.append_ap_item_timeline_entry(ap_item_id, {
+        "event_type": "unsnoozed",
+        "summary": f"Snooze expired. Restored to {restore_state.replace('_', ' ')}.",
+        "next_action": "Item is back in the active queue.",
+        "actor": "agent",
+        "timestamp": now.isoformat(),
+    })
+    return True
+
+
+def _load_invoice_workflow(org_id: str):
+    from solden.services.invoice_workflow import get_invoice_workflow
+
+    try:
+        return get_invoice_workflow(org_id)
+    except Exception as exc:
+        logger.warning("[snooze_reaper] could not load workflow for org=%s: %s", org_id, exc)
+        return None
+
+
+async def unsnooze_ap_item(ap_item_id: str) -> bool:
+    """Unsnooze a single AP item whose ``snooze_expired`` timer fired.
+
+    Returns False if the item is gone, no longer snoozed, or was
+    re-snoozed to a later time.
+    """
+    from solden.core.database import get_db
+
+    db = get_db()
+    item = db.get_ap_item(ap_item_id)
+    if not item:
+        return False
+    workflow = _load_invoice_workflow(item.get("organization_id") or "")
+    return _unsnooze_item(db, workflow, item, datetime.now(timezone.utc))
+
+
 async def _reap_expired_snoozes(org_ids) -> Dict[str, List[str]]:
     """Unsnooze AP items whose snooze timer has expired (§3 Gmail Power Features).
 
-    Returns a dict mapping organization_id -> list of unsnoozed ap_item ids,
-    so the caller can fan out per-item TIMER_FIRED events with box_id rather
-    than a single org-level event the planner can't act on.
+    Returns a dict mapping organization_id -> list of unsnoozed ap_item ids.
+    Snoozes normally expire one at a time through their ``agent_timers``
+    row (:func:`unsnooze_ap_item`); this org-wide pass is the fallback
+    for an ``unsnooze`` action without a box.
     """
     from solden.core.database import get_db
-    from solden.services.invoice_workflow import get_invoice_workflow
 
     db = get_db()
     now = datetime.now(timezone.utc)
@@ -809,60 +916,10 @@ async def _reap_expired_snoozes(org_ids) -> Dict[str, List[str]]:
             items = db.list_ap_items(organization_id=org_id, state="snoozed", limit=500)
         except Exception:
             items = []
-        try:
-            workflow = get_invoice_workflow(org_id)
-        except Exception as exc:
-            logger.warning("[snooze_reaper] could not load workflow for org=%s: %s", org_id, exc)
-            workflow = None
+        workflow = _load_invoice_workflow(org_id)
         for item in items:
-            metadata = dict(item.get("metadata") or {})
-            snoozed_until_str = metadata.get("snoozed_until")
-            if not snoozed_until_str:
-                continue
-            try:
-                snoozed_until = datetime.fromisoformat(snoozed_until_str.replace("Z", "+00:00"))
-            except (ValueError, TypeError):
-                continue
-            if now < snoozed_until:
-                continue
-
-            restore_state = metadata.pop("pre_snooze_state", "needs_approval")
-            metadata.pop("snoozed_until", None)
-            metadata.pop("snooze_note", None)
-
-            ap_item_id = item.get("id")
-            gmail_id = item.get("thread_id") or item.get("gmail_id") or ap_item_id
-            transitioned = False
-            if workflow is not None and gmail_id:
-                try:
-                    transitioned = bool(workflow._transition_invoice_state(
-                        gmail_id,
-                        restore_state,
-                        source="snooze_reaper",
-                        metadata=metadata,
-                    ))
-                except Exception as exc:
-                    logger.warning(
-                        "[snooze_reaper] state transition snoozed→%s failed for %s: %s",
-                        restore_state, ap_item_id, exc,
-                    )
-            if not transitioned:
-                # Fallback so we don't strand items if workflow is unavailable.
-                # Leaves observers un-fired but at least clears the snooze.
-                try:
-                    db.update_ap_item(ap_item_id, state=restore_state, metadata=metadata)
-                except Exception as exc:
-                    logger.warning("[snooze_reaper] direct update failed for %s: %s", ap_item_id, exc)
-                    continue
-
-            db.append_ap_item_timeline_entry(ap_item_id, {
-                "event_type": "unsnoozed",
-                "summary": f"Snooze expired. Restored to {restore_state.replace('_', ' ')}.",
-                "next_action": "Item is back in the active queue.",
-                "actor": "agent",
-                "timestamp": now.isoformat(),
-            })
-            unsnoozed.setdefault(org_id, []).append(ap_item_id)
+            if _unsnooze_item(db, workflow, item, now):
+                unsnoozed.setdefault(org_id, []).append(item.get("id"))
 
     return unsnoozed
 
@@ -1049,16 +1106,25 @@ async def _drain_erp_post_retry_queue():
         logger.error("Durable queue drain failed: %s", exc)
 
 
-async def _check_approval_timeouts(org_id: str):
+async def _check_approval_timeouts(org_id: str, ap_item_id: Optional[str] = None):
     """Send reminders / escalations for AP items stuck in needs_approval.
 
     Deduplication is DB-backed via the ap_item's metadata column
     (``approval_reminder_milestones`` dict). This survives process restarts,
     deploys, and scale-out — unlike the old module-level ``_reminded_set``.
+
+    With ``ap_item_id`` (an ``approval_timeout`` timer firing) only that
+    item is checked. Items that get a reminder or escalation have their
+    timer re-armed for the next milestone.
     """
     try:
         import json as _json
         from solden.core.database import get_db
+        from solden.services.agent_timers import (
+            APPROVAL_RETRY_SECONDS,
+            approval_milestones,
+            arm_approval_timer,
+        )
         from solden.services.policy_compliance import get_approval_automation_policy
         from solden.services.slack_notifications import send_approval_reminder
 
@@ -1068,21 +1134,16 @@ async def _check_approval_timeouts(org_id: str):
 
         now_iso = datetime.now(timezone.utc).isoformat()
         policy = get_approval_automation_policy(organization_id=org_id)
-        reminder_hours = max(1.0, float(policy.get("reminder_hours") or 4.0))
-        escalation_hours = max(reminder_hours, float(policy.get("escalation_hours") or 24.0))
         escalation_channel = str(policy.get("escalation_channel") or "").strip() or None
+        # The loop below rebinds ``ap_item_id`` per overdue item.
+        target_id = ap_item_id
+        rearm_ids = {target_id} if target_id else set()
 
-        def _milestone_key(stage: str, hours_value: float) -> str:
-            hours_token = str(int(hours_value) if float(hours_value).is_integer() else hours_value).replace(".", "_")
-            return f"{stage}_{hours_token}h"
-
-        milestones = [
-            ("reminder", reminder_hours, _milestone_key("reminder", reminder_hours)),
-            ("escalation", escalation_hours, _milestone_key("escalation", escalation_hours)),
-        ]
-
-        for stage, min_hours, milestone in milestones:
-            overdue = db.get_overdue_approvals(org_id, min_hours=min_hours)
+        for stage, min_hours, milestone in approval_milestones(policy):
+            if target_id:
+                overdue = db.get_overdue_approvals(org_id, min_hours=min_hours, ap_item_id=target_id)
+            else:
+                overdue = db.get_overdue_approvals(org_id, min_hours=min_hours)
             for item in overdue:
                 ap_item_id = item.get("id")
                 if not ap_item_id:
@@ -1171,12 +1232,25 @@ async def _check_approval_timeouts(org_id: str):
 
                 if patch and hasattr(db, "update_ap_item_metadata_merge"):
                     db.update_ap_item_metadata_merge(ap_item_id, patch)
+                    rearm_ids.add(ap_item_id)
 
                 logger.info(
                     "Approval timeout %s milestone triggered for ap_item_id=%s",
                     milestone,
                     ap_item_id,
                 )
+
+        if hasattr(db, "register_timer"):
+            for rearm_id in rearm_ids:
+                try:
+                    rearm_item = db.get_ap_item(rearm_id)
+                    if rearm_item:
+                        arm_approval_timer(
+                            db, rearm_item, policy=policy,
+                            min_delay_seconds=APPROVAL_RETRY_SECONDS,
+                        )
+                except Exception as timer_exc:
+                    logger.warning("Approval timer re-arm failed for %s: %s", rearm_id, timer_exc)
         # Auto-reassign pending approvals to delegates (OOO)
         try:
             from solden.services.approval_delegation import get_delegation_service
@@ -2035,63 +2109,6 @@ async def _check_queue_depth_and_concurrency() -> Dict[str, Any]:
     return result
 
 
-async def _fire_erp_recheck_timers(org_id: str) -> int:
-    """§12.2: Fire TIMER_FIRED erp_recheck events for paused items.
-
-    Finds AP items with waiting_condition.type = 'external_dependency_unavailable'
-    whose expected_by has passed, and enqueues timer events that trigger
-    the ERP connectivity re-check plan.
-    """
-    try:
-        import json as _json
-        from solden.core.database import get_db
-        from solden.core.events import AgentEvent, AgentEventType
-        from solden.core.event_queue import get_event_queue
-
-        db = get_db()
-        items = db.list_ap_items(organization_id=org_id, limit=200)
-        now = datetime.now(timezone.utc)
-        queue = get_event_queue()
-        fired = 0
-
-        for item in (items or []):
-            wc = item.get("waiting_condition")
-            if isinstance(wc, str):
-                try:
-                    wc = _json.loads(wc)
-                except Exception:
-                    wc = None
-            if not isinstance(wc, dict):
-                continue
-            if wc.get("type") != "external_dependency_unavailable":
-                continue
-
-            expected_by = wc.get("expected_by")
-            if not expected_by:
-                continue
-            try:
-                exp = datetime.fromisoformat(expected_by.replace("Z", "+00:00"))
-            except Exception:
-                continue
-            if exp > now:
-                continue  # Not yet due
-
-            # Fire the timer
-            queue.enqueue(AgentEvent(
-                type=AgentEventType.TIMER_FIRED,
-                source="erp_recheck_scheduler",
-                payload={"timer_type": "erp_recheck", "box_id": item.get("id", "")},
-                organization_id=org_id,
-                idempotency_key=f"erp_recheck:{item.get('id', '')}:{int(now.timestamp()) // 900}",
-            ))
-            fired += 1
-
-        return fired
-    except Exception as exc:
-        logger.debug("[ERP recheck] Failed for %s: %s", org_id, exc)
-        return 0
-
-
 async def _poll_grn_confirmations(org_id: str) -> None:
     """§2.2 + §4.3: Poll for GRN confirmations on invoices waiting for GRN.
 
@@ -2122,8 +2139,8 @@ async def _poll_grn_confirmations(org_id: str) -> None:
 
         from solden.core.events import AgentEvent, AgentEventType
         from solden.core.event_queue import get_event_queue
-        queue = get_event_queue()
 
+        events = []
         for item in grn_waiting:
             ap_item_id = item.get("id", "")
             po_number = item.get("po_number", "")
@@ -2145,7 +2162,7 @@ async def _poll_grn_confirmations(org_id: str) -> None:
 
             if grn_found:
                 # GRN confirmed — enqueue ERP_GRN_CONFIRMED
-                queue.enqueue(AgentEvent(
+                events.append(AgentEvent(
                     type=AgentEventType.ERP_GRN_CONFIRMED,
                     source="grn_poll",
                     payload={
@@ -2158,7 +2175,7 @@ async def _poll_grn_confirmations(org_id: str) -> None:
                 logger.info("[GRN poll] GRN confirmed for %s (PO %s)", ap_item_id, po_number)
             else:
                 # GRN not yet confirmed — enqueue TIMER_FIRED for recheck
-                queue.enqueue(AgentEvent(
+                events.append(AgentEvent(
                     type=AgentEventType.TIMER_FIRED,
                     source="grn_poll",
                     payload={
@@ -2170,5 +2187,7 @@ async def _poll_grn_confirmations(org_id: str) -> None:
                     idempotency_key=f"grn_recheck:{ap_item_id}:{int(datetime.now(timezone.utc).timestamp()) // 3600}",
                 ))
 
+        get_event_queue().enqueue_many(events)
+
     except Exception as exc:
         logger.debug("[GRN poll] Failed for org=%s: %s", org_id, exc)
@@ -0,0 +1,156 @@
+"""Similar-case index for agent memory.
+
+One ``agent_case_index`` row per belief state (``AgentMemoryService``
+writes it in the same transaction as ``upsert_belief_state``). The row
+carries the keys ``recall_similar_cases`` matches on as plain indexed
+columns — normalized vendor, vendor's leading token, document type,
+state, next action, field-review flag — and a hashed feature vector
+computed here, with no external embedding service.
+
+Retrieval reads candidates off the composite indexes (newest first per
+key combination), scores them from these columns alone, and only loads
+the full belief JSON for the cases it returns.
+
+The feature vector covers what the exact keys miss: the signed hashing
+trick over the vendor name's character trigrams (spelling variants),
+the amount's order of magnitude, currency and reason words. It is
+L2-normalized and packed as float32, so the similarity of two cases is
+a dot product. Hashing uses blake2b rather
+than ``hash()`` so vectors are stable across processes.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from solden.services.fuzzy_matching import normalize_vendor
+
+CASE_FEATURE_DIMENSIONS = 128
+# Shared by ``AgentMemoryService._init_tables`` and migration 113, which
+# backfills belief states written before the index existed.
+CASE_INDEX_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS agent_case_index (
+        organization_id TEXT NOT NULL,
+        skill_id TEXT NOT NULL,
+        ap_item_id TEXT NOT NULL,
+        vendor_key TEXT NOT NULL DEFAULT '',
+        vendor_token TEXT NOT NULL DEFAULT '',
+        document_type TEXT NOT NULL DEFAULT '',
+        state_key TEXT NOT NULL DEFAULT '',
+        next_action_type TEXT NOT NULL DEFAULT '',
+        requires_field_review INTEGER NOT NULL DEFAULT 0,
+        features BYTEA,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (organization_id, skill_id, ap_item_id)
+    )
+"""
+# Reason text is free-form; the first few words carry the signal.
+_REASON_TOKEN_LIMIT = 16
+
+
+def _clean(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def case_state_key(current_state: Any, status: Any) -> str:
+    return _clean(current_state or status)
+
+
+def case_next_action_key(next_action: Any) -> str:
+    if isinstance(next_action, dict):
+        return _clean(next_action.get("type") or next_action.get("label"))
+    return _clean(next_action)
+
+
+def vendor_keys(vendor_name: Any) -> Tuple[str, str]:
+    """``(vendor_key, vendor_token)``: normalized name and its first word."""
+    key = normalize_vendor(str(vendor_name or ""))
+    return key, (key.split(" ", 1)[0] if key else "")
+
+
+def _tokens(*, vendor_key: str, amount: Any, currency: Any, reason: Any) -> Iterable[Tuple[str, float]]:
+    if vendor_key:
+        padded = f"  {vendor_key} "
+        trigrams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+        weight = 1.0 / math.sqrt(len(trigrams))
+        for trigram in trigrams:
+            yield f"vg:{trigram}", weight
+    try:
+        magnitude = float(amount)
+    except (TypeError, ValueError):
+        magnitude = None
+    if magnitude is not None and math.isfinite(magnitude) and magnitude > 0:
+        yield f"amt:{int(math.floor(math.log2(magnitude)))}", 0.5
+    if currency:
+        yield f"cur:{_clean(currency)}", 0.25
+    for word in _clean(reason).replace("_", " ").split()[:_REASON_TOKEN_LIMIT]:
+        yield f"r:{word}", 0.2
+
+
+def case_features(*, vendor_key: str, amount: Any = None, currency: Any = None, reason: Any = None) -> List[float]:
+    """Hashed, L2-normalized feature vector of one case (or a query)."""
+    vector = [0.0] * CASE_FEATURE_DIMENSIONS
+    for token, weight in _tokens(vendor_key=vendor_key, amount=amount, currency=currency, reason=reason):
+        digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+        sign = 1.0 if digest & 1 else -1.0
+        vector[(digest >> 1) % CASE_FEATURE_DIMENSIONS] += sign * weight
+    norm = math.sqrt(sum(v * v for v in vector))
+    return [v / norm for v in vector] if norm else vector
+
+
+def encode_features(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def decode_features(raw: Any) -> Optional[array]:
+    if raw is None:
+        return None
+    values = array("f")
+    try:
+        values.frombytes(bytes(raw))
+    except (TypeError, ValueError):
+        return None
+    return values if len(values) == CASE_FEATURE_DIMENSIONS else None
+
+
+def feature_similarity(query: List[float], candidate: Optional[array]) -> float:
+    """Cosine similarity of two normalized vectors, floored at 0."""
+    if candidate is None:
+        return 0.0
+    return max(0.0, sum(q * c for q, c in zip(query, candidate)))
+
+
+def case_index_entry(
+    *,
+    ap_item_id: str,
+    current_state: Any,
+    status: Any,
+    belief: Dict[str, Any],
+    next_action: Any,
+    updated_at: str,
+) -> Dict[str, Any]:
+    """The ``agent_case_index`` row for one belief state."""
+    vendor_key, vendor_token = vendor_keys(belief.get("vendor_name"))
+    document_type = _clean(belief.get("document_type"))
+    state_key = case_state_key(current_state, status)
+    next_action_type = case_next_action_key(next_action)
+    requires_field_review = bool(belief.get("requires_field_review"))
+    features = case_features(
+        vendor_key=vendor_key,
+        amount=belief.get("amount"),
+        currency=belief.get("currency"),
+        reason=belief.get("reason"),
+    )
+    return {
+        "ap_item_id": ap_item_id,
+        "vendor_key": vendor_key,
+        "vendor_token": vendor_token,
+        "document_type": document_type,
+        "state_key": state_key,
+        "next_action_type": next_action_type,
+        "requires_field_review": 1 if requires_field_review else 0,
+        "features": encode_features(features),
+        "updated_at": updated_at,
+    }
@@ -17,11 +17,26 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
 from solden.core.database import SoldenDB, get_db
+from solden.services.agent_case_index import (
+    CASE_INDEX_TABLE_SQL,
+    case_features,
+    case_index_entry,
+    case_next_action_key,
+    case_state_key,
+    decode_features,
+    feature_similarity,
+    vendor_keys,
+)
 
 logger = logging.getLogger(__name__)
 
 _agent_memory_services: Dict[Tuple[str, int], "AgentMemoryService"] = {}
 
+# Candidates read per recall tier (at least ``limit * 10``).
+_CASE_CANDIDATES_PER_TIER = 50
+# Scales feature similarity (at most 1.0) in recall scoring.
+_FEATURE_SIMILARITY_WEIGHT = 0.4
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
@@ -227,6 +242,7 @@ class AgentMemoryService:
                 )
                 """
             )
+            cur.execute(CASE_INDEX_TABLE_SQL)
             cur.execute(
                 "CREATE INDEX IF NOT EXISTS idx_agent_profiles_org_skill "
                 "ON agent_profiles(organization_id, skill_id)"
@@ -255,6 +271,24 @@ class AgentMemoryService:
                 "CREATE INDEX IF NOT EXISTS idx_agent_patterns_org_type "
                 "ON agent_patterns(organization_id, skill_id, pattern_type, updated_at)"
             )
+            # Similar-case recall: one index per candidate tier, each
+            # ending in updated_at so a tier reads newest-first.
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_agent_case_index_vendor "
+                "ON agent_case_index(organization_id, skill_id, vendor_key, document_type, state_key, updated_at DESC)"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_agent_case_index_vendor_token "
+                "ON agent_case_index(organization_id, skill_id, vendor_token, updated_at DESC)"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_agent_case_index_document_state "
+                "ON agent_case_index(organization_id, skill_id, document_type, state_key, next_action_type, updated_at DESC)"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_agent_case_index_recent "
+                "ON agent_case_index(organization_id, skill_id, updated_at DESC)"
+            )
             conn.commit()
 
     def ensure_profile(
@@ -850,9 +884,60 @@ class AgentMemoryService:
                     row["updated_at"],
                 ),
             )
+            self._write_case_index(
+                cur,
+                resolved_skill_id,
+                [
+                    case_index_entry(
+                        ap_item_id=resolved_ap_item_id,
+                        current_state=row["current_state"],
+                        status=row["status"],
+                        belief=row["belief_json"],
+                        next_action=row["next_action_json"],
+                        updated_at=row["updated_at"],
+                    )
+                ],
+            )
             conn.commit()
         return self.get_belief_state(ap_item_id=resolved_ap_item_id, skill_id=resolved_skill_id)
 
+    def _write_case_index(self, cur: Any, skill_id: str, entries: List[Dict[str, Any]]) -> None:
+        sql = (
+            """
+            INSERT INTO agent_case_index (
+                organization_id, skill_id, ap_item_id, vendor_key, vendor_token, document_type,
+                state_key, next_action_type, requires_field_review, features, updated_at
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (organization_id, skill_id, ap_item_id)
+            DO UPDATE SET
+                vendor_key = EXCLUDED.vendor_key,
+                vendor_token = EXCLUDED.vendor_token,
+                document_type = EXCLUDED.document_type,
+                state_key = EXCLUDED.state_key,
+                next_action_type = EXCLUDED.next_action_type,
+                requires_field_review = EXCLUDED.requires_field_review,
+                features = EXCLUDED.features,
+                updated_at = EXCLUDED.updated_at
+            """
+        )
+        for entry in entries:
+            cur.execute(
+                sql,
+                (
+                    self.organization_id,
+                    skill_id,
+                    entry["ap_item_id"],
+                    entry["vendor_key"],
+                    entry["vendor_token"],
+                    entry["document_type"],
+                    entry["state_key"],
+                    entry["next_action_type"],
+                    entry["requires_field_review"],
+                    entry["features"],
+                    entry["updated_at"],
+                ),
+            )
+
     def get_belief_state(self, *, ap_item_id: str, skill_id: str = "ap_v1") -> Dict[str, Any]:
         if not self.enabled:
             return {}
@@ -1216,86 +1301,93 @@ class AgentMemoryService:
         if not self.enabled:
             return []
         normalized_context = dict(context or {})
+        resolved_skill_id = str(skill_id or "ap_v1").strip() or "ap_v1"
+        resolved_limit = max(1, int(limit or 5))
         target_vendor = str(normalized_context.get("vendor_name") or "").strip().lower()
+        target_vendor_key, target_vendor_token = vendor_keys(target_vendor)
         target_document_type = str(normalized_context.get("document_type") or "").strip().lower()
-        target_state = str(normalized_context.get("current_state") or normalized_context.get("status") or "").strip().lower()
-        target_next_action = str(normalized_context.get("next_action_type") or normalized_context.get("next_action") or "").strip().lower()
+        target_state = case_state_key(normalized_context.get("current_state"), normalized_context.get("status"))
+        target_next_action = case_next_action_key(
+            normalized_context.get("next_action_type") or normalized_context.get("next_action")
+        )
+        target_field_review = normalized_context.get("requires_field_review")
+        query_features = case_features(
+            vendor_key=target_vendor_key,
+            amount=normalized_context.get("amount"),
+            currency=normalized_context.get("currency"),
+            reason=normalized_context.get("reason"),
+        )
 
-        sql = (
-            """
-            SELECT ap_item_id, current_state, status, belief_json, next_action_json, memory_summary_json, updated_at
-            FROM agent_belief_states
-            WHERE organization_id = %s AND skill_id = %s
-            ORDER BY updated_at DESC
-            LIMIT %s
-            """
+        candidates = self._case_candidates(
+            skill_id=resolved_skill_id,
+            per_tier=max(_CASE_CANDIDATES_PER_TIER, resolved_limit * 10),
+            vendor_key=target_vendor_key,
+            vendor_token=target_vendor_token,
+            document_type=target_document_type,
+            state_key=target_state,
+            next_action_type=target_next_action,
         )
-        with self.db.connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                sql,
-                (
-                    self.organization_id,
-                    str(skill_id or "ap_v1").strip() or "ap_v1",
-                    max(5, int(limit or 5) * 8),
-                ),
-            )
-            rows = cur.fetchall() or []
 
-        matches: List[Dict[str, Any]] = []
-        for row in rows:
-            payload = self._row_to_dict(row)
-            belief = self._load_json(payload.get("belief_json"), {})
-            next_action = self._load_json(payload.get("next_action_json"), {})
-            summary = self._load_json(payload.get("memory_summary_json"), {})
+        now = datetime.now(timezone.utc)
+        scored: List[Dict[str, Any]] = []
+        for payload in candidates:
             score = 0.0
             match_reasons: List[str] = []
-            belief_vendor = str(belief.get("vendor_name") or "").strip().lower()
-            belief_document_type = str(belief.get("document_type") or "").strip().lower()
-            belief_state = str(payload.get("current_state") or payload.get("status") or "").strip().lower()
-            belief_next_action = str(next_action.get("type") or next_action.get("label") or "").strip().lower()
-            if target_vendor and belief_vendor == target_vendor:
+            if target_vendor_key and payload.get("vendor_key") == target_vendor_key:
                 score += 4.0
                 match_reasons.append("vendor_exact")
-            if target_document_type and belief_document_type == target_document_type:
+            if target_document_type and payload.get("document_type") == target_document_type:
                 score += 2.0
                 match_reasons.append("document_type")
-            if target_state and belief_state == target_state:
+            if target_state and payload.get("state_key") == target_state:
                 score += 2.0
                 match_reasons.append("state")
-            if target_next_action and belief_next_action == target_next_action:
+            if target_next_action and payload.get("next_action_type") == target_next_action:
                 score += 1.5
                 match_reasons.append("next_action")
-            confidence_blockers = belief.get("requires_field_review")
-            if bool(confidence_blockers) == bool(normalized_context.get("requires_field_review")) and normalized_context.get("requires_field_review") is not None:
+            if target_field_review is not None and bool(payload.get("requires_field_review")) == bool(target_field_review):
                 score += 0.5
                 match_reasons.append("field_review_alignment")
             updated_at = str(payload.get("updated_at") or "").strip()
             if updated_at:
                 try:
                     updated_dt = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-                    age_hours = max(
-                        0.0,
-                        (datetime.now(timezone.utc) - updated_dt).total_seconds() / 3600.0,
-                    )
+                    age_hours = max(0.0, (now - updated_dt).total_seconds() / 3600.0)
                     recency_bonus = max(0.0, 1.0 - min(age_hours / 168.0, 1.0))
                     score += recency_bonus
                     if recency_bonus:
                         match_reasons.append("recency")
                 except Exception:
                     pass
+            # Soft match on the hashed features: vendor spelling variants,
+            # amount band, reason wording. Capped below the smallest exact
+            # key (field_review_alignment, 0.5) so it only breaks ties.
+            similarity = feature_similarity(query_features, decode_features(payload.get("features")))
+            if similarity >= 0.5:
+                score += _FEATURE_SIMILARITY_WEIGHT * similarity
+                match_reasons.append("similar_features")
             if score <= 0:
                 continue
+            scored.append({"ap_item_id": payload.get("ap_item_id"), "score": score, "match_reasons": match_reasons})
+
+        scored.sort(key=lambda entry: -entry["score"])
+        top = scored[:resolved_limit]
+        beliefs = self._load_belief_rows(skill_id=resolved_skill_id, ap_item_ids=[entry["ap_item_id"] for entry in top])
+        matches: List[Dict[str, Any]] = []
+        for entry in top:
+            payload = beliefs.get(entry["ap_item_id"])
+            if payload is None:
+                continue
             matches.append(
                 {
-                    "ap_item_id": payload.get("ap_item_id"),
-                    "score": score,
-                    "match_reasons": match_reasons,
+                    "ap_item_id": entry["ap_item_id"],
+                    "score": entry["score"],
+                    "match_reasons": entry["match_reasons"],
                     "current_state": payload.get("current_state"),
                     "status": payload.get("status"),
-                    "belief": belief,
-                    "next_action": next_action,
-                    "summary": summary,
+                    "belief": self._load_json(payload.get("belief_json"), {}),
+                    "next_action": self._load_json(payload.get("next_action_json"), {}),
+                    "summary": self._load_json(payload.get("memory_summary_json"), {}),
                     "updated_at": payload.get("updated_at"),
                 }
             )
@@ -1332,6 +1424,82 @@ class AgentMemoryService:
         )
         return matches[: max(1, int(limit or 5))]
 
+    def _case_candidates(
+        self,
+        *,
+        skill_id: str,
+        per_tier: int,
+        vendor_key: str,
+        vendor_token: str,
+        document_type: str,
+        state_key: str,
+        next_action_type: str,
+    ) -> List[Dict[str, Any]]:
+        """Candidate cases for one recall, deduplicated.
+
+        Each tier is an index range on ``agent_case_index`` read newest
+        first, so the cost is bounded by ``per_tier`` and not by how much
+        memory the org has. The last tier (most recent cases) is what
+        recall used to scan on its own.
+        """
+        tiers: List[Tuple[str, List[Any]]] = []
+        if vendor_key:
+            if document_type and state_key:
+                tiers.append(("vendor_key = %s AND document_type = %s AND state_key = %s", [vendor_key, document_type, state_key]))
+            if document_type:
+                tiers.append(("vendor_key = %s AND document_type = %s", [vendor_key, document_type]))
+            tiers.append(("vendor_key = %s", [vendor_key]))
+            # Same leading word ("globex" / "globex holdings"): spelling
+            # variants the feature similarity then ranks.
+            tiers.append(("vendor_token = %s", [vendor_token]))
+        if document_type and state_key:
+            if next_action_type:
+                tiers.append((
+                    "document_type = %s AND state_key = %s AND next_action_type = %s",
+                    [document_type, state_key, next_action_type],
+                ))
+            tiers.append(("document_type = %s AND state_key = %s", [document_type, state_key]))
+        tiers.append(("TRUE", []))
+
+        selects: List[str] = []
+        params: List[Any] = []
+        for where, tier_params in tiers:
+            selects.append(
+                "(SELECT ap_item_id, vendor_key, document_type, state_key, next_action_type, "
+                "requires_field_review, features, updated_at FROM agent_case_index "
+                f"WHERE organization_id = %s AND skill_id = %s AND {where} "
+                "ORDER BY updated_at DESC LIMIT %s)"
+            )
+            params.extend([self.organization_id, skill_id, *tier_params, per_tier])
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(" UNION ALL ".join(selects), tuple(params))
+            rows = cur.fetchall() or []
+        seen: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            payload = self._row_to_dict(row)
+            seen.setdefault(str(payload.get("ap_item_id") or ""), payload)
+        return list(seen.values())
+
+    def _load_belief_rows(self, *, skill_id: str, ap_item_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not ap_item_ids:
+            return {}
+        sql = (
+            """
+            SELECT ap_item_id, current_state, status, belief_json, next_action_json, memory_summary_json, updated_at
+            FROM agent_belief_states
+            WHERE organization_id = %s AND skill_id = %s AND ap_item_id = ANY(%s)
+            """
+        )
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, (self.organization_id, skill_id, list(ap_item_ids)))
+            rows = cur.fetchall() or []
+        return {
+            str(payload.get("ap_item_id") or ""): payload
+            for payload in (self._row_to_dict(row) for row in rows)
+        }
+
     def record_outcome(
         self,
         *,
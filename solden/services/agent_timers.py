@@ -0,0 +1,280 @@
+"""Agent timers — registering Box timers and firing the due ones.
+
+``agent_timers`` (:mod:`solden.core.stores.timer_store`) holds one row
+per waiting Box per timer type. This module owns the two ends of it:
+
+* **Writers.** ``update_ap_item`` calls :func:`sync_ap_item_timers`
+  after each committed write, so every path that snoozes an item, parks
+  it on an unreachable ERP or sends it for approval arms the matching
+  timer, and every path that moves it on cancels it. The approval
+  sweep re-arms ``approval_timeout`` for the next unsent milestone via
+  :func:`arm_approval_timer`.
+* **Consumer.** :func:`fire_due_timers` pops due timers in due order
+  and enqueues one ``TIMER_FIRED`` event per timer for the planner.
+  Its cost is proportional to the timers that are due, not to the
+  number of AP items or orgs.
+
+Override windows are not mirrored here: ``override_windows`` is already
+indexed on ``(state, expires_at)`` and its reaper expires each window
+exactly once under a ``WHERE state = 'pending'`` guard; a second timer
+for the same deadline would only race it.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TIMER_SNOOZE_EXPIRED = "snooze_expired"
+TIMER_ERP_RECHECK = "erp_recheck"
+TIMER_APPROVAL_TIMEOUT = "approval_timeout"
+
+FIRE_BATCH_SIZE = 200
+# Cap per call so one beat tick can't run unbounded after an outage;
+# whatever is left is picked up on the next tick.
+FIRE_MAX_BATCHES = 10
+# Floor on a re-armed approval timer whose milestone is already due
+# (the reminder failed to send): retry on the old sweep cadence.
+APPROVAL_RETRY_SECONDS = 900
+
+
+def _load_json(raw: Any) -> Dict[str, Any]:
+    if isinstance(raw, dict):
+        return raw
+    if not raw:
+        return {}
+    try:
+        loaded = json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+    return loaded if isinstance(loaded, dict) else {}
+
+
+def _parse_ts(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Approval milestones
+# ---------------------------------------------------------------------------
+
+
+def approval_milestones(policy: Dict[str, Any]) -> List[Tuple[str, float, str]]:
+    """Return ``(stage, hours, milestone_key)`` for the reminder and escalation."""
+    reminder_hours = max(1.0, float(policy.get("reminder_hours") or 4.0))
+    escalation_hours = max(reminder_hours, float(policy.get("escalation_hours") or 24.0))
+
+    def _key(stage: str, hours_value: float) -> str:
+        hours_token = str(int(hours_value) if float(hours_value).is_integer() else hours_value).replace(".", "_")
+        return f"{stage}_{hours_token}h"
+
+    return [
+        ("reminder", reminder_hours, _key("reminder", reminder_hours)),
+        ("escalation", escalation_hours, _key("escalation", escalation_hours)),
+    ]
+
+
+def arm_approval_timer(
+    db: Any,
+    item: Dict[str, Any],
+    *,
+    policy: Optional[Dict[str, Any]] = None,
+    min_delay_seconds: float = 0,
+) -> Optional[datetime]:
+    """Point the item's ``approval_timeout`` timer at its next unsent milestone.
+
+    Cancels the timer when the item is no longer waiting on approval or
+    every milestone has been sent. ``min_delay_seconds`` pushes a
+    milestone that is already due out by that much, so a reminder that
+    failed to send is retried later rather than re-fired in a loop.
+    Returns the due time armed, if any.
+    """
+    ap_item_id = item.get("id")
+    organization_id = item.get("organization_id")
+    if not ap_item_id or not organization_id:
+        return None
+    if item.get("state") != "needs_approval":
+        db.cancel_timer(ap_item_id, TIMER_APPROVAL_TIMEOUT)
+        return None
+    if policy is None:
+        from solden.services.policy_compliance import get_approval_automation_policy
+
+        policy = get_approval_automation_policy(organization_id=organization_id)
+
+    metadata = _load_json(item.get("metadata"))
+    requested_at = (
+        _parse_ts(metadata.get("approval_requested_at"))
+        or _parse_ts(item.get("updated_at"))
+        or datetime.now(timezone.utc)
+    )
+    sent = metadata.get("approval_reminder_milestones") or {}
+    for stage, hours, milestone in approval_milestones(policy):
+        legacy = f"{int(hours)}h" if float(hours).is_integer() else None
+        if milestone in sent or (legacy and legacy in sent):
+            continue
+        due_at = max(
+            requested_at + timedelta(hours=hours),
+            datetime.now(timezone.utc) + timedelta(seconds=min_delay_seconds),
+        )
+        db.register_timer(
+            organization_id=organization_id,
+            box_id=ap_item_id,
+            timer_type=TIMER_APPROVAL_TIMEOUT,
+            due_at=due_at,
+            payload={"stage": stage, "milestone": milestone},
+        )
+        return due_at
+    db.cancel_timer(ap_item_id, TIMER_APPROVAL_TIMEOUT)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+
+def sync_ap_item_timers(
+    db: Any,
+    ap_item_id: str,
+    *,
+    fields: Dict[str, Any],
+    organization_id: Optional[str] = None,
+    prev_state: Optional[str] = None,
+) -> None:
+    """Mirror a committed ``update_ap_item`` write into ``agent_timers``.
+
+    ``fields`` are the columns as written (JSON columns serialized).
+    """
+    new_state = fields.get("state")
+    org_id = organization_id or fields.get("organization_id")
+
+    def _org() -> str:
+        nonlocal org_id
+        if not org_id:
+            org_id = (db.get_ap_item(ap_item_id) or {}).get("organization_id") or ""
+        return org_id
+
+    # Snooze: armed with the item's snoozed_until, cleared on any exit.
+    if new_state == "snoozed":
+        snoozed_until = _parse_ts(_load_json(fields.get("metadata")).get("snoozed_until"))
+        if snoozed_until is not None and _org():
+            db.register_timer(
+                organization_id=org_id,
+                box_id=ap_item_id,
+                timer_type=TIMER_SNOOZE_EXPIRED,
+                due_at=snoozed_until,
+            )
+    elif new_state is not None and prev_state == "snoozed":
+        db.cancel_timer(ap_item_id, TIMER_SNOOZE_EXPIRED)
+
+    # Approval: armed at the first milestone when the item starts waiting.
+    if new_state == "needs_approval" and prev_state != "needs_approval":
+        if _org():
+            arm_approval_timer(
+                db,
+                {
+                    "id": ap_item_id,
+                    "organization_id": org_id,
+                    "state": "needs_approval",
+                    "metadata": fields.get("metadata"),
+                    "updated_at": fields.get("updated_at"),
+                },
+            )
+    elif new_state is not None and prev_state == "needs_approval" and new_state != "needs_approval":
+        db.cancel_timer(ap_item_id, TIMER_APPROVAL_TIMEOUT)
+
+    # ERP recheck: follows waiting_condition.expected_by while the ERP is down.
+    if "waiting_condition" in fields:
+        condition = _load_json(fields.get("waiting_condition"))
+        expected_by = _parse_ts(condition.get("expected_by"))
+        if condition.get("type") == "external_dependency_unavailable" and expected_by and _org():
+            db.register_timer(
+                organization_id=org_id,
+                box_id=ap_item_id,
+                timer_type=TIMER_ERP_RECHECK,
+                due_at=expected_by,
+            )
+        else:
+            db.cancel_timer(ap_item_id, TIMER_ERP_RECHECK)
+
+
+# ---------------------------------------------------------------------------
+# Consumer
+# ---------------------------------------------------------------------------
+
+
+def fire_due_timers(
+    *,
+    db: Any = None,
+    queue: Any = None,
+    batch_size: int = FIRE_BATCH_SIZE,
+    max_batches: int = FIRE_MAX_BATCHES,
+) -> int:
+    """Enqueue a ``TIMER_FIRED`` event for every due timer; return the count.
+
+    Timers are claimed in due order under a lease and deleted only
+    after their event is enqueued, so a failed enqueue (or a dead
+    consumer) hands them out again when the lease runs out. The
+    idempotency key includes the time the timer was scheduled for —
+    not its ``due_at``, which each claim pushes out by the lease — so a
+    redelivered timer is dropped by the queue while a re-armed one fires
+    again.
+    """
+    from solden.core.events import AgentEvent, AgentEventType
+
+    if db is None:
+        from solden.core.database import get_db
+
+        db = get_db()
+    if queue is None:
+        from solden.core.event_queue import get_event_queue
+
+        queue = get_event_queue()
+
+    fired = 0
+    for _ in range(max(1, int(max_batches))):
+        timers = db.claim_due_timers(limit=batch_size)
+        if not timers:
+            break
+        events = []
+        for timer in timers:
+            scheduled_at = timer.get("scheduled_at") or timer["due_at"]
+            payload = dict(timer.get("payload") or {})
+            payload.update({
+                "timer_type": timer["timer_type"],
+                "box_id": timer["box_id"],
+                "box_type": timer.get("box_type") or "ap_item",
+                "organization_id": timer["organization_id"],
+                "due_at": scheduled_at,
+            })
+            events.append(AgentEvent(
+                type=AgentEventType.TIMER_FIRED,
+                source="agent_timers",
+                payload=payload,
+                organization_id=timer["organization_id"],
+                idempotency_key=f"timer:{timer['timer_type']}:{timer['box_id']}:{scheduled_at}",
+            ))
+        try:
+            results = queue.enqueue_many(events)
+        except Exception as exc:
+            logger.warning(
+                "[agent_timers] enqueue failed for %d timer(s), left for lease expiry: %s",
+                len(timers), exc,
+            )
+            results = []
+        # A duplicate was already enqueued by an earlier claim — done too.
+        done: List[str] = [timer["id"] for timer, _result in zip(timers, results)]
+        db.complete_timers(done, timers[0]["claim_token"])
+        fired += len(done)
+        if len(timers) < batch_size:
+            break
+    return fired
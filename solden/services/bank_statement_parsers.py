@@ -41,16 +41,94 @@ Each parser returns the same canonical shape:
 
 Outflows (debits leaving our account) are signed negative — they're
 what the matcher pairs against ``payment_confirmations`` rows.
+
+Both formats are parsed incrementally (``iterparse`` for CAMT, a
+chunked SGML→XML rewrite feeding ``XMLPullParser`` for OFX): each
+``stream_*`` function returns a :class:`StatementStream` whose lines
+are yielded one entry at a time, with every consumed element cleared
+and detached from the tree. ``detect_and_ingest`` pipes that stream
+into batched ``bank_statement_lines`` inserts, so memory is bounded by
+the batch size rather than the file size — multi-account corporate
+statements run to hundreds of MB. The ``parse_*`` / ``detect_and_parse``
+functions collect the same stream into the dict shape above.
 """
 from __future__ import annotations
 
+import codecs
+import io
 import logging
 import re
 import xml.etree.ElementTree as ET
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Read size for the OFX rewrite; iterparse uses its own 16 KiB reads.
+_READ_CHUNK_BYTES = 64 * 1024
+# Lines per multi-row INSERT in ``detect_and_ingest``.
+_INGEST_BATCH_SIZE = 1000
+# Bytes sniffed for format detection.
+_SNIFF_BYTES = 512
+
+StatementSource = Union[bytes, bytearray, BinaryIO]
+
+
+class StatementStream:
+    """A statement parsed lazily: iterate once for the lines.
+
+    ``statement`` starts empty and holds the first statement's header
+    once its closing tag has been read — after iteration finishes for
+    OFX, whose ledger balance trails the transactions.
+    """
+
+    def __init__(self, fmt: str) -> None:
+        self.format = fmt
+        self.statement: Dict[str, Any] = {}
+        self._lines: Iterator[Dict[str, Any]] = iter(())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._lines
+
+
+def _as_binary(source: StatementSource) -> BinaryIO:
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(bytes(source))
+    return source
+
+
+def _walk(
+    events: Iterator[Tuple[str, ET.Element]],
+) -> Iterator[Tuple[str, ET.Element, List[ET.Element]]]:
+    """Turn start/end events into ``(localname, elem, ancestors)`` on
+    each element end; ``ancestors[-1]`` is the parent."""
+    stack: List[ET.Element] = []
+    for event, elem in events:
+        if event == "start":
+            stack.append(elem)
+        else:
+            stack.pop()
+            yield _strip_ns(elem.tag), elem, stack
+
+
+def _release(elem: ET.Element, ancestors: List[ET.Element]) -> None:
+    """Drop a consumed subtree so the partial tree stays O(depth)."""
+    elem.clear()
+    if ancestors:
+        ancestors[-1].remove(elem)
+
+
+def _collect(stream: StatementStream) -> Dict[str, Any]:
+    try:
+        lines = list(stream)
+    except ET.ParseError as exc:
+        logger.warning("%s parse failed: %s", stream.format, exc)
+        return {"format": stream.format, "statement": {}, "lines": []}
+    return {
+        "format": stream.format,
+        "statement": dict(stream.statement),
+        "lines": lines,
+    }
+
 
 # ── CAMT.053 ────────────────────────────────────────────────────────
 
@@ -121,241 +199,430 @@ def _parse_amount_with_sign(entry: ET.Element) -> Optional[float]:
     return amount * sign
 
 
-def parse_camt053(content: bytes) -> Dict[str, Any]:
-    """Parse a single CAMT.053 statement XML payload."""
-    text = content.decode("utf-8", errors="replace") if content else ""
-    if not text.strip():
-        return {"format": "camt.053", "statement": {}, "lines": []}
-    try:
-        root = ET.fromstring(text)
-    except ET.ParseError as exc:
-        logger.warning("camt.053 parse failed: %s", exc)
-        return {"format": "camt.053", "statement": {}, "lines": []}
+def _camt_entry_line(
+    ntry: ET.Element, idx: int, currency: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """One ``<Ntry>`` → canonical line, or ``None`` if unusable."""
+    amount = _parse_amount_with_sign(ntry)
+    if amount is None:
+        return None
+    amt_el = _find(ntry, ["Amt"])
+    line_currency = (
+        amt_el.attrib.get("Ccy") if amt_el is not None else None
+    ) or currency
+    if not line_currency:
+        return None
 
-    # Document/BkToCstmrStmt/Stmt
-    stmt = _find(root, ["BkToCstmrStmt", "Stmt"])
-    if stmt is None:
-        # Some banks wrap differently — try root → Stmt.
-        stmt = _find(root, ["Stmt"])
-    if stmt is None:
-        return {"format": "camt.053", "statement": {}, "lines": []}
+    booking_date = _text(_find(ntry, ["BookgDt", "Dt"]))
+    value_date = _text(_find(ntry, ["ValDt", "Dt"]))
+    bank_ref = _text(_find(ntry, ["AcctSvcrRef"]))
+
+    # Drill into the entry details for counterparty + end-to-end-id.
+    ntry_dtls = _find(ntry, ["NtryDtls", "TxDtls"])
+    end_to_end = _text(
+        _find(ntry_dtls, ["Refs", "EndToEndId"])
+    ) if ntry_dtls is not None else None
+    # Counterparty: for an outflow (DBIT), the counterparty is the
+    # creditor; for an inflow (CRDT), it's the debtor.
+    counterparty = None
+    counterparty_iban = None
+    if ntry_dtls is not None:
+        related = _find(ntry_dtls, ["RltdPties"])
+        if related is not None:
+            for who in ("Cdtr", "Dbtr"):
+                party = _find(related, [who])
+                if party is not None:
+                    counterparty = _text(_find(party, ["Nm"])) or counterparty
+            acct = _find(related, ["CdtrAcct", "Id", "IBAN"])
+            if acct is None:
+                acct = _find(related, ["DbtrAcct", "Id", "IBAN"])
+            counterparty_iban = _text(acct)
+    description = _text(_find(ntry, ["AddtlNtryInf"]))
 
-    iban = _text(_find(stmt, ["Acct", "Id", "IBAN"]))
-    other = _text(_find(stmt, ["Acct", "Id", "Othr", "Id"]))
-    currency = _text(_find(stmt, ["Acct", "Ccy"]))
+    return {
+        "line_index": idx,
+        "value_date": value_date,
+        "booking_date": booking_date,
+        "amount": amount,
+        "currency": line_currency,
+        "description": description,
+        "counterparty": counterparty,
+        "counterparty_iban": counterparty_iban,
+        "bank_reference": bank_ref,
+        "end_to_end_id": end_to_end,
+    }
 
-    from_date = _text(_find(stmt, ["FrToDt", "FrDtTm"]))
-    to_date = _text(_find(stmt, ["FrToDt", "ToDtTm"]))
 
-    opening = None
-    closing = None
-    for bal in _findall(stmt, ["Bal"]):
-        cd_el = _find(bal, ["Tp", "CdOrPrtry", "Cd"])
-        amt_el = _find(bal, ["Amt"])
-        if amt_el is None or amt_el.text is None:
-            continue
-        try:
-            value = float(amt_el.text)
-        except ValueError:
-            continue
-        cd = (cd_el.text or "").strip() if cd_el is not None else ""
-        if cd in ("OPBD", "PRCD"):
-            opening = value
-        elif cd in ("CLBD",):
-            closing = value
-
-    lines: List[Dict[str, Any]] = []
-    for idx, ntry in enumerate(_findall(stmt, ["Ntry"])):
-        amount = _parse_amount_with_sign(ntry)
-        if amount is None:
-            continue
-        amt_el = _find(ntry, ["Amt"])
-        line_currency = (
-            amt_el.attrib.get("Ccy") if amt_el is not None else None
-        ) or currency
-        if not line_currency:
-            continue
+def _iter_camt053(
+    source: BinaryIO, statement: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    """Yield lines from every ``<Stmt>`` in the document.
+
+    ``statement`` is filled with the first statement's header once
+    that ``<Stmt>`` closes. ``line_index`` runs across statements so
+    multi-account files keep unique indexes.
+    """
+    idx = 0
+    seen_stmt = False
+    header: Dict[str, Any] = {}
+    for tag, elem, stack in _walk(ET.iterparse(source, events=("start", "end"))):
+        parent = _strip_ns(stack[-1].tag) if stack else ""
+        if tag == "Ntry" and parent == "Stmt":
+            line = _camt_entry_line(elem, idx, header.get("currency"))
+            idx += 1
+            _release(elem, stack)
+            if line is not None:
+                yield line
+        elif tag == "Acct" and parent == "Stmt":
+            iban = _text(_find(elem, ["Id", "IBAN"]))
+            other = _text(_find(elem, ["Id", "Othr", "Id"]))
+            header.update(
+                iban=iban, account=other or iban,
+                currency=_text(_find(elem, ["Ccy"])),
+            )
+        elif tag == "FrToDt" and parent == "Stmt":
+            header.update(
+                from_date=_text(_find(elem, ["FrDtTm"])),
+                to_date=_text(_find(elem, ["ToDtTm"])),
+            )
+        elif tag == "Bal" and parent == "Stmt":
+            cd_el = _find(elem, ["Tp", "CdOrPrtry", "Cd"])
+            amt_el = _find(elem, ["Amt"])
+            if amt_el is not None and amt_el.text is not None:
+                try:
+                    value = float(amt_el.text)
+                except ValueError:
+                    value = None
+                cd = (cd_el.text or "").strip() if cd_el is not None else ""
+                if value is not None and cd in ("OPBD", "PRCD"):
+                    header["opening_balance"] = value
+                elif value is not None and cd in ("CLBD",):
+                    header["closing_balance"] = value
+            _release(elem, stack)
+        elif tag == "Stmt":
+            if not seen_stmt:
+                seen_stmt = True
+                statement.update({
+                    "iban": header.get("iban"),
+                    "account": header.get("account"),
+                    "currency": header.get("currency"),
+                    "from_date": header.get("from_date"),
+                    "to_date": header.get("to_date"),
+                    "opening_balance": header.get("opening_balance"),
+                    "closing_balance": header.get("closing_balance"),
+                })
+            header = {}
+            _release(elem, stack)
+
+
+def stream_camt053(source: StatementSource) -> StatementStream:
+    """Incremental CAMT.053 parse over bytes or a binary file object.
+
+    Raises ``xml.etree.ElementTree.ParseError`` from iteration on
+    malformed XML; lines already yielded stay valid.
+    """
+    stream = StatementStream("camt.053")
+    stream._lines = _iter_camt053(_as_binary(source), stream.statement)
+    return stream
 
-        booking_date = _text(_find(ntry, ["BookgDt", "Dt"]))
-        value_date = _text(_find(ntry, ["ValDt", "Dt"]))
-        bank_ref = _text(_find(ntry, ["AcctSvcrRef"]))
-
-        # Drill into the entry details for counterparty + end-to-end-id.
-        ntry_dtls = _find(ntry, ["NtryDtls", "TxDtls"])
-        end_to_end = _text(
-            _find(ntry_dtls, ["Refs", "EndToEndId"])
-        ) if ntry_dtls is not None else None
-        # Counterparty: for an outflow (DBIT), the counterparty is the
-        # creditor; for an inflow (CRDT), it's the debtor.
-        counterparty = None
-        counterparty_iban = None
-        if ntry_dtls is not None:
-            related = _find(ntry_dtls, ["RltdPties"])
-            if related is not None:
-                for who in ("Cdtr", "Dbtr"):
-                    party = _find(related, [who])
-                    if party is not None:
-                        counterparty = _text(_find(party, ["Nm"])) or counterparty
-                acct = _find(related, ["CdtrAcct", "Id", "IBAN"])
-                if acct is None:
-                    acct = _find(related, ["DbtrAcct", "Id", "IBAN"])
-                counterparty_iban = _text(acct)
-        description = _text(_find(ntry, ["AddtlNtryInf"]))
-
-        lines.append({
-            "line_index": idx,
-            "value_date": value_date,
-            "booking_date": booking_date,
-            "amount": amount,
-            "currency": line_currency,
-            "description": description,
-            "counterparty": counterparty,
-            "counterparty_iban": counterparty_iban,
-            "bank_reference": bank_ref,
-            "end_to_end_id": end_to_end,
-        })
 
-    return {
-        "format": "camt.053",
-        "statement": {
-            "iban": iban,
-            "account": other or iban,
-            "currency": currency,
-            "from_date": from_date,
-            "to_date": to_date,
-            "opening_balance": opening,
-            "closing_balance": closing,
-        },
-        "lines": lines,
-    }
+def parse_camt053(content: bytes) -> Dict[str, Any]:
+    """Parse a CAMT.053 statement XML payload into memory.
 
+    Covers every ``<Stmt>`` in the file; ``statement`` describes the
+    first. Use :func:`stream_camt053` for large files.
+    """
+    if not content or not content.strip():
+        return {"format": "camt.053", "statement": {}, "lines": []}
+    return _collect(stream_camt053(content))
 
-# ── OFX ─────────────────────────────────────────────────────────────
 
+# ── OFX ─────────────────────────────────────────────────────────────
 
-_OFX_SELF_CLOSE_RE = re.compile(
-    # Match leaf tags only: opening tag, non-empty value, then a
-    # newline or another tag. Aggregate tags (with no inline value)
-    # already have their closing counterpart in OFX SGML.
-    r"<(?P<tag>[A-Z0-9_.]+)>(?P<value>[^<\r\n]+?)\s*(?=\r?\n|<)",
-    re.MULTILINE,
-)
 
+def _iter_ofx_xml(source: BinaryIO) -> Iterator[str]:
+    """OFX 1.x is SGML-ish: tags don't always close. Read the payload
+    in ``_READ_CHUNK_BYTES`` pieces and emit well-formed XML fragments.
+
+    A start tag followed by non-blank text and then anything other
+    than its own end tag is a leaf, so ``</TAG>`` is inserted after
+    the stripped value. Already-closed leaves (OFX 2.x XML) pass
+    through unchanged.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    started = False
+    leaf: Optional[str] = None
+    eof = False
+    while not eof:
+        chunk = source.read(_READ_CHUNK_BYTES)
+        eof = not chunk
+        buf += decoder.decode(chunk or b"", final=eof)
+        if not started:
+            ofx_pos = buf.find("<OFX")
+            if ofx_pos < 0:
+                # Keep a tail in case "<OFX" straddles two chunks.
+                buf = buf[-3:]
+                continue
+            # Strip the SGML preamble (OFXHEADER:..., DATA:OFXSGML, etc).
+            buf = buf[ofx_pos:]
+            started = True
+
+        out: List[str] = []
+        pos = 0
+        while True:
+            lt = buf.find("<", pos)
+            gt = buf.find(">", lt) if lt >= 0 else -1
+            if gt < 0:
+                break
+            value = buf[pos:lt]
+            tag = buf[lt + 1:gt]
+            if leaf is not None and value.strip():
+                if tag == "/" + leaf:
+                    out.append(value)
+                else:
+                    out.append(f"{value.strip()}</{leaf}>")
+            else:
+                out.append(value)
+            out.append(f"<{tag}>")
+            is_start = not tag.startswith(("/", "?", "!")) and not tag.endswith("/")
+            leaf = tag.split()[0] if is_start and tag else None
+            pos = gt + 1
+        buf = buf[pos:]
+        if out:
+            yield "".join(out)
+    if started and leaf is not None and buf.strip():
+        yield f"{buf.strip()}</{leaf}>"
+
+
+def _ofx_events(source: BinaryIO) -> Iterator[Tuple[str, ET.Element]]:
+    parser = ET.XMLPullParser(events=("start", "end"))
+    for fragment in _iter_ofx_xml(source):
+        parser.feed(fragment)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _ofx_txn_line(
+    txn: ET.Element, idx: int, currency: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    """One ``<STMTTRN>`` → canonical line, or ``None`` if unusable."""
+    amt_el = _find(txn, ["TRNAMT"])
+    if amt_el is None or amt_el.text is None:
+        return None
+    try:
+        amount = float(amt_el.text)
+    except ValueError:
+        return None
+    if not currency:
+        return None
+    booking_date = _text(_find(txn, ["DTPOSTED"]))
+    value_date = _text(_find(txn, ["DTAVAIL"])) or booking_date
+    description = (
+        _text(_find(txn, ["MEMO"]))
+        or _text(_find(txn, ["NAME"]))
+    )
+    bank_ref = _text(_find(txn, ["FITID"]))
+    check_num = _text(_find(txn, ["CHECKNUM"]))
+    counterparty = _text(_find(txn, ["NAME"]))
 
-def _ofx_to_xml(content: bytes) -> str:
-    """OFX 1.x is SGML-ish: tags don't always close. Convert to
-    well-formed XML by replacing ``<TAG>value`` with ``<TAG>value</TAG>``
-    when the next non-whitespace char is a newline or another tag."""
-    text = content.decode("utf-8", errors="replace") if content else ""
-    ofx_pos = text.find("<OFX")
-    if ofx_pos < 0:
-        return text
-    # Strip the SGML preamble (OFXHEADER:..., DATA:OFXSGML, etc).
-    text = text[ofx_pos:]
+    return {
+        "line_index": idx,
+        "value_date": value_date,
+        "booking_date": booking_date,
+        "amount": amount,
+        "currency": currency,
+        "description": description,
+        "counterparty": counterparty,
+        "counterparty_iban": None,
+        "bank_reference": bank_ref or check_num,
+        "end_to_end_id": check_num,
+    }
 
-    def _close(match: re.Match) -> str:
-        tag = match.group("tag")
-        value = match.group("value")
-        return f"<{tag}>{value}</{tag}>"
 
-    fixed = _OFX_SELF_CLOSE_RE.sub(_close, text)
-    return fixed
+def _iter_ofx(
+    source: BinaryIO, statement: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    """Yield lines from every ``<STMTRS>``; ``statement`` gets the
+    first one's header (its ledger balance follows the transactions,
+    so it is only complete once that ``<STMTRS>`` closes)."""
+    # OFX bank statements: BANKMSGSRSV1 / STMTTRNRS / STMTRS / { BANKACCTFROM, BANKTRANLIST, LEDGERBAL, AVAILBAL }
+    idx = 0
+    seen_stmt = False
+    header: Dict[str, Any] = {}
+    for tag, elem, stack in _walk(_ofx_events(source)):
+        parent = stack[-1].tag if stack else ""
+        grandparent = stack[-2].tag if len(stack) > 1 else ""
+        if tag == "STMTTRN" and parent == "BANKTRANLIST" and grandparent == "STMTRS":
+            line = _ofx_txn_line(elem, idx, header.get("currency"))
+            idx += 1
+            _release(elem, stack)
+            if line is not None:
+                yield line
+        elif tag == "CURDEF" and parent == "STMTRS":
+            header["currency"] = _text(elem)
+        elif tag == "ACCTID" and parent == "BANKACCTFROM":
+            header["account"] = _text(elem)
+        elif tag in ("DTSTART", "DTEND") and parent == "BANKTRANLIST":
+            header["from_date" if tag == "DTSTART" else "to_date"] = _text(elem)
+        elif tag == "BALAMT" and parent == "LEDGERBAL":
+            try:
+                header["closing_balance"] = float(elem.text) if elem.text is not None else None
+            except ValueError:
+                header["closing_balance"] = None
+        elif tag == "STMTRS":
+            if not seen_stmt and parent == "STMTTRNRS":
+                seen_stmt = True
+                statement.update({
+                    "iban": None,
+                    "account": header.get("account"),
+                    "currency": header.get("currency"),
+                    "from_date": header.get("from_date"),
+                    "to_date": header.get("to_date"),
+                    "opening_balance": None,
+                    "closing_balance": header.get("closing_balance"),
+                })
+            header = {}
+            _release(elem, stack)
+
+
+def stream_ofx(source: StatementSource) -> StatementStream:
+    """Incremental OFX (SGML or XML) parse; see :func:`stream_camt053`."""
+    stream = StatementStream("ofx")
+    stream._lines = _iter_ofx(_as_binary(source), stream.statement)
+    return stream
 
 
 def parse_ofx(content: bytes) -> Dict[str, Any]:
-    xml_text = _ofx_to_xml(content)
-    if not xml_text.strip():
-        return {"format": "ofx", "statement": {}, "lines": []}
-    try:
-        root = ET.fromstring(xml_text)
-    except ET.ParseError as exc:
-        logger.warning("ofx parse failed: %s", exc)
+    """Parse an OFX payload into memory; see :func:`stream_ofx`."""
+    if not content or not content.strip():
         return {"format": "ofx", "statement": {}, "lines": []}
+    return _collect(stream_ofx(content))
 
-    # OFX bank statements: BANKMSGSRSV1 / STMTTRNRS / STMTRS / { BANKACCTFROM, BANKTRANLIST, LEDGERBAL, AVAILBAL }
-    stmt = _find(root, ["BANKMSGSRSV1", "STMTTRNRS", "STMTRS"])
-    if stmt is None:
-        return {"format": "ofx", "statement": {}, "lines": []}
-
-    currency = _text(_find(stmt, ["CURDEF"]))
-    acct = _find(stmt, ["BANKACCTFROM"])
-    account_id = _text(_find(acct, ["ACCTID"]))
 
-    tranlist = _find(stmt, ["BANKTRANLIST"])
-    from_date = _text(_find(tranlist, ["DTSTART"]))
-    to_date = _text(_find(tranlist, ["DTEND"]))
+def sniff_format(source: StatementSource, filename: str = "") -> Optional[str]:
+    """Format ``detect_and_ingest`` would pick from the payload's head
+    and ``filename``, or ``None`` when it would have to try both. A file
+    ``source`` is rewound afterwards."""
+    src = _as_binary(source)
+    head = src.read(_SNIFF_BYTES)
+    src.seek(0)
+    return _detect_format(head, filename)
 
-    ledger_bal = None
-    closing_el = _find(stmt, ["LEDGERBAL", "BALAMT"])
-    if closing_el is not None and closing_el.text is not None:
-        try:
-            ledger_bal = float(closing_el.text)
-        except ValueError:
-            ledger_bal = None
-
-    lines: List[Dict[str, Any]] = []
-    for idx, txn in enumerate(_findall(tranlist, ["STMTTRN"])):
-        amt_el = _find(txn, ["TRNAMT"])
-        if amt_el is None or amt_el.text is None:
-            continue
-        try:
-            amount = float(amt_el.text)
-        except ValueError:
-            continue
-        if not currency:
-            continue
-        booking_date = _text(_find(txn, ["DTPOSTED"]))
-        value_date = _text(_find(txn, ["DTAVAIL"])) or booking_date
-        description = (
-            _text(_find(txn, ["MEMO"]))
-            or _text(_find(txn, ["NAME"]))
-        )
-        bank_ref = _text(_find(txn, ["FITID"]))
-        check_num = _text(_find(txn, ["CHECKNUM"]))
-        counterparty = _text(_find(txn, ["NAME"]))
-
-        lines.append({
-            "line_index": idx,
-            "value_date": value_date,
-            "booking_date": booking_date,
-            "amount": amount,
-            "currency": currency,
-            "description": description,
-            "counterparty": counterparty,
-            "counterparty_iban": None,
-            "bank_reference": bank_ref or check_num,
-            "end_to_end_id": check_num,
-        })
 
-    return {
-        "format": "ofx",
-        "statement": {
-            "iban": None,
-            "account": account_id,
-            "currency": currency,
-            "from_date": from_date,
-            "to_date": to_date,
-            "opening_balance": None,
-            "closing_balance": ledger_bal,
-        },
-        "lines": lines,
-    }
+def _detect_format(head: bytes, filename: str) -> Optional[str]:
+    text = head.decode("utf-8", errors="replace").lower() if head else ""
+    if "<bktocstmrstmt" in text or "camt.053" in text:
+        return "camt.053"
+    if "ofxheader" in text or "<ofx" in text:
+        return "ofx"
+    if filename.lower().endswith(".ofx"):
+        return "ofx"
+    if filename.lower().endswith((".xml", ".camt", ".camt053")):
+        return "camt.053"
+    return None
 
 
 def detect_and_parse(content: bytes, *, filename: str = "") -> Dict[str, Any]:
     """Auto-detect format from content + filename and dispatch."""
-    head = content[:512].decode("utf-8", errors="replace").lower() if content else ""
-    if "<bktocstmrstmt" in head or "camt.053" in head:
+    fmt = _detect_format(content[:_SNIFF_BYTES] if content else b"", filename)
+    if fmt == "camt.053":
         return parse_camt053(content)
-    if "ofxheader" in head or "<ofx" in head:
+    if fmt == "ofx":
         return parse_ofx(content)
-    if filename.lower().endswith(".ofx"):
-        return parse_ofx(content)
-    if filename.lower().endswith((".xml", ".camt", ".camt053")):
-        return parse_camt053(content)
     # Default: try CAMT first (more structured); fall through to OFX
     # if the CAMT parser returns no lines.
     parsed = parse_camt053(content)
     if parsed["lines"]:
         return parsed
     return parse_ofx(content)
+
+
+def _ingest_stream(
+    db,
+    stream: StatementStream,
+    *,
+    organization_id: str,
+    import_id: str,
+    batch_size: int,
+) -> int:
+    inserted = 0
+    batch: List[Dict[str, Any]] = []
+    for line in stream:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            inserted += db.insert_bank_statement_lines(
+                organization_id=organization_id, import_id=import_id, lines=batch,
+            )
+            batch = []
+    if batch:
+        inserted += db.insert_bank_statement_lines(
+            organization_id=organization_id, import_id=import_id, lines=batch,
+        )
+    return inserted
+
+
+def detect_and_ingest(
+    db,
+    source: StatementSource,
+    *,
+    organization_id: str,
+    filename: str = "",
+    uploaded_by: Optional[str] = None,
+    batch_size: int = _INGEST_BATCH_SIZE,
+) -> Optional[Dict[str, Any]]:
+    """Detect the format, then stream lines straight into a new import.
+
+    ``source`` is the payload as bytes or a seekable binary file (the
+    API spools uploads to a temp file). The import row is created up
+    front and its header + ``line_count`` filled in once the stream is
+    exhausted. Returns the import row, or ``None`` — with any partial
+    import removed — when the payload is malformed or has no lines, so
+    callers see the same all-or-nothing outcome as ``detect_and_parse``.
+    """
+    src = _as_binary(source)
+    head = src.read(_SNIFF_BYTES)
+    fmt = _detect_format(head, filename)
+    # Unknown payloads: try CAMT first (more structured), then OFX.
+    for candidate in ([fmt] if fmt else ["camt.053", "ofx"]):
+        src.seek(0)
+        stream = stream_camt053(src) if candidate == "camt.053" else stream_ofx(src)
+        import_id = db.create_bank_statement_import(
+            organization_id=organization_id,
+            filename=filename,
+            format=candidate,
+            uploaded_by=uploaded_by,
+        )["id"]
+        try:
+            line_count = _ingest_stream(
+                db, stream,
+                organization_id=organization_id,
+                import_id=import_id,
+                batch_size=max(1, int(batch_size)),
+            )
+        except ET.ParseError as exc:
+            logger.warning(
+                "%s streaming parse failed import=%s: %s", candidate, import_id, exc,
+            )
+            line_count = 0
+        except Exception:
+            db.delete_bank_statement_import(import_id)
+            raise
+        if not line_count:
+            db.delete_bank_statement_import(import_id)
+            continue
+        statement = stream.statement
+        db.update_bank_statement_import_header(
+            import_id,
+            statement_iban=statement.get("iban"),
+            statement_account=statement.get("account"),
+            statement_currency=statement.get("currency"),
+            from_date=statement.get("from_date"),
+            to_date=statement.get("to_date"),
+            opening_balance=statement.get("opening_balance"),
+            closing_balance=statement.get("closing_balance"),
+            line_count=line_count,
+        )
+        return db.get_bank_statement_import(import_id)
+    return None
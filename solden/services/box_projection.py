@@ -20,6 +20,9 @@ This module replaces the live join with materialised projections:
 * ``vendor_summary`` — per-vendor rollup (BlackLine-style), keyed
   ``(organization_id, vendor_name_normalized)``. Backs the vendor
   detail page + ``GET /api/vendors/{name}/summary``.
+* ``ap_kpi_rollup`` — per-org AP KPI totals maintained by deltas
+  (:mod:`solden.core.stores.kpi_rollup_store`). Backs the headline
+  numbers of ``get_ap_kpis`` + ``GET /api/ops/ap-kpis/summary``.
 
 Architecture: the projection is updated by a :class:`BoxProjector`
 listening to state-transition outbox events. Same durability seam as
@@ -707,6 +710,48 @@ class VendorSummaryProjector:
         return 1
 
 
+# ─── APKPIRollupProjector ──────────────────────────────────────────
+
+
+class APKPIRollupProjector:
+    """Keeps the per-org AP KPI rollup (``ap_kpi_rollup``) current.
+
+    Unlike :class:`VendorSummaryProjector` this is incremental: every
+    transition recomputes the one item's KPI fact and adds the
+    difference to the org's totals, so ``get_ap_kpi_summary`` never
+    scans ``ap_items``. Replays are no-ops because the fact is
+    recomputed from the item's current row, not from the transition.
+    Drift from writes that bypass transitions is corrected by the
+    ``ap_kpi_reconciliation`` sweep.
+    """
+
+    projector_name = "ap_kpi_rollup"
+    box_types = ("ap_item",)
+
+    def __init__(self, db: Any = None) -> None:
+        self._db = db
+
+    @property
+    def db(self) -> Any:
+        if self._db is not None:
+            return self._db
+        from solden.core.database import get_db
+        return get_db()
+
+    async def project(self, context: ProjectionContext) -> ProjectionResult:
+        assert_org_id(context.organization_id, context="APKPIRollupProjector.project")
+        db = self.db
+        if not hasattr(db, "apply_ap_kpi_fact"):
+            return ProjectionResult(skip_reason="db_without_kpi_rollup")
+        outcome = db.apply_ap_kpi_fact(context.box_id) or {}
+        if not outcome.get("applied"):
+            return ProjectionResult(skip_reason=str(outcome.get("skip_reason") or "not_applied"))
+        return ProjectionResult(
+            rows_upserted=1 if outcome.get("changed") else 0,
+            metadata={"changed": bool(outcome.get("changed"))},
+        )
+
+
 # ─── Read helpers (called by api/ap_items_read_routes + new endpoints) ──
 
 
@@ -979,7 +1024,7 @@ def _safe_json(value: Any, default: Any) -> Any:
 _register_outbox_handler()
 
 
-# Register the two built-in projectors at import time. Concrete db
+# Register the built-in projectors at import time. Concrete db
 # binding happens lazily — projectors call ``get_db()`` themselves
 # the first time ``project()`` runs. Importing this module never
 # touches the DB, so it's safe to run before the test fixtures
@@ -993,6 +1038,10 @@ def _register_default_projectors() -> None:
         register_projector(VendorSummaryProjector())
     except Exception as exc:  # noqa: BLE001
         logger.warning("box_projection: VendorSummaryProjector registration — %s", exc)
+    try:
+        register_projector(APKPIRollupProjector())
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("box_projection: APKPIRollupProjector registration — %s", exc)
 
 
 _register_default_projectors()
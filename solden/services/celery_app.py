@@ -73,10 +73,12 @@ app.config_from_object(
         },
         # Celery Beat schedule for timer-based events
         "beat_schedule": {
-            # §2: Consume events from Redis Streams
-            "drain-event-stream": {
-                "task": "solden.services.celery_tasks.drain_event_stream",
-                "schedule": 2.0,  # Every 2 seconds — near-real-time consumption
+            # Beat liveness key for /api/ops health. The event streams
+            # themselves are drained (and stale entries reclaimed) by
+            # the long-running event_stream_consumer service.
+            "beat-heartbeat": {
+                "task": "solden.services.celery_tasks.beat_heartbeat",
+                "schedule": 30.0,
             },
             # §4.3: GRN checks, approval timeouts, vendor chases
             "fire-pending-timers": {
@@ -106,11 +108,6 @@ app.config_from_object(
                 "task": "solden.services.celery_tasks.reap_orphan_approval_dispatches_tick",
                 "schedule": 60.0,
             },
-            # §12.1: Reclaim stale events from dead workers
-            "reclaim-stale-events": {
-                "task": "solden.services.celery_tasks.reclaim_stale_events",
-                "schedule": 30.0,  # Every 30 seconds
-            },
             # Daily retention sweep for the agent_retry_jobs table.
             # Without this, the UNIQUE idempotency_key index grows for
             # the life of the deployment and lookups slow over time.
@@ -180,6 +177,13 @@ app.config_from_object(
                 "task": "solden.services.celery_tasks.deliver_due_report_subscriptions",
                 "schedule": _crontab(minute=15),
             },
+            # Policy replay runs whose partitions stopped reporting
+            # progress (worker lost, subtask dropped) are failed so the
+            # run page stops showing them as running.
+            "fail-stale-policy-replay-runs": {
+                "task": "solden.services.celery_tasks.fail_stale_policy_replay_runs",
+                "schedule": 10 * 60.0,
+            },
         },
     }
 )
@@ -7,16 +7,12 @@ planning engine with workspace concurrency enforcement.
 from __future__ import annotations
 
 import logging
-import os
-import socket
 
 from solden.core.org_utils import assert_org_id
 from solden.services.celery_app import app
 
 logger = logging.getLogger(__name__)
 
-_CONSUMER_NAME = f"worker-{socket.gethostname()}-{os.getpid()}"
-
 
 @app.task(bind=True, max_retries=3, default_retry_delay=5)
 def process_agent_event(self, event_data: dict) -> dict:
@@ -26,6 +22,25 @@ def process_agent_event(self, event_data: dict) -> dict:
     If at capacity, the task retries with 5-second backoff.
     §5: Event is dispatched to the planning engine for execution.
     """
+    result = handle_agent_event(event_data)
+    if result.get("status") == "at_capacity":
+        logger.info(
+            "[CeleryTask] Workspace %s at concurrency limit, retrying in 5s",
+            result.get("organization_id"),
+        )
+        raise self.retry(countdown=5)
+    return result
+
+
+def handle_agent_event(event_data: dict, redis_client=None) -> dict:
+    """Parse, admit and run one agent event; the body of
+    :func:`process_agent_event`, shared with the stream consumer.
+
+    Returns a result dict whose ``status`` is ``completed``,
+    ``failed``, ``poison_payload`` or ``at_capacity`` (no semaphore
+    slot — nothing ran; the caller decides how to retry).
+    ``redis_client`` is reused for the workspace semaphore.
+    """
     from solden.core.events import AgentEvent
     from solden.services.workspace_semaphore import WorkspaceSemaphore
 
@@ -71,13 +86,14 @@ def process_agent_event(self, event_data: dict) -> dict:
         pass
 
     # §11.2.2: Acquire workspace concurrency slot
-    semaphore = WorkspaceSemaphore(org_id)
+    semaphore = WorkspaceSemaphore(org_id, redis_client=redis_client)
     if not semaphore.acquire():
-        logger.info(
-            "[CeleryTask] Workspace %s at concurrency limit, retrying in 5s",
-            org_id,
-        )
-        raise self.retry(countdown=5)
+        return {
+            "event_id": event.id,
+            "event_type": event.type.value,
+            "organization_id": org_id,
+            "status": "at_capacity",
+        }
 
     try:
         result = _dispatch_event(event)
@@ -111,8 +127,8 @@ def _dispatch_event(event) -> dict:
     1. DeterministicPlanningEngine.plan(event, box_state) → Plan
     2. CoordinationEngine.execute(plan) → CoordinationResult
     """
-    import asyncio
     from solden.core.database import get_db
+    from solden.core.worker_loop import run_on_worker_loop
     from solden.core.planning_engine import get_planning_engine
     from solden.core.coordination_engine import CoordinationEngine
 
@@ -132,7 +148,7 @@ def _dispatch_event(event) -> dict:
 
     # §5: Coordination engine runs the Plan (mechanical, one action at a time)
     engine = CoordinationEngine(db, event.organization_id)
-    result = asyncio.run(engine.execute(plan))
+    result = run_on_worker_loop(engine.execute(plan))
 
     return result.to_dict()
 
@@ -209,46 +225,31 @@ def _load_box_state(event, db) -> dict:
 
 
 @app.task
-def drain_event_stream() -> dict:
-    """§2: Consume events from Redis Streams and dispatch to workers.
+def beat_heartbeat() -> dict:
+    """Write the Beat heartbeat key that the ops health endpoint reads —
+    if this stops ticking, Beat is dead.
 
-    Runs every 2 seconds via Celery Beat. Claims up to 10 events per
-    tick and dispatches each to a process_agent_event Celery task.
-    This is the ONLY consumer — Gmail webhooks and Slack callbacks
-    enqueue to the stream, this task drains it.
-
-    Also writes the Beat heartbeat key that the ops health endpoint
-    reads — if this stops ticking, Beat is dead.
+    Draining the event streams moved to the long-running
+    ``solden.services.event_stream_consumer`` service; this used to
+    piggy-back on the old ``drain_event_stream`` tick.
     """
+    from datetime import datetime, timezone
+
     from solden.core.event_queue import get_event_queue
 
     try:
         queue = get_event_queue()
-        # Beat heartbeat (cheap: one SET with TTL per tick, ~2s cadence).
-        try:
-            from datetime import datetime, timezone
-            queue._redis.set(
-                "clearledgr:beat:last-tick",
-                datetime.now(timezone.utc).isoformat(),
-                ex=300,  # expire after 5min so absence = dead
-            )
-        except Exception:
-            pass
-
-        dispatched = 0
-        for _ in range(10):  # Max 10 events per tick
-            claimed = queue.claim_next(_CONSUMER_NAME, block_ms=0)
-            if not claimed:
-                break
-            stream, entry_id, event = claimed
-            # Dispatch to Celery worker for processing
-            process_agent_event.delay(event.to_dict())
-            # Ack the stream entry — worker handles retries via Celery
-            queue.ack(stream, entry_id)
-            dispatched += 1
-        return {"status": "ok", "dispatched": dispatched}
+        redis_client = getattr(queue, "_redis", None)
+        if redis_client is None:
+            return {"status": "skipped", "reason": "no_redis"}
+        redis_client.set(
+            "clearledgr:beat:last-tick",
+            datetime.now(timezone.utc).isoformat(),
+            ex=300,  # expire after 5min so absence = dead
+        )
+        return {"status": "ok"}
     except Exception as exc:
-        logger.debug("[CeleryBeat] drain_event_stream: %s", exc)
+        logger.debug("[CeleryBeat] beat_heartbeat: %s", exc)
         return {"status": "error", "error": str(exc)}
 
 
@@ -266,14 +267,13 @@ def process_gmail_push(self, email_address: str, history_id: str) -> dict:
     calls `process_gmail_push.delay(email_address, history_id)` and
     returns 200 to Google. This Celery task picks it up, fetches the
     history, classifies messages, and enqueues per-message events
-    onto the same Redis stream that drain_event_stream consumes.
+    onto the same Redis stream that the event stream consumer drains.
     """
-    import asyncio
-
     from solden.api.gmail_webhooks import process_gmail_notification
+    from solden.core.worker_loop import run_on_worker_loop
 
     try:
-        asyncio.run(process_gmail_notification(email_address, history_id))
+        run_on_worker_loop(process_gmail_notification(email_address, history_id))
         return {
             "status": "completed",
             "email_address": email_address,
@@ -295,37 +295,26 @@ def fire_pending_timers() -> dict:
     """§4.3: Check for timer-fired events and enqueue them.
 
     Runs every 60 seconds via Celery Beat (vs old 15-min polling).
-    Checks: snooze reaper, override window reaper, vendor chases,
-    approval timeouts, ERP retry drain.
+    Fires due ``agent_timers`` rows (snooze expiry, ERP rechecks,
+    approval milestones) as TIMER_FIRED events, then runs the override
+    window reaper, ERP retry drain and back-pressure checks.
     """
-    import asyncio
+    from solden.core.worker_loop import run_on_worker_loop
+
     results = {}
 
-    # Snooze reaper
+    # Due agent timers — an index range scan on agent_timers.due_at,
+    # so the cost follows the number of due timers, not AP items or orgs.
     try:
-        from solden.services.agent_background import _reap_expired_snoozes
-        from solden.core.database import get_db
-        db = get_db()
-        db.initialize()
-        # Get all org IDs with active items
-        org_ids = []
-        try:
-            with db.connect() as conn:
-                cur = conn.cursor()
-                cur.execute("SELECT DISTINCT organization_id FROM ap_items WHERE state = 'snoozed' LIMIT 100")
-                org_ids = [r[0] for r in cur.fetchall()]
-        except Exception:
-            pass
-        if org_ids:
-            unsnoozed = asyncio.run(_reap_expired_snoozes(org_ids))
-            results["snooze_reaped"] = sum(len(v) for v in unsnoozed.values())
+        from solden.services.agent_timers import fire_due_timers
+        results["timers_fired"] = fire_due_timers()
     except Exception as exc:
-        results["snooze_error"] = str(exc)
+        results["timers_error"] = str(exc)
 
     # Override window reaper
     try:
         from solden.services.agent_background import reap_expired_override_windows
-        count = asyncio.run(reap_expired_override_windows())
+        count = run_on_worker_loop(reap_expired_override_windows())
         results["override_reaped"] = count
     except Exception as exc:
         results["override_error"] = str(exc)
@@ -333,7 +322,7 @@ def fire_pending_timers() -> dict:
     # ERP retry drain
     try:
         from solden.services.agent_background import _drain_erp_post_retry_queue
-        asyncio.run(_drain_erp_post_retry_queue())
+        run_on_worker_loop(_drain_erp_post_retry_queue())
         results["erp_retry_drained"] = True
     except Exception as exc:
         results["erp_retry_error"] = str(exc)
@@ -341,7 +330,7 @@ def fire_pending_timers() -> dict:
     # §11.2.4: Queue depth + workspace concurrency back-pressure monitoring
     try:
         from solden.services.agent_background import _check_queue_depth_and_concurrency
-        bp_result = asyncio.run(_check_queue_depth_and_concurrency())
+        bp_result = run_on_worker_loop(_check_queue_depth_and_concurrency())
         results["back_pressure"] = {
             "queue_pending": bp_result.get("queue_pending"),
             "queue_depth_sustained_min": bp_result.get("queue_depth_sustained_min"),
@@ -350,30 +339,6 @@ def fire_pending_timers() -> dict:
     except Exception as exc:
         results["back_pressure_error"] = str(exc)
 
-    # §12.2: Fire erp_recheck timers for paused items whose expected_by has passed
-    try:
-        from solden.services.agent_background import _fire_erp_recheck_timers
-        from solden.core.database import get_db
-        _db = get_db()
-        _db.initialize()
-        org_ids = []
-        try:
-            with _db.connect() as conn:
-                cur = conn.cursor()
-                cur.execute(
-                    "SELECT DISTINCT organization_id FROM ap_items "
-                    "WHERE waiting_condition IS NOT NULL LIMIT 100"
-                )
-                org_ids = [r[0] for r in cur.fetchall() if r[0]]
-        except Exception:
-            pass
-        total_fired = 0
-        for oid in org_ids:
-            total_fired += asyncio.run(_fire_erp_recheck_timers(oid))
-        results["erp_recheck_fired"] = total_fired
-    except Exception as exc:
-        results["erp_recheck_error"] = str(exc)
-
     return {"status": "ok", **results}
 
 
@@ -394,10 +359,11 @@ def reap_orphan_approval_dispatches_tick() -> dict:
     transient DB blip swallowed the next write); we don't need
     sub-minute recovery latency for the operator-noticeable case.
     """
-    import asyncio
+    from solden.core.worker_loop import run_on_worker_loop
+
     try:
         from solden.services.agent_background import reap_orphan_approval_dispatches
-        count = asyncio.run(reap_orphan_approval_dispatches())
+        count = run_on_worker_loop(reap_orphan_approval_dispatches())
         return {"status": "ok", "recovered": count}
     except Exception as exc:  # noqa: BLE001
         logger.error("[reap_orphan_approval_dispatches_tick] failed: %s", exc)
@@ -431,36 +397,17 @@ def reap_override_windows_tick() -> dict:
     sweeps; if Celery beat dies, FastAPI still sweeps. Both call
     the same idempotent reaper so concurrent execution is safe.
     """
-    import asyncio
+    from solden.core.worker_loop import run_on_worker_loop
+
     try:
         from solden.services.agent_background import reap_expired_override_windows
-        count = asyncio.run(reap_expired_override_windows())
+        count = run_on_worker_loop(reap_expired_override_windows())
         return {"status": "ok", "reaped": count}
     except Exception as exc:  # noqa: BLE001
         logger.error("[reap_override_windows_tick] failed: %s", exc)
         return {"status": "error", "error": str(exc)}
 
 
-@app.task
-def reclaim_stale_events() -> dict:
-    """§12.1: Reclaim events from dead workers.
-
-    Runs every 30 seconds. Takes over events that have been pending
-    longer than the visibility timeout (60s).
-    """
-    from solden.core.event_queue import get_event_queue
-
-    try:
-        queue = get_event_queue()
-        reclaimed = queue.reclaim_stale(_CONSUMER_NAME)
-        for stream, entry_id, event in reclaimed:
-            process_agent_event.delay(event.to_dict())
-        return {"status": "ok", "reclaimed": len(reclaimed)}
-    except Exception as exc:
-        logger.error("[CeleryBeat] reclaim_stale_events failed: %s", exc)
-        return {"status": "error", "error": str(exc)}
-
-
 @app.task
 def purge_soft_deleted_orgs() -> dict:
     """Hard-purge tenant data for orgs past their legal-hold window.
@@ -753,8 +700,8 @@ def poll_sap_b1_payments_all_orgs() -> dict:
     events at the (org, source, payment_id, ap_item_id) compound
     key, so a missed-then-recovered run never double-records.
     """
-    import asyncio
     from solden.core.database import get_db
+    from solden.core.worker_loop import run_on_worker_loop
     from solden.services.erp_payment_dispatcher import (
         poll_sap_b1_payments,
     )
@@ -785,7 +732,7 @@ def poll_sap_b1_payments_all_orgs() -> dict:
 
     for org_id in org_ids:
         try:
-            result = asyncio.run(
+            result = run_on_worker_loop(
                 poll_sap_b1_payments(organization_id=org_id, db=db),
             )
         except Exception as exc:
@@ -895,8 +842,8 @@ def deliver_audit_webhook(
     using the exponential backoff schedule above.
     """
     from solden.core.database import get_db
+    from solden.core.worker_loop import run_on_worker_loop
     from solden.services.webhook_delivery import deliver_webhook
-    import asyncio
     import time as _time
 
     db = get_db()
@@ -927,14 +874,12 @@ def deliver_audit_webhook(
         "organization_id": organization_id,
     }
 
-    # Deliver. ``deliver_webhook`` is async, so spin a loop just for
-    # this call. Each Celery worker invocation is its own thread,
-    # so a fresh loop is safe + cheap.
+    # Deliver. ``deliver_webhook`` is async; run it on this worker
+    # thread's persistent loop so repeat deliveries to the same
+    # endpoint reuse the pooled connection.
     started_ms = int(_time.time() * 1000)
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        ok = loop.run_until_complete(
+        ok = run_on_worker_loop(
             deliver_webhook(
                 url=url,
                 event_type=event_type,
@@ -943,7 +888,6 @@ def deliver_audit_webhook(
                 webhook_id=f"audit_{audit_event_id}_{webhook_subscription_id}",
             )
         )
-        loop.close()
         duration_ms = int(_time.time() * 1000) - started_ms
         status = "success" if ok else "failed"
         error_message = None if ok else "delivery_returned_false"
@@ -1213,6 +1157,79 @@ def generate_audit_export(self, export_id: str) -> dict:
         raise self.retry(exc=exc, countdown=10, max_retries=2) from exc
 
 
+# ---------------------------------------------------------------------------
+# Policy replay runs — full-history replay of a policy version.
+#
+# Queued by ``POST /api/policies/replay/runs`` (policy_replay_runs row,
+# migration v109). ``run_policy_replay`` claims the run and fans its
+# keyset partitions (migration v111) out as ``replay_policy_partition``
+# subtasks, so a large window spreads over the worker fleet. The work,
+# progress updates and failure handling live in ``PolicyService``;
+# these are the thin Celery wrappers.
+# ---------------------------------------------------------------------------
+
+@app.task(bind=True, max_retries=0)
+def run_policy_replay(self, run_id: str, organization_id: str) -> dict:
+    """Claim one queued policy replay run and dispatch its partitions.
+
+    Not retried: a run that fails is marked 'failed' on its row and the
+    operator re-queues it. A redelivered task loses the atomic
+    queued→running claim and dispatches nothing.
+    """
+    from solden.services.policy_service import PolicyService
+
+    org_id = assert_org_id(organization_id, context="run_policy_replay")
+    service = PolicyService(organization_id=org_id)
+    partitions = service.start_replay_run(run_id)
+    try:
+        for index in partitions:
+            replay_policy_partition.delay(run_id, org_id, index)
+    except Exception as exc:
+        logger.exception("[run_policy_replay] dispatch failed for run %s: %s", run_id, exc)
+        service.mark_replay_run_failed(run_id, f"dispatch_failed: {exc}")
+    run = service.get_replay_run(run_id)
+    if run is None:
+        logger.warning("[run_policy_replay] run %s not found", run_id)
+        return {"status": "skipped", "run_id": run_id, "reason": "not_found"}
+    return {
+        "status": run.get("status"),
+        "run_id": run_id,
+        "partitions": len(partitions),
+    }
+
+
+@app.task(bind=True, max_retries=0)
+def replay_policy_partition(self, run_id: str, organization_id: str, index: int) -> dict:
+    """Replay one keyset partition of a running replay run.
+
+    Not retried: a failing partition fails the run. A redelivered task
+    finds the partition past 'queued' and returns without re-running.
+    """
+    from solden.services.policy_service import PolicyService
+
+    org_id = assert_org_id(organization_id, context="replay_policy_partition")
+    PolicyService(organization_id=org_id).run_replay_partition(run_id, int(index))
+    return {"status": "ok", "run_id": run_id, "partition": int(index)}
+
+
+@app.task
+def fail_stale_policy_replay_runs() -> dict:
+    """Fail replay runs stuck in 'running' without progress.
+
+    Threshold: ``POLICY_REPLAY_STALE_SECONDS`` (default 1800).
+    """
+    import os
+    from solden.services.policy_service import REPLAY_STALE_SECONDS, fail_stale_replay_runs
+
+    try:
+        seconds = int(os.getenv("POLICY_REPLAY_STALE_SECONDS", str(REPLAY_STALE_SECONDS)))
+        failed = fail_stale_replay_runs(stale_after_seconds=seconds)
+        return {"status": "ok", "failed": failed, "stale_after_seconds": seconds}
+    except Exception as exc:
+        logger.error("[CeleryBeat] fail_stale_policy_replay_runs failed: %s", exc)
+        return {"status": "error", "error": str(exc)}
+
+
 # ---------------------------------------------------------------------------
 # Module 8 — scheduled report email delivery.
 #
@@ -18,10 +18,10 @@ from typing import Any, Dict, List, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
-import re
-
 from solden.core.database import get_db
 from solden.core.org_utils import assert_org_id
+from solden.core.stores.invoice_fingerprint_store import normalize_invoice_number
+from solden.services.fuzzy_matching import normalize_vendor
 
 logger = logging.getLogger(__name__)
 
@@ -141,12 +141,31 @@ Return ONLY valid JSON."""
         return flagged
 
 
-def _normalize_invoice_number(raw: str) -> str:
-    """Normalize invoice number for comparison: lowercase, strip whitespace and common prefixes."""
-    val = str(raw or "").strip().lower()
-    val = val.lstrip("#")
-    val = re.sub(r"^inv(?:oice)?[-\s]*", "", val)
-    return val.strip()
+# Same normalization the fingerprint index blocks on.
+_normalize_invoice_number = normalize_invoice_number
+
+
+def _indexed_candidate(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a fingerprint-index candidate like a vendor history row.
+
+    Its date is the invoice date (``created_at`` when the invoice
+    carried none) — the date the index blocked on.
+    """
+    return {
+        "id": row.get("id"),
+        "ap_item_id": row.get("id"),
+        "gmail_id": row.get("message_id") or row.get("id"),
+        # save_invoice_status intake stores the source message id here
+        # and leaves message_id empty.
+        "thread_id": row.get("thread_id"),
+        "vendor_name": row.get("vendor_name"),
+        "vendor_key": row.get("vendor_key"),
+        "invoice_number": row.get("invoice_number"),
+        "amount": row.get("amount") or 0,
+        "currency": row.get("currency"),
+        "created_at": row.get("invoice_date") or row.get("created_at"),
+        "state": row.get("state"),
+    }
 
 
 @dataclass
@@ -279,11 +298,14 @@ class CrossInvoiceAnalyzer:
         invoice_date: Optional[str] = None,
         currency: str = "USD",
         gmail_id: Optional[str] = None,  # Exclude self from duplicate check
+        ap_item_id: Optional[str] = None,  # Exclude self once it is saved
     ) -> CrossInvoiceAnalysis:
         """
         Perform cross-invoice analysis.
         
         Returns analysis with duplicates, anomalies, and recommendations.
+        Pass ``ap_item_id`` when the invoice already has an AP item: it is
+        in the fingerprint index by then and would match itself.
         """
         duplicates = []
         anomalies = []
@@ -301,6 +323,7 @@ class CrossInvoiceAnalyzer:
             recent_invoices=recent_invoices,
             exclude_gmail_id=gmail_id,
             currency=currency,
+            exclude_ap_item_id=ap_item_id,
         )
         duplicates.extend(duplicate_alerts)
         
@@ -352,6 +375,25 @@ class CrossInvoiceAnalyzer:
             logger.warning(f"Failed to get recent invoices: {e}")
             return []
     
+    def _indexed_duplicate_candidates(
+        self, invoices: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """Fingerprint-index candidates for each invoice, in one query."""
+        empty: List[List[Dict[str, Any]]] = [[] for _ in invoices]
+        if not invoices or not hasattr(self.db, "find_invoice_duplicate_candidates"):
+            return empty
+        try:
+            found = self.db.find_invoice_duplicate_candidates(self.organization_id, invoices)
+        except Exception as e:
+            logger.warning(f"Duplicate index lookup failed: {e}")
+            return empty
+        if not isinstance(found, list) or len(found) != len(invoices):
+            return empty
+        return [
+            [_indexed_candidate(row) for row in rows] if isinstance(rows, list) else []
+            for rows in found
+        ]
+
     def _check_duplicates(
         self,
         vendor: str,
@@ -361,15 +403,111 @@ class CrossInvoiceAnalyzer:
         recent_invoices: List[Dict[str, Any]],
         exclude_gmail_id: Optional[str] = None,
         currency: str = "USD",
+        exclude_ap_item_id: Optional[str] = None,
     ) -> List[DuplicateAlert]:
-        """Check for potential duplicate invoices."""
+        """Check for potential duplicate invoices.
+
+        Scores the vendor's recent history plus whatever the org-wide
+        fingerprint index returns for this invoice — which catches
+        vendor-name variants and duplicates older than the history
+        window.
+        """
+        indexed = self._indexed_duplicate_candidates([{
+            "vendor_name": vendor,
+            "amount": amount,
+            "currency": currency,
+            "invoice_number": invoice_number,
+            "invoice_date": invoice_date,
+        }])[0]
+        top_duplicates = self._score_duplicate_candidates(
+            vendor=vendor,
+            amount=amount,
+            invoice_number=invoice_number,
+            invoice_date=invoice_date,
+            candidates=list(recent_invoices) + indexed,
+            exclude_gmail_id=exclude_gmail_id,
+            currency=currency,
+            exclude_ap_item_id=exclude_ap_item_id,
+        )
+
+        # AI reasoning: ask the model to evaluate flagged duplicates
+        if top_duplicates:
+            top_duplicates = _ai_evaluate_duplicates(
+                current_vendor=vendor,
+                current_amount=amount,
+                current_invoice_number=invoice_number,
+                current_date=invoice_date,
+                flagged=top_duplicates,
+            )
+
+        return top_duplicates
+
+    def check_duplicates_many(
+        self, invoices: List[Dict[str, Any]]
+    ) -> List[List[DuplicateAlert]]:
+        """Deterministic duplicate check for a batch of invoices.
+
+        For bulk imports: one fingerprint-index query for the whole
+        batch, scored the same way as :meth:`analyze`, without the
+        per-vendor history fetch or the model evaluation. Each invoice
+        is a dict with ``vendor``, ``amount`` and optionally
+        ``invoice_number``, ``invoice_date``, ``currency``, ``gmail_id``
+        and ``ap_item_id``. Returns one alert list per invoice, in order.
+        """
+        probes = [
+            {
+                "vendor_name": inv.get("vendor") or "",
+                "amount": inv.get("amount") or 0,
+                "currency": inv.get("currency") or "USD",
+                "invoice_number": inv.get("invoice_number"),
+                "invoice_date": inv.get("invoice_date"),
+            }
+            for inv in invoices
+        ]
+        indexed = self._indexed_duplicate_candidates(probes)
+        return [
+            self._score_duplicate_candidates(
+                vendor=probe["vendor_name"],
+                amount=float(probe["amount"] or 0),
+                invoice_number=probe["invoice_number"],
+                invoice_date=probe["invoice_date"],
+                candidates=candidates,
+                exclude_gmail_id=inv.get("gmail_id"),
+                currency=probe["currency"],
+                exclude_ap_item_id=inv.get("ap_item_id"),
+            )
+            for inv, probe, candidates in zip(invoices, probes, indexed)
+        ]
+
+    def _score_duplicate_candidates(
+        self,
+        vendor: str,
+        amount: float,
+        invoice_number: Optional[str],
+        invoice_date: Optional[str],
+        candidates: List[Dict[str, Any]],
+        exclude_gmail_id: Optional[str] = None,
+        currency: str = "USD",
+        exclude_ap_item_id: Optional[str] = None,
+    ) -> List[DuplicateAlert]:
+        """Score candidates against the invoice; top 3 at score >= 0.5."""
         duplicates = []
         current_currency = str(currency or "USD").strip().upper()
+        vendor_key = normalize_vendor(vendor or "")
+        seen_items = set()
 
-        for inv in recent_invoices:
+        for inv in candidates:
             # Skip self
-            if exclude_gmail_id and inv.get("gmail_id") == exclude_gmail_id:
+            if exclude_gmail_id and exclude_gmail_id in (inv.get("gmail_id"), inv.get("thread_id")):
+                continue
+            # History rows and index rows can name the same AP item.
+            item_id = inv.get("ap_item_id")
+            if exclude_ap_item_id and item_id == exclude_ap_item_id:
                 continue
+            if item_id:
+                if item_id in seen_items:
+                    continue
+                seen_items.add(item_id)
 
             match_score = 0.0
             match_reasons = []
@@ -377,8 +515,10 @@ class CrossInvoiceAnalyzer:
             # Check invoice number match (strongest signal) — normalized
             # comparison. Currency-independent: "INV-1234" is the same
             # invoice regardless of what currency it's quoted in.
+            number_match = False
             if invoice_number and inv.get("invoice_number"):
                 if _normalize_invoice_number(invoice_number) == _normalize_invoice_number(inv.get("invoice_number", "")):
+                    number_match = True
                     match_score += 0.5
                     match_reasons.append("Same invoice number")
 
@@ -387,6 +527,7 @@ class CrossInvoiceAnalyzer:
             # would generate false positives for international AP.
             inv_currency = str(inv.get("currency") or "USD").strip().upper()
             inv_amount = inv.get("amount", 0)
+            amount_match = False
             if (
                 inv_amount > 0
                 and amount > 0
@@ -394,12 +535,22 @@ class CrossInvoiceAnalyzer:
             ):
                 amount_diff = abs(amount - inv_amount) / max(amount, inv_amount)
                 if amount_diff <= self.DUPLICATE_AMOUNT_TOLERANCE:
+                    amount_match = True
                     match_score += 0.3
                     # Use the real currency symbol where we can; default
                     # "$" is fine as a fallback for unknown codes.
                     sym = {"USD": "$", "EUR": "€", "GBP": "£"}.get(current_currency, f"{current_currency} ")
                     match_reasons.append(f"Same amount ({sym}{amount:,.2f})")
-            
+
+            # An index candidate filed under a different vendor only
+            # counts when both the number and the amount agree — a bare
+            # "INV-1001" is shared by half the vendors in an org.
+            inv_vendor_key = inv.get("vendor_key")
+            if inv_vendor_key is not None and inv_vendor_key != vendor_key:
+                if not (number_match and amount_match):
+                    continue
+                match_reasons.append(f"Filed under vendor '{inv.get('vendor_name') or ''}'")
+
             # Check date proximity
             if invoice_date and inv.get("created_at"):
                 try:
@@ -434,19 +585,7 @@ class CrossInvoiceAnalyzer:
         
         # Sort by match score
         duplicates.sort(key=lambda d: d.match_score, reverse=True)
-        top_duplicates = duplicates[:3]
-
-        # AI reasoning: ask the model to evaluate flagged duplicates
-        if top_duplicates:
-            top_duplicates = _ai_evaluate_duplicates(
-                current_vendor=vendor,
-                current_amount=amount,
-                current_invoice_number=invoice_number,
-                current_date=invoice_date,
-                flagged=top_duplicates,
-            )
-
-        return top_duplicates
+        return duplicates[:3]
     
     def _check_anomalies(
         self,
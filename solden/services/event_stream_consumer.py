@@ -0,0 +1,375 @@
+"""Event Stream Consumer — Agent Design Specification §2 + §11.2 + §12.1.
+
+Long-running consumer for the Redis Streams event queue. Replaces the
+old ``drain_event_stream`` Beat task, which claimed at most 10 entries
+per 2s tick (one ``XREADGROUP count=1`` each) and acked every entry
+before ``process_agent_event`` had run — so intake topped out around
+5 events/sec and a crashed worker silently lost whatever it held.
+
+Here each node:
+
+* claims in batches (:meth:`RedisEventQueue.claim_batch`), high_priority
+  first, blocking on both streams only while it has nothing else to do;
+* runs events on a thread pool, at most ``max_in_flight`` at once, in
+  claim order (so high_priority starts first). Each pool thread keeps
+  one persistent event loop (:mod:`solden.core.worker_loop`), so the
+  HTTP pools behind Gmail, the ERPs and the model API stay warm;
+* acks an entry only after the coordination engine has finished with it
+  — one ``XACK`` per stream per loop turn. A crash leaves the entry
+  pending, and :meth:`RedisEventQueue.reclaim_stale` on any node feeds
+  it back into the same pipeline once the visibility timeout passes;
+* keeps a workspace at its concurrency limit waiting locally (the entry
+  stays pending, its idle time refreshed) instead of acking and
+  re-adding it. At most ``max_deferred`` wait at once; past that an
+  entry is released — left pending, untouched — for reclaim to retry;
+* counts deliveries (claims and reclaims) per entry on this node and
+  moves an entry that keeps coming back — a handler that raises, or a
+  workspace that never frees up — to the dead-letter stream after
+  ``MAX_DELIVERIES``.
+
+Run with ``python -m solden.services.event_stream_consumer``. Several
+replicas can share the consumer group; each names itself after its
+host and pid.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from solden.core.event_queue import _VISIBILITY_TIMEOUT_MS, get_event_queue
+from solden.core.events import AgentEvent
+
+logger = logging.getLogger(__name__)
+
+Claimed = Tuple[str, str, AgentEvent]
+
+
+def _default_consumer_name() -> str:
+    return f"consumer-{socket.gethostname()}-{os.getpid()}"
+
+
+def _default_handler(event_data: dict, redis_client: Any = None) -> dict:
+    from solden.services.celery_tasks import handle_agent_event
+
+    return handle_agent_event(event_data, redis_client=redis_client)
+
+
+class EventStreamConsumer:
+    """Batched, ack-after-processing consumer of the agent event streams.
+
+    ``handler`` takes ``(event_data, redis_client=...)`` and returns a
+    result dict (see :func:`celery_tasks.handle_agent_event`). Every
+    status except ``at_capacity`` settles the entry; ``at_capacity``
+    retries it after ``CAPACITY_RETRY_SECONDS``. A handler that raises
+    leaves the entry pending for reclaim. An entry delivered more than
+    ``MAX_DELIVERIES`` times is dead-lettered instead of run again.
+    """
+
+    BATCH_SIZE = 64
+    MAX_IN_FLIGHT = 32
+    # How long an idle node blocks in XREADGROUP before re-checking
+    # reclaim / stop.
+    BLOCK_MS = 2000
+    # With events in flight the loop never blocks in Redis; it waits on
+    # completions for at most this long before polling again.
+    BUSY_POLL_SECONDS = 0.05
+    RECLAIM_INTERVAL_SECONDS = 30.0
+    # Refresh the idle time of held entries well inside the visibility
+    # timeout so another node doesn't reclaim work still in progress.
+    TOUCH_INTERVAL_SECONDS = _VISIBILITY_TIMEOUT_MS / 1000 / 3
+    CAPACITY_RETRY_SECONDS = 5.0
+    # Bound on entries waiting locally for their workspace; overflow
+    # goes back to Redis for reclaim.
+    MAX_DEFERRED = 256
+    # Deliveries (claim or reclaim) before an entry is dead-lettered.
+    # Counted per node, so across N nodes an entry can run up to N times
+    # this before one of them gives up on it.
+    MAX_DELIVERIES = 5
+    # Delivery counts kept for entries that left this node unsettled
+    # (raised or released); the oldest are forgotten first.
+    DELIVERY_TRACKING_LIMIT = 10_000
+    METRICS_LOG_INTERVAL_SECONDS = 60.0
+
+    def __init__(
+        self,
+        queue: Any = None,
+        *,
+        consumer_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        block_ms: Optional[int] = None,
+        max_deferred: Optional[int] = None,
+        handler: Any = None,
+    ) -> None:
+        self.queue = queue if queue is not None else get_event_queue()
+        self.consumer_name = consumer_name or _default_consumer_name()
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.max_in_flight = max_in_flight or self.MAX_IN_FLIGHT
+        self.block_ms = self.BLOCK_MS if block_ms is None else block_ms
+        self.max_deferred = max_deferred or self.MAX_DEFERRED
+        self.handler = handler or _default_handler
+        self._redis = getattr(self.queue, "_redis", None)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="event-consumer",
+        )
+        self._in_flight: Dict[Future, Claimed] = {}
+        # (due_monotonic, seq, claimed) — entries whose workspace was at
+        # its concurrency limit.
+        self._deferred: List[Tuple[float, int, Claimed]] = []
+        self._seq = 0
+        # (stream, entry_id) -> deliveries seen here, oldest first.
+        self._deliveries: Dict[Tuple[str, str], int] = {}
+        self._acks: Dict[str, List[str]] = {}
+        self._stop = threading.Event()
+        self.stats: Dict[str, int] = {
+            "claimed": 0, "reclaimed": 0, "completed": 0, "failed": 0,
+            "poison": 0, "deferred": 0, "released": 0, "errors": 0,
+            "dead_lettered": 0, "acked": 0,
+        }
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # -- pipeline ----------------------------------------------------
+
+    def _free_slots(self) -> int:
+        return self.max_in_flight - len(self._in_flight)
+
+    def _submit(self, claimed: Claimed) -> None:
+        _stream, _entry_id, event = claimed
+        future = self._executor.submit(
+            self.handler, event.to_dict(), redis_client=self._redis,
+        )
+        self._in_flight[future] = claimed
+
+    def _submit_due_deferred(self, now: float) -> None:
+        while self._deferred and self._deferred[0][0] <= now and self._free_slots() > 0:
+            _due, _seq, claimed = heapq.heappop(self._deferred)
+            self._submit(claimed)
+
+    def _count_delivery(self, claimed: Claimed) -> int:
+        key = (claimed[0], claimed[1])
+        count = self._deliveries.pop(key, 0) + 1
+        self._deliveries[key] = count
+        while len(self._deliveries) > self.DELIVERY_TRACKING_LIMIT:
+            del self._deliveries[next(iter(self._deliveries))]
+        return count
+
+    def _dead_letter(self, claimed: Claimed, deliveries: int) -> None:
+        stream, entry_id, event = claimed
+        try:
+            self.queue.dead_letter(stream, entry_id, event, f"max_deliveries:{deliveries}")
+        except Exception as exc:
+            # Still pending; the next reclaim brings it back here.
+            logger.warning("[EventConsumer] Dead-letter of %s on %s failed: %s", entry_id, stream, exc)
+            return
+        self._deliveries.pop((stream, entry_id), None)
+        self.stats["dead_lettered"] += 1
+
+    def _admit(self, incoming: List[Claimed]) -> int:
+        """Submit freshly claimed or reclaimed entries, dead-lettering
+        any past ``MAX_DELIVERIES``. Returns the number submitted."""
+        submitted = 0
+        for claimed in incoming:
+            deliveries = self._count_delivery(claimed)
+            if deliveries > self.MAX_DELIVERIES:
+                self._dead_letter(claimed, deliveries)
+                continue
+            self._submit(claimed)
+            submitted += 1
+        return submitted
+
+    def _defer(self, claimed: Claimed) -> None:
+        if len(self._deferred) >= self.max_deferred:
+            # Not touched from here on, so it goes stale and comes back
+            # through reclaim, counted as another delivery.
+            self.stats["released"] += 1
+            return
+        self._seq += 1
+        heapq.heappush(
+            self._deferred,
+            (time.monotonic() + self.CAPACITY_RETRY_SECONDS, self._seq, claimed),
+        )
+        self.stats["deferred"] += 1
+
+    def _settle(self, done) -> None:
+        for future in done:
+            claimed = self._in_flight.pop(future)
+            stream, entry_id, event = claimed
+            try:
+                result = future.result() or {}
+            except Exception as exc:
+                # Leave it pending: reclaim retries it after the
+                # visibility timeout, on this node or another.
+                logger.error(
+                    "[EventConsumer] Event %s (%s) raised, left for reclaim: %s",
+                    event.id, entry_id, exc,
+                )
+                self.stats["errors"] += 1
+                continue
+            status = result.get("status")
+            if status == "at_capacity":
+                self._defer(claimed)
+                continue
+            if status == "poison_payload":
+                self.stats["poison"] += 1
+            elif status == "failed":
+                self.stats["failed"] += 1
+            else:
+                self.stats["completed"] += 1
+            self._deliveries.pop((stream, entry_id), None)
+            self._acks.setdefault(stream, []).append(entry_id)
+
+    def _flush_acks(self) -> None:
+        for stream, entry_ids in list(self._acks.items()):
+            try:
+                self.queue.ack_many(stream, entry_ids)
+            except Exception as exc:
+                # Kept for the next turn; if this node dies first the
+                # entries are reclaimed and re-run elsewhere.
+                logger.warning("[EventConsumer] XACK of %d on %s failed: %s", len(entry_ids), stream, exc)
+                continue
+            self.stats["acked"] += len(entry_ids)
+            del self._acks[stream]
+
+    def _held_by_stream(self) -> Dict[str, List[str]]:
+        held: Dict[str, List[str]] = {}
+        claims = list(self._in_flight.values()) + [c for _, _, c in self._deferred]
+        for stream, entry_id, _event in claims:
+            held.setdefault(stream, []).append(entry_id)
+        return held
+
+    def _touch_held(self) -> None:
+        for stream, entry_ids in self._held_by_stream().items():
+            try:
+                self.queue.touch(stream, self.consumer_name, entry_ids)
+            except Exception as exc:
+                logger.debug("[EventConsumer] Touch on %s failed: %s", stream, exc)
+
+    def _claim(self) -> List[Claimed]:
+        want = min(self.batch_size, self._free_slots())
+        if want <= 0:
+            return []
+        # Only block in Redis when there's nothing to settle or retry.
+        idle = not self._in_flight and not self._deferred
+        claimed = self.queue.claim_batch(
+            self.consumer_name, count=want, block_ms=self.block_ms if idle else 0,
+        )
+        self.stats["claimed"] += len(claimed)
+        return claimed
+
+    def _reclaim(self) -> List[Claimed]:
+        try:
+            reclaimed = self.queue.reclaim_stale(self.consumer_name, count=self.batch_size)
+        except Exception as exc:
+            logger.warning("[EventConsumer] Reclaim failed: %s", exc)
+            return []
+        # Our own long-running entries are touched well before they go
+        # stale, but never run one twice on the same node.
+        held = {(stream, entry_id) for stream, ids in self._held_by_stream().items() for entry_id in ids}
+        reclaimed = [c for c in reclaimed if (c[0], c[1]) not in held]
+        self.stats["reclaimed"] += len(reclaimed)
+        return reclaimed
+
+    def run_once(self, *, reclaim: bool = False) -> int:
+        """One loop turn: settle finished work, ack it, feed the pool.
+
+        Returns the number of entries newly submitted.
+        """
+        timeout = self.BUSY_POLL_SECONDS if self._in_flight else 0
+        if self._in_flight:
+            done, _ = wait(list(self._in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+            self._settle(done)
+        self._flush_acks()
+
+        submitted = 0
+        now = time.monotonic()
+        before = len(self._in_flight)
+        self._submit_due_deferred(now)
+        submitted += len(self._in_flight) - before
+
+        incoming: List[Claimed] = self._reclaim() if reclaim else []
+        incoming.extend(self._claim())
+        submitted += self._admit(incoming)
+
+        if not self._in_flight and self._deferred and not incoming:
+            # Only capacity-deferred work left: sleep until it's due.
+            self._stop.wait(max(0.0, min(self._deferred[0][0] - time.monotonic(), 1.0)))
+        return submitted
+
+    def drain(self, timeout: float = 30.0) -> None:
+        """Finish and ack everything in flight (deferred entries stay
+        pending for reclaim)."""
+        deadline = time.monotonic() + timeout
+        while self._in_flight and time.monotonic() < deadline:
+            done, _ = wait(
+                list(self._in_flight),
+                timeout=max(0.0, deadline - time.monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+            self._settle(done)
+        self._flush_acks()
+
+    def run_forever(self) -> None:
+        logger.info(
+            "[EventConsumer] %s started (batch=%d, in_flight=%d)",
+            self.consumer_name, self.batch_size, self.max_in_flight,
+        )
+        now = time.monotonic()
+        # Reclaim on startup: this is when a crashed predecessor's
+        # entries are most likely waiting.
+        next_reclaim = now
+        next_touch = now + self.TOUCH_INTERVAL_SECONDS
+        next_metrics_log = now + self.METRICS_LOG_INTERVAL_SECONDS
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                reclaim = now >= next_reclaim
+                if reclaim:
+                    next_reclaim = now + self.RECLAIM_INTERVAL_SECONDS
+                try:
+                    if not self.run_once(reclaim=reclaim) and not self._in_flight:
+                        # Backends without blocking reads (the in-memory
+                        # fallback) would otherwise spin.
+                        self._stop.wait(self.BUSY_POLL_SECONDS)
+                except Exception as exc:
+                    logger.error("[EventConsumer] Loop error: %s", exc)
+                    self._stop.wait(1.0)
+                if now >= next_touch:
+                    next_touch = now + self.TOUCH_INTERVAL_SECONDS
+                    self._touch_held()
+                if now >= next_metrics_log:
+                    next_metrics_log = now + self.METRICS_LOG_INTERVAL_SECONDS
+                    logger.info(
+                        "[EventConsumer] %s in_flight=%d deferred=%d %s",
+                        self.consumer_name, len(self._in_flight), len(self._deferred), self.stats,
+                    )
+        finally:
+            self.drain()
+            self._executor.shutdown(wait=True)
+            logger.info("[EventConsumer] %s stopped %s", self.consumer_name, self.stats)
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+    )
+    consumer = EventStreamConsumer(
+        batch_size=int(os.environ.get("EVENT_CONSUMER_BATCH_SIZE", "0") or 0) or None,
+        max_in_flight=int(os.environ.get("EVENT_CONSUMER_CONCURRENCY", "0") or 0) or None,
+    )
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: consumer.stop())
+    consumer.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ Provides intelligent matching beyond exact/tolerance comparisons:
 """
 import logging
 import unicodedata
-from typing import Dict, List, Optional, Tuple
+from typing import AbstractSet, Any, Dict, List, Optional, Sequence, Tuple, Union
 import re
 from difflib import SequenceMatcher
 
@@ -212,9 +212,25 @@ def vendor_similarity_modes(vendor1: str, vendor2: str) -> Dict[str, float]:
             "sequence": 0.0, "levenshtein": 0.0, "trigram": 0.0,
         }
 
-    norm1 = normalize_vendor(vendor1)
-    norm2 = normalize_vendor(vendor2)
+    return vendor_similarity_modes_normalized(
+        normalize_vendor(vendor1), normalize_vendor(vendor2),
+    )
+
 
+def vendor_similarity_modes_normalized(
+    norm1: str,
+    norm2: str,
+    trigrams1: Optional[AbstractSet[str]] = None,
+    trigrams2: Optional[AbstractSet[str]] = None,
+) -> Dict[str, float]:
+    """:func:`vendor_similarity_modes` over already-normalized names.
+
+    Index-backed search (``services/vendor_name_index.py``) normalizes
+    and trigram-encodes every vendor once at index time; passing those
+    here skips re-running :func:`normalize_vendor` and
+    :func:`_trigrams` on every comparison. Scores are identical to the
+    raw-name entry point.
+    """
     if norm1 == norm2:
         return {
             "exact": 1.0, "containment": 1.0, "jaccard": 1.0,
@@ -244,7 +260,13 @@ def vendor_similarity_modes(vendor1: str, vendor2: str) -> Dict[str, float]:
 
     sequence = SequenceMatcher(None, norm1, norm2).ratio()
     lev = levenshtein_ratio(norm1, norm2)
-    tg = trigram_jaccard(norm1, norm2)
+    if trigrams1 is None or trigrams2 is None:
+        tg = trigram_jaccard(norm1, norm2)
+    elif not trigrams1 or not trigrams2:
+        tg = 0.0
+    else:
+        inter = len(trigrams1 & trigrams2)
+        tg = inter / (len(trigrams1) + len(trigrams2) - inter)
 
     return {
         "exact": 0.0,
@@ -256,6 +278,220 @@ def vendor_similarity_modes(vendor1: str, vendor2: str) -> Dict[str, float]:
     }
 
 
+# ─── Batch scoring ─────────────────────────────────────────────────
+#
+# Scoring one query against many names with the scalar functions
+# re-normalizes both sides per pair and runs O(len²) pure-Python
+# Levenshtein. The batch path normalizes / encodes the corpus once,
+# gets trigram and token overlaps for the whole corpus from inverted
+# postings (a sparse matrix-vector product: one pass over the
+# postings of the query's terms instead of one set intersection per
+# name), and computes edit distance with a bit-parallel kernel that
+# processes a whole column of the DP table per machine-word op. Every
+# score is computed from the same integers as the scalar path, so the
+# floats are bit-identical.
+
+_ZERO_MODES = {
+    "exact": 0.0, "containment": 0.0, "jaccard": 0.0,
+    "sequence": 0.0, "levenshtein": 0.0, "trigram": 0.0,
+}
+_EXACT_MODES = {
+    "exact": 1.0, "containment": 1.0, "jaccard": 1.0,
+    "sequence": 1.0, "levenshtein": 1.0, "trigram": 1.0,
+}
+
+# Below this many names, per-name C-level set intersections beat
+# building postings.
+_POSTINGS_MIN_NAMES = 64
+
+
+def _bitparallel_pattern(pattern: str) -> Dict[str, int]:
+    """Per-character position bitmasks of ``pattern`` (bit i set where
+    ``pattern[i] == ch``) for :func:`_levenshtein_bitparallel`."""
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _levenshtein_bitparallel(peq: Dict[str, int], m: int, text: str) -> int:
+    """Edit distance between the ``m``-char pattern encoded in ``peq``
+    and ``text`` (Myers 1999 / Hyyrö 2001 bit-vector algorithm).
+
+    Each DP column is held as vertical +1/-1 delta bit-vectors, so a
+    text character costs a fixed handful of integer ops regardless of
+    the pattern length (Python ints are arbitrary width, so patterns
+    past 64 chars need no blocking). Exact: same distance as
+    :func:`levenshtein_distance`.
+    """
+    if not m:
+        return len(text)
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    vp, vn, score = full, 0, m
+    for ch in text:
+        eq = peq.get(ch, 0)
+        xv = eq | vn
+        xh = ((((eq & vp) + vp) & full) ^ vp) | eq
+        ph = vn | (~(xh | vp) & full)
+        mh = vp & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        vp = mh | (~(xv | ph) & full)
+        vn = ph & xv
+    return score
+
+
+class EncodedVendorNames:
+    """A vendor-name corpus normalized and encoded once for
+    :func:`vendor_similarity_modes_batch`.
+
+    Build once and reuse when the same corpus is scored against many
+    queries (dedup, repeated intake lookups); passing a plain list of
+    names to the batch function encodes it on the fly.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[Any],
+        *,
+        normalized: Optional[Sequence[str]] = None,
+        trigrams: Optional[Sequence[AbstractSet[str]]] = None,
+    ) -> None:
+        self.names: List[str] = [str(n or "") for n in names]
+        self.normalized: List[str] = (
+            list(normalized) if normalized is not None
+            else [normalize_vendor(n) for n in self.names]
+        )
+        self.trigrams: List[AbstractSet[str]] = (
+            list(trigrams) if trigrams is not None
+            else [frozenset(_trigrams(n)) for n in self.normalized]
+        )
+        self.tokens: List[List[str]] = [n.split() for n in self.normalized]
+        self.token_sets: List[frozenset] = [frozenset(t) for t in self.tokens]
+        self._gram_postings: Optional[Dict[str, List[int]]] = None
+        self._token_postings: Optional[Dict[str, List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def gram_overlaps(self, grams: AbstractSet[str]) -> List[int]:
+        """``|grams ∩ trigrams[i]|`` for every name."""
+        if len(self.names) < _POSTINGS_MIN_NAMES:
+            return [len(grams & tg) for tg in self.trigrams]
+        if self._gram_postings is None:
+            self._gram_postings = _postings(self.trigrams)
+        return self._overlaps(self._gram_postings, grams)
+
+    def token_overlaps(self, tokens: AbstractSet[str]) -> List[int]:
+        """``|tokens ∩ token_sets[i]|`` for every name."""
+        if len(self.names) < _POSTINGS_MIN_NAMES:
+            return [len(tokens & ts) for ts in self.token_sets]
+        if self._token_postings is None:
+            self._token_postings = _postings(self.token_sets)
+        return self._overlaps(self._token_postings, tokens)
+
+    def _overlaps(self, postings: Dict[str, List[int]], terms: AbstractSet[str]) -> List[int]:
+        counts = [0] * len(self.names)
+        for term in terms:
+            for i in postings.get(term, ()):
+                counts[i] += 1
+        return counts
+
+
+def _postings(term_sets: Sequence[AbstractSet[str]]) -> Dict[str, List[int]]:
+    postings: Dict[str, List[int]] = {}
+    for i, terms in enumerate(term_sets):
+        for term in terms:
+            postings.setdefault(term, []).append(i)
+    return postings
+
+
+def vendor_similarity_modes_batch(
+    query: str,
+    names: Union[Sequence[str], EncodedVendorNames],
+) -> List[Dict[str, float]]:
+    """:func:`vendor_similarity_modes` of ``query`` against every name.
+
+    Returns one mode dict per name, in order, with scores identical to
+    ``[vendor_similarity_modes(query, n) for n in names]``. ``names``
+    may be an :class:`EncodedVendorNames` to skip re-encoding a corpus
+    that is queried repeatedly.
+    """
+    corpus = names if isinstance(names, EncodedVendorNames) else EncodedVendorNames(names)
+    if not query:
+        return [dict(_ZERO_MODES) for _ in range(len(corpus))]
+    return _modes_batch_normalized(normalize_vendor(query), corpus)
+
+
+def _modes_batch_normalized(
+    query_norm: str,
+    corpus: EncodedVendorNames,
+    query_grams: Optional[AbstractSet[str]] = None,
+) -> List[Dict[str, float]]:
+    grams = query_grams if query_grams is not None else _trigrams(query_norm)
+    query_tokens = query_norm.split()
+    query_token_set = frozenset(query_tokens)
+    gram_hits = corpus.gram_overlaps(grams)
+    token_hits = corpus.token_overlaps(query_token_set)
+    peq = _bitparallel_pattern(query_norm)
+    m = len(query_norm)
+
+    results: List[Dict[str, float]] = []
+    for i, norm in enumerate(corpus.normalized):
+        if not corpus.names[i]:
+            results.append(dict(_ZERO_MODES))
+            continue
+        if norm == query_norm:
+            results.append(dict(_EXACT_MODES))
+            continue
+
+        if query_norm in norm or norm in query_norm:
+            longer = max(m, len(norm))
+            containment = (min(m, len(norm)) / longer) * 0.95 if longer else 0.0
+        else:
+            containment = 0.0
+
+        tokens = corpus.tokens[i]
+        if query_tokens and tokens:
+            inter = token_hits[i]
+            union = len(query_token_set) + len(corpus.token_sets[i]) - inter
+            jaccard = (inter / union) if union else 0.0
+            if query_tokens[0] == tokens[0]:
+                jaccard = min(1.0, jaccard + 0.2)
+        else:
+            jaccard = 0.0
+
+        sequence = SequenceMatcher(None, query_norm, norm).ratio()
+
+        if not m or not norm:
+            lev = 0.0
+        else:
+            dist = _levenshtein_bitparallel(peq, m, norm)
+            lev = 1.0 - (dist / max(m, len(norm)))
+
+        name_grams = corpus.trigrams[i]
+        if not grams or not name_grams:
+            tg = 0.0
+        else:
+            inter = gram_hits[i]
+            tg = inter / (len(grams) + len(name_grams) - inter)
+
+        results.append({
+            "exact": 0.0,
+            "containment": containment,
+            "jaccard": jaccard,
+            "sequence": sequence,
+            "levenshtein": lev,
+            "trigram": tg,
+        })
+    return results
+
+
 def vendor_similarity_hybrid(
     vendor1: str,
     vendor2: str,
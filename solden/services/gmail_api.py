@@ -113,6 +113,10 @@ OAUTH_TOKEN_URL = "https://oauth2.googleapis.com/token"
 OAUTH_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
 GMAIL_PROFILE_URL = f"{GMAIL_API_BASE}/users/me/profile"
+GMAIL_BATCH_URL = "https://gmail.googleapis.com/batch/gmail/v1"
+# Gmail accepts 100 calls per batch but rate-limits batches above ~50
+# (per-user concurrent-request quota), so chunks stay at 50.
+GMAIL_BATCH_MAX_REQUESTS = 50
 
 # Scopes needed for autonomous processing.
 # Sheets scope enables reconciliation workflows (read bank statements, write results).
@@ -130,6 +134,79 @@ GMAIL_SCOPES = [
 ]
 
 
+def _build_batch_body(paths: List[str], boundary: str) -> str:
+    """Encode GET ``paths`` as a ``multipart/mixed`` batch request body.
+
+    Each part's ``Content-ID`` is ``<item-N>``; Gmail answers with
+    ``<response-item-N>`` so responses map back by index.
+    """
+    parts = []
+    for index, path in enumerate(paths):
+        parts.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <item-{index}>\r\n"
+            "\r\n"
+            f"GET {path}\r\n"
+            "\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n")
+    return "".join(parts)
+
+
+def _split_head(text: str) -> tuple:
+    """Split ``text`` at the first blank line into (head, body)."""
+    for separator in ("\r\n\r\n", "\n\n"):
+        index = text.find(separator)
+        if index != -1:
+            return text[:index], text[index + len(separator):]
+    return text, ""
+
+
+def _parse_batch_response(content_type: str, body: str) -> Dict[int, tuple]:
+    """Decode a ``multipart/mixed`` batch response.
+
+    Returns ``{index: (status_code, json_or_None)}`` keyed by the
+    request index recovered from each part's ``Content-ID``. Parts
+    without a recognisable id or status line are skipped.
+    """
+    import json
+
+    boundary = ""
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "boundary":
+            boundary = value.strip().strip('"')
+    if not boundary:
+        raise ValueError("batch response has no multipart boundary")
+
+    results: Dict[int, tuple] = {}
+    for raw_part in body.split(f"--{boundary}"):
+        part = raw_part.strip("\r\n")
+        if not part or part == "--":
+            continue
+        part_head, http_response = _split_head(part)
+        content_id = ""
+        for line in part_head.splitlines():
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-id":
+                content_id = value.strip().strip("<>")
+        index_text = content_id.rsplit("-", 1)[-1]
+        if not index_text.isdigit():
+            continue
+        status_head, payload = _split_head(http_response.lstrip("\r\n"))
+        status_line = status_head.splitlines()[0] if status_head else ""
+        fields = status_line.split()
+        if len(fields) < 2 or not fields[1].isdigit():
+            continue
+        try:
+            data = json.loads(payload) if payload.strip() else None
+        except ValueError:
+            data = None
+        results[int(index_text)] = (int(fields[1]), data)
+    return results
+
+
 def _utc_now() -> datetime:
     """Return a timezone-aware UTC timestamp."""
     return datetime.now(timezone.utc)
@@ -399,6 +476,65 @@ class GmailAPIClient:
 
         return self._parse_message(data)
 
+    async def batch_get_messages(
+        self,
+        message_ids: List[str],
+        format: str = "full",
+    ) -> Dict[str, GmailMessage]:
+        """
+        Get many messages through the Gmail batch endpoint.
+
+        One HTTP request per ``GMAIL_BATCH_MAX_REQUESTS`` ids instead
+        of one per message. Parts Gmail rejects inside a batch (usually
+        429 when the per-user quota trips) are retried one by one with
+        ``get_message``; messages that are gone (404) are left out.
+
+        Args:
+            message_ids: Message IDs; duplicates are fetched once
+            format: 'full', 'metadata', 'minimal', or 'raw'
+
+        Returns:
+            Dict of message ID -> GmailMessage for every message found
+        """
+        import uuid
+
+        unique_ids = list(dict.fromkeys(mid for mid in message_ids if mid))
+        messages: Dict[str, GmailMessage] = {}
+        retry_ids: List[str] = []
+        client = get_http_client()
+        for start in range(0, len(unique_ids), GMAIL_BATCH_MAX_REQUESTS):
+            chunk = unique_ids[start:start + GMAIL_BATCH_MAX_REQUESTS]
+            boundary = f"batch_{uuid.uuid4().hex}"
+            paths = [
+                f"/gmail/v1/users/me/messages/{message_id}?{urlencode({'format': format})}"
+                for message_id in chunk
+            ]
+            headers = self._headers()
+            headers["Content-Type"] = f"multipart/mixed; boundary={boundary}"
+            response = await client.post(
+                GMAIL_BATCH_URL,
+                headers=headers,
+                content=_build_batch_body(paths, boundary).encode("utf-8"),
+            )
+            response.raise_for_status()
+            parts = _parse_batch_response(response.headers.get("content-type", ""), response.text)
+            for index, message_id in enumerate(chunk):
+                status, data = parts.get(index, (None, None))
+                if status == 200 and isinstance(data, dict) and data.get("id"):
+                    messages[message_id] = self._parse_message(data)
+                elif status != 404:
+                    retry_ids.append(message_id)
+
+        if retry_ids:
+            logger.info("Gmail batch: retrying %d of %d messages individually", len(retry_ids), len(unique_ids))
+        for message_id in retry_ids:
+            try:
+                messages[message_id] = await self.get_message(message_id, format=format)
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code != 404:
+                    raise
+        return messages
+
     async def get_thread(self, thread_id: str, format: str = "full") -> List[GmailMessage]:
         """Get all messages in a Gmail thread."""
         client = get_http_client()
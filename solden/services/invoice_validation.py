@@ -30,6 +30,7 @@ from solden.services.approval_card_builder import (
 )
 from solden.core.utils import safe_int
 from solden.services.invoice_models import InvoiceData
+from solden.services.validation_context import ValidationContext, fuzzy_dedup_settings
 
 logger = logging.getLogger(__name__)
 
@@ -1358,6 +1359,10 @@ class InvoiceValidationMixin:
         ``solden.core.typed_dicts`` documents the entry shape.
         """
         checked_at = datetime.now(timezone.utc).isoformat()
+        # Reads (vendor profile, org row, vendor history, recent items,
+        # bank details) are prefetched once and shared by every rule.
+        # Writes and services that own their own lookups keep self.db.
+        db = await ValidationContext.load(self.db, self.organization_id, invoice)
         reason_codes: List[str] = []
         reasons: List[Dict[str, Any]] = []
         rule_results: List[Dict[str, Any]] = []
@@ -1520,8 +1525,8 @@ class InvoiceValidationMixin:
         if invoice.currency and invoice.vendor_name:
             try:
                 vendor_profile = (
-                    self.db.get_vendor_profile(self.organization_id, invoice.vendor_name)
-                    if hasattr(self.db, "get_vendor_profile") else None
+                    db.get_vendor_profile(self.organization_id, invoice.vendor_name)
+                    if hasattr(db, "get_vendor_profile") else None
                 )
                 if vendor_profile:
                     vendor_currency = (
@@ -1562,7 +1567,7 @@ class InvoiceValidationMixin:
         if invoice.invoice_number and invoice.vendor_name:
             try:
                 mismatch = _check_reference_format(
-                    self.db, self.organization_id,
+                    db, self.organization_id,
                     invoice.vendor_name, invoice.invoice_number,
                 )
                 if mismatch is not None:
@@ -1601,7 +1606,7 @@ class InvoiceValidationMixin:
         if invoice.amount and invoice.vendor_name:
             try:
                 range_breach = _check_amount_range(
-                    self.db, self.organization_id,
+                    db, self.organization_id,
                     invoice.vendor_name, float(invoice.amount),
                 )
                 if range_breach is not None:
@@ -1904,33 +1909,17 @@ class InvoiceValidationMixin:
             # ``settings_json["dedup"]``: tighter windows for high-volume
             # AR-style vendors (e.g. utility re-bills); wider windows for
             # quarterly retainers. Default: 7 days, 2% amount tolerance.
-            fuzzy_dedup_window_days = 7
-            fuzzy_dedup_amount_tolerance = 0.02
             try:
-                _org_row = (
-                    self.db.get_organization(self.organization_id)
-                    if hasattr(self.db, "get_organization") else None
-                ) or {}
-                _settings = _org_row.get("settings_json") or _org_row.get("settings") or {}
-                if isinstance(_settings, str):
-                    try:
-                        _settings = json.loads(_settings)
-                    except Exception:
-                        _settings = {}
-                _dedup_cfg = (_settings or {}).get("dedup") or {}
-                if isinstance(_dedup_cfg, dict):
-                    _w = _dedup_cfg.get("fuzzy_window_days")
-                    if isinstance(_w, (int, float)) and 1 <= _w <= 90:
-                        fuzzy_dedup_window_days = int(_w)
-                    _t = _dedup_cfg.get("fuzzy_amount_tolerance")
-                    if isinstance(_t, (int, float)) and 0 < _t <= 0.25:
-                        fuzzy_dedup_amount_tolerance = float(_t)
+                fuzzy_dedup_window_days, fuzzy_dedup_amount_tolerance = fuzzy_dedup_settings(
+                    db.get_organization(self.organization_id)
+                    if hasattr(db, "get_organization") else None
+                )
             except Exception:
-                pass
+                fuzzy_dedup_window_days, fuzzy_dedup_amount_tolerance = 7, 0.02
 
             try:
-                if hasattr(self.db, "get_ap_items_by_vendor") and invoice.amount:
-                    recent_items = self.db.get_ap_items_by_vendor(
+                if hasattr(db, "get_ap_items_by_vendor") and invoice.amount:
+                    recent_items = db.get_ap_items_by_vendor(
                         self.organization_id,
                         invoice.vendor_name,
                         days=fuzzy_dedup_window_days,
@@ -2036,9 +2025,9 @@ class InvoiceValidationMixin:
                 )
 
                 stored_bank: Optional[Dict[str, Any]] = None
-                if invoice.vendor_name and hasattr(self.db, "get_vendor_bank_details"):
+                if invoice.vendor_name and hasattr(db, "get_vendor_bank_details"):
                     try:
-                        stored_bank = self.db.get_vendor_bank_details(
+                        stored_bank = db.get_vendor_bank_details(
                             self.organization_id, invoice.vendor_name
                         )
                     except Exception as fetch_exc:
@@ -2104,6 +2093,9 @@ class InvoiceValidationMixin:
                                 "Auto-freeze detect failed (non-fatal): %s",
                                 freeze_exc,
                             )
+                        # The freeze writes to the vendor profile; the
+                        # freeze rule below must see it, not the prefetch.
+                        db.invalidate("get_vendor_profile")
             except Exception as bank_exc:
                 logger.warning("Bank details comparison failed (non-fatal): %s", bank_exc)
                 _exc_bank_details_mismatch = bank_exc
@@ -2122,11 +2114,11 @@ class InvoiceValidationMixin:
         # Severity=error so the Phase 1.1 enforcement machinery
         # force-escalates any LLM 'approve' on a frozen vendor.
         try:
-            if invoice.vendor_name and hasattr(self.db, "is_iban_change_pending"):
-                if self.db.is_iban_change_pending(
+            if invoice.vendor_name and hasattr(db, "is_iban_change_pending"):
+                if db.is_iban_change_pending(
                     self.organization_id, invoice.vendor_name
                 ):
-                    verification_state = self.db.get_iban_change_verification_state(
+                    verification_state = db.get_iban_change_verification_state(
                         self.organization_id, invoice.vendor_name
                     ) or {}
                     missing = [
@@ -2178,10 +2170,10 @@ class InvoiceValidationMixin:
         # (``gate_payment_against_sanctions``) — payment is the last
         # line of defence; the validation gate is the first.
         try:
-            if invoice.vendor_name and hasattr(self.db, "get_vendor_profile"):
+            if invoice.vendor_name and hasattr(db, "get_vendor_profile"):
                 _vp = None
                 try:
-                    _vp = self.db.get_vendor_profile(
+                    _vp = db.get_vendor_profile(
                         self.organization_id, invoice.vendor_name,
                     )
                 except Exception:
@@ -2354,7 +2346,7 @@ class InvoiceValidationMixin:
             if invoice_terms and invoice.vendor_name:
                 vp = None
                 try:
-                    vp = self.db.get_vendor_profile(self.organization_id, invoice.vendor_name) or {}
+                    vp = db.get_vendor_profile(self.organization_id, invoice.vendor_name) or {}
                 except Exception:
                     vp = {}
                 profile_terms = vp.get("payment_terms") or ""
@@ -2384,14 +2376,14 @@ class InvoiceValidationMixin:
                 # blown-up live call would block intake. The async
                 # scaffold that used to live here was dead-logic
                 # (both branches set ``coa = []``); removed.
-                from solden.integrations.erp_router import _get_cached_chart_of_accounts
-                cached = _get_cached_chart_of_accounts(self.organization_id)
-                coa = (cached or {}).get("accounts", []) if cached else []
-                if coa:
-                    valid_codes = {str(a.get("code") or a.get("id") or "").strip() for a in coa if a.get("active", True)}
+                from solden.integrations.erp_router import _match_cached_gl_codes
+                line_codes = [str(item.get("gl_code") or "").strip() for item in invoice.line_items]
+                line_codes = [gl for gl in line_codes if gl]
+                valid_codes = _match_cached_gl_codes(self.organization_id, line_codes) if line_codes else None
+                if valid_codes is not None:
                     for item in invoice.line_items:
                         gl = str(item.get("gl_code") or "").strip()
-                        if gl and valid_codes and gl not in valid_codes:
+                        if gl and gl not in valid_codes:
                             add_reason(
                                 "invalid_gl_code",
                                 f"GL code '{gl}' not found in chart of accounts",
@@ -2436,7 +2428,7 @@ class InvoiceValidationMixin:
             from solden.services.tax_compliance import validate_tax_id
             vendor_profile = None
             try:
-                vendor_profile = self.db.get_vendor_profile(self.organization_id, invoice.vendor_name) or {}
+                vendor_profile = db.get_vendor_profile(self.organization_id, invoice.vendor_name) or {}
             except Exception:
                 vendor_profile = {}
             meta = vendor_profile.get("metadata") or {}
@@ -2527,14 +2519,12 @@ class InvoiceValidationMixin:
         try:
             from solden.services.ap_decision import evaluate_fraud_thresholds
             # Gate already loads ``vendor_profile`` in earlier rules
-            # (currency_consistency, sanctions_status, etc.); we re-
-            # fetch here rather than threading the variable through
-            # every rule block — vendor_profile reads come from the
-            # per-DSN psycopg pool and are well under a millisecond.
+            # (currency_consistency, sanctions_status, etc.); ``db`` is
+            # the per-invoice ValidationContext, so this is a cache hit.
             _vp_for_thresholds = None
-            if invoice.vendor_name and hasattr(self.db, "get_vendor_profile"):
+            if invoice.vendor_name and hasattr(db, "get_vendor_profile"):
                 try:
-                    _vp_for_thresholds = self.db.get_vendor_profile(
+                    _vp_for_thresholds = db.get_vendor_profile(
                         self.organization_id, invoice.vendor_name,
                     )
                 except Exception:
@@ -2544,8 +2534,8 @@ class InvoiceValidationMixin:
             _org_thresholds: Dict[str, Any] = {}
             try:
                 _org_for_thresholds = (
-                    self.db.get_organization(self.organization_id)
-                    if hasattr(self.db, "get_organization") else None
+                    db.get_organization(self.organization_id)
+                    if hasattr(db, "get_organization") else None
                 ) or {}
                 _settings_blob = (
                     _org_for_thresholds.get("settings_json")
@@ -2608,7 +2598,7 @@ class InvoiceValidationMixin:
             )
             from solden.core.prompt_guard import scan_invoice_fields
 
-            fraud_config = load_fraud_controls(self.organization_id, self.db)
+            fraud_config = load_fraud_controls(self.organization_id, db)
         except Exception as fc_exc:
             # If config loading itself fails, FAIL CLOSED with a specific
             # reason code. "No silent disabling" of fraud controls.
@@ -2688,7 +2678,7 @@ class InvoiceValidationMixin:
             try:
                 vendor_profile_for_first_payment = None
                 if invoice.vendor_name:
-                    vendor_profile_for_first_payment = self.db.get_vendor_profile(
+                    vendor_profile_for_first_payment = db.get_vendor_profile(
                         self.organization_id, invoice.vendor_name
                     )
 
@@ -2770,8 +2760,8 @@ class InvoiceValidationMixin:
             # 6c) Vendor velocity — block if vendor has submitted more than
             # the configured max invoices in the last 7 days.
             try:
-                if invoice.vendor_name and hasattr(self.db, "get_ap_items_by_vendor"):
-                    recent = self.db.get_ap_items_by_vendor(
+                if invoice.vendor_name and hasattr(db, "get_ap_items_by_vendor"):
+                    recent = db.get_ap_items_by_vendor(
                         self.organization_id,
                         invoice.vendor_name,
                         days=7,
@@ -587,6 +587,7 @@ class InvoiceWorkflowService(InvoiceValidationMixin, InvoicePostingMixin):
         self,
         invoice: InvoiceData,
         validation_gate: Dict[str, Any],
+        ap_item_id: Optional[str] = None,
     ):
         """Assemble vendor context and call APDecisionService. Never raises.
 
@@ -690,6 +691,8 @@ class InvoiceWorkflowService(InvoiceValidationMixin, InvoicePostingMixin):
                     # for fabricating one.
                     currency=getattr(invoice, "currency", "") or "",
                     gmail_id=invoice.gmail_id,
+                    # Already saved and fingerprinted by now.
+                    ap_item_id=ap_item_id,
                 )
                 cross_analysis_dict = cross_result.to_dict() if cross_result else None
             except Exception as exc:
@@ -1188,7 +1191,7 @@ class InvoiceWorkflowService(InvoiceValidationMixin, InvoicePostingMixin):
         # skip the internal AP-decision call to avoid a double evaluation.
         if ap_decision is None:
             _decision_start = _time.monotonic()
-            ap_decision = await self._get_ap_decision(invoice, validation_gate)
+            ap_decision = await self._get_ap_decision(invoice, validation_gate, ap_item_id=invoice_id)
             # §11: Track classification/decision latency
             try:
                 from solden.core.sla_tracker import get_sla_tracker
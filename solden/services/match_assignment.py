@@ -0,0 +1,254 @@
+"""Globally optimal one-to-one assignment for reconciliation matchers.
+
+The bank-statement and vendor-statement matchers used to walk lines in
+arbitrary order and greedily take each line's best candidate. Two lines
+whose best candidate is the same payment / AP item then "fought" over
+it: whichever line came first won, and the loser was reported
+ambiguous or unmatched even when a clean pairing for both existed.
+
+:func:`solve_assignment` resolves a whole import at once. It takes the
+sparse candidate graph as ``(left, right, weight)`` edges and returns a
+maximum-weight matching (by default maximising the number of matches
+first, total weight second). The graph is split into connected
+components — in practice each is a handful of lines sharing an amount
+block — and each component is solved with a sparse Hungarian
+(successive shortest augmenting paths with Dijkstra potentials), so
+cost tracks the candidate edges rather than lines × candidates.
+
+:func:`find_split_group` is the bounded one-to-many extension: for a
+line left unassigned, find the *unique* combination of up to
+``max_parts`` still-free candidates whose amounts sum to the line.
+Uniqueness is required because a coincidental subset sum is exactly
+the kind of auto-match an operator should confirm instead.
+"""
+from __future__ import annotations
+
+import heapq
+from decimal import Decimal
+from itertools import combinations
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Weights are compared at 1e-3 resolution (match confidences are
+# already rounded to three places), which keeps the solver in exact
+# integer arithmetic.
+_WEIGHT_SCALE = 1000
+
+# Split search gives up past this many plausible parts, which bounds the
+# work at C(_SPLIT_CANDIDATE_CAP, max_parts) combinations per line.
+_SPLIT_CANDIDATE_CAP = 24
+
+
+class _UnionFind:
+    def __init__(self) -> None:
+        self._parent: Dict[Any, Any] = {}
+
+    def find(self, x: Any) -> Any:
+        root = self._parent.setdefault(x, x)
+        while root != self._parent[root]:
+            root = self._parent[root]
+        while x != root:
+            self._parent[x], x = root, self._parent[x]
+        return root
+
+    def union(self, a: Any, b: Any) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self._parent[ra] = rb
+
+
+def _solve_component(
+    edges: List[Tuple[Hashable, Hashable, float]],
+    *,
+    cardinality_first: bool,
+) -> Dict[Hashable, Hashable]:
+    """Max-weight bipartite matching for one connected component.
+
+    Sparse Hungarian (successive shortest augmenting paths): every left
+    gets a private zero-cost "stay unassigned" right, turning the
+    problem into a left-perfect min-cost assignment. Lefts are added
+    one at a time; each Dijkstra starts at the new left and stops at
+    the first free right, and only the nodes it settled get their
+    potentials shifted — so an uncontested line costs O(degree) and
+    only genuinely contested regions pay for longer searches. Weights
+    are scaled to integers so reduced costs are exact.
+    """
+    if len(edges) == 1:
+        left, right, weight = edges[0]
+        return {left: right} if (cardinality_first or weight > 0) else {}
+
+    lefts: Dict[Hashable, int] = {}
+    rights: Dict[Hashable, int] = {}
+    for left, right, _ in sorted(edges, key=lambda e: (str(e[0]), str(e[1]))):
+        lefts.setdefault(left, len(lefts))
+        rights.setdefault(right, len(rights))
+    n_left, n_right = len(lefts), len(rights)
+
+    int_weights = [int(round(w * _WEIGHT_SCALE)) for _, _, w in edges]
+    # With ``cardinality_first`` every edge carries a bonus larger than
+    # any achievable weight swing, so an extra match always beats a
+    # better-scored but smaller matching.
+    bonus = 0
+    if cardinality_first:
+        bonus = (min(n_left, n_right) + 1) * max(abs(w) for w in int_weights) + 1
+
+    # adj[x] = [(right, cost)]; right ``n_right + x`` is x's private
+    # unassigned slot at cost 0. Costs are negated weights (min-cost).
+    adj: List[List[Tuple[int, int]]] = [[] for _ in range(n_left)]
+    for (left, right, _), w in zip(edges, int_weights):
+        adj[lefts[left]].append((rights[right], -(w + bonus)))
+    for x in range(n_left):
+        adj[x].sort()
+        adj[x].append((n_right + x, 0))
+
+    match_left = [-1] * n_left
+    match_cost = [0] * n_left
+    match_right = [-1] * (n_right + n_left)
+    pot_left = [-min(c for _, c in adj[x]) for x in range(n_left)]
+    pot_right = [0] * (n_right + n_left)
+
+    for root in range(n_left):
+        dist_left: Dict[int, int] = {root: 0}
+        dist_right: Dict[int, int] = {}
+        via: Dict[int, Tuple[int, int]] = {}
+        done_left: List[int] = []
+        done_right: List[int] = []
+        seen_left: set = set()
+        seen_right: set = set()
+        # Heap entries: (dist, node) with lefts as x >= 0, rights as ~r.
+        heap: List[Tuple[int, int]] = [(0, root)]
+        end = -1
+        reach = 0
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node >= 0:
+                x = node
+                if x in seen_left or d != dist_left[x]:
+                    continue
+                seen_left.add(x)
+                done_left.append(x)
+                px = pot_left[x]
+                for r, cost in adj[x]:
+                    if r == match_left[x] or r in seen_right:
+                        continue
+                    nd = d + cost + px - pot_right[r]
+                    if nd < dist_right.get(r, nd + 1):
+                        dist_right[r] = nd
+                        via[r] = (x, cost)
+                        heapq.heappush(heap, (nd, ~r))
+            else:
+                r = ~node
+                if r in seen_right or d != dist_right[r]:
+                    continue
+                seen_right.add(r)
+                done_right.append(r)
+                owner = match_right[r]
+                if owner < 0:
+                    end, reach = r, d
+                    break
+                # Matched arcs are tight, so the owner sits at the same
+                # distance (up to integer rounding of the potentials).
+                nd = d - match_cost[owner] + pot_right[r] - pot_left[owner]
+                if owner not in seen_left and nd < dist_left.get(owner, nd + 1):
+                    dist_left[owner] = nd
+                    heapq.heappush(heap, (nd, owner))
+
+        for x in done_left:
+            pot_left[x] += dist_left[x] - reach
+        for r in done_right:
+            pot_right[r] += dist_right[r] - reach
+
+        r = end
+        while True:
+            x, cost = via[r]
+            previous = match_left[x]
+            match_left[x] = r
+            match_cost[x] = cost
+            match_right[r] = x
+            if x == root:
+                break
+            r = previous
+
+    left_keys = list(lefts)
+    right_keys = list(rights)
+    return {
+        left_keys[x]: right_keys[r]
+        for x, r in enumerate(match_left)
+        if 0 <= r < n_right
+    }
+
+
+def solve_assignment(
+    edges: Iterable[Tuple[Hashable, Hashable, float]],
+    *,
+    cardinality_first: bool = True,
+) -> Dict[Hashable, Hashable]:
+    """Return a one-to-one ``{left: right}`` assignment over ``edges``.
+
+    ``edges`` are ``(left, right, weight)`` triples; duplicate pairs
+    keep the highest weight. With ``cardinality_first`` (default) the
+    solver maximises the number of pairs, then total weight; otherwise
+    it maximises total weight and may leave a left unassigned when
+    that scores better. Left and right keys live in separate
+    namespaces, so the same id may appear on both sides.
+    """
+    best: Dict[Tuple[Hashable, Hashable], float] = {}
+    for left, right, weight in edges:
+        key = (left, right)
+        w = float(weight)
+        if key not in best or w > best[key]:
+            best[key] = w
+    if not best:
+        return {}
+
+    uf = _UnionFind()
+    for left, right in best:
+        uf.union(("L", left), ("R", right))
+    components: Dict[Any, List[Tuple[Hashable, Hashable, float]]] = {}
+    for (left, right), weight in best.items():
+        components.setdefault(uf.find(("L", left)), []).append((left, right, weight))
+
+    assignment: Dict[Hashable, Hashable] = {}
+    for component in components.values():
+        assignment.update(_solve_component(component, cardinality_first=cardinality_first))
+    return assignment
+
+
+def find_split_group(
+    target: Any,
+    candidates: Iterable[Tuple[Hashable, Any]],
+    *,
+    tolerance: Any,
+    max_parts: int,
+) -> Optional[Tuple[Hashable, ...]]:
+    """Unique combination of 2..``max_parts`` candidates summing to ``target``.
+
+    ``candidates`` are ``(key, amount)`` pairs, already filtered to the
+    line's currency / date window and to keys nobody else claimed.
+    Returns ``None`` when there is no combination, more than one, or
+    more than ``_SPLIT_CANDIDATE_CAP`` plausible parts — in a window
+    that busy no subset sum is trustworthy enough to auto-match.
+    """
+    if max_parts < 2:
+        return None
+    goal = abs(Decimal(str(target)))
+    tol = Decimal(str(tolerance))
+    pool: List[Tuple[Hashable, Decimal]] = []
+    for key, amount in candidates:
+        if amount is None:
+            continue
+        value = abs(Decimal(str(amount)))
+        # A part as large as the whole is a one-to-one candidate, not a split.
+        if value == 0 or value >= goal - tol:
+            continue
+        pool.append((key, value))
+        if len(pool) > _SPLIT_CANDIDATE_CAP:
+            return None
+
+    found: Optional[Tuple[Hashable, ...]] = None
+    for size in range(2, min(max_parts, len(pool)) + 1):
+        for combo in combinations(pool, size):
+            if abs(sum(amount for _, amount in combo) - goal) <= tol:
+                if found is not None:
+                    return None
+                found = tuple(key for key, _ in combo)
+    return found
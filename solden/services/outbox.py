@@ -15,9 +15,11 @@ The contract:
    commits both atomically; if the business write rolls back, the
    outbox row rolls back too.
 
-2. :class:`OutboxWorker` polls for pending rows whose backoff window
-   has elapsed, dispatches each to the appropriate handler, and
-   updates the row's status (succeeded / failed / dead).
+2. :class:`OutboxWorker` claims pending rows whose backoff window
+   has elapsed, dispatches them concurrently to the appropriate
+   handlers (bounded per target prefix, fair across organizations),
+   and updates each row's status (succeeded / failed / dead). It
+   wakes on ``NOTIFY outbox_events`` rather than polling.
 
 3. Handlers are registered by ``target`` string. Three target kinds
    today:
@@ -45,11 +47,19 @@ import asyncio
 import json
 import logging
 import random
+import time
 import uuid
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Awaitable, Callable, Dict, List, Optional
-
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from solden.core.async_database import (
+    async_db_for,
+    close_async_pool,
+    has_async_pool,
+    open_async_pool,
+)
 from solden.core.database import get_db
 
 logger = logging.getLogger(__name__)
@@ -231,9 +241,98 @@ class OutboxWriter:
         return _row_to_event(dict(row)) if row else None
 
 
+# ─── Worker SQL (shared by the sync and async paths) ───────────────
+
+_CLAIM_SQL = """
+    WITH due AS (
+        SELECT id, organization_id, next_attempt_at, created_at,
+               split_part(target, ':', 1) AS prefix
+        FROM outbox_events
+        WHERE (
+                (status IN ('pending', 'failed')
+                 AND (next_attempt_at IS NULL OR next_attempt_at <= %s))
+                -- Claimed by a worker that died before flushing its
+                -- outcome: reclaim once the lease has run out.
+                OR (status = 'processing' AND last_attempted_at < %s)
+              )
+          AND split_part(target, ':', 1) <> ALL(%s)
+        ORDER BY next_attempt_at ASC
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ), org_ranked AS (
+        SELECT id, next_attempt_at, prefix,
+               ROW_NUMBER() OVER (
+                   PARTITION BY organization_id
+                   ORDER BY next_attempt_at, created_at
+               ) AS org_rank
+        FROM due
+    ), picked AS (
+        -- At most the prefix's free slots per prefix (taken fairly
+        -- across orgs), then round-robin across orgs up to the limit.
+        SELECT id FROM (
+            SELECT id, next_attempt_at, prefix, org_rank,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY prefix
+                       ORDER BY org_rank, next_attempt_at
+                   ) AS prefix_rank
+            FROM org_ranked
+        ) ranked
+        WHERE prefix_rank <= COALESCE(
+            (SELECT caps.free FROM unnest(%s::text[], %s::integer[]) AS caps(prefix, free)
+             WHERE caps.prefix = ranked.prefix),
+            %s
+        )
+        ORDER BY org_rank, next_attempt_at
+        LIMIT %s
+    )
+    UPDATE outbox_events
+    SET status = 'processing',
+        last_attempted_at = %s,
+        updated_at = %s
+    WHERE id IN (SELECT id FROM picked)
+    RETURNING *
+"""
+
+_NEXT_DUE_SQL = """
+    SELECT MIN(next_attempt_at) AS next_at FROM outbox_events
+    WHERE status IN ('pending', 'failed')
+      AND split_part(target, ':', 1) <> ALL(%s)
+"""
+
+
+def _flush_sql(rows: int) -> str:
+    values = ", ".join(["(%s, %s, %s::integer, %s, %s, %s, %s)"] * rows)
+    return f"""
+        UPDATE outbox_events AS o
+        SET status = v.status,
+            attempts = v.attempts,
+            next_attempt_at = v.next_attempt_at,
+            succeeded_at = COALESCE(v.succeeded_at, o.succeeded_at),
+            updated_at = v.updated_at,
+            error_log_json = COALESCE(v.error_log_json, o.error_log_json)
+        FROM (VALUES {values}) AS v(
+            id, status, attempts, next_attempt_at,
+            succeeded_at, updated_at, error_log_json
+        )
+        WHERE o.id = v.id
+    """
+
+
+def _seconds_until(row: Any) -> Optional[float]:
+    next_at = _parse_ts(dict(row).get("next_at") if row else None)
+    if next_at is None:
+        return None
+    return (next_at - datetime.now(timezone.utc)).total_seconds()
+
+
 # ─── Worker ────────────────────────────────────────────────────────
 
 
+# Channel the ``outbox_events`` trigger (migration v100) notifies
+# whenever a row becomes pending.
+NOTIFY_CHANNEL = "outbox_events"
+
+
 @dataclass
 class WorkerStats:
     polled: int = 0
@@ -243,13 +342,169 @@ class WorkerStats:
     skipped_no_handler: int = 0
 
 
-class OutboxWorker:
-    """Polls ``outbox_events`` for due rows and dispatches to handlers.
+def _target_prefix(target: str) -> str:
+    return (target or "").split(":", 1)[0]
+
+
+def _interleave_by_org(events: List[OutboxEvent]) -> List[OutboxEvent]:
+    """Round-robin ``events`` across organizations, keeping each org's
+    own order: one event per org, then the next, and so on."""
+    queues: Dict[str, List[OutboxEvent]] = {}
+    for event in events:
+        queues.setdefault(event.organization_id, []).append(event)
+    ordered: List[OutboxEvent] = []
+    for rank in range(max((len(q) for q in queues.values()), default=0)):
+        ordered.extend(q[rank] for q in queues.values() if rank < len(q))
+    return ordered
+
+
+def _parse_ts(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _lag_seconds(event: OutboxEvent) -> float:
+    """Seconds between the event becoming due and now."""
+    due = _parse_ts(event.next_attempt_at) or _parse_ts(event.created_at)
+    if due is None:
+        return 0.0
+    return max(0.0, (datetime.now(timezone.utc) - due).total_seconds())
+
+
+class _TargetMetrics:
+    def __init__(self) -> None:
+        self.dispatched = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.dead = 0
+        self.in_flight = 0
+        self.handler_seconds = 0.0
+        self.lag_seconds_last = 0.0
+        self.lag_seconds_max = 0.0
+        self.lag_seconds_total = 0.0
+        self.completions: Deque[float] = deque()
+
+
+class OutboxWorkerMetrics:
+    """Per-target-prefix throughput and lag for one worker process.
+
+    Lag is taken when the handler starts: how long after the row became
+    due (``next_attempt_at``, else ``created_at``) it actually ran. It
+    includes time spent waiting for the prefix's concurrency slot, so a
+    prefix whose lag climbs while the others stay flat needs a wider
+    lane or more workers. Throughput is completions per second over
+    the trailing ``THROUGHPUT_WINDOW_SECONDS``.
+    """
 
-    Default poll cadence: 2s sleep between polls. Per-row processing
-    locks the row by flipping status to ``processing`` (with the
-    per-row attempt counter incremented atomically) before dispatch,
-    so multiple worker processes don't double-fire.
+    THROUGHPUT_WINDOW_SECONDS = 60.0
+
+    def __init__(self) -> None:
+        self._targets: Dict[str, _TargetMetrics] = {}
+        self.claims = 0
+        self.claimed = 0
+        self.claim_size = 0
+
+    def _target(self, prefix: str) -> _TargetMetrics:
+        metrics = self._targets.get(prefix)
+        if metrics is None:
+            metrics = self._targets[prefix] = _TargetMetrics()
+        return metrics
+
+    def record_claim(self, claimed: int, claim_size: int) -> None:
+        self.claims += 1
+        self.claimed += claimed
+        self.claim_size = claim_size
+
+    def record_dispatch(self, prefix: str, lag_seconds: float) -> None:
+        metrics = self._target(prefix)
+        metrics.dispatched += 1
+        metrics.in_flight += 1
+        metrics.lag_seconds_last = lag_seconds
+        metrics.lag_seconds_max = max(metrics.lag_seconds_max, lag_seconds)
+        metrics.lag_seconds_total += lag_seconds
+
+    def record_outcome(self, prefix: str, outcome: str, handler_seconds: float) -> None:
+        """``outcome`` is ``succeeded``, ``failed`` or ``dead``."""
+        metrics = self._target(prefix)
+        metrics.in_flight = max(0, metrics.in_flight - 1)
+        metrics.handler_seconds += handler_seconds
+        if outcome == "succeeded":
+            metrics.succeeded += 1
+        elif outcome == "dead":
+            metrics.dead += 1
+        else:
+            metrics.failed += 1
+        now = time.monotonic()
+        metrics.completions.append(now)
+        self._trim(metrics, now)
+
+    def _trim(self, metrics: _TargetMetrics, now: float) -> None:
+        horizon = now - self.THROUGHPUT_WINDOW_SECONDS
+        while metrics.completions and metrics.completions[0] < horizon:
+            metrics.completions.popleft()
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        targets: Dict[str, Dict[str, Any]] = {}
+        for prefix, metrics in sorted(self._targets.items()):
+            self._trim(metrics, now)
+            completed = metrics.succeeded + metrics.failed + metrics.dead
+            targets[prefix] = {
+                "dispatched": metrics.dispatched,
+                "succeeded": metrics.succeeded,
+                "failed": metrics.failed,
+                "dead": metrics.dead,
+                "in_flight": metrics.in_flight,
+                "throughput_per_second": round(
+                    len(metrics.completions) / self.THROUGHPUT_WINDOW_SECONDS, 3,
+                ),
+                "avg_handler_ms": (
+                    round(metrics.handler_seconds / completed * 1000, 2) if completed else 0
+                ),
+                "lag_seconds_last": round(metrics.lag_seconds_last, 3),
+                "lag_seconds_max": round(metrics.lag_seconds_max, 3),
+                "lag_seconds_avg": (
+                    round(metrics.lag_seconds_total / metrics.dispatched, 3)
+                    if metrics.dispatched else 0
+                ),
+            }
+        return {
+            "claims": self.claims,
+            "claimed": self.claimed,
+            "claim_size": self.claim_size,
+            "targets": targets,
+        }
+
+
+class OutboxWorker:
+    """Claims due ``outbox_events`` rows and dispatches them concurrently.
+
+    Claiming locks rows by flipping status to ``processing`` inside one
+    ``FOR UPDATE SKIP LOCKED`` statement, so multiple worker processes
+    don't double-fire. Each claim scans ``FAIRNESS_WINDOW`` × the claim
+    size of due rows and takes them round-robin across organizations,
+    so one tenant's burst can't starve everyone else's events.
+
+    Claimed events run as concurrent tasks: at most ``max_in_flight``
+    overall and at most ``PREFIX_CONCURRENCY[prefix]`` per target
+    prefix (``DEFAULT_PREFIX_CONCURRENCY`` otherwise). A prefix at its
+    cap is excluded from further claims until a slot frees, and no claim
+    takes more of a prefix's rows than it has free slots, so a slow ERP
+    or Slack target only ever holds its own lane. The claim size
+    doubles while claims come back full (backlog) and halves back
+    towards ``batch_size`` once they come back mostly empty. Outcomes
+    are buffered and written in one statement per tick (see
+    :meth:`_flush_completions`).
+
+    :meth:`run_forever` LISTENs on :data:`NOTIFY_CHANNEL` and sleeps
+    until a notification, the next backoff deadline, or a slow safety
+    poll — whichever comes first. Without a LISTEN connection it falls
+    back to polling every ``POLL_INTERVAL_SECONDS``.
 
     Backoff: exponential with jitter — base 30s, doubles each
     attempt, capped at 30 minutes. Adds 0-25% jitter.
@@ -259,103 +514,363 @@ class OutboxWorker:
     MAX_BACKOFF_SECONDS = 1800
     POLL_INTERVAL_SECONDS = 2.0
     BATCH_SIZE = 25
-
-    def __init__(self, *, batch_size: Optional[int] = None) -> None:
+    MAX_BATCH_SIZE = 200
+    MAX_IN_FLIGHT = 64
+    # ERP write-backs and Slack/ERP annotation writers sit behind
+    # upstream rate limits; give them narrow lanes.
+    PREFIX_CONCURRENCY: Dict[str, int] = {"adapter": 4, "annotation": 4, "webhook": 8}
+    DEFAULT_PREFIX_CONCURRENCY = 16
+    FAIRNESS_WINDOW = 4
+    # A row left in ``processing`` this long after its claim belongs to
+    # a worker that died before flushing; it is claimable again. Well
+    # above any handler's runtime plus the flush interval.
+    PROCESSING_LEASE_SECONDS = 900
+    # With LISTEN up, idle waits still re-check this often in case a
+    # notification was missed (e.g. while the listener reconnected).
+    IDLE_POLL_SECONDS = 30.0
+    LISTEN_RECONNECT_MAX_SECONDS = 60.0
+    METRICS_LOG_INTERVAL_SECONDS = 60.0
+    # Completion bookkeeping is flushed at most this often (or sooner
+    # once this many rows are buffered).
+    FLUSH_INTERVAL_SECONDS = 0.2
+    FLUSH_MAX_ROWS = 1000
+
+    def __init__(
+        self,
+        *,
+        batch_size: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        prefix_concurrency: Optional[Dict[str, int]] = None,
+        listen: bool = True,
+    ) -> None:
         self.batch_size = batch_size or self.BATCH_SIZE
+        self.max_in_flight = max_in_flight or self.MAX_IN_FLIGHT
+        self.prefix_concurrency = {**self.PREFIX_CONCURRENCY, **(prefix_concurrency or {})}
+        self.listen = listen
+        self.metrics = OutboxWorkerMetrics()
+        self._claim_size = self.batch_size
         self._stop = False
+        self._listening = False
+        self._wake = asyncio.Event()
+        # Claimed-but-unsettled events per prefix, and the semaphores
+        # that bound how many of them run at once.
+        self._held: Dict[str, int] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        # (id, status, attempts, next_attempt_at, succeeded_at,
+        #  updated_at, error_log_json) rows awaiting _flush_completions.
+        self._completions: List[tuple] = []
+        self._last_flush = time.monotonic()
 
     def stop(self) -> None:
         self._stop = True
+        self._wake.set()
+
+    def prefix_limit(self, prefix: str) -> int:
+        return self.prefix_concurrency.get(prefix, self.DEFAULT_PREFIX_CONCURRENCY)
 
     async def run_forever(self) -> None:
-        while not self._stop:
-            try:
-                stats = await self.run_once()
-                if stats.polled == 0:
+        # A long-lived loop: give it an async connection pool unless the
+        # host (the API server) already opened one.
+        adb = async_db_for(get_db())
+        owns_pool = adb is not None and not has_async_pool(adb.dsn)
+        if owns_pool:
+            await open_async_pool(adb.sync_db)
+        listener = asyncio.create_task(self._listen()) if self.listen else None
+        stats = WorkerStats()
+        next_metrics_log = time.monotonic() + self.METRICS_LOG_INTERVAL_SECONDS
+        try:
+            while not self._stop:
+                if self._flush_due():
+                    try:
+                        await self._aflush_completions()
+                    except Exception as exc:  # noqa: BLE001
+                        logger.exception("outbox: completion flush raised — %s", exc)
+                try:
+                    claimed = await self._top_up(stats)
+                except Exception as exc:  # noqa: BLE001
+                    logger.exception("outbox: claim raised — %s", exc)
                     await asyncio.sleep(self.POLL_INTERVAL_SECONDS)
-            except Exception as exc:  # noqa: BLE001
-                logger.exception("outbox: run_once raised — %s", exc)
-                await asyncio.sleep(self.POLL_INTERVAL_SECONDS)
+                    continue
+                if time.monotonic() >= next_metrics_log:
+                    logger.info("outbox: worker metrics %s", json.dumps(self.metrics.snapshot()))
+                    next_metrics_log = time.monotonic() + self.METRICS_LOG_INTERVAL_SECONDS
+                if not claimed:
+                    await self._wait_for_work()
+        finally:
+            if listener is not None:
+                listener.cancel()
+                await asyncio.gather(listener, return_exceptions=True)
+            if self._tasks:
+                await asyncio.gather(*list(self._tasks), return_exceptions=True)
+            try:
+                await self._aflush_completions()
+            finally:
+                if owns_pool:
+                    await close_async_pool(adb.dsn)
 
     async def run_once(self) -> WorkerStats:
+        """Claim one batch, dispatch it concurrently, and return once
+        every claimed event has settled."""
         stats = WorkerStats()
-        events = self._claim_due_events()
+        events = await self._aclaim_due_events(self._claim_size)
         stats.polled = len(events)
+        results = await asyncio.gather(
+            *(self._dispatch(event, stats) for event in events),
+            return_exceptions=True,
+        )
+        await self._aflush_completions()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return stats
+
+    # ─── Dispatch ────────────────────────────────────────────────
+
+    async def _top_up(self, stats: WorkerStats) -> int:
+        """Claim as many due events as there is capacity for and start
+        them as tasks. Returns the number claimed."""
+        free = self.max_in_flight - len(self._tasks)
+        if free <= 0:
+            return 0
+        events = await self._aclaim_due_events(
+            min(self._claim_size, free), exclude=self._saturated_prefixes(),
+        )
         for event in events:
+            task = asyncio.create_task(self._dispatch(event, stats))
+            self._tasks.add(task)
+            task.add_done_callback(self._on_task_done)
+        return len(events)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        at_capacity = len(self._tasks) >= self.max_in_flight
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("outbox: dispatch task raised — %s", task.exception())
+        if at_capacity:
+            self._wake.set()
+
+    def _saturated_prefixes(self) -> List[str]:
+        return sorted(
+            prefix for prefix, held in self._held.items()
+            if held >= self.prefix_limit(prefix)
+        )
+
+    def _slot(self, prefix: str) -> asyncio.Semaphore:
+        slot = self._slots.get(prefix)
+        if slot is None:
+            slot = self._slots[prefix] = asyncio.Semaphore(self.prefix_limit(prefix))
+        return slot
+
+    async def _dispatch(self, event: OutboxEvent, stats: WorkerStats) -> None:
+        prefix = _target_prefix(event.target)
+        try:
             handler = _resolve_handler(event.target)
             if handler is None:
+                self.metrics.record_dispatch(prefix, _lag_seconds(event))
                 self._mark_dead(event, "no_handler_registered")
+                self.metrics.record_outcome(prefix, "dead", 0.0)
                 stats.skipped_no_handler += 1
-                continue
+                return
+            async with self._slot(prefix):
+                self.metrics.record_dispatch(prefix, _lag_seconds(event))
+                started = time.monotonic()
+                try:
+                    await handler(event)
+                except Exception as exc:  # noqa: BLE001
+                    elapsed = time.monotonic() - started
+                    logger.warning(
+                        "outbox: handler %s failed for event %s — %s",
+                        event.target, event.id, exc,
+                    )
+                    self._mark_failed(event, str(exc))
+                    if event.attempts + 1 >= event.max_attempts:
+                        outcome = "dead"
+                        stats.dead += 1
+                    else:
+                        outcome = "failed"
+                        stats.failed += 1
+                else:
+                    elapsed = time.monotonic() - started
+                    self._mark_succeeded(event)
+                    outcome = "succeeded"
+                    stats.succeeded += 1
+                self.metrics.record_outcome(prefix, outcome, elapsed)
+        finally:
+            held = self._held.get(prefix, 0)
+            self._held[prefix] = max(0, held - 1)
+            # A freed slot on a saturated prefix makes its backlog
+            # claimable again.
+            if held >= self.prefix_limit(prefix):
+                self._wake.set()
+
+    # ─── Idle wait ───────────────────────────────────────────────
+
+    async def _wait_for_work(self) -> None:
+        timeout = self.IDLE_POLL_SECONDS if self._listening else self.POLL_INTERVAL_SECONDS
+        try:
+            due_in = await self._aseconds_until_next_due(self._saturated_prefixes())
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("outbox: next-due lookup failed — %s", exc)
+            due_in = None
+        if due_in is not None:
+            timeout = min(timeout, max(due_in, 0.05))
+        if self._completions:
+            timeout = min(timeout, self.FLUSH_INTERVAL_SECONDS)
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wake.clear()
+
+    def _seconds_until_next_due(self, exclude: List[str]) -> Optional[float]:
+        db = get_db()
+        if not hasattr(db, "connect"):
+            return None
+        with db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(_NEXT_DUE_SQL, (list(exclude),))
+            row = cur.fetchone()
+        return _seconds_until(row)
+
+    async def _aseconds_until_next_due(self, exclude: List[str]) -> Optional[float]:
+        adb = async_db_for(get_db())
+        if adb is None:
+            return self._seconds_until_next_due(exclude)
+        return _seconds_until(await adb.fetchone(_NEXT_DUE_SQL, (list(exclude),)))
+
+    async def _listen(self) -> None:
+        """Hold a ``LISTEN`` connection and wake the dispatch loop on
+        every notification. Reconnects with backoff; while it is down
+        the loop polls every ``POLL_INTERVAL_SECONDS``."""
+        dsn = getattr(get_db(), "dsn", None)
+        if not dsn:
+            return
+        import psycopg
+
+        delay = 1.0
+        while not self._stop:
             try:
-                await handler(event)
-                self._mark_succeeded(event)
-                stats.succeeded += 1
+                conn = await psycopg.AsyncConnection.connect(dsn, autocommit=True)
+                async with conn:
+                    await conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                    self._listening = True
+                    delay = 1.0
+                    # Rows enqueued while we were disconnected.
+                    self._wake.set()
+                    async for _notify in conn.notifies():
+                        self._wake.set()
+            except asyncio.CancelledError:
+                raise
             except Exception as exc:  # noqa: BLE001
-                logger.warning(
-                    "outbox: handler %s failed for event %s — %s",
-                    event.target, event.id, exc,
-                )
-                self._mark_failed(event, str(exc))
-                if event.attempts + 1 >= event.max_attempts:
-                    stats.dead += 1
-                else:
-                    stats.failed += 1
-        return stats
+                logger.warning("outbox: LISTEN %s connection lost — %s", NOTIFY_CHANNEL, exc)
+            finally:
+                self._listening = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.LISTEN_RECONNECT_MAX_SECONDS)
 
     # ─── Internal state transitions ──────────────────────────────
 
-    def _claim_due_events(self) -> List[OutboxEvent]:
-        """Atomically transition pending/failed rows whose
-        next_attempt_at has elapsed to status='processing' and
-        return them. Atomic because the UPDATE filters on the old
-        status — concurrent workers competing for the same row will
-        only have one win the UPDATE."""
+    def _claim_due_events(
+        self,
+        limit: int,
+        *,
+        exclude: Optional[List[str]] = None,
+    ) -> List[OutboxEvent]:
+        """Atomically transition up to ``limit`` pending/failed rows
+        whose next_attempt_at has elapsed to status='processing' and
+        return them, interleaved across organizations. Rows stuck in
+        ``processing`` past ``PROCESSING_LEASE_SECONDS`` are reclaimed
+        too. No prefix gets more rows than its free slots
+        (``prefix_limit`` minus what this worker already holds), so a
+        backlogged target can't fill the claim with rows that would
+        only wait on its semaphore. Rows whose target prefix is in
+        ``exclude`` are left for a later claim.
+        Atomic because the candidate rows are locked with SKIP LOCKED
+        — concurrent workers never claim the same row."""
         db = get_db()
         if not hasattr(db, "connect"):
             return []
         db.initialize()
-        now = datetime.now(timezone.utc).isoformat()
         with db.connect() as conn:
             cur = conn.cursor()
-            cur.execute(
-                """
-                UPDATE outbox_events
-                SET status = 'processing',
-                    last_attempted_at = %s,
-                    updated_at = %s
-                WHERE id IN (
-                    SELECT id FROM outbox_events
-                    WHERE status IN ('pending', 'failed')
-                      AND (next_attempt_at IS NULL OR next_attempt_at <= %s)
-                    ORDER BY next_attempt_at ASC
-                    LIMIT %s
-                    FOR UPDATE SKIP LOCKED
-                )
-                RETURNING *
-                """,
-                (now, now, now, self.batch_size),
-            )
+            cur.execute(_CLAIM_SQL, self._claim_params(limit, exclude))
             rows = cur.fetchall()
             conn.commit()
-        return [_row_to_event(dict(r)) for r in rows or []]
+        return self._claimed(rows, limit)
+
+    async def _aclaim_due_events(
+        self,
+        limit: int,
+        *,
+        exclude: Optional[List[str]] = None,
+    ) -> List[OutboxEvent]:
+        """:meth:`_claim_due_events` over the async DB facade, so the
+        claim doesn't stall dispatch tasks sharing the loop."""
+        adb = async_db_for(get_db())
+        if adb is None:
+            return self._claim_due_events(limit, exclude=exclude)
+        await adb.initialize()
+        async with adb.connect() as conn:
+            cur = conn.cursor()
+            await cur.execute(_CLAIM_SQL, self._claim_params(limit, exclude))
+            rows = await cur.fetchall()
+            await conn.commit()
+        return self._claimed(rows, limit)
+
+    def _claim_params(self, limit: int, exclude: Optional[List[str]]) -> tuple:
+        now_dt = datetime.now(timezone.utc)
+        now = now_dt.isoformat()
+        lease_expired = (now_dt - timedelta(seconds=self.PROCESSING_LEASE_SECONDS)).isoformat()
+        free = self._free_prefix_slots()
+        return (
+            now, lease_expired, list(exclude or []),
+            limit * self.FAIRNESS_WINDOW,
+            list(free), list(free.values()), self.DEFAULT_PREFIX_CONCURRENCY,
+            limit, now, now,
+        )
+
+    def _free_prefix_slots(self) -> Dict[str, int]:
+        """Slots each known prefix can still take; prefixes not listed
+        hold nothing and get ``DEFAULT_PREFIX_CONCURRENCY``."""
+        prefixes = set(self.prefix_concurrency) | set(self._held)
+        return {
+            prefix: max(0, self.prefix_limit(prefix) - self._held.get(prefix, 0))
+            for prefix in sorted(prefixes)
+        }
+
+    def _claimed(self, rows: Any, limit: int) -> List[OutboxEvent]:
+        # RETURNING order is unspecified; restore the fair order.
+        events = sorted(
+            (_row_to_event(dict(r)) for r in rows or []),
+            key=lambda e: (e.next_attempt_at or "", e.created_at),
+        )
+        events = _interleave_by_org(events)
+        for event in events:
+            prefix = _target_prefix(event.target)
+            self._held[prefix] = self._held.get(prefix, 0) + 1
+        self._adapt_claim_size(limit, len(events))
+        self.metrics.record_claim(len(events), self._claim_size)
+        return events
+
+    def _adapt_claim_size(self, requested: int, claimed: int) -> None:
+        if requested > 0 and claimed >= requested:
+            self._claim_size = min(self._claim_size * 2, max(self.MAX_BATCH_SIZE, self.batch_size))
+        elif claimed * 4 < requested:
+            self._claim_size = max(self._claim_size // 2, self.batch_size)
+
+    # Completions are buffered and written by ``_flush_completions`` —
+    # one UPDATE per tick instead of one round trip per event. A crash
+    # before the flush leaves the rows in ``processing`` until the
+    # claim reclaims them after ``PROCESSING_LEASE_SECONDS``: the side
+    # effect may re-fire, which is the outbox's at-least-once contract.
 
     def _mark_succeeded(self, event: OutboxEvent) -> None:
-        db = get_db()
         now = datetime.now(timezone.utc).isoformat()
-        with db.connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                UPDATE outbox_events
-                SET status = 'succeeded',
-                    succeeded_at = %s, updated_at = %s,
-                    attempts = attempts + 1
-                WHERE id = %s
-                """,
-                (now, now, event.id),
-            )
-            conn.commit()
+        self._completions.append((
+            event.id, "succeeded", event.attempts + 1,
+            event.next_attempt_at, now, now, None,
+        ))
 
     def _mark_failed(self, event: OutboxEvent, error: str) -> None:
         attempts = event.attempts + 1
@@ -371,52 +886,84 @@ class OutboxWorker:
             datetime.now(timezone.utc) + timedelta(seconds=backoff_seconds + jitter)
         ).isoformat()
         now = datetime.now(timezone.utc).isoformat()
-        db = get_db()
         new_log_entry = {
             "attempt": attempts,
             "at": now,
             "error": error[:500],
         }
         new_error_log = list(event.error_log) + [new_log_entry]
-        with db.connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                UPDATE outbox_events
-                SET status = %s, attempts = %s,
-                    next_attempt_at = %s, updated_at = %s,
-                    error_log_json = %s
-                WHERE id = %s
-                """,
-                (
-                    next_status, attempts,
-                    next_at if next_status == "failed" else None,
-                    now, json.dumps(new_error_log), event.id,
-                ),
-            )
-            conn.commit()
+        self._completions.append((
+            event.id, next_status, attempts,
+            next_at if next_status == "failed" else None,
+            None, now, json.dumps(new_error_log),
+        ))
 
     def _mark_dead(self, event: OutboxEvent, reason: str) -> None:
         now = datetime.now(timezone.utc).isoformat()
-        db = get_db()
         log = list(event.error_log) + [{
             "attempt": event.attempts + 1,
             "at": now,
             "error": reason,
             "terminal": True,
         }]
-        with db.connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                UPDATE outbox_events
-                SET status = 'dead', updated_at = %s,
-                    error_log_json = %s, attempts = %s
-                WHERE id = %s
-                """,
-                (now, json.dumps(log), event.attempts + 1, event.id),
-            )
-            conn.commit()
+        self._completions.append((
+            event.id, "dead", event.attempts + 1,
+            event.next_attempt_at, None, now, json.dumps(log),
+        ))
+
+    def _flush_due(self) -> bool:
+        if not self._completions:
+            return False
+        return (
+            len(self._completions) >= self.FLUSH_MAX_ROWS
+            or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL_SECONDS
+        )
+
+    def _flush_completions(self) -> int:
+        """Write every buffered completion, ``FLUSH_MAX_ROWS`` rows per
+        ``UPDATE ... FROM (VALUES ...)``. On error the batch goes back
+        on the buffer for the next tick. Returns rows written."""
+        self._last_flush = time.monotonic()
+        if not self._completions:
+            return 0
+        batch, self._completions = self._completions, []
+        written = 0
+        try:
+            db = get_db()
+            with db.connect() as conn:
+                cur = conn.cursor()
+                while written < len(batch):
+                    chunk = batch[written:written + self.FLUSH_MAX_ROWS]
+                    cur.execute(_flush_sql(len(chunk)), tuple(v for row in chunk for v in row))
+                    conn.commit()
+                    written += len(chunk)
+        except Exception:
+            self._completions = batch[written:] + self._completions
+            raise
+        return written
+
+    async def _aflush_completions(self) -> int:
+        """:meth:`_flush_completions` over the async DB facade."""
+        adb = async_db_for(get_db())
+        if adb is None:
+            return self._flush_completions()
+        self._last_flush = time.monotonic()
+        if not self._completions:
+            return 0
+        batch, self._completions = self._completions, []
+        written = 0
+        try:
+            async with adb.connect() as conn:
+                cur = conn.cursor()
+                while written < len(batch):
+                    chunk = batch[written:written + self.FLUSH_MAX_ROWS]
+                    await cur.execute(_flush_sql(len(chunk)), tuple(v for row in chunk for v in row))
+                    await conn.commit()
+                    written += len(chunk)
+        except Exception:
+            self._completions = batch[written:] + self._completions
+            raise
+        return written
 
 
 # ─── Ops helpers (called by /api/ops/outbox/* routes) ──────────────
@@ -533,11 +1080,21 @@ def replay_events(
     observer; replay last 24h of state transitions through the new
     logic." Each replay creates a NEW row (with parent_event_id
     linking to the original) so the original audit trail is
-    preserved."""
+    preserved.
+
+    Set-based: one ``INSERT ... SELECT`` copies the whole window, so a
+    large replay costs one statement rather than a lookup + insert per
+    row. Replays strip ``dedupe_key`` so they're accepted as new
+    intents (operator's responsibility to ensure the side-effect is
+    genuinely safe to re-fire — usually it is, since we only replay
+    observer fan-outs which are idempotent by design)."""
     db = get_db()
     if not hasattr(db, "connect"):
         return 0
     db.initialize()
+    from solden.core.org_utils import assert_org_id
+
+    organization_id = assert_org_id(organization_id, context="replay_events")
     clauses = ["organization_id = %s"]
     params: List[Any] = [organization_id]
     if event_type:
@@ -549,36 +1106,41 @@ def replay_events(
     if until:
         clauses.append("created_at <= %s")
         params.append(until)
+    params.append(int(limit))
+    now = datetime.now(timezone.utc).isoformat()
     sql = (
-        "SELECT * FROM outbox_events WHERE "
+        """
+        INSERT INTO outbox_events
+          (id, organization_id, event_type, target,
+           payload_json, dedupe_key, parent_event_id,
+           status, attempts, max_attempts,
+           next_attempt_at, last_attempted_at, succeeded_at,
+           error_log_json, created_at, updated_at, created_by)
+        SELECT
+           'OE-' || replace(gen_random_uuid()::text, '-', ''),
+           organization_id, event_type, target,
+           payload_json, NULL, id,
+           'pending', 0, 5,
+           %s, NULL, NULL,
+           '[]', %s, %s, %s
+        FROM (
+            SELECT id, organization_id, event_type, target, payload_json
+            FROM outbox_events
+            WHERE """
         + " AND ".join(clauses)
-        + " ORDER BY created_at DESC LIMIT %s"
+        + """
+            ORDER BY created_at DESC
+            LIMIT %s
+        ) AS originals
+        RETURNING id
+        """
     )
-    params.append(int(limit))
     with db.connect() as conn:
         cur = conn.cursor()
-        cur.execute(sql, tuple(params))
+        cur.execute(sql, (now, now, now, f"replay:{actor}", *params))
         rows = cur.fetchall()
-    count = 0
-    writer = OutboxWriter(organization_id)
-    for r in rows or []:
-        original = _row_to_event(dict(r))
-        # Strip dedupe_key on replay so it's accepted as a new
-        # intent (operator's responsibility to ensure the side-effect
-        # is genuinely safe to re-fire — usually it is, since we
-        # only replay observer fan-outs which are idempotent by
-        # design).
-        new_id = writer.enqueue(
-            event_type=original.event_type,
-            target=original.target,
-            payload=original.payload,
-            dedupe_key=None,
-            parent_event_id=original.id,
-            actor=f"replay:{actor}",
-        )
-        if new_id:
-            count += 1
-    return count
+        conn.commit()
+    return len(rows or [])
 
 
 def _fetch_event_by_id(event_id: str) -> Optional[OutboxEvent]:
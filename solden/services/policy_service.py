@@ -35,8 +35,8 @@ import json
 import logging
 import uuid
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Set
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from solden.core.database import get_db
 
@@ -177,6 +177,152 @@ class ReplayResult:
     summary: Dict[str, int] = field(default_factory=dict)
 
 
+# Kinds with a replay strategy; every other kind replays as "skipped".
+REPLAYABLE_KINDS: Set[str] = {"approval_thresholds", "gl_account_map"}
+
+# Streaming replay runs (``policy_replay_runs``): rows pulled per
+# server-side cursor fetch, items per partition (one Celery subtask
+# each), how long a running run may go without progress before the
+# sweep fails it, and the bounds that keep a run's report small no
+# matter how many items it covers.
+REPLAY_CHUNK_SIZE = 2000
+REPLAY_PARTITION_SIZE = 20000
+REPLAY_STALE_SECONDS = 1800
+REPLAY_REPORT_SAMPLE_LIMIT = 100
+REPLAY_REPORT_IDS_PER_TRANSITION = 5
+REPLAY_REPORT_MAX_TRANSITIONS = 500
+
+
+class ReplayReport:
+    """Compact, incrementally built result of a replay run.
+
+    Instead of one :class:`ReplayDelta` per changed item, keeps a
+    count per ``(field, current_value, replayed_value)`` transition
+    with a few example AP item ids each, plus the first
+    ``sample_limit`` deltas. Memory is bounded by the number of
+    distinct transitions (itself capped — the overflow is counted in
+    ``other_changes``), not by the size of the window.
+
+    Chunk reports are merged in stream order, so the result is the
+    same however the items were chunked or which worker evaluated
+    them. :meth:`snapshot` / :meth:`from_snapshot` carry a partial
+    report between processes with that order intact.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_limit: int = REPLAY_REPORT_SAMPLE_LIMIT,
+        ids_per_transition: int = REPLAY_REPORT_IDS_PER_TRANSITION,
+        max_transitions: int = REPLAY_REPORT_MAX_TRANSITIONS,
+    ) -> None:
+        self.sample_limit = sample_limit
+        self.ids_per_transition = ids_per_transition
+        self.max_transitions = max_transitions
+        self.items_evaluated = 0
+        self.summary: Dict[str, int] = {"would_change": 0, "no_change": 0, "skipped": 0}
+        self.transitions: Dict[tuple, Dict[str, Any]] = {}
+        self.other_changes = 0
+        self.samples: List[ReplayDelta] = []
+
+    def add(self, items_evaluated: int, deltas: List[ReplayDelta], summary: Dict[str, int]) -> None:
+        """Fold one evaluated batch (a strategy's output) into the report."""
+        self.items_evaluated += int(items_evaluated)
+        self._add_summary(summary)
+        for delta in deltas:
+            self._count(delta.field, delta.current_value, delta.replayed_value, 1, [delta.ap_item_id])
+        self._add_samples(deltas)
+
+    def merge(self, other: "ReplayReport") -> None:
+        """Fold another report (typically one chunk's) into this one."""
+        self.items_evaluated += other.items_evaluated
+        self._add_summary(other.summary)
+        for entry in other.transitions.values():
+            self._count(
+                entry["field"], entry["current_value"], entry["replayed_value"],
+                entry["count"], entry["sample_ap_item_ids"],
+            )
+        self.other_changes += other.other_changes
+        self._add_samples(other.samples)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-safe state, transitions in first-seen order (unlike
+        :meth:`to_dict`, which sorts them for display)."""
+        return {
+            "items_evaluated": self.items_evaluated,
+            "summary": dict(self.summary),
+            "transitions": [dict(entry) for entry in self.transitions.values()],
+            "other_changes": self.other_changes,
+            "samples": [
+                [d.ap_item_id, d.field, d.current_value, d.replayed_value]
+                for d in self.samples
+            ],
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any], **limits: int) -> "ReplayReport":
+        report = cls(**limits)
+        report.items_evaluated = int(data.get("items_evaluated") or 0)
+        report._add_summary(data.get("summary") or {})
+        for entry in data.get("transitions") or []:
+            report._count(
+                entry["field"], entry["current_value"], entry["replayed_value"],
+                int(entry["count"]), list(entry.get("sample_ap_item_ids") or []),
+            )
+        report.other_changes += int(data.get("other_changes") or 0)
+        report._add_samples([ReplayDelta(*sample) for sample in data.get("samples") or []])
+        return report
+
+    def to_dict(self) -> Dict[str, Any]:
+        transitions = sorted(
+            self.transitions.values(),
+            key=lambda entry: (-entry["count"], entry["field"]),
+        )
+        return {
+            "items_evaluated": self.items_evaluated,
+            "summary": dict(self.summary),
+            "transitions": [dict(entry) for entry in transitions],
+            "other_changes": self.other_changes,
+            "sample_deltas": [
+                {
+                    "ap_item_id": d.ap_item_id,
+                    "field": d.field,
+                    "current_value": d.current_value,
+                    "replayed_value": d.replayed_value,
+                }
+                for d in self.samples
+            ],
+        }
+
+    def _add_summary(self, summary: Dict[str, int]) -> None:
+        for key, value in (summary or {}).items():
+            self.summary[key] = self.summary.get(key, 0) + int(value or 0)
+
+    def _add_samples(self, deltas: List[ReplayDelta]) -> None:
+        room = self.sample_limit - len(self.samples)
+        if room > 0:
+            self.samples.extend(deltas[:room])
+
+    def _count(self, field_name: str, current: Any, replayed: Any, count: int, ap_item_ids: List[str]) -> None:
+        key = (field_name, _transition_key(current), _transition_key(replayed))
+        entry = self.transitions.get(key)
+        if entry is None:
+            if len(self.transitions) >= self.max_transitions:
+                self.other_changes += count
+                return
+            entry = self.transitions[key] = {
+                "field": field_name,
+                "current_value": current,
+                "replayed_value": replayed,
+                "count": 0,
+                "sample_ap_item_ids": [],
+            }
+        entry["count"] += count
+        room = self.ids_per_transition - len(entry["sample_ap_item_ids"])
+        if room > 0:
+            entry["sample_ap_item_ids"].extend(ap_item_ids[:room])
+
+
 class PolicyKindError(ValueError):
     """Raised when an unknown policy kind is referenced."""
 
@@ -665,19 +811,12 @@ class PolicyService:
         target = self.get_version(version_id)
         kind = target.policy_kind
         ap_items = self._fetch_ap_items_for_replay(since=since, until=until, limit=limit)
-        deltas: List[ReplayDelta] = []
-        summary: Dict[str, int] = {"would_change": 0, "no_change": 0, "skipped": 0}
-
-        if kind == "approval_thresholds":
-            deltas, summary = _replay_approval_thresholds(target.content, ap_items)
-        elif kind == "gl_account_map":
-            deltas, summary = _replay_gl_account_map(target.content, ap_items)
-        else:
-            summary["skipped"] = len(ap_items)
+        if kind not in REPLAYABLE_KINDS:
             logger.info(
                 "policy_service: replay for kind=%s is not yet implemented; %d items skipped",
                 kind, len(ap_items),
             )
+        deltas, summary = _replay_chunk(kind, target.content, ap_items)
 
         return ReplayResult(
             target_version_id=target.id,
@@ -688,6 +827,190 @@ class PolicyService:
             summary=summary,
         )
 
+    # ─── Streaming replay runs ────────────────────────────────────
+    #
+    # ``replay_against`` is the interactive path: one capped window,
+    # every delta returned. A replay run covers the whole window
+    # (a year of history before promoting a branch) as a background
+    # job on ``policy_replay_runs``. :meth:`start_replay_run` claims
+    # the run and splits the window into keyset ranges on
+    # ``(created_at_tz, id)`` (``policy_replay_partitions``); each
+    # range is one Celery subtask (:meth:`run_replay_partition`) that
+    # pages its items off a server-side cursor into a
+    # :class:`ReplayReport`. The last partition to finish merges the
+    # partition reports in range order into the run's report. The run
+    # row carries progress while the run is going and the report once
+    # done; :func:`fail_stale_replay_runs` fails runs that stop moving.
+
+    def create_replay_run(
+        self,
+        version_id: str,
+        *,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        requested_by: str = "system",
+    ) -> Dict[str, Any]:
+        """Queue a replay run of ``version_id`` over ``[since, until]``.
+
+        The caller dispatches the ``run_policy_replay`` Celery task
+        (or calls :meth:`run_replay` inline). Raises
+        :class:`PolicyVersionNotFound` for an unknown version.
+        """
+        target = self.get_version(version_id)
+        run_id = f"PRR-{uuid.uuid4().hex}"
+        now = datetime.now(timezone.utc).isoformat()
+        self.db.initialize()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                """
+                INSERT INTO policy_replay_runs
+                  (id, organization_id, target_version_id, target_version_number,
+                   target_kind, requested_by, filters_json, status,
+                   items_evaluated, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, 'queued', 0, %s, %s)
+                """,
+                (
+                    run_id, self.organization_id, target.id, target.version_number,
+                    target.policy_kind, requested_by or "system",
+                    json.dumps({"since": since, "until": until}), now, now,
+                ),
+            )
+            conn.commit()
+        return self.get_replay_run(run_id) or {"id": run_id, "status": "queued"}
+
+    def get_replay_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """One replay run for this org (None when absent or cross-tenant)."""
+        self.db.initialize()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT * FROM policy_replay_runs WHERE id = %s AND organization_id = %s",
+                (run_id, self.organization_id),
+            )
+            row = cur.fetchone()
+        return _row_to_replay_run(dict(row)) if row else None
+
+    def mark_replay_run_failed(self, run_id: str, error_message: str) -> None:
+        self._update_replay_run(
+            run_id,
+            status="failed",
+            error_message=str(error_message)[:500],
+            completed_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+    def run_replay(
+        self,
+        run_id: str,
+        *,
+        chunk_size: int = REPLAY_CHUNK_SIZE,
+        partition_size: int = REPLAY_PARTITION_SIZE,
+    ) -> Optional[Dict[str, Any]]:
+        """Execute a queued replay run in this process and return its
+        final row: :meth:`start_replay_run`, then every partition in
+        turn. The Celery path fans the partitions out instead.
+        """
+        for index in self.start_replay_run(run_id, partition_size=partition_size):
+            self.run_replay_partition(run_id, index, chunk_size=chunk_size)
+        return self.get_replay_run(run_id)
+
+    def start_replay_run(
+        self, run_id: str, *, partition_size: int = REPLAY_PARTITION_SIZE,
+    ) -> List[int]:
+        """Claim a queued run and plan its partitions.
+
+        The ``queued`` → ``running`` flip is one conditional UPDATE, so
+        of two deliveries of the same task only one gets the run; the
+        other (and any run already past ``queued``) gets ``[]``. Returns
+        the partition indexes to dispatch — ``[]`` too when the run
+        finished on the spot (a kind without a replay strategy, or an
+        empty window). Failures land on the row as ``status='failed'``;
+        they are not raised.
+        """
+        run = self._claim_replay_run(run_id)
+        if run is None:
+            return []
+        filters = run.get("filters") or {}
+        since, until = filters.get("since"), filters.get("until")
+        try:
+            target = self.get_version(run["target_version_id"])
+            total = self._count_ap_items_for_replay(since=since, until=until)
+            self._update_replay_run(run_id, items_total=total)
+            bounds: List[Tuple[str, str]] = []
+            if target.policy_kind in REPLAYABLE_KINDS and total:
+                bounds = self._plan_replay_partitions(
+                    since=since, until=until, partition_size=partition_size,
+                )
+            if not bounds:
+                report = ReplayReport()
+                if target.policy_kind not in REPLAYABLE_KINDS:
+                    logger.info(
+                        "policy_service: replay for kind=%s is not yet implemented; %d items skipped",
+                        target.policy_kind, total,
+                    )
+                    report.add(total, [], {"skipped": total})
+                self._finish_replay_run(run_id, report)
+                return []
+            self._insert_replay_partitions(run_id, bounds)
+            return list(range(len(bounds)))
+        except Exception as exc:
+            self._fail_replay_run(run_id, exc)
+            return []
+
+    def run_replay_partition(
+        self, run_id: str, index: int, *, chunk_size: int = REPLAY_CHUNK_SIZE,
+    ) -> None:
+        """Replay one partition of a running run.
+
+        Claims the partition (``queued`` → ``running``, only while the
+        run itself is running), streams its keyset range chunk by chunk
+        — bumping the run's ``items_evaluated`` and ``updated_at`` per
+        chunk — and stores the partition's report. Whichever partition
+        finishes last merges them all into the run. A failure fails the
+        partition and the run; it is not raised.
+        """
+        partition = self._claim_replay_partition(run_id, index)
+        if partition is None:
+            return
+        try:
+            run = self.get_replay_run(run_id) or {}
+            filters = run.get("filters") or {}
+            target = self.get_version(run["target_version_id"])
+            lower = (partition["lower_created_at"], partition["lower_id"])
+            upper = (
+                (partition["upper_created_at"], partition["upper_id"])
+                if partition.get("upper_id") else None
+            )
+            report = ReplayReport()
+            for chunk in self._iter_ap_item_chunks(
+                since=filters.get("since"), until=filters.get("until"),
+                chunk_size=chunk_size, lower=lower, upper=upper,
+            ):
+                deltas, summary = _replay_chunk(target.policy_kind, target.content, chunk)
+                report.add(len(chunk), deltas, summary)
+                self._record_replay_progress(run_id, len(chunk))
+            self._update_replay_partition(
+                run_id, index,
+                status="done",
+                items_evaluated=report.items_evaluated,
+                report_json=json.dumps(report.snapshot(), default=str),
+            )
+            self._finish_replay_run_if_complete(run_id)
+        except Exception as exc:
+            logger.exception(
+                "policy_service: replay run %s partition %s failed: %s", run_id, index, exc,
+            )
+            try:
+                self._update_replay_partition(
+                    run_id, index, status="failed", error_message=str(exc)[:500],
+                )
+            except Exception as inner:  # noqa: BLE001
+                logger.exception(
+                    "policy_service: also failed to mark replay partition %s/%s failed: %s",
+                    run_id, index, inner,
+                )
+            self._fail_replay_run(run_id, exc)
+
     # ─── Internals ────────────────────────────────────────────────
 
     def _fetch_latest(self, kind: str) -> Optional[PolicyVersion]:
@@ -856,6 +1179,273 @@ class PolicyService:
             rows = cur.fetchall()
         return [dict(r) for r in rows]
 
+    def _replay_window_clauses(
+        self, *, since: Optional[str], until: Optional[str],
+    ) -> tuple[List[str], List[Any]]:
+        # Replay runs filter on the generated ``created_at_tz`` column
+        # (v107) so the window is an index range scan on
+        # ``idx_ap_items_org_created_tz``.
+        # Rows whose created_at doesn't parse (NULL created_at_tz) have
+        # no place in the keyset order and are left out.
+        clauses = ["organization_id = %s", "created_at_tz IS NOT NULL"]
+        params: List[Any] = [self.organization_id]
+        if since:
+            clauses.append("created_at_tz >= %s::timestamptz")
+            params.append(since)
+        if until:
+            clauses.append("created_at_tz <= %s::timestamptz")
+            params.append(until)
+        return clauses, params
+
+    def _count_ap_items_for_replay(self, *, since: Optional[str], until: Optional[str]) -> int:
+        self.db.initialize()
+        clauses, params = self._replay_window_clauses(since=since, until=until)
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT COUNT(*) AS n FROM ap_items WHERE " + " AND ".join(clauses),
+                tuple(params),
+            )
+            row = cur.fetchone()
+        return int(dict(row).get("n") or 0) if row else 0
+
+    def _plan_replay_partitions(
+        self, *, since: Optional[str], until: Optional[str], partition_size: int,
+    ) -> List[Tuple[str, str]]:
+        """Lower ``(created_at_tz, id)`` bound of every ``partition_size``
+        items of the window, in order; partition ``i`` runs up to bound
+        ``i + 1`` (the last one to the end of the window)."""
+        self.db.initialize()
+        clauses, params = self._replay_window_clauses(since=since, until=until)
+        # ``lower_ts``: dict_row drops ``created_at_tz`` from result rows
+        # unless it is selected under an alias.
+        sql = (
+            "SELECT lower_ts, id FROM ("
+            " SELECT created_at_tz AS lower_ts, id,"
+            " ROW_NUMBER() OVER (ORDER BY created_at_tz, id) AS rn"
+            " FROM ap_items WHERE " + " AND ".join(clauses)
+            + ") numbered WHERE rn %% %s = 1 ORDER BY lower_ts, id"
+        )
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, (*params, max(1, int(partition_size))))
+            rows = cur.fetchall()
+        bounds = []
+        for row in rows:
+            row = dict(row)
+            created = row["lower_ts"]
+            bounds.append((
+                created.isoformat() if hasattr(created, "isoformat") else str(created),
+                str(row["id"]),
+            ))
+        return bounds
+
+    def _iter_ap_item_chunks(
+        self,
+        *,
+        since: Optional[str],
+        until: Optional[str],
+        chunk_size: int,
+        lower: Optional[Tuple[str, str]] = None,
+        upper: Optional[Tuple[str, str]] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the window's AP items, oldest first, ``chunk_size`` at a time.
+
+        ``lower`` (inclusive) and ``upper`` (exclusive) narrow it to one
+        partition's ``(created_at_tz, id)`` range. Uses a named
+        (server-side) cursor, so Postgres holds the result set and only
+        one chunk is in this process at a time. Selects just the columns
+        the replay strategies read.
+        """
+        self.db.initialize()
+        clauses, params = self._replay_window_clauses(since=since, until=until)
+        if lower is not None:
+            clauses.append("(created_at_tz, id) >= (%s::timestamptz, %s)")
+            params.extend(lower)
+        if upper is not None:
+            clauses.append("(created_at_tz, id) < (%s::timestamptz, %s)")
+            params.extend(upper)
+        sql = (
+            "SELECT id, amount, vendor_name, state, metadata FROM ap_items WHERE "
+            + " AND ".join(clauses)
+            + " ORDER BY created_at_tz, id"
+        )
+        size = max(1, int(chunk_size))
+        with self.db.connect() as conn:
+            cur = conn.cursor(name=f"policy_replay_{uuid.uuid4().hex[:16]}")
+            cur.itersize = size
+            try:
+                cur.execute(sql, tuple(params))
+                while True:
+                    rows = cur.fetchmany(size)
+                    if not rows:
+                        break
+                    yield [dict(r) for r in rows]
+            finally:
+                cur.close()
+                # A named cursor lives in a transaction; end it rather
+                # than hand the pool an open read transaction.
+                conn.commit()
+
+    _REPLAY_RUN_COLUMNS = frozenset({
+        "status", "items_total", "items_evaluated", "summary_json",
+        "report_json", "error_message", "started_at", "completed_at",
+    })
+
+    def _update_replay_run(self, run_id: str, **fields: Any) -> None:
+        unknown = set(fields) - self._REPLAY_RUN_COLUMNS
+        if unknown:
+            raise ValueError(f"unknown policy_replay_runs columns: {sorted(unknown)}")
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        assignments = ", ".join(f"{column} = %s" for column in fields)
+        self.db.initialize()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"UPDATE policy_replay_runs SET {assignments} "
+                "WHERE id = %s AND organization_id = %s",
+                (*fields.values(), run_id, self.organization_id),
+            )
+            conn.commit()
+
+    def _claim_replay_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        now = datetime.now(timezone.utc).isoformat()
+        self.db.initialize()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE policy_replay_runs SET status = 'running', started_at = %s, updated_at = %s "
+                "WHERE id = %s AND organization_id = %s AND status = 'queued' "
+                "RETURNING *",
+                (now, now, run_id, self.organization_id),
+            )
+            row = cur.fetchone()
+            conn.commit()
+        return _row_to_replay_run(dict(row)) if row else None
+
+    def _fail_replay_run(self, run_id: str, exc: Exception) -> None:
+        logger.exception("policy_service: replay run %s failed: %s", run_id, exc)
+        try:
+            self.mark_replay_run_failed(run_id, str(exc))
+        except Exception as inner:  # noqa: BLE001
+            logger.exception(
+                "policy_service: also failed to mark replay run %s failed: %s", run_id, inner,
+            )
+
+    def _record_replay_progress(self, run_id: str, evaluated: int) -> None:
+        # An increment, not a SET: partitions report concurrently.
+        self.db.initialize()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE policy_replay_runs SET items_evaluated = items_evaluated + %s, updated_at = %s "
+                "WHERE id = %s AND organization_id = %s",
+                (int(evaluated), datetime.now(timezone.utc).isoformat(), run_id, self.organization_id),
+            )
+            conn.commit()
+
+    def _finish_replay_run(self, run_id: str, report: ReplayReport) -> None:
+        self._update_replay_run(
+            run_id,
+            status="done",
+            items_evaluated=report.items_evaluated,
+            summary_json=json.dumps(report.summary),
+            report_json=json.dumps(report.to_dict(), default=str),
+            completed_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+    def _finish_replay_run_if_complete(self, run_id: str) -> None:
+        """Merge the partition reports into the run once none is left.
+
+        Called by every partition after it stores its report. Two
+        partitions finishing together may both get here and both
+        compute the same report; the ``status = 'running'`` guard lets
+        one write it.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        self.db.initialize()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT status, report_json FROM policy_replay_partitions "
+                "WHERE run_id = %s AND organization_id = %s ORDER BY partition_index",
+                (run_id, self.organization_id),
+            )
+            rows = [dict(r) for r in cur.fetchall()]
+            if not rows or any(row["status"] != "done" for row in rows):
+                return
+            report = ReplayReport()
+            for row in rows:
+                report.merge(ReplayReport.from_snapshot(json.loads(row["report_json"] or "{}")))
+            cur.execute(
+                "UPDATE policy_replay_runs SET status = 'done', items_evaluated = %s, "
+                "summary_json = %s, report_json = %s, completed_at = %s, updated_at = %s "
+                "WHERE id = %s AND organization_id = %s AND status = 'running' "
+                "AND NOT EXISTS (SELECT 1 FROM policy_replay_partitions p "
+                "WHERE p.run_id = policy_replay_runs.id AND p.status <> 'done')",
+                (
+                    report.items_evaluated, json.dumps(report.summary),
+                    json.dumps(report.to_dict(), default=str), now, now,
+                    run_id, self.organization_id,
+                ),
+            )
+            conn.commit()
+
+    def _insert_replay_partitions(self, run_id: str, bounds: List[Tuple[str, str]]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        rows = []
+        for index, lower in enumerate(bounds):
+            upper = bounds[index + 1] if index + 1 < len(bounds) else (None, None)
+            rows.append((run_id, index, self.organization_id, *lower, *upper, now, now))
+        self.db.initialize()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "INSERT INTO policy_replay_partitions "
+                "(run_id, partition_index, organization_id, lower_created_at, lower_id, "
+                "upper_created_at, upper_id, status, created_at, updated_at) VALUES "
+                + ", ".join(["(%s, %s, %s, %s, %s, %s, %s, 'queued', %s, %s)"] * len(rows)),
+                tuple(v for row in rows for v in row),
+            )
+            conn.commit()
+
+    def _claim_replay_partition(self, run_id: str, index: int) -> Optional[Dict[str, Any]]:
+        self.db.initialize()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE policy_replay_partitions SET status = 'running', updated_at = %s "
+                "WHERE run_id = %s AND partition_index = %s AND organization_id = %s "
+                "AND status = 'queued' "
+                "AND EXISTS (SELECT 1 FROM policy_replay_runs r "
+                "WHERE r.id = policy_replay_partitions.run_id AND r.status = 'running') "
+                "RETURNING *",
+                (datetime.now(timezone.utc).isoformat(), run_id, int(index), self.organization_id),
+            )
+            row = cur.fetchone()
+            conn.commit()
+        return dict(row) if row else None
+
+    _REPLAY_PARTITION_COLUMNS = frozenset({
+        "status", "items_evaluated", "report_json", "error_message",
+    })
+
+    def _update_replay_partition(self, run_id: str, index: int, **fields: Any) -> None:
+        unknown = set(fields) - self._REPLAY_PARTITION_COLUMNS
+        if unknown:
+            raise ValueError(f"unknown policy_replay_partitions columns: {sorted(unknown)}")
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        assignments = ", ".join(f"{column} = %s" for column in fields)
+        self.db.initialize()
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"UPDATE policy_replay_partitions SET {assignments} "
+                "WHERE run_id = %s AND partition_index = %s AND organization_id = %s",
+                (*fields.values(), run_id, int(index), self.organization_id),
+            )
+            conn.commit()
+
 
 # ─── Module helpers ────────────────────────────────────────────────
 
@@ -1138,9 +1728,90 @@ def _row_to_branch(row: Dict[str, Any]) -> "PolicyBranch":
     )
 
 
+def _row_to_replay_run(row: Dict[str, Any]) -> Dict[str, Any]:
+    """``policy_replay_runs`` row → API shape, JSON columns decoded."""
+    out = {
+        key: row.get(key)
+        for key in (
+            "id", "organization_id", "target_version_id", "target_version_number",
+            "target_kind", "requested_by", "status", "items_total", "error_message",
+            "created_at", "started_at", "updated_at", "completed_at",
+        )
+    }
+    out["items_evaluated"] = int(row.get("items_evaluated") or 0)
+    for column, key in (("filters_json", "filters"), ("summary_json", "summary"), ("report_json", "report")):
+        raw = row.get(column)
+        if isinstance(raw, str):
+            try:
+                raw = json.loads(raw)
+            except Exception:
+                raw = None
+        out[key] = raw if isinstance(raw, dict) else ({} if key != "report" else None)
+    total = out.get("items_total")
+    out["progress"] = (
+        min(1.0, out["items_evaluated"] / total) if total else (1.0 if out["status"] == "done" else 0.0)
+    )
+    return out
+
+
+def fail_stale_replay_runs(*, stale_after_seconds: int = REPLAY_STALE_SECONDS) -> int:
+    """Fail running replay runs with no progress for ``stale_after_seconds``.
+
+    A run's ``updated_at`` moves with every chunk any partition
+    evaluates, so a run that stopped moving lost its worker (or its
+    subtasks). Across all orgs — this is the periodic sweep. Returns
+    the number of runs failed.
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = (now - timedelta(seconds=int(stale_after_seconds))).isoformat()
+    db = get_db()
+    db.initialize()
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "UPDATE policy_replay_runs SET status = 'failed', error_message = %s, "
+            "completed_at = %s, updated_at = %s "
+            "WHERE status = 'running' AND updated_at < %s "
+            "RETURNING id",
+            (
+                f"stale: no progress for {int(stale_after_seconds)}s",
+                now.isoformat(), now.isoformat(), cutoff,
+            ),
+        )
+        failed = cur.fetchall()
+        conn.commit()
+    for row in failed:
+        logger.warning("policy_service: replay run %s failed as stale", dict(row)["id"])
+    return len(failed)
+
+
 # ─── Replay strategies ─────────────────────────────────────────────
 
 
+def _replay_chunk(
+    kind: str, content: Dict[str, Any], ap_items: List[Dict[str, Any]],
+) -> tuple[List[ReplayDelta], Dict[str, int]]:
+    """Run ``kind``'s replay strategy over ``ap_items``.
+
+    Kinds without a strategy count every item as skipped.
+    """
+    if kind == "approval_thresholds":
+        return _replay_approval_thresholds(content, ap_items)
+    if kind == "gl_account_map":
+        return _replay_gl_account_map(content, ap_items)
+    return [], {"would_change": 0, "no_change": 0, "skipped": len(ap_items)}
+
+
+def _transition_key(value: Any) -> Any:
+    """Hashable stand-in for a delta value (strategies emit scalars,
+    but a dict/list value must not break aggregation)."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=str)
+
+
 def _replay_approval_thresholds(
     content: Dict[str, Any], ap_items: List[Dict[str, Any]],
 ) -> tuple[List[ReplayDelta], Dict[str, int]]:
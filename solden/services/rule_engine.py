@@ -8,7 +8,10 @@ Two layers:
   - **Evaluation** (``evaluate_rules``) — given an AP item context
     and a list of active rules, returns the FIRST matching rule
     plus a structured trace showing why each rule did or didn't
-    match. Test-mode in the API surfaces the same trace.
+    match. Test-mode in the API surfaces the same trace; it is built
+    only when read. Rule lists are compiled once per rule-set version
+    into field indexes (``compile_rules``); ``evaluate_rules_batch``
+    runs many contexts against one compiled list.
 
 Conditions schema (the body the operator writes in the JSON editor):
 
@@ -58,10 +61,17 @@ Conflict detection (``find_rule_conflicts``):
 """
 from __future__ import annotations
 
+import bisect
 import fnmatch
 import logging
+import math
+import operator
+import os
+import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -308,11 +318,32 @@ class RuleTrace:
         }
 
 
-@dataclass
 class EvaluationResult:
-    matched_rule: Optional[Dict[str, Any]]
-    matched_actions: List[Dict[str, Any]]
-    rule_trace: List[RuleTrace]
+    """First matching rule plus, on demand, the per-rule trace.
+
+    Routing only needs ``matched_rule``; the trace is built the first
+    time ``rule_trace`` (or ``to_dict``) is read, which test mode does.
+    """
+
+    def __init__(
+        self,
+        matched_rule: Optional[Dict[str, Any]],
+        matched_actions: List[Dict[str, Any]],
+        rule_trace: Optional[List[RuleTrace]] = None,
+        *,
+        trace_builder: Optional[Callable[[], List[RuleTrace]]] = None,
+    ) -> None:
+        self.matched_rule = matched_rule
+        self.matched_actions = matched_actions
+        self._rule_trace = rule_trace
+        self._trace_builder = trace_builder
+
+    @property
+    def rule_trace(self) -> List[RuleTrace]:
+        if self._rule_trace is None:
+            builder, self._trace_builder = self._trace_builder, None
+            self._rule_trace = builder() if builder is not None else []
+        return self._rule_trace
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -326,22 +357,41 @@ class EvaluationResult:
 def evaluate_rules(
     invoice_context: Dict[str, Any],
     rules: List[Dict[str, Any]],
+    *,
+    cache: bool = True,
 ) -> EvaluationResult:
     """Run an AP item context through a list of rules in priority order.
 
-    Returns the first matching rule's actions plus the full trace of
-    every rule's evaluation (for test-mode display).
+    Returns the first matching rule's actions. The full trace of every
+    rule's evaluation (for test-mode display) is built lazily from
+    ``rule_trace``. ``cache`` is passed to ``compile_rules``.
+    """
+    return compile_rules(rules, cache=cache).evaluate(invoice_context)
+
+
+def evaluate_rules_batch(
+    contexts: Iterable[Dict[str, Any]],
+    rules: List[Dict[str, Any]],
+) -> List[EvaluationResult]:
+    """``evaluate_rules`` over many contexts against one rule list.
+
+    The rule list is compiled (or fetched from the cache) once; used
+    by policy replay and bulk routing.
+    """
+    compiled = compile_rules(rules)
+    return [compiled.evaluate(context) for context in contexts]
+
+
+def _trace_rules(
+    invoice_context: Dict[str, Any],
+    sorted_rules: List[Dict[str, Any]],
+) -> List[RuleTrace]:
+    """Interpret every rule against the context, clause by clause.
+
+    The reference evaluator: the compiled path must agree with it on
+    which rule matches, and test mode displays its trace.
     """
-    sorted_rules = sorted(
-        rules,
-        key=lambda r: (
-            int(r.get("priority", 100)),
-            str(r.get("created_at", "")),
-        ),
-    )
     trace: List[RuleTrace] = []
-    matched_rule: Optional[Dict[str, Any]] = None
-    matched_actions: List[Dict[str, Any]] = []
 
     for rule in sorted_rules:
         if rule.get("status") != "active":
@@ -387,24 +437,17 @@ def evaluate_rules(
             invoice_context, mode="any",
         )
 
-        rule_matched = all_matched and any_matched
-        rt = RuleTrace(
+        trace.append(RuleTrace(
             rule_id=rule.get("id", ""),
             rule_name=rule.get("name", ""),
             priority=int(rule.get("priority", 100)),
-            matched=rule_matched,
+            matched=all_matched and any_matched,
             all_of_traces=all_traces,
             any_of_traces=any_traces,
-        )
-        trace.append(rt)
-
-        if rule_matched and matched_rule is None:
-            matched_rule = rule
-            matched_actions = list(rule.get("actions") or [])
-            # Continue iteration for full trace, but the first match
-            # wins — subsequent rules show as "skipped:already_matched".
+        ))
 
-    # Annotate post-match rules
+    # The first match wins — subsequent rules show as
+    # "rule_above_already_matched".
     seen_match = False
     for rt in trace:
         if rt.matched:
@@ -412,12 +455,7 @@ def evaluate_rules(
             continue
         if seen_match and rt.skipped_reason is None:
             rt.skipped_reason = "rule_above_already_matched"
-
-    return EvaluationResult(
-        matched_rule=matched_rule,
-        matched_actions=matched_actions,
-        rule_trace=trace,
-    )
+    return trace
 
 
 def _evaluate_clauses(
@@ -489,6 +527,374 @@ def _to_number(value: Any) -> float:
     return float(value)
 
 
+# ---------------------------------------------------------------------------
+# Compiled evaluation
+# ---------------------------------------------------------------------------
+#
+# A rule list is compiled once per rule-set version into bitmask
+# indexes, bit i being the i-th rule in priority order:
+#
+#   - status, workflow and entity scoping become masks looked up by the
+#     context's workflow and entity;
+#   - ``eq`` / ``in`` clauses under ``all_of`` become one hash lookup
+#     per field (value -> rules that accept it);
+#   - ``lt`` / ``lte`` / ``gt`` / ``gte`` clauses under ``all_of``
+#     collapse to one interval per rule and field, indexed as a sorted
+#     boundary table: one bisect yields every rule whose interval holds
+#     the value;
+#   - every other clause (``ne``, ``not_in``, ``contains``, ``matches``
+#     with its glob precompiled, all of ``any_of``) becomes a predicate
+#     that only runs for rules surviving the indexes, in priority order,
+#     until the first match.
+#
+# ``_trace_rules`` stays the reference semantics; the compiled form
+# must pick the same rule.
+
+_NUMERIC_COMPARE: Dict[str, Callable[[float, float], bool]] = {
+    "lt": operator.lt, "lte": operator.le,
+    "gt": operator.gt, "gte": operator.ge,
+}
+_COMPILED_CACHE_SIZE = 256
+_compiled_cache: "OrderedDict[Tuple[Any, ...], _RuleSetIndex]" = OrderedDict()
+_compiled_cache_lock = threading.Lock()
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def _never(context: Dict[str, Any]) -> bool:
+    return False
+
+
+def _clause_predicate(clause: Dict[str, Any]) -> Predicate:
+    """One clause as a predicate over the context (``_evaluate_op`` semantics)."""
+    field_name = clause.get("field")
+    op = str(clause.get("op") or "").lower()
+    expected = clause.get("value")
+
+    if op in _NUMERIC_COMPARE:
+        compare = _NUMERIC_COMPARE[op]
+        try:
+            bound = _to_number(expected)
+        except (TypeError, ValueError):
+            return _never
+
+        def _numeric(context: Dict[str, Any]) -> bool:
+            try:
+                return compare(_to_number(context.get(field_name)), bound)
+            except (TypeError, ValueError):
+                return False
+        return _numeric
+
+    if op == "matches":
+        glob = re.compile(fnmatch.translate(os.path.normcase(str(expected))))
+
+        def _matches(context: Dict[str, Any]) -> bool:
+            actual = context.get(field_name)
+            return actual is not None and glob.match(os.path.normcase(str(actual))) is not None
+        return _matches
+
+    return lambda context: _evaluate_op(op, context.get(field_name), expected)
+
+
+def _hashable_values(op: str, expected: Any) -> Optional[frozenset]:
+    """Values an ``eq`` / ``in`` clause accepts, or None if not hashable."""
+    try:
+        if op == "eq":
+            return frozenset((expected,))
+        if isinstance(expected, (list, tuple)) or not expected:
+            return frozenset(expected or ())
+    except TypeError:
+        pass
+    return None
+
+
+def _lookup(index: Dict[Any, int], value: Any) -> int:
+    try:
+        return index.get(value, 0)
+    except TypeError:  # unhashable context value equals no indexed key
+        return 0
+
+
+class _Interval:
+    """Intersection of one rule's numeric clauses on one field."""
+
+    __slots__ = ("lo", "lo_inclusive", "hi", "hi_inclusive")
+
+    def __init__(self) -> None:
+        self.lo: Optional[float] = None
+        self.lo_inclusive = True
+        self.hi: Optional[float] = None
+        self.hi_inclusive = True
+
+    def add(self, op: str, bound: float) -> None:
+        inclusive = op in ("gte", "lte")
+        if op in ("gt", "gte"):
+            if self.lo is None or bound > self.lo:
+                self.lo, self.lo_inclusive = bound, inclusive
+            elif bound == self.lo:
+                self.lo_inclusive = self.lo_inclusive and inclusive
+        else:
+            if self.hi is None or bound < self.hi:
+                self.hi, self.hi_inclusive = bound, inclusive
+            elif bound == self.hi:
+                self.hi_inclusive = self.hi_inclusive and inclusive
+
+    def empty(self) -> bool:
+        if self.lo is None or self.hi is None:
+            return False
+        return self.lo > self.hi or (
+            self.lo == self.hi and not (self.lo_inclusive and self.hi_inclusive)
+        )
+
+
+class _RangeIndex:
+    """Rules' intervals on one field, as masks over elementary regions.
+
+    With sorted boundaries b0 < ... < bk-1, region 2i is the open
+    stretch below bi, region 2i+1 is the point bi and region 2k is
+    everything above the last boundary.
+    """
+
+    __slots__ = ("bounds", "regions")
+
+    def __init__(self, intervals: List[Tuple[int, _Interval]]) -> None:
+        points = set()
+        for _, interval in intervals:
+            points.update(b for b in (interval.lo, interval.hi) if b is not None)
+        self.bounds = sorted(points)
+        position = {b: i for i, b in enumerate(self.bounds)}
+        top = 2 * len(self.bounds)
+        self.regions = [0] * (top + 1)
+        for bit, interval in intervals:
+            if interval.lo is None:
+                start = 0
+            else:
+                start = 2 * position[interval.lo] + (1 if interval.lo_inclusive else 2)
+            if interval.hi is None:
+                end = top
+            else:
+                end = 2 * position[interval.hi] + (1 if interval.hi_inclusive else 0)
+            for region in range(start, end + 1):
+                self.regions[region] |= 1 << bit
+
+    def stab(self, value: float) -> int:
+        if math.isnan(value):
+            return 0
+        i = bisect.bisect_left(self.bounds, value)
+        if i < len(self.bounds) and self.bounds[i] == value:
+            return self.regions[2 * i + 1]
+        return self.regions[2 * i]
+
+
+class _RuleSetIndex:
+    """Compiled, rule-dict-free form of one rule list (cached)."""
+
+    def __init__(self, rules: List[Dict[str, Any]]) -> None:
+        self.order = sorted(
+            range(len(rules)),
+            key=lambda i: (
+                int(rules[i].get("priority", 100)),
+                str(rules[i].get("created_at", "")),
+            ),
+        )
+        self.eligible = 0
+        self.workflow_any = 0
+        self.workflow_index: Dict[Any, int] = {}
+        self.entity_any = 0
+        self.entity_index: Dict[Any, int] = {}
+        self.hash_index: Dict[str, Tuple[int, Dict[Any, int]]] = {}
+        self.range_index: Dict[str, Tuple[int, _RangeIndex]] = {}
+        self.residual_all: List[Tuple[Predicate, ...]] = []
+        self.any_of: List[Tuple[Predicate, ...]] = []
+
+        intervals: Dict[str, List[Tuple[int, _Interval]]] = {}
+        for bit, position in enumerate(self.order):
+            rule = rules[position]
+            conditions = rule.get("conditions") or {}
+            all_of = conditions.get("all_of") or []
+            any_of = conditions.get("any_of") or []
+            self.any_of.append(tuple(_clause_predicate(c) for c in any_of))
+
+            residual: List[Predicate] = []
+            accepted: Dict[str, frozenset] = {}
+            ranges: Dict[str, _Interval] = {}
+            possible = True
+            for clause in all_of:
+                field_name = clause.get("field")
+                op = str(clause.get("op") or "").lower()
+                if not isinstance(field_name, str):
+                    residual.append(_clause_predicate(clause))
+                    continue
+                if op in ("eq", "in"):
+                    values = _hashable_values(op, clause.get("value"))
+                    if values is not None:
+                        accepted[field_name] = accepted.get(field_name, values) & values
+                        continue
+                elif op in _NUMERIC_COMPARE:
+                    try:
+                        bound = _to_number(clause.get("value"))
+                    except (TypeError, ValueError):
+                        possible = False
+                        continue
+                    if math.isnan(bound):
+                        possible = False
+                        continue
+                    ranges.setdefault(field_name, _Interval()).add(op, bound)
+                    continue
+                residual.append(_clause_predicate(clause))
+            self.residual_all.append(tuple(residual))
+
+            if rule.get("status") != "active" or not possible:
+                continue
+            if any(not values for values in accepted.values()):
+                continue
+            if any(interval.empty() for interval in ranges.values()):
+                continue
+            if not self._add_scope(bit, rule):
+                continue
+
+            mask = 1 << bit
+            self.eligible |= mask
+            for field_name, values in accepted.items():
+                constrained, index = self.hash_index.setdefault(field_name, (0, {}))
+                for value in values:
+                    index[value] = index.get(value, 0) | mask
+                self.hash_index[field_name] = (constrained | mask, index)
+            for field_name, interval in ranges.items():
+                intervals.setdefault(field_name, []).append((bit, interval))
+
+        for field_name, field_intervals in intervals.items():
+            constrained = 0
+            for bit, _ in field_intervals:
+                constrained |= 1 << bit
+            self.range_index[field_name] = (constrained, _RangeIndex(field_intervals))
+
+    def _add_scope(self, bit: int, rule: Dict[str, Any]) -> bool:
+        mask = 1 << bit
+        try:
+            workflow = rule.get("workflow", "ap")
+            entity = rule.get("entity_id")
+            if workflow:
+                self.workflow_index[workflow] = self.workflow_index.get(workflow, 0) | mask
+            else:
+                self.workflow_any |= mask
+            if entity:
+                self.entity_index[entity] = self.entity_index.get(entity, 0) | mask
+            else:
+                self.entity_any |= mask
+        except TypeError:  # unhashable scope never equals a context value
+            return False
+        return True
+
+    def candidates(self, context: Dict[str, Any]) -> int:
+        """Rules whose scope and indexed ``all_of`` clauses hold."""
+        mask = self.eligible
+        mask &= self.workflow_any | _lookup(self.workflow_index, context.get("workflow", "ap"))
+        mask &= self.entity_any | _lookup(self.entity_index, context.get("entity_id"))
+        for field_name, (constrained, index) in self.hash_index.items():
+            if not mask:
+                return 0
+            mask &= ~constrained | _lookup(index, context.get(field_name))
+        for field_name, (constrained, ranges) in self.range_index.items():
+            if not mask:
+                return 0
+            try:
+                hits = ranges.stab(_to_number(context.get(field_name)))
+            except (TypeError, ValueError):
+                hits = 0
+            mask &= ~constrained | hits
+        return mask
+
+    def passes(self, bit: int, context: Dict[str, Any]) -> bool:
+        if not all(predicate(context) for predicate in self.residual_all[bit]):
+            return False
+        any_of = self.any_of[bit]
+        return not any_of or any(predicate(context) for predicate in any_of)
+
+    def matching_bits(self, context: Dict[str, Any], *, first_only: bool) -> List[int]:
+        bits: List[int] = []
+        mask = self.candidates(context)
+        while mask:
+            low = mask & -mask
+            bit = low.bit_length() - 1
+            if self.passes(bit, context):
+                bits.append(bit)
+                if first_only:
+                    break
+            mask ^= low
+        return bits
+
+
+class CompiledRuleSet:
+    """A rule list bound to its compiled index."""
+
+    def __init__(self, index: _RuleSetIndex, rules: List[Dict[str, Any]]) -> None:
+        self._index = index
+        self._rules = rules
+
+    def evaluate(self, invoice_context: Dict[str, Any]) -> EvaluationResult:
+        bits = self._index.matching_bits(invoice_context, first_only=True)
+        matched_rule = self._rules[self._index.order[bits[0]]] if bits else None
+        snapshot = dict(invoice_context)
+        rules, order = self._rules, self._index.order
+        return EvaluationResult(
+            matched_rule=matched_rule,
+            matched_actions=list((matched_rule or {}).get("actions") or []),
+            trace_builder=lambda: _trace_rules(snapshot, [rules[position] for position in order]),
+        )
+
+    def matching_indexes(self, invoice_context: Dict[str, Any]) -> List[int]:
+        """Positions (in the input list) of every rule that matches."""
+        bits = self._index.matching_bits(invoice_context, first_only=False)
+        return sorted(self._index.order[bit] for bit in bits)
+
+
+def rule_set_version(rules: List[Dict[str, Any]]) -> Tuple[Any, ...]:
+    """Cache key for a list of saved rules.
+
+    Built from row metadata only: the rules store bumps ``version`` on
+    every body change, so ``(id, version)`` identifies the conditions.
+    Unsaved candidates do not have that guarantee and are compiled with
+    ``cache=False``; rules without a version are never cached.
+    """
+    return tuple(
+        (
+            rule.get("organization_id"), rule.get("id"), rule.get("version"),
+            rule.get("status"), rule.get("priority", 100), str(rule.get("created_at", "")),
+            rule.get("workflow", "ap"), rule.get("entity_id"),
+        )
+        for rule in rules
+    )
+
+
+def compile_rules(rules: Iterable[Dict[str, Any]], *, cache: bool = True) -> CompiledRuleSet:
+    """Compile ``rules``, reusing the cached index for this version.
+
+    Pass ``cache=False`` for rule bodies that are not saved yet (test
+    mode, conflict checks on an edit).
+    """
+    rules = list(rules)
+    if not cache or any(rule.get("version") is None for rule in rules):
+        return CompiledRuleSet(_RuleSetIndex(rules), rules)
+    try:
+        key = rule_set_version(rules)
+        hash(key)
+    except TypeError:
+        return CompiledRuleSet(_RuleSetIndex(rules), rules)
+
+    with _compiled_cache_lock:
+        index = _compiled_cache.get(key)
+        if index is not None:
+            _compiled_cache.move_to_end(key)
+    if index is None:
+        index = _RuleSetIndex(rules)
+        with _compiled_cache_lock:
+            _compiled_cache[key] = index
+            while len(_compiled_cache) > _COMPILED_CACHE_SIZE:
+                _compiled_cache.popitem(last=False)
+    return CompiledRuleSet(index, rules)
+
+
 # ---------------------------------------------------------------------------
 # Conflict detection
 # ---------------------------------------------------------------------------
@@ -554,24 +960,32 @@ def find_rule_conflicts(
     candidate_priority = int(candidate.get("priority") or 100)
 
     # Which probes the candidate matches.
+    # The candidate is usually an unsaved edit still at the stored version.
+    compiled_candidate = compile_rules([candidate], cache=False)
     candidate_matches = {
         idx for idx, probe in enumerate(_PROBE_INVOICES)
-        if evaluate_rules(probe, [candidate]).matched_rule is not None
+        if compiled_candidate.matching_indexes(probe)
     }
     if not candidate_matches:
         # Candidate matches nothing — trivially no conflict.
         return conflicts
 
-    for other in existing_rules:
-        if other.get("id") == candidate.get("id"):
-            continue
-        if (other.get("status") or "active") != "active":
-            continue
+    others = [
+        other for other in existing_rules
+        if other.get("id") != candidate.get("id")
+        and (other.get("status") or "active") == "active"
+    ]
+    # Each existing rule is judged on its own, so one pass per probe
+    # over the compiled set yields every rule's probe matches.
+    other_matches_by_position: Dict[int, set] = {}
+    compiled_others = compile_rules(others)
+    for idx, probe in enumerate(_PROBE_INVOICES):
+        for position in compiled_others.matching_indexes(probe):
+            other_matches_by_position.setdefault(position, set()).add(idx)
+
+    for position, other in enumerate(others):
         other_priority = int(other.get("priority") or 100)
-        other_matches = {
-            idx for idx, probe in enumerate(_PROBE_INVOICES)
-            if evaluate_rules(probe, [other]).matched_rule is not None
-        }
+        other_matches = other_matches_by_position.get(position)
         if not other_matches:
             continue
 
@@ -526,9 +526,15 @@ class SubscriptionService:
         if not row:
             row = self.db.get_subscription_record(organization_id)
         sub = self._subscription_from_row(row, organization_id)
+        before = (sub.plan, sub.status, sub.trial_days_remaining)
         self._update_trial_status(sub)
-        sub = self._save_subscription(sub)
-        return sub
+        # Only write when there is something new to persist: the org's
+        # first row (or its first own copy of an inherited one), or a
+        # trial tick. Every read used to upsert the row.
+        own_row = bool(row) and str(row.get("organization_id") or "") == organization_id
+        if own_row and (sub.plan, sub.status, sub.trial_days_remaining) == before:
+            return sub
+        return self._save_subscription(sub)
 
     def start_trial(self, organization_id: str) -> Subscription:
         """Start a 14-day Professional trial for an organization."""
@@ -962,20 +968,13 @@ class SubscriptionService:
     def _get_llm_cost_this_month(self, organization_id: str) -> Dict[str, Any]:
         """§8.2: Aggregate LLM API costs from llm_call_log for current month."""
         try:
-            from datetime import datetime, timezone
-            now = datetime.now(timezone.utc)
-            month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0).isoformat()
-            sql = (
-                "SELECT COUNT(*) as call_count, "
-                "COALESCE(SUM(cost_estimate_usd), 0) as total_cost_usd, "
-                "COALESCE(SUM(input_tokens), 0) as total_input_tokens, "
-                "COALESCE(SUM(output_tokens), 0) as total_output_tokens "
-                "FROM llm_call_log "
-                "WHERE organization_id = %s AND created_at >= %s"
+            from solden.core.stores.async_llm_call_store import (
+                LLM_COST_THIS_MONTH_SQL,
+                month_start_iso,
             )
             with self.db.connect() as conn:
                 cur = conn.cursor()
-                cur.execute(sql, (organization_id, month_start))
+                cur.execute(LLM_COST_THIS_MONTH_SQL, (organization_id, month_start_iso()))
                 row = cur.fetchone()
                 if row:
                     r = dict(row)
@@ -998,6 +997,7 @@ class SubscriptionService:
             with db.connect() as conn:
                 conn.execute(sql, (json.dumps(usage.to_dict()), organization_id))
                 conn.commit()
+            db._org_cache().invalidate("subscriptions", organization_id)
         except Exception as exc:
             logger.warning("[Subscription] persist usage failed: %s", exc)
 
@@ -0,0 +1,422 @@
+"""Distributed per-org sweep scheduler for the agent background loop.
+
+The background loop used to walk every active org serially for each
+job (approval timeouts, exception sweeps, ERP verification, payment /
+GRN polling, anomalies, monitoring, digests, reports) and then sleep
+15 minutes. Sweep time grew linearly with tenants, one slow ERP
+stalled everything behind it past the interval, and every replica
+repeated the same work.
+
+Here each ``(job, org)`` pair is a row in ``agent_sweep_leases`` with
+its own ``next_due_at``:
+
+* replicas claim due pairs in batches with ``FOR UPDATE SKIP LOCKED``
+  and hold a lease while they run them, so the orgs of a sweep are
+  split across however many replicas are polling — wall-clock time
+  scales with tenants ÷ workers;
+* every claimed pair runs as its own asyncio task, tracked by its
+  ``(job, org)`` key. :meth:`SweepScheduler.run_due` only claims and
+  starts work — up to ``concurrency`` running orgs per job — and
+  returns, so a slow org holds its own slot and nothing else: the next
+  poll tops every job back up while it is still running;
+* org runs execute on a thread pool, each thread on its persistent
+  event loop (:mod:`solden.core.worker_loop`) — the job functions
+  make sync DB calls that would otherwise serialize them;
+* a run past ``deadline_seconds`` counts as an overrun; one past
+  ``timeout_seconds`` is abandoned (its lease is left to expire so no
+  other replica starts the same org while the thread may still be
+  running). A whole sweep longer than the job's interval is a sweep
+  overrun. Counters are in :meth:`SweepScheduler.metrics_snapshot` and
+  each run's outcome is recorded on its lease row.
+
+If the lease table can't be reached the scheduler keeps going on
+in-process due times (the pre-lease single-replica behaviour) rather
+than stopping the sweeps.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SweepJob:
+    """One per-org background job.
+
+    ``hour_utc`` makes it a daily job due at that hour; otherwise it is
+    due every ``interval_seconds`` after its previous start.
+    """
+
+    name: str
+    run: Callable[[str], Awaitable[Any]]
+    interval_seconds: int = 900
+    hour_utc: Optional[int] = None
+    concurrency: int = 8
+    deadline_seconds: float = 120.0
+    timeout_seconds: float = 600.0
+
+    @property
+    def lease_seconds(self) -> float:
+        return self.timeout_seconds + 60.0
+
+    @property
+    def sweep_budget_seconds(self) -> float:
+        return float(self.interval_seconds if self.hour_utc is None else 3600)
+
+    def next_due(self, started: datetime) -> datetime:
+        if self.hour_utc is None:
+            return started + timedelta(seconds=self.interval_seconds)
+        due = started.replace(hour=self.hour_utc, minute=0, second=0, microsecond=0)
+        if due <= started:
+            due += timedelta(days=1)
+        return due
+
+    def first_due(self, now: datetime) -> datetime:
+        if self.hour_utc is None or now.hour == self.hour_utc:
+            return now
+        return self.next_due(now)
+
+
+@dataclass
+class SweepJobMetrics:
+    sweeps: int = 0
+    orgs_run: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    overruns: int = 0
+    sweep_overruns: int = 0
+    last_sweep_seconds: float = 0.0
+    max_org_seconds: float = 0.0
+    org_seconds_total: float = 0.0
+    slowest_org: Optional[str] = None
+
+
+@dataclass
+class _Sweep:
+    """A job's sweep in progress: from the first run started while the
+    job was idle until nothing is running and a claim comes back short."""
+
+    started: float
+    ran: int = 0
+    exhausted: bool = False
+
+
+# ─── Lease SQL ─────────────────────────────────────────────────────
+
+_SEED_SQL = """
+    INSERT INTO agent_sweep_leases (job_name, organization_id, next_due_at)
+    SELECT %s, org_id, %s FROM unnest(%s::text[]) AS org_id
+    ON CONFLICT (job_name, organization_id) DO NOTHING
+"""
+
+_CLAIM_SQL = """
+    WITH due AS (
+        SELECT job_name, organization_id
+        FROM agent_sweep_leases
+        WHERE job_name = %s
+          AND organization_id = ANY(%s)
+          AND next_due_at <= %s
+          AND (lease_until IS NULL OR lease_until < %s)
+        ORDER BY next_due_at ASC
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE agent_sweep_leases l
+    SET lease_owner = %s, lease_until = %s, last_started_at = %s
+    FROM due
+    WHERE l.job_name = due.job_name AND l.organization_id = due.organization_id
+    RETURNING l.organization_id
+"""
+
+# A timed-out run keeps its lease (the thread may still be running);
+# everything else releases it.
+_COMPLETE_SQL = """
+    UPDATE agent_sweep_leases
+    SET next_due_at = %s,
+        lease_owner = CASE WHEN %s THEN lease_owner ELSE NULL END,
+        lease_until = CASE WHEN %s THEN lease_until ELSE NULL END,
+        last_finished_at = %s,
+        last_duration_ms = %s,
+        last_status = %s,
+        last_error = %s,
+        overrun_count = overrun_count + %s
+    WHERE job_name = %s AND organization_id = %s AND lease_owner = %s
+"""
+
+
+def _iso(value: datetime) -> str:
+    return value.isoformat()
+
+
+def _default_owner() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class SweepScheduler:
+    """Runs due ``(job, org)`` pairs under Postgres leases."""
+
+    CLAIM_BATCH = 16
+    MAX_THREADS = 32
+
+    def __init__(
+        self,
+        jobs: Sequence[SweepJob],
+        *,
+        db: Any = None,
+        owner: Optional[str] = None,
+        max_threads: Optional[int] = None,
+    ) -> None:
+        self.jobs = list(jobs)
+        self._db = db
+        self.owner = owner or _default_owner()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_threads or self.MAX_THREADS, thread_name_prefix="agent-sweep",
+        )
+        self.metrics: Dict[str, SweepJobMetrics] = {job.name: SweepJobMetrics() for job in self.jobs}
+        # (job name, org id) -> the task running it, one per held lease.
+        self._running: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._sweeps: Dict[str, _Sweep] = {}
+        # In-process due times, used only while the lease table is
+        # unreachable.
+        self._local_due: Dict[Tuple[str, str], datetime] = {}
+
+    @property
+    def db(self) -> Any:
+        if self._db is None:
+            from solden.core.database import get_db
+
+            self._db = get_db()
+        return self._db
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    # -- lease store -----------------------------------------------------
+
+    def _seed(self, org_ids: List[str], now: datetime) -> None:
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            for job in self.jobs:
+                cur.execute(_SEED_SQL, (job.name, _iso(job.first_due(now)), org_ids))
+            conn.commit()
+
+    def _claim(self, job: SweepJob, org_ids: List[str], limit: int) -> List[str]:
+        now = datetime.now(timezone.utc)
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                _CLAIM_SQL,
+                (
+                    job.name, org_ids, _iso(now), _iso(now), limit,
+                    self.owner, _iso(now + timedelta(seconds=job.lease_seconds)), _iso(now),
+                ),
+            )
+            rows = cur.fetchall()
+            conn.commit()
+        return [row[0] for row in rows]
+
+    def _complete(
+        self,
+        job: SweepJob,
+        org_id: str,
+        started: datetime,
+        duration: float,
+        status: str,
+        error: Optional[str],
+        overrun: bool,
+    ) -> None:
+        keep_lease = status == "timeout"
+        with self.db.connect() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                _COMPLETE_SQL,
+                (
+                    _iso(job.next_due(started)), keep_lease, keep_lease,
+                    _iso(datetime.now(timezone.utc)), int(duration * 1000), status,
+                    (error or "")[:500] or None, 1 if overrun else 0,
+                    job.name, org_id, self.owner,
+                ),
+            )
+            conn.commit()
+
+    def _claim_local(self, job: SweepJob, org_ids: List[str], limit: int) -> List[str]:
+        now = datetime.now(timezone.utc)
+        claimed: List[str] = []
+        for org_id in org_ids:
+            key = (job.name, org_id)
+            if key in self._running:
+                continue
+            due = self._local_due.setdefault(key, job.first_due(now))
+            if due <= now:
+                claimed.append(org_id)
+                if len(claimed) >= limit:
+                    break
+        return claimed
+
+    # -- running ---------------------------------------------------------
+
+    async def seed(self, org_ids: List[str]) -> None:
+        """Make sure every ``(job, org)`` pair has a lease row."""
+        if not org_ids:
+            return
+        try:
+            await asyncio.to_thread(self._seed, org_ids, datetime.now(timezone.utc))
+        except Exception as exc:
+            logger.warning("[SweepScheduler] lease seeding failed: %s", exc)
+
+    async def run_due(self, org_ids: List[str]) -> Dict[str, int]:
+        """Claim every job's due orgs and start them; returns orgs
+        started per job. Doesn't wait for the runs — see :meth:`wait_idle`."""
+        if not org_ids:
+            return {}
+        counts = await asyncio.gather(
+            *(self._start_due(job, org_ids) for job in self.jobs), return_exceptions=True,
+        )
+        out: Dict[str, int] = {}
+        for job, count in zip(self.jobs, counts):
+            if isinstance(count, BaseException):
+                logger.error("[SweepScheduler] job %s failed: %s", job.name, count)
+                count = 0
+            out[job.name] = count
+        return out
+
+    def running(self, job_name: Optional[str] = None) -> int:
+        """Org runs in progress, for one job or all of them."""
+        if job_name is None:
+            return len(self._running)
+        return sum(1 for name, _org_id in self._running if name == job_name)
+
+    async def wait_idle(self) -> None:
+        """Wait for every run started so far to finish."""
+        while self._running:
+            await asyncio.gather(*list(self._running.values()), return_exceptions=True)
+
+    async def _start_due(self, job: SweepJob, org_ids: List[str]) -> int:
+        limit = min(self.CLAIM_BATCH, job.concurrency - self.running(job.name))
+        if limit <= 0:
+            return 0
+        use_leases = True
+        try:
+            batch = await asyncio.to_thread(self._claim, job, org_ids, limit)
+        except Exception as exc:
+            logger.warning("[SweepScheduler] lease claim for %s failed, running locally: %s", job.name, exc)
+            use_leases = False
+            batch = self._claim_local(job, org_ids, limit)
+        started = 0
+        for org_id in batch:
+            key = (job.name, org_id)
+            if key in self._running:
+                # Our own lease ran out under a slow run; leave it be.
+                continue
+            self._sweeps.setdefault(job.name, _Sweep(started=time.monotonic()))
+            self._running[key] = asyncio.create_task(self._run_tracked(job, org_id, use_leases))
+            started += 1
+        sweep = self._sweeps.get(job.name)
+        if sweep is not None:
+            sweep.exhausted = len(batch) < limit
+            if not self.running(job.name) and sweep.exhausted:
+                self._finish_sweep(job)
+        return started
+
+    async def _run_tracked(self, job: SweepJob, org_id: str, use_leases: bool) -> None:
+        try:
+            await self._run_org(job, org_id, use_leases)
+        finally:
+            self._running.pop((job.name, org_id), None)
+            sweep = self._sweeps.get(job.name)
+            if sweep is not None:
+                sweep.ran += 1
+                if sweep.exhausted and not self.running(job.name):
+                    self._finish_sweep(job)
+
+    def _finish_sweep(self, job: SweepJob) -> None:
+        sweep = self._sweeps.pop(job.name)
+        ran = sweep.ran
+        metrics = self.metrics[job.name]
+        elapsed = time.monotonic() - sweep.started
+        metrics.sweeps += 1
+        metrics.last_sweep_seconds = elapsed
+        if elapsed > job.sweep_budget_seconds:
+            metrics.sweep_overruns += 1
+            logger.warning(
+                "[SweepScheduler] %s sweep took %.1fs for %d orgs (budget %.0fs)",
+                job.name, elapsed, ran, job.sweep_budget_seconds,
+            )
+
+    async def _run_org(self, job: SweepJob, org_id: str, use_leases: bool) -> None:
+        from solden.core.worker_loop import run_on_worker_loop
+
+        metrics = self.metrics[job.name]
+        started_at = datetime.now(timezone.utc)
+        started = time.monotonic()
+        status, error = "ok", None
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(
+                loop.run_in_executor(self._executor, run_on_worker_loop, job.run(org_id)),
+                timeout=job.timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            status, error = "timeout", f"exceeded {job.timeout_seconds:.0f}s"
+        except Exception as exc:
+            status, error = "failed", str(exc)
+            logger.warning("[SweepScheduler] %s failed for org=%s: %s", job.name, org_id, exc)
+        duration = time.monotonic() - started
+        overrun = duration > job.deadline_seconds
+
+        metrics.orgs_run += 1
+        metrics.org_seconds_total += duration
+        if duration > metrics.max_org_seconds:
+            metrics.max_org_seconds, metrics.slowest_org = duration, org_id
+        if status == "ok":
+            metrics.succeeded += 1
+        elif status == "timeout":
+            metrics.timed_out += 1
+            logger.error("[SweepScheduler] %s abandoned for org=%s after %.0fs", job.name, org_id, duration)
+        else:
+            metrics.failed += 1
+        if overrun:
+            metrics.overruns += 1
+
+        if use_leases:
+            try:
+                await asyncio.to_thread(
+                    self._complete, job, org_id, started_at, duration, status, error, overrun,
+                )
+                return
+            except Exception as exc:
+                # The lease expires on its own; the org runs again then.
+                logger.warning("[SweepScheduler] lease release for %s/%s failed: %s", job.name, org_id, exc)
+                return
+        self._local_due[(job.name, org_id)] = (
+            started_at + timedelta(seconds=job.lease_seconds)
+            if status == "timeout" else job.next_due(started_at)
+        )
+
+    def metrics_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        for name, m in self.metrics.items():
+            snapshot[name] = {
+                "sweeps": m.sweeps,
+                "orgs_run": m.orgs_run,
+                "succeeded": m.succeeded,
+                "failed": m.failed,
+                "timed_out": m.timed_out,
+                "overruns": m.overruns,
+                "sweep_overruns": m.sweep_overruns,
+                "last_sweep_seconds": round(m.last_sweep_seconds, 3),
+                "avg_org_seconds": round(m.org_seconds_total / m.orgs_run, 3) if m.orgs_run else 0,
+                "max_org_seconds": round(m.max_org_seconds, 3),
+                "slowest_org": m.slowest_org,
+            }
+        return snapshot
@@ -120,11 +120,12 @@ def _get_trust_arc_state(
 def _get_performance_stats(db: Any, org_id: str) -> Dict[str, Any]:
     """Read AP KPIs for the org. Returns a simplified dict.
 
-    The KPI shape from ``get_ap_kpis`` nests data under ``overview``
-    and ``exceptions`` sub-dicts. We flatten for template consumption.
+    Only the headline totals and rates are needed, so this reads the
+    rollup-backed ``get_ap_kpi_summary`` rather than the full
+    ``get_ap_kpis`` bundle. We flatten for template consumption.
     """
     try:
-        kpis = db.get_ap_kpis(org_id)
+        kpis = db.get_ap_kpi_summary(org_id)
         totals = kpis.get("totals") or {}
         touchless_dict = kpis.get("touchless_rate") or {}
         exception_dict = kpis.get("exception_rate") or {}
@@ -143,7 +144,7 @@ def _get_performance_stats(db: Any, org_id: str) -> Dict[str, Any]:
             "currency": currency,
         }
     except Exception as exc:
-        logger.debug("[trust_arc] get_ap_kpis failed for %s: %s", org_id, exc)
+        logger.debug("[trust_arc] get_ap_kpi_summary failed for %s: %s", org_id, exc)
         return {
             "total_processed": 0,
             "touchless_rate": 0.0,
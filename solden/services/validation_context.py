@@ -0,0 +1,280 @@
+"""Per-invoice read cache for the deterministic validation gate.
+
+``_evaluate_deterministic_validation`` runs ~30 rules. Each rule used
+to read what it needed straight from the DB, so one invoice fetched
+the same vendor profile six times, the org row twice, the vendor's
+recent AP items twice (two windows), its invoice history twice (two
+limits), and decoded the IBAN-freeze flags from two more profile reads.
+
+:meth:`ValidationContext.load` fetches those reads once, up front and
+concurrently, before the gate runs:
+
+* vendor profile — also answers ``is_iban_change_pending`` and
+  ``get_iban_change_verification_state``;
+* organization row;
+* vendor invoice history, at the largest limit any rule asks for;
+* the vendor's recent AP items, over the widest window (fuzzy dedup vs.
+  velocity) and the largest limit;
+* stored bank details, only when the invoice carries bank details.
+
+The context then stands in for the DB inside the gate. The methods
+above answer from the prefetched results when the call is for the
+invoice's own org and vendor, and the request is covered by what was
+fetched. Any other call, and every other attribute, goes to the
+underlying DB. Nothing is hidden from ``hasattr``: a memoized method
+exists on the context exactly when the DB has it. If a prefetch raises,
+the exception is kept and re-raised to each rule that asks for that
+read, so the rule records ``skip`` as it would have against the DB.
+A rule that writes one of these mid-gate calls :meth:`invalidate`.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Largest history any gate rule reads (amount range; reference format
+# reads the newest 50).
+VENDOR_HISTORY_PREFETCH_LIMIT = 200
+FUZZY_DEDUP_DEFAULT_WINDOW_DAYS = 7
+FUZZY_DEDUP_DEFAULT_AMOUNT_TOLERANCE = 0.02
+FUZZY_DEDUP_LIMIT = 20
+VELOCITY_WINDOW_DAYS = 7
+
+_MEMOIZED = frozenset({
+    "get_vendor_profile",
+    "get_organization",
+    "get_vendor_invoice_history",
+    "get_ap_items_by_vendor",
+    "get_vendor_bank_details",
+    "is_iban_change_pending",
+    "get_iban_change_verification_state",
+})
+
+
+def org_settings(org_row: Any) -> Dict[str, Any]:
+    """``settings_json`` of an organization row, decoded."""
+    if not isinstance(org_row, dict):
+        return {}
+    settings = org_row.get("settings_json") or org_row.get("settings") or {}
+    if isinstance(settings, str):
+        try:
+            settings = json.loads(settings)
+        except Exception:
+            settings = {}
+    return settings if isinstance(settings, dict) else {}
+
+
+def fuzzy_dedup_settings(org_row: Any) -> Tuple[int, float]:
+    """``(window_days, amount_tolerance)`` from ``settings_json["dedup"]``."""
+    window_days = FUZZY_DEDUP_DEFAULT_WINDOW_DAYS
+    tolerance = FUZZY_DEDUP_DEFAULT_AMOUNT_TOLERANCE
+    dedup_cfg = org_settings(org_row).get("dedup") or {}
+    if isinstance(dedup_cfg, dict):
+        window = dedup_cfg.get("fuzzy_window_days")
+        if isinstance(window, (int, float)) and 1 <= window <= 90:
+            window_days = int(window)
+        tol = dedup_cfg.get("fuzzy_amount_tolerance")
+        if isinstance(tol, (int, float)) and 0 < tol <= 0.25:
+            tolerance = float(tol)
+    return window_days, tolerance
+
+
+def _created_at(row: Dict[str, Any]) -> Optional[datetime]:
+    value = row.get("created_at")
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value or "").replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class _Fetched:
+    """A prefetched read: its value, or the exception it raised."""
+
+    __slots__ = ("value", "error", "params")
+
+    def __init__(self, value: Any = None, error: Optional[BaseException] = None, params: Any = None):
+        self.value = value
+        self.error = error
+        self.params = params
+
+    def get(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class ValidationContext:
+    """Stands in for ``db`` inside one gate evaluation."""
+
+    def __init__(self, db: Any, organization_id: str, vendor_name: str):
+        self._db = db
+        self._organization_id = organization_id
+        self._vendor_name = vendor_name or ""
+        self._fetched: Dict[str, _Fetched] = {}
+
+    @classmethod
+    async def load(cls, db: Any, organization_id: str, invoice: Any) -> "ValidationContext":
+        """Build the context for ``invoice`` with its reads prefetched."""
+        ctx = cls(db, organization_id, getattr(invoice, "vendor_name", "") or "")
+        vendor = ctx._vendor_name
+        calls: Dict[str, Tuple[Tuple[Any, ...], Dict[str, Any]]] = {}
+        if hasattr(db, "get_organization"):
+            calls["get_organization"] = ((organization_id,), {})
+        if vendor:
+            if hasattr(db, "get_vendor_profile"):
+                calls["get_vendor_profile"] = ((organization_id, vendor), {})
+            if hasattr(db, "get_vendor_invoice_history") and (
+                getattr(invoice, "invoice_number", None) or getattr(invoice, "amount", None)
+            ):
+                calls["get_vendor_invoice_history"] = (
+                    (organization_id, vendor), {"limit": VENDOR_HISTORY_PREFETCH_LIMIT},
+                )
+            if hasattr(db, "get_vendor_bank_details") and getattr(invoice, "bank_details", None):
+                calls["get_vendor_bank_details"] = ((organization_id, vendor), {})
+        await ctx._prefetch(calls)
+
+        if vendor and hasattr(db, "get_ap_items_by_vendor"):
+            # Depends on org settings (dedup window, velocity limit), so
+            # it follows the first batch rather than joining it.
+            days, limit = ctx._recent_items_window()
+            await ctx._prefetch({
+                "get_ap_items_by_vendor": ((organization_id, vendor), {"days": days, "limit": limit}),
+            })
+        return ctx
+
+    async def _prefetch(self, calls: Dict[str, Tuple[Tuple[Any, ...], Dict[str, Any]]]) -> None:
+        if not calls:
+            return
+        names = list(calls)
+        results = await asyncio.gather(
+            *(asyncio.to_thread(getattr(self._db, name), *calls[name][0], **calls[name][1]) for name in names),
+            return_exceptions=True,
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.debug("[ValidationContext] prefetch %s failed: %s", name, result)
+                self._fetched[name] = _Fetched(error=result, params=calls[name][1])
+            else:
+                self._fetched[name] = _Fetched(value=result, params=calls[name][1])
+
+    def _recent_items_window(self) -> Tuple[int, int]:
+        org_row = None
+        fetched = self._fetched.get("get_organization")
+        if fetched is not None and fetched.error is None:
+            org_row = fetched.value
+        window_days, _ = fuzzy_dedup_settings(org_row)
+        try:
+            from solden.core.fraud_controls import load_fraud_controls
+
+            velocity_limit = int(load_fraud_controls(self._organization_id, self).vendor_velocity_max_per_week) + 5
+        except Exception:
+            velocity_limit = 0
+        return max(window_days, VELOCITY_WINDOW_DAYS), max(FUZZY_DEDUP_LIMIT, velocity_limit)
+
+    def invalidate(self, *names: str) -> None:
+        """Drop prefetched reads so the next call goes to the DB.
+
+        For rules that write through the DB mid-gate (the IBAN freeze
+        updates the vendor profile) ahead of rules that read the result.
+        """
+        for name in names:
+            self._fetched.pop(name, None)
+
+    # ------------------------------------------------------------------
+    # DB stand-in
+    # ------------------------------------------------------------------
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._db, name)
+        if name in _MEMOIZED:
+            return getattr(self, f"_memo_{name}")
+        return attr
+
+    def _own(self, organization_id: Any, vendor_name: Any) -> bool:
+        return organization_id == self._organization_id and vendor_name == self._vendor_name
+
+    def _profile(self) -> Optional[Dict[str, Any]]:
+        fetched = self._fetched.get("get_vendor_profile")
+        if fetched is None:
+            fetched = self._fetched["get_vendor_profile"] = _Fetched()
+            try:
+                fetched.value = self._db.get_vendor_profile(self._organization_id, self._vendor_name)
+            except Exception as exc:
+                fetched.error = exc
+        return fetched.get()
+
+    def _memo_get_vendor_profile(self, organization_id: str, vendor_name: str) -> Optional[Dict[str, Any]]:
+        if not self._own(organization_id, vendor_name):
+            return self._db.get_vendor_profile(organization_id, vendor_name)
+        return self._profile()
+
+    def _memo_is_iban_change_pending(self, organization_id: str, vendor_name: str) -> bool:
+        if not self._own(organization_id, vendor_name):
+            return self._db.is_iban_change_pending(organization_id, vendor_name)
+        profile = self._profile()
+        return bool(profile and profile.get("iban_change_pending"))
+
+    def _memo_get_iban_change_verification_state(
+        self, organization_id: str, vendor_name: str
+    ) -> Optional[Dict[str, Any]]:
+        if not self._own(organization_id, vendor_name):
+            return self._db.get_iban_change_verification_state(organization_id, vendor_name)
+        state = (self._profile() or {}).get("iban_change_verification_state")
+        return state if isinstance(state, dict) else None
+
+    def _memo_get_organization(self, organization_id: str) -> Optional[Dict[str, Any]]:
+        fetched = self._fetched.get("get_organization")
+        if organization_id != self._organization_id or fetched is None:
+            result = self._db.get_organization(organization_id)
+            if organization_id == self._organization_id:
+                self._fetched["get_organization"] = _Fetched(value=result)
+            return result
+        return fetched.get()
+
+    def _memo_get_vendor_bank_details(self, organization_id: str, vendor_name: str) -> Optional[Dict[str, str]]:
+        fetched = self._fetched.get("get_vendor_bank_details")
+        if fetched is None or not self._own(organization_id, vendor_name):
+            return self._db.get_vendor_bank_details(organization_id, vendor_name)
+        return fetched.get()
+
+    def _memo_get_vendor_invoice_history(
+        self, organization_id: str, vendor_name: str, limit: int = 6
+    ) -> List[Dict[str, Any]]:
+        fetched = self._fetched.get("get_vendor_invoice_history")
+        if fetched is None or not self._own(organization_id, vendor_name) or limit > fetched.params["limit"]:
+            return self._db.get_vendor_invoice_history(organization_id, vendor_name, limit=limit)
+        # Newest first, so a smaller limit is a prefix.
+        return list(fetched.get() or [])[:limit]
+
+    def _memo_get_ap_items_by_vendor(
+        self, organization_id: str, vendor_name: str, days: int = 90, limit: int = 50
+    ) -> List[Dict[str, Any]]:
+        fetched = self._fetched.get("get_ap_items_by_vendor")
+        if (
+            fetched is None
+            or not self._own(organization_id, vendor_name)
+            or days > fetched.params["days"]
+            or limit > fetched.params["limit"]
+        ):
+            return self._db.get_ap_items_by_vendor(organization_id, vendor_name, days=days, limit=limit)
+        # Newest first: the rows inside the narrower window are a prefix
+        # of the wider fetch, and complete unless that fetch hit its limit.
+        cutoff = datetime.now(timezone.utc) - timedelta(days=max(1, days))
+        rows = []
+        for row in fetched.get() or []:
+            created = _created_at(row)
+            if created is None or created < cutoff:
+                break
+            rows.append(row)
+            if len(rows) >= limit:
+                break
+        return rows
@@ -20,9 +20,13 @@ from solden.services.fuzzy_matching import (
     vendor_similarity,
     vendor_similarity_modes,
 )
+from solden.services.vendor_name_index import (
+    get_vendor_name_index,
+    remove_from_vendor_name_index,
+)
 from solden.services.vendor_search import (
     DEFAULT_RRF_K,
-    find_candidate_matches,
+    find_indexed_matches,
 )
 
 logger = logging.getLogger(__name__)
@@ -40,6 +44,14 @@ DEFAULT_SIMILARITY_THRESHOLD = 0.75
 DEFAULT_TOP_K = 6
 MIN_RRF_SCORE_GATE = 0.05  # ~3 mid-ranked appearances across modes
 
+# Per-profile shortlist pulled from the vendor name index before the
+# per-mode scoring, and the trigram-Jaccard floor a shortlisted
+# neighbour must clear. A pair below the floor cannot reach
+# ``DEFAULT_SIMILARITY_THRESHOLD`` on any mode in practice, so scoring
+# it only burns time on large orgs.
+DEDUP_SHORTLIST_SIZE = 16
+DEDUP_TRIGRAM_FLOOR = 0.3
+
 
 class VendorDedupService:
     """Detect and merge duplicate vendor profiles for a single tenant."""
@@ -93,12 +105,15 @@ class VendorDedupService:
 
         Algorithm:
 
-        1. For each profile, run its name as a query against the
-           rest of the corpus via
-           :func:`vendor_search.find_candidate_matches`. Each mode
-           (containment / jaccard / sequence / lev / trigram)
-           ranks every other candidate independently; RRF fuses
-           the rankings so a candidate consistently top-ranked
+        1. Take the org's cached name index
+           (:func:`vendor_name_index.get_vendor_name_index`, synced
+           incrementally from ``vendor_profiles``), then run each
+           profile's name as a query against the rest of the corpus
+           via :func:`vendor_search.find_indexed_matches`. The index
+           shortlists the ``DEDUP_SHORTLIST_SIZE`` trigram-nearest
+           neighbours; each mode (containment / jaccard / sequence /
+           lev / trigram) ranks that shortlist independently and RRF
+           fuses the rankings so a candidate consistently top-ranked
            across modes wins over one with a single high spike.
         2. Filter candidate edges to those with RRF score >=
            ``min_rrf_score`` AND legacy similarity >= ``threshold``.
@@ -115,8 +130,10 @@ class VendorDedupService:
            neighbors that bump the query out of its top-K).
         4. Connected components via union-find = duplicate clusters.
 
-        Complexity: O(N * top_k * M) where M is the number of fusion
-        modes (~5). Replaces the legacy O(N²) pairwise scan.
+        Complexity: O(N * S * M) mode evaluations, where S is the
+        shortlist size and M the number of fusion modes (~5), plus
+        index probes bounded by the postings of each name's rarest
+        trigrams. Replaces the legacy O(N²) pairwise scan.
         """
         profiles = self._load_all_profiles()
         if len(profiles) < 2:
@@ -131,19 +148,26 @@ class VendorDedupService:
             row["_rrf_idx"] = idx
             indexed.append(row)
 
+        # The shared index is keyed by profile id; a profile written
+        # after the load above may be in it but not in ``by_id``.
+        name_index = get_vendor_name_index(self.organization_id, self.db)
+        by_id = {row.get("id"): row["_rrf_idx"] for row in indexed}
+
         top_k_per_profile: Dict[int, List[Tuple[int, float, Dict[str, float]]]] = {}
         for source in indexed:
-            corpus = [r for r in indexed if r["_rrf_idx"] != source["_rrf_idx"]]
-            matches = find_candidate_matches(
+            matches = find_indexed_matches(
                 source["vendor_name"],
-                corpus,
+                name_index,
                 k=top_k,
                 rrf_k=rrf_k,
+                shortlist_size=DEDUP_SHORTLIST_SIZE,
+                exclude=source.get("id"),
+                min_trigram=DEDUP_TRIGRAM_FLOOR,
             )
             top_k_per_profile[source["_rrf_idx"]] = [
-                (m.candidate_record["_rrf_idx"], m.score, m.modes)
+                (by_id[m.candidate_record.get("id")], m.score, m.modes)
                 for m in matches
-                if m.score >= min_rrf_score
+                if m.score >= min_rrf_score and m.candidate_record.get("id") in by_id
             ]
 
         # 2. Edge candidates filtered by legacy similarity threshold.
@@ -520,14 +544,17 @@ class VendorDedupService:
     def _delete_vendor_profile(self, vendor_name: str) -> bool:
         """Delete a vendor profile."""
         sql = (
-            "DELETE FROM vendor_profiles WHERE organization_id = %s AND vendor_name = %s"
+            "DELETE FROM vendor_profiles WHERE organization_id = %s AND vendor_name = %s "
+            "RETURNING id"
         )
         try:
             with self.db.connect() as conn:
                 cur = conn.cursor()
                 cur.execute(sql, (self.organization_id, vendor_name))
+                deleted = [row["id"] for row in cur.fetchall()]
                 conn.commit()
-                return cur.rowcount > 0
+            remove_from_vendor_name_index(self.organization_id, deleted)
+            return bool(deleted)
         except Exception as exc:
             logger.warning("[VendorDedup] _delete_vendor_profile failed: %s", exc)
             return False
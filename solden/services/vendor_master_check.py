@@ -40,7 +40,7 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -55,12 +55,11 @@ VENDOR_NOT_IN_ERP_MASTER = "vendor_not_in_erp_master"
 # (~0.92) but "Acme" / "Apex" doesn't (~0.55).
 _FUZZY_MATCH_THRESHOLD = 0.85
 
-# How many local vendor profiles to fetch as fuzzy candidates. Capped
-# so a customer with 5,000 vendors doesn't pay for a full table scan
-# on every intake. 200 most-recently-active covers the typical AP
-# concentration where the top quartile of vendors gets >90% of the
-# invoice volume.
-_FUZZY_CANDIDATE_CAP = 200
+# How many trigram-nearest local vendor profiles the org's vendor name
+# index shortlists for full scoring. The index covers the whole vendor
+# master, so a rarely-used vendor is as findable as a busy one, and an
+# intake costs an incremental index sync instead of a table scan.
+_FUZZY_SHORTLIST_SIZE = 16
 
 
 _NEEDS_INFO_OPERATOR_MESSAGE = (
@@ -183,7 +182,9 @@ def _fuzzy_match_local(
 ) -> Optional[Dict[str, Any]]:
     """Fuzzy-match against the local ``vendor_profiles`` cache.
 
-    Returns ``{"name": str, "score": float}`` for the best candidate
+    Candidates are the org's vendor name index shortlist
+    (``services/vendor_name_index.py``), scored with
+    :func:`vendor_similarity`. Returns ``{"name": str, "score": float}`` for the best candidate
     above ``_FUZZY_MATCH_THRESHOLD``, or ``None`` when no candidate
     clears the bar.
 
@@ -200,19 +201,20 @@ def _fuzzy_match_local(
     """
     try:
         from solden.core.database import get_db
-        from solden.services.fuzzy_matching import vendor_similarity
+        from solden.services.fuzzy_matching import normalize_vendor, vendor_similarity
+        from solden.services.vendor_name_index import get_vendor_name_index
 
         db = get_db()
-        if not hasattr(db, "list_vendor_profiles"):
+        if not hasattr(db, "list_vendor_profile_names"):
             return None
-        candidates: List[Dict[str, Any]] = db.list_vendor_profiles(
-            organization_id, limit=_FUZZY_CANDIDATE_CAP,
-        ) or []
+        candidates = get_vendor_name_index(organization_id, db).shortlist(
+            normalize_vendor(vendor_name), limit=_FUZZY_SHORTLIST_SIZE,
+        )
 
         best_score = 0.0
         best_name: Optional[str] = None
-        for row in candidates:
-            candidate_name = str(row.get("vendor_name") or "").strip()
+        for entry in candidates:
+            candidate_name = entry.name.strip()
             if not candidate_name:
                 continue
             score = vendor_similarity(vendor_name, candidate_name)
@@ -0,0 +1,376 @@
+"""Inverted index over vendor names for shortlist-then-score search.
+
+``vendor_search.find_candidate_matches`` scores a query against every
+candidate with all five similarity modes (SequenceMatcher, pure-Python
+Levenshtein, trigram Jaccard, ...). That is fine for a handful of
+profiles and hopeless for a 50k-vendor org, where dedup runs one query
+per profile and the work grows with N².
+
+:class:`VendorNameIndex` keeps, per vendor, the normalized name and its
+``$``-padded trigram set (computed once, at index time), plus postings
+from trigram / token / exact-normalized-name to vendor keys. A query
+only walks the postings of its *rarest* trigrams and tokens — common
+grams like ``"$$s"`` or tokens like ``"services"`` match thousands of
+vendors and carry no signal — then re-scores that pool by exact
+trigram Jaccard against the precomputed sets and hands the top
+``limit`` to the expensive modes. Retrieval is a recall heuristic: a
+vendor sharing none of the query's rarest grams or tokens is not
+considered, which in practice only drops names no mode would rank.
+
+The index is mutable: :meth:`VendorNameIndex.upsert` and
+:meth:`VendorNameIndex.remove` touch only the postings of the vendor
+being changed. :func:`get_vendor_name_index` keeps one index per org
+and brings it up to date from ``vendor_profiles`` on each call — rows
+updated since the last sync (less a short overlap for late commits)
+are re-indexed, and a row-count mismatch triggers an id sweep to drop deleted profiles — so
+search surfaces pay for what changed, not for the whole vendor master.
+Intake's local fuzzy match (``vendor_master_check``) and duplicate
+detection (``vendor_dedup``) both search it; code that deletes
+profiles calls :func:`remove_from_vendor_name_index` so the cached
+index drops them without waiting for the sweep.
+"""
+from __future__ import annotations
+
+import dataclasses
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from operator import itemgetter
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+from .fuzzy_matching import _trigrams, normalize_vendor
+
+logger = logging.getLogger(__name__)
+
+# How many of the query's rarest trigrams are probed. Near-duplicates
+# share most of their grams, so they share some of the rare ones; the
+# common grams would only add noise to the pool.
+_PROBE_GRAMS = 8
+
+# Postings longer than this (or than ``_COMMON_FRACTION`` of the index,
+# whichever is larger) are treated as stop-grams / stop-words and not
+# probed unless nothing rarer exists.
+_COMMON_POSTINGS_FLOOR = 256
+_COMMON_FRACTION = 0.02
+
+# The pool is cut to ``limit * _RESCORE_FACTOR`` by posting-hit count
+# before exact Jaccard re-scoring.
+_RESCORE_FACTOR = 4
+
+# ``updated_at`` is stamped before the writing transaction commits, so a
+# rename can become visible after the watermark has moved past it. Each
+# sync re-reads this far behind the watermark to pick those rows up.
+_SYNC_OVERLAP = timedelta(minutes=5)
+
+
+@dataclasses.dataclass(frozen=True)
+class IndexedVendorName:
+    """One indexed vendor. ``record`` is the row handed to
+    :meth:`VendorNameIndex.upsert`; search results carry it through."""
+
+    key: Hashable
+    name: str
+    normalized: str
+    trigrams: frozenset
+    record: Dict[str, Any]
+
+
+class VendorNameIndex:
+    """Trigram / token / exact-name postings over one org's vendors."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[Hashable, IndexedVendorName] = {}
+        # Postings are insertion-ordered dicts (used as ordered sets) so
+        # candidate pools — and therefore tie-breaks — are deterministic.
+        self._grams: Dict[str, Dict[Hashable, None]] = {}
+        self._tokens: Dict[str, Dict[Hashable, None]] = {}
+        self._exact: Dict[str, Dict[Hashable, None]] = {}
+        # Registry-held indexes are synced by one thread while others
+        # search them.
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Dict[str, Any]],
+        *,
+        key_field: Optional[str] = None,
+        name_field: str = "vendor_name",
+    ) -> "VendorNameIndex":
+        """Index ``records`` keyed by ``key_field`` (or list position)."""
+        index = cls()
+        for position, record in enumerate(records):
+            key = record.get(key_field) if key_field else position
+            index.upsert(key, record.get(name_field), record)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[IndexedVendorName]:
+        return self._entries.get(key)
+
+    def keys(self) -> List[Hashable]:
+        with self._lock:
+            return list(self._entries)
+
+    def upsert(
+        self,
+        key: Hashable,
+        name: Any,
+        record: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Insert or re-index one vendor. Blank names are not indexed
+        (and un-index a previously named vendor)."""
+        display = str(name or "")
+        with self._lock:
+            self._upsert(key, display, record)
+
+    def _upsert(
+        self,
+        key: Hashable,
+        display: str,
+        record: Optional[Dict[str, Any]],
+    ) -> None:
+        existing = self._entries.get(key)
+        if existing is not None:
+            if existing.name == display and record is None:
+                return
+            self.remove(key)
+        if not display.strip():
+            return
+        normalized = normalize_vendor(display)
+        entry = IndexedVendorName(
+            key=key,
+            name=display,
+            normalized=normalized,
+            trigrams=frozenset(_trigrams(normalized)),
+            record=dict(record) if record is not None else {"vendor_name": display},
+        )
+        self._entries[key] = entry
+        for gram in entry.trigrams:
+            self._grams.setdefault(gram, {})[key] = None
+        for token in set(normalized.split()):
+            self._tokens.setdefault(token, {})[key] = None
+        self._exact.setdefault(normalized, {})[key] = None
+
+    def remove(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            for gram in entry.trigrams:
+                _discard(self._grams, gram, key)
+            for token in set(entry.normalized.split()):
+                _discard(self._tokens, token, key)
+            _discard(self._exact, entry.normalized, key)
+            return True
+
+    def shortlist(
+        self,
+        normalized: str,
+        *,
+        limit: int,
+        exclude: Optional[Hashable] = None,
+        min_trigram: float = 0.0,
+    ) -> List[IndexedVendorName]:
+        """Up to ``limit`` entries most trigram-similar to ``normalized``.
+
+        ``normalized`` is a :func:`normalize_vendor` output. Exact
+        normalized-name matches always make the list. ``min_trigram``
+        drops entries whose trigram Jaccard with the query is below
+        the floor. Ordered by Jaccard desc, then normalized name.
+        """
+        if limit <= 0:
+            return []
+        with self._lock:
+            return self._shortlist(normalized, limit, exclude, min_trigram)
+
+    def _shortlist(
+        self,
+        normalized: str,
+        limit: int,
+        exclude: Optional[Hashable],
+        min_trigram: float,
+    ) -> List[IndexedVendorName]:
+        if not self._entries:
+            return []
+        grams = _trigrams(normalized)
+        common = max(_COMMON_POSTINGS_FLOOR, int(len(self._entries) * _COMMON_FRACTION))
+
+        hits: Counter = Counter()
+        for gram in _rarest(self._grams, grams, _PROBE_GRAMS, common):
+            hits.update(self._grams[gram].keys())
+        for token in _rarest(self._tokens, set(normalized.split()), None, common):
+            hits.update(self._tokens[token].keys())
+        exact = dict(self._exact.get(normalized, {}))
+        hits.pop(exclude, None)
+        exact.pop(exclude, None)
+
+        # Stable sort: equal hit counts keep postings order.
+        ranked = sorted(hits.items(), key=itemgetter(1), reverse=True)
+        pool = [key for key, _ in ranked[: limit * _RESCORE_FACTOR]]
+        pool.extend(key for key in exact if key not in hits)
+
+        scored: List[tuple] = []
+        size = len(grams)
+        for key in pool:
+            entry = self._entries[key]
+            if key in exact:
+                similarity = 1.0
+            elif not grams or not entry.trigrams:
+                similarity = 0.0
+            else:
+                inter = len(grams & entry.trigrams)
+                similarity = inter / (size + len(entry.trigrams) - inter)
+            if similarity < min_trigram:
+                continue
+            scored.append((-similarity, entry.normalized, entry.name, entry))
+        scored.sort(key=lambda t: t[:3])
+        return [t[3] for t in scored[:limit]]
+
+
+def _discard(postings: Dict[str, Dict[Hashable, None]], term: str, key: Hashable) -> None:
+    bucket = postings.get(term)
+    if bucket is None:
+        return
+    bucket.pop(key, None)
+    if not bucket:
+        del postings[term]
+
+
+def _rarest(
+    postings: Dict[str, Dict[Hashable, None]],
+    terms: Iterable[str],
+    count: Optional[int],
+    common: int,
+) -> List[str]:
+    """Query terms present in ``postings``, rarest first, without the
+    stop-terms — unless stop-terms are all the query has, in which case
+    the single rarest one is kept so the query still finds something."""
+    present = sorted(
+        (len(postings[t]), t) for t in terms if t in postings
+    )
+    picked = [t for n, t in present if n <= common]
+    if not picked and present:
+        picked = [present[0][1]]
+    return picked[:count] if count is not None else picked
+
+
+# ---------------------------------------------------------------------------
+# Per-org registry with incremental sync from vendor_profiles
+# ---------------------------------------------------------------------------
+
+
+class _OrgIndexState:
+    def __init__(self) -> None:
+        self.index = VendorNameIndex()
+        self.watermark: Optional[str] = None
+        self.lock = threading.Lock()
+
+
+class VendorNameIndexRegistry:
+    """Process-local cache of one :class:`VendorNameIndex` per org.
+
+    :meth:`get` syncs before returning: profiles with ``updated_at``
+    no older than ``_SYNC_OVERLAP`` before the previous watermark are
+    re-read, so rows that committed late are not missed, and the ones
+    that changed are re-indexed. When the index size disagrees with
+    the org's count of named profiles, the live ids are listed to drop
+    deletions.
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[str, _OrgIndexState] = {}
+        self._lock = threading.Lock()
+
+    def get(self, organization_id: str, db: Any = None) -> VendorNameIndex:
+        if db is None:
+            from solden.core.database import get_db
+
+            db = get_db()
+        with self._lock:
+            state = self._states.setdefault(organization_id, _OrgIndexState())
+        with state.lock:
+            self._sync(db, organization_id, state)
+            return state.index
+
+    def remove(self, organization_id: str, keys: Iterable[Hashable]) -> None:
+        """Drop deleted profiles from the org's index, if it is cached."""
+        with self._lock:
+            state = self._states.get(organization_id)
+        if state is None:
+            return
+        with state.lock:
+            for key in keys:
+                state.index.remove(key)
+
+    def invalidate(self, organization_id: Optional[str] = None) -> None:
+        """Forget one org's index (or all), forcing a full rebuild."""
+        with self._lock:
+            if organization_id is None:
+                self._states.clear()
+            else:
+                self._states.pop(organization_id, None)
+
+    @staticmethod
+    def _sync(db: Any, organization_id: str, state: _OrgIndexState) -> None:
+        index = state.index
+        rows = db.list_vendor_profile_names(
+            organization_id, updated_since=_overlap_start(state.watermark),
+        )
+        changed = 0
+        for row in rows:
+            updated_at = row.get("updated_at")
+            if updated_at and (state.watermark is None or updated_at > state.watermark):
+                state.watermark = updated_at
+            entry = index.get(row["id"])
+            if entry is not None and entry.record == row:
+                continue
+            index.upsert(row["id"], row.get("vendor_name"), row)
+            changed += 1
+        # Blank-named profiles are never indexed, so only named ones
+        # are counted against the index size.
+        total = db.count_vendor_profiles(organization_id, named_only=True)
+        if total != len(index):
+            live = set(db.list_vendor_profile_ids(organization_id))
+            for key in index.keys():
+                if key not in live:
+                    index.remove(key)
+        if changed:
+            logger.debug(
+                "[VendorNameIndex] org=%s synced %d changed profiles (size=%d)",
+                organization_id, changed, len(index),
+            )
+
+
+def _overlap_start(watermark: Optional[str]) -> Optional[str]:
+    """``watermark`` moved back by ``_SYNC_OVERLAP`` (unparseable
+    watermarks are used as-is)."""
+    if not watermark:
+        return watermark
+    try:
+        return (datetime.fromisoformat(watermark) - _SYNC_OVERLAP).isoformat()
+    except ValueError:
+        return watermark
+
+
+_registry = VendorNameIndexRegistry()
+
+
+def get_vendor_name_index(organization_id: str, db: Any = None) -> VendorNameIndex:
+    """The org's vendor name index, synced with ``vendor_profiles``."""
+    return _registry.get(organization_id, db)
+
+
+def remove_from_vendor_name_index(organization_id: str, profile_ids: Iterable[Hashable]) -> None:
+    """Drop deleted ``vendor_profiles`` ids from the cached org index."""
+    _registry.remove(organization_id, profile_ids)
+
+
+def invalidate_vendor_name_index(organization_id: Optional[str] = None) -> None:
+    _registry.invalidate(organization_id)
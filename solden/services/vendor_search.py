@@ -33,13 +33,28 @@ This module has no DB / network calls — pure functions over Python
 data so it can be unit-tested without infrastructure. Callers
 (e.g., ``vendor_dedup.VendorDedupService``) load profiles and
 hand them in.
+
+Large corpora go through a :class:`~.vendor_name_index.VendorNameIndex`:
+the index shortlists ``shortlist_size`` candidates from trigram /
+token postings and only those are scored and fused.
+:func:`find_candidate_matches` builds a throwaway index when handed
+more than ``shortlist_size`` candidates; callers that query the same
+corpus repeatedly (dedup, intake against the org's vendor master)
+build or fetch the index once and use :func:`find_indexed_matches`.
 """
 from __future__ import annotations
 
 import dataclasses
-from typing import Dict, Iterable, List, Optional, Sequence
-
-from .fuzzy_matching import vendor_similarity_modes
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+
+from .fuzzy_matching import (
+    EncodedVendorNames,
+    _modes_batch_normalized,
+    _trigrams,
+    normalize_vendor,
+    vendor_similarity_modes_batch,
+)
+from .vendor_name_index import VendorNameIndex
 
 
 # RRF smoothing constant. The original paper (Cormack et al. 2009)
@@ -61,6 +76,12 @@ _FUSION_MODES = (
 )
 
 
+# How many index-shortlisted candidates get the full per-mode scoring.
+# Comfortably above any ``k`` callers use; RRF ranks are computed over
+# the shortlist, so it also bounds how deep a rank can go.
+DEFAULT_SHORTLIST_SIZE = 32
+
+
 @dataclasses.dataclass(frozen=True)
 class VendorMatch:
     """One ranked match. ``score`` is the fused RRF score (higher =
@@ -84,6 +105,7 @@ def find_candidate_matches(
     name_field: str = "vendor_name",
     modes: Iterable[str] = _FUSION_MODES,
     min_per_mode_score: float = 0.0,
+    shortlist_size: Optional[int] = DEFAULT_SHORTLIST_SIZE,
 ) -> List[VendorMatch]:
     """Return the top-K ``VendorMatch`` for ``query`` against
     ``candidates``.
@@ -105,6 +127,9 @@ def find_candidate_matches(
     * ``min_per_mode_score``: drop candidates whose per-mode score
       is below this floor BEFORE ranking. Default 0.0 (include all).
       Set to e.g. 0.2 to prune obviously irrelevant candidates.
+    * ``shortlist_size``: above this many candidates, index them and
+      score only the shortlist (see :func:`find_indexed_matches`).
+      ``None`` / 0 scores every candidate.
 
     Empty / null query or empty candidates list returns ``[]``.
 
@@ -114,22 +139,99 @@ def find_candidate_matches(
     if not query or not candidates:
         return []
 
+    if shortlist_size and len(candidates) > shortlist_size:
+        index = VendorNameIndex.from_records(candidates, name_field=name_field)
+        return find_indexed_matches(
+            query, index,
+            k=k, rrf_k=rrf_k, modes=modes,
+            min_per_mode_score=min_per_mode_score,
+            shortlist_size=shortlist_size,
+        )
+
+    names = [str(cand.get(name_field) or "") for cand in candidates]
+    # Compute per-mode score for every candidate in one batch.
+    scored: List[Optional[Dict[str, float]]] = [
+        modes_for_name if name.strip() else None
+        for name, modes_for_name in zip(names, vendor_similarity_modes_batch(query, names))
+    ]
+    return _fuse(
+        names, candidates, scored,
+        k=k, rrf_k=rrf_k, modes=modes, min_per_mode_score=min_per_mode_score,
+    )
+
+
+def find_indexed_matches(
+    query: str,
+    index: VendorNameIndex,
+    *,
+    k: int = 5,
+    rrf_k: int = DEFAULT_RRF_K,
+    modes: Iterable[str] = _FUSION_MODES,
+    min_per_mode_score: float = 0.0,
+    shortlist_size: int = DEFAULT_SHORTLIST_SIZE,
+    exclude: Optional[Hashable] = None,
+    min_trigram: float = 0.0,
+) -> List[VendorMatch]:
+    """:func:`find_candidate_matches` against a prebuilt index.
+
+    Only the ``shortlist_size`` entries the index retrieves for
+    ``query`` are scored; RRF ranks are taken within that shortlist.
+    ``exclude`` is an index key to leave out (dedup queries a
+    profile's own name against the corpus it is part of).
+    ``min_trigram`` drops shortlisted entries whose trigram Jaccard
+    with the query is below the floor before any mode is computed.
+    Returned ``candidate_record`` is the record the entry was indexed
+    with.
+    """
+    if not query:
+        return []
+    normalized = normalize_vendor(query)
+    query_grams = _trigrams(normalized)
+    entries = index.shortlist(
+        normalized, limit=shortlist_size, exclude=exclude, min_trigram=min_trigram,
+    )
+    if not entries:
+        return []
+    corpus = EncodedVendorNames(
+        [entry.name for entry in entries],
+        normalized=[entry.normalized for entry in entries],
+        trigrams=[entry.trigrams for entry in entries],
+    )
+    scored: List[Optional[Dict[str, float]]] = list(
+        _modes_batch_normalized(normalized, corpus, query_grams)
+    )
+    return _fuse(
+        [entry.name for entry in entries],
+        [entry.record for entry in entries],
+        scored,
+        k=k, rrf_k=rrf_k, modes=modes, min_per_mode_score=min_per_mode_score,
+    )
+
+
+def _fuse(
+    names: List[str],
+    records: Sequence[Dict[str, object]],
+    scored: List[Optional[Dict[str, float]]],
+    *,
+    k: int,
+    rrf_k: int,
+    modes: Iterable[str],
+    min_per_mode_score: float,
+) -> List[VendorMatch]:
+    """RRF over per-candidate mode dicts (``None`` = blank name)."""
     fusion_modes = list(modes)
     if not fusion_modes:
         return []
 
-    # 1. Compute per-mode score for every candidate. ``scores`` is a
-    #    list of (mode, [(candidate_index, score), ...]) tuples, each
-    #    inner list NOT yet sorted.
+    # 1. Collect per-mode scores. ``per_mode_scores`` maps mode ->
+    #    [(candidate_index, score), ...], NOT yet sorted.
     per_mode_scores: Dict[str, List[tuple]] = {m: [] for m in fusion_modes}
     full_modes_per_candidate: List[Dict[str, float]] = []
 
-    for idx, cand in enumerate(candidates):
-        cand_name = str(cand.get(name_field) or "").strip()
-        if not cand_name:
+    for idx, all_modes in enumerate(scored):
+        if all_modes is None:
             full_modes_per_candidate.append({m: 0.0 for m in fusion_modes})
             continue
-        all_modes = vendor_similarity_modes(query, cand_name)
         full_modes_per_candidate.append(all_modes)
         for mode in fusion_modes:
             score = all_modes.get(mode, 0.0)
@@ -138,19 +240,16 @@ def find_candidate_matches(
 
     # 2. For each mode, sort candidates by score desc and assign ranks.
     #    RRF uses 1-based ranking: best = rank 1, second = rank 2, ...
-    rrf_acc: Dict[int, float] = {i: 0.0 for i in range(len(candidates))}
+    rrf_acc: Dict[int, float] = {i: 0.0 for i in range(len(names))}
     for mode in fusion_modes:
         ranked = sorted(per_mode_scores[mode], key=lambda t: (-t[1], t[0]))
         for rank, (cand_idx, _) in enumerate(ranked, start=1):
             rrf_acc[cand_idx] += 1.0 / (rrf_k + rank)
 
     # 3. Sort by fused RRF score desc, ties broken by candidate name.
-    def _candidate_name(idx: int) -> str:
-        return str(candidates[idx].get(name_field) or "")
-
     ranked_indices = sorted(
         rrf_acc.keys(),
-        key=lambda i: (-rrf_acc[i], _candidate_name(i)),
+        key=lambda i: (-rrf_acc[i], names[i]),
     )
 
     # 4. Drop candidates with zero RRF (no mode matched at all).
@@ -160,8 +259,8 @@ def find_candidate_matches(
         if score <= 0.0:
             break
         matches.append(VendorMatch(
-            candidate=_candidate_name(idx),
-            candidate_record=dict(candidates[idx]),
+            candidate=names[idx],
+            candidate_record=dict(records[idx]),
             score=score,
             modes=full_modes_per_candidate[idx],
         ))
@@ -9,15 +9,24 @@ Produces a reconciliation report with:
 - Unmatched in Solden (we have an AP item, statement doesn't show it)
 - Amount discrepancies (matched by reference but amounts differ)
 
+Matching is resolved for the whole statement at once, tier by tier
+(exact reference, partial reference, amount + date, amount only): each
+tier is a one-to-one assignment over the lines and AP items still free,
+so a line that only fits one AP item is never starved by an earlier
+line that had alternatives, and the result does not depend on
+statement line order.
+
 Never raises — returns empty report on error.
 """
 from __future__ import annotations
 
 import logging
+from bisect import bisect_left, bisect_right
 from datetime import date, datetime, timezone
 
 from solden.core.money import money_sum, money_to_float
-from typing import Any, Dict, List, Optional
+from solden.services.match_assignment import solve_assignment
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +34,8 @@ logger = logging.getLogger(__name__)
 DATE_TOLERANCE_DAYS = 5
 # Amount tolerance: amounts within this % are considered close enough to flag (not reject)
 AMOUNT_TOLERANCE_PCT = 0.01  # 1%
+# Strongest evidence first; a weaker tier only sees what stronger ones left
+_MATCH_TIERS = ("reference_exact", "reference_partial", "amount_date", "amount_only")
 
 
 class VendorStatementRecon:
@@ -67,20 +78,19 @@ class VendorStatementRecon:
             unmatched_statement: List[Dict[str, Any]] = []
             discrepancies: List[Dict[str, Any]] = []
 
-            # Track which AP items have been matched
-            matched_ap_ids = set()
+            assignments = self._assign_matches(statement_items, ap_items)
+            matched_ap_ids = {m["ap_item"]["id"] for m in assignments.values()}
 
-            for stmt_item in statement_items:
+            for idx, stmt_item in enumerate(statement_items):
                 stmt_ref = str(stmt_item.get("reference") or "").strip()
                 stmt_amount = float(stmt_item.get("amount") or 0)
                 stmt_date = str(stmt_item.get("date") or "")
                 stmt_desc = str(stmt_item.get("description") or "")
 
-                match = self._find_match(stmt_ref, stmt_amount, stmt_date, ap_items, matched_ap_ids)
+                match = assignments.get(idx)
 
                 if match:
                     ap_item = match["ap_item"]
-                    matched_ap_ids.add(ap_item["id"])
 
                     ap_amount = float(ap_item.get("amount") or 0)
                     amount_diff = abs(stmt_amount - ap_amount)
@@ -182,55 +192,88 @@ class VendorStatementRecon:
             logger.warning("[VendorRecon] _load_ap_items failed: %s", exc)
             return []
 
-    def _find_match(
+    def _assign_matches(
         self,
-        stmt_ref: str,
-        stmt_amount: float,
-        stmt_date: str,
+        statement_items: List[Dict[str, Any]],
         ap_items: List[Dict[str, Any]],
-        already_matched: set,
-    ) -> Optional[Dict[str, Any]]:
-        """Find the best matching AP item for a statement line."""
-        # Strategy 1: Exact reference match
-        if stmt_ref:
-            norm_ref = self._normalize_ref(stmt_ref)
-            for ap in ap_items:
-                if ap["id"] in already_matched:
-                    continue
-                ap_ref = self._normalize_ref(ap.get("invoice_number") or "")
-                if norm_ref and ap_ref and norm_ref == ap_ref:
-                    return {"ap_item": ap, "match_type": "reference_exact"}
+    ) -> Dict[int, Dict[str, Any]]:
+        """Map statement line index -> {"ap_item", "match_type"}.
 
-            # Strategy 2: Reference contains match
-            for ap in ap_items:
-                if ap["id"] in already_matched:
-                    continue
-                ap_ref = self._normalize_ref(ap.get("invoice_number") or "")
-                if norm_ref and ap_ref and (norm_ref in ap_ref or ap_ref in norm_ref):
-                    return {"ap_item": ap, "match_type": "reference_partial"}
+        Each tier's candidate edges only cover lines and AP items no
+        stronger tier claimed; within a tier the assignment maximises
+        matched lines, then closeness (reference overlap, date gap).
+        """
+        ap_by_id = {ap["id"]: ap for ap in ap_items}
+        ap_refs = [
+            (ap, self._normalize_ref(ap.get("invoice_number") or ""))
+            for ap in ap_items
+        ]
+        exact_refs: Dict[str, List[Dict[str, Any]]] = {}
+        for ap, ref in ap_refs:
+            if ref:
+                exact_refs.setdefault(ref, []).append(ap)
+        by_amount = sorted(
+            (float(ap.get("amount") or 0), pos) for pos, ap in enumerate(ap_items)
+        )
+        amount_keys = [amount for amount, _ in by_amount]
+        ap_dates = [
+            self._parse_date(ap.get("invoice_date") or ap.get("created_at") or "")
+            for ap in ap_items
+        ]
+
+        lines = [
+            (
+                self._normalize_ref(str(item.get("reference") or "").strip()),
+                float(item.get("amount") or 0),
+                self._parse_date(str(item.get("date") or "")),
+            )
+            for item in statement_items
+        ]
 
-        # Strategy 3: Amount + date proximity match
-        if stmt_amount and stmt_date:
-            stmt_d = self._parse_date(stmt_date)
-            for ap in ap_items:
-                if ap["id"] in already_matched:
-                    continue
-                ap_amount = float(ap.get("amount") or 0)
-                if abs(stmt_amount - ap_amount) < max(0.01, stmt_amount * AMOUNT_TOLERANCE_PCT):
-                    ap_date = self._parse_date(ap.get("invoice_date") or ap.get("created_at") or "")
-                    if stmt_d and ap_date and abs((stmt_d - ap_date).days) <= DATE_TOLERANCE_DAYS:
-                        return {"ap_item": ap, "match_type": "amount_date"}
-
-        # Strategy 4: Amount-only match (weakest)
-        if stmt_amount:
-            for ap in ap_items:
-                if ap["id"] in already_matched:
-                    continue
-                ap_amount = float(ap.get("amount") or 0)
-                if abs(stmt_amount - ap_amount) < 0.01:
-                    return {"ap_item": ap, "match_type": "amount_only"}
+        def _near_amount(amount: float, tolerance: float) -> List[int]:
+            lo = bisect_left(amount_keys, amount - tolerance)
+            hi = bisect_right(amount_keys, amount + tolerance)
+            return [
+                pos for ap_amount, pos in by_amount[lo:hi]
+                if abs(amount - ap_amount) < tolerance
+            ]
 
-        return None
+        def _candidates(match_type: str, ref: str, amount: float, stmt_d: Optional[date]):
+            if match_type == "reference_exact":
+                for ap in exact_refs.get(ref, ()) if ref else ():
+                    yield ap, 1.0
+            elif match_type == "reference_partial":
+                if not ref:
+                    return
+                for ap, ap_ref in ap_refs:
+                    if ap_ref and (ref in ap_ref or ap_ref in ref):
+                        yield ap, min(len(ref), len(ap_ref)) / max(len(ref), len(ap_ref))
+            elif match_type == "amount_date":
+                if not amount or stmt_d is None:
+                    return
+                for pos in _near_amount(amount, max(0.01, amount * AMOUNT_TOLERANCE_PCT)):
+                    ap_d = ap_dates[pos]
+                    if ap_d and abs((stmt_d - ap_d).days) <= DATE_TOLERANCE_DAYS:
+                        gap = abs((stmt_d - ap_d).days)
+                        yield ap_items[pos], 1.0 - gap / (DATE_TOLERANCE_DAYS + 1)
+            elif amount:
+                for pos in _near_amount(amount, 0.01):
+                    yield ap_items[pos], 1.0
+
+        assigned: Dict[int, Dict[str, Any]] = {}
+        taken: set = set()
+        for match_type in _MATCH_TIERS:
+            edges: List[Tuple[int, str, float]] = []
+            for idx, (ref, amount, stmt_d) in enumerate(lines):
+                if idx in assigned:
+                    continue
+                for ap, weight in _candidates(match_type, ref, amount, stmt_d):
+                    if ap["id"] not in taken:
+                        edges.append((idx, ap["id"], weight))
+            for idx, ap_id in solve_assignment(edges).items():
+                assigned[idx] = {"ap_item": ap_by_id[ap_id], "match_type": match_type}
+                taken.add(ap_id)
+        return assigned
 
     @staticmethod
     def _normalize_ref(ref: str) -> str:
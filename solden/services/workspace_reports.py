@@ -18,6 +18,11 @@ empty-but-valid payload on database failure so the frontend renders
 Period bucketing uses Postgres ``date_trunc`` (daily/weekly/monthly).
 The Postgres pool is the only engine path post-C.2/C.3, so the SQL
 uses native PG features (date_trunc, FILTER, NULLIF, CASE).
+
+Time filters and buckets read the generated ``created_at_tz`` /
+``erp_posted_at_tz`` columns (migration 107) rather than casting the
+TEXT timestamps per row, so the window is an index range scan on
+``(organization_id, created_at_tz)``.
 """
 from __future__ import annotations
 
@@ -183,13 +188,13 @@ def generate_volume_report(
     # Per-(bucket, currency) — Python converts each row to functional
     # before aggregating into the bucket total.
     series_sql = (
-        f"SELECT date_trunc('{trunc}', created_at::timestamptz) AS bucket, "
+        f"SELECT date_trunc('{trunc}', created_at_tz) AS bucket, "
         "       currency, "
         "       COUNT(*)::bigint AS invoice_count, "
         "       COALESCE(SUM(amount), 0)::numeric AS total_amount "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND created_at >= %s AND created_at < %s "
+        "  AND created_at_tz >= %s::timestamptz AND created_at_tz < %s::timestamptz "
         f"  {where_extra} "
         "GROUP BY bucket, currency ORDER BY bucket ASC"
     )
@@ -199,7 +204,7 @@ def generate_volume_report(
         "       COALESCE(SUM(amount), 0)::numeric AS total_amount "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND created_at >= %s AND created_at < %s "
+        "  AND created_at_tz >= %s::timestamptz AND created_at_tz < %s::timestamptz "
         "  AND vendor_name IS NOT NULL AND vendor_name <> '' "
         f"  {where_extra} "
         "GROUP BY vendor_name, currency"
@@ -209,7 +214,7 @@ def generate_volume_report(
         "       COUNT(DISTINCT vendor_name)::bigint AS distinct_vendors "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND created_at >= %s AND created_at < %s "
+        "  AND created_at_tz >= %s::timestamptz AND created_at_tz < %s::timestamptz "
         f"  {where_extra}"
     )
 
@@ -398,7 +403,7 @@ def generate_agent_performance_report(
     # extraction confidence (the field we have on ap_items today; the
     # governance agent_confidence is on audit_events).
     series_sql = (
-        f"SELECT date_trunc('{trunc}', created_at::timestamptz) AS bucket, "
+        f"SELECT date_trunc('{trunc}', created_at_tz) AS bucket, "
         "       COUNT(*)::bigint AS total_items, "
         f"      COUNT(*) FILTER (WHERE state IN {auto_states_clause} "
         "                       AND (exception_code IS NULL OR exception_code = '')) AS auto_resolved, "
@@ -407,7 +412,7 @@ def generate_agent_performance_report(
         "       AVG(confidence) FILTER (WHERE confidence IS NOT NULL AND confidence > 0) AS avg_confidence "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND created_at >= %s AND created_at < %s "
+        "  AND created_at_tz >= %s::timestamptz AND created_at_tz < %s::timestamptz "
         f"  {where_extra} "
         "GROUP BY bucket ORDER BY bucket ASC"
     )
@@ -420,7 +425,7 @@ def generate_agent_performance_report(
         "       AVG(confidence) FILTER (WHERE confidence IS NOT NULL AND confidence > 0) AS avg_confidence "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND created_at >= %s AND created_at < %s "
+        "  AND created_at_tz >= %s::timestamptz AND created_at_tz < %s::timestamptz "
         f"  {where_extra}"
     )
 
@@ -520,25 +525,26 @@ def generate_cycle_time_report(
     trunc = _PERIOD_TO_PG_TRUNC[params.period]
     where_extra, where_args = _common_where(params)
 
-    # erp_posted_at + created_at are TEXT (ISO strings) in the schema —
-    # cast both to timestamptz for arithmetic. extract(epoch from delta)
-    # gives seconds; divide by 86400 for days.
+    # erp_posted_at + created_at are TEXT (ISO strings) in the schema;
+    # their generated ``_tz`` twins are timestamptz, so the arithmetic
+    # and the range filter use those. extract(epoch from delta) gives
+    # seconds; divide by 86400 for days.
     delta_expr = (
         "EXTRACT(EPOCH FROM "
-        " (erp_posted_at::timestamptz - created_at::timestamptz)) / 86400.0"
+        " (erp_posted_at_tz - created_at_tz)) / 86400.0"
     )
 
     series_sql = (
-        f"SELECT date_trunc('{trunc}', erp_posted_at::timestamptz) AS bucket, "
+        f"SELECT date_trunc('{trunc}', erp_posted_at_tz) AS bucket, "
         f"       AVG({delta_expr}) AS avg_days, "
         f"       PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY {delta_expr}) AS p50_days, "
         f"       PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY {delta_expr}) AS p90_days, "
         "        COUNT(*)::bigint AS posted_count "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND erp_posted_at IS NOT NULL "
-        "  AND erp_posted_at::timestamptz >= %s AND erp_posted_at::timestamptz < %s "
-        "  AND created_at IS NOT NULL "
+        "  AND erp_posted_at_tz IS NOT NULL "
+        "  AND erp_posted_at_tz >= %s::timestamptz AND erp_posted_at_tz < %s::timestamptz "
+        "  AND created_at_tz IS NOT NULL "
         f"  {where_extra} "
         "GROUP BY bucket ORDER BY bucket ASC"
     )
@@ -549,9 +555,9 @@ def generate_cycle_time_report(
         "        COUNT(*)::bigint AS posted_count "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND erp_posted_at IS NOT NULL "
-        "  AND erp_posted_at::timestamptz >= %s AND erp_posted_at::timestamptz < %s "
-        "  AND created_at IS NOT NULL "
+        "  AND erp_posted_at_tz IS NOT NULL "
+        "  AND erp_posted_at_tz >= %s::timestamptz AND erp_posted_at_tz < %s::timestamptz "
+        "  AND created_at_tz IS NOT NULL "
         f"  {where_extra}"
     )
     breakdown_sql = (
@@ -560,9 +566,9 @@ def generate_cycle_time_report(
         "        COUNT(*)::bigint AS posted_count "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND erp_posted_at IS NOT NULL "
-        "  AND erp_posted_at::timestamptz >= %s AND erp_posted_at::timestamptz < %s "
-        "  AND created_at IS NOT NULL "
+        "  AND erp_posted_at_tz IS NOT NULL "
+        "  AND erp_posted_at_tz >= %s::timestamptz AND erp_posted_at_tz < %s::timestamptz "
+        "  AND created_at_tz IS NOT NULL "
         f"  {where_extra} "
         "GROUP BY entity_id ORDER BY posted_count DESC LIMIT 25"
     )
@@ -666,17 +672,17 @@ def generate_exception_breakdown_report(
         "SELECT exception_code, COUNT(*)::bigint AS count "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND created_at >= %s AND created_at < %s "
+        "  AND created_at_tz >= %s::timestamptz AND created_at_tz < %s::timestamptz "
         "  AND exception_code IS NOT NULL AND exception_code <> '' "
         f"  {where_extra} "
         "GROUP BY exception_code ORDER BY count DESC LIMIT 20"
     )
     series_sql = (
-        f"SELECT date_trunc('{trunc}', created_at::timestamptz) AS bucket, "
+        f"SELECT date_trunc('{trunc}', created_at_tz) AS bucket, "
         "       COUNT(*)::bigint AS total_exceptions "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND created_at >= %s AND created_at < %s "
+        "  AND created_at_tz >= %s::timestamptz AND created_at_tz < %s::timestamptz "
         "  AND exception_code IS NOT NULL AND exception_code <> '' "
         f"  {where_extra} "
         "GROUP BY bucket ORDER BY bucket ASC"
@@ -778,7 +784,7 @@ def generate_vendor_quality_report(
         "                       AND exception_code <> '')::bigint AS exception_count "
         "FROM ap_items "
         "WHERE organization_id = %s AND is_sample = FALSE "
-        "  AND created_at >= %s AND created_at < %s "
+        "  AND created_at_tz >= %s::timestamptz AND created_at_tz < %s::timestamptz "
         "  AND vendor_name IS NOT NULL AND vendor_name <> '' "
         f"  {where_extra} "
         "GROUP BY vendor_name "
@@ -134,6 +134,21 @@ def reset_service_singletons():
         _learning_services.clear()
     except Exception:
         pass
+    # SLATracker buffers measurements for its flusher thread; drop the
+    # singleton (and anything still queued) so a row recorded in one
+    # test can't be flushed into the next test's truncated tables.
+    try:
+        from solden.core.sla_tracker import reset_sla_tracker
+        reset_sla_tracker()
+    except Exception:
+        pass
+    # The org cache outlives each test's TRUNCATE; its NOTIFY arrives
+    # asynchronously, so clear this process's copies directly.
+    try:
+        from solden.core.org_cache import clear_org_caches
+        clear_org_caches()
+    except Exception:
+        pass
     # SubscriptionService caches `self.db` at construction (subscription.py:432).
     # If a test swaps DATABASE_URL / CLEARLEDGR_DB_PATH but the singleton
     # stayed alive from an earlier test, it would keep writing to the old
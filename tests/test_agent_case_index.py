@@ -0,0 +1,59 @@
+"""Tests for the agent similar-case index helpers.
+
+Covers:
+  * Index entries carry the structured keys recall matches on,
+    normalized the way recall normalizes its query.
+  * Hashed feature vectors are normalized, survive the bytes round
+    trip, and rank a near-identical case above an unrelated one.
+"""
+from __future__ import annotations
+
+import math
+
+from solden.services.agent_case_index import (
+    CASE_FEATURE_DIMENSIONS,
+    case_features,
+    case_index_entry,
+    decode_features,
+    encode_features,
+    feature_similarity,
+    vendor_keys,
+)
+
+
+def _entry(**belief):
+    return case_index_entry(
+        ap_item_id="ap-1",
+        current_state=None,
+        status="Pending_Approval",
+        belief=belief,
+        next_action={"label": "Wait for approval decision"},
+        updated_at="2025-01-01T00:00:00+00:00",
+    )
+
+
+def test_entry_keys_are_normalized():
+    entry = _entry(vendor_name="Acme Widgets Inc.", document_type="Invoice", requires_field_review="yes")
+    assert (entry["vendor_key"], entry["vendor_token"]) == ("acme widgets", "acme")
+    assert entry["document_type"] == "invoice"
+    assert entry["state_key"] == "pending_approval"
+    assert entry["next_action_type"] == "wait for approval decision"
+    assert entry["requires_field_review"] == 1
+    assert vendor_keys("ACME WIDGETS") == ("acme widgets", "acme")
+
+
+def test_features_rank_near_duplicates_above_unrelated_cases():
+    query = case_features(vendor_key="acme widgets", amount=1200, currency="USD")
+    assert len(query) == CASE_FEATURE_DIMENSIONS
+    assert math.isclose(sum(v * v for v in query), 1.0, rel_tol=1e-9)
+
+    close = decode_features(encode_features(
+        case_features(vendor_key="acme widget", amount=1180, currency="USD")
+    ))
+    far = decode_features(encode_features(
+        case_features(vendor_key="northwind traders", amount=9, currency="USD")
+    ))
+    assert feature_similarity(query, close) > 0.7
+    assert feature_similarity(query, close) > feature_similarity(query, far)
+    assert feature_similarity(query, decode_features(b"short")) == 0.0
+    assert case_features(vendor_key="") == [0.0] * CASE_FEATURE_DIMENSIONS
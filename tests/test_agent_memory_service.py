@@ -265,3 +265,90 @@ def test_agent_memory_ensure_profile_preserves_existing_overrides(tmp_path, monk
 
     assert preserved["forbidden_actions"] == ["post_to_erp"]
     assert preserved["autonomy_level"] == "bounded_auto"
+
+
+def test_agent_memory_recall_reaches_past_recent_window(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLEARLEDGR_SECRET_KEY", "test-secret-key")
+    db = SoldenDB(str(tmp_path / "agent-memory-case-index.db"))
+    db.initialize()
+    service = AgentMemoryService("test-org", db=db)
+
+    service.upsert_belief_state(
+        skill_id="ap_v1",
+        ap_item_id="ap-old-globex",
+        current_state="needs_info",
+        status="needs_info",
+        belief_state={"vendor_name": "Globex Corp.", "document_type": "credit_note", "amount": 410.0},
+        next_action={"type": "await_vendor_info"},
+    )
+    # Enough newer, unrelated cases to push the Globex case out of the
+    # most-recent window recall used to scan.
+    for idx in range(60):
+        service.upsert_belief_state(
+            skill_id="ap_v1",
+            ap_item_id=f"ap-filler-{idx}",
+            current_state="validated",
+            status="pending_approval",
+            belief_state={"vendor_name": f"Filler {idx}", "document_type": "invoice"},
+            next_action={"type": "await_approval"},
+        )
+
+    recall = service.recall_similar_cases(
+        {"vendor_name": "GLOBEX CORP", "document_type": "credit_note", "current_state": "needs_info"},
+        skill_id="ap_v1",
+        limit=3,
+    )
+    assert recall[0]["ap_item_id"] == "ap-old-globex"
+    assert {"vendor_exact", "document_type", "state"} <= set(recall[0]["match_reasons"])
+    assert recall[0]["belief"]["vendor_name"] == "Globex Corp."
+
+    # The index follows belief updates.
+    service.upsert_belief_state(
+        skill_id="ap_v1",
+        ap_item_id="ap-old-globex",
+        current_state="closed",
+        status="closed",
+        belief_state={"vendor_name": "Globex Corp.", "document_type": "credit_note"},
+        next_action={"type": "monitor_completion"},
+    )
+    recall = service.recall_similar_cases(
+        {"vendor_name": "Globex", "current_state": "closed"},
+        skill_id="ap_v1",
+        limit=1,
+    )
+    assert recall[0]["ap_item_id"] == "ap-old-globex"
+    assert "state" in recall[0]["match_reasons"]
+
+
+def test_case_index_backfill_migration_indexes_older_belief_states(tmp_path, monkeypatch):
+    from solden.core.migrations import _v113_agent_case_index_backfill
+
+    monkeypatch.setenv("CLEARLEDGR_SECRET_KEY", "test-secret-key")
+    db = SoldenDB(str(tmp_path / "agent-memory-case-backfill.db"))
+    db.initialize()
+    service = AgentMemoryService("test-org", db=db)
+    service.upsert_belief_state(
+        skill_id="ap_v1",
+        ap_item_id="ap-pre-index",
+        current_state="needs_info",
+        status="needs_info",
+        belief_state={"vendor_name": "Initech", "document_type": "invoice"},
+        next_action={"type": "await_vendor_info"},
+    )
+    # As if written before the case index existed.
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "DELETE FROM agent_case_index WHERE organization_id = %s AND ap_item_id = %s",
+            ("test-org", "ap-pre-index"),
+        )
+        conn.commit()
+    assert service.recall_similar_cases({"vendor_name": "Initech"}, skill_id="ap_v1") == []
+
+    with db.connect() as conn:
+        _v113_agent_case_index_backfill(conn.cursor(), db)
+        conn.commit()
+
+    recall = service.recall_similar_cases({"vendor_name": "Initech"}, skill_id="ap_v1")
+    assert recall[0]["ap_item_id"] == "ap-pre-index"
+    assert "vendor_exact" in recall[0]["match_reasons"]
@@ -0,0 +1,242 @@
+"""Tests for the agent_timers due-time table and its consumer.
+
+Covers:
+  * Snooze / ERP-recheck writes mirrored from ``update_ap_item`` register and
+    cancel their timers; leaving ``needs_approval`` cancels the approval
+    timer.
+  * Approval timers point at the next unsent milestone and back off when
+    that milestone is already due.
+  * ``fire_due_timers`` emits one TIMER_FIRED per due timer in due order
+    and keeps timers whose enqueue failed for the next pass; a timer
+    redelivered after its lease lapsed keeps its idempotency key.
+  * Against Postgres: every due timer is claimed regardless of how many
+    orgs have one (the old scan stopped at 100), concurrent claims are
+    disjoint, and a timer re-armed while claimed survives completion.
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from solden.core.event_queue import InMemoryEventQueue, STREAM_STANDARD
+from solden.services.agent_timers import (
+    TIMER_APPROVAL_TIMEOUT,
+    TIMER_ERP_RECHECK,
+    TIMER_SNOOZE_EXPIRED,
+    arm_approval_timer,
+    fire_due_timers,
+    sync_ap_item_timers,
+)
+
+_POLICY = {"reminder_hours": 4, "escalation_hours": 24}
+
+
+class _FakeTimerDB:
+    """Just enough of TimerStore to drive the writers and the consumer."""
+
+    def __init__(self):
+        self.timers = {}
+
+    def get_ap_item(self, ap_item_id):
+        return {"id": ap_item_id, "organization_id": "org-x"}
+
+    def register_timer(self, *, organization_id, box_id, timer_type, due_at, payload=None, box_type="ap_item"):
+        due_at = due_at.isoformat() if isinstance(due_at, datetime) else due_at
+        self.timers[(box_id, timer_type)] = {
+            "id": f"tmr-{box_id}-{timer_type}",
+            "organization_id": organization_id,
+            "box_id": box_id,
+            "box_type": box_type,
+            "timer_type": timer_type,
+            "due_at": due_at,
+            "scheduled_at": due_at,
+            "payload": payload or {},
+        }
+        return self.timers[(box_id, timer_type)]["id"]
+
+    def cancel_timer(self, box_id, timer_type):
+        return self.timers.pop((box_id, timer_type), None) is not None
+
+    def claim_due_timers(self, *, limit=200):
+        now = datetime.now(timezone.utc)
+        due = sorted(
+            (t for t in self.timers.values() if t["due_at"] <= now.isoformat()),
+            key=lambda t: t["due_at"],
+        )[:limit]
+        claimed = [dict(t, claim_token="tok") for t in due]
+        for t in due:
+            # Like the real claim: due_at moves out by the lease.
+            t["due_at"] = (now + timedelta(minutes=5)).isoformat()
+            t["claim_token"] = "tok"
+        return claimed
+
+    def complete_timers(self, timer_ids, claim_token):
+        done = 0
+        for key, t in list(self.timers.items()):
+            if t["id"] in timer_ids and t.get("claim_token") == claim_token:
+                del self.timers[key]
+                done += 1
+        return done
+
+
+def _iso(delta: timedelta) -> str:
+    return (datetime.now(timezone.utc) + delta).isoformat()
+
+
+def test_snooze_and_erp_recheck_writes_register_and_cancel_timers():
+    db = _FakeTimerDB()
+    until = _iso(timedelta(hours=2))
+    sync_ap_item_timers(
+        db, "AP-1",
+        fields={"state": "snoozed", "metadata": json.dumps({"snoozed_until": until})},
+        prev_state="needs_approval",
+    )
+    assert db.timers[("AP-1", TIMER_SNOOZE_EXPIRED)]["due_at"] == until
+    assert db.timers[("AP-1", TIMER_SNOOZE_EXPIRED)]["organization_id"] == "org-x"
+
+    sync_ap_item_timers(db, "AP-1", fields={"state": "approved"}, prev_state="snoozed")
+    assert ("AP-1", TIMER_SNOOZE_EXPIRED) not in db.timers
+
+    expected_by = _iso(timedelta(minutes=15))
+    sync_ap_item_timers(
+        db, "AP-2",
+        fields={"waiting_condition": json.dumps({
+            "type": "external_dependency_unavailable", "expected_by": expected_by,
+        })},
+        organization_id="org-y",
+    )
+    assert db.timers[("AP-2", TIMER_ERP_RECHECK)]["due_at"] == expected_by
+    sync_ap_item_timers(db, "AP-2", fields={"waiting_condition": None}, organization_id="org-y")
+    assert ("AP-2", TIMER_ERP_RECHECK) not in db.timers
+
+
+def test_approval_timer_tracks_the_next_unsent_milestone():
+    db = _FakeTimerDB()
+    requested = datetime.now(timezone.utc) - timedelta(hours=1)
+    item = {
+        "id": "AP-3",
+        "organization_id": "org-x",
+        "state": "needs_approval",
+        "metadata": {"approval_requested_at": requested.isoformat()},
+    }
+    assert arm_approval_timer(db, item, policy=_POLICY) == requested + timedelta(hours=4)
+    assert db.timers[("AP-3", TIMER_APPROVAL_TIMEOUT)]["payload"]["stage"] == "reminder"
+
+    item["metadata"]["approval_reminder_milestones"] = {"reminder_4h": requested.isoformat()}
+    assert arm_approval_timer(db, item, policy=_POLICY) == requested + timedelta(hours=24)
+    assert db.timers[("AP-3", TIMER_APPROVAL_TIMEOUT)]["payload"]["stage"] == "escalation"
+
+    # Reminder already due but never sent: retried after the floor, not now.
+    item["metadata"] = {"approval_requested_at": (requested - timedelta(hours=10)).isoformat()}
+    due = arm_approval_timer(db, item, policy=_POLICY, min_delay_seconds=900)
+    assert due > datetime.now(timezone.utc) + timedelta(minutes=14)
+
+    sync_ap_item_timers(db, "AP-3", fields={"state": "approved"}, prev_state="needs_approval")
+    assert ("AP-3", TIMER_APPROVAL_TIMEOUT) not in db.timers
+
+
+def test_fire_due_timers_emits_in_due_order_and_keeps_failures():
+    db = _FakeTimerDB()
+    db.register_timer(organization_id="org-a", box_id="AP-late", timer_type=TIMER_SNOOZE_EXPIRED,
+                      due_at=_iso(-timedelta(minutes=1)))
+    db.register_timer(organization_id="org-b", box_id="AP-early", timer_type=TIMER_ERP_RECHECK,
+                      due_at=_iso(-timedelta(minutes=10)))
+    db.register_timer(organization_id="org-c", box_id="AP-future", timer_type=TIMER_SNOOZE_EXPIRED,
+                      due_at=_iso(timedelta(hours=1)))
+    queue = InMemoryEventQueue()
+
+    assert fire_due_timers(db=db, queue=queue) == 2
+    events = [event for _entry, event in queue._queues[STREAM_STANDARD]]
+    assert [e.payload["box_id"] for e in events] == ["AP-early", "AP-late"]
+    assert events[0].payload["timer_type"] == TIMER_ERP_RECHECK
+    assert events[0].organization_id == "org-b"
+    assert list(db.timers) == [("AP-future", TIMER_SNOOZE_EXPIRED)]
+
+    class _DownQueue:
+        def enqueue_many(self, events):
+            raise ConnectionError("redis down")
+
+    db.register_timer(organization_id="org-a", box_id="AP-4", timer_type=TIMER_SNOOZE_EXPIRED,
+                      due_at=_iso(-timedelta(seconds=1)))
+    assert fire_due_timers(db=db, queue=_DownQueue()) == 0
+    assert ("AP-4", TIMER_SNOOZE_EXPIRED) in db.timers
+
+
+# ─── Postgres-backed TimerStore ───────────────────────────────────
+
+
+@pytest.fixture()
+def pg_db():
+    from solden.core.database import get_db
+
+    inst = get_db()
+    inst.initialize()
+    return inst
+
+
+def test_claims_every_due_timer_across_orgs_in_due_order(pg_db):
+    base = datetime.now(timezone.utc) - timedelta(hours=1)
+    for i in range(150):
+        pg_db.register_timer(
+            organization_id=f"org-{i:03d}",
+            box_id=f"AP-T-{i:03d}",
+            timer_type=TIMER_SNOOZE_EXPIRED,
+            due_at=base + timedelta(seconds=149 - i),
+        )
+    pg_db.register_timer(
+        organization_id="org-future", box_id="AP-T-future",
+        timer_type=TIMER_SNOOZE_EXPIRED, due_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+
+    first = pg_db.claim_due_timers(limit=100)
+    second = pg_db.claim_due_timers(limit=100)
+    assert len(first) == 100 and len(second) == 50
+    assert not {t["id"] for t in first} & {t["id"] for t in second}
+    assert [t["box_id"] for t in first][:2] == ["AP-T-149", "AP-T-148"]
+    assert first[0]["due_at"] <= first[-1]["due_at"] <= second[0]["due_at"]
+    assert pg_db.claim_due_timers(limit=100) == []
+
+    assert pg_db.complete_timers([t["id"] for t in first], first[0]["claim_token"]) == 100
+    assert pg_db.get_timer("AP-T-000", TIMER_SNOOZE_EXPIRED) is not None
+    assert pg_db.get_timer("AP-T-149", TIMER_SNOOZE_EXPIRED) is None
+
+
+def test_timer_rearmed_while_claimed_survives_completion(pg_db):
+    pg_db.register_timer(
+        organization_id="org-r", box_id="AP-R-1", timer_type=TIMER_ERP_RECHECK,
+        due_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+    )
+    claimed = pg_db.claim_due_timers(limit=10)
+    assert [t["box_id"] for t in claimed] == ["AP-R-1"]
+
+    later = datetime.now(timezone.utc) + timedelta(minutes=15)
+    pg_db.register_timer(
+        organization_id="org-r", box_id="AP-R-1", timer_type=TIMER_ERP_RECHECK, due_at=later,
+    )
+    assert pg_db.complete_timers([claimed[0]["id"]], claimed[0]["claim_token"]) == 0
+    timer = pg_db.get_timer("AP-R-1", TIMER_ERP_RECHECK)
+    assert datetime.fromisoformat(timer["due_at"]) == later
+
+
+def test_redelivered_timer_keeps_its_idempotency_key():
+    db = _FakeTimerDB()
+    scheduled = _iso(-timedelta(minutes=2))
+    db.register_timer(organization_id="org-a", box_id="AP-5", timer_type=TIMER_SNOOZE_EXPIRED,
+                      due_at=scheduled)
+    keys = []
+
+    class _RecordingQueue:
+        def enqueue_many(self, events):
+            keys.extend(event.idempotency_key for event in events)
+            return ["1-0"] * len(events)
+
+    # The first consumer enqueues, then dies before completing the claim.
+    db.complete_timers = lambda timer_ids, claim_token: 0
+    assert fire_due_timers(db=db, queue=_RecordingQueue()) == 1
+    # Its lease lapses and the timer is handed out again.
+    db.timers[("AP-5", TIMER_SNOOZE_EXPIRED)]["due_at"] = _iso(-timedelta(seconds=1))
+    fire_due_timers(db=db, queue=_RecordingQueue())
+
+    assert keys == [f"timer:{TIMER_SNOOZE_EXPIRED}:AP-5:{scheduled}"] * 2
@@ -0,0 +1,195 @@
+"""Tests for the incrementally maintained AP KPI rollup.
+
+Covers:
+  * Fact computation matches the ``get_ap_kpis`` definitions: touchless,
+    cycle time, exceptions and the three discount outcomes.
+  * Contribution deltas: a transition moves counts between buckets and
+    an unchanged fact contributes nothing.
+  * Histogram percentiles interpolate inside buckets.
+  * Against Postgres: the first summary read seeds the org; applying a
+    transition updates the rollup once however often it is replayed;
+    reconciliation reports and corrects drift from writes that bypass
+    transitions; overdue discounts count once their deadline passes.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from solden.core.stores.kpi_rollup_store import (
+    _contribution_delta,
+    ap_kpi_fact_contributions,
+    compute_ap_kpi_fact,
+    cycle_time_bucket,
+    histogram_percentile,
+)
+
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _item(**overrides):
+    item = {
+        "id": "AP-1",
+        "organization_id": "org-1",
+        "state": "received",
+        "approval_required": 1,
+        "metadata": "{}",
+        "created_at": (NOW - timedelta(hours=30)).isoformat(),
+        "updated_at": (NOW - timedelta(hours=2)).isoformat(),
+        "erp_posted_at": None,
+    }
+    item.update(overrides)
+    return item
+
+
+def test_completed_item_fact_matches_kpi_definitions():
+    posted = _item(state="posted_to_erp", erp_posted_at=(NOW - timedelta(hours=6)).isoformat())
+    fact = compute_ap_kpi_fact(posted, has_approvals=False, now=NOW)
+    assert fact["completed"] and fact["touchless"]
+    assert fact["cycle_hours"] == pytest.approx(24.0)
+
+    # Approval required and recorded: completed but touched.
+    touched = compute_ap_kpi_fact(posted, has_approvals=True, now=NOW)
+    assert touched["completed"] and not touched["touchless"]
+
+    # Open items have neither a cycle time nor a touchless flag.
+    open_fact = compute_ap_kpi_fact(_item(state="needs_approval"), has_approvals=False, now=NOW)
+    assert not open_fact["completed"] and open_fact["cycle_hours"] is None
+
+    flagged = compute_ap_kpi_fact(_item(metadata='{"exception_code": "po_mismatch"}'), has_approvals=False, now=NOW)
+    assert flagged["exception"]
+
+
+def test_discount_outcomes():
+    future = (NOW + timedelta(days=3)).isoformat()
+
+    pending = compute_ap_kpi_fact(
+        _item(metadata={"discount": {"amount": 40, "deadline": future}}), has_approvals=False, now=NOW,
+    )
+    assert pending["discount_candidate"] and not pending["discount_missed"]
+    assert pending["discount_deadline"] == NOW + timedelta(days=3)
+
+    # Completing without taking it misses it, whatever the deadline.
+    completed = compute_ap_kpi_fact(
+        _item(state="closed", metadata={"discount": {"amount": 40, "deadline": future}}),
+        has_approvals=False, now=NOW,
+    )
+    assert completed["discount_missed"] and completed["discount_deadline"] is None
+
+    no_deadline = compute_ap_kpi_fact(
+        _item(metadata={"payment_discount": {"eligible": True, "amount": "12.5"}}), has_approvals=False, now=NOW,
+    )
+    assert no_deadline["discount_missed"] and no_deadline["discount_amount"] == 12.5
+
+    taken = compute_ap_kpi_fact(
+        _item(metadata={"discount": {"amount": 40, "taken": True}}), has_approvals=False, now=NOW,
+    )
+    assert taken["discount_candidate"] and not taken["discount_missed"]
+    assert taken["discount_deadline"] is None
+
+
+def test_transition_delta_moves_counts_between_buckets():
+    before = compute_ap_kpi_fact(_item(state="needs_approval"), has_approvals=True, now=NOW)
+    after = compute_ap_kpi_fact(
+        _item(state="posted_to_erp", erp_posted_at=(NOW - timedelta(hours=6)).isoformat()),
+        has_approvals=True, now=NOW,
+    )
+    delta = _contribution_delta(before, after)
+    assert delta[("state", "needs_approval")] == (-1, 0.0)
+    assert delta[("state", "posted_to_erp")] == (1, 0.0)
+    assert delta[("completed", "")] == (1, 0.0)
+    assert delta[("cycle_time", "24")] == (1, pytest.approx(24.0))
+    assert ("items", "") not in delta
+    assert ("touchless", "") not in delta
+
+    assert _contribution_delta(after, dict(after)) == {}
+    assert _contribution_delta(after, None) == {
+        key: (-count, -total) for key, (count, total) in ap_kpi_fact_contributions(after).items()
+    }
+
+
+def test_histogram_buckets_and_percentiles():
+    assert cycle_time_bucket(0.5) == "1"
+    assert cycle_time_bucket(24) == "24"
+    assert cycle_time_bucket(25) == "48"
+    assert cycle_time_bucket(5000) == "inf"
+
+    buckets = [("4", 2, 5.0), ("8", 2, 12.0)]
+    assert histogram_percentile(buckets, 0.5) == pytest.approx(4.0)
+    assert histogram_percentile(buckets, 0.75) == pytest.approx(6.0)
+    assert histogram_percentile([("inf", 2, 2000.0)], 0.95) == pytest.approx(1000.0)
+    assert histogram_percentile([], 0.5) is None
+
+
+# ─── Postgres-backed store ────────────────────────────────────────
+
+
+@pytest.fixture()
+def pg_db():
+    from solden.core.database import get_db
+
+    inst = get_db()
+    inst.initialize()
+    return inst
+
+
+def _create(db, org_id, item_id, **fields):
+    now = datetime.now(timezone.utc)
+    payload = {
+        "id": item_id,
+        "invoice_key": f"inv-{item_id}",
+        "thread_id": f"thread-{item_id}",
+        "message_id": f"msg-{item_id}",
+        "vendor_name": "Rollup Vendor",
+        "amount": 100.0,
+        "currency": "USD",
+        "state": "received",
+        "organization_id": org_id,
+        "created_at": (now - timedelta(hours=10)).isoformat(),
+        "updated_at": now.isoformat(),
+    }
+    payload.update(fields)
+    return db.create_ap_item(payload)
+
+
+def test_rollup_seeds_applies_idempotently_and_reconciles(pg_db):
+    org_id = f"org-kpi-{uuid.uuid4().hex[:8]}"
+    pg_db.ensure_organization(org_id, organization_name="KPI Co")
+    _create(pg_db, org_id, f"{org_id}-a", state="ready_to_post")
+    _create(pg_db, org_id, f"{org_id}-b", metadata={"exception_code": "po_mismatch"})
+
+    summary = pg_db.get_ap_kpi_summary(org_id)
+    assert summary["totals"]["items"] == 2
+    assert summary["states"] == {"ready_to_post": 1, "received": 1}
+    assert summary["exception_rate"]["exception_count"] == 1
+
+    posted_at = datetime.now(timezone.utc).isoformat()
+    pg_db.update_ap_item(f"{org_id}-a", state="posted_to_erp", erp_posted_at=posted_at)
+    for _ in range(3):  # outbox redelivery must not double count
+        assert pg_db.apply_ap_kpi_fact(f"{org_id}-a")["applied"]
+    summary = pg_db.get_ap_kpi_summary(org_id)
+    assert summary["states"] == {"received": 1, "posted_to_erp": 1}
+    assert summary["touchless_rate"]["touchless_count"] == 1
+    assert summary["cycle_time_hours"]["count"] == 1
+
+    # A write that skips the transition hooks drifts until reconciled.
+    _create(pg_db, org_id, f"{org_id}-c")
+    assert pg_db.get_ap_kpi_summary(org_id)["totals"]["items"] == 2
+    result = pg_db.reconcile_ap_kpi_rollup(org_id)
+    assert result["items"] == 3 and result["drift_count"] >= 1
+    assert pg_db.get_ap_kpi_summary(org_id)["totals"]["items"] == 3
+    assert pg_db.reconcile_ap_kpi_rollup(org_id)["drift_count"] == 0
+
+
+def test_open_discount_counts_as_missed_after_its_deadline(pg_db):
+    org_id = f"org-kpi-{uuid.uuid4().hex[:8]}"
+    pg_db.ensure_organization(org_id, organization_name="Discount Co")
+    deadline = datetime.now(timezone.utc) + timedelta(days=2)
+    _create(pg_db, org_id, f"{org_id}-d", metadata={"discount": {"amount": 30, "deadline": deadline.isoformat()}})
+
+    before = pg_db.get_ap_kpi_summary(org_id)["missed_discounts_baseline"]
+    assert (before["candidate_count"], before["missed_count"]) == (1, 0)
+    after = pg_db.get_ap_kpi_summary(org_id, now=deadline + timedelta(minutes=1))["missed_discounts_baseline"]
+    assert (after["missed_count"], after["missed_value"]) == (1, 30.0)
@@ -0,0 +1,160 @@
+"""Tests for the async DB facade (``solden.core.async_database``).
+
+The async twins must return exactly what the sync paths return for the
+same rows, with the same ``HybridRow`` semantics and the same
+connection contract (explicit commit, rollback on release).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from solden.core import database as db_module
+from solden.core.async_database import (
+    AsyncSoldenDB,
+    async_db_for,
+    close_async_pool,
+    get_async_db,
+    has_async_pool,
+    open_async_pool,
+)
+from solden.core.database import HybridRow
+
+
+@pytest.fixture()
+def db():
+    inst = db_module.get_db()
+    inst.initialize()
+    return inst
+
+
+@pytest.fixture()
+def adb(db):
+    return get_async_db(db)
+
+
+def _seed(db, box_id: str) -> None:
+    db.create_ap_item({
+        "id": box_id,
+        "invoice_key": f"inv-{box_id}",
+        "thread_id": f"thr-{box_id}",
+        "message_id": f"msg-{box_id}",
+        "subject": "Invoice",
+        "sender": "billing@vendor.com",
+        "vendor_name": "Acme",
+        "amount": 500.0,
+        "currency": "USD",
+        "invoice_number": f"INV-{box_id}",
+        "state": "received",
+        "organization_id": "org-async",
+        "entity_id": "ent-1",
+    })
+
+
+def test_async_db_for_only_wraps_real_soldendb(db):
+    assert isinstance(async_db_for(db), AsyncSoldenDB)
+    assert async_db_for(db) is get_async_db(db)
+    assert async_db_for(object()) is None
+    assert async_db_for(None) is None
+
+
+@pytest.mark.asyncio
+async def test_rows_are_hybrid(adb):
+    row = await adb.fetchone("SELECT 1 AS one, 'two' AS two")
+    assert isinstance(row, HybridRow)
+    assert row[0] == 1 and row["two"] == "two"
+
+
+@pytest.mark.asyncio
+async def test_llm_call_log_insert_and_month_total(db, adb):
+    from solden.core.stores.async_llm_call_store import month_start_iso
+    from solden.services.subscription import get_subscription_service
+
+    now = month_start_iso()
+    for i, cost in enumerate((0.5, 0.25)):
+        await adb.insert_llm_call_log((
+            f"LLM-async-{i}", "org-async", "explain_state", "m", 10, 5, 100, cost,
+            0, None, None, now, None, None,
+        ))
+    totals = await adb.get_llm_cost_this_month("org-async")
+    assert totals["call_count"] == 2
+    assert float(totals["total_cost_usd"]) == pytest.approx(0.75)
+    sync_totals = get_subscription_service()._get_llm_cost_this_month("org-async")
+    assert float(sync_totals["total_cost_usd"]) == pytest.approx(0.75)
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_work_is_rolled_back_on_release(db, adb):
+    _seed(db, "AP-ASYNC-3")
+    async with adb.connect() as conn:
+        cur = conn.cursor()
+        await cur.execute(
+            "UPDATE ap_items SET vendor_name = %s WHERE id = %s", ("Changed", "AP-ASYNC-3"),
+        )
+    assert db.get_ap_item("AP-ASYNC-3")["vendor_name"] == "Acme"
+
+
+@pytest.mark.asyncio
+async def test_pool_is_per_loop_and_used_when_open(db, adb):
+    assert not has_async_pool(db.dsn)
+    pool = await open_async_pool(db)
+    try:
+        assert has_async_pool(db.dsn)
+        assert await open_async_pool(db) is pool
+        await pool.wait()
+        async with adb.connect() as conn:
+            pooled = conn
+        async with adb.connect() as conn:
+            assert conn is pooled
+    finally:
+        await close_async_pool(db.dsn)
+    assert not has_async_pool(db.dsn)
+
+
+@pytest.mark.asyncio
+async def test_gateway_log_uses_a_thread_without_a_pool(db, adb, monkeypatch):
+    from solden.core.llm_gateway import LLMAction, LLMGateway
+
+    gateway = LLMGateway(api_key="test", db=db)
+    connects = []
+    original = adb.connect
+    monkeypatch.setattr(adb, "connect", lambda: connects.append(1) or original())
+    kwargs = dict(
+        action=LLMAction.EXPLAIN_STATE, model="m", input_tokens=1, output_tokens=1,
+        latency_ms=1, cost_estimate=0.0, truncated=False, error=None,
+        organization_id="org-async",
+    )
+    assert await gateway._alog_call(**kwargs)
+    assert connects == []
+
+    pool = await open_async_pool(db)
+    try:
+        await pool.wait()
+        assert await gateway._alog_call(**kwargs)
+    finally:
+        await close_async_pool(db.dsn)
+    assert connects == [1]
+
+
+@pytest.mark.asyncio
+async def test_async_queries_do_not_stall_the_loop(db, adb):
+    """A 200ms ``pg_sleep`` through the facade leaves the loop free."""
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    beat = asyncio.create_task(heartbeat())
+    try:
+        started = time.monotonic()
+        await adb.fetchone("SELECT pg_sleep(0.2)")
+        elapsed = time.monotonic() - started
+    finally:
+        beat.cancel()
+    assert elapsed >= 0.2
+    assert ticks >= 10
@@ -6,6 +6,8 @@ Covers:
   * OFX parser: tolerates SGML-style unclosed tags + extracts
     debits with correct sign.
   * Auto-detect: filename + content sniff routes to the right parser.
+  * Streaming: multi-statement CAMT, XML-form OFX, bounded memory,
+    batched ingest + rollback of unparseable payloads.
   * Store CRUD: insert + list + match update; uniqueness on
     (org, import_id, line_index).
   * Matcher:
@@ -15,6 +17,8 @@ Covers:
       - Inflow (positive amount) → unmatched (out of scope)
       - Outside date window → unmatched
       - Re-running idempotent: existing match preserved
+      - Import-wide assignment: competing lines, interchangeable
+        lines, unique / non-unique split payments
   * API end-to-end: import + reconcile, manual match.
 """
 from __future__ import annotations
@@ -39,9 +43,11 @@ from solden.services.bank_reconciliation_matcher import (  # noqa: E402
     reconcile_import,
 )
 from solden.services.bank_statement_parsers import (  # noqa: E402
+    detect_and_ingest,
     detect_and_parse,
     parse_camt053,
     parse_ofx,
+    stream_camt053,
 )
 
 
@@ -217,6 +223,54 @@ def test_camt053_handles_empty_body():
     assert out["lines"] == []
 
 
+def _camt_payload(accounts) -> bytes:
+    """CAMT.053 document with one ``<Stmt>`` per ``(ccy, n_entries)``."""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02">'
+        "<BkToCstmrStmt>"
+    ]
+    for acct_no, (ccy, n_entries) in enumerate(accounts):
+        parts.append(
+            f"<Stmt><Acct><Id><IBAN>DE00ACCT{acct_no}</IBAN></Id><Ccy>{ccy}</Ccy></Acct>"
+        )
+        for i in range(n_entries):
+            parts.append(
+                f"<Ntry><Amt>{10 + i}.00</Amt><CdtDbtInd>DBIT</CdtDbtInd>"
+                f"<ValDt><Dt>2026-04-29</Dt></ValDt>"
+                f"<AcctSvcrRef>REF-{acct_no}-{i}</AcctSvcrRef>"
+                f"<AddtlNtryInf>Payment {i} {'x' * 200}</AddtlNtryInf></Ntry>"
+            )
+        parts.append("</Stmt>")
+    parts.append("</BkToCstmrStmt></Document>")
+    return "".join(parts).encode("utf-8")
+
+
+def test_camt053_streams_every_statement_in_file():
+    stream = stream_camt053(_camt_payload([("EUR", 2), ("USD", 3)]))
+    lines = list(stream)
+    assert [ln["line_index"] for ln in lines] == [0, 1, 2, 3, 4]
+    assert [ln["currency"] for ln in lines] == ["EUR"] * 2 + ["USD"] * 3
+    # Header describes the first statement, as the DOM parser did.
+    assert stream.statement["iban"] == "DE00ACCT0"
+    assert stream.statement["currency"] == "EUR"
+
+
+def test_camt053_stream_memory_bounded_by_entry_not_file():
+    import io
+    import tracemalloc
+
+    payload = _camt_payload([("EUR", 20000)])
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in stream_camt053(io.BytesIO(payload)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == 20000
+    assert peak < len(payload) / 4
+
+
 # ─── OFX parser ─────────────────────────────────────────────────────
 
 
@@ -234,6 +288,16 @@ def test_ofx_parses_sgml_style_tags():
     assert line["bank_reference"] == "BANK-REF-77"
 
 
+def test_ofx_parses_closed_xml_tags():
+    out = parse_ofx(
+        b'<?xml version="1.0"?><OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>'
+        b"<CURDEF>USD</CURDEF><BANKTRANLIST>"
+        b"<STMTTRN><TRNAMT>-5.00</TRNAMT><FITID>X1</FITID></STMTTRN>"
+        b"</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"
+    )
+    assert [(ln["amount"], ln["bank_reference"]) for ln in out["lines"]] == [(-5.0, "X1")]
+
+
 # ─── Auto-detect ────────────────────────────────────────────────────
 
 
@@ -247,6 +311,38 @@ def test_detect_routes_to_ofx():
     assert out["format"] == "ofx"
 
 
+def test_detect_and_ingest_streams_lines_in_batches(db):
+    calls = []
+    original = db.insert_bank_statement_lines
+
+    def _spy(**kwargs):
+        calls.append(len(kwargs["lines"]))
+        return original(**kwargs)
+
+    db.insert_bank_statement_lines = _spy
+    try:
+        imp = detect_and_ingest(
+            db, _camt_payload([("EUR", 25)]),
+            organization_id="orgA", filename="big.xml", batch_size=10,
+        )
+    finally:
+        del db.insert_bank_statement_lines
+    assert calls == [10, 10, 5]
+    assert imp["line_count"] == 25
+    assert imp["statement_iban"] == "DE00ACCT0"
+    lines = db.list_bank_statement_lines("orgA", import_id=imp["id"])
+    assert len(lines) == 25
+
+
+def test_detect_and_ingest_malformed_payload_leaves_no_import(db):
+    truncated = _camt_payload([("EUR", 5)])[:-200]
+    assert detect_and_ingest(
+        db, truncated, organization_id="orgA", filename="bad.xml", batch_size=2,
+    ) is None
+    assert db.list_bank_statement_imports("orgA") == []
+    assert db.list_bank_statement_lines("orgA") == []
+
+
 # ─── Store ──────────────────────────────────────────────────────────
 
 
@@ -428,6 +524,202 @@ def test_reconcile_import_summary_counts(db):
     assert fresh_imp["matched_count"] == 1
 
 
+def _seed_parity_import(db) -> str:
+    """One import exercising every outcome: exact match, ref tie-break,
+    ambiguous pair, inflow, and no-candidate."""
+    _make_payment_confirmation(
+        db, ap_item_id_prefix="AP-bm-par-1", payment_id="P-PAR-1",
+        amount=1500.0, payment_reference="WIRE-77",
+    )
+    _make_payment_confirmation(
+        db, ap_item_id_prefix="AP-bm-par-2", payment_id="P-PAR-2",
+        amount=220.0, payment_reference="MISC-A",
+    )
+    _make_payment_confirmation(
+        db, ap_item_id_prefix="AP-bm-par-3", payment_id="P-PAR-3",
+        amount=220.0, payment_reference="MISC-B",
+    )
+    imp = db.create_bank_statement_import(
+        organization_id="orgA", filename="parity.xml", format="camt.053",
+        statement_currency="EUR", line_count=4,
+    )
+    for idx, (amount, ref) in enumerate((
+        (-1500.0, "WIRE-77"),
+        (-220.0, "UNRELATED"),
+        (220.0, "INFLOW"),
+        (-9.99, "NOTHING"),
+    )):
+        db.insert_bank_statement_line(
+            organization_id="orgA", import_id=imp["id"], line_index=idx,
+            amount=amount, currency="EUR", value_date="2026-04-28",
+            bank_reference=ref,
+        )
+    return imp["id"]
+
+
+def test_reconcile_import_batched_matches_per_line_path(db):
+    """The set-based engine and the per-line loop must agree on every
+    line's outcome, confirmation and confidence."""
+    import_id = _seed_parity_import(db)
+    per_line = reconcile_import(
+        db, organization_id="orgA", import_id=import_id, batched=False,
+    )
+    per_line_rows = {
+        r["line_index"]: (r["match_status"], r["payment_confirmation_id"], r["match_confidence"])
+        for r in db.list_bank_statement_lines("orgA", import_id=import_id)
+    }
+    # Reset the lines and replay through the batched engine.
+    for r in db.list_bank_statement_lines("orgA", import_id=import_id):
+        db.update_bank_statement_line_match(
+            r["id"], payment_confirmation_id=None, match_status="unmatched",
+        )
+    batched = reconcile_import(db, organization_id="orgA", import_id=import_id)
+    batched_rows = {
+        r["line_index"]: (r["match_status"], r["payment_confirmation_id"], r["match_confidence"])
+        for r in db.list_bank_statement_lines("orgA", import_id=import_id)
+    }
+    assert per_line == batched
+    assert batched["matched"] == 1
+    assert batched["ambiguous"] == 1
+    assert batched["unmatched"] == 2
+    assert batched_rows == per_line_rows
+
+
+def test_reconcile_import_batched_writes_idempotent_audit_events(db):
+    import_id = _seed_parity_import(db)
+    reconcile_import(db, organization_id="orgA", import_id=import_id)
+    matched = db.list_bank_statement_lines(
+        "orgA", import_id=import_id, match_status="matched",
+    )
+    assert len(matched) == 1
+    key = f"bank_match:orgA:{matched[0]['id']}"
+    event = db.get_ap_audit_event_by_key(key)
+    assert event is not None
+    assert event["event_type"] == "bank_statement_line_matched"
+    # Re-emitting the same payload is absorbed by the idempotency key.
+    assert db.append_audit_events([{
+        "ap_item_id": "AP-bm-par-1",
+        "event_type": "bank_statement_line_matched",
+        "organization_id": "orgA",
+        "idempotency_key": key,
+    }]) == []
+
+
+def test_reconcile_import_batched_not_capped_at_500_confirmations(db):
+    """The per-line path only sees 500 confirmations per query; the
+    batched window load is uncapped, so a same-day confirmation that
+    sorts past the cap still matches."""
+    for i in range(510):
+        db.create_payment_confirmation(
+            organization_id="orgA", ap_item_id=f"AP-bm-cap-{i}",
+            payment_id=f"P-CAP-{i}", source="manual", status="confirmed",
+            amount=100.0 + i, currency="EUR",
+            settlement_at=f"2026-04-29T{i // 60:02d}:{i % 60:02d}:00+00:00",
+        )
+    imp = db.create_bank_statement_import(
+        organization_id="orgA", filename="cap.xml", format="camt.053",
+        statement_currency="EUR", line_count=1,
+    )
+    db.insert_bank_statement_line(
+        organization_id="orgA", import_id=imp["id"], line_index=0,
+        amount=-100.0, currency="EUR", value_date="2026-04-29",
+    )
+    summary = reconcile_import(db, organization_id="orgA", import_id=imp["id"])
+    assert summary["matched"] == 1
+
+
+def _make_lines(db, rows) -> str:
+    imp = db.create_bank_statement_import(
+        organization_id="orgA", filename="assign.xml", format="camt.053",
+        statement_currency="EUR", line_count=len(rows),
+    )
+    for idx, (amount, value_date) in enumerate(rows):
+        db.insert_bank_statement_line(
+            organization_id="orgA", import_id=imp["id"], line_index=idx,
+            amount=amount, currency="EUR", value_date=value_date,
+            bank_reference=f"LINE-{idx}",
+        )
+    return imp["id"]
+
+
+def test_reconcile_import_resolves_competing_lines_globally(db):
+    """Line 1 prefers X but can also take Y; line 0 can only take X.
+    Greedy order would hand X to both — the assignment gives each line
+    its own confirmation."""
+    x = _make_payment_confirmation(
+        db, ap_item_id_prefix="AP-bm-asg-x", payment_id="P-ASG-X",
+        amount=300.0, settlement_at="2026-04-28T00:00:00+00:00",
+        payment_reference="ASG-X",
+    )
+    y = _make_payment_confirmation(
+        db, ap_item_id_prefix="AP-bm-asg-y", payment_id="P-ASG-Y",
+        amount=300.0, settlement_at="2026-04-20T00:00:00+00:00",
+        payment_reference="ASG-Y",
+    )
+    import_id = _make_lines(db, [(-300.0, "2026-04-30"), (-300.0, "2026-04-25")])
+    summary = reconcile_import(db, organization_id="orgA", import_id=import_id)
+    assert summary["matched"] == 2
+    assert summary["ambiguous"] == 0
+    by_index = {
+        r["line_index"]: r["payment_confirmation_id"]
+        for r in db.list_bank_statement_lines("orgA", import_id=import_id)
+    }
+    assert by_index == {0: x["id"], 1: y["id"]}
+
+
+def test_reconcile_import_interchangeable_lines_stay_ambiguous(db):
+    """Two identical lines and two identical confirmations: any pairing
+    is a coin flip, so neither line is auto-matched."""
+    for suffix in ("a", "b"):
+        _make_payment_confirmation(
+            db, ap_item_id_prefix=f"AP-bm-swap-{suffix}",
+            payment_id=f"P-SWAP-{suffix}", amount=75.0,
+            payment_reference=f"SWAP-{suffix}",
+        )
+    import_id = _make_lines(db, [(-75.0, "2026-04-29"), (-75.0, "2026-04-29")])
+    summary = reconcile_import(db, organization_id="orgA", import_id=import_id)
+    assert summary["matched"] == 0
+    assert summary["ambiguous"] == 2
+
+
+def test_reconcile_import_matches_unique_split_payment(db):
+    a = _make_payment_confirmation(
+        db, ap_item_id_prefix="AP-bm-split-a", payment_id="P-SPLIT-A",
+        amount=600.0, payment_reference="SPLIT-A",
+    )
+    b = _make_payment_confirmation(
+        db, ap_item_id_prefix="AP-bm-split-b", payment_id="P-SPLIT-B",
+        amount=400.0, payment_reference="SPLIT-B",
+    )
+    import_id = _make_lines(db, [(-1000.0, "2026-04-29")])
+    summary = reconcile_import(db, organization_id="orgA", import_id=import_id)
+    assert summary["matched"] == 1
+    (line,) = db.list_bank_statement_lines("orgA", import_id=import_id)
+    assert line["match_reason"] == "auto_matched_split"
+    assert line["payment_confirmation_id"] == a["id"]
+    assert line["metadata"]["split_payment_confirmation_ids"] == [a["id"], b["id"]]
+    assert line["match_confidence"] < 0.8
+    event = db.get_ap_audit_event_by_key(f"bank_match:orgA:{line['id']}")
+    assert event is not None
+
+
+def test_reconcile_import_skips_non_unique_split(db):
+    for suffix, amount in (("a", 600.0), ("b", 400.0), ("c", 700.0), ("d", 300.0)):
+        _make_payment_confirmation(
+            db, ap_item_id_prefix=f"AP-bm-nsplit-{suffix}",
+            payment_id=f"P-NSPLIT-{suffix}", amount=amount,
+            payment_reference=f"NSPLIT-{suffix}",
+        )
+    import_id = _make_lines(db, [(-1000.0, "2026-04-29")])
+    summary = reconcile_import(db, organization_id="orgA", import_id=import_id)
+    assert summary["matched"] == 0
+    assert summary["unmatched"] == 1
+    disabled = reconcile_import(
+        db, organization_id="orgA", import_id=import_id, max_split_parts=1,
+    )
+    assert disabled["matched"] == 0
+
+
 # ─── API end-to-end ─────────────────────────────────────────────────
 
 
@@ -456,6 +748,16 @@ def test_api_import_empty_body_400(client_orgA):
     assert resp.status_code == 400
 
 
+def test_api_import_malformed_statement_400_names_format(client_orgA):
+    resp = client_orgA.post(
+        "/api/workspace/bank-statements/import?filename=april.xml",
+        content=_camt_payload([("EUR", 5)])[:-200],
+        headers={"Content-Type": "application/xml"},
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "unsupported_or_empty_statement:camt.053"
+
+
 def test_api_list_imports_org_scoped(db, client_orgA):
     db.create_bank_statement_import(
         organization_id="orgA", filename="orgA.xml", format="camt.053",
@@ -253,6 +253,7 @@ def test_default_projectors_registered_at_import():
     names = list_registered_projectors()
     assert "box_summary" in names
     assert "vendor_summary" in names
+    assert "ap_kpi_rollup" in names
 
 
 def test_projection_outbox_handler_registered():
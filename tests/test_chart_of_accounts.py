@@ -22,6 +22,7 @@ from solden.integrations.erp_router import (
     get_chart_of_accounts_xero,
     get_chart_of_accounts_netsuite,
     get_chart_of_accounts_sap,
+    list_account_changes_quickbooks,
     _get_cached_chart_of_accounts,
     _save_chart_of_accounts_cache,
     erp_preflight_check,
@@ -39,6 +40,13 @@ def db(tmp_path, monkeypatch):
     return inst
 
 
+def _seed_coa_cache(db, org_id, accounts, erp_type="quickbooks", *, fetched_at=None):
+    """Seed erp_account_cache the way a full sync would, optionally backdated."""
+    _save_chart_of_accounts_cache(org_id, accounts, erp_type)
+    if fetched_at:
+        db.record_erp_cache_sync("accounts", org_id, erp_type, full=True, synced_at=fetched_at)
+
+
 def _qb_connection(**overrides) -> ERPConnection:
     defaults = dict(type="quickbooks", access_token="tok_qb", realm_id="realm_123")
     defaults.update(overrides)
@@ -165,6 +173,36 @@ class TestChartOfAccountsQuickBooks:
         assert result == []
 
 
+    def test_cdc_changes_split_upserts_and_deletes(self):
+        payload = {
+            "CDCResponse": [{
+                "QueryResponse": [{
+                    "Account": [
+                        {"Id": "7", "AcctNum": "6300", "Name": "Rent",
+                         "AccountType": "Expense", "Active": True},
+                        {"domain": "QBO", "status": "Deleted", "Id": "8"},
+                    ],
+                }],
+            }],
+        }
+        mock_client = _mock_async_client(_ok_response(payload))
+        since = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+        with patch("solden.integrations.erp_quickbooks.get_http_client", return_value=mock_client):
+            result = asyncio.run(list_account_changes_quickbooks(_qb_connection(), since))
+
+        assert [a["code"] for a in result["upserts"]] == ["6300"]
+        assert result["deleted"] == ["8"]
+        params = mock_client.get.call_args.kwargs["params"]
+        assert params == {"entities": "Account", "changedSince": "2026-10-01T12:00:00Z"}
+
+    def test_cdc_errors_raise(self):
+        mock_client = AsyncMock()
+        mock_client.get.side_effect = Exception("timeout")
+        with patch("solden.integrations.erp_quickbooks.get_http_client", return_value=mock_client):
+            with pytest.raises(Exception):
+                asyncio.run(list_account_changes_quickbooks(_qb_connection(), datetime.now(timezone.utc)))
+
+
 # ===========================================================================
 # Xero — get_chart_of_accounts_xero
 # ===========================================================================
@@ -353,8 +391,7 @@ class TestChartOfAccountsDispatcher:
         mock_fetcher.assert_called_once()
 
         # Verify it was cached
-        org = db.get_organization(org_id)
-        cache = (org.get("settings_json") or {}).get("chart_of_accounts_cache")
+        cache = _get_cached_chart_of_accounts(org_id)
         assert cache is not None
         assert cache["account_count"] == 1
 
@@ -364,15 +401,8 @@ class TestChartOfAccountsDispatcher:
             {"id": "99", "code": "9999", "name": "Cached", "type": "expense",
              "sub_type": "", "active": True, "currency": ""},
         ]
-        settings = {
-            "chart_of_accounts_cache": {
-                "accounts": cached_accounts,
-                "fetched_at": datetime.now(timezone.utc).isoformat(),
-                "erp_type": "quickbooks",
-                "account_count": 1,
-            }
-        }
-        db.create_organization(organization_id=org_id, name="Test Org Cached", settings=settings)
+        db.create_organization(organization_id=org_id, name="Test Org Cached", settings={})
+        _seed_coa_cache(db, org_id, cached_accounts)
         db.save_erp_connection(
             organization_id=org_id, erp_type="quickbooks",
             access_token="tok", refresh_token=None, realm_id="realm1",
@@ -392,15 +422,8 @@ class TestChartOfAccountsDispatcher:
     def test_stale_cache_fetches_fresh(self, db):
         org_id = "org_coa_stale"
         stale_time = (datetime.now(timezone.utc) - timedelta(hours=25)).isoformat()
-        settings = {
-            "chart_of_accounts_cache": {
-                "accounts": [{"id": "old", "code": "OLD"}],
-                "fetched_at": stale_time,
-                "erp_type": "quickbooks",
-                "account_count": 1,
-            }
-        }
-        db.create_organization(organization_id=org_id, name="Test Org Stale", settings=settings)
+        db.create_organization(organization_id=org_id, name="Test Org Stale", settings={})
+        _seed_coa_cache(db, org_id, [{"id": "old", "code": "OLD"}], fetched_at=stale_time)
         db.save_erp_connection(
             organization_id=org_id, erp_type="quickbooks",
             access_token="tok", refresh_token=None, realm_id="realm1",
@@ -416,6 +439,8 @@ class TestChartOfAccountsDispatcher:
         with patch.dict(
             "solden.integrations.erp_router._CHART_OF_ACCOUNTS_FETCHERS",
             {"quickbooks": mock_fetcher},
+        ), patch.dict(
+            "solden.integrations.erp_router._ACCOUNT_CHANGE_FETCHERS", {}, clear=True,
         ):
             result = asyncio.run(get_chart_of_accounts(org_id))
 
@@ -425,15 +450,8 @@ class TestChartOfAccountsDispatcher:
 
     def test_force_refresh_bypasses_cache(self, db):
         org_id = "org_coa_force"
-        settings = {
-            "chart_of_accounts_cache": {
-                "accounts": [{"id": "cached", "code": "CACHED"}],
-                "fetched_at": datetime.now(timezone.utc).isoformat(),
-                "erp_type": "xero",
-                "account_count": 1,
-            }
-        }
-        db.create_organization(organization_id=org_id, name="Test Org Force", settings=settings)
+        db.create_organization(organization_id=org_id, name="Test Org Force", settings={})
+        _seed_coa_cache(db, org_id, [{"id": "cached", "code": "CACHED"}], "xero")
         db.save_erp_connection(
             organization_id=org_id, erp_type="xero",
             access_token="tok", refresh_token=None, realm_id=None,
@@ -449,12 +467,64 @@ class TestChartOfAccountsDispatcher:
         with patch.dict(
             "solden.integrations.erp_router._CHART_OF_ACCOUNTS_FETCHERS",
             {"xero": mock_fetcher},
+        ), patch.dict(
+            "solden.integrations.erp_router._ACCOUNT_CHANGE_FETCHERS", {}, clear=True,
         ):
             result = asyncio.run(get_chart_of_accounts(org_id, force_refresh=True))
 
         assert result[0]["code"] == "FRESH"
         mock_fetcher.assert_called_once()
 
+    def test_refresh_applies_delta_instead_of_full_pull(self, db):
+        org_id = "org_coa_delta"
+        db.create_organization(organization_id=org_id, name="Test Org Delta", settings={})
+        _seed_coa_cache(db, org_id, [
+            {"id": "1", "code": "5000", "name": "COGS", "type": "expense", "active": True},
+            {"id": "2", "code": "6200", "name": "Office", "type": "expense", "active": True},
+        ])
+        db.save_erp_connection(
+            organization_id=org_id, erp_type="quickbooks",
+            access_token="tok", refresh_token=None, realm_id="realm1",
+            tenant_id=None, base_url=None, credentials=None,
+        )
+
+        full_fetcher = AsyncMock(return_value=[])
+        change_fetcher = AsyncMock(return_value={
+            "upserts": [{"id": "1", "code": "5000", "name": "Cost of Sales",
+                         "type": "expense", "active": True}],
+            "deleted": ["2"],
+        })
+        with patch.dict(
+            "solden.integrations.erp_router._CHART_OF_ACCOUNTS_FETCHERS",
+            {"quickbooks": full_fetcher},
+        ), patch.dict(
+            "solden.integrations.erp_router._ACCOUNT_CHANGE_FETCHERS",
+            {"quickbooks": change_fetcher},
+        ):
+            result = asyncio.run(get_chart_of_accounts(org_id, force_refresh=True))
+
+        full_fetcher.assert_not_called()
+        since = change_fetcher.call_args.args[1]
+        assert since < datetime.now(timezone.utc)
+        assert [a["name"] for a in result] == ["Cost of Sales"]
+
+        # A failing change feed falls back to the full pull.
+        change_fetcher.side_effect = RuntimeError("cdc window exceeded")
+        full_fetcher.return_value = [
+            {"id": "3", "code": "7000", "name": "Travel", "type": "expense", "active": True},
+        ]
+        with patch.dict(
+            "solden.integrations.erp_router._CHART_OF_ACCOUNTS_FETCHERS",
+            {"quickbooks": full_fetcher},
+        ), patch.dict(
+            "solden.integrations.erp_router._ACCOUNT_CHANGE_FETCHERS",
+            {"quickbooks": change_fetcher},
+        ):
+            result = asyncio.run(get_chart_of_accounts(org_id, force_refresh=True))
+
+        full_fetcher.assert_called_once()
+        assert [a["code"] for a in result] == ["7000"]
+
     def test_no_erp_connection_returns_empty(self, db):
         org_id = "org_no_erp"
         db.create_organization(organization_id=org_id, name="No ERP", settings={})
@@ -527,20 +597,13 @@ class TestAccountTypeNormalization:
 class TestGLValidationWithCachedCOA:
     def test_gl_codes_valid_against_cached_coa(self, db):
         org_id = "org_gl_coa"
-        settings = {
-            "chart_of_accounts_cache": {
-                "accounts": [
-                    {"id": "1", "code": "5000", "name": "COGS", "type": "expense",
-                     "active": True, "currency": ""},
-                    {"id": "2", "code": "6200", "name": "Office", "type": "expense",
-                     "active": True, "currency": ""},
-                ],
-                "fetched_at": datetime.now(timezone.utc).isoformat(),
-                "erp_type": "quickbooks",
-                "account_count": 2,
-            }
-        }
-        db.create_organization(organization_id=org_id, name="GL COA Org", settings=settings)
+        db.create_organization(organization_id=org_id, name="GL COA Org", settings={})
+        _seed_coa_cache(db, org_id, [
+            {"id": "1", "code": "5000", "name": "COGS", "type": "expense",
+             "active": True, "currency": ""},
+            {"id": "2", "code": "6200", "name": "Office", "type": "expense",
+             "active": True, "currency": ""},
+        ])
         db.save_erp_connection(
             organization_id=org_id, erp_type="quickbooks",
             access_token="tok", refresh_token=None, realm_id="realm1",
@@ -556,18 +619,11 @@ class TestGLValidationWithCachedCOA:
 
     def test_gl_codes_invalid_against_cached_coa(self, db):
         org_id = "org_gl_invalid"
-        settings = {
-            "chart_of_accounts_cache": {
-                "accounts": [
-                    {"id": "1", "code": "5000", "name": "COGS", "type": "expense",
-                     "active": True, "currency": ""},
-                ],
-                "fetched_at": datetime.now(timezone.utc).isoformat(),
-                "erp_type": "quickbooks",
-                "account_count": 1,
-            }
-        }
-        db.create_organization(organization_id=org_id, name="GL Invalid Org", settings=settings)
+        db.create_organization(organization_id=org_id, name="GL Invalid Org", settings={})
+        _seed_coa_cache(db, org_id, [
+            {"id": "1", "code": "5000", "name": "COGS", "type": "expense",
+             "active": True, "currency": ""},
+        ])
         db.save_erp_connection(
             organization_id=org_id, erp_type="quickbooks",
             access_token="tok", refresh_token=None, realm_id="realm1",
@@ -582,18 +638,11 @@ class TestGLValidationWithCachedCOA:
     def test_gl_codes_valid_by_id_match(self, db):
         """Account ID (not just code) should be accepted as valid."""
         org_id = "org_gl_id"
-        settings = {
-            "chart_of_accounts_cache": {
-                "accounts": [
-                    {"id": "42", "code": "5000", "name": "COGS", "type": "expense",
-                     "active": True, "currency": ""},
-                ],
-                "fetched_at": datetime.now(timezone.utc).isoformat(),
-                "erp_type": "quickbooks",
-                "account_count": 1,
-            }
-        }
-        db.create_organization(organization_id=org_id, name="GL ID Org", settings=settings)
+        db.create_organization(organization_id=org_id, name="GL ID Org", settings={})
+        _seed_coa_cache(db, org_id, [
+            {"id": "42", "code": "5000", "name": "COGS", "type": "expense",
+             "active": True, "currency": ""},
+        ])
         db.save_erp_connection(
             organization_id=org_id, erp_type="quickbooks",
             access_token="tok", refresh_token=None, realm_id="realm1",
@@ -624,8 +673,6 @@ class TestChartOfAccountsEndpoint:
         mock_accounts = [
             {"id": "1", "code": "5000", "name": "COGS", "type": "expense",
              "sub_type": "", "active": True, "currency": "USD"},
-            {"id": "2", "code": "6200", "name": "Office", "type": "expense",
-             "sub_type": "", "active": False, "currency": "USD"},
         ]
 
         from solden.api.workspace_shell import get_chart_of_accounts_endpoint
@@ -642,7 +689,7 @@ class TestChartOfAccountsEndpoint:
                 "solden.integrations.erp_router.get_chart_of_accounts",
                 new_callable=AsyncMock,
                 return_value=mock_accounts,
-            ):
+            ) as mock_get:
                 result = asyncio.run(
                     get_chart_of_accounts_endpoint(
                         organization_id=org_id,
@@ -653,7 +700,8 @@ class TestChartOfAccountsEndpoint:
                     )
                 )
 
-        # active_only=True should filter out the inactive account
+        # active_only=True is applied by the cache query
+        assert mock_get.call_args.kwargs["active_only"] is True
         assert result["account_count"] == 1
         assert result["accounts"][0]["code"] == "5000"
 
@@ -664,8 +712,6 @@ class TestChartOfAccountsEndpoint:
         mock_accounts = [
             {"id": "1", "code": "5000", "name": "COGS", "type": "expense",
              "sub_type": "", "active": True, "currency": ""},
-            {"id": "2", "code": "4000", "name": "Revenue", "type": "revenue",
-             "sub_type": "", "active": True, "currency": ""},
         ]
 
         from solden.api.workspace_shell import get_chart_of_accounts_endpoint
@@ -679,7 +725,7 @@ class TestChartOfAccountsEndpoint:
                 "solden.integrations.erp_router.get_chart_of_accounts",
                 new_callable=AsyncMock,
                 return_value=mock_accounts,
-            ):
+            ) as mock_get:
                 result = asyncio.run(
                     get_chart_of_accounts_endpoint(
                         organization_id=org_id,
@@ -690,6 +736,8 @@ class TestChartOfAccountsEndpoint:
                     )
                 )
 
+        assert mock_get.call_args.kwargs["account_type"] == "expense"
+        assert mock_get.call_args.kwargs["active_only"] is False
         assert result["account_count"] == 1
         assert result["accounts"][0]["type"] == "expense"
 
@@ -724,15 +772,8 @@ class TestCacheHelpers:
     def test_stale_cache_returns_none(self, db):
         org_id = "org_stale_cache"
         stale_time = (datetime.now(timezone.utc) - timedelta(hours=25)).isoformat()
-        settings = {
-            "chart_of_accounts_cache": {
-                "accounts": [],
-                "fetched_at": stale_time,
-                "erp_type": "quickbooks",
-                "account_count": 0,
-            }
-        }
-        db.create_organization(organization_id=org_id, name="Stale Cache", settings=settings)
+        db.create_organization(organization_id=org_id, name="Stale Cache", settings={})
+        _seed_coa_cache(db, org_id, [], fetched_at=stale_time)
         assert _get_cached_chart_of_accounts(org_id) is None
 
     def test_nonexistent_org_returns_none(self, db):
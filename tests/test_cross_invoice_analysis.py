@@ -95,6 +95,91 @@ class TestDuplicateDetection:
         assert len(result.duplicates) <= 3
 
 
+def _indexed_row(
+    *, item_id="AP-old", vendor_name="Acme", vendor_key="acme", invoice_number="INV-700",
+    amount=700.0, currency="USD", invoice_date="2025-01-10", message_id=None, thread_id=None,
+):
+    return {
+        "id": item_id,
+        "message_id": message_id,
+        "thread_id": thread_id,
+        "vendor_name": vendor_name,
+        "vendor_key": vendor_key,
+        "invoice_number": invoice_number,
+        "amount": amount,
+        "currency": currency,
+        "invoice_date": invoice_date,
+        "created_at": "2025-01-11T09:00:00+00:00",
+        "state": "closed",
+    }
+
+
+class TestFingerprintIndexCandidates:
+    def test_index_candidate_outside_history_is_flagged(self, analyzer, mock_db):
+        mock_db.find_invoice_duplicate_candidates.return_value = [[_indexed_row()]]
+        result = analyzer.analyze(
+            vendor="ACME, Inc.", amount=700.0, invoice_number="#700", invoice_date="2025-01-12",
+        )
+        assert len(result.duplicates) == 1
+        assert result.duplicates[0].severity == "high"
+        assert result.duplicates[0].match_score == pytest.approx(1.0)
+        mock_db.find_invoice_duplicate_candidates.assert_called_once()
+        org, probes = mock_db.find_invoice_duplicate_candidates.call_args[0]
+        assert org == "test-org" and probes[0]["invoice_number"] == "#700"
+
+    def test_other_vendor_needs_number_and_amount(self, analyzer, mock_db):
+        mock_db.find_invoice_duplicate_candidates.return_value = [[
+            _indexed_row(item_id="AP-a", vendor_name="Globex", vendor_key="globex", amount=50.0),
+            _indexed_row(item_id="AP-b", vendor_name="Globex", vendor_key="globex"),
+        ]]
+        result = analyzer.analyze(vendor="Acme", amount=700.0, invoice_number="INV-700")
+        assert [d.matching_invoice_id for d in result.duplicates] == ["AP-b"]
+        assert "Filed under vendor 'Globex'" in result.duplicates[0].details["reasons"]
+
+    def test_item_in_history_and_index_scored_once(self, analyzer, mock_db):
+        history = _make_invoice(invoice_number="INV-700", amount=700.0)
+        history["ap_item_id"] = "AP-old"
+        mock_db.get_vendor_invoice_history.return_value = [history]
+        mock_db.find_invoice_duplicate_candidates.return_value = [[_indexed_row()]]
+        result = analyzer.analyze(vendor="Acme", amount=700.0, invoice_number="INV-700")
+        assert len(result.duplicates) == 1
+
+    def test_own_index_row_is_not_a_duplicate(self, analyzer, mock_db):
+        # save_invoice_status rows carry the Gmail id in thread_id only.
+        mock_db.find_invoice_duplicate_candidates.return_value = [
+            [_indexed_row(item_id="AP-self", thread_id="gmail-self")],
+        ]
+        by_item = analyzer.analyze(
+            vendor="Acme", amount=700.0, invoice_number="INV-700", ap_item_id="AP-self",
+        )
+        assert by_item.duplicates == []
+        by_gmail = analyzer.analyze(
+            vendor="Acme", amount=700.0, invoice_number="INV-700", gmail_id="gmail-self",
+        )
+        assert by_gmail.duplicates == []
+
+    def test_index_failure_falls_back_to_history(self, analyzer, mock_db):
+        mock_db.get_vendor_invoice_history.return_value = [_make_invoice(invoice_number="INV-800")]
+        mock_db.find_invoice_duplicate_candidates.side_effect = Exception("DB down")
+        result = analyzer.analyze(vendor="Acme", amount=1.0, invoice_number="INV-800")
+        assert len(result.duplicates) == 1
+
+    def test_check_duplicates_many_uses_one_lookup(self, analyzer, mock_db):
+        mock_db.find_invoice_duplicate_candidates.return_value = [
+            [_indexed_row()],
+            [],
+            [_indexed_row(message_id="self-msg")],
+        ]
+        results = analyzer.check_duplicates_many([
+            {"vendor": "Acme", "amount": 700.0, "invoice_number": "INV-700"},
+            {"vendor": "Acme", "amount": 10.0, "invoice_number": "INV-9"},
+            {"vendor": "Acme", "amount": 700.0, "invoice_number": "INV-700", "gmail_id": "self-msg"},
+        ])
+        assert [len(alerts) for alerts in results] == [1, 0, 0]
+        assert mock_db.find_invoice_duplicate_candidates.call_count == 1
+        mock_db.get_vendor_invoice_history.assert_not_called()
+
+
 class TestAnomalyDetection:
     def test_amount_much_higher_than_avg(self, analyzer, mock_db):
         mock_db.get_vendor_invoice_history.return_value = [
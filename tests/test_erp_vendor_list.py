@@ -28,6 +28,7 @@ from solden.integrations.erp_router import (
     list_all_vendors_sap,
     _get_cached_vendor_list,
     _save_vendor_list_cache,
+    find_cached_vendor,
 )
 
 
@@ -346,33 +347,44 @@ class TestVendorListCache:
 
     def test_cache_miss_when_expired(self, db):
         db.create_organization("stale-org", "Stale Org", settings={})
-        # Save with a timestamp 25 hours ago
+        _save_vendor_list_cache("stale-org", [{"vendor_id": "1", "name": "Old"}], "xero")
+        # Backdate the sync 25 hours
         stale_time = (datetime.now(timezone.utc) - timedelta(hours=25)).isoformat()
-        db.update_organization("stale-org", settings_json={
-            "vendor_list_cache": {
-                "vendors": [{"vendor_id": "1", "name": "Old"}],
-                "fetched_at": stale_time,
-                "erp_type": "xero",
-                "vendor_count": 1,
-            }
-        })
+        db.record_erp_cache_sync("vendors", "stale-org", "xero", full=True, synced_at=stale_time)
         assert _get_cached_vendor_list("stale-org") is None
 
     def test_cache_hit_when_fresh(self, db):
         db.create_organization("fresh-org", "Fresh Org", settings={})
+        _save_vendor_list_cache("fresh-org", [{"vendor_id": "1", "name": "Fresh"}], "netsuite")
         fresh_time = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
-        db.update_organization("fresh-org", settings_json={
-            "vendor_list_cache": {
-                "vendors": [{"vendor_id": "1", "name": "Fresh"}],
-                "fetched_at": fresh_time,
-                "erp_type": "netsuite",
-                "vendor_count": 1,
-            }
-        })
+        db.record_erp_cache_sync("vendors", "fresh-org", "netsuite", full=True, synced_at=fresh_time)
         cached = _get_cached_vendor_list("fresh-org")
         assert cached is not None
         assert cached["vendors"][0]["name"] == "Fresh"
 
+    def test_pages_filters_and_lookups_run_against_the_table(self, db):
+        db.create_organization("page-org", "Page Org", settings={})
+        vendors = [
+            {"vendor_id": str(i), "name": f"Vendor {i:02d}", "email": f"ap{i}@v{i}.com",
+             "active": i % 3 != 0}
+            for i in range(1, 11)
+        ]
+        vendors.append({"vendor_id": "x1", "name": "  ACME   Supplies ", "email": "", "active": True})
+        _save_vendor_list_cache("page-org", vendors, "quickbooks")
+
+        with patch("solden.integrations.erp_router.get_erp_connection") as mock_conn:
+            page = asyncio.run(list_all_vendors("page-org", limit=3, offset=3))
+            active = asyncio.run(list_all_vendors("page-org", active_only=True, search="vendor"))
+            by_email = asyncio.run(list_all_vendors("page-org", search="AP7@"))
+            mock_conn.assert_not_called()
+
+        assert [v["vendor_id"] for v in page] == ["3", "4", "5"]
+        assert len(active) == 7
+        assert [v["vendor_id"] for v in by_email] == ["7"]
+        assert find_cached_vendor("page-org", name="acme supplies")["vendor_id"] == "x1"
+        assert find_cached_vendor("page-org", vendor_id="4")["name"] == "Vendor 04"
+        assert find_cached_vendor("page-org", name="nobody") is None
+
 
 # ===========================================================================
 # Router dispatcher (list_all_vendors)
@@ -462,31 +474,33 @@ class TestERPVendorsEndpoint:
     def test_endpoint_returns_200(self, client, db):
         mock_vendors = [
             {"vendor_id": "1", "name": "Acme", "email": "a@acme.com", "active": True},
-            {"vendor_id": "2", "name": "Beta", "email": "b@beta.com", "active": False},
         ]
-        with self._patch_list(mock_vendors):
+        with self._patch_list(mock_vendors) as mock_list:
             resp = client.get("/api/workspace/erp-vendors")
 
         assert resp.status_code == 200
         data = resp.json()
         assert "vendors" in data
         assert "vendor_count" in data
-        # active_only=True by default, so inactive vendor is filtered
+        # active_only=True by default, applied by the cache query
+        assert mock_list.call_args.kwargs["active_only"] is True
         assert data["vendor_count"] == 1
         assert data["vendors"][0]["name"] == "Acme"
 
     def test_endpoint_search_filter(self, client, db):
         mock_vendors = [
-            {"vendor_id": "1", "name": "Acme Corp", "email": "a@acme.com", "active": True},
             {"vendor_id": "2", "name": "Beta LLC", "email": "b@beta.com", "active": True},
         ]
-        with self._patch_list(mock_vendors):
+        with self._patch_list(mock_vendors) as mock_list:
             resp = client.get("/api/workspace/erp-vendors?search=beta&active_only=false")
 
         assert resp.status_code == 200
+        assert mock_list.call_args.kwargs["search"] == "beta"
+        assert mock_list.call_args.kwargs["active_only"] is False
         data = resp.json()
         assert data["vendor_count"] == 1
         assert data["vendors"][0]["name"] == "Beta LLC"
+        assert data["filtered"] is True
 
     def test_endpoint_all_vendors_when_not_active_only(self, client, db):
         mock_vendors = [
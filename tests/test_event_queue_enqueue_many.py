@@ -0,0 +1,153 @@
+"""Tests for multi-event enqueue on the durable event queue.
+
+Covers:
+  * ``RedisEventQueue.enqueue_many`` sends one script call per 500
+    events, routes each event to its priority stream, dedups on
+    idempotency keys (including repeats inside one batch) and returns
+    per-event results in order; a failed chunk raises with the results
+    of the chunks before it.
+  * Every append is capped with ``MAXLEN ~``, single enqueues included.
+  * ``InMemoryEventQueue.enqueue_many`` mirrors the API.
+
+The fake Redis decodes the script's ARGV layout and applies the same
+SET NX / XADD steps, so a change to the encoding breaks these tests.
+"""
+from __future__ import annotations
+
+from typing import Dict, List
+
+from solden.core import event_queue as event_queue_module
+from solden.core.event_queue import (
+    STREAM_HIGH,
+    EnqueueManyError,
+    STREAM_STANDARD,
+    InMemoryEventQueue,
+    RedisEventQueue,
+)
+from solden.core.events import AgentEvent, AgentEventType
+
+
+def _event(key: str = "", priority: str = "standard") -> AgentEvent:
+    return AgentEvent(
+        type=AgentEventType.TIMER_FIRED,
+        source="test",
+        payload={"box_id": key or "AP-1"},
+        organization_id="org-1",
+        priority=priority,
+        idempotency_key=key or None,
+    )
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.keys: Dict[str, str] = {}
+        self.streams: Dict[str, List[dict]] = {STREAM_HIGH: [], STREAM_STANDARD: []}
+        self.script_calls: List[list] = []
+        self.xadd_kwargs: List[dict] = []
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    def xadd(self, stream, fields, **kwargs):
+        self.xadd_kwargs.append(kwargs)
+        self.streams[stream].append(dict(fields))
+        return f"{len(self.streams[stream])}-0"
+
+    def register_script(self, source):
+        assert "MAXLEN" in source
+
+        def _run(keys=None, args=None):
+            self.script_calls.append(list(args))
+            maxlen, ttl, rest = args[0], args[1], list(args[2:])
+            results = []
+            while rest:
+                dedup_key, stream, count = rest[0], rest[1], int(rest[2])
+                pairs, rest = rest[3:3 + 2 * count], rest[3 + 2 * count:]
+                if dedup_key and not self.set(dedup_key, "1", nx=True, ex=ttl):
+                    results.append("duplicate")
+                    continue
+                results.append(self.xadd(stream, dict(zip(pairs[::2], pairs[1::2])), maxlen=maxlen))
+            return results
+
+        return _run
+
+
+def _queue(fake: _FakeRedis) -> RedisEventQueue:
+    queue = RedisEventQueue.__new__(RedisEventQueue)
+    queue._redis = fake
+    return queue
+
+
+def test_enqueue_many_dedups_routes_and_keeps_order():
+    fake = _FakeRedis()
+    queue = _queue(fake)
+    fake.keys["clearledgr:dedup:seen"] = "1"
+
+    results = queue.enqueue_many([
+        _event("a"),
+        _event("seen"),
+        _event("b", priority="high_priority"),
+        _event("a"),  # repeat inside the batch
+        _event(),  # no key: never deduped
+    ])
+
+    assert results == ["1-0", "duplicate", "1-0", "duplicate", "2-0"]
+    assert len(fake.script_calls) == 1
+    assert fake.script_calls[0][:2] == [event_queue_module._STREAM_MAXLEN, event_queue_module._DEDUP_TTL_SECONDS]
+    assert [AgentEvent.from_dict(f).idempotency_key for f in fake.streams[STREAM_STANDARD]] == ["a", None]
+    assert [AgentEvent.from_dict(f).idempotency_key for f in fake.streams[STREAM_HIGH]] == ["b"]
+    assert queue.enqueue_many([]) == []
+    assert len(fake.script_calls) == 1
+
+
+def test_enqueue_many_chunks_large_bursts(monkeypatch):
+    monkeypatch.setattr(event_queue_module, "_ENQUEUE_MANY_CHUNK", 4)
+    fake = _FakeRedis()
+
+    results = _queue(fake).enqueue_many([_event(f"k{i}") for i in range(10)])
+
+    assert len(results) == 10 and "duplicate" not in results
+    assert len(fake.script_calls) == 3
+
+
+def test_single_enqueue_caps_stream_length():
+    fake = _FakeRedis()
+    queue = _queue(fake)
+
+    queue.enqueue(_event("x"))
+    assert queue.enqueue(_event("x")) == "duplicate"
+    assert fake.xadd_kwargs == [{"maxlen": event_queue_module._STREAM_MAXLEN, "approximate": True}]
+
+
+def test_in_memory_enqueue_many_matches_enqueue():
+    queue = InMemoryEventQueue()
+
+    results = queue.enqueue_many([_event("a"), _event("b", priority="high_priority")])
+
+    assert results == ["1-0", "2-0"]
+    assert queue.pending_count() == {STREAM_HIGH: 1, STREAM_STANDARD: 1}
+
+
+def test_enqueue_many_reports_results_before_a_failed_chunk(monkeypatch):
+    monkeypatch.setattr(event_queue_module, "_ENQUEUE_MANY_CHUNK", 4)
+    fake = _FakeRedis()
+    run = fake.register_script("MAXLEN")
+    calls = []
+
+    def _flaky(keys=None, args=None):
+        calls.append(1)
+        if len(calls) == 2:
+            raise ConnectionError("redis went away")
+        return run(keys=keys, args=args)
+
+    fake.register_script = lambda source: _flaky
+
+    try:
+        _queue(fake).enqueue_many([_event(f"k{i}") for i in range(10)])
+    except EnqueueManyError as exc:
+        assert exc.results == ["1-0", "2-0", "3-0", "4-0"]
+    else:
+        raise AssertionError("expected EnqueueManyError")
@@ -0,0 +1,267 @@
+"""Tests for the long-running Redis Streams event consumer.
+
+Covers:
+  * claim_batch drains high_priority before standard, one XREADGROUP
+    per stream, and only blocks when both streams are empty.
+  * Poison entries are acked and dropped at decode time.
+  * Entries are acked only after the handler returns — a handler that
+    raises leaves the entry pending for reclaim.
+  * at_capacity results are retried locally, not acked, up to
+    max_deferred at once.
+  * reclaim_stale output runs through the same pipeline, and an entry
+    delivered more than MAX_DELIVERIES times is dead-lettered.
+"""
+from __future__ import annotations
+
+import threading
+from typing import List
+
+from solden.core.event_queue import (
+    STREAM_HIGH,
+    STREAM_STANDARD,
+    InMemoryEventQueue,
+    RedisEventQueue,
+)
+from solden.core.events import AgentEvent, AgentEventType
+from solden.services.event_stream_consumer import EventStreamConsumer
+
+
+def _event(priority: str = "standard", org: str = "org-1") -> AgentEvent:
+    return AgentEvent(
+        type=AgentEventType.EMAIL_RECEIVED,
+        source="test",
+        payload={"message_id": "m1"},
+        organization_id=org,
+        priority=priority,
+    )
+
+
+class _RecordingQueue(InMemoryEventQueue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.acked: List[tuple] = []
+        self.stale: List[tuple] = []
+
+    def ack_many(self, stream, entry_ids):
+        self.acked.extend((stream, entry_id) for entry_id in entry_ids)
+
+    def reclaim_stale(self, consumer_name, count=10):
+        reclaimed, self.stale = self.stale[:count], self.stale[count:]
+        return reclaimed
+
+
+class _FakeRedis:
+    """Just enough XREADGROUP / XACK for RedisEventQueue.claim_batch."""
+
+    def __init__(self, streams):
+        self.streams = streams
+        self.reads: List[tuple] = []
+        self.acks: List[tuple] = []
+
+    def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        self.reads.append((tuple(streams), count, block))
+        out = []
+        for name in streams:
+            entries = self.streams.get(name, [])
+            take, self.streams[name] = entries[:count], entries[count:]
+            if take:
+                out.append((name, take))
+        return out
+
+    def xack(self, stream, group, *entry_ids):
+        self.acks.append((stream, entry_ids))
+
+
+def _redis_queue(fake: _FakeRedis) -> RedisEventQueue:
+    queue = RedisEventQueue.__new__(RedisEventQueue)
+    queue._redis = fake
+    return queue
+
+
+def _run_until_idle(consumer: EventStreamConsumer, turns: int = 50) -> None:
+    for _ in range(turns):
+        consumer.run_once()
+    consumer.drain()
+
+
+# ─── RedisEventQueue.claim_batch ──────────────────────────────────
+
+
+def test_claim_batch_reads_high_priority_first_and_fills_from_standard():
+    high = [(f"{i}-0", _event("high_priority").to_dict()) for i in range(3)]
+    standard = [(f"{i}-1", _event().to_dict()) for i in range(5)]
+    fake = _FakeRedis({STREAM_HIGH: high, STREAM_STANDARD: standard})
+
+    claimed = _redis_queue(fake).claim_batch("c1", count=5)
+
+    assert [c[0] for c in claimed] == [STREAM_HIGH] * 3 + [STREAM_STANDARD] * 2
+    assert fake.reads == [((STREAM_HIGH,), 5, None), ((STREAM_STANDARD,), 2, None)]
+
+
+def test_claim_batch_blocks_on_both_streams_only_when_empty():
+    fake = _FakeRedis({STREAM_HIGH: [], STREAM_STANDARD: []})
+
+    assert _redis_queue(fake).claim_batch("c1", count=8, block_ms=1500) == []
+    assert fake.reads[-1] == ((STREAM_HIGH, STREAM_STANDARD), 8, 1500)
+
+
+def test_claim_batch_acks_and_drops_poison_entries():
+    good = _event().to_dict()
+    poison = {"type": "email_received"}  # no organization_id
+    fake = _FakeRedis({STREAM_HIGH: [], STREAM_STANDARD: [("1-0", poison), ("2-0", good)]})
+
+    claimed = _redis_queue(fake).claim_batch("c1", count=10)
+
+    assert [c[1] for c in claimed] == ["2-0"]
+    assert fake.acks == [(STREAM_STANDARD, ("1-0",))]
+
+
+# ─── EventStreamConsumer ──────────────────────────────────────────
+
+
+def test_consumer_acks_after_handler_and_keeps_priority_order():
+    queue = _RecordingQueue()
+    for _ in range(3):
+        queue.enqueue(_event())
+    queue.enqueue(_event("high_priority"))
+    seen: List[str] = []
+
+    def handler(event_data, redis_client=None):
+        seen.append(event_data["priority"])
+        return {"status": "completed"}
+
+    consumer = EventStreamConsumer(queue, consumer_name="c1", max_in_flight=1, handler=handler)
+    _run_until_idle(consumer)
+
+    assert seen == ["high_priority", "standard", "standard", "standard"]
+    assert len(queue.acked) == 4
+    assert consumer.stats["completed"] == 4
+
+
+def test_consumer_does_not_ack_before_handler_finishes():
+    queue = _RecordingQueue()
+    queue.enqueue(_event())
+    release = threading.Event()
+
+    def handler(event_data, redis_client=None):
+        release.wait(5)
+        return {"status": "completed"}
+
+    consumer = EventStreamConsumer(queue, consumer_name="c1", handler=handler)
+    consumer.run_once()
+    consumer.run_once()
+    assert queue.acked == []
+
+    release.set()
+    consumer.drain()
+    assert len(queue.acked) == 1
+
+
+def test_consumer_leaves_raising_events_pending():
+    queue = _RecordingQueue()
+    queue.enqueue(_event())
+
+    def handler(event_data, redis_client=None):
+        raise RuntimeError("worker crashed mid-plan")
+
+    consumer = EventStreamConsumer(queue, consumer_name="c1", handler=handler)
+    _run_until_idle(consumer)
+
+    assert queue.acked == []
+    assert consumer.stats["errors"] == 1
+
+
+def test_consumer_acks_failed_and_poison_results():
+    queue = _RecordingQueue()
+    queue.enqueue(_event())
+    queue.enqueue(_event())
+    statuses = iter(["failed", "poison_payload"])
+
+    consumer = EventStreamConsumer(
+        queue, consumer_name="c1", max_in_flight=1,
+        handler=lambda event_data, redis_client=None: {"status": next(statuses)},
+    )
+    _run_until_idle(consumer)
+
+    assert len(queue.acked) == 2
+    assert consumer.stats["failed"] == 1
+    assert consumer.stats["poison"] == 1
+
+
+def test_consumer_retries_at_capacity_without_acking(monkeypatch):
+    queue = _RecordingQueue()
+    queue.enqueue(_event())
+    results = iter([{"status": "at_capacity"}, {"status": "completed"}])
+
+    consumer = EventStreamConsumer(
+        queue, consumer_name="c1",
+        handler=lambda event_data, redis_client=None: next(results),
+    )
+    monkeypatch.setattr(consumer, "CAPACITY_RETRY_SECONDS", 0.0)
+    consumer.run_once()
+    consumer.drain()
+    assert queue.acked == []
+    assert consumer.stats["deferred"] == 1
+
+    _run_until_idle(consumer)
+    assert len(queue.acked) == 1
+    assert consumer.stats["completed"] == 1
+
+
+def test_consumer_runs_reclaimed_entries_through_same_pipeline():
+    queue = _RecordingQueue()
+    queue.stale = [(STREAM_STANDARD, "9-0", _event())]
+    handled: List[str] = []
+
+    def handler(event_data, redis_client=None):
+        handled.append(event_data["id"])
+        return {"status": "completed"}
+
+    consumer = EventStreamConsumer(queue, consumer_name="c1", handler=handler)
+    consumer.run_once(reclaim=True)
+    consumer.drain()
+
+    assert len(handled) == 1
+    assert queue.acked == [(STREAM_STANDARD, "9-0")]
+    assert consumer.stats["reclaimed"] == 1
+
+
+def test_consumer_releases_at_capacity_entries_past_max_deferred():
+    queue = _RecordingQueue()
+    for _ in range(3):
+        queue.enqueue(_event())
+
+    consumer = EventStreamConsumer(
+        queue, consumer_name="c1", max_deferred=2,
+        handler=lambda event_data, redis_client=None: {"status": "at_capacity"},
+    )
+    consumer.run_once()
+    consumer.drain()
+
+    assert len(consumer._deferred) == 2
+    assert consumer.stats["deferred"] == 2
+    assert consumer.stats["released"] == 1
+    assert queue.acked == []
+
+
+def test_consumer_dead_letters_entries_past_max_deliveries():
+    queue = _RecordingQueue()
+    handled: List[str] = []
+
+    def handler(event_data, redis_client=None):
+        handled.append(event_data["id"])
+        raise RuntimeError("worker crashed mid-plan")
+
+    consumer = EventStreamConsumer(queue, consumer_name="c1", handler=handler)
+    stale = (STREAM_STANDARD, "9-0", _event())
+    for _ in range(consumer.MAX_DELIVERIES + 1):
+        queue.stale = [stale]
+        consumer.run_once(reclaim=True)
+        consumer.drain()
+
+    assert len(handled) == consumer.MAX_DELIVERIES
+    assert queue.acked == []
+    assert [(d[0], d[1], d[3]) for d in queue.dead_letters] == [
+        (STREAM_STANDARD, "9-0", f"max_deliveries:{consumer.MAX_DELIVERIES + 1}"),
+    ]
+    assert consumer.stats["dead_lettered"] == 1
@@ -0,0 +1,205 @@
+"""Tests for batched Gmail history intake.
+
+Covers:
+  * ``GmailAPIClient.batch_get_messages`` sends one multipart request
+    per 50 ids to the Gmail batch endpoint, retries parts rejected
+    inside the batch individually, and leaves deleted messages out.
+  * ``process_gmail_notification`` resolves every message's thread in
+    one batch fetch and one ``get_ap_items_by_threads`` query, then
+    hands all events to ``enqueue_many`` in one call — replies on a
+    watched thread become VENDOR_RESPONSE_RECEIVED.
+  * When ``enqueue_many`` fails part-way, only the messages whose events
+    weren't confirmed are processed inline.
+"""
+from __future__ import annotations
+
+import json
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List
+
+import httpx
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from solden.api import gmail_webhooks  # noqa: E402
+from solden.core import database as db_module  # noqa: E402
+from solden.core.event_queue import EnqueueManyError  # noqa: E402
+from solden.core.events import AgentEvent, AgentEventType  # noqa: E402
+from solden.services import gmail_api  # noqa: E402
+from solden.services.gmail_api import GmailAPIClient, GmailMessage, GmailToken  # noqa: E402
+
+
+def _message_json(message_id: str) -> dict:
+    return {
+        "id": message_id,
+        "threadId": f"thread-{message_id}",
+        "labelIds": ["INBOX"],
+        "snippet": "",
+        "payload": {"headers": [{"name": "Subject", "value": f"Invoice {message_id}"}]},
+    }
+
+
+def _batch_responder(statuses: Dict[str, int]):
+    """Answer a batch request part-by-part; ids default to 200."""
+
+    def _respond(request: httpx.Request) -> httpx.Response:
+        body = request.content.decode("utf-8")
+        parts = []
+        for content_id, message_id in re.findall(r"Content-ID: <item-(\d+)>\r\n\r\nGET /gmail/v1/users/me/messages/([^?]+)", body):
+            status = statuses.get(message_id, 200)
+            payload = _message_json(message_id) if status == 200 else {"error": {"code": status}}
+            parts.append(
+                "--resp\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-item-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\n\r\n"
+                f"{json.dumps(payload)}\r\n"
+            )
+        return httpx.Response(
+            200,
+            text="".join(parts) + "--resp--\r\n",
+            headers={"Content-Type": "multipart/mixed; boundary=resp"},
+        )
+
+    return _respond
+
+
+def _authenticated_client() -> GmailAPIClient:
+    client = GmailAPIClient("user-1")
+    client._token = GmailToken(
+        user_id="user-1",
+        access_token="token",
+        refresh_token="refresh",
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+        email="ap@example.com",
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_batch_get_messages_chunks_and_retries_rejected_parts(mock_http):
+    ids = [f"m{index}" for index in range(60)]
+    mock_http.handle_dynamic("POST", "batch/gmail/v1", _batch_responder({"m3": 429, "m7": 404}))
+    mock_http.handle("GET", "/users/me/messages/m3", json=_message_json("m3"))
+
+    messages = await _authenticated_client().batch_get_messages(ids + ["m0"], format="metadata")
+
+    batch_calls = [call for call in mock_http.calls if call.method == "POST"]
+    assert len(batch_calls) == 2  # 50 + 10
+    assert "format=metadata" in batch_calls[0].text_body
+    assert batch_calls[0].headers["content-type"].startswith("multipart/mixed; boundary=")
+    assert [call.url for call in mock_http.calls if call.method == "GET"] == [
+        f"{gmail_api.GMAIL_API_BASE}/users/me/messages/m3?format=metadata"
+    ]
+    assert set(messages) == set(ids) - {"m7"}
+    assert messages["m3"].thread_id == "thread-m3"
+
+
+class _BatchQueue:
+    def __init__(self) -> None:
+        self.batches: List[List[AgentEvent]] = []
+
+    def enqueue_many(self, events: List[AgentEvent]) -> List[str]:
+        self.batches.append(list(events))
+        return [f"entry-{index}" for index, _ in enumerate(events)]
+
+
+class _HistoryClient:
+    def __init__(self, message_ids: List[str]) -> None:
+        self._message_ids = message_ids
+        self.batch_calls = 0
+
+    async def ensure_authenticated(self) -> bool:
+        return True
+
+    async def get_history(self, _history_id: str) -> dict:
+        return {"history": [
+            {"messagesAdded": [{"message": {"id": message_id}}]} for message_id in self._message_ids
+        ]}
+
+    async def batch_get_messages(self, message_ids, format="full") -> Dict[str, GmailMessage]:
+        self.batch_calls += 1
+        return {
+            message_id: SimpleNamespace(id=message_id, thread_id=f"thread-{message_id}")
+            for message_id in message_ids
+        }
+
+
+@pytest.mark.asyncio
+async def test_notification_resolves_threads_and_enqueues_in_one_batch(monkeypatch):
+    db = db_module.get_db()
+    db.initialize()
+    db.ensure_organization("org-batch", organization_name="Batch Co")
+    db.create_ap_item({
+        "id": "AP-batch-1",
+        "invoice_key": "inv-batch-1",
+        "thread_id": "thread-m1",
+        "message_id": "msg-original",
+        "vendor_name": "Acme",
+        "amount": 10.0,
+        "state": "needs_approval",
+        "organization_id": "org-batch",
+    })
+
+    history_client = _HistoryClient(["m0", "m1", "m2", "m1"])
+    queue = _BatchQueue()
+    lookups = []
+    original_lookup = db.get_ap_items_by_threads
+
+    def _counting_lookup(organization_id, thread_ids):
+        lookups.append(list(thread_ids))
+        return original_lookup(organization_id, thread_ids)
+
+    monkeypatch.setattr(db, "get_ap_items_by_threads", _counting_lookup)
+    monkeypatch.setattr(
+        gmail_webhooks.token_store, "get_by_email",
+        lambda _email: SimpleNamespace(user_id="user-1", email="ap@example.com"),
+    )
+    monkeypatch.setattr(gmail_webhooks, "_resolve_user_org_id", lambda _user_id: "org-batch")
+    monkeypatch.setattr(gmail_webhooks, "GmailAPIClient", lambda _user_id: history_client)
+    monkeypatch.setattr("solden.core.event_queue.get_event_queue", lambda: queue)
+
+    await gmail_webhooks.process_gmail_notification("ap@example.com", "100")
+
+    assert history_client.batch_calls == 1
+    assert len(lookups) == 1
+    assert len(queue.batches) == 1
+    events = {event.payload["message_id"]: event for event in queue.batches[0]}
+    assert sorted(events) == ["m0", "m1", "m2"]
+    assert events["m1"].type == AgentEventType.VENDOR_RESPONSE_RECEIVED
+    assert events["m1"].payload["vendor_id"] == "Acme"
+    assert events["m0"].type == AgentEventType.EMAIL_RECEIVED
+    assert events["m0"].payload["thread_id"] == "thread-m0"
+
+
+@pytest.mark.asyncio
+async def test_partial_enqueue_failure_processes_only_unconfirmed_inline(monkeypatch):
+    db_module.get_db().initialize()
+
+    class _PartialQueue:
+        def enqueue_many(self, events):
+            raise EnqueueManyError(["entry-0", "duplicate"], len(events), ConnectionError("redis went away"))
+
+    inline: List[str] = []
+
+    async def _process_single_email(*, client, message_id, user_id, organization_id, message=None):
+        inline.append(message_id)
+
+    monkeypatch.setattr(
+        gmail_webhooks.token_store, "get_by_email",
+        lambda _email: SimpleNamespace(user_id="user-1", email="ap@example.com"),
+    )
+    monkeypatch.setattr(gmail_webhooks, "_resolve_user_org_id", lambda _user_id: "org-partial")
+    monkeypatch.setattr(gmail_webhooks, "GmailAPIClient", lambda _user_id: _HistoryClient(["m0", "m1", "m2", "m3"]))
+    monkeypatch.setattr(gmail_webhooks, "process_single_email", _process_single_email)
+    monkeypatch.setattr("solden.core.event_queue.get_event_queue", lambda: _PartialQueue())
+
+    await gmail_webhooks.process_gmail_notification("ap@example.com", "100")
+
+    assert inline == ["m2", "m3"]
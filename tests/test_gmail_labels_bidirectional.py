@@ -63,6 +63,9 @@ class _MockQueue:
             self._seen_keys.add(key)
         return f"entry-{len(self.events)}"
 
+    def enqueue_many(self, events: List[AgentEvent]) -> List[str]:
+        return [self.enqueue(event) for event in events]
+
 
 @pytest.fixture()
 def db(tmp_path, monkeypatch):
@@ -0,0 +1,125 @@
+"""Tests for the duplicate-invoice fingerprint index (migration 108).
+
+Covers:
+  * The fingerprint helpers: invoice numbers and vendor names collapse
+    their variants, amounts within 1% land at most one bucket apart,
+    and the invoice day falls back to ``created_at``.
+  * Against Postgres: ``create_ap_item`` / ``update_ap_item`` write the
+    fingerprint through; a batch lookup finds number matches across
+    vendor variants and amount+date matches beyond any history window;
+    ``sync_invoice_fingerprints`` backfills from its cursor and is a
+    no-op once caught up.
+"""
+from __future__ import annotations
+
+import random
+import uuid
+from datetime import date
+
+import pytest
+
+from solden.core.stores.invoice_fingerprint_store import (
+    invoice_amount_bucket,
+    invoice_day,
+    invoice_fingerprint,
+)
+
+
+def test_fingerprint_normalizes_variants():
+    a = invoice_fingerprint({"vendor_name": "ACME, Inc.", "invoice_number": "#INV-00123", "currency": "eur"})
+    b = invoice_fingerprint({"vendor_name": "Acme", "invoice_number": "inv 00123", "currency": "EUR"})
+    assert (a["vendor_key"], a["invoice_number_norm"], a["currency"]) == ("acme", "00123", "EUR")
+    assert (b["vendor_key"], b["invoice_number_norm"], b["currency"]) == ("acme", "00123", "EUR")
+    assert invoice_fingerprint({})["currency"] == "USD"
+
+
+def test_amounts_within_tolerance_are_adjacent_buckets():
+    rng = random.Random(7)
+    for _ in range(2000):
+        low = rng.uniform(0.5, 1_000_000)
+        high = low / (1 - 0.01 * rng.random())
+        assert abs(invoice_amount_bucket(high) - invoice_amount_bucket(low)) <= 1
+    assert invoice_amount_bucket(0) is None
+    assert invoice_amount_bucket("n/a") is None
+
+
+def test_invoice_day_prefers_invoice_date():
+    assert invoice_day("2026-03-02", "2026-04-01T00:00:00+00:00") == date(2026, 3, 2).toordinal()
+    assert invoice_day("", "2026-04-01T10:00:00+00:00") == date(2026, 4, 1).toordinal()
+    assert invoice_day("garbage", None) is None
+
+
+# ─── Postgres-backed ──────────────────────────────────────────────
+
+
+@pytest.fixture()
+def pg_db():
+    from solden.core.database import get_db
+
+    inst = get_db()
+    inst.initialize()
+    return inst
+
+
+def _item(org_id, n, **overrides):
+    payload = {
+        "id": f"{org_id}-{n}",
+        "invoice_key": f"{org_id}-inv-{n}",
+        "thread_id": f"{org_id}-thread-{n}",
+        "message_id": f"{org_id}-msg-{n}",
+        "vendor_name": "Acme Ltd",
+        "amount": 100.0 + n,
+        "currency": "USD",
+        "invoice_number": f"A-{n}",
+        "invoice_date": "2024-01-15",
+        "state": "received",
+        "organization_id": org_id,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_lookup_blocks_on_number_and_amount_date(pg_db):
+    org_id = f"org-fp-{uuid.uuid4().hex[:8]}"
+    pg_db.ensure_organization(org_id, organization_name="FP Co")
+    pg_db.create_ap_item(_item(org_id, 1, invoice_number="INV-9001", amount=1250.0))
+    pg_db.create_ap_item(_item(org_id, 2, amount=480.0, invoice_date="2024-02-01"))
+    pg_db.create_ap_item(_item(org_id, 3, vendor_name="Other", invoice_number="INV-9001", amount=5.0))
+    for n in range(4, 64):  # more than any history window
+        pg_db.create_ap_item(_item(org_id, n, invoice_date="2025-06-01"))
+
+    by_number, by_amount, nothing = pg_db.find_invoice_duplicate_candidates(org_id, [
+        {"vendor_name": "ACME LIMITED", "invoice_number": "#9001", "amount": 1.0},
+        {"vendor_name": "acme", "amount": 482.0, "currency": "usd", "invoice_date": "2024-02-05"},
+        {"vendor_name": "acme", "amount": 482.0, "invoice_date": "2024-03-20"},
+    ])
+    assert sorted(row["id"] for row in by_number) == [f"{org_id}-1", f"{org_id}-3"]
+    assert [row["id"] for row in by_amount] == [f"{org_id}-2"]
+    assert by_amount[0]["vendor_key"] == "acme" and by_amount[0]["message_id"] == f"{org_id}-msg-2"
+    assert nothing == []
+
+    pg_db.update_ap_item(f"{org_id}-2", amount=900.0)
+    _, moved, _ = pg_db.find_invoice_duplicate_candidates(org_id, [
+        {}, {"vendor_name": "acme", "amount": 482.0, "invoice_date": "2024-02-05"}, {},
+    ])
+    assert moved == []
+
+
+def test_sync_backfills_from_cursor(pg_db):
+    org_id = f"org-fp-{uuid.uuid4().hex[:8]}"
+    pg_db.ensure_organization(org_id, organization_name="FP Sync Co")
+    for n in range(5):
+        pg_db.create_ap_item(_item(org_id, n))
+    with pg_db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM ap_invoice_fingerprints WHERE organization_id = %s", (org_id,))
+        conn.commit()
+
+    first = pg_db.sync_invoice_fingerprints(org_id, page_size=2)
+    assert (first["indexed"], first["pages"]) == (5, 3)
+    assert pg_db.sync_invoice_fingerprints(org_id)["indexed"] == 0
+
+    pg_db.update_ap_item(f"{org_id}-0", subject="Resent")
+    assert pg_db.sync_invoice_fingerprints(org_id)["indexed"] == 1
+    [found] = pg_db.find_invoice_duplicate_candidates(org_id, [{"invoice_number": "A-3"}])
+    assert [row["id"] for row in found] == [f"{org_id}-3"]
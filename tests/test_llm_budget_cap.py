@@ -9,6 +9,9 @@ Covers the runaway-spend guard wired into ``LLMGateway.call()``:
 - A new billing month clears the tombstone automatically.
 - Override endpoints (customer CFO + ops CS) clear the pause, are
   role-gated, and write an audit event.
+- The in-process spend ledger answers the pre-flight from memory,
+  tracks logged spend, and hands off to the authoritative check at
+  the cap, on staleness, and across a month boundary.
 
 Everything is tested against a temp-file SQLite DB via the standard
 monkeypatch fixture pattern used across the rest of the suite.
@@ -23,6 +26,7 @@ from fastapi.testclient import TestClient
 
 from solden.core import database as db_module
 from solden.core.auth import TokenData
+from solden.core.llm_budget_ledger import get_llm_budget_ledger
 from solden.core.llm_gateway import (
     LLMBudgetExceededError,
     LLMGateway,
@@ -278,6 +282,137 @@ class TestBudgetCapSideEffects:
         assert row["box_id"] == "budget-test-org"
 
 
+# ---------------------------------------------------------------------------
+# In-process spend ledger
+# ---------------------------------------------------------------------------
+
+
+_MESSAGES_RESPONSE = {
+    "content": [{"type": "text", "text": "{}"}],
+    "stop_reason": "end_turn",
+    # 1M sonnet input tokens = $3.00 at the tracking rates.
+    "usage": {"input_tokens": 1_000_000, "output_tokens": 0},
+}
+
+
+class TestBudgetLedger:
+    """Pre-flight answers from the ledger; the authoritative check only
+    runs on a miss, a stale entry, or once the running spend hits the cap."""
+
+    def test_preflight_hit_skips_cost_query(self, gateway, db):
+        svc = get_subscription_service()
+        with patch.object(svc, "_get_llm_cost_this_month", return_value={"total_cost_usd": 3.00}):
+            assert gateway._budget_preflight("budget-test-org") is False
+            gateway._enforce_budget_cap("budget-test-org")
+        with patch.object(svc, "_get_llm_cost_this_month") as cost_mock, \
+             patch.object(db, "get_organization") as org_mock:
+            for _ in range(50):
+                assert gateway._budget_preflight("budget-test-org") is True
+        assert cost_mock.call_count == 0
+        assert org_mock.call_count == 0
+
+    def test_logged_spend_trips_cap_without_waiting_for_refresh(self, gateway, db):
+        svc = get_subscription_service()
+        with patch.object(svc, "_get_llm_cost_this_month", return_value={"total_cost_usd": 9.50}):
+            gateway._enforce_budget_cap("budget-test-org")
+        assert gateway._budget_preflight("budget-test-org") is True
+
+        # $0.60 of logged spend pushes the FREE-tier org past $10.
+        get_llm_budget_ledger().record("budget-test-org", 0.60)
+        assert gateway._budget_preflight("budget-test-org") is False
+
+        with patch("solden.services.webhook_delivery.emit_webhook_event", AsyncMock()), \
+             patch("solden.services.monitoring.alert_cs_team"), \
+             patch.object(svc, "_get_llm_cost_this_month", return_value={"total_cost_usd": 10.10}):
+            with pytest.raises(LLMBudgetExceededError):
+                gateway._enforce_budget_cap("budget-test-org")
+        assert db.get_organization("budget-test-org").get("llm_cost_paused_at")
+
+        # The pause is now answered from memory.
+        with patch.object(db, "get_organization") as org_mock:
+            with pytest.raises(LLMBudgetExceededError):
+                gateway._budget_preflight("budget-test-org")
+        assert org_mock.call_count == 0
+
+    def test_entry_expires_faster_near_cap(self, gateway, db):
+        from solden.core import llm_budget_ledger as ledger_mod
+
+        ledger = get_llm_budget_ledger()
+        ledger.seed("budget-test-org", spent_usd=1.0, cap_usd=10.0)
+        entry = ledger.get("budget-test-org")
+        entry.refreshed_at -= ledger_mod.NEAR_CAP_STALENESS_SECONDS + 1
+        assert ledger.peek("budget-test-org") is not None
+
+        ledger.seed("budget-test-org", spent_usd=9.5, cap_usd=10.0)
+        entry = ledger.get("budget-test-org")
+        entry.refreshed_at -= ledger_mod.NEAR_CAP_STALENESS_SECONDS + 1
+        assert ledger.peek("budget-test-org") is None
+
+    def test_entry_from_previous_month_is_ignored(self, gateway, db):
+        ledger = get_llm_budget_ledger()
+        ledger.seed("budget-test-org", spent_usd=1.0, cap_usd=10.0, paused_at="2020-01-01")
+        ledger.get("budget-test-org").month = "2020-01"
+        assert ledger.peek("budget-test-org") is None
+        assert gateway._budget_preflight("budget-test-org") is False
+
+    def test_override_endpoint_invalidates_cached_pause(self, db):
+        ledger = get_llm_budget_ledger()
+        paused_at = datetime.now(timezone.utc).isoformat()
+        db.update_organization("budget-test-org", llm_cost_paused_at=paused_at)
+        ledger.seed("budget-test-org", spent_usd=0.0, cap_usd=0.0, paused_at=paused_at)
+        client, ws_module, ops_module = _make_test_client(db, role="cfo")
+        try:
+            resp = client.post(
+                "/api/workspace/llm-budget/override",
+                json={"reason": "verified spike"},
+            )
+        finally:
+            from main import app
+            app.dependency_overrides.pop(ws_module.get_current_user, None)
+            app.dependency_overrides.pop(ops_module.get_current_user, None)
+        assert resp.status_code == 200, resp.text
+        assert ledger.get("budget-test-org") is None
+
+    @pytest.mark.asyncio
+    async def test_call_runs_authoritative_check_once_then_tracks_spend(
+        self, gateway, db, mock_http,
+    ):
+        from solden.core.llm_gateway import LLMAction
+
+        mock_http.handle("POST", "api.anthropic.com", json=_MESSAGES_RESPONSE)
+        svc = get_subscription_service()
+        with patch.object(
+            svc, "_get_llm_cost_this_month", return_value={"total_cost_usd": 0.0},
+        ) as cost_mock, \
+             patch("solden.services.webhook_delivery.emit_webhook_event", AsyncMock()), \
+             patch("solden.services.monitoring.alert_cs_team"):
+            for _ in range(3):
+                await gateway.call(
+                    LLMAction.EXPLAIN_STATE,
+                    [{"role": "user", "content": "hi"}],
+                    organization_id="budget-test-org",
+                )
+            assert cost_mock.call_count == 1
+            assert get_llm_budget_ledger().get("budget-test-org").spent_usd == pytest.approx(9.0)
+
+            # Fourth call is cleared ($9 < $10) and takes spend to $12;
+            # the fifth hits the cap and goes to the authoritative path,
+            # which trips on the (now over-cap) month-to-date total.
+            await gateway.call(
+                LLMAction.EXPLAIN_STATE,
+                [{"role": "user", "content": "hi"}],
+                organization_id="budget-test-org",
+            )
+            cost_mock.return_value = {"total_cost_usd": 12.0}
+            with pytest.raises(LLMBudgetExceededError):
+                await gateway.call(
+                    LLMAction.EXPLAIN_STATE,
+                    [{"role": "user", "content": "hi"}],
+                    organization_id="budget-test-org",
+                )
+        assert len(mock_http.calls) == 4
+
+
 # ---------------------------------------------------------------------------
 # Override endpoints
 # ---------------------------------------------------------------------------
@@ -0,0 +1,117 @@
+"""Tests for the reconciliation assignment solver.
+
+Covers:
+  * solve_assignment: contested candidates, cardinality-first vs
+    weight-only, agreement with brute force on small random graphs.
+  * find_split_group: unique combination, ambiguous combinations,
+    busy-window cap.
+"""
+from __future__ import annotations
+
+import random
+import sys
+from itertools import permutations
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from solden.services.match_assignment import (  # noqa: E402
+    _SPLIT_CANDIDATE_CAP,
+    find_split_group,
+    solve_assignment,
+)
+
+
+def _brute_force(edges, lefts, rights, cardinality_first):
+    weights = {(left, right): w for left, right, w in edges}
+    best = None
+    padded = list(rights) + [None] * len(lefts)
+    for perm in permutations(padded, len(lefts)):
+        pairs = [(left, right) for left, right in zip(lefts, perm) if right is not None]
+        if any(pair not in weights for pair in pairs):
+            continue
+        total = round(sum(weights[pair] for pair in pairs), 6)
+        key = (len(pairs), total) if cardinality_first else (total,)
+        if best is None or key > best:
+            best = key
+    return best
+
+
+def test_contested_candidate_goes_to_line_without_alternative():
+    assignment = solve_assignment([
+        ("a", "x", 0.9),
+        ("a", "y", 0.8),
+        ("b", "x", 1.0),
+    ])
+    assert assignment == {"a": "y", "b": "x"}
+
+
+def test_cardinality_first_prefers_more_matches():
+    edges = [("a", "x", 1.0), ("a", "y", 0.1), ("b", "x", 0.1)]
+    assert solve_assignment(edges) == {"a": "y", "b": "x"}
+    assert solve_assignment(edges, cardinality_first=False) == {"a": "x"}
+
+
+def test_duplicate_edges_keep_best_weight():
+    assignment = solve_assignment([
+        ("a", "x", 0.2), ("a", "x", 0.9), ("a", "y", 0.5),
+    ], cardinality_first=False)
+    assert assignment == {"a": "x"}
+
+
+def test_matches_brute_force_on_random_graphs():
+    rng = random.Random(11)
+    for _ in range(200):
+        lefts = [f"l{i}" for i in range(rng.randint(1, 5))]
+        rights = [f"r{j}" for j in range(rng.randint(1, 5))]
+        edges = [
+            (left, right, round(rng.choice([rng.uniform(-0.2, 1.0), 0.6, 0.8]), 3))
+            for left in lefts for right in rights if rng.random() < 0.5
+        ]
+        weights = {(left, right): w for left, right, w in edges}
+        for cardinality_first in (True, False):
+            assignment = solve_assignment(edges, cardinality_first=cardinality_first)
+            assert len(set(assignment.values())) == len(assignment)
+            total = round(sum(weights[pair] for pair in assignment.items()), 6)
+            got = (len(assignment), total) if cardinality_first else (total,)
+            expected = _brute_force(edges, lefts, rights, cardinality_first)
+            assert all(abs(g - e) < 1e-6 for g, e in zip(got, expected))
+
+
+def test_long_chain_component_is_fast():
+    # One connected component where every line overlaps its neighbours.
+    rng = random.Random(3)
+    n = 5000
+    edges = [
+        (f"l{i}", f"r{j}", round(rng.uniform(0.6, 1.0), 3))
+        for i in range(n) for j in (i, i + 1, i + 2) if j < n
+    ]
+    assert len(solve_assignment(edges)) == n
+
+
+def test_split_group_unique():
+    assert find_split_group(
+        -100, [("a", 60), ("b", 40), ("c", 30)], tolerance="0.01", max_parts=3,
+    ) == ("a", "b")
+
+
+def test_split_group_ambiguous_returns_none():
+    assert find_split_group(
+        100, [("a", 60), ("b", 40), ("c", 30), ("d", 10)],
+        tolerance="0.01", max_parts=3,
+    ) is None
+
+
+def test_split_group_ignores_whole_amount_parts():
+    assert find_split_group(
+        100, [("a", 100), ("b", 70), ("c", 30)], tolerance="0.01", max_parts=2,
+    ) == ("b", "c")
+
+
+def test_split_group_gives_up_on_busy_window():
+    pool = [(f"k{i}", 1000 + i) for i in range(_SPLIT_CANDIDATE_CAP + 1)]
+    pool += [("a", 60), ("b", 40)]
+    assert find_split_group(100000, pool, tolerance="0.01", max_parts=3) is None
+    assert find_split_group(100, pool, tolerance="0.01", max_parts=3) == ("a", "b")
@@ -0,0 +1,193 @@
+"""Tests for the process-local org cache.
+
+Covers:
+  * Read-through hits return copies; ``None`` results are cached.
+  * A fill that raced an invalidation is discarded, per key and for a
+    table-wide (empty id) invalidation.
+  * Invalidations map tables to namespaces (``organizations`` also
+    drops the parsed org config) and NOTIFY payloads apply the same way.
+  * TTL expiry, the short TTL while unlistened, and ``ttl=0`` bypass.
+  * Against Postgres: store writers invalidate their own process and a
+    write from another connection reaches the listener via NOTIFY.
+"""
+from __future__ import annotations
+
+import time
+import uuid
+
+import pytest
+
+from solden.core.org_cache import (
+    NS_ERP_CONNECTIONS,
+    NS_ORG_CONFIG,
+    NS_ORGANIZATION,
+    NS_SUBSCRIPTION,
+    OrgCache,
+)
+
+
+class _Loader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_hits_return_copies_and_none_is_cached():
+    cache = OrgCache(ttl_seconds=60, unlistened_ttl_seconds=60)
+    loader = _Loader({"id": "org-1", "settings": {"a": 1}})
+
+    first = cache.get(NS_ORGANIZATION, "org-1", loader)
+    first["settings"]["a"] = 2
+    second = cache.get(NS_ORGANIZATION, "org-1", loader)
+    assert loader.calls == 1
+    assert second["settings"]["a"] == 1
+
+    missing = _Loader(None)
+    assert cache.get(NS_ORGANIZATION, "org-none", missing) is None
+    assert cache.get(NS_ORGANIZATION, "org-none", missing) is None
+    assert missing.calls == 1
+
+    stats = cache.metrics_snapshot()["namespaces"][NS_ORGANIZATION]
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_fill_that_raced_an_invalidation_is_discarded():
+    cache = OrgCache(ttl_seconds=60, unlistened_ttl_seconds=60)
+
+    def _stale_read():
+        # A writer commits and invalidates while this read is in flight.
+        cache.invalidate("subscriptions", "org-1")
+        return {"plan": "free"}
+
+    assert cache.get(NS_SUBSCRIPTION, "org-1", _stale_read) == {"plan": "free"}
+    fresh = _Loader({"plan": "enterprise"})
+    assert cache.get(NS_SUBSCRIPTION, "org-1", fresh) == {"plan": "enterprise"}
+    assert fresh.calls == 1
+
+    def _stale_read_all():
+        cache.invalidate("subscriptions")
+        return {"plan": "free"}
+
+    assert cache.get(NS_SUBSCRIPTION, "org-2", _stale_read_all) == {"plan": "free"}
+    fresh = _Loader({"plan": "pro"})
+    cache.get(NS_SUBSCRIPTION, "org-2", fresh)
+    assert fresh.calls == 1
+    assert cache.metrics_snapshot()["namespaces"][NS_SUBSCRIPTION]["discarded_fills"] == 2
+
+
+def test_table_invalidations_and_notify_payloads():
+    cache = OrgCache(ttl_seconds=60, unlistened_ttl_seconds=60)
+    loaders = {ns: _Loader(ns) for ns in (NS_ORGANIZATION, NS_ORG_CONFIG, NS_SUBSCRIPTION, NS_ERP_CONNECTIONS)}
+    for ns, loader in loaders.items():
+        cache.get(ns, "org-1", loader)
+        cache.get(ns, "org-2", loader)
+
+    cache.invalidate("organizations", "org-1")
+    for ns, loader in loaders.items():
+        cache.get(ns, "org-1", loader)
+    assert {ns: listener.calls for ns, listener in loaders.items()} == {
+        NS_ORGANIZATION: 3, NS_ORG_CONFIG: 3, NS_SUBSCRIPTION: 2, NS_ERP_CONNECTIONS: 2,
+    }
+
+    cache.apply_notification("erp_connections:org-2")
+    cache.apply_notification("subscriptions:")
+    cache.apply_notification("unrelated_table:org-1")
+    for ns, loader in loaders.items():
+        cache.get(ns, "org-1", loader)
+        cache.get(ns, "org-2", loader)
+    assert {ns: listener.calls for ns, listener in loaders.items()} == {
+        NS_ORGANIZATION: 3, NS_ORG_CONFIG: 3, NS_SUBSCRIPTION: 4, NS_ERP_CONNECTIONS: 3,
+    }
+
+
+def test_ttl_expiry_and_disabled_cache():
+    cache = OrgCache(ttl_seconds=60, unlistened_ttl_seconds=0.05)
+    loader = _Loader("row")
+    cache.get(NS_ORGANIZATION, "org-1", loader)
+    cache.get(NS_ORGANIZATION, "org-1", loader)
+    assert loader.calls == 1
+    time.sleep(0.1)
+    cache.get(NS_ORGANIZATION, "org-1", loader)
+    assert loader.calls == 2
+    assert cache.metrics_snapshot()["ttl_seconds"] == 0.05
+
+    off = OrgCache(ttl_seconds=0)
+    loader = _Loader("row")
+    off.get(NS_ORGANIZATION, "org-1", loader)
+    off.get(NS_ORGANIZATION, "org-1", loader)
+    assert loader.calls == 2
+    assert off.metrics_snapshot()["namespaces"] == {}
+
+
+def test_eviction_keeps_the_cache_bounded():
+    cache = OrgCache(ttl_seconds=60, unlistened_ttl_seconds=60, max_entries=2)
+    for org in ("a", "b", "c"):
+        cache.get(NS_ORGANIZATION, org, _Loader(org))
+    assert cache.metrics_snapshot()["entries"] == 2
+    loader = _Loader("a")
+    cache.get(NS_ORGANIZATION, "a", loader)
+    assert loader.calls == 1
+
+
+# ─── Postgres-backed stores ───────────────────────────────────────
+
+
+@pytest.fixture()
+def pg_db():
+    from solden.core.database import get_db
+
+    inst = get_db()
+    inst.initialize()
+    return inst
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_store_writes_invalidate_this_process(pg_db):
+    org_id = f"org-cache-{uuid.uuid4().hex[:8]}"
+    assert pg_db.get_organization(org_id) is None
+    pg_db.ensure_organization(org_id, organization_name="Cache Co")
+    assert pg_db.get_organization(org_id)["name"] == "Cache Co"
+
+    org = pg_db.get_organization(org_id)
+    assert pg_db.update_organization(org_id, name="Renamed", expected_updated_at=org["updated_at"])
+    # A CAS miss still drops the entry so the retry re-reads.
+    assert not pg_db.update_organization(org_id, name="Lost", expected_updated_at="stale")
+    assert pg_db.get_organization(org_id)["name"] == "Renamed"
+
+    pg_db.upsert_subscription_record(org_id, {"plan": "starter"})
+    assert pg_db.get_subscription_record(org_id)["plan"] == "starter"
+    pg_db.upsert_subscription_record(org_id, {"plan": "enterprise"})
+    assert pg_db.get_subscription_record(org_id)["plan"] == "enterprise"
+
+    assert pg_db.get_erp_connections(org_id) == []
+    pg_db.save_erp_connection(org_id, "xero", access_token="tok", tenant_id="t-1")
+    assert [c["access_token"] for c in pg_db.get_erp_connections(org_id)] == ["tok"]
+    pg_db.delete_erp_connection(org_id, "xero")
+    assert pg_db.get_erp_connections(org_id) == []
+
+
+def test_write_from_another_connection_arrives_by_notify(pg_db):
+    cache = pg_db._org_cache()
+    if not _wait_for(lambda: cache.listening):
+        pytest.skip("org cache listener could not connect")
+    org_id = f"org-cache-{uuid.uuid4().hex[:8]}"
+    pg_db.ensure_organization(org_id, organization_name="Before")
+    assert pg_db.get_organization(org_id)["name"] == "Before"
+
+    # Bypass the store so only the trigger can tell the cache.
+    with pg_db.connect() as conn:
+        conn.execute("UPDATE organizations SET name = %s WHERE id = %s", ("After", org_id))
+        conn.commit()
+    assert _wait_for(lambda: pg_db.get_organization(org_id)["name"] == "After")
@@ -0,0 +1,407 @@
+"""Tests for streaming policy replay runs.
+
+Covers:
+
+* ``ReplayReport`` folds chunk reports into the same result as one
+  pass over all items, survives a snapshot round-trip with its order
+  intact, and stays bounded (samples, ids per transition, distinct
+  transitions).
+* ``PolicyService.run_replay`` claims the run with one conditional
+  UPDATE, splits the window into keyset partitions, pages each one
+  through a named cursor, records progress per chunk, and finishes
+  with a summary identical to ``replay_against`` over the same items.
+  A run that already left ``queued`` is not claimed again.
+* Partitions of a run that is no longer running are not claimed.
+* Kinds without a replay strategy finish without opening the cursor;
+  a failing stream marks the partition and the run failed.
+* ``fail_stale_replay_runs`` fails running runs that stopped moving.
+
+Mocked DB — no Postgres. Result rows go through the real ``dict_row``
+factory, so a query that reads back a query-only column (``*_tz``)
+without aliasing it fails here the way it does in production.
+"""
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+from solden.core.database import dict_row
+
+
+def _as_fetched(row: Dict[str, Any]):
+    """``row`` as the pool's ``dict_row`` factory would return it."""
+    description = [SimpleNamespace(name=name) for name in row]
+    return dict_row(SimpleNamespace(description=description))(list(row.values()))
+
+
+def _items(count: int) -> List[Dict[str, Any]]:
+    items = []
+    for i in range(count):
+        items.append({
+            "id": f"AP-{i:03d}",
+            "created_at_tz": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00",
+            "amount": 250 * i,
+            "vendor_name": "Acme" if i % 3 else "Other Co",
+            "state": "posted_to_erp",
+            "metadata": json.dumps({"approval_target": {"threshold_label": "small" if i % 2 else "mid"}}),
+        })
+    return items
+
+
+_THRESHOLDS = {"thresholds": [
+    {"min_amount": 0, "max_amount": 1000, "label": "small"},
+    {"min_amount": 1000, "max_amount": 4000, "label": "mid"},
+    {"min_amount": 4000, "label": "large"},
+]}
+
+
+def _assignments(sql_lower: str) -> List[str]:
+    return [part.split(" = ")[0] for part in sql_lower.split(" set ")[1].split(" where ")[0].split(", ")]
+
+
+def _make_db(items: List[Dict[str, Any]], *, kind: str = "approval_thresholds", content=None):
+    db = MagicMock()
+    version = {
+        "id": "PV-1", "organization_id": "org-1", "policy_kind": kind,
+        "version_number": 3, "content_json": json.dumps(content or _THRESHOLDS),
+        "content_hash": "h", "created_at": "2025-01-01T00:00:00+00:00",
+        "created_by": "ops@example.com", "description": "", "parent_version_id": None,
+        "is_rollback": 0, "branch_id": None,
+    }
+    runs: Dict[str, Dict[str, Any]] = {}
+    partitions: Dict[tuple, Dict[str, Any]] = {}
+    log: Dict[str, list] = {
+        "named_cursors": [], "fetchmany": [], "progress": [], "count_sql": [], "claims": [],
+    }
+
+    def _key(row):
+        return (row["created_at_tz"], row["id"])
+
+    class _Cursor:
+        def __init__(self, name=None):
+            self.name = name
+            self.itersize = None
+            self._rows: List[Dict[str, Any]] = []
+
+        def execute(self, sql: str, params=()):
+            sql_lower = " ".join(sql.split()).lower()
+            self._rows = []
+            if sql_lower.startswith("select * from policy_versions where id"):
+                self._rows = [version] if params == ("PV-1", "org-1") else []
+            elif sql_lower.startswith("insert into policy_replay_runs"):
+                (run_id, org, version_id, number, run_kind, requested_by,
+                 filters_json, created_at, updated_at) = params
+                runs[run_id] = {
+                    "id": run_id, "organization_id": org, "target_version_id": version_id,
+                    "target_version_number": number, "target_kind": run_kind,
+                    "requested_by": requested_by, "filters_json": filters_json,
+                    "status": "queued", "items_evaluated": 0,
+                    "created_at": created_at, "updated_at": updated_at,
+                }
+            elif sql_lower.startswith("select * from policy_replay_runs"):
+                row = runs.get(params[0])
+                self._rows = [dict(row)] if row and row["organization_id"] == params[1] else []
+            elif sql_lower.startswith("update policy_replay_runs set status = 'running'"):
+                log["claims"].append(sql_lower)
+                assert "and status = 'queued'" in sql_lower and sql_lower.endswith("returning *")
+                started_at, updated_at, run_id, org = params
+                row = runs.get(run_id)
+                if row and row["organization_id"] == org and row["status"] == "queued":
+                    row.update(status="running", started_at=started_at, updated_at=updated_at)
+                    self._rows = [dict(row)]
+            elif sql_lower.startswith("update policy_replay_runs set items_evaluated = items_evaluated +"):
+                delta, updated_at, run_id, _org = params
+                runs[run_id]["items_evaluated"] += delta
+                runs[run_id]["updated_at"] = updated_at
+                log["progress"].append(runs[run_id]["items_evaluated"])
+            elif sql_lower.startswith("update policy_replay_runs set status = 'done'"):
+                (evaluated, summary_json, report_json, completed_at, updated_at,
+                 run_id, _org) = params
+                row = runs[run_id]
+                pending = [p for (rid, _), p in partitions.items() if rid == run_id and p["status"] != "done"]
+                if row["status"] == "running" and not pending:
+                    row.update(
+                        status="done", items_evaluated=evaluated, summary_json=summary_json,
+                        report_json=report_json, completed_at=completed_at, updated_at=updated_at,
+                    )
+            elif sql_lower.startswith("update policy_replay_runs set status = 'failed'"):
+                error, completed_at, updated_at, cutoff = params
+                for row in runs.values():
+                    if row["status"] == "running" and row["updated_at"] < cutoff:
+                        row.update(status="failed", error_message=error,
+                                   completed_at=completed_at, updated_at=updated_at)
+                        self._rows.append({"id": row["id"]})
+            elif sql_lower.startswith("update policy_replay_runs set"):
+                values, (run_id, _org) = params[:-2], params[-2:]
+                runs[run_id].update(zip(_assignments(sql_lower), values))
+            elif sql_lower.startswith("select count(*)"):
+                log["count_sql"].append((sql_lower, params))
+                self._rows = [{"n": len(items)}]
+            elif "row_number() over (order by created_at_tz, id) as rn" in sql_lower:
+                assert "rn %% %s = 1" in sql_lower
+                # Result columns are named as the outer select names them.
+                names = [c.strip() for c in sql_lower[len("select "):sql_lower.index(" from (")].split(",")]
+                size = params[-1]
+                ordered = sorted(items, key=_key)
+                self._rows = [
+                    dict(zip(names, _key(r)))
+                    for n, r in enumerate(ordered) if n % size == 0
+                ]
+            elif sql_lower.startswith("insert into policy_replay_partitions"):
+                for i in range(0, len(params), 9):
+                    (run_id, index, org, lower_at, lower_id, upper_at, upper_id,
+                     created_at, updated_at) = params[i:i + 9]
+                    partitions[(run_id, index)] = {
+                        "run_id": run_id, "partition_index": index, "organization_id": org,
+                        "lower_created_at": lower_at, "lower_id": lower_id,
+                        "upper_created_at": upper_at, "upper_id": upper_id,
+                        "status": "queued", "items_evaluated": 0, "report_json": None,
+                        "created_at": created_at, "updated_at": updated_at,
+                    }
+            elif sql_lower.startswith("update policy_replay_partitions set status = 'running'"):
+                assert "and status = 'queued'" in sql_lower and "r.status = 'running'" in sql_lower
+                updated_at, run_id, index, _org = params
+                part = partitions.get((run_id, index))
+                if part and part["status"] == "queued" and runs[run_id]["status"] == "running":
+                    part.update(status="running", updated_at=updated_at)
+                    self._rows = [dict(part)]
+            elif sql_lower.startswith("update policy_replay_partitions set"):
+                values, (run_id, index, _org) = params[:-3], params[-3:]
+                partitions[(run_id, index)].update(zip(_assignments(sql_lower), values))
+            elif sql_lower.startswith("select status, report_json from policy_replay_partitions"):
+                run_id = params[0]
+                self._rows = [
+                    dict(p) for (rid, _), p in sorted(partitions.items()) if rid == run_id
+                ]
+            elif sql_lower.startswith("select id, amount, vendor_name, state, metadata from ap_items"):
+                assert self.name, "replay runs must stream through a named cursor"
+                assert "order by created_at_tz, id" in sql_lower
+                rows = sorted(items, key=_key)
+                ranges = sql_lower.count("(created_at_tz, id) ")
+                rest = list(params[len(params) - 2 * ranges:])
+                if "(created_at_tz, id) >= (" in sql_lower:
+                    lower = (rest.pop(0), rest.pop(0))
+                    rows = [r for r in rows if _key(r) >= lower]
+                if "(created_at_tz, id) < (" in sql_lower:
+                    upper = (rest.pop(0), rest.pop(0))
+                    rows = [r for r in rows if _key(r) < upper]
+                self._rows = rows
+
+        def fetchone(self):
+            return _as_fetched(self._rows[0]) if self._rows else None
+
+        def fetchall(self):
+            return [_as_fetched(row) for row in self._rows]
+
+        def fetchmany(self, size):
+            log["fetchmany"].append(size)
+            batch, self._rows = self._rows[:size], self._rows[size:]
+            return [_as_fetched(row) for row in batch]
+
+        def close(self):
+            pass
+
+    class _Conn:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def cursor(self, name=None):
+            if name:
+                log["named_cursors"].append(name)
+            return _Cursor(name)
+
+        def commit(self):
+            pass
+
+    db.connect = MagicMock(side_effect=lambda: _Conn())
+    db._runs = runs
+    db._partitions = partitions
+    db._log = log
+    return db
+
+
+def _service(db):
+    from solden.services.policy_service import PolicyService
+    with patch("solden.services.policy_service.get_db", return_value=db):
+        return PolicyService(organization_id="org-1")
+
+
+def _chunk_report(items):
+    from solden.services.policy_service import ReplayReport, _replay_chunk
+    report = ReplayReport()
+    report.add(len(items), *_replay_chunk("approval_thresholds", _THRESHOLDS, items))
+    return report
+
+
+# ─── ReplayReport ──────────────────────────────────────────────────
+
+
+def test_chunked_report_matches_single_pass():
+    from solden.services.policy_service import ReplayReport
+    items = _items(40)
+    whole = _chunk_report(items)
+
+    merged = ReplayReport()
+    for start in range(0, len(items), 7):
+        merged.merge(_chunk_report(items[start:start + 7]))
+
+    assert merged.to_dict() == whole.to_dict()
+    assert merged.items_evaluated == 40
+    assert sum(t["count"] for t in merged.to_dict()["transitions"]) == merged.summary["would_change"]
+
+
+def test_snapshot_round_trip_keeps_first_seen_order():
+    from solden.services.policy_service import ReplayDelta, ReplayReport
+    items = _items(40)
+    merged = ReplayReport()
+    for start in range(0, len(items), 9):
+        part = json.loads(json.dumps(_chunk_report(items[start:start + 9]).snapshot()))
+        merged.merge(ReplayReport.from_snapshot(part))
+    assert merged.to_dict() == _chunk_report(items).to_dict()
+
+    # With the transition cap hit, which transitions survive depends on
+    # the order they were first seen — the snapshot must keep it.
+    capped = ReplayReport(max_transitions=2)
+    rare_first = [ReplayDelta("AP-0", "gl_account", "6000", "699")]
+    rare_first += [ReplayDelta(f"AP-{i}", "gl_account", "6000", "610") for i in range(1, 4)]
+    rare_first += [ReplayDelta("AP-9", "gl_account", "6000", "620")]
+    capped.add(5, rare_first, {"would_change": 5})
+    restored = ReplayReport.from_snapshot(capped.snapshot(), max_transitions=2)
+    assert restored.to_dict() == capped.to_dict()
+    assert [t["replayed_value"] for t in restored.to_dict()["transitions"]] == ["610", "699"]
+
+
+def test_report_stays_bounded():
+    from solden.services.policy_service import ReplayDelta, ReplayReport
+    report = ReplayReport(sample_limit=3, ids_per_transition=2, max_transitions=2)
+    deltas = [ReplayDelta(f"AP-{i}", "gl_account", "6000", f"61{i % 3}") for i in range(9)]
+    report.add(9, deltas, {"would_change": 9})
+
+    out = report.to_dict()
+    assert len(out["sample_deltas"]) == 3
+    assert [t["replayed_value"] for t in out["transitions"]] == ["610", "611"]
+    assert all(len(t["sample_ap_item_ids"]) == 2 for t in out["transitions"])
+    assert out["transitions"][0]["count"] == 3
+    assert out["other_changes"] == 3
+
+
+# ─── run_replay ────────────────────────────────────────────────────
+
+
+def test_run_replay_partitions_stream_and_record_progress():
+    items = _items(25)
+    db = _make_db(items)
+    service = _service(db)
+
+    run = service.create_replay_run("PV-1", since="2025-01-01", requested_by="ops@example.com")
+    assert run["status"] == "queued" and run["filters"] == {"since": "2025-01-01", "until": None}
+
+    done = service.run_replay(run["id"], chunk_size=4, partition_size=10)
+
+    (count_sql, count_params), = db._log["count_sql"]
+    assert "created_at_tz >= %s::timestamptz" in count_sql
+    assert count_params == ("org-1", "2025-01-01")
+    parts = [db._partitions[(run["id"], i)] for i in range(3)]
+    assert [(p["lower_id"], p["upper_id"]) for p in parts] == [
+        ("AP-000", "AP-010"), ("AP-010", "AP-020"), ("AP-020", None),
+    ]
+    assert [p["items_evaluated"] for p in parts] == [10, 10, 5]
+    assert {p["status"] for p in parts} == {"done"}
+    assert len(db._log["named_cursors"]) == 3
+    assert set(db._log["fetchmany"]) == {4}
+    assert db._log["progress"] == [4, 8, 10, 14, 18, 20, 24, 25]
+    assert done["status"] == "done"
+    assert done["items_total"] == 25 and done["items_evaluated"] == 25
+    assert done["progress"] == 1.0
+
+    # Same verdicts as the interactive path over the same items.
+    with patch.object(service, "_fetch_ap_items_for_replay", return_value=items):
+        interactive = service.replay_against("PV-1")
+    assert done["summary"] == interactive.summary
+    report = done["report"]
+    assert sum(t["count"] for t in report["transitions"]) == len(interactive.deltas)
+    assert [d["ap_item_id"] for d in report["sample_deltas"]] == [d.ap_item_id for d in interactive.deltas]
+
+    # Redelivered task: the conditional claim no longer matches.
+    assert service.start_replay_run(run["id"]) == []
+    assert service.run_replay(run["id"])["completed_at"] == done["completed_at"]
+    assert len(db._log["claims"]) == 3
+    assert len(db._log["named_cursors"]) == 3
+
+
+def test_partition_of_failed_run_is_not_claimed():
+    db = _make_db(_items(12))
+    service = _service(db)
+    run = service.create_replay_run("PV-1")
+
+    assert service.start_replay_run(run["id"], partition_size=5) == [0, 1, 2]
+    service.run_replay_partition(run["id"], 0)
+    service.mark_replay_run_failed(run["id"], "operator cancelled")
+    service.run_replay_partition(run["id"], 1)
+
+    assert db._partitions[(run["id"], 0)]["status"] == "done"
+    assert db._partitions[(run["id"], 1)]["status"] == "queued"
+    assert len(db._log["named_cursors"]) == 1
+    assert service.get_replay_run(run["id"])["status"] == "failed"
+
+
+def test_run_replay_skips_unreplayable_kind_without_streaming():
+    db = _make_db(_items(12), kind="confidence_gate", content={"critical_field_confidence_threshold": 0.9})
+    service = _service(db)
+    run = service.create_replay_run("PV-1")
+
+    done = service.run_replay(run["id"])
+
+    assert done["status"] == "done"
+    assert done["summary"] == {"would_change": 0, "no_change": 0, "skipped": 12}
+    assert db._log["named_cursors"] == []
+    assert db._partitions == {}
+
+
+def test_run_replay_failure_marks_run_failed():
+    db = _make_db(_items(5))
+    service = _service(db)
+    run = service.create_replay_run("PV-1")
+
+    with patch.object(service, "_iter_ap_item_chunks", side_effect=RuntimeError("cursor lost")):
+        failed = service.run_replay(run["id"])
+
+    assert failed["status"] == "failed"
+    assert "cursor lost" in failed["error_message"]
+    assert failed["completed_at"]
+    assert db._partitions[(run["id"], 0)]["status"] == "failed"
+
+
+def test_get_replay_run_is_tenant_scoped():
+    from solden.services.policy_service import PolicyService
+    db = _make_db(_items(1))
+    run = _service(db).create_replay_run("PV-1")
+    with patch("solden.services.policy_service.get_db", return_value=db):
+        other = PolicyService(organization_id="org-2")
+    assert other.get_replay_run(run["id"]) is None
+
+
+# ─── Stale-run sweep ───────────────────────────────────────────────
+
+
+def test_fail_stale_replay_runs_fails_only_runs_without_progress():
+    from solden.services.policy_service import fail_stale_replay_runs
+    db = _make_db(_items(12))
+    service = _service(db)
+    stuck = service.create_replay_run("PV-1")
+    moving = service.create_replay_run("PV-1")
+    for run in (stuck, moving):
+        service.start_replay_run(run["id"], partition_size=5)
+    db._runs[stuck["id"]]["updated_at"] = "2025-01-01T00:00:00+00:00"
+
+    with patch("solden.services.policy_service.get_db", return_value=db):
+        assert fail_stale_replay_runs(stale_after_seconds=600) == 1
+
+    assert db._runs[stuck["id"]]["status"] == "failed"
+    assert db._runs[stuck["id"]]["error_message"].startswith("stale")
+    assert db._runs[moving["id"]]["status"] == "running"
@@ -0,0 +1,169 @@
+"""Tests for compiled rule evaluation.
+
+Covers:
+  * The compiled rule set picks the same rule as the clause-by-clause
+    interpreter (``_trace_rules``) across randomised rules and contexts,
+    including malformed values, globs, scoping and paused rules.
+  * Numeric bounds keep their inclusive / exclusive edges.
+  * Compiled indexes are cached per rule-set version and rebuilt when
+    a rule's version or (unsaved) conditions change.
+  * The trace is only built when read; ``evaluate_rules_batch``
+    agrees with ``evaluate_rules``.
+"""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from solden.services import rule_engine  # noqa: E402
+
+_FIELDS = ["amount", "currency", "vendor_name", "gl_code", "invoice_age_days", "entity_id"]
+_VALUES = {
+    "amount": [0, 500, 999.99, 1000, 1000.0, "1000", "abc", None, float("inf")],
+    "currency": ["USD", "EUR", "usd", None, 1],
+    "vendor_name": ["Acme Corp", "Acme", "Beta Vendors LLC", "", None],
+    "gl_code": ["5000", "6100", 5000, None],
+    "invoice_age_days": [0, 5, 30, "5", None],
+    "entity_id": [None, "eu-1", "us-1"],
+}
+_OPS = ["eq", "ne", "lt", "lte", "gt", "gte", "in", "not_in", "matches", "contains", "LT", "bogus"]
+
+
+def _rule(rule_id: str, *, priority: int = 100, version=None, **conditions) -> dict:
+    rule = {
+        "id": rule_id, "name": rule_id, "priority": priority, "status": "active",
+        "workflow": "ap", "entity_id": None, "created_at": "0",
+        "conditions": conditions, "actions": [{"type": "auto_approve"}],
+    }
+    if version is not None:
+        rule["version"] = version
+    return rule
+
+
+def _random_clause(rng: random.Random) -> dict:
+    field_name = rng.choice(_FIELDS)
+    op = rng.choice(_OPS)
+    if op in ("in", "not_in"):
+        value = rng.choice([None, "Acme", rng.sample(_VALUES[field_name], k=rng.randint(0, 3))])
+    elif op == "matches":
+        value = rng.choice(["Acme*", "*Corp", "?cme*", "[AB]*", "5*"])
+    else:
+        value = rng.choice(_VALUES[field_name] + ["x", [1, 2]])
+    return {"field": field_name, "op": op, "value": value}
+
+
+def _random_rule(rng: random.Random, index: int) -> dict:
+    conditions = {"all_of": [_random_clause(rng) for _ in range(rng.randint(0, 4))]}
+    if rng.random() < 0.4:
+        conditions["any_of"] = [_random_clause(rng) for _ in range(rng.randint(0, 3))]
+    rule = _rule(f"r{index}", priority=rng.choice([50, 100, 100, 200]), **conditions)
+    rule.update(
+        status=rng.choice(["active"] * 5 + ["paused", None]),
+        workflow=rng.choice(["ap", "ap", "", "ar"]),
+        entity_id=rng.choice([None, None, "eu-1", ""]),
+        created_at=str(rng.randint(0, 9)),
+    )
+    return rule
+
+
+def _random_context(rng: random.Random) -> dict:
+    context = {f: rng.choice(_VALUES[f]) for f in _FIELDS if rng.random() < 0.9}
+    context["workflow"] = rng.choice(["ap", "ap", "ar"])
+    return context
+
+
+def _interpreted_match(context: dict, rules: list):
+    ordered = sorted(rules, key=lambda r: (int(r.get("priority", 100)), str(r.get("created_at", ""))))
+    trace = rule_engine._trace_rules(context, ordered)
+    return next((ordered[i] for i, entry in enumerate(trace) if entry.matched), None)
+
+
+def test_compiled_matches_interpreter_on_random_rule_sets():
+    rng = random.Random(20240611)
+    for _ in range(400):
+        rules = [_random_rule(rng, i) for i in range(rng.randint(0, 8))]
+        contexts = [_random_context(rng) for _ in range(8)]
+        results = rule_engine.evaluate_rules_batch(contexts, rules)
+        for context, result in zip(contexts, results):
+            assert result.matched_rule is _interpreted_match(context, rules), (context, rules)
+
+
+def test_numeric_bounds_keep_their_edges():
+    rules = [
+        _rule("band", all_of=[
+            {"field": "amount", "op": "gt", "value": 1000},
+            {"field": "amount", "op": "lte", "value": 5000},
+        ]),
+        _rule("fallback", priority=900, all_of=[{"field": "amount", "op": "gte", "value": 0}]),
+    ]
+    matched = [
+        result.matched_rule["id"] if result.matched_rule else None
+        for result in rule_engine.evaluate_rules_batch(
+            [{"amount": a} for a in (1000, 1000.01, 5000, 5000.01, -1, None)], rules,
+        )
+    ]
+    assert matched == ["fallback", "band", "band", "fallback", None, None]
+
+
+def test_compiled_index_is_cached_per_version():
+    rules = [_rule("cached", version=3, all_of=[{"field": "currency", "op": "in", "value": ["USD", "EUR"]}])]
+    first = rule_engine.compile_rules(rules)
+    again = rule_engine.compile_rules([dict(rules[0])])
+    assert again._index is first._index
+
+    bumped = dict(rules[0], version=4, conditions={"all_of": [{"field": "currency", "op": "eq", "value": "GBP"}]})
+    recompiled = rule_engine.compile_rules([bumped])
+    assert recompiled._index is not first._index
+    assert recompiled.evaluate({"currency": "GBP"}).matched_rule is bumped
+    assert recompiled.evaluate({"currency": "USD"}).matched_rule is None
+
+
+def test_unsaved_condition_edit_is_not_served_from_cache():
+    # update_rule checks the edited candidate for conflicts before the
+    # version is bumped.
+    stored = _rule("edited", version=3, all_of=[{"field": "amount", "op": "gt", "value": 1_000_000}])
+    assert rule_engine.evaluate_rules({"amount": 500}, [stored]).matched_rule is None
+    cached = rule_engine.compile_rules([stored])
+
+    candidate = dict(stored, conditions={"all_of": [{"field": "amount", "op": "gt", "value": 0}]})
+    result = rule_engine.evaluate_rules({"amount": 500}, [candidate], cache=False)
+    assert result.matched_rule is candidate
+    assert result.rule_trace[0].matched is True
+    assert rule_engine.compile_rules([stored])._index is cached._index
+    assert rule_engine.find_rule_conflicts(candidate, []) == []
+
+
+def test_cache_key_ignores_rule_bodies():
+    rule = _rule("keyed", version=2, all_of=[{"field": "amount", "op": "gt", "value": 10}])
+    assert rule_engine.rule_set_version([rule]) == rule_engine.rule_set_version(
+        [dict(rule, conditions={"all_of": [], "any_of": [], "none_of": []})]
+    )
+
+
+def test_trace_is_built_only_when_read(monkeypatch):
+    calls = []
+    original = rule_engine._trace_rules
+
+    def _counting(context, rules):
+        calls.append(len(rules))
+        return original(context, rules)
+
+    monkeypatch.setattr(rule_engine, "_trace_rules", _counting)
+    rules = [
+        _rule("low", all_of=[{"field": "amount", "op": "lt", "value": 1000}]),
+        _rule("high", priority=200, all_of=[{"field": "amount", "op": "gte", "value": 1000}]),
+    ]
+    result = rule_engine.evaluate_rules({"amount": 500}, rules)
+    assert result.matched_rule["id"] == "low"
+    assert calls == []
+
+    trace = result.to_dict()["trace"]
+    assert calls == [2]
+    assert [entry["skipped_reason"] for entry in trace] == [None, "rule_above_already_matched"]
+    assert result.rule_trace[1].all_of_traces[0].matched is False
+    assert calls == [2]
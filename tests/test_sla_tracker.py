@@ -0,0 +1,157 @@
+"""Tests for the buffered SLA metric pipeline in ``SLATracker``.
+
+Covers:
+- ``record`` only queues; ``flush`` writes raw rows and per-minute
+  rollups in one transaction.
+- Breach alerts are logged at record time, not at flush time.
+- Tier resolution is cached per org.
+- A failed flush keeps the batch queued.
+- ``get_summary`` is answered from the rollup table.
+- The background flusher drains on the size threshold.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from unittest.mock import patch
+
+import pytest
+
+from solden.core import database as db_module
+from solden.core.sla_tracker import SLATracker
+
+
+@pytest.fixture()
+def db():
+    inst = db_module.get_db()
+    inst.initialize()
+    return inst
+
+
+@pytest.fixture()
+def tracker(db):
+    t = SLATracker(db=db, background=False)
+    yield t
+    t.close(flush=False)
+
+
+def _count(db, table: str, org: str) -> int:
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute(f"SELECT COUNT(*) AS n FROM {table} WHERE organization_id = %s", (org,))
+        return dict(cur.fetchone())["n"]
+
+
+def test_record_queues_without_touching_db(tracker, db):
+    tracker.record("guardrails", 120, organization_id="sla-org")  # warms the tier cache
+    with patch.object(db, "connect") as connect_mock:
+        metric_id = tracker.record("guardrails", 120, organization_id="sla-org")
+    assert metric_id and metric_id.startswith("SLA-")
+    assert tracker.pending() == 2
+    assert connect_mock.call_count == 0
+
+
+def test_flush_writes_raw_rows_and_rollup(tracker, db):
+    for latency in (100, 300, 800):
+        tracker.record("guardrails", latency, organization_id="sla-org", ap_item_id="AP-1")
+    tracker.record("erp_post", 50, organization_id="sla-org")
+
+    assert tracker.flush() == 4
+    assert tracker.pending() == 0
+    assert _count(db, "ap_sla_metrics", "sla-org") == 4
+
+    with db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT total, latency_ms_sum, max_ms, breached_count "
+            "FROM ap_sla_metrics_rollup WHERE organization_id = %s AND step_name = %s",
+            ("sla-org", "guardrails"),
+        )
+        rows = [dict(r) for r in cur.fetchall()]
+    assert sum(r["total"] for r in rows) == 3
+    assert sum(r["latency_ms_sum"] for r in rows) == 1200
+    assert max(r["max_ms"] for r in rows) == 800
+    # guardrails target is 500ms on every tier
+    assert sum(r["breached_count"] for r in rows) == 1
+
+
+def test_rollup_accumulates_across_flushes(tracker, db):
+    tracker.record("three_way_match", 40, organization_id="sla-org")
+    tracker.flush()
+    tracker.record("three_way_match", 60, organization_id="sla-org")
+    tracker.flush()
+
+    summary = tracker.get_summary("sla-org")
+    (step,) = summary["steps"]
+    assert step["step"] == "three_way_match"
+    assert step["total"] == 2
+    assert step["avg_ms"] == 50
+    assert step["max_ms"] == 60
+    assert step["compliance_pct"] == 100.0
+
+
+def test_summary_reads_rollup_not_raw_rows(tracker, db):
+    tracker.record("erp_post", 6000, organization_id="sla-org")
+    tracker.record("erp_post", 1000, organization_id="sla-org")
+    tracker.flush()
+    with db.connect() as conn:
+        conn.execute("DELETE FROM ap_sla_metrics WHERE organization_id = %s", ("sla-org",))
+        conn.commit()
+
+    summary = tracker.get_summary("sla-org", hours=1)
+    (step,) = summary["steps"]
+    assert step["total"] == 2
+    assert step["breached"] == 1
+    assert step["compliance_pct"] == 50.0
+
+
+def test_breach_alert_logged_before_flush(tracker, caplog):
+    with caplog.at_level(logging.WARNING, logger="solden.core.sla_tracker"):
+        tracker.record("guardrails", 900, organization_id="sla-org")
+    assert tracker.pending() == 1
+    assert any("guardrails breached" in r.getMessage() for r in caplog.records)
+
+
+def test_tier_is_cached_per_org(tracker, db):
+    with patch.object(
+        db, "get_subscription_record", return_value={"plan": "enterprise"},
+    ) as sub_mock:
+        for _ in range(20):
+            tracker.record("classification", 4000, organization_id="sla-org")
+    assert sub_mock.call_count == 1
+    # 4s breaches the 3s enterprise classification target
+    assert all(row[5] == 1 for row in tracker._queue)
+
+
+def test_failed_flush_keeps_batch_queued(tracker, db):
+    tracker.record("erp_lookup", 10, organization_id="sla-org")
+    tracker.record("erp_lookup", 20, organization_id="sla-org")
+    with patch.object(tracker, "_write_batch", side_effect=RuntimeError("db down")):
+        assert tracker.flush() == 0
+    assert tracker.pending() == 2
+    assert tracker.flush() == 2
+    assert _count(db, "ap_sla_metrics", "sla-org") == 2
+
+
+def test_full_buffer_drops_new_measurements(tracker):
+    tracker.MAX_BUFFERED_ROWS = 2
+    assert tracker.record("erp_post", 1, organization_id="sla-org")
+    assert tracker.record("erp_post", 1, organization_id="sla-org")
+    assert tracker.record("erp_post", 1, organization_id="sla-org") is None
+    assert tracker.pending() == 2
+
+
+def test_background_flusher_drains_on_size_threshold(db):
+    t = SLATracker(db=db)
+    t.FLUSH_INTERVAL_SECONDS = 60.0
+    t.FLUSH_MAX_ROWS = 5
+    try:
+        for _ in range(5):
+            t.record("erp_post", 10, organization_id="sla-org")
+        deadline = time.monotonic() + 5
+        while t.pending() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert t.pending() == 0
+        assert _count(db, "ap_sla_metrics", "sla-org") == 5
+    finally:
+        t.close(flush=False)
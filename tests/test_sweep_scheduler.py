@@ -0,0 +1,166 @@
+"""Tests for the leased, concurrent per-org sweep scheduler.
+
+Covers:
+  * Two replicas sharing the lease table split one sweep between them
+    and run every org exactly once; the next poll finds nothing due.
+  * run_due only starts work: a slow org doesn't hold up the poll, other
+    jobs, or the rest of its own job's orgs.
+  * Daily jobs are due at their hour, interval jobs after their interval.
+  * Per-org overruns and timeouts are counted, and a failing org doesn't
+    stop the rest of the sweep.
+  * Without a reachable lease table the scheduler still runs each org
+    once per interval on in-process due times.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from solden.services.sweep_scheduler import SweepJob, SweepScheduler
+
+
+class _BrokenDB:
+    def connect(self):
+        raise RuntimeError("lease table unavailable")
+
+
+def _orgs(n: int):
+    return [f"org-{i:02d}" for i in range(n)]
+
+
+async def _poll_until_idle(schedulers, orgs, turns: int = 200):
+    """Poll like the background loop until nothing is due or running."""
+    started = [0] * len(schedulers)
+    for _ in range(turns):
+        was_running = any(scheduler.running() for scheduler in schedulers)
+        new = [sum((await scheduler.run_due(orgs)).values()) for scheduler in schedulers]
+        started = [total + n for total, n in zip(started, new)]
+        if not was_running and not any(new):
+            break
+        await asyncio.sleep(0.01)
+    for scheduler in schedulers:
+        await scheduler.wait_idle()
+    return started
+
+
+def test_replicas_split_a_sweep_and_run_each_org_once():
+    from solden.core.database import get_db
+
+    db = get_db()
+    db.initialize()
+    ran = []
+
+    async def job_fn(org_id):
+        await asyncio.sleep(0.02)
+        ran.append(org_id)
+
+    job = SweepJob("test_job", job_fn, interval_seconds=900, concurrency=2)
+    a = SweepScheduler([job], db=db, owner="replica-a")
+    b = SweepScheduler([job], db=db, owner="replica-b")
+    a.CLAIM_BATCH = b.CLAIM_BATCH = 2
+    orgs = _orgs(12)
+
+    async def sweep():
+        await a.seed(orgs)
+        return await _poll_until_idle([a, b], orgs)
+
+    first_a, first_b = asyncio.run(sweep())
+    assert sorted(ran) == orgs
+    assert first_a + first_b == 12
+    assert first_a > 0 and first_b > 0
+    assert a.metrics_snapshot()["test_job"]["sweeps"] == 1
+
+    again = asyncio.run(a.run_due(orgs))
+    assert again == {"test_job": 0}
+    a.close()
+    b.close()
+
+
+def test_daily_and_interval_due_times():
+    now = datetime(2026, 10, 16, 9, 30, tzinfo=timezone.utc)
+    daily = SweepJob("digest", lambda org_id: None, hour_utc=8)
+    hourly = SweepJob("hourly", lambda org_id: None, interval_seconds=3600)
+
+    assert daily.first_due(now) == datetime(2026, 10, 17, 8, 0, tzinfo=timezone.utc)
+    assert daily.first_due(now.replace(hour=8)) == now.replace(hour=8)
+    assert daily.next_due(now.replace(hour=8, minute=5)) == datetime(2026, 10, 17, 8, 0, tzinfo=timezone.utc)
+    assert hourly.next_due(now) == datetime(2026, 10, 16, 10, 30, tzinfo=timezone.utc)
+
+
+def test_overruns_timeouts_and_failures_are_counted():
+    async def job_fn(org_id):
+        if org_id == "org-00":
+            raise RuntimeError("ERP down")
+        if org_id == "org-01":
+            await asyncio.sleep(0.5)
+        elif org_id == "org-02":
+            await asyncio.sleep(0.15)
+
+    job = SweepJob("slow_job", job_fn, concurrency=4, deadline_seconds=0.1, timeout_seconds=0.3)
+    scheduler = SweepScheduler([job], db=_BrokenDB())
+
+    ran = asyncio.run(_poll_until_idle([scheduler], _orgs(4)))
+    snapshot = scheduler.metrics_snapshot()["slow_job"]
+
+    assert ran == [4]
+    assert snapshot["failed"] == 1
+    assert snapshot["timed_out"] == 1
+    assert snapshot["succeeded"] == 2
+    assert snapshot["overruns"] == 2  # org-01 (timed out) and org-02
+    scheduler.close()
+
+
+def test_local_fallback_runs_each_org_once_per_interval():
+    calls = []
+
+    async def job_fn(org_id):
+        calls.append(org_id)
+
+    job = SweepJob("local_job", job_fn, interval_seconds=900, concurrency=3)
+    scheduler = SweepScheduler([job], db=_BrokenDB())
+    orgs = _orgs(7)
+
+    started = time.monotonic()
+    asyncio.run(_poll_until_idle([scheduler], orgs))
+    asyncio.run(_poll_until_idle([scheduler], orgs))
+
+    assert sorted(calls) == orgs
+    assert time.monotonic() - started < 5
+    scheduler.close()
+
+
+def test_run_due_starts_runs_without_waiting_for_slow_orgs():
+    finished = []
+
+    async def slow_fn(org_id):
+        await asyncio.sleep(1.0 if org_id == "org-00" else 0.01)
+        finished.append(("slow", org_id))
+
+    async def fast_fn(org_id):
+        finished.append(("fast", org_id))
+
+    slow = SweepJob("slow_job", slow_fn, concurrency=2)
+    fast = SweepJob("fast_job", fast_fn, concurrency=2)
+    scheduler = SweepScheduler([slow, fast], db=_BrokenDB())
+    orgs = _orgs(4)
+
+    async def scenario():
+        poll_started = time.monotonic()
+        first = await scheduler.run_due(orgs)
+        assert time.monotonic() - poll_started < 0.3
+        assert first == {"slow_job": 2, "fast_job": 2}
+        # org-00 is still running; its job's other orgs and the other
+        # job carry on around it.
+        for _ in range(10):
+            await asyncio.sleep(0.03)
+            await scheduler.run_due(orgs)
+        assert ("slow", "org-00") not in finished
+        assert {org for job, org in finished if job == "fast"} == set(orgs)
+        assert {org for job, org in finished if job == "slow"} == set(orgs[1:])
+        assert scheduler.running("slow_job") == 1
+        await scheduler.wait_idle()
+
+    asyncio.run(scenario())
+    assert ("slow", "org-00") in finished
+    scheduler.close()
@@ -0,0 +1,185 @@
+"""Tests for the generated timestamptz columns (migration 107).
+
+Covers:
+  * ``dict_row`` drops the query-only ``*_tz`` columns from result rows
+    without shifting the remaining positional values.
+  * Against Postgres: ``solden_iso_ts`` parses offset and naive ISO
+    text (naive as UTC) and maps garbage to NULL instead of failing
+    the write; the generated column follows the TEXT value and
+    ``SELECT *`` rows carry no typed columns.
+  * EXPLAIN regression: every query the workspace reports, the ops
+    monitoring thresholds, the month-to-date LLM cost and the
+    ``since`` audit filter issue against the timestamp tables plans
+    without a Seq Scan when sequential scans are disabled — i.e. an
+    index can serve it.
+"""
+from __future__ import annotations
+
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from solden.core.database import dict_row
+
+_TIMESTAMP_TABLES = ("ap_items", "audit_events", "llm_call_log")
+
+
+def test_dict_row_hides_query_only_columns():
+    cursor = SimpleNamespace(description=[
+        SimpleNamespace(name=name) for name in ("id", "created_at", "created_at_tz", "state")
+    ])
+    row = dict_row(cursor)(("AP-1", "2026-03-02T12:00:00+00:00", datetime(2026, 3, 2), "received"))
+    assert dict(row) == {"id": "AP-1", "created_at": "2026-03-02T12:00:00+00:00", "state": "received"}
+    assert row[2] == "received"
+
+    plain = dict_row(SimpleNamespace(description=[SimpleNamespace(name="n")]))((3,))
+    assert plain["n"] == 3 and plain[0] == 3
+
+
+# ─── Postgres-backed ──────────────────────────────────────────────
+
+
+@pytest.fixture()
+def pg_db():
+    from solden.core.database import get_db
+
+    inst = get_db()
+    inst.initialize()
+    return inst
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2026-03-02T14:00:00+02:00", datetime(2026, 3, 2, 12, tzinfo=timezone.utc)),
+        ("2026-03-02T12:00:00", datetime(2026, 3, 2, 12, tzinfo=timezone.utc)),
+        ("not a timestamp", None),
+        ("", None),
+    ],
+)
+def test_solden_iso_ts_parses_iso_text(pg_db, text, expected):
+    with pg_db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT solden_iso_ts(%s) AS parsed", (text,))
+        assert cur.fetchone()["parsed"] == expected
+
+
+def test_generated_column_tracks_text_and_stays_out_of_rows(pg_db):
+    org_id = f"org-tz-{uuid.uuid4().hex[:8]}"
+    pg_db.ensure_organization(org_id, organization_name="TZ Co")
+    item = pg_db.create_ap_item({
+        "id": f"{org_id}-1",
+        "invoice_key": f"inv-{org_id}",
+        "thread_id": f"thread-{org_id}",
+        "message_id": f"msg-{org_id}",
+        "vendor_name": "TZ Vendor",
+        "amount": 10.0,
+        "state": "received",
+        "organization_id": org_id,
+    })
+    assert "created_at_tz" not in item and "updated_at_tz" not in item
+
+    with pg_db.connect() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT created_at, created_at_tz AS typed FROM ap_items WHERE id = %s",
+            (item["id"],),
+        )
+        row = cur.fetchone()
+    created = datetime.fromisoformat(row["created_at"])
+    assert row["typed"] == created
+
+
+class _RecordingCursor:
+    def __init__(self, cursor, statements):
+        self._cursor = cursor
+        self._statements = statements
+
+    def execute(self, sql, params=None):
+        self._statements.append((sql, params))
+        return self._cursor.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _RecordingConnection:
+    def __init__(self, conn, statements):
+        self._conn = conn
+        self._statements = statements
+
+    def cursor(self, *args, **kwargs):
+        return _RecordingCursor(self._conn.cursor(*args, **kwargs), self._statements)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@contextmanager
+def _recording(db):
+    statements = []
+    connect = db.connect
+
+    @contextmanager
+    def _connect():
+        with connect() as conn:
+            yield _RecordingConnection(conn, statements)
+
+    db.connect = _connect
+    try:
+        yield statements
+    finally:
+        del db.connect
+
+
+def _seq_scans(plan):
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in _TIMESTAMP_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans") or []:
+        found.extend(_seq_scans(child))
+    return found
+
+
+def test_time_range_queries_do_not_seq_scan(pg_db):
+    from solden.api.ops import _evaluate_monitoring_thresholds
+    from solden.core.stores.async_llm_call_store import LLM_COST_THIS_MONTH_SQL, month_start_iso
+    from solden.services import workspace_reports as reports
+
+    org_id = f"org-tz-{uuid.uuid4().hex[:8]}"
+    pg_db.ensure_organization(org_id, organization_name="Explain Co")
+    since = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+
+    with _recording(pg_db) as statements:
+        reports.generate_volume_report(org_id)
+        reports.generate_agent_performance_report(org_id)
+        reports.generate_cycle_time_report(org_id)
+        reports.generate_exception_breakdown_report(org_id)
+        reports.generate_vendor_quality_report(org_id)
+        _evaluate_monitoring_thresholds(org_id, 24, pg_db)
+        pg_db.list_audit_events(org_id, event_types=["state_transition"], since=since)
+        with pg_db.connect() as conn:
+            conn.cursor().execute(LLM_COST_THIS_MONTH_SQL, (org_id, month_start_iso()))
+
+    queries = [
+        (sql, params) for sql, params in statements
+        if sql.lstrip().upper().startswith("SELECT")
+        and any(table in sql for table in _TIMESTAMP_TABLES)
+        and ("_tz" in sql)
+    ]
+    assert len(queries) >= 15
+
+    offenders = []
+    with pg_db.connect() as conn:
+        cur = conn.cursor()
+        for sql, params in queries:
+            cur.execute("SET LOCAL enable_seqscan = off")
+            cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            plan = cur.fetchone()[0][0]["Plan"]
+            if _seq_scans(plan):
+                offenders.append(sql)
+        conn.rollback()
+    assert offenders == []
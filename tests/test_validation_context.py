@@ -0,0 +1,201 @@
+"""Tests for the per-invoice validation read cache.
+
+Covers:
+  * ``ValidationContext.load`` prefetches the vendor profile, org row,
+    vendor history, bank details and recent items once each, and the
+    gate's narrower reads are answered from those results.
+  * Prefetch failures re-raise to every rule that asks, so rules still
+    record ``skip`` instead of passing on missing data.
+  * Methods the DB lacks stay missing on the context (``hasattr``).
+  * The deterministic gate, run against Postgres, reads the vendor
+    profile, history and recent items once per invoice.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from solden.services.validation_context import ValidationContext, fuzzy_dedup_settings
+
+
+def _ago(**delta) -> str:
+    return (datetime.now(timezone.utc) - timedelta(**delta)).isoformat()
+
+
+class _FakeDB:
+    def __init__(self) -> None:
+        self.calls: Counter = Counter()
+        self.profile = {
+            "default_currency": "USD",
+            "iban_change_pending": True,
+            "iban_change_verification_state": {"email_domain_factor": {"verified": True}},
+        }
+        self.recent = [
+            {"id": "AP-3", "created_at": _ago(hours=6)},
+            {"id": "AP-2", "created_at": _ago(days=2)},
+            {"id": "AP-1", "created_at": _ago(days=9)},
+        ]
+
+    def get_vendor_profile(self, organization_id, vendor_name):
+        self.calls["get_vendor_profile"] += 1
+        return self.profile
+
+    def get_organization(self, organization_id):
+        self.calls["get_organization"] += 1
+        return {"settings_json": '{"dedup": {"fuzzy_window_days": 14}}'}
+
+    def get_vendor_invoice_history(self, organization_id, vendor_name, limit=6):
+        self.calls["get_vendor_invoice_history"] += 1
+        return [{"invoice_number": f"INV-{i}"} for i in range(limit)]
+
+    def get_ap_items_by_vendor(self, organization_id, vendor_name, days=90, limit=50):
+        self.calls["get_ap_items_by_vendor"] += 1
+        self.recent_params = (days, limit)
+        return list(self.recent)
+
+    def get_vendor_bank_details(self, organization_id, vendor_name):
+        self.calls["get_vendor_bank_details"] += 1
+        return {"iban": "GB00TEST"}
+
+    def is_iban_change_pending(self, organization_id, vendor_name):
+        raise AssertionError("derived from the cached profile")
+
+    def get_iban_change_verification_state(self, organization_id, vendor_name):
+        raise AssertionError("derived from the cached profile")
+
+    def append_audit_event(self, payload):
+        return "audit-1"
+
+
+def _invoice(**overrides):
+    fields = {"vendor_name": "Acme", "invoice_number": "INV-9", "amount": 100.0, "bank_details": None}
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+@pytest.mark.asyncio
+async def test_load_prefetches_once_and_serves_narrower_reads():
+    db = _FakeDB()
+    ctx = await ValidationContext.load(db, "org-1", _invoice(bank_details={"iban": "GB00TEST"}))
+
+    for _ in range(3):
+        assert ctx.get_vendor_profile("org-1", "Acme") is db.profile
+        assert ctx.get_organization("org-1")["settings_json"]
+    assert len(ctx.get_vendor_invoice_history("org-1", "Acme", limit=50)) == 50
+    assert len(ctx.get_vendor_invoice_history("org-1", "Acme", limit=200)) == 200
+    assert ctx.get_vendor_bank_details("org-1", "Acme") == {"iban": "GB00TEST"}
+    assert ctx.is_iban_change_pending("org-1", "Acme") is True
+    assert "email_domain_factor" in ctx.get_iban_change_verification_state("org-1", "Acme")
+
+    # Widest window is the tenant's 14-day dedup setting; each rule's
+    # narrower window is a prefix of it.
+    assert db.recent_params[0] == 14
+    assert [r["id"] for r in ctx.get_ap_items_by_vendor("org-1", "Acme", days=1, limit=20)] == ["AP-3"]
+    assert [r["id"] for r in ctx.get_ap_items_by_vendor("org-1", "Acme", days=7, limit=1)] == ["AP-3"]
+    assert len(ctx.get_ap_items_by_vendor("org-1", "Acme", days=14, limit=20)) == 3
+
+    assert db.calls == Counter({
+        "get_vendor_profile": 1,
+        "get_organization": 1,
+        "get_vendor_invoice_history": 1,
+        "get_ap_items_by_vendor": 1,
+        "get_vendor_bank_details": 1,
+    })
+
+    # Reads outside what was prefetched go to the DB.
+    ctx.get_vendor_profile("org-1", "Other Vendor")
+    ctx.get_ap_items_by_vendor("org-1", "Acme", days=30, limit=20)
+    assert db.calls["get_vendor_profile"] == 2
+    assert db.calls["get_ap_items_by_vendor"] == 2
+
+
+@pytest.mark.asyncio
+async def test_prefetch_errors_reraise_and_missing_methods_stay_missing():
+    class _Broken(_FakeDB):
+        def get_vendor_profile(self, organization_id, vendor_name):
+            self.calls["get_vendor_profile"] += 1
+            raise RuntimeError("pool exhausted")
+
+    db = _Broken()
+    ctx = await ValidationContext.load(db, "org-1", _invoice())
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            ctx.get_vendor_profile("org-1", "Acme")
+    with pytest.raises(RuntimeError):
+        ctx.is_iban_change_pending("org-1", "Acme")
+    assert db.calls["get_vendor_profile"] == 1
+    assert db.calls["get_vendor_bank_details"] == 0  # invoice has no bank details
+    assert not hasattr(ctx, "get_ap_item_by_invoice_hash")
+    assert ctx.append_audit_event({}) == "audit-1"
+
+
+def test_fuzzy_dedup_settings_bounds():
+    assert fuzzy_dedup_settings(None) == (7, 0.02)
+    assert fuzzy_dedup_settings({"settings_json": {"dedup": {"fuzzy_window_days": 3, "fuzzy_amount_tolerance": 0.1}}}) == (3, 0.1)
+    assert fuzzy_dedup_settings({"settings_json": {"dedup": {"fuzzy_window_days": 365, "fuzzy_amount_tolerance": 0.5}}}) == (7, 0.02)
+
+
+@pytest.mark.asyncio
+async def test_gate_reads_each_vendor_lookup_at_most_once(postgres_test_db):
+    from solden.core.database import get_db
+    from solden.services.invoice_models import InvoiceData
+    from solden.services.invoice_workflow import InvoiceWorkflowService
+
+    db = get_db()
+    db.initialize()
+    db.create_ap_item({
+        "invoice_key": "Budget Co::INV-1",
+        "thread_id": "thread-budget-1",
+        "vendor_name": "Budget Co",
+        "amount": 400.0,
+        "currency": "USD",
+        "invoice_number": "INV-1",
+        "state": "received",
+        "organization_id": "org-test",
+    })
+
+    workflow = InvoiceWorkflowService(organization_id="org-test")
+    budgeted = (
+        "get_vendor_profile",
+        "get_vendor_invoice_history",
+        "get_ap_items_by_vendor",
+        "is_iban_change_pending",
+        "get_iban_change_verification_state",
+    )
+    calls: Counter = Counter()
+    originals = {name: getattr(workflow.db, name) for name in budgeted}
+
+    def _counting(name):
+        def _call(*args, **kwargs):
+            calls[name] += 1
+            return originals[name](*args, **kwargs)
+        return _call
+
+    for name in budgeted:
+        setattr(workflow.db, name, _counting(name))
+    try:
+        await workflow._evaluate_deterministic_validation(InvoiceData(
+            gmail_id="thread-budget-2",
+            subject="Bill from Budget Co",
+            sender="billing@budget.example.com",
+            vendor_name="Budget Co",
+            amount=410.0,
+            currency="USD",
+            invoice_number="",
+            confidence=0.95,
+            organization_id="org-test",
+            user_id="test-user",
+        ))
+    finally:
+        for name in budgeted:
+            delattr(workflow.db, name)
+
+    for name in ("get_vendor_profile", "get_vendor_invoice_history", "get_ap_items_by_vendor"):
+        assert calls[name] == 1, f"{name} read {calls[name]} times: {dict(calls)}"
+    # The freeze rule reads IBAN state from the cached profile.
+    assert calls["is_iban_change_pending"] == 0
+    assert calls["get_iban_change_verification_state"] == 0
@@ -15,7 +15,7 @@ Postgres test fixture so the audit_event actually lands.
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
@@ -327,36 +327,49 @@ async def test_fuzzy_dedup_window_honours_per_tenant_setting(postgres_test_db):
     )
 
     workflow = _make_workflow()
-    captured_kwargs: list[dict] = []
     original = workflow.db.get_ap_items_by_vendor
+    now = datetime.now(timezone.utc)
+    recent_rows: list[dict] = []
 
-    def _capturing_get_ap_items_by_vendor(*args, **kwargs):
-        captured_kwargs.append(dict(kwargs))
-        # Return empty so we don't trigger the actual reason; we only
-        # care that the gate plumbed our 1-day window.
-        return []
+    def _fake_get_ap_items_by_vendor(*args, **kwargs):
+        # The gate fetches the vendor's recent items once, over the
+        # widest window any rule needs, and each rule narrows it to its
+        # own window — so what gets flagged is the observable contract.
+        return list(recent_rows)
 
-    workflow.db.get_ap_items_by_vendor = _capturing_get_ap_items_by_vendor  # type: ignore[assignment]
+    workflow.db.get_ap_items_by_vendor = _fake_get_ap_items_by_vendor  # type: ignore[assignment]
     try:
-        await workflow._evaluate_deterministic_validation(invoice)
+        # Same amount, 3 days old: inside the 7-day default, outside
+        # the tenant's 1-day window.
+        recent_rows[:] = [{
+            "id": "AP-old", "state": "received", "amount": 750.0,
+            "created_at": (now - timedelta(days=3)).isoformat(),
+        }]
+        outside = await workflow._evaluate_deterministic_validation(invoice)
+
+        # 12 hours old and 0.27% off: inside the window and the 0.5%
+        # tolerance.
+        recent_rows[:] = [{
+            "id": "AP-new", "state": "received", "amount": 752.0,
+            "created_at": (now - timedelta(hours=12)).isoformat(),
+        }]
+        inside = await workflow._evaluate_deterministic_validation(invoice)
     finally:
         workflow.db.get_ap_items_by_vendor = original  # type: ignore[assignment]
         # Restore the org settings so this test doesn't leak into others.
         db.update_organization(org_id, settings_json=_existing_settings)
 
-    assert captured_kwargs, "fuzzy dedup branch never invoked get_ap_items_by_vendor"
-    # The validation gate also has a velocity check that calls the
-    # same DB method with its own (unrelated) days=7 default. Match by
-    # the fuzzy-branch's distinctive limit=20 to find the one we care
-    # about.
-    fuzzy_calls = [c for c in captured_kwargs if c.get("limit") == 20]
-    assert fuzzy_calls, (
-        f"fuzzy dedup call (limit=20) not in captured kwargs: {captured_kwargs}"
+    assert "possible_duplicate_no_invoice_number" not in (outside.get("reason_codes") or []), (
+        "3-day-old item flagged despite settings_json[dedup].fuzzy_window_days=1"
     )
-    assert fuzzy_calls[0].get("days") == 1, (
-        f"expected days=1 from settings_json[dedup].fuzzy_window_days, "
-        f"got days={fuzzy_calls[0].get('days')}"
+    assert "possible_duplicate_no_invoice_number" in (inside.get("reason_codes") or [])
+    fuzzy_reason = next(
+        r for r in inside.get("reasons") or []
+        if r.get("code") == "possible_duplicate_no_invoice_number"
     )
+    assert fuzzy_reason["details"]["window_days"] == 1
+    assert fuzzy_reason["details"]["amount_tolerance"] == 0.005
+    assert fuzzy_reason["details"]["existing_ap_item_id"] == "AP-new"
 
 
 @pytest.mark.asyncio
@@ -10,6 +10,8 @@ Covers:
 """
 from __future__ import annotations
 
+import random
+import string
 from datetime import datetime, timedelta, timezone
 
 import pytest
@@ -97,6 +99,45 @@ class TestDuplicateDetection:
         assert len(clusters) == 0
 
 
+    def test_detects_typo_in_large_org(self, db):
+        # Enough decoys that every query goes through the index shortlist.
+        rng = random.Random(4)
+        for _ in range(60):
+            brand = "".join(rng.choice(string.ascii_lowercase) for _ in range(8))
+            _create_vendor(db, f"{brand.capitalize()} Services", invoice_count=1)
+        _create_vendor(db, "Quantrix Logistics", invoice_count=8)
+        _create_vendor(db, "Quantrix Logisitcs", invoice_count=1)
+
+        clusters = VendorDedupService("org-test").detect_duplicates(threshold=0.85)
+
+        assert len(clusters) == 1
+        assert clusters[0]["canonical"]["vendor_name"] == "Quantrix Logistics"
+        assert [d["vendor_name"] for d in clusters[0]["duplicates"]] == ["Quantrix Logisitcs"]
+
+
+class TestVendorNameIndexSync:
+    def test_index_tracks_profile_changes(self, db):
+        from solden.services.vendor_dedup import VendorDedupService as _Svc
+        from solden.services.vendor_name_index import (
+            get_vendor_name_index,
+            invalidate_vendor_name_index,
+        )
+
+        invalidate_vendor_name_index("org-test")
+        _create_vendor(db, "Acme Corp")
+        _create_vendor(db, "Globex Ltd")
+        index = get_vendor_name_index("org-test", db)
+        assert sorted(e.name for e in map(index.get, index.keys())) == ["Acme Corp", "Globex Ltd"]
+
+        _create_vendor(db, "Initech Software")
+        index = get_vendor_name_index("org-test", db)
+        assert [e.name for e in index.shortlist("initech software", limit=1)] == ["Initech Software"]
+
+        _Svc("org-test")._delete_vendor_profile("Globex Ltd")
+        index = get_vendor_name_index("org-test", db)
+        assert sorted(e.name for e in map(index.get, index.keys())) == ["Acme Corp", "Initech Software"]
+
+
 # ---------------------------------------------------------------------------
 # Merge tests
 # ---------------------------------------------------------------------------
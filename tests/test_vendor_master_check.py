@@ -15,6 +15,8 @@ import asyncio
 
 from unittest.mock import MagicMock
 
+import pytest
+
 from solden.services.vendor_master_check import (
     VENDOR_NOT_IN_ERP_MASTER,
     VendorMasterCheckResult,
@@ -176,6 +178,19 @@ class TestVendorNotInErpMasterConstant:
         assert VENDOR_NOT_IN_ERP_MASTER == "vendor_not_in_erp_master"
 
 
+def _profiles_db(names):
+    """Fake DB exposing the projections the vendor name index syncs from."""
+    rows = [
+        {"id": f"VP-{i}", "vendor_name": name, "updated_at": "2025-01-01T00:00:00+00:00"}
+        for i, name in enumerate(names)
+    ]
+    fake_db = MagicMock()
+    fake_db.list_vendor_profile_names = MagicMock(return_value=rows)
+    fake_db.count_vendor_profiles = MagicMock(return_value=len(rows))
+    fake_db.list_vendor_profile_ids = MagicMock(return_value=[r["id"] for r in rows])
+    return fake_db
+
+
 class TestFuzzyMatchTier:
     """Tier 2: fuzzy match against local ``vendor_profiles`` cache.
 
@@ -185,9 +200,16 @@ class TestFuzzyMatchTier:
     tests pin the corrected behaviour.
     """
 
+    @pytest.fixture(autouse=True)
+    def _fresh_name_index(self):
+        from solden.services.vendor_name_index import invalidate_vendor_name_index
+        invalidate_vendor_name_index()
+        yield
+        invalidate_vendor_name_index()
+
     def test_exact_match_resolves_at_tier_1_without_fuzzy(self, monkeypatch):
         # Tier 1 hit short-circuits — the local fuzzy pass shouldn't
-        # even run. Verify by patching list_vendor_profiles to raise
+        # even run. Verify by making the vendor name index sync raise
         # if called.
         monkeypatch.setattr(
             "solden.integrations.erp_router.get_erp_connection",
@@ -203,7 +225,7 @@ class TestFuzzyMatchTier:
         )
 
         fake_db = MagicMock()
-        fake_db.list_vendor_profiles = MagicMock(
+        fake_db.list_vendor_profile_names = MagicMock(
             side_effect=AssertionError("fuzzy tier should not run on exact hit"),
         )
         monkeypatch.setattr(
@@ -236,11 +258,8 @@ class TestFuzzyMatchTier:
             _fake_find_vendor,
         )
 
-        fake_db = MagicMock()
-        fake_db.list_vendor_profiles = MagicMock(return_value=[
-            {"vendor_name": "CISCO SYSTEMS, INCORPORATED"},
-            {"vendor_name": "Cisco Systems Inc"},
-            {"vendor_name": "ACME Corp"},
+        fake_db = _profiles_db([
+            "CISCO SYSTEMS, INCORPORATED", "Cisco Systems Inc", "ACME Corp",
         ])
         monkeypatch.setattr(
             "solden.core.database.get_db", lambda: fake_db,
@@ -273,11 +292,7 @@ class TestFuzzyMatchTier:
             _fake_find_vendor,
         )
 
-        fake_db = MagicMock()
-        fake_db.list_vendor_profiles = MagicMock(return_value=[
-            {"vendor_name": "Apex Manufacturing"},
-            {"vendor_name": "Beta Industries"},
-        ])
+        fake_db = _profiles_db(["Apex Manufacturing", "Beta Industries"])
         monkeypatch.setattr(
             "solden.core.database.get_db", lambda: fake_db,
         )
@@ -313,8 +328,7 @@ class TestFuzzyMatchTier:
             _fake_find_vendor,
         )
 
-        fake_db = MagicMock()
-        fake_db.list_vendor_profiles = MagicMock(return_value=[])
+        fake_db = _profiles_db([])
         monkeypatch.setattr(
             "solden.core.database.get_db", lambda: fake_db,
         )
@@ -357,6 +371,38 @@ class TestFuzzyMatchTier:
         assert result == "found"
         assert isinstance(result, str)
 
+    def test_fuzzy_searches_whole_vendor_master(self, monkeypatch):
+        # The old tier scored only the 200 most recently active
+        # profiles; the name index reaches a long-tail vendor too.
+        monkeypatch.setattr(
+            "solden.integrations.erp_router.get_erp_connection",
+            lambda org_id: object(),
+        )
+
+        async def _fake_find_vendor(org_id, name=None, email=None):
+            return None
+
+        monkeypatch.setattr(
+            "solden.integrations.erp_router.find_vendor",
+            _fake_find_vendor,
+        )
+        names = [f"Supplier {i:04d} Holdings" for i in range(1000)]
+        names.append("Quantrix Logistics GmbH")
+        fake_db = _profiles_db(names)
+        monkeypatch.setattr(
+            "solden.core.database.get_db", lambda: fake_db,
+        )
+
+        result = asyncio.run(
+            check_vendor_in_erp_master_full(
+                organization_id="org-1",
+                vendor_name="Quantrix Logistics",
+            )
+        )
+        assert result.status == "found"
+        assert result.matched_via == "fuzzy_local"
+        assert result.matched_name == "Quantrix Logistics GmbH"
+
 
 class TestVendorMasterCheckResultDataclass:
     def test_default_status_only_construction(self):
@@ -396,3 +396,187 @@ def test_match_probability_is_monotonic_in_strong_modes():
 # ``vendor_search.py`` + ``fuzzy_matching.py``. The DB-bound
 # integration test for ``detect_duplicates_via_rrf`` lives in
 # ``test_vendor_dedup.py``.
+
+
+# ─── Indexed retrieval (vendor_name_index) ─────────────────────────
+
+
+def _decoy_corpus(n):
+    # Names that share the common words with the query but not the brand.
+    words = ("Global", "Logistics", "Services", "Holdings", "Partners")
+    return [
+        {"vendor_name": f"Vendor{i:04d} {words[i % len(words)]}", "id": f"d{i}"}
+        for i in range(n)
+    ]
+
+
+def test_index_shortlist_finds_typo_among_decoys():
+    from solden.services.fuzzy_matching import normalize_vendor
+    from solden.services.vendor_name_index import VendorNameIndex
+
+    corpus = _decoy_corpus(500) + [{"vendor_name": "Quantrix Logistics LLC", "id": "q"}]
+    index = VendorNameIndex.from_records(corpus, key_field="id")
+    shortlist = index.shortlist(normalize_vendor("Quantrixx Logistics"), limit=5)
+    assert shortlist[0].key == "q"
+    assert shortlist[0].record["vendor_name"] == "Quantrix Logistics LLC"
+
+
+def test_index_shortlist_exact_and_exclude():
+    from solden.services.vendor_name_index import VendorNameIndex
+
+    index = VendorNameIndex.from_records(
+        [{"vendor_name": "Stripe Inc", "id": "a"}, {"vendor_name": "STRIPE", "id": "b"}],
+        key_field="id",
+    )
+    # Same normalized name: ties break on display name.
+    assert [e.key for e in index.shortlist("stripe", limit=5)] == ["b", "a"]
+    assert [e.key for e in index.shortlist("stripe", limit=5, exclude="a")] == ["b"]
+
+
+def test_index_upsert_and_remove_are_incremental():
+    from solden.services.vendor_name_index import VendorNameIndex
+
+    index = VendorNameIndex()
+    index.upsert("v1", "Acme Manufacturing")
+    index.upsert("v2", "Globex Corporation")
+    assert [e.key for e in index.shortlist("acme manufacturing", limit=1)] == ["v1"]
+
+    # Rename: old postings go, new ones arrive.
+    index.upsert("v1", "Initech Software")
+    assert index.get("v1").normalized == "initech software"
+    assert "v1" not in {e.key for e in index.shortlist("acme manufacturing", limit=5, min_trigram=0.3)}
+    assert [e.key for e in index.shortlist("initech software", limit=1)] == ["v1"]
+
+    assert index.remove("v2") is True
+    assert index.remove("v2") is False
+    assert len(index) == 1
+    assert index.shortlist("globex", limit=5) == []
+
+    # Blank names are not indexed.
+    index.upsert("v1", "  ")
+    assert len(index) == 0
+
+
+def test_find_indexed_matches_modes_match_scalar():
+    from solden.services.vendor_name_index import VendorNameIndex
+    from solden.services.vendor_search import find_indexed_matches
+
+    corpus = [
+        {"vendor_name": "Logisitcs Co"},
+        {"vendor_name": "Logistics Partners Ltd"},
+        {"vendor_name": "Acme Manufacturing"},
+    ]
+    index = VendorNameIndex.from_records(corpus)
+    matches = find_indexed_matches("Logistics Co", index, k=3)
+    # Nothing in "Acme Manufacturing" overlaps the query's grams.
+    assert {m.candidate for m in matches} == {"Logisitcs Co", "Logistics Partners Ltd"}
+    for match in matches:
+        assert match.modes == vendor_similarity_modes("Logistics Co", match.candidate)
+
+
+def test_find_candidate_matches_large_corpus_uses_shortlist():
+    corpus = _decoy_corpus(300) + [
+        {"vendor_name": "Quantrix Logistics LLC", "id": "q1"},
+        {"vendor_name": "Quantrix Logistic", "id": "q2"},
+    ]
+    indexed = find_candidate_matches("Quantrix Logistics", corpus, k=2)
+    full = find_candidate_matches("Quantrix Logistics", corpus, k=2, shortlist_size=None)
+    assert {m.candidate_record["id"] for m in indexed} == {"q1", "q2"}
+    assert [m.candidate for m in indexed] == [m.candidate for m in full]
+
+
+class _ProfilesDB:
+    """``vendor_profiles`` projections the registry syncs from."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.id_sweeps = 0
+
+    def list_vendor_profile_names(self, organization_id, *, updated_since=None):
+        return sorted(
+            (dict(r) for r in self.rows if not updated_since or r["updated_at"] >= updated_since),
+            key=lambda r: (r["updated_at"], r["id"]),
+        )
+
+    def count_vendor_profiles(self, organization_id, *, named_only=False):
+        return sum(1 for r in self.rows if not named_only or (r["vendor_name"] or "").strip())
+
+    def list_vendor_profile_ids(self, organization_id):
+        self.id_sweeps += 1
+        return [r["id"] for r in self.rows]
+
+
+def test_registry_picks_up_rename_committed_behind_watermark():
+    from solden.services.vendor_name_index import VendorNameIndexRegistry
+
+    db = _ProfilesDB([
+        {"id": "v1", "vendor_name": "Acme Manufacturing", "updated_at": "2025-01-01T10:00:00+00:00"},
+        {"id": "v2", "vendor_name": "Globex Corporation", "updated_at": "2025-01-01T10:00:05+00:00"},
+    ])
+    registry = VendorNameIndexRegistry()
+    registry.get("org-1", db)
+    # Stamped before the last sync, visible only after it.
+    db.rows[0] = dict(db.rows[0], vendor_name="Initech Software", updated_at="2025-01-01T10:00:02+00:00")
+    index = registry.get("org-1", db)
+    assert index.get("v1").normalized == "initech software"
+
+
+def test_registry_skips_id_sweep_for_blank_named_profiles():
+    from solden.services.vendor_name_index import VendorNameIndexRegistry
+
+    db = _ProfilesDB([
+        {"id": "v1", "vendor_name": "Acme Manufacturing", "updated_at": "2025-01-01T10:00:00+00:00"},
+        {"id": "v2", "vendor_name": " ", "updated_at": "2025-01-01T10:00:00+00:00"},
+    ])
+    registry = VendorNameIndexRegistry()
+    assert len(registry.get("org-1", db)) == 1
+    registry.get("org-1", db)
+    assert db.id_sweeps == 0
+
+    db.rows.pop(0)
+    assert len(registry.get("org-1", db)) == 0
+    assert db.id_sweeps == 1
+
+
+# ─── Batch scoring parity ──────────────────────────────────────────
+
+
+def test_bitparallel_levenshtein_matches_wagner_fischer():
+    import random
+
+    from solden.services.fuzzy_matching import (
+        _bitparallel_pattern,
+        _levenshtein_bitparallel,
+    )
+
+    rng = random.Random(11)
+    for _ in range(2000):
+        # Small alphabet forces plenty of matches / near-matches; lengths
+        # cross the 64-char word boundary.
+        a = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 80)))
+        b = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 80)))
+        assert _levenshtein_bitparallel(_bitparallel_pattern(a), len(a), b) == levenshtein_distance(a, b)
+
+
+def test_vendor_similarity_modes_batch_identical_to_scalar():
+    import random
+
+    from solden.services.fuzzy_matching import (
+        EncodedVendorNames,
+        vendor_similarity_modes_batch,
+    )
+
+    rng = random.Random(5)
+    words = ["Acme", "Global", "Logistics", "Stripe", "Payments", "Café", "Société",
+             "Intl", "International", "Systems", "Co.", "Inc", "GmbH", "Ltd"]
+    names = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 4))) for _ in range(150)]
+    names += ["", "  ", None, "Inc", "Acme Co.™", "ACME", "Logisitcs Co", "x" * 120]
+    queries = ["Acme Corp", "Logistics Co", "Cafe Societe", "Inc", "", "Stripe Payments UK"]
+
+    encoded = EncodedVendorNames(names)
+    for query in queries:
+        expected = [vendor_similarity_modes(query, name) for name in names]
+        # Large corpus goes through postings; a small one through direct
+        # set intersections. Both must match the scalar path exactly.
+        assert vendor_similarity_modes_batch(query, encoded) == expected
+        assert vendor_similarity_modes_batch(query, names[-10:]) == expected[-10:]
@@ -4,6 +4,7 @@ Covers:
 - Exact reference matching
 - Partial reference matching
 - Amount + date proximity matching
+- Statement-wide assignment (order independence, tier priority)
 - Unmatched items on both sides
 - Amount discrepancies
 - Summary stats (match rate, totals, difference)
@@ -113,6 +114,43 @@ class TestAmountDateMatching:
         assert result["matched"][0]["match_type"] == "amount_only"
 
 
+class TestGlobalAssignment:
+    def test_line_with_alternatives_does_not_starve_later_line(self, db):
+        _create_ap_item(db, "ga1", "Theta", 100.0, invoice_date="2026-03-10")
+        _create_ap_item(db, "ga2", "Theta", 100.0, invoice_date="2026-03-20")
+
+        svc = VendorStatementRecon("org-test")
+        items = [
+            {"reference": "", "amount": 100.0, "date": "2026-03-15"},  # fits both
+            {"reference": "", "amount": 100.0, "date": "2026-03-09"},  # fits ga1 only
+        ]
+        result = svc.reconcile("Theta", items)
+
+        assert result["summary"]["matched_count"] == 2
+        by_date = {m["statement_date"]: m for m in result["matched"]}
+        assert by_date["2026-03-09"]["ap_item_id"] == "ga1"
+        assert by_date["2026-03-15"]["ap_item_id"] == "ga2"
+        assert {m["match_type"] for m in result["matched"]} == {"amount_date"}
+
+        reversed_result = svc.reconcile("Theta", list(reversed(items)))
+        assert {
+            (m["statement_date"], m["ap_item_id"]) for m in reversed_result["matched"]
+        } == {(d, m["ap_item_id"]) for d, m in by_date.items()}
+
+    def test_reference_tier_takes_priority_over_amount(self, db):
+        _create_ap_item(db, "gp1", "Iota", 400.0, invoice_number="IOTA-9")
+
+        svc = VendorStatementRecon("org-test")
+        result = svc.reconcile("Iota", [
+            {"reference": "", "amount": 400.0, "date": ""},
+            {"reference": "IOTA-9", "amount": 400.0, "date": ""},
+        ])
+
+        assert result["summary"]["matched_count"] == 1
+        assert result["matched"][0]["match_type"] == "reference_exact"
+        assert result["summary"]["unmatched_on_statement"] == 1
+
+
 # ---------------------------------------------------------------------------
 # Unmatched / discrepancy tests
 # ---------------------------------------------------------------------------
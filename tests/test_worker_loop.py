@@ -0,0 +1,80 @@
+"""Tests for the persistent per-thread worker loops.
+
+Covers:
+  * Repeat calls on one thread reuse the same loop (unlike asyncio.run).
+  * Each thread gets its own loop.
+  * Calling from inside a running loop fails like asyncio.run does.
+  * The shared HTTP client survives across calls on a worker loop and
+    is replaced, not handed out dead, once its loop is closed.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from solden.core import http_client
+from solden.core.worker_loop import close_worker_loop, run_on_worker_loop
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_loop():
+    close_worker_loop()
+    http_client._reset_for_testing()
+    yield
+    close_worker_loop()
+    http_client._reset_for_testing()
+
+
+def test_repeat_calls_reuse_one_loop():
+    first = run_on_worker_loop(_current_loop())
+    second = run_on_worker_loop(_current_loop())
+    assert first is second
+    assert not first.is_closed()
+
+
+def test_each_thread_gets_its_own_loop():
+    loops = {}
+
+    def worker(name):
+        loops[name] = run_on_worker_loop(_current_loop())
+        close_worker_loop()
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in ("a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert loops["a"] is not loops["b"]
+
+
+def test_refuses_to_nest_inside_a_running_loop():
+    async def outer():
+        return run_on_worker_loop(_current_loop())
+
+    with pytest.raises(RuntimeError, match="running event loop"):
+        asyncio.run(outer())
+
+
+def test_http_client_is_reused_across_calls_on_the_worker_loop():
+    async def client():
+        return http_client.get_http_client()
+
+    first = run_on_worker_loop(client())
+    second = run_on_worker_loop(client())
+    assert first is second
+
+
+def test_http_client_bound_to_a_closed_loop_is_replaced():
+    async def client():
+        return http_client.get_http_client()
+
+    dead = asyncio.run(client())
+    live = run_on_worker_loop(client())
+    assert live is not dead
+    assert run_on_worker_loop(client()) is live